@@ -8,24 +8,36 @@ Supports:
 - Custom shapes (rounded corners, circular dots)
 """
 
-import qrcode
-from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers import RoundedModuleDrawer, CircleModuleDrawer, SquareModuleDrawer
-from qrcode.image.styles.colormasks import SolidFillColorMask
 from PIL import Image, ImageDraw, ImageFont
 import io
+import math
+from functools import lru_cache
 from typing import Optional, Tuple, List
 import os
 
+import qr_service
+
+
+@lru_cache(maxsize=1)
+def _label_font():
+    """Label font, loaded once per process"""
+    try:
+        return ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', 36)
+    except:
+        try:
+            return ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 36)
+        except:
+            return ImageFont.load_default()
+
 
 class AdvancedQRGenerator:
     """Generate modern QR codes with advanced styling"""
 
-    # Style to module drawer mapping
-    STYLE_DRAWERS = {
-        'minimal': SquareModuleDrawer,
-        'rounded': RoundedModuleDrawer,
-        'circles': CircleModuleDrawer
+    # Style to qr_service module style
+    STYLES = {
+        'minimal': 'square',
+        'rounded': 'rounded',
+        'circles': 'circles'
     }
 
     def __init__(
@@ -63,56 +75,21 @@ class AdvancedQRGenerator:
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
-    def _create_gradient_overlay(self, qr_img: Image.Image) -> Image.Image:
-        """Apply linear gradient overlay to QR code"""
-        if not self.secondary_color:
-            return qr_img
-
-        # Create gradient image
-        gradient = Image.new('RGB', qr_img.size)
-        draw = ImageDraw.Draw(gradient)
-
-        # Get colors
-        color1 = self._hex_to_rgb(self.primary_color)
-        color2 = self._hex_to_rgb(self.secondary_color)
-
-        # Draw vertical gradient
-        width, height = qr_img.size
-        for y in range(height):
-            # Interpolate between colors
-            ratio = y / height
-            r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-            g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-            b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-
-        # Convert QR to RGBA for transparency
-        qr_rgba = qr_img.convert('RGBA')
-
-        # Create mask from QR (black pixels become opaque)
-        # Extract alpha channel based on luminance
-        pixels = qr_rgba.load()
-        for y in range(height):
-            for x in range(width):
-                r, g, b, a = pixels[x, y]
-                # If pixel is dark (QR module), keep it; if light (background), make transparent
-                if r < 128:  # Dark pixel (QR module)
-                    pixels[x, y] = gradient.getpixel((x, y)) + (255,)
-                else:  # Light pixel (background)
-                    pixels[x, y] = (255, 255, 255, 255)
-
-        return qr_rgba.convert('RGB')
-
-    def _embed_logo(self, qr_img: Image.Image) -> Image.Image:
-        """Embed logo in center of QR code"""
+    def _mask(self) -> Image.Image:
+        """Module mask at final size, from qr_service's shared caches"""
+        matrix = qr_service.encode(self.data, 'H', 1)  # 30% redundancy (allows logo embedding)
+        return qr_service.module_mask(matrix, self.STYLES.get(self.style, 'square'), 10, 4, self.size)
+
+    def _logo_overlay(self, qr_size: int) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+        """Logo on its white pad and where it goes, or None"""
         if not self.logo_path or not os.path.exists(self.logo_path):
-            return qr_img
+            return None
 
         # Open and resize logo
         logo = Image.open(self.logo_path)
 
         # Logo should be ~20% of QR size
-        logo_size = int(qr_img.size[0] * 0.2)
+        logo_size = int(qr_size * 0.2)
         logo = logo.resize((logo_size, logo_size), Image.Resampling.LANCZOS)
 
         # Add white background to logo
@@ -120,106 +97,81 @@ class AdvancedQRGenerator:
         logo_bg.paste(logo, (10, 10), logo.convert('RGBA') if logo.mode == 'RGBA' else None)
 
         # Calculate center position
-        qr_width, qr_height = qr_img.size
-        logo_width, logo_height = logo_bg.size
         position = (
-            (qr_width - logo_width) // 2,
-            (qr_height - logo_height) // 2
+            (qr_size - logo_bg.size[0]) // 2,
+            (qr_size - logo_bg.size[1]) // 2
         )
+        return logo_bg, position
 
-        # Paste logo
-        qr_img.paste(logo_bg, position)
-        return qr_img
-
-    def _add_label(self, qr_img: Image.Image) -> Image.Image:
-        """Add text label below QR code"""
+    def _label_canvas(self, qr_size: int) -> Optional[Image.Image]:
+        """White canvas with room for the QR and the label drawn below it, or None"""
         if not self.label:
-            return qr_img
+            return None
 
         # Create new image with space for label
         label_height = 60
-        final_img = Image.new('RGB', (qr_img.size[0], qr_img.size[1] + label_height), 'white')
-        final_img.paste(qr_img, (0, 0))
+        canvas = Image.new('RGB', (qr_size, qr_size + label_height), 'white')
 
         # Draw label
-        draw = ImageDraw.Draw(final_img)
-
-        # Try to use a nice font, fall back to default
-        try:
-            font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', 36)
-        except:
-            try:
-                font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 36)
-            except:
-                font = ImageFont.load_default()
+        draw = ImageDraw.Draw(canvas)
+        font = _label_font()
 
         # Center text
         bbox = draw.textbbox((0, 0), self.label, font=font)
         text_width = bbox[2] - bbox[0]
-        text_x = (qr_img.size[0] - text_width) // 2
-        text_y = qr_img.size[1] + 10
+        text_x = (qr_size - text_width) // 2
+        text_y = qr_size + 10
 
         draw.text((text_x, text_y), self.label, fill='black', font=font)
 
-        return final_img
+        return canvas
+
+    def _compose(self, qr_img: Image.Image, logo: Optional[Tuple], label_canvas: Optional[Image.Image]) -> Image.Image:
+        """Paste logo and label onto a rendered QR"""
+        if logo:
+            qr_img.paste(*logo)
+
+        if label_canvas:
+            final_img = label_canvas.copy()
+            final_img.paste(qr_img, (0, 0))
+            return final_img
+
+        return qr_img
+
+    def _cache_key(self, kind: str, *extra) -> Tuple:
+        logo_mtime = os.path.getmtime(self.logo_path) if self.logo_path and os.path.exists(self.logo_path) else None
+        return (kind, self.data, self.style, self.primary_color, self.secondary_color,
+                self.label, self.logo_path, logo_mtime, self.size) + extra
 
     def generate(self) -> bytes:
         """
         Generate QR code with all styling options
 
+        Identical requests are served from qr_service's PNG cache.
+
         Returns:
             PNG image bytes
         """
-        # Create QR code with high error correction (allows logo embedding)
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,  # 30% redundancy
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(self.data)
-        qr.make(fit=True)
-
-        # Get module drawer for style
-        module_drawer = self.STYLE_DRAWERS.get(self.style, SquareModuleDrawer)()
-
-        # Generate styled QR image
-        color_mask = SolidFillColorMask(
-            back_color=(255, 255, 255),
-            front_color=self._hex_to_rgb(self.primary_color)
-        )
-
-        qr_img = qr.make_image(
-            image_factory=StyledPilImage,
-            module_drawer=module_drawer,
-            color_mask=color_mask
-        )
-
-        # Resize to target size
-        qr_img = qr_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
+        return qr_service.remember(self._cache_key('advanced'), self._render)
 
-        # Apply gradient if secondary color provided
-        if self.secondary_color:
-            qr_img = self._create_gradient_overlay(qr_img)
+    def _render(self) -> bytes:
+        # Solid or gradient (primary -> secondary, top to bottom) modules on white
+        qr_img = qr_service.colorize(
+            self._mask(),
+            fill=self._hex_to_rgb(self.primary_color),
+            gradient_to=self._hex_to_rgb(self.secondary_color) if self.secondary_color else None
+        ).convert('RGB')
 
-        # Embed logo if provided
-        if self.logo_path:
-            qr_img = self._embed_logo(qr_img)
-
-        # Add label if provided
-        if self.label:
-            qr_img = self._add_label(qr_img)
-
-        # Convert to bytes
-        buffer = io.BytesIO()
-        qr_img.save(buffer, format='PNG')
-        return buffer.getvalue()
+        qr_img = self._compose(qr_img, self._logo_overlay(self.size), self._label_canvas(self.size))
+        return qr_service.to_png(qr_img)
 
     def generate_animated(self, frames: int = 8, pulse_intensity: float = 0.3) -> bytes:
         """
         Generate animated GIF QR code with pulsing effect
 
-        Each frame is a valid QR code with slightly different styling
+        Each frame is a valid QR code with slightly different styling.
+        The module mask, logo and label are built once; a frame is one
+        colorize() of the mask plus two pastes.
 
         Args:
             frames: Number of animation frames (8-10 recommended)
@@ -233,69 +185,32 @@ class AdvancedQRGenerator:
         except ImportError:
             raise ImportError("imageio required for animated QR codes. Run: pip install imageio")
 
+        return qr_service.remember(
+            self._cache_key('animated', frames, pulse_intensity),
+            lambda: self._render_animated(imageio, frames, pulse_intensity)
+        )
+
+    def _render_animated(self, imageio, frames: int, pulse_intensity: float) -> bytes:
+        mask = self._mask()
+        logo = self._logo_overlay(self.size)
+        label_canvas = self._label_canvas(self.size)
+
+        rgb = self._hex_to_rgb(self.primary_color)
+        rgb2 = self._hex_to_rgb(self.secondary_color) if self.secondary_color else None
+
         frame_images = []
 
         # Generate frames with color pulsing
         for i in range(frames):
             # Calculate pulse factor (sine wave)
-            import math
             pulse = 1.0 + (pulse_intensity * math.sin(2 * math.pi * i / frames))
 
-            # Adjust primary color brightness
-            rgb = self._hex_to_rgb(self.primary_color)
+            # Adjust primary (and gradient) color brightness
             pulsed_rgb = tuple(min(255, int(c * pulse)) for c in rgb)
+            pulsed_rgb2 = tuple(min(255, int(c * pulse)) for c in rgb2) if rgb2 else None
 
-            # Create QR for this frame
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_H,
-                box_size=10,
-                border=4,
-            )
-            qr.add_data(self.data)
-            qr.make(fit=True)
-
-            module_drawer = self.STYLE_DRAWERS.get(self.style, SquareModuleDrawer)()
-            color_mask = SolidFillColorMask(
-                back_color=(255, 255, 255),
-                front_color=pulsed_rgb
-            )
-
-            qr_img = qr.make_image(
-                image_factory=StyledPilImage,
-                module_drawer=module_drawer,
-                color_mask=color_mask
-            )
-
-            qr_img = qr_img.resize((self.size, self.size), Image.Resampling.LANCZOS)
-
-            # Apply gradient if secondary color
-            if self.secondary_color:
-                # Also pulse secondary color
-                rgb2 = self._hex_to_rgb(self.secondary_color)
-                pulsed_rgb2 = tuple(min(255, int(c * pulse)) for c in rgb2)
-
-                # Temporarily override colors for gradient
-                original_primary = self.primary_color
-                original_secondary = self.secondary_color
-                self.primary_color = '#%02x%02x%02x' % pulsed_rgb
-                self.secondary_color = '#%02x%02x%02x' % pulsed_rgb2
-
-                qr_img = self._create_gradient_overlay(qr_img)
-
-                # Restore original colors
-                self.primary_color = original_primary
-                self.secondary_color = original_secondary
-
-            # Embed logo
-            if self.logo_path:
-                qr_img = self._embed_logo(qr_img)
-
-            # Add label
-            if self.label:
-                qr_img = self._add_label(qr_img)
-
-            frame_images.append(qr_img)
+            qr_img = qr_service.colorize(mask, fill=pulsed_rgb, gradient_to=pulsed_rgb2).convert('RGB')
+            frame_images.append(self._compose(qr_img, logo, label_canvas))
 
         # Create GIF
         buffer = io.BytesIO()
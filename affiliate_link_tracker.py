@@ -106,6 +106,7 @@ Usage:
 
 from flask import Blueprint, request, jsonify, session, make_response
 from database import get_db
+from schema_registry import ensure_schema
 from typing import Dict, List, Optional
 import json
 import hashlib
@@ -685,49 +686,8 @@ def get_referral_stats_endpoint(user_id):
 # ==============================================================================
 
 def create_referral_tables():
-    """Create referral tracking tables"""
-    db = get_db()
-
-    # Referral codes
-    db.execute('''
-        CREATE TABLE IF NOT EXISTS referral_codes (
-            code TEXT PRIMARY KEY,
-            domain TEXT NOT NULL,
-            referrer_user_id INTEGER,
-            campaign TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # User journeys
-    db.execute('''
-        CREATE TABLE IF NOT EXISTS user_journeys (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            domain_sequence TEXT,
-            entry_domain TEXT,
-            current_domain TEXT,
-            referral_code TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # Referral earnings
-    db.execute('''
-        CREATE TABLE IF NOT EXISTS referral_earnings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            referrer_domain TEXT NOT NULL,
-            referred_user_id INTEGER NOT NULL,
-            target_domain TEXT NOT NULL,
-            ownership_earned REAL NOT NULL,
-            referral_type TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    db.commit()
-    db.close()
+    """Create referral tracking tables (schema lives in schema_registry)"""
+    ensure_schema()
 
 
 # ==============================================================================
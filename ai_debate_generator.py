@@ -42,6 +42,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 from database import get_db
+from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
 
 
 # ==============================================================================
@@ -49,6 +50,7 @@ from database import get_db
 # ==============================================================================
 
 OLLAMA_URL = 'http://localhost:11434'
+DEBATE_TIMEOUT = 60
 DEBATES_DIR = Path('./debates')
 DEBATES_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -94,30 +96,8 @@ class AIDebateGenerator:
         except Exception:
             return False
 
-    def generate_counter_argument(
-        self,
-        original_text: str,
-        persona: str = 'deathtodata',
-        ragebait: bool = False,
-        model: str = 'llama3'
-    ) -> Dict:
-        """
-        Generate AI counter-argument to original text
-
-        Args:
-            original_text: Original voice transcript
-            persona: AI persona (calriven, soulfra, deathtodata)
-            ragebait: Optimize for controversy/engagement
-            model: Ollama model to use
-
-        Returns:
-            {
-                'persona': str,
-                'counter_argument': str,
-                'reasoning': str,
-                'controversy_score': float
-            }
-        """
+    def _counter_prompt(self, persona: str, ragebait: bool = False):
+        """Persona-specific (system, instructions) for a counter-argument"""
         if persona not in PERSONAS:
             raise ValueError(f"Unknown persona: {persona}")
 
@@ -135,15 +115,12 @@ IMPORTANT: Make this SPICY. This needs to drive engagement.
 - Make them WANT to respond
 """
 
-        prompt = f"""You are {profile['name']}, an AI with this personality:
+        system = f"""You are {profile['name']}, an AI with this personality:
 - Style: {profile['style']}
 - Approach: {profile['approach']}
-- Tone: {profile['tone']}
-
-Someone just said:
-"{original_text}"
+- Tone: {profile['tone']}"""
 
-Your task: Write a passionate counter-argument that disagrees with their perspective.
+        instructions = f"""Your task: Write a passionate counter-argument that disagrees with their perspective.
 - Be specific about what they got wrong
 - Provide alternative viewpoint
 - Challenge their assumptions
@@ -153,72 +130,99 @@ Your task: Write a passionate counter-argument that disagrees with their perspec
 
 Write your response as {profile['name']}:"""
 
-        print(f"\n🤖 Generating {profile['name']} counter-argument...")
-        print(f"   Model: {model}")
-        print(f"   Ragebait: {'YES' if ragebait else 'No'}")
+        return system, instructions
 
-        # Call Ollama
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    'model': model,
-                    'prompt': prompt,
-                    'stream': False
-                },
-                timeout=60
-            )
+    @staticmethod
+    def _statement_context(original_text: str) -> str:
+        """Shared part of every panelist's prompt, evaluated once per debate"""
+        return f'Someone just said:\n"{original_text}"'
 
-            if not response.ok:
-                return {
-                    'error': f'Ollama error: {response.status_code}',
-                    'persona': persona
-                }
+    def _counter_result(self, persona: str, generation, model: str) -> Dict:
+        """Shape an orchestrator result like generate_counter_argument() output"""
+        if not generation.ok:
+            return {
+                'error': generation.error,
+                'persona': persona
+            }
 
-            data = response.json()
-            counter_text = data.get('response', '').strip()
+        counter_text = generation.text
+        print(f"   ✅ {PERSONAS[persona]['name']}: {len(counter_text)} characters "
+              f"({generation.seconds:.1f}s, {generation.tokens_per_sec:.1f} tok/s)")
+
+        # Calculate controversy score (simple heuristic)
+        controversy_keywords = [
+            'wrong', 'actually', 'completely', 'totally',
+            'missing the point', 'ridiculous', 'absurd',
+            'naive', 'ignorant', 'hypocrisy', 'ironic'
+        ]
+        controversy_score = sum(
+            1 for kw in controversy_keywords
+            if kw.lower() in counter_text.lower()
+        ) / len(controversy_keywords)
 
-            print(f"   ✅ Generated {len(counter_text)} characters")
+        return {
+            'persona': persona,
+            'persona_name': PERSONAS[persona]['name'],
+            'counter_argument': counter_text,
+            'controversy_score': controversy_score,
+            'model': model,
+            'generated_at': datetime.now().isoformat()
+        }
 
-            # Calculate controversy score (simple heuristic)
-            controversy_keywords = [
-                'wrong', 'actually', 'completely', 'totally',
-                'missing the point', 'ridiculous', 'absurd',
-                'naive', 'ignorant', 'hypocrisy', 'ironic'
-            ]
-            controversy_score = sum(
-                1 for kw in controversy_keywords
-                if kw.lower() in counter_text.lower()
-            ) / len(controversy_keywords)
+    def generate_counter_argument(
+        self,
+        original_text: str,
+        persona: str = 'deathtodata',
+        ragebait: bool = False,
+        model: str = 'llama3'
+    ) -> Dict:
+        """
+        Generate AI counter-argument to original text
 
-            return {
-                'persona': persona,
-                'persona_name': profile['name'],
-                'counter_argument': counter_text,
-                'controversy_score': controversy_score,
-                'model': model,
-                'generated_at': datetime.now().isoformat()
-            }
+        Args:
+            original_text: Original voice transcript
+            persona: AI persona (calriven, soulfra, deathtodata)
+            ragebait: Optimize for controversy/engagement
+            model: Ollama model to use
 
-        except Exception as e:
-            return {
-                'error': str(e),
-                'persona': persona
+        Returns:
+            {
+                'persona': str,
+                'counter_argument': str,
+                'reasoning': str,
+                'controversy_score': float
             }
+        """
+        system, instructions = self._counter_prompt(persona, ragebait)
+
+        print(f"\n🤖 Generating {PERSONAS[persona]['name']} counter-argument...")
+        print(f"   Model: {model}")
+        print(f"   Ragebait: {'YES' if ragebait else 'No'}")
+
+        engine = GenerationOrchestrator(self.ollama_url, model=model, concurrency=1,
+                                        timeout=DEBATE_TIMEOUT)
+        generation = engine.generate(f"{self._statement_context(original_text)}\n\n{instructions}",
+                                     system=system)
+        return self._counter_result(persona, generation, model)
 
     def generate_panel_debate(
         self,
         original_text: str,
         personas: Optional[List[str]] = None,
-        model: str = 'llama3'
+        model: str = 'llama3',
+        ragebait: bool = False
     ) -> Dict:
         """
         Generate multi-persona panel debate
 
+        The statement is evaluated once and every panelist's counter-argument
+        is generated concurrently on top of it.
+
         Args:
             original_text: Original statement
             personas: List of personas (default: all 3)
             model: Ollama model
+            ragebait: Optimize for controversy/engagement
 
         Returns:
             {
@@ -235,18 +239,23 @@ Write your response as {profile['name']}:"""
         print(f"Panel: {', '.join(personas)}")
         print(f"{'='*70}\n")
 
-        responses = []
-
+        jobs = []
         for persona in personas:
-            result = self.generate_counter_argument(
-                original_text,
-                persona=persona,
-                model=model
-            )
-
-            if 'error' not in result:
-                responses.append(result)
-                print()  # Spacing
+            system, instructions = self._counter_prompt(persona, ragebait)
+            jobs.append(GenerationJob(key=persona, system=system, prompt=instructions))
+
+        engine = GenerationOrchestrator(self.ollama_url, model=model, concurrency=len(jobs),
+                                        timeout=DEBATE_TIMEOUT)
+        by_persona = {}
+        engine.run([GenerationItem(key='panel', prefix=self._statement_context(original_text), jobs=jobs)],
+                   on_result=lambda generation: by_persona.__setitem__(
+                       generation.job_key, self._counter_result(generation.job_key, generation, model)))
+
+        # Panel order, not completion order
+        responses = [by_persona[persona] for persona in personas if 'error' not in by_persona[persona]]
+        timing = engine.items.get('panel', {})
+        print(f"\n⏱️  Panel generated in {timing.get('seconds', 0)}s "
+              f"({timing.get('tokens_per_sec', 0)} tokens/sec)")
 
         return {
             'original': original_text,
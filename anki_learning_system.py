@@ -36,10 +36,43 @@ How It Works:
 
 import sqlite3
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 import math
 from database import get_db
+from schema_registry import ensure_schema
+
+
+# New cards offered per get_cards_due() call when enough cards are due
+NEW_CARD_SLOTS = 10
+
+# Progress of a card the user has never reviewed:
+# (repetitions, ease_factor, interval_days, total_reviews, correct_reviews, streak)
+NEW_CARD_STATE = (0, 2.5, 1, 0, 0, 0)
+
+CARD_FIELDS = 'c.id, c.question, c.answer, c.explanation, c.question_type, c.difficulty_predicted'
+PROGRESS_COLUMNS = ('repetitions', 'ease_factor', 'interval_days', 'last_reviewed', 'next_review',
+                    'streak', 'status', 'total_reviews', 'correct_reviews')
+
+# Indexed range read on idx_progress_user_due (user_id, next_review) - schema_registry version 110
+DUE_CARDS_SQL = f'''
+    SELECT {CARD_FIELDS}, {', '.join('p.' + column for column in PROGRESS_COLUMNS)}
+    FROM learning_progress p
+    JOIN learning_cards c ON c.id = p.card_id
+    WHERE p.user_id = ? AND p.next_review <= ?
+    ORDER BY p.next_review ASC
+    LIMIT ?
+'''
+
+# New cards in id order from the user's cursor; reviewed ones are skipped via the (card_id, user_id) key
+NEW_CARDS_SQL = f'''
+    SELECT {CARD_FIELDS}, {', '.join('NULL AS ' + column for column in PROGRESS_COLUMNS)}
+    FROM learning_cards c
+    WHERE c.id > ?
+      AND NOT EXISTS (SELECT 1 FROM learning_progress p WHERE p.card_id = c.id AND p.user_id = ?)
+    ORDER BY c.id
+    LIMIT ?
+'''
 
 
 # ==============================================================================
@@ -93,118 +126,56 @@ def sm2_schedule(quality: int, repetitions: int, ease_factor: float, interval: i
     return repetitions, ease_factor, interval
 
 
+def sm2_schedule_batch(qualities: Iterable[int], repetitions: Iterable[int],
+                       ease_factors: Iterable[float], intervals: Iterable[int]) -> Tuple[List[int], List[float], List[int]]:
+    """
+    sm2_schedule() over parallel columns in one pass
+
+    Returns:
+        (new_repetitions, new_ease_factors, new_intervals) - one entry per card
+    """
+    scheduled = list(map(sm2_schedule, qualities, repetitions, ease_factors, intervals))
+    if not scheduled:
+        return [], [], []
+    new_reps, new_ease, new_intervals = zip(*scheduled)
+    return list(new_reps), list(new_ease), list(new_intervals)
+
+
 def calculate_next_review(last_reviewed: datetime, interval_days: int) -> datetime:
     """Calculate next review date based on interval"""
     return last_reviewed + timedelta(days=interval_days)
 
 
-# ==============================================================================
-# DATABASE SCHEMA
-# ==============================================================================
+def _timestamp(moment: datetime) -> str:
+    """Stored form of review times (same text sqlite3 used to write for datetimes)"""
+    return moment.isoformat(' ')
 
-def init_learning_tables():
-    """Initialize spaced repetition learning tables"""
-    conn = get_db()
 
-    # Learning cards (flashcards from tutorial questions)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS learning_cards (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tutorial_id INTEGER,
-            question TEXT NOT NULL,
-            answer TEXT,
-            explanation TEXT,
-            question_type TEXT,
-            difficulty_predicted REAL,
-            neural_classifier TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (tutorial_id) REFERENCES tutorials(id)
-        )
-    ''')
+def _parse_review_time(value) -> Optional[datetime]:
+    """Client-supplied review time as naive local time"""
+    if not value:
+        return None
+    moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if moment.tzinfo:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment
 
-    # Learning progress (SM-2 state for each card)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS learning_progress (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_id INTEGER NOT NULL,
-            user_id INTEGER,
-            repetitions INTEGER DEFAULT 0,
-            ease_factor REAL DEFAULT 2.5,
-            interval_days INTEGER DEFAULT 1,
-            last_reviewed TIMESTAMP,
-            next_review TIMESTAMP,
-            total_reviews INTEGER DEFAULT 0,
-            correct_reviews INTEGER DEFAULT 0,
-            streak INTEGER DEFAULT 0,
-            status TEXT DEFAULT 'new',
-            FOREIGN KEY (card_id) REFERENCES learning_cards(id),
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            UNIQUE(card_id, user_id)
-        )
-    ''')
 
-    # Learning sessions (track study sessions)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS learning_sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            session_start TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            session_end TIMESTAMP,
-            cards_reviewed INTEGER DEFAULT 0,
-            cards_correct INTEGER DEFAULT 0,
-            session_duration_seconds INTEGER,
-            session_type TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
+def _status(repetitions: int) -> str:
+    if repetitions == 0:
+        return 'learning'
+    elif repetitions < 3:
+        return 'young'
+    return 'mature'
 
-    # Review history (detailed log)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS review_history (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            card_id INTEGER NOT NULL,
-            user_id INTEGER,
-            session_id INTEGER,
-            quality INTEGER NOT NULL,
-            time_to_answer_seconds INTEGER,
-            reviewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (card_id) REFERENCES learning_cards(id),
-            FOREIGN KEY (user_id) REFERENCES users(id),
-            FOREIGN KEY (session_id) REFERENCES learning_sessions(id)
-        )
-    ''')
 
-    # Learning paths (organize cards into courses)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS learning_paths (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            path_name TEXT NOT NULL,
-            description TEXT,
-            topic TEXT,
-            card_count INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # Path cards (many-to-many relationship)
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS path_cards (
-            path_id INTEGER NOT NULL,
-            card_id INTEGER NOT NULL,
-            position INTEGER,
-            FOREIGN KEY (path_id) REFERENCES learning_paths(id),
-            FOREIGN KEY (card_id) REFERENCES learning_cards(id),
-            UNIQUE(path_id, card_id)
-        )
-    ''')
-
-    # Create indexes for performance
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_next_review ON learning_progress(next_review)')
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_card_user ON learning_progress(card_id, user_id)')
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_session_user ON learning_sessions(user_id)')
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
 
-    conn.commit()
-    conn.close()
+def init_learning_tables():
+    """Initialize spaced repetition learning tables (schema lives in schema_registry)"""
+    ensure_schema()
 
     print("✅ Learning tables initialized")
 
@@ -226,27 +197,23 @@ def import_tutorial_questions(tutorial_id: int, questions: List[Dict], question_
         Number of cards created
     """
     conn = get_db()
-    cards_created = 0
 
+    # One lookup for the whole import instead of one per question
+    existing = {row[0] for row in conn.execute(
+        'SELECT question FROM learning_cards WHERE tutorial_id = ?', (tutorial_id,)
+    )}
+
+    rows = []
     for q in questions:
         # Skip if card already exists
-        existing = conn.execute('''
-            SELECT id FROM learning_cards
-            WHERE tutorial_id = ? AND question = ?
-        ''', (tutorial_id, q['question'])).fetchone()
-
-        if existing:
+        if q['question'] in existing:
             continue
+        existing.add(q['question'])
 
         # Predict difficulty using neural networks (if available)
         difficulty = predict_question_difficulty(q)
 
-        # Insert card
-        conn.execute('''
-            INSERT INTO learning_cards
-            (tutorial_id, question, answer, explanation, question_type, difficulty_predicted, neural_classifier)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        rows.append((
             tutorial_id,
             q['question'],
             q.get('answer'),
@@ -256,7 +223,12 @@ def import_tutorial_questions(tutorial_id: int, questions: List[Dict], question_
             q.get('model', 'ollama')
         ))
 
-        cards_created += 1
+    conn.executemany('''
+        INSERT INTO learning_cards
+        (tutorial_id, question, answer, explanation, question_type, difficulty_predicted, neural_classifier)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    cards_created = len(rows)
 
     conn.commit()
     conn.close()
@@ -314,54 +286,58 @@ def predict_question_difficulty(question: Dict) -> float:
 # REVIEW SYSTEM
 # ==============================================================================
 
-def get_cards_due(user_id: int = 1, limit: int = 20) -> List[Dict]:
+def get_cards_due(user_id: int = 1, limit: int = 20, now: Optional[datetime] = None) -> List[Dict]:
     """
     Get cards due for review today
 
+    Due cards come from an indexed range read on (user_id, next_review);
+    new cards are read in id order from the user's new-card cursor, so
+    neither query scans the whole deck. Up to NEW_CARD_SLOTS new cards are
+    included (more if fewer cards are due), ahead of the due cards.
+
     Args:
         user_id: User ID
         limit: Maximum cards to return
+        now: Review time (default: now)
 
     Returns:
-        List of card dicts with progress info
+        List of card dicts with progress info (progress fields are None for new cards)
     """
     conn = get_db()
 
-    # Get cards that are:
-    # 1. New (never reviewed)
-    # 2. Due for review (next_review <= now)
-    cards = conn.execute('''
-        SELECT
-            c.id,
-            c.question,
-            c.answer,
-            c.explanation,
-            c.question_type,
-            c.difficulty_predicted,
-            p.repetitions,
-            p.ease_factor,
-            p.interval_days,
-            p.last_reviewed,
-            p.next_review,
-            p.streak,
-            p.status,
-            p.total_reviews,
-            p.correct_reviews
-        FROM learning_cards c
-        LEFT JOIN learning_progress p ON c.id = p.card_id AND p.user_id = ?
-        WHERE
-            p.next_review IS NULL OR p.next_review <= datetime('now')
-        ORDER BY
-            p.next_review ASC,
-            c.difficulty_predicted ASC
-        LIMIT ?
-    ''', (user_id, limit)).fetchall()
+    due = conn.execute(DUE_CARDS_SQL, (user_id, _timestamp(now or datetime.now()), limit)).fetchall()
+    new = _new_cards(conn, user_id, limit)
+
+    new_count = min(len(new), max(NEW_CARD_SLOTS, limit - len(due)))
+    cards = new[:new_count] + due[:limit - new_count]
 
     conn.close()
 
     return [dict(card) for card in cards]
 
 
+def _new_cards(conn, user_id: int, limit: int) -> List[sqlite3.Row]:
+    """Unreviewed cards after the user's cursor; moves the cursor past reviewed ones"""
+    row = conn.execute('SELECT last_card_id FROM learning_new_cursor WHERE user_id = ?', (user_id,)).fetchone()
+    cursor = row[0] if row else 0
+
+    cards = conn.execute(NEW_CARDS_SQL, (cursor, user_id, limit)).fetchall()
+
+    if cards:
+        advanced = cards[0]['id'] - 1
+    else:
+        advanced = conn.execute('SELECT COALESCE(MAX(id), 0) FROM learning_cards').fetchone()[0]
+
+    if advanced > cursor:
+        conn.execute('''
+            INSERT INTO learning_new_cursor (user_id, last_card_id) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET last_card_id = excluded.last_card_id
+        ''', (user_id, advanced))
+        conn.commit()
+
+    return cards
+
+
 def review_card(card_id: int, quality: int, user_id: int = 1, session_id: Optional[int] = None,
                 time_to_answer: int = 0) -> Dict:
     """
@@ -377,82 +353,186 @@ def review_card(card_id: int, quality: int, user_id: int = 1, session_id: Option
     Returns:
         Updated progress dict
     """
-    conn = get_db()
+    return submit_reviews(
+        user_id,
+        [{'card_id': card_id, 'quality': quality, 'time_to_answer': time_to_answer}],
+        session_id
+    )[0]
 
-    # Get current progress
-    progress = conn.execute('''
-        SELECT * FROM learning_progress
-        WHERE card_id = ? AND user_id = ?
-    ''', (card_id, user_id)).fetchone()
 
-    if not progress:
-        # New card - initialize progress
-        repetitions, ease_factor, interval_days = 0, 2.5, 1
-        total_reviews, correct_reviews, streak = 0, 0, 0
-    else:
-        repetitions = progress['repetitions']
-        ease_factor = progress['ease_factor']
-        interval_days = progress['interval_days']
-        total_reviews = progress['total_reviews']
-        correct_reviews = progress['correct_reviews']
-        streak = progress['streak']
-
-    # Apply SM-2 algorithm
-    new_reps, new_ease, new_interval = sm2_schedule(
-        quality, repetitions, ease_factor, interval_days
-    )
+def submit_reviews(user_id: int, reviews: List[Dict], session_id: Optional[int] = None) -> List[Dict]:
+    """
+    Apply a batch of reviews in one transaction (mobile/offline clients)
 
-    # Update stats
-    total_reviews += 1
-    if quality >= 3:
-        correct_reviews += 1
-        streak += 1
-    else:
-        streak = 0
+    Progress for every card in the batch is read with one query, scheduled
+    with sm2_schedule_batch() and written back with executemany, together
+    with the review log and the session counters. Several reviews of the
+    same card are applied in review-time order.
+
+    Args:
+        user_id: User ID
+        reviews: [{'card_id', 'quality', 'time_to_answer'?, 'reviewed_at'?}]
+            reviewed_at (ISO 8601) is when an offline client saw the card
+        session_id: Current session ID
 
-    # Calculate next review date
-    last_reviewed = datetime.now()
-    next_review = calculate_next_review(last_reviewed, new_interval)
+    Returns:
+        One progress dict per review (same shape as review_card()), in input order
+    """
+    parsed = []
+    for position, review in enumerate(reviews):
+        quality = int(review['quality'])
+        if not 0 <= quality <= 5:
+            raise ValueError(f"quality must be 0-5, got {quality}")
+        reviewed_at = _parse_review_time(review.get('reviewed_at'))
+        parsed.append((
+            position, int(review['card_id']), quality,
+            int(review.get('time_to_answer') or 0), reviewed_at or datetime.now(), reviewed_at
+        ))
+    parsed.sort(key=lambda review: review[4])
 
-    # Determine status
-    if new_reps == 0:
-        status = 'learning'
-    elif new_reps < 3:
-        status = 'young'
-    else:
-        status = 'mature'
+    if not parsed:
+        return []
+
+    conn = get_db()
+
+    state = {
+        row[0]: tuple(row[1:])
+        for row in conn.execute('''
+            SELECT card_id, repetitions, ease_factor, interval_days, total_reviews, correct_reviews, streak
+            FROM learning_progress
+            WHERE user_id = ? AND card_id IN (SELECT value FROM json_each(?))
+        ''', (user_id, json.dumps(sorted({review[1] for review in parsed}))))
+    }
+
+    results: List[Optional[Dict]] = [None] * len(parsed)
+    final = {}
+    pending = parsed
+    while pending:
+        # One review per card per pass; repeats of a card wait for the next pass
+        batch, later, seen = [], [], set()
+        for review in pending:
+            (later if review[1] in seen else batch).append(review)
+            seen.add(review[1])
+
+        current = [state.get(review[1], NEW_CARD_STATE) for review in batch]
+        new_reps, new_ease, new_intervals = sm2_schedule_batch(
+            [review[2] for review in batch],
+            [progress[0] for progress in current],
+            [progress[1] for progress in current],
+            [progress[2] for progress in current],
+        )
+
+        for i, (position, card_id, quality, _, reviewed_at, _) in enumerate(batch):
+            _, _, _, total_reviews, correct_reviews, streak = current[i]
+            total_reviews += 1
+            if quality >= 3:
+                correct_reviews += 1
+                streak += 1
+            else:
+                streak = 0
+
+            next_review = calculate_next_review(reviewed_at, new_intervals[i])
+            status = _status(new_reps[i])
+
+            state[card_id] = (new_reps[i], new_ease[i], new_intervals[i], total_reviews, correct_reviews, streak)
+            final[card_id] = (
+                card_id, user_id, new_reps[i], new_ease[i], new_intervals[i],
+                _timestamp(reviewed_at), _timestamp(next_review), total_reviews, correct_reviews, streak, status
+            )
+            results[position] = {
+                'card_id': card_id,
+                'repetitions': new_reps[i],
+                'ease_factor': new_ease[i],
+                'interval_days': new_intervals[i],
+                'next_review': next_review.isoformat(),
+                'streak': streak,
+                'status': status,
+                'accuracy': (correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
+            }
+
+        pending = later
 
     # Upsert progress
-    conn.execute('''
-        INSERT OR REPLACE INTO learning_progress
+    conn.executemany('''
+        INSERT INTO learning_progress
         (card_id, user_id, repetitions, ease_factor, interval_days,
          last_reviewed, next_review, total_reviews, correct_reviews, streak, status)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        card_id, user_id, new_reps, new_ease, new_interval,
-        last_reviewed, next_review, total_reviews, correct_reviews, streak, status
-    ))
-
-    # Log review
-    conn.execute('''
+        ON CONFLICT(card_id, user_id) DO UPDATE SET
+            repetitions = excluded.repetitions, ease_factor = excluded.ease_factor,
+            interval_days = excluded.interval_days, last_reviewed = excluded.last_reviewed,
+            next_review = excluded.next_review, total_reviews = excluded.total_reviews,
+            correct_reviews = excluded.correct_reviews, streak = excluded.streak, status = excluded.status
+    ''', list(final.values()))
+
+    # Log reviews (client times are stored in UTC like CURRENT_TIMESTAMP)
+    conn.executemany('''
         INSERT INTO review_history
-        (card_id, user_id, session_id, quality, time_to_answer_seconds)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (card_id, user_id, session_id, quality, time_to_answer))
+        (card_id, user_id, session_id, quality, time_to_answer_seconds, reviewed_at)
+        VALUES (?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+    ''', [
+        (card_id, user_id, session_id, quality, time_to_answer,
+         client_time.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S') if client_time else None)
+        for _, card_id, quality, time_to_answer, _, client_time in parsed
+    ])
+
+    if session_id:
+        conn.execute('''
+            UPDATE learning_sessions
+            SET cards_reviewed = cards_reviewed + ?, cards_correct = cards_correct + ?
+            WHERE id = ?
+        ''', (len(parsed), sum(1 for review in parsed if review[2] >= 3), session_id))
 
     conn.commit()
     conn.close()
 
-    return {
-        'card_id': card_id,
-        'repetitions': new_reps,
-        'ease_factor': new_ease,
-        'interval_days': new_interval,
-        'next_review': next_review.isoformat(),
-        'streak': streak,
-        'status': status,
-        'accuracy': (correct_reviews / total_reviews * 100) if total_reviews > 0 else 0
-    }
+    return results
+
+
+def reschedule_cards(user_id: Optional[int] = None, tutorial_id: Optional[int] = None,
+                     ease_factor: Optional[float] = None) -> int:
+    """
+    Recompute schedules for many cards in one pass (e.g. an ease reset)
+
+    Intervals are scaled by new_ease / old_ease (minimum 1 day) and
+    next_review is recalculated from last_reviewed.
+
+    Args:
+        user_id: Only this user's progress (default: all users)
+        tutorial_id: Only cards imported from this tutorial
+        ease_factor: New ease for every matched card (default: keep, just recompute dates)
+
+    Returns:
+        Number of cards rescheduled
+    """
+    conn = get_db()
+
+    rows = conn.execute('''
+        SELECT p.id, p.ease_factor, p.interval_days, p.last_reviewed
+        FROM learning_progress p
+        JOIN learning_cards c ON c.id = p.card_id
+        WHERE (? IS NULL OR p.user_id = ?) AND (? IS NULL OR c.tutorial_id = ?)
+    ''', (user_id, user_id, tutorial_id, tutorial_id)).fetchall()
+
+    now = datetime.now()
+    old_ease = [row['ease_factor'] or 2.5 for row in rows]
+    new_ease = [max(1.3, ease_factor) if ease_factor else ease for ease in old_ease]
+    intervals = [max(1, int(round((row['interval_days'] or 1) * new / old)))
+                 for row, new, old in zip(rows, new_ease, old_ease)]
+    next_reviews = [
+        _timestamp(calculate_next_review(_parse_review_time(row['last_reviewed']) or now, interval))
+        for row, interval in zip(rows, intervals)
+    ]
+
+    conn.executemany(
+        'UPDATE learning_progress SET ease_factor = ?, interval_days = ?, next_review = ? WHERE id = ?',
+        [(ease, interval, next_review, row['id'])
+         for row, ease, interval, next_review in zip(rows, new_ease, intervals, next_reviews)]
+    )
+    conn.commit()
+    conn.close()
+
+    return len(rows)
 
 
 # ==============================================================================
@@ -551,12 +631,12 @@ def get_learning_stats(user_id: int = 1) -> Dict:
         LEFT JOIN learning_progress p ON c.id = p.card_id AND p.user_id = ?
     ''', (user_id,)).fetchone()
 
-    # Cards due today
+    # Cards due today (range count on idx_progress_user_due)
     due_today = conn.execute('''
         SELECT COUNT(*) as count
         FROM learning_progress
-        WHERE user_id = ? AND next_review <= datetime('now')
-    ''', (user_id,)).fetchone()
+        WHERE user_id = ? AND next_review <= ?
+    ''', (user_id, _timestamp(datetime.now()))).fetchone()
 
     # Recent accuracy
     recent_accuracy = conn.execute('''
@@ -657,6 +737,9 @@ def main():
     parser.add_argument('--stats', action='store_true', help='Show learning statistics')
     parser.add_argument('--user-id', type=int, default=1, help='User ID (default: 1)')
     parser.add_argument('--max-cards', type=int, default=20, help='Max cards per session')
+    parser.add_argument('--reschedule', action='store_true', help='Recompute schedules (with --ease to reset ease)')
+    parser.add_argument('--ease', type=float, help='New ease factor for --reschedule')
+    parser.add_argument('--tutorial-id', type=int, help='Limit --reschedule to one tutorial')
 
     args = parser.parse_args()
 
@@ -686,6 +769,10 @@ def main():
     elif args.review:
         run_review_session(args.user_id, args.max_cards)
 
+    elif args.reschedule:
+        count = reschedule_cards(args.user_id, args.tutorial_id, args.ease)
+        print(f"✅ Rescheduled {count} cards")
+
     elif args.stats:
         stats = get_learning_stats(args.user_id)
         print("=" * 60)
@@ -18,7 +18,8 @@ import sys
 import argparse
 from datetime import datetime
 from typing import Dict, List, Any
-import time
+
+from crawler import Crawler
 
 # ANSI colors
 GREEN = '\033[92m'
@@ -36,6 +37,8 @@ class APIHealthScanner:
         self.lan_ip = lan_ip
         self.results = []
         self.start_time = None
+        # Our own dev servers: no robots/politeness delay, just bounded concurrency
+        self.crawler = Crawler(concurrency=8, per_host=8, cache=False, respect_robots=False)
 
     def fetch_routes(self, base_url: str) -> Dict:
         """Fetch all routes from /status/routes endpoint"""
@@ -67,13 +70,11 @@ class APIHealthScanner:
             result['issues'].append('Route has parameters - needs manual testing')
             return result
 
-        start = time.time()
-
         try:
-            # Try GET request
-            response = requests.get(f"{base_url}{route}", timeout=10, allow_redirects=False)
+            # Try GET request (usually already fetched by scan_all's prefetch)
+            response = self.crawler.request('GET', f"{base_url}{route}", allow_redirects=False)
             result['http_code'] = response.status_code
-            result['response_time'] = round((time.time() - start) * 1000, 2)  # ms
+            result['response_time'] = round(response.elapsed.total_seconds() * 1000, 2)  # ms
 
             # Check if response is JSON
             if 'application/json' in response.headers.get('Content-Type', ''):
@@ -198,6 +199,11 @@ class APIHealthScanner:
             total_routes = sum(len(route_list) for route_list in routes.values())
             print(f"Found {total_routes} routes to test\n")
 
+            # Hit every testable route concurrently; results print in route order below
+            self.crawler.prefetch([('GET', f"{base_url}{route}", {'allow_redirects': False})
+                                   for route_list in routes.values() for route in route_list
+                                   if '<' not in route and '>' not in route])
+
             tested = 0
             for category, route_list in routes.items():
                 print(f"\n{category} ({len(route_list)} routes)")
@@ -242,6 +248,7 @@ class APIHealthScanner:
                         for issue in result['issues']:
                             print(f"         └─ {issue}")
 
+        print(f"\n{self.crawler.report()}")
         self._print_summary()
         self._save_report()
 
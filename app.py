@@ -962,6 +962,13 @@ def inject_globals():
 if not os.path.exists('soulfra.db'):
     init_db()
 
+# Apply pending schema migrations once (tables + hot-lookup indexes)
+try:
+    from schema_registry import ensure_schema
+    ensure_schema()
+except Exception as e:
+    print(f"⚠️  Schema migrations error: {e}")
+
 
 # =============================================================================
 # DEBUG & TESTING ROUTES - See what actually works
@@ -1396,7 +1403,7 @@ def search():
 
     Search modes:
     - semantic: Uses Ollama embeddings for meaning-based search
-    - text: Simple SQL LIKE search
+    - text: Full-text search (see full_text_search.py)
 
     Examples:
     - /search?q=AI+models&mode=semantic
@@ -1479,21 +1486,21 @@ def search():
             mode = 'text'
 
     if mode == 'text' or not results:
-        # Simple text search
-        results_raw = db.execute('''
-            SELECT p.*, b.name as brand_name
-            FROM posts p
-            LEFT JOIN brands b ON p.brand_id = b.id
-            WHERE p.published_at IS NOT NULL
-            AND (p.title LIKE ? OR p.content LIKE ?)
-            ORDER BY p.published_at DESC
-            LIMIT 20
-        ''', (f'%{query}%', f'%{query}%')).fetchall()
+        # Full-text search (FTS5, BM25-ranked, optional ?brand=<id> filter)
+        from full_text_search import search as full_text_search
+        results_raw = full_text_search(
+            'posts', query, limit=20,
+            brand=request.args.get('brand', type=int),
+            where='t.published_at IS NOT NULL',
+            select='t.*, b.name as brand_name',
+            join='LEFT JOIN brands b ON t.brand_id = b.id',
+            db=db
+        )
 
         results = [{
-            **dict(post),
+            **post,
             'score': None,
-            'excerpt': dict(post)['content'][:200] + '...' if len(dict(post)['content']) > 200 else dict(post)['content']
+            'excerpt': post['snippet'] or (post['content'][:200] + '...' if len(post['content']) > 200 else post['content'])
         } for post in results_raw]
 
     db.close()
@@ -3034,7 +3041,12 @@ def api_assistant_message():
         "response": "AI response text",
         "artifact": {...}  (optional: QR code, predictions, etc.)
     }
+
+    Chat messages stream as server-sent events with "stream": true (or
+    ?stream=1 / Accept: text/event-stream); slash commands always return JSON.
     """
+    from llm_stream import sse_response, wants_stream
+
     data = request.get_json() or {}
     message = data.get('message', '').strip()
     context = data.get('context', {})
@@ -3058,6 +3070,11 @@ def api_assistant_message():
             context=context
         )
 
+        if wants_stream(request):
+            stream = assistant.stream_message(message)
+            if stream is not None:
+                return sse_response(stream, on_complete=lambda text, summary: assistant.finish_stream(text))
+
         result = assistant.handle_message(message)
         return jsonify(result)
 
@@ -5091,73 +5108,16 @@ def sitemap_game():
 
 @app.route('/sitemap.xml')
 def sitemap_xml():
-    """SEO sitemap - XML format for search engines"""
-    from datetime import datetime
-
-    # Get base URL from config
-    from config import BASE_URL
-
-    # Define all public routes (exclude admin, API, POST-only routes)
-    public_routes = [
-        '/',
-        '/live',
-        '/shipyard',
-        '/brands',
-        '/tiers',
-        '/souls',
-        '/showcase',
-        '/code',
-        '/status',
-        '/reasoning',
-        '/ml',
-        '/dashboard',
-        '/train',
-        '/about',
-        '/feedback',
-        '/subscribe',
-        '/login',
-        '/signup',
-        '/sitemap',
-        '/feed.xml',
-    ]
-
-    # Add dynamic routes from database
-    db = get_db()
-
-    # Add all posts
-    posts = db.execute('SELECT slug FROM posts').fetchall()
-    for post in posts:
-        public_routes.append(f"/post/{post['slug']}")
-
-    # Add all brands
-    brands = db.execute('SELECT slug FROM brands').fetchall()
-    for brand in brands:
-        public_routes.append(f"/brand/{brand['slug']}")
-
-    # Add all souls
-    users = db.execute('SELECT username FROM users WHERE is_ai_persona = 0').fetchall()
-    for user in users:
-        public_routes.append(f"/soul/{user['username']}")
-
-    db.close()
-
-    # Generate XML
-    xml_lines = ['<?xml version="1.0" encoding="UTF-8"?>']
-    xml_lines.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
-
-    for route in public_routes:
-        xml_lines.append('  <url>')
-        xml_lines.append(f'    <loc>{BASE_URL}{route}</loc>')
-        xml_lines.append(f'    <lastmod>{datetime.now().strftime("%Y-%m-%d")}</lastmod>')
-        xml_lines.append('    <changefreq>daily</changefreq>')
-        xml_lines.append('    <priority>0.8</priority>')
-        xml_lines.append('  </url>')
-
-    xml_lines.append('</urlset>')
+    """SEO sitemap index - shards per entity, cached with ETag/304 (see syndication.py)"""
+    from syndication import respond, sitemap_index
+    return respond(sitemap_index())
 
-    xml_content = '\n'.join(xml_lines)
 
-    return Response(xml_content, mimetype='application/xml')
+@app.route('/sitemaps/<name>-<int:number>.xml')
+def sitemap_shard_xml(name, number):
+    """One sitemap shard (up to 50k URLs)"""
+    from syndication import respond, sitemap_shard
+    return respond(sitemap_shard(name, number))
 
 
 @app.route('/robots.txt')
@@ -5181,43 +5141,9 @@ Sitemap: {BASE_URL}/sitemap.xml
 
 @app.route('/feed.xml')
 def rss_feed():
-    """Generate RSS feed for all published posts"""
-    # Get recent published posts directly from database
-    conn = get_db()
-    posts = conn.execute('''
-        SELECT * FROM posts
-        WHERE published_at IS NOT NULL
-        ORDER BY published_at DESC
-        LIMIT 20
-    ''').fetchall()
-    conn.close()
-
-    rss_items = []
-    for post in posts:
-        author = get_user_by_id(post['user_id'])
-        # Escape XML special characters in content
-        content_preview = post['content'][:300].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-
-        rss_items.append(f"""    <item>
-      <title>{post['title']}</title>
-      <link>http://localhost:5001/post/{post['slug']}</link>
-      <description>{content_preview}...</description>
-      <pubDate>{post['published_at']}</pubDate>
-      <author>{author['display_name'] if author else 'Unknown'}</author>
-    </item>""")
-
-    rss = f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0">
-  <channel>
-    <title>Soulfra</title>
-    <link>http://localhost:5001</link>
-    <description>AI, privacy, and the future of technology</description>
-    <language>en-us</language>
-{chr(10).join(rss_items)}
-  </channel>
-</rss>"""
-
-    return Response(rss, mimetype='application/rss+xml')
+    """RSS feed for all published posts (cached, conditional GET)"""
+    from syndication import posts_feed, respond
+    return respond(posts_feed())
 
 
 @app.route('/user/<username>')
@@ -8332,29 +8258,15 @@ def generate_dashboard_qr():
 
     Perfect for iPhone testing - scan this QR to open dashboard
     """
-    import qrcode
+    import qr_service
     from io import BytesIO
 
     # Get base URL (will be local IP when accessed from network)
     base_url = request.url_root.rstrip('/')
     dashboard_url = f"{base_url}/dashboard"
 
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(dashboard_url)
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Convert to bytes
-    img_io = BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
+    # Generate QR code (cached PNG)
+    img_io = BytesIO(qr_service.png(dashboard_url, ecc='L', version=1))
 
     return send_file(img_io, mimetype='image/png')
 
@@ -8366,29 +8278,14 @@ def generate_search_gate_qr(token):
 
     Returns PNG image of QR code that links to verification URL
     """
-    import qrcode
+    import qr_service
     from io import BytesIO
 
     # Build verification URL
     verify_url = url_for('verify_search_token', token=token, _external=True)
 
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(verify_url)
-    qr.make(fit=True)
-
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Convert to PNG bytes
-    img_io = BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
+    # Generate QR code (cached PNG)
+    img_io = BytesIO(qr_service.png(verify_url, ecc='L', version=1))
 
     return send_file(img_io, mimetype='image/png')
 
@@ -9211,7 +9108,14 @@ def api_domains_import_csv():
     """
     Import domains from CSV data (JSON API)
     Frontend sends parsed CSV as JSON
+
+    Small imports finish inline ({imported}); large ones run as a background
+    job - poll status_url (/api/import-jobs/<job_id>) until status is
+    'completed'.
     """
+    from bulk_import import run_import
+    from import_domains_csv import brands_target
+
     try:
         data = request.get_json()
         domains = data.get('domains', [])
@@ -9219,56 +9123,12 @@ def api_domains_import_csv():
         if not domains:
             return jsonify({'success': False, 'error': 'No domains provided'}), 400
 
-        db = get_db()
-        imported = 0
-
-        for domain_data in domains:
-            try:
-                name = domain_data.get('name', '').strip()
-                domain = domain_data.get('domain', '').strip()
-                category = domain_data.get('category', 'tech')
-                tier = domain_data.get('tier', 'creative')
-                emoji = domain_data.get('emoji', '🌐')
-                brand_type = domain_data.get('brand_type', 'blog')
-                tagline = domain_data.get('tagline', '')
-                target_audience = domain_data.get('target_audience', '')
-                purpose = domain_data.get('purpose', '')
-
-                if not name or not domain:
-                    continue
-
-                # Generate slug from name
-                slug = name.lower().replace(' ', '-').replace('_', '-')
-                import re
-                slug = re.sub(r'[^a-z0-9-]', '', slug)
-
-                # Check if slug already exists
-                existing = db.execute('SELECT id FROM brands WHERE slug = ?', (slug,)).fetchone()
-                if existing:
-                    # Add number to slug
-                    counter = 1
-                    while db.execute('SELECT id FROM brands WHERE slug = ?', (f'{slug}-{counter}',)).fetchone():
-                        counter += 1
-                    slug = f'{slug}-{counter}'
+        target = brands_target(slug_from='name', strict=False, skip_existing_domains=False,
+                               defaults={'tier': 'creative', 'emoji': '🌐'})
+        job = run_import(target, lambda: domains, total=len(domains), source='api')
 
-                # Insert brand with all CSV fields
-                db.execute('''
-                    INSERT INTO brands (
-                        name, slug, domain, category, tier, emoji, brand_type, tagline, created_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                ''', (name, slug, domain, category, tier, emoji, brand_type, tagline))
-
-                imported += 1
-
-            except Exception as e:
-                print(f"Error importing {domain}: {e}")
-                continue
-
-        db.commit()
-        db.close()
-
-        return jsonify({'success': True, 'imported': imported})
+        return jsonify(dict(job, success=True, status_url=url_for('api_import_job', job_id=job['job_id'])),
+                       200 if job['status'] == 'completed' else 202)
 
     except Exception as e:
         print(f"Error importing CSV domains: {e}")
@@ -9285,7 +9145,14 @@ def admin_domains_import_csv():
     Expected CSV format:
     name,domain,category,tier,emoji,brand_type,tagline
     Example Site,example.com,tech,foundation,💻,blog,An example site
+
+    The upload is spooled to a temp file and streamed in chunks; files
+    over one chunk import in the background (progress: /api/import-jobs/<job_id>).
     """
+    import tempfile
+    from bulk_import import estimate_rows, read_rows, run_import
+    from import_domains_csv import brands_target
+
     try:
         # Check if file was uploaded
         if 'csv_file' not in request.files:
@@ -9302,60 +9169,24 @@ def admin_domains_import_csv():
             flash('File must be a CSV', 'error')
             return redirect(url_for('admin_domains'))
 
-        # Read CSV
-        import csv
-        import io
-
-        stream = io.StringIO(file.stream.read().decode("UTF8"), newline=None)
-        csv_reader = csv.DictReader(stream)
-
-        db = get_db()
-        imported = 0
-        skipped = 0
-        errors = []
-
-        for row in csv_reader:
-            try:
-                name = row.get('name', '').strip()
-                domain = row.get('domain', '').strip()
-                category = row.get('category', '').strip()
-                tier = row.get('tier', 'foundation').strip()
-                emoji = row.get('emoji', '').strip()
-                brand_type = row.get('brand_type', 'blog').strip()
-                tagline = row.get('tagline', '').strip()
-
-                if not name:
-                    skipped += 1
-                    continue
-
-                # Generate slug
-                slug = name.lower().replace(' ', '-').replace('_', '-')
-                import re
-                slug = re.sub(r'[^a-z0-9-]', '', slug)
-
-                # Check if slug exists
-                existing = db.execute('SELECT id FROM brands WHERE slug = ?', (slug,)).fetchone()
-                if existing:
-                    # Add number to slug
-                    counter = 1
-                    while db.execute('SELECT id FROM brands WHERE slug = ?', (f'{slug}-{counter}',)).fetchone():
-                        counter += 1
-                    slug = f'{slug}-{counter}'
-
-                # Insert
-                db.execute('''
-                    INSERT INTO brands (name, slug, domain, category, tier, emoji, brand_type, tagline, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                ''', (name, slug, domain, category, tier, emoji, brand_type, tagline))
+        # Spool to disk - never read the whole upload into memory
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
+        file.save(path)
 
-                imported += 1
+        target = brands_target(slug_from='name', strict=False, skip_existing_domains=False,
+                               defaults={'emoji': ''})
+        job = run_import(target, lambda: read_rows(path), total=estimate_rows(path),
+                         source=file.filename, on_finish=lambda: os.remove(path))
 
-            except Exception as e:
-                errors.append(f"Row {imported + skipped + 1}: {str(e)}")
-                skipped += 1
+        if job['status'] != 'completed':
+            flash(f"⏳ Importing {file.filename} in the background (job {job['job_id']}) - "
+                  f"progress at {url_for('api_import_job', job_id=job['job_id'])}", 'success')
+            return redirect(url_for('admin_domains'))
 
-        db.commit()
-        db.close()
+        imported = job['imported']
+        skipped = job['skipped'] + job['errors']
+        errors = job['error_samples']
 
         # Build success message
         msg = f'✅ Imported {imported} domains'
@@ -9373,6 +9204,17 @@ def admin_domains_import_csv():
         return redirect(url_for('admin_domains'))
 
 
+@app.route('/api/import-jobs/<job_id>')
+def api_import_job(job_id):
+    """Progress of a bulk import (bulk_import.py): status, processed, imported, skipped, errors"""
+    from bulk_import import get_import_job
+
+    job = get_import_job(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Import job not found'}), 404
+    return jsonify(dict(job, success=job['status'] != 'failed'))
+
+
 # ==================== DOMAIN VERIFICATION ====================
 
 @app.route('/admin/domains/verify/<int:brand_id>')
@@ -10092,10 +9934,14 @@ def api_gallery_chat():
         "answer": "AI response...",
         "model": "llama2"
     }
+
+    With "stream": true the answer streams as server-sent events (`done`
+    carries answer, model, ttft_ms and total_ms).
     """
     import urllib.request
     import urllib.error
     import json
+    from llm_stream import sse_response, wants_stream
 
     data = request.get_json() or {}
     slug = data.get('slug')
@@ -10141,7 +9987,11 @@ User: {question}"""
     from llm_router import LLMRouter
 
     router = LLMRouter()
-    result = router.call(prompt=prompt, timeout=30)
+    streaming = wants_stream(request)
+    if streaming:
+        result = router.stream(prompt=prompt, timeout=30)
+    else:
+        result = router.call(prompt=prompt, timeout=30)
 
     # Get user info for analytics
     user_ip = request.remote_addr
@@ -10154,6 +10004,23 @@ User: {question}"""
     elif 'Android' in user_agent:
         device_type = 'Android'
 
+    if result['success'] and streaming:
+        db.close()
+        model_used = result['model_used']
+
+        def save_chat(answer, summary):
+            # Save chat to database for analytics
+            conn = get_db()
+            conn.execute('''
+                INSERT INTO gallery_chats (gallery_slug, user_ip, device_type, question, answer, model)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (slug, user_ip, device_type, question, answer.strip(), model_used))
+            conn.commit()
+            conn.close()
+            return {'success': True, 'answer': answer.strip(), 'model': model_used, 'question': question}
+
+        return sse_response(result['stream'], on_complete=save_chat, meta={'model': model_used})
+
     if result['success']:
         answer = result['response']
         model_used = result['model_used']
@@ -15961,8 +15828,14 @@ def brand_builder_start():
 
 @app.route('/api/brand-builder/chat', methods=['POST'])
 def brand_builder_chat():
-    """Handle brand builder chat messages"""
-    from brand_builder import process_message
+    """
+    Handle brand builder chat messages
+
+    With "stream": true the final brand concept generation streams as
+    server-sent events (`done` carries the formatted response).
+    """
+    from brand_builder import process_message, stream_message
+    from llm_stream import sse_response, wants_stream
 
     data = request.get_json()
     session_id = data.get('session_id')
@@ -15972,7 +15845,14 @@ def brand_builder_chat():
         return jsonify({'success': False, 'error': 'Missing session_id or message'}), 400
 
     try:
-        response, options = process_message(session_id, user_message)
+        if wants_stream(request):
+            response, options, generation = stream_message(session_id, user_message)
+            if generation:
+                stream, finish = generation
+                return sse_response(stream, on_complete=lambda text, summary: {
+                    'success': True, 'response': finish(stream), 'options': None})
+        else:
+            response, options = process_message(session_id, user_message)
 
         return jsonify({
             'success': True,
@@ -16934,29 +16814,14 @@ def practice_submit_message(room_id):
 @app.route('/practice/room/<room_id>/qr.png')
 def practice_room_qr_download(room_id):
     """Download QR code as PNG image"""
-    import qrcode
+    import qr_service
     from io import BytesIO
 
     # Get full URL for room
     room_url = request.host_url.rstrip('/') + url_for('practice_room_view', room_id=room_id)
 
-    # Generate QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(room_url)
-    qr.make(fit=True)
-
-    # Create image
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Save to bytes
-    img_io = BytesIO()
-    img.save(img_io, 'PNG')
-    img_io.seek(0)
+    # Generate QR code (rooms are shared around, so the PNG is cached)
+    img_io = BytesIO(qr_service.png(room_url, ecc='L', version=1))
 
     return send_file(
         img_io,
@@ -17194,6 +17059,31 @@ def api_learn_answer():
     return jsonify(result)
 
 
+@app.route('/api/learn/answers', methods=['POST'])
+def api_learn_answers():
+    """
+    Submit a batch of card answers (mobile/offline clients)
+
+    POST {"session_id": 12, "reviews": [{"card_id": 1, "quality": 4, "reviewed_at": "2026-01-05T09:30:00Z"}, ...]}
+    """
+    user_id = session.get('user_id', 1)
+
+    from anki_learning_system import submit_reviews
+
+    data = request.get_json() or {}
+    reviews = data.get('reviews') or []
+
+    if any(r.get('card_id') is None or r.get('quality') is None for r in reviews):
+        return jsonify({'error': 'Every review needs card_id and quality'}), 400
+
+    try:
+        results = submit_reviews(user_id, reviews, data.get('session_id'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({'results': results})
+
+
 # ==============================================================================
 # INTERACTIVE LEARNING ONBOARDING - Calriven Chapters with Neural Network Building
 # ==============================================================================
@@ -17388,8 +17278,13 @@ User: {question}"""
 
     # Use LLM router for response
     from llm_router import LLMRouter
+    from llm_stream import sse_response, wants_stream
     router = LLMRouter()
-    result = router.call(prompt=prompt, timeout=30)
+    streaming = wants_stream(request)
+    if streaming:
+        result = router.stream(prompt=prompt, timeout=30)
+    else:
+        result = router.call(prompt=prompt, timeout=30)
 
     if not result['success']:
         return jsonify({
@@ -17397,17 +17292,28 @@ User: {question}"""
             'error': result['error']
         }), 503
 
-    answer = result['response']
     model_used = result['model_used']
 
+    def save_interaction(answer):
+        db = get_db()
+        db.execute('''
+            INSERT INTO chapter_interactions (user_id, chapter_number, question, answer, model_used, persona)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (user_id, chapter_num, question, answer, model_used, persona))
+        db.commit()
+        db.close()
+
+    if streaming:
+        def finish(text, summary):
+            save_interaction(text.strip())
+            return {'success': True, 'answer': text.strip(), 'model': model_used, 'persona': persona}
+
+        return sse_response(result['stream'], on_complete=finish, meta={'model': model_used, 'persona': persona})
+
+    answer = result['response']
+
     # Save interaction
-    db = get_db()
-    db.execute('''
-        INSERT INTO chapter_interactions (user_id, chapter_number, question, answer, model_used, persona)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', (user_id, chapter_num, question, answer, model_used, persona))
-    db.commit()
-    db.close()
+    save_interaction(answer)
 
     return jsonify({
         'success': True,
@@ -17920,14 +17826,25 @@ def serve_theme_css(domain):
     - All pages use: var(--brand-primary) etc.
 
     Example: /theme-soulfra.css → serves domains/soulfra/theme-soulfra.css
+
+    CSS is served from memory with a content-hash ETag; link it with
+    {{ theme_url('soulfra') }} (/theme-soulfra.css?v=<hash>) for immutable caching.
     """
-    domains_dir = Path(__file__).parent.parent / 'domains' / domain
-    theme_file = f'theme-{domain}.css'
+    from theme_compiler import get_theme_cache, respond_theme
+
+    document = get_theme_cache().get(domain)
 
-    if not (domains_dir / theme_file).exists():
+    if document is None:
         return f"Theme not found for domain: {domain}. Run: python theme_compiler.py --domain {domain}", 404
 
-    return send_from_directory(domains_dir, theme_file, mimetype='text/css')
+    return respond_theme(document, request.args.get('v'))
+
+
+@app.template_global('theme_url')
+def theme_url_global(domain):
+    """Versioned theme URL for templates"""
+    from theme_compiler import theme_url
+    return theme_url(domain)
 
 
 @app.route('/blog/<domain>/<path:filename>')
@@ -18035,14 +17952,14 @@ def read_template():
 @app.route('/api/templates/render', methods=['POST'])
 def render_formula_template():
     """Render a formula template with variables"""
-    from formula_engine import FormulaEngine
+    from formula_engine import get_engine
 
     data = request.get_json()
     template_content = data.get('template', '')
     variables = data.get('variables', {})
 
     try:
-        engine = FormulaEngine()
+        engine = get_engine()
         rendered = engine.render_template(
             template_source=template_content,
             variables=variables
@@ -18092,8 +18009,8 @@ def generate_with_ollama():
         variables['generated_content'] = generated_content
 
         # Render template
-        from formula_engine import FormulaEngine
-        engine = FormulaEngine()
+        from formula_engine import get_engine
+        engine = get_engine()
         rendered = engine.render_template(
             template_source=template,
             variables=variables
@@ -21280,8 +21197,11 @@ def cal_reasoning():
     """
     Cal's deep reasoning endpoint - called when legendary responses triggered
     Uses Ollama with soul document for authentic Soulfra personality
+
+    With "stream": true the reasoning streams as server-sent events.
     """
-    from ollama_soul import ask_ollama_with_soul
+    from ollama_soul import ask_ollama_with_soul, stream_ollama_with_soul
+    from llm_stream import sse_response, wants_stream
 
     data = request.get_json()
     user_message = data.get('message', '')
@@ -21303,6 +21223,16 @@ Your job: Cut through the excitement and give the REAL analysis. What's actually
 
 Be grumpy, be honest, be useful. No cheerleading - just truth."""
 
+    if wants_stream(request):
+        stream = stream_ollama_with_soul(cal_prompt, model='llama3.2:3b')
+        if stream is not None:
+            return sse_response(stream, meta={'cal_mood': 'grumpy but helpful'},
+                                on_complete=lambda text, summary: {
+                                    'response': text.strip(),
+                                    'cal_mood': 'grumpy but helpful',
+                                    'timestamp': datetime.now().isoformat()
+                                })
+
     # Call Ollama with soul document
     response = ask_ollama_with_soul(cal_prompt, model='llama3.2:3b')
 
@@ -21312,6 +21242,13 @@ Be grumpy, be honest, be useful. No cheerleading - just truth."""
         'timestamp': datetime.now().isoformat()
     })
 
+
+@app.route('/api/llm/stream-stats')
+def llm_stream_stats():
+    """Time-to-first-token vs total latency for streamed LLM responses (this worker)"""
+    from llm_stream import stream_stats
+    return jsonify(stream_stats())
+
 # =============================================================================
 # END CAL REASONING API
 # =============================================================================
@@ -23,9 +23,9 @@ Usage in app.py:
 
 from flask import session, request, redirect, url_for, g, jsonify
 from functools import wraps
-import jwt
 from typing import Optional, Dict
-from domain_config.domain_loader import get_domain_config, get_domain_by_hostname
+from domain_config.domain_loader import get_domain_config
+import auth_cache
 
 
 class AuthBridge:
@@ -83,7 +83,7 @@ class AuthBridge:
 
         # Detect current domain
         hostname = request.headers.get('Host', '').lower()
-        domain_config = get_domain_by_hostname(hostname)
+        domain_config = auth_cache.resolve_domain(hostname)
 
         if not domain_config:
             # Unknown domain, use dev mode default
@@ -155,14 +155,7 @@ class AuthBridge:
             return None
 
         master_user_id = self.get_master_user_id()
-
-        from database import get_db
-        db = get_db()
-
-        user = db.execute(
-            'SELECT * FROM soulfra_master_users WHERE id = ?',
-            (master_user_id,)
-        ).fetchone()
+        user = auth_cache.get_user('master', master_user_id, _load_master_user)
 
         if not user:
             return None
@@ -222,14 +215,11 @@ class AuthBridge:
             Decoded payload dict or None if invalid
         """
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
-            return payload
-        except jwt.ExpiredSignatureError:
-            print("⚠️  JWT token expired")
-            return None
-        except jwt.InvalidTokenError as e:
-            print(f"⚠️  Invalid JWT token: {e}")
-            return None
+            from soulfra_master_auth import session_token_active
+        except ImportError:
+            session_token_active = None
+
+        return auth_cache.verify_jwt(token, self.jwt_secret, self.jwt_algorithm, check=session_token_active)
 
     def require_auth(self, f):
         """
@@ -269,6 +259,20 @@ class AuthBridge:
         return decorated_function
 
 
+def _load_master_user(master_user_id) -> Optional[Dict]:
+    """Cold-path loader for auth_cache.get_user('master', ...)"""
+    from database import get_db
+    db = get_db()
+
+    user = db.execute(
+        'SELECT * FROM soulfra_master_users WHERE id = ?',
+        (master_user_id,)
+    ).fetchone()
+    db.close()
+
+    return dict(user) if user else None
+
+
 # Global instance (initialized in app.py)
 auth_bridge = None
 
@@ -309,7 +313,7 @@ def register_auth_bridge_routes(app):
 
         # Detect if this is Soulfra domain (provides auth)
         hostname = request.headers.get('Host', '').lower()
-        domain_config = get_domain_by_hostname(hostname)
+        domain_config = auth_cache.resolve_domain(hostname)
 
         if domain_config and domain_config.get('provides_auth'):
             # Render Soulfra login page
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Auth Cache - Fast-path session/token resolution shared by every auth system
+
+auth_bridge, soulfra_master_auth, soulfra_oauth, device_auth and qr_auth
+each used to hit SQLite on every request to decode/verify a token and load
+the user. This module keeps the verified results in-process so the warm
+path is pure memory:
+
+- Verified JWTs  -> decoded payload (TTL-bounded, never past token exp)
+- Opaque tokens  -> user/permission dicts (OAuth access tokens, device tokens)
+- Users          -> row dicts by (namespace, id)
+- Hostnames      -> domain config from domain_config/domains.yaml
+- NonceSet       -> exact in-memory set of used one-time QR nonces
+
+Invalidation:
+    revoke_token(token)       # logout of one session
+    revoke_user(user_id)      # logout everywhere - rejects tokens issued before now
+    invalidate_user(user_id)  # profile changed
+
+Revocations are kept in an ExpiringMap until the tokens they cover expire -
+never evicted early, so a flood of logouts can't bring a revoked token back.
+
+Caches are per-process. With several gunicorn workers a revocation made on
+one worker is seen by the others once their entry expires (TOKEN_TTL_SECONDS),
+because the cold path re-checks the database.
+
+Usage:
+    from auth_cache import verify_jwt, cached_lookup, resolve_domain
+
+    payload = verify_jwt(token, JWT_SECRET, check=_token_not_expired_in_db)
+    user = cached_lookup('oauth_token', access_token, _load_oauth_user)
+    domain_config = resolve_domain(request.headers.get('Host', ''))
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import jwt
+
+
+# Configuration
+TOKEN_TTL_SECONDS = 60          # How long a verified token skips the DB
+USER_TTL_SECONDS = 300
+DOMAIN_TTL_SECONDS = 600
+MAX_ENTRIES = 10000
+REVOCATION_TTL_SECONDS = 7 * 24 * 3600      # Longest token lifetime any auth system issues
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU dict whose entries expire after a TTL"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Return cached value (may be None) or default if missing/expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value; ttl_seconds overrides the cache default (never longer)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """Drop every entry for which predicate(key, value) is true"""
+        with self._lock:
+            for key in [k for k, (v, _) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+class ExpiringMap:
+    """
+    Thread-safe dict whose entries live until their own (wall-clock) expiry
+
+    Unlike TTLCache there is no size cap - an entry is only dropped once
+    expired. Expired entries are swept whenever the map has doubled since
+    the last sweep, so its size follows the live entries.
+    """
+
+    def __init__(self):
+        self._data: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self._sweep_at = 1024
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.time():
+            return default
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, expires_at: float):
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            if len(self._data) >= self._sweep_at:
+                now = time.time()
+                self._data = {k: entry for k, entry in self._data.items() if entry[1] > now}
+                self._sweep_at = max(1024, 2 * len(self._data))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sweep_at = 1024
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class NonceSet:
+    """
+    Exact set of used one-time nonces
+
+    Loaded from the database once (loader returns an iterable of nonces),
+    then kept current by add(). Exact rather than a bloom filter - a false
+    positive would reject a valid login. A replayed nonce is rejected from
+    memory; if confirm is given, a nonce not in the set is double-checked
+    with confirm(nonce) so nonces spent on another worker are still caught.
+    """
+
+    def __init__(self, loader: Callable[[], Any], confirm: Optional[Callable[[str], bool]] = None):
+        self._loader = loader
+        self._confirm = confirm
+        self._nonces = None
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._nonces is None:
+            with self._lock:
+                if self._nonces is None:
+                    try:
+                        self._nonces = set(self._loader())
+                    except Exception as e:
+                        print(f"⚠️  Could not load used nonces: {e}")
+                        self._nonces = set()
+
+    def __contains__(self, nonce: str) -> bool:
+        self._ensure_loaded()
+        if nonce in self._nonces:
+            return True
+        if self._confirm is not None and self._confirm(nonce):
+            self.add(nonce)
+            return True
+        return False
+
+    def add(self, nonce: str):
+        self._ensure_loaded()
+        with self._lock:
+            self._nonces.add(nonce)
+
+    def reset(self):
+        """Force a reload from the database on next use"""
+        with self._lock:
+            self._nonces = None
+
+
+# ==============================================================================
+# CACHES
+# ==============================================================================
+
+_tokens = TTLCache(TOKEN_TTL_SECONDS)      # (kind, token) -> payload/user dict
+_users = TTLCache(USER_TTL_SECONDS)        # (namespace, user_id) -> dict
+_domains = TTLCache(DOMAIN_TTL_SECONDS)    # hostname -> domain config (or None)
+
+_revoked_tokens = ExpiringMap()            # token -> True, until the token expires
+_user_revoked_at = ExpiringMap()           # user_id -> second of logout-everywhere, for one token lifetime
+
+
+def _token_expiry(token: str, payload: Optional[Dict] = None) -> float:
+    """When a token stops being valid anyway: its JWT exp, else the longest token lifetime"""
+    if payload is None:
+        try:
+            payload = jwt.decode(token, options={'verify_signature': False})
+        except jwt.InvalidTokenError:
+            payload = {}
+    exp = payload.get('exp') if isinstance(payload, dict) else None
+    return float(exp) if exp else time.time() + REVOCATION_TTL_SECONDS
+
+
+def _user_of(value) -> Optional[Hashable]:
+    if isinstance(value, dict):
+        for field in ('master_user_id', 'user_id', 'id'):
+            if value.get(field) is not None:
+                return value[field]
+    return None
+
+
+# ==============================================================================
+# TOKENS
+# ==============================================================================
+
+def verify_jwt(token: str, secret: str, algorithm: str = 'HS256',
+               check: Optional[Callable[[str, Dict], bool]] = None) -> Optional[Dict]:
+    """
+    Decode and verify a JWT, serving repeats from memory
+
+    Args:
+        token: Encoded JWT
+        secret: Signing secret
+        algorithm: JWT algorithm
+        check: Optional cold-path callback (token, payload) -> bool, e.g. a
+               database revocation check. Only runs on cache misses.
+
+    Returns:
+        Decoded payload or None if invalid/expired/revoked
+    """
+    if not token or _revoked_tokens.get(token, False):
+        return None
+
+    key = ('jwt', token)
+    payload = _tokens.get(key)
+    if payload is not _MISSING:
+        if payload.get('exp') and payload['exp'] <= time.time():
+            _tokens.pop(key)
+            return None
+        return payload
+
+    try:
+        payload = jwt.decode(token, secret, algorithms=[algorithm])
+    except jwt.ExpiredSignatureError:
+        print("⚠️  JWT token expired")
+        return None
+    except jwt.InvalidTokenError as e:
+        print(f"⚠️  Invalid JWT token: {e}")
+        return None
+
+    # Whole seconds like iat: a re-login in the second of the logout stays valid
+    revoked_at = _user_revoked_at.get(_user_of(payload))
+    if revoked_at is not None and payload.get('iat', 0) < revoked_at:
+        return None
+
+    if check is not None and not check(token, payload):
+        _revoked_tokens.set(token, True, _token_expiry(token, payload))
+        return None
+
+    ttl = payload['exp'] - time.time() if payload.get('exp') else None
+    _tokens.set(key, payload, ttl)
+    return payload
+
+
+def cached_lookup(kind: str, token: str, loader: Callable[[str], Optional[Dict]],
+                  ttl_seconds: Optional[float] = None) -> Optional[Dict]:
+    """
+    Resolve an opaque token (OAuth access token, device token, ...) to a dict
+
+    loader(token) runs on cache misses and may touch the database; a None
+    result is not cached so newly issued tokens work immediately.
+    """
+    if not token or _revoked_tokens.get(token, False):
+        return None
+
+    key = (kind, token)
+    value = _tokens.get(key)
+    if value is not _MISSING:
+        return value
+
+    value = loader(token)
+    if value is not None:
+        _tokens.set(key, value, ttl_seconds)
+    return value
+
+
+def get_user(namespace: str, user_id: Hashable, loader: Callable[[Hashable], Optional[Dict]]) -> Optional[Dict]:
+    """Load a user dict through the cache (loader runs on misses only)"""
+    if user_id is None:
+        return None
+
+    key = (namespace, user_id)
+    user = _users.get(key)
+    if user is not _MISSING:
+        return user
+
+    user = loader(user_id)
+    if user is not None:
+        _users.set(key, user)
+    return user
+
+
+def revoke_token(token: str):
+    """Reject this token from now on (logout of a single session)"""
+    if not token:
+        return
+    _revoked_tokens.set(token, True, _token_expiry(token))
+    _tokens.discard_where(lambda key, _: key[1] == token)
+
+
+def revoke_user(user_id: Hashable):
+    """Reject every token issued to user_id before the current second (logout everywhere)"""
+    if user_id is None:
+        return
+    now = int(time.time())
+    _user_revoked_at.set(user_id, now, now + REVOCATION_TTL_SECONDS)
+    _tokens.discard_where(lambda _, value: _user_of(value) == user_id)
+    invalidate_user(user_id)
+
+
+def invalidate_user(user_id: Hashable):
+    """Drop cached user rows for user_id in every namespace"""
+    _users.discard_where(lambda key, _: key[1] == user_id)
+
+
+# ==============================================================================
+# DOMAINS
+# ==============================================================================
+
+def resolve_domain(hostname: str) -> Optional[Dict]:
+    """Cached domain_config.get_domain_by_hostname (unknown hosts cached as None)"""
+    host = hostname.split(':')[0].lower()
+    config = _domains.get(host)
+    if config is not _MISSING:
+        return config
+
+    from domain_config.domain_loader import get_domain_by_hostname
+    config = get_domain_by_hostname(host)
+    _domains.set(host, config)
+    return config
+
+
+# ==============================================================================
+# STATS
+# ==============================================================================
+
+def get_cache_stats() -> Dict:
+    """Hit/miss counters for each cache"""
+    return {
+        'tokens': _tokens.stats(),
+        'users': _users.stats(),
+        'domains': _domains.stats(),
+        'revoked_tokens': len(_revoked_tokens),
+        'revoked_users': len(_user_revoked_at),
+    }
+
+
+def clear_all():
+    """Empty every cache (tests, config reload)"""
+    for cache in (_tokens, _users, _domains, _revoked_tokens):
+        cache.clear()
+    _user_revoked_at.clear()
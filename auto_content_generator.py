@@ -4,8 +4,12 @@ AI Workforce Content Generator - POC Version
 
 Reads pending tasks from ai_workforce_tasks and generates content using Ollama.
 
+--execute generates all pending tasks concurrently through the generation
+orchestrator: the shared writing requirements are evaluated once and every
+task's post continues from them, each saved as soon as it finishes.
+
 Usage:
-    python3 auto_content_generator.py --execute
+    python3 auto_content_generator.py --execute [--concurrency 4]
     python3 auto_content_generator.py --task-id 1
 """
 
@@ -15,9 +19,19 @@ import json
 import argparse
 from datetime import datetime
 
+from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
+
 DB_PATH = 'soulfra.db'
 OLLAMA_URL = 'http://192.168.1.87:11434/api/chat'
 OLLAMA_MODEL = 'soulfra-model'
+GENERATION_CONCURRENCY = 4
+
+POST_REQUIREMENTS = """- Write 400-600 words
+- Include an engaging introduction
+- Use clear headings and paragraphs
+- Be informative and helpful
+- Natural tone, not overly formal
+- Include the keywords naturally (don't force them)"""
 
 
 class AIContentGenerator:
@@ -52,18 +66,10 @@ class AIContentGenerator:
         print(f"   Prompt: {prompt[:100]}...")
 
         # Build full prompt with SEO keywords
-        keywords_str = ', '.join(keywords) if keywords else ''
-        full_prompt = f"""Write a blog post about: {prompt}
-
-Target keywords to include naturally: {keywords_str}
+        full_prompt = f"""{self._topic_prompt(prompt, keywords)}
 
 Requirements:
-- Write 400-600 words
-- Include an engaging introduction
-- Use clear headings and paragraphs
-- Be informative and helpful
-- Natural tone, not overly formal
-- Include the keywords naturally (don't force them)
+{POST_REQUIREMENTS}
 
 Write the blog post now:"""
 
@@ -98,6 +104,57 @@ Write the blog post now:"""
             print(f"   Make sure Ollama is running at {self.ollama_url}")
             return None
 
+    @staticmethod
+    def _topic_prompt(prompt, keywords):
+        """Task-specific part of the blog post prompt"""
+        keywords_str = ', '.join(keywords) if keywords else ''
+        return f"""Write a blog post about: {prompt}
+
+Target keywords to include naturally: {keywords_str}"""
+
+    @staticmethod
+    def _parse_keywords(task):
+        if not task['keywords_target']:
+            return []
+        try:
+            return json.loads(task['keywords_target'])
+        except json.JSONDecodeError:
+            return [task['keywords_target']]
+
+    def _set_status(self, task_ids, status):
+        self.db.executemany('''
+            UPDATE ai_workforce_tasks
+            SET status = ?
+            WHERE id = ?
+        ''', [(status, task_id) for task_id in task_ids])
+        self.db.commit()
+
+    def _complete_task(self, task, content):
+        """Title, slug and save generated content for a task"""
+        title = self.generate_title_from_prompt(task['prompt'])
+        slug = self.generate_slug_from_title(title)
+
+        print(f"\n📄 Generated Content:")
+        print(f"   Title: {title}")
+        print(f"   Slug: {slug}")
+        print(f"   Length: {len(content)} characters")
+        print(f"   Preview: {content[:200]}...")
+
+        # Update task with output
+        self.db.execute('''
+            UPDATE ai_workforce_tasks
+            SET status = 'completed',
+                output_content = ?,
+                output_title = ?,
+                output_slug = ?,
+                completed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (content, title, slug, task['id']))
+        self.db.commit()
+
+        print(f"\n✅ Task #{task['id']} completed!")
+        print(f"   Status: completed (ready for CringeProof review)")
+
     def generate_title_from_prompt(self, prompt):
         """Generate a clean title from the task prompt"""
         # Simple title generation (can enhance with Ollama later)
@@ -148,20 +205,10 @@ Write the blog post now:"""
         print(f"Prompt: {task['prompt']}")
 
         # Parse keywords
-        keywords = []
-        if task['keywords_target']:
-            try:
-                keywords = json.loads(task['keywords_target'])
-            except json.JSONDecodeError:
-                keywords = [task['keywords_target']]
+        keywords = self._parse_keywords(task)
 
         # Mark as in_progress
-        self.db.execute('''
-            UPDATE ai_workforce_tasks
-            SET status = 'in_progress'
-            WHERE id = ?
-        ''', (task_id,))
-        self.db.commit()
+        self._set_status([task_id], 'in_progress')
 
         # Generate content
         content = self.generate_content(task['prompt'], keywords)
@@ -169,56 +216,60 @@ Write the blog post now:"""
         if not content:
             print(f"❌ Content generation failed")
             # Revert to pending
-            self.db.execute('''
-                UPDATE ai_workforce_tasks
-                SET status = 'pending'
-                WHERE id = ?
-            ''', (task_id,))
-            self.db.commit()
+            self._set_status([task_id], 'pending')
             return False
 
-        # Generate title and slug
-        title = self.generate_title_from_prompt(task['prompt'])
-        slug = self.generate_slug_from_title(title)
-
-        print(f"\n📄 Generated Content:")
-        print(f"   Title: {title}")
-        print(f"   Slug: {slug}")
-        print(f"   Length: {len(content)} characters")
-        print(f"   Preview: {content[:200]}...")
-
-        # Update task with output
-        self.db.execute('''
-            UPDATE ai_workforce_tasks
-            SET status = 'completed',
-                output_content = ?,
-                output_title = ?,
-                output_slug = ?,
-                completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (content, title, slug, task_id))
-        self.db.commit()
-
-        print(f"\n✅ Task #{task_id} completed!")
-        print(f"   Status: completed (ready for CringeProof review)")
+        self._complete_task(task, content)
 
         return True
 
-    def execute_all_pending(self):
-        """Execute all pending tasks"""
-        tasks = self.get_pending_tasks()
+    def execute_all_pending(self, concurrency=GENERATION_CONCURRENCY):
+        """
+        Execute all pending tasks concurrently
+
+        The shared requirements are evaluated once; each task's post is
+        generated on top of them and saved as soon as it finishes. Failed
+        tasks go back to pending.
+        """
+        tasks = {task['id']: task for task in self.get_pending_tasks()}
 
         if not tasks:
             print("✅ No pending tasks found")
             return
 
-        print(f"\n🚀 Found {len(tasks)} pending task(s)")
+        print(f"\n🚀 Found {len(tasks)} pending task(s), generating {concurrency} at a time")
+
+        self._set_status(list(tasks), 'in_progress')
+
+        jobs = [GenerationJob(key=task_id,
+                              prompt=f"{self._topic_prompt(task['prompt'], self._parse_keywords(task))}\n\n"
+                                     f"Write the blog post now:")
+                for task_id, task in tasks.items()]
+        prefix = f"Every blog post you write must meet these requirements:\n{POST_REQUIREMENTS}"
+
+        def finished(result):
+            task = tasks[result.job_key]
+            if result.ok and result.text:
+                print(f"\n📝 Task #{task['id']} ({task['domain']}, {task['assigned_to_persona']}): "
+                      f"{result.seconds:.1f}s, {result.tokens_per_sec:.1f} tokens/sec")
+                self._complete_task(task, result.text)
+            else:
+                print(f"❌ Task #{task['id']} failed: {result.error or 'empty response'}")
+                self._set_status([task['id']], 'pending')
+
+        engine = GenerationOrchestrator(self.ollama_url, model=self.model,
+                                        concurrency=concurrency, timeout=120)
+        try:
+            engine.run([GenerationItem(key='pending', prefix=prefix, jobs=jobs)], on_result=finished)
+        finally:
+            # Anything not reached (e.g. interrupted) goes back to the queue
+            self.db.executemany('''
+                UPDATE ai_workforce_tasks SET status = 'pending'
+                WHERE id = ? AND status = 'in_progress'
+            ''', [(task_id,) for task_id in tasks])
+            self.db.commit()
 
-        for task in tasks:
-            success = self.execute_task(task['id'])
-            if not success:
-                print(f"⚠️  Skipping remaining tasks due to error")
-                break
+        print(f"\n{engine.report()}")
 
         print(f"\n{'='*80}")
         print("📊 Task Execution Summary")
@@ -247,6 +298,8 @@ def main():
                        help='Execute all pending tasks')
     parser.add_argument('--task-id', type=int,
                        help='Execute specific task by ID')
+    parser.add_argument('--concurrency', type=int, default=GENERATION_CONCURRENCY,
+                       help='Tasks generated at once with --execute')
     args = parser.parse_args()
 
     generator = AIContentGenerator()
@@ -255,7 +308,7 @@ def main():
         if args.task_id:
             generator.execute_task(args.task_id)
         elif args.execute:
-            generator.execute_all_pending()
+            generator.execute_all_pending(concurrency=args.concurrency)
         else:
             # Show pending tasks
             tasks = generator.get_pending_tasks()
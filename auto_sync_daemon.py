@@ -24,6 +24,8 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+from git_publisher import get_queue
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,6 +42,8 @@ DB_PATH = Path('./soulfra.db')
 SYNC_INTERVAL = 30  # seconds
 STATE_FILE = Path('./auto_sync_state.json')
 GITHUB_REPO_PATH = Path('/Users/matthewmauer/Desktop/soulfra.github.io')
+AUTO_PUSH = os.environ.get('AUTO_SYNC_PUSH') == '1'
+AUTO_PUSH_WINDOW = SYNC_INTERVAL * 4  # seconds - one commit per ~2 minutes of syncs
 
 class AutoSyncDaemon:
     def __init__(self):
@@ -205,8 +209,17 @@ class AutoSyncDaemon:
 
             logger.info(f"Changes detected:\n{result.stdout}")
 
-            # NOTE: We don't auto-push to GitHub yet
-            # User should manually review and push
+            if AUTO_PUSH:
+                # Batched: syncs inside one publish window share a commit/push
+                synced = [entry.name for entry in Path(__file__).parent.joinpath('output').iterdir()]
+                get_queue(GITHUB_REPO_PATH, window=AUTO_PUSH_WINDOW).submit(
+                    synced, f"Auto-sync: {datetime.now().isoformat()}"
+                )
+                logger.info(f"📤 Queued {len(synced)} paths for the next publish window")
+                return True
+
+            # NOTE: Auto-push is opt-in (AUTO_SYNC_PUSH=1)
+            # By default the user reviews and pushes manually
             logger.info("⚠️  Changes ready to commit. Run manually:")
             logger.info(f"    cd {GITHUB_REPO_PATH}")
             logger.info(f"    git add .")
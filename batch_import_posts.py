@@ -7,7 +7,11 @@ Import blog posts in bulk from spreadsheets. Supports:
 - Excel files (.xlsx, .xls)
 - Column mapping (Excel columns → database fields)
 - Data validation
-- Progress tracking
+- Progress tracking (import job ID, see bulk_import.py)
+
+Files are streamed and imported in chunks of --chunk-size rows per
+transaction, with slugs made unique in bulk (title-1, title-2, ...), so
+large spreadsheets import in bounded memory. Excel needs openpyxl.
 
 Usage:
     # Preview first 5 rows
@@ -23,6 +27,9 @@ Usage:
     # Import to specific brand
     python3 batch_import_posts.py --file posts.csv --import --brand deathtodata
 
+    # Large files: bigger transactions
+    python3 batch_import_posts.py --file posts.csv --import --chunk-size 20000
+
 Excel/CSV Format:
     title               | content              | brand_slug  | tags                | published_date
     Privacy 101         | Your guide to...     | deathtodata | privacy,encryption  | 2025-01-15
@@ -30,20 +37,12 @@ Excel/CSV Format:
 """
 
 import argparse
-import sqlite3
-import csv
 import sys
-from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Optional
-
-# Try to import pandas for Excel support
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    print("⚠️  pandas not installed. Excel support disabled. Run: pip install pandas openpyxl")
+from typing import Dict, Iterable, Iterator, Optional
+
+from bulk_import import (DEFAULT_CHUNK_SIZE, BulkImporter, ImportTarget, RowError, clean,
+                         estimate_rows, parse_timestamp, read_rows, slugify)
+from database import get_db
 
 # Default column mapping (Excel column name → database field)
 DEFAULT_MAPPING = {
@@ -57,145 +56,143 @@ DEFAULT_MAPPING = {
     'excerpt': 'excerpt'
 }
 
-def load_file(file_path: str) -> pd.DataFrame:
-    """Load CSV or Excel file into pandas DataFrame"""
-
-    if not PANDAS_AVAILABLE:
-        raise ImportError("pandas not installed. Run: pip install pandas openpyxl")
-
-    file_path = Path(file_path)
+REQUIRED_FIELDS = ['title', 'content']
+POST_COLUMNS = ['user_id', 'title', 'slug', 'content', 'excerpt', 'published_at', 'brand_id']
 
-    if not file_path.exists():
-        raise FileNotFoundError(f"File not found: {file_path}")
+def load_file(file_path: str) -> Iterator[Dict]:
+    """Stream rows from a CSV or Excel file (keys are lowercased column names)"""
 
-    # Detect file type and load
-    if file_path.suffix.lower() == '.csv':
-        df = pd.read_csv(file_path)
-        print(f"✓ Loaded CSV file: {len(df)} rows")
+    return read_rows(file_path)
 
-    elif file_path.suffix.lower() in ['.xlsx', '.xls']:
-        df = pd.read_excel(file_path)
-        print(f"✓ Loaded Excel file: {len(df)} rows")
-
-    else:
-        raise ValueError(f"Unsupported file type: {file_path.suffix}. Use .csv, .xlsx, or .xls")
-
-    return df
-
-def preview_data(df: pd.DataFrame, num_rows: int = 5):
+def preview_data(rows: Iterable[Dict], num_rows: int = 5):
     """Preview first N rows of data"""
 
     print(f"\n{'='*80}")
     print(f"PREVIEW (first {num_rows} rows)")
     print(f"{'='*80}\n")
 
-    print(f"Columns found: {', '.join(df.columns.tolist())}")
-    print(f"Total rows: {len(df)}\n")
-
-    # Show first N rows
-    preview = df.head(num_rows)
-
-    for idx, row in preview.iterrows():
+    for idx, row in enumerate(rows):
+        if idx >= num_rows:
+            break
+        if idx == 0:
+            print(f"Columns found: {', '.join(row.keys())}\n")
         print(f"Row {idx + 1}:")
-        for col in df.columns:
-            value = str(row[col])[:60]  # Truncate long values
-            print(f"  {col}: {value}")
+        for col, value in row.items():
+            print(f"  {col}: {clean(value)[:60]}")  # Truncate long values
         print()
 
-def map_columns(df: pd.DataFrame, custom_mapping: Optional[Dict] = None) -> pd.DataFrame:
-    """Map Excel columns to database fields"""
+def build_mapping(custom_mapping: Optional[Dict] = None) -> Dict:
+    """Column mapping (lowercased Excel column → database field)"""
 
     mapping = DEFAULT_MAPPING.copy()
 
     if custom_mapping:
-        mapping.update(custom_mapping)
+        mapping.update({col.strip().lower(): field for col, field in custom_mapping.items()})
 
-    # Normalize column names (lowercase, strip whitespace)
-    df.columns = df.columns.str.strip().str.lower()
+    return mapping
 
-    # Create mapped dataframe
-    mapped_df = pd.DataFrame()
+def map_columns(rows: Iterable[Dict], custom_mapping: Optional[Dict] = None) -> Iterator[Dict]:
+    """Map Excel columns to database fields, row by row (checks required fields on the header)"""
 
-    for excel_col, db_field in mapping.items():
-        if excel_col.lower() in df.columns:
-            mapped_df[db_field] = df[excel_col.lower()]
+    mapping = build_mapping(custom_mapping)
 
-    # Check required fields
-    required_fields = ['title', 'content']
-    missing_fields = [f for f in required_fields if f not in mapped_df.columns]
+    for idx, row in enumerate(rows):
+        mapped = {db_field: row[col] for col, db_field in mapping.items() if col in row}
+
+        if idx == 0:
+            missing_fields = [f for f in REQUIRED_FIELDS if f not in mapped]
+            if missing_fields:
+                raise ValueError(f"Missing required fields: {missing_fields}")
 
-    if missing_fields:
-        raise ValueError(f"Missing required fields: {missing_fields}")
+        yield mapped
 
-    return mapped_df
+def load_brand_ids(db) -> Dict[str, int]:
+    """Brand slug → ID for every brand (looked up once per import)"""
+
+    try:
+        return {row['slug']: row['id'] for row in db.execute('SELECT id, slug FROM brands')}
+    except Exception:
+        return {}
 
 def get_brand_id(brand_slug: str) -> Optional[int]:
     """Get brand ID from slug"""
 
-    conn = sqlite3.connect('soulfra.db')
-    cursor = conn.cursor()
-
-    cursor.execute("SELECT id FROM brands WHERE slug = ?", (brand_slug,))
-    result = cursor.fetchone()
-    conn.close()
+    db = get_db()
+    result = db.execute("SELECT id FROM brands WHERE slug = ?", (brand_slug,)).fetchone()
+    db.close()
 
     return result[0] if result else None
 
 def create_slug(title: str) -> str:
-    """Generate URL slug from title"""
-
-    import re
-
-    # Lowercase, replace spaces with hyphens, remove special chars
-    slug = title.lower()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    slug = slug.strip('-')
+    """Generate URL slug from title (the importer makes it unique: slug-1, slug-2, ...)"""
 
-    # Add timestamp to ensure uniqueness
-    slug = f"{slug}-{int(datetime.now().timestamp())}"
+    return slugify(title) or 'post'
 
-    return slug[:100]  # Limit length
-
-def validate_row(row: Dict, row_num: int) -> Optional[str]:
+def validate_row(row: Dict, brand_ids: Dict[str, int]) -> Optional[str]:
     """Validate a row of data. Returns error message if invalid, None if valid"""
 
     # Check required fields
-    if not row.get('title'):
-        return f"Row {row_num}: Missing title"
+    if not clean(row.get('title')):
+        return "Missing title"
 
-    if not row.get('content'):
-        return f"Row {row_num}: Missing content"
+    if not clean(row.get('content')):
+        return "Missing content"
 
     # Check title length
-    if len(row['title']) > 200:
-        return f"Row {row_num}: Title too long (max 200 characters)"
+    if len(clean(row['title'])) > 200:
+        return "Title too long (max 200 characters)"
 
     # Check brand exists (if specified)
-    if row.get('brand_slug'):
-        brand_id = get_brand_id(row['brand_slug'])
-        if not brand_id:
-            return f"Row {row_num}: Brand not found: {row['brand_slug']}"
+    brand_slug = clean(row.get('brand_slug'))
+    if brand_slug and brand_slug not in brand_ids:
+        return f"Brand not found: {brand_slug}"
 
     return None
 
-def import_posts(df: pd.DataFrame, default_brand: str = None, dry_run: bool = False) -> Dict:
+def posts_target(default_brand_id: Optional[int] = None, user_id: int = 1) -> ImportTarget:
+    """Import target for posts (default admin user, default brand if the row has none)"""
+
+    def prepare(row: Dict, brand_ids: Dict) -> Dict:
+        error = validate_row(row, brand_ids)
+        if error:
+            raise RowError(error)
+
+        title = clean(row['title'])
+        content = clean(row['content'])
+        brand_slug = clean(row.get('brand_slug'))
+
+        # Excerpt: generated from content (first 150 chars) if missing
+        excerpt = clean(row.get('excerpt'))
+        if not excerpt:
+            excerpt = content[:150] + '...' if len(content) > 150 else content
+
+        return {
+            'user_id': user_id,
+            'title': title,
+            'slug': create_slug(title),
+            'content': content,
+            'excerpt': excerpt,
+            'published_at': parse_timestamp(row.get('published_at')),
+            'brand_id': brand_ids[brand_slug] if brand_slug else default_brand_id,
+        }
+
+    return ImportTarget(name='posts', table='posts', columns=POST_COLUMNS, prepare=prepare,
+                        slug_column='slug', load_lookups=load_brand_ids)
+
+def import_posts(rows: Iterable[Dict], default_brand: str = None, dry_run: bool = False,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, total: Optional[int] = None, source: str = '') -> Dict:
     """
-    Import posts from DataFrame into database
+    Import posts from mapped rows into database
 
     Args:
-        df: Pandas DataFrame with mapped columns
+        rows: Rows with mapped columns (see map_columns), consumed in chunks
         default_brand: Default brand slug if not specified in data
         dry_run: If True, validate only without inserting
 
     Returns:
-        Dict with success/error statistics
+        Dict with success/error statistics and the import job ID
     """
 
-    conn = sqlite3.connect('soulfra.db')
-    cursor = conn.cursor()
-
     # Get default brand ID
     default_brand_id = None
     if default_brand:
@@ -203,104 +200,37 @@ def import_posts(df: pd.DataFrame, default_brand: str = None, dry_run: bool = Fa
         if not default_brand_id:
             raise ValueError(f"Default brand not found: {default_brand}")
 
-    stats = {
-        'total': len(df),
-        'success': 0,
-        'errors': 0,
-        'skipped': 0,
-        'error_messages': []
-    }
-
     print(f"\n{'='*80}")
-    print(f"IMPORTING {len(df)} POSTS")
+    print(f"IMPORTING POSTS" + (f" (~{total} rows)" if total else ''))
     if dry_run:
         print("(DRY RUN - No actual changes will be made)")
     print(f"{'='*80}\n")
 
-    for idx, row in df.iterrows():
-        row_num = idx + 1
-        row_dict = row.to_dict()
+    def progress(stats):
+        print(f"  … {stats['processed']} rows, {stats['imported']} imported, {stats['errors']} errors")
 
-        # Validate row
-        error = validate_row(row_dict, row_num)
-        if error:
-            stats['errors'] += 1
-            stats['error_messages'].append(error)
-            print(f"✗ {error}")
-            continue
-
-        # Prepare data
-        title = row_dict['title']
-        content = row_dict['content']
-        slug = create_slug(title)
-
-        # Get brand ID
-        brand_id = default_brand_id
-        if row_dict.get('brand_slug'):
-            brand_id = get_brand_id(row_dict['brand_slug'])
-
-        # Published date
-        published_at = row_dict.get('published_at')
-        if not published_at:
-            published_at = datetime.now().isoformat()
-        elif isinstance(published_at, str):
-            # Try to parse date string
-            try:
-                dt = datetime.fromisoformat(published_at)
-                published_at = dt.isoformat()
-            except:
-                published_at = datetime.now().isoformat()
-
-        # Excerpt
-        excerpt = row_dict.get('excerpt')
-        if not excerpt:
-            # Generate from content (first 150 chars)
-            excerpt = content[:150] + '...' if len(content) > 150 else content
+    importer = BulkImporter(posts_target(default_brand_id), chunk_size=chunk_size, dry_run=dry_run,
+                            on_progress=progress)
+    job = importer.run(rows, total=total, source=source)
 
-        if dry_run:
-            print(f"✓ Row {row_num}: Would import '{title}' → /post/{slug}")
-            stats['success'] += 1
-            continue
-
-        # Insert into database
-        try:
-            cursor.execute("""
-                INSERT INTO posts (user_id, title, slug, content, excerpt, published_at, brand_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                1,  # Default admin user
-                title,
-                slug,
-                content,
-                excerpt,
-                published_at,
-                brand_id
-            ))
-
-            post_id = cursor.lastrowid
-            stats['success'] += 1
-
-            print(f"✓ Row {row_num}: Imported '{title}' → post #{post_id}")
-
-        except Exception as e:
-            stats['errors'] += 1
-            error_msg = f"Row {row_num}: Database error: {str(e)}"
-            stats['error_messages'].append(error_msg)
-            print(f"✗ {error_msg}")
-
-    if not dry_run:
-        conn.commit()
-
-    conn.close()
+    stats = {
+        'job_id': job['job_id'],
+        'total': job['processed'],
+        'success': job['imported'],
+        'errors': job['errors'],
+        'skipped': job['skipped'],
+        'error_messages': job['error_samples']
+    }
 
     # Print summary
     print(f"\n{'='*80}")
-    print(f"IMPORT COMPLETE")
+    print(f"IMPORT COMPLETE (job {stats['job_id']})")
     print(f"{'='*80}")
     print(f"Total rows: {stats['total']}")
     print(f"✓ Success: {stats['success']}")
     print(f"✗ Errors: {stats['errors']}")
     print(f"⊘ Skipped: {stats['skipped']}")
+    print(importer.report())
 
     if stats['error_messages']:
         print(f"\nErrors:")
@@ -331,16 +261,17 @@ def main():
     parser.add_argument('--brand', help='Default brand slug for posts')
     parser.add_argument('--mapping', help='Custom column mapping (e.g., "Title=title,Content=content")')
     parser.add_argument('--dry-run', action='store_true', help='Validate without actually importing')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per transaction')
 
     args = parser.parse_args()
 
     try:
-        # Load file
-        df = load_file(args.file)
+        # Load file (streamed - rows are read chunk by chunk during the import)
+        rows = load_file(args.file)
 
         # Preview mode
         if args.preview:
-            preview_data(df)
+            preview_data(rows)
             print("\n💡 To import, run with --import flag")
             return 0
 
@@ -351,12 +282,12 @@ def main():
             print(f"Using custom mapping: {custom_mapping}")
 
         # Map columns
-        mapped_df = map_columns(df, custom_mapping)
-        print(f"✓ Mapped {len(mapped_df.columns)} columns: {', '.join(mapped_df.columns)}")
+        mapped_rows = map_columns(rows, custom_mapping)
 
         # Import mode
         if args.do_import:
-            stats = import_posts(mapped_df, default_brand=args.brand, dry_run=args.dry_run)
+            stats = import_posts(mapped_rows, default_brand=args.brand, dry_run=args.dry_run,
+                                 chunk_size=args.chunk_size, total=estimate_rows(args.file), source=args.file)
 
             if stats['errors'] > 0:
                 return 1
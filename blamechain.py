@@ -8,15 +8,112 @@ Use cases:
 - Tribunal evidence (Kangaroo Court examines edit history)
 - User accountability (can't hide what they originally said)
 - 3-way AI argument tracking (CalRiven/Soulfra/DeathToData debate history)
+
+Verification replays a chain from its last signed checkpoint (an HMAC over
+message, version and chain hash, written every CHECKPOINT_INTERVAL verified
+versions), so checking a message costs O(versions since checkpoint).
+blamechain_heads caches each message's latest link for new edits.
+
+Each verification has a status: 'verified', 'tampered' (a content hash,
+chain hash or link doesn't match), 'checkpoint_mismatch' (a signed
+checkpoint no longer matches its row) or 'legacy'. Versions written before
+edited_at stored the exact hashed timestamp can't have their chain hash
+recomputed; a chain whose only failures are such leading versions, with
+intact content hashes and links, is legacy - unverifiable, not tampered.
+
+Usage:
+    python3 blamechain.py --audit              # All chains, from checkpoints
+    python3 blamechain.py --audit --full       # Replay every chain from version 1
 """
 
 import hashlib
+import hmac
+import json
+import os
+import re
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 from flask import Blueprint, jsonify, request, session, g
 
+from schema_registry import register_migration
+
 blamechain_bp = Blueprint('blamechain', __name__)
 
+ALLOWED_TABLES = ['messages', 'irc_messages', 'dm_messages', 'qr_chat_transcripts']
+CHECKPOINT_INTERVAL = 32        # Sign a checkpoint once this many new versions verify
+AUDIT_BATCH = 2000              # Chains per audit work unit
+
+# edited_at as the old column default wrote it (CURRENT_TIMESTAMP), not the hashed isoformat
+_LEGACY_EDITED_AT = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+# Head cache + signed checkpoints + audit log; pending until message_history
+# (add_blamechain.sql, version 100) exists
+CHECKPOINT_SCHEMA = [
+    'SELECT message_table, message_id, version_number, chain_hash FROM message_history LIMIT 0',
+    '''
+    CREATE TABLE IF NOT EXISTS blamechain_heads (
+        message_table TEXT NOT NULL,
+        message_id INTEGER NOT NULL,
+        version_number INTEGER NOT NULL,
+        chain_hash TEXT NOT NULL,
+        PRIMARY KEY (message_table, message_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS blamechain_checkpoints (
+        message_table TEXT NOT NULL,
+        message_id INTEGER NOT NULL,
+        version_number INTEGER NOT NULL,
+        chain_hash TEXT NOT NULL,
+        signature TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (message_table, message_id, version_number)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS blamechain_audits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at TIMESTAMP NOT NULL,
+        finished_at TIMESTAMP,
+        full_replay BOOLEAN DEFAULT 0,
+        chains_checked INTEGER DEFAULT 0,
+        versions_replayed INTEGER DEFAULT 0,
+        invalid_chains INTEGER DEFAULT 0,
+        invalid_json TEXT,
+        legacy_chains INTEGER DEFAULT 0
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_message_history_head
+    AFTER INSERT ON message_history
+    BEGIN
+        INSERT INTO blamechain_heads (message_table, message_id, version_number, chain_hash)
+        VALUES (NEW.message_table, NEW.message_id, NEW.version_number, NEW.chain_hash)
+        ON CONFLICT (message_table, message_id) DO UPDATE SET
+            version_number = excluded.version_number,
+            chain_hash = excluded.chain_hash
+        WHERE excluded.version_number > blamechain_heads.version_number;
+    END
+    ''',
+    '''
+    INSERT OR REPLACE INTO blamechain_heads (message_table, message_id, version_number, chain_hash)
+    SELECT message_table, message_id, MAX(version_number), chain_hash
+    FROM message_history
+    GROUP BY message_table, message_id
+    ''',
+]
+
+# Audits recorded before legacy chains were told apart from tampered ones
+AUDIT_LEGACY_SCHEMA = [
+    'ALTER TABLE blamechain_audits ADD COLUMN legacy_chains INTEGER DEFAULT 0',
+]
+
+register_migration(108, 'blamechain checkpoints', *CHECKPOINT_SCHEMA, module='blamechain')
+register_migration(130, 'blamechain audits: legacy chains', *AUDIT_LEGACY_SCHEMA, module='blamechain',
+                   depends_on=(108,))
+
 
 def get_db():
     """Get database connection from Flask g object"""
@@ -42,6 +139,308 @@ def compute_chain_hash(previous_hash, content_hash, timestamp):
     return hashlib.sha256(chain_input.encode('utf-8')).hexdigest()
 
 
+# ==============================================================================
+# CHECKPOINTS + VERIFICATION
+# ==============================================================================
+
+def _checkpoint_key() -> bytes:
+    key = os.environ.get('BLAMECHAIN_CHECKPOINT_KEY')
+    if not key:
+        from config import SECRET_KEY
+        key = SECRET_KEY
+    return key.encode('utf-8')
+
+
+def sign_checkpoint(message_table, message_id, version_number, chain_hash, key: Optional[bytes] = None) -> str:
+    payload = f"{message_table}:{message_id}:{version_number}:{chain_hash}".encode('utf-8')
+    return hmac.new(key or _checkpoint_key(), payload, hashlib.sha256).hexdigest()
+
+
+def _replay(rows, previous_hash: Optional[str], from_genesis: bool) -> Tuple[bool, List[Dict]]:
+    """Recompute content/chain hashes and links for consecutive history rows"""
+    results = []
+    chain_valid = True
+
+    legacy_prefix = from_genesis
+
+    for i, row in enumerate(rows):
+        # Verify content hash
+        content_hash_valid = (compute_content_hash(row['content']) == row['content_hash'])
+
+        # Verify chain hash
+        expected_chain_hash = compute_chain_hash(row['previous_hash'], row['content_hash'], row['edited_at'])
+        chain_hash_valid = (expected_chain_hash == row['chain_hash'])
+
+        # Verify previous hash links correctly (first version has none)
+        if i == 0 and from_genesis:
+            previous_hash_valid = (row['previous_hash'] is None)
+        else:
+            previous_hash_valid = (row['previous_hash'] == previous_hash)
+
+        version_valid = content_hash_valid and chain_hash_valid and previous_hash_valid
+        chain_valid = chain_valid and version_valid
+        previous_hash = row['chain_hash']
+
+        # Only the versions before the first exactly-timestamped one can be legacy
+        legacy_prefix = legacy_prefix and bool(_LEGACY_EDITED_AT.match(str(row['edited_at'])))
+        results.append({
+            'version': row['version_number'],
+            'content_hash_valid': content_hash_valid,
+            'chain_hash_valid': chain_hash_valid,
+            'previous_hash_valid': previous_hash_valid,
+            'version_valid': version_valid,
+            'legacy': legacy_prefix and not chain_hash_valid and content_hash_valid and previous_hash_valid,
+            'chain_hash': row['chain_hash']
+        })
+
+    return chain_valid, results
+
+
+def _chain_status(chain_valid: bool, results: List[Dict]) -> str:
+    """'verified', 'legacy' (only pre-fix chain hashes fail) or 'tampered'"""
+    if chain_valid:
+        return 'verified'
+    if all(r['version_valid'] or r['legacy'] for r in results):
+        return 'legacy'
+    return 'tampered'
+
+
+def _latest_checkpoint(db, message_table, message_id, key: bytes) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Newest checkpoint whose signature checks out
+
+    Returns (checkpoint, problem). A forged signature is ignored (full
+    replay); a history row that no longer matches its signed checkpoint
+    is reported as tampering.
+    """
+    try:
+        checkpoint = db.execute('''
+            SELECT version_number, chain_hash, signature
+            FROM blamechain_checkpoints
+            WHERE message_table = ? AND message_id = ?
+            ORDER BY version_number DESC
+            LIMIT 1
+        ''', (message_table, message_id)).fetchone()
+    except sqlite3.OperationalError:
+        return None, None       # Checkpoint tables not migrated yet
+
+    if not checkpoint:
+        return None, None
+
+    expected = sign_checkpoint(message_table, message_id, checkpoint['version_number'], checkpoint['chain_hash'], key)
+    if not hmac.compare_digest(expected, checkpoint['signature']):
+        return None, None
+
+    row = db.execute('''
+        SELECT chain_hash FROM message_history
+        WHERE message_table = ? AND message_id = ? AND version_number = ?
+    ''', (message_table, message_id, checkpoint['version_number'])).fetchone()
+    if not row or row['chain_hash'] != checkpoint['chain_hash']:
+        return dict(checkpoint), 'checkpointed version was modified'
+
+    return dict(checkpoint), None
+
+
+def verify_message_chain(db, message_table, message_id, full: bool = False,
+                         record: bool = True, key: Optional[bytes] = None) -> Optional[Dict]:
+    """
+    Verify one message's chain from its last trusted checkpoint
+
+    Args:
+        full: Ignore checkpoints and replay from version 1
+        record: Sign a new checkpoint if enough new versions verified
+
+    Returns:
+        Verification dict, or None if the message has no history
+    """
+    key = key or _checkpoint_key()
+    checkpoint, problem = (None, None) if full else _latest_checkpoint(db, message_table, message_id, key)
+
+    if problem:
+        return {
+            'chain_valid': False,
+            'status': 'checkpoint_mismatch',
+            'error': problem,
+            'checkpoint_version': checkpoint['version_number'],
+            'total_versions': checkpoint['version_number'],
+            'versions_replayed': 0,
+            'verification': []
+        }
+
+    since = checkpoint['version_number'] if checkpoint else 0
+    rows = db.execute('''
+        SELECT version_number, content, content_hash, previous_hash, chain_hash, edited_at
+        FROM message_history
+        WHERE message_table = ? AND message_id = ? AND version_number > ?
+        ORDER BY version_number ASC
+    ''', (message_table, message_id, since)).fetchall()
+
+    if not rows and not checkpoint:
+        return None
+
+    chain_valid, results = _replay(rows, checkpoint['chain_hash'] if checkpoint else None, checkpoint is None)
+    head = rows[-1] if rows else None
+
+    if record and chain_valid and head and head['version_number'] - since >= CHECKPOINT_INTERVAL:
+        _write_checkpoints(db, [(message_table, message_id, head['version_number'], head['chain_hash'])], key)
+        db.commit()
+
+    return {
+        'chain_valid': chain_valid,
+        'status': _chain_status(chain_valid, results),
+        'checkpoint_version': since or None,
+        'total_versions': head['version_number'] if head else since,
+        'versions_replayed': len(rows),
+        'verification': results
+    }
+
+
+def _write_checkpoints(db, checkpoints: Iterable[Tuple], key: bytes):
+    db.executemany('''
+        INSERT OR REPLACE INTO blamechain_checkpoints
+        (message_table, message_id, version_number, chain_hash, signature)
+        VALUES (?, ?, ?, ?, ?)
+    ''', [(t, m, v, h, sign_checkpoint(t, m, v, h, key)) for t, m, v, h in checkpoints])
+
+
+# ==============================================================================
+# EDIT INGESTION
+# ==============================================================================
+
+def _chunks(items: List, size: int = 500):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _load_heads(db, keys: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], Dict]:
+    """{(table, message_id): {'version_number', 'chain_hash'}} in one query per table chunk"""
+    by_table: Dict[str, List[int]] = {}
+    for table, message_id in keys:
+        by_table.setdefault(table, []).append(message_id)
+
+    heads = {}
+    for table, ids in by_table.items():
+        for chunk in _chunks(ids):
+            placeholders = ','.join('?' * len(chunk))
+            try:
+                rows = db.execute(f'''
+                    SELECT message_id, version_number, chain_hash FROM blamechain_heads
+                    WHERE message_table = ? AND message_id IN ({placeholders})
+                ''', (table, *chunk)).fetchall()
+            except sqlite3.OperationalError:
+                # Heads cache not migrated yet - newest row per message
+                rows = db.execute(f'''
+                    SELECT message_id, MAX(version_number) AS version_number, chain_hash
+                    FROM message_history
+                    WHERE message_table = ? AND message_id IN ({placeholders})
+                    GROUP BY message_id
+                ''', (table, *chunk)).fetchall()
+            for row in rows:
+                heads[(table, row['message_id'])] = {'version_number': row['version_number'],
+                                                      'chain_hash': row['chain_hash']}
+    return heads
+
+
+def _load_originals(db, keys: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], Dict]:
+    by_table: Dict[str, List[int]] = {}
+    for table, message_id in keys:
+        by_table.setdefault(table, []).append(message_id)
+
+    originals = {}
+    for table, ids in by_table.items():
+        for chunk in _chunks(ids):
+            placeholders = ','.join('?' * len(chunk))
+            for row in db.execute(f'SELECT id, content, from_user_id FROM {table} WHERE id IN ({placeholders})',
+                                  chunk).fetchall():
+                originals[(table, row['id'])] = dict(row)
+    return originals
+
+
+def append_edits(db, edits: List[Dict], editor_platform: str = 'unknown') -> List[Dict]:
+    """
+    Record a batch of edits in the blamechain
+
+    Heads for every touched message are read in one query per table, links
+    are computed in memory, and history rows / message updates are written
+    with executemany. The caller commits.
+
+    Args:
+        edits: [{'message_table', 'message_id', 'new_content', 'user_id', 'edit_reason'}]
+            in the order they happened
+
+    Returns:
+        One result per edit: {'message_id', 'version', 'chain_hash', 'previous_hash', 'edited_at'}
+
+    Raises:
+        LookupError: an edited message has no history and doesn't exist
+    """
+    keys = list(dict.fromkeys((e['message_table'], e['message_id']) for e in edits))
+    heads = _load_heads(db, keys)
+    originals = _load_originals(db, [k for k in keys if k not in heads])
+
+    history_rows = []
+    message_updates: Dict[Tuple[str, int], List] = {}
+    results = []
+
+    for edit in edits:
+        key = (edit['message_table'], edit['message_id'])
+        timestamp = datetime.now().isoformat()
+
+        if key not in heads:
+            # No history exists - record the original message as version 1 first
+            original = originals.get(key)
+            if not original:
+                raise LookupError(f"Message not found: {key[0]}/{key[1]}")
+
+            original_hash = compute_content_hash(original['content'])
+            original_chain_hash = compute_chain_hash(None, original_hash, timestamp)
+            history_rows.append((key[1], key[0], 1, original['content'], original['from_user_id'], None,
+                                 original_hash, None, original_chain_hash, timestamp, None))
+            heads[key] = {'version_number': 1, 'chain_hash': original_chain_hash}
+
+        latest = heads[key]
+        new_version = latest['version_number'] + 1
+        new_content_hash = compute_content_hash(edit['new_content'])
+        new_chain_hash = compute_chain_hash(latest['chain_hash'], new_content_hash, timestamp)
+
+        history_rows.append((key[1], key[0], new_version, edit['new_content'], edit['user_id'],
+                             edit.get('edit_reason'), new_content_hash, latest['chain_hash'], new_chain_hash,
+                             timestamp, editor_platform))
+        heads[key] = {'version_number': new_version, 'chain_hash': new_chain_hash}
+
+        update = message_updates.setdefault(key, [None, 0, None])
+        update[0], update[1], update[2] = edit['new_content'], update[1] + 1, timestamp
+
+        results.append({
+            'message_id': key[1],
+            'version': new_version,
+            'chain_hash': new_chain_hash,
+            'previous_hash': latest['chain_hash'],
+            'edited_at': timestamp
+        })
+
+    # edited_at is the timestamp that went into chain_hash, so verification can recompute it
+    db.executemany('''
+        INSERT INTO message_history
+        (message_id, message_table, version_number, content,
+         edited_by_user_id, edit_reason, content_hash, previous_hash, chain_hash,
+         edited_at, editor_platform)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', history_rows)
+
+    by_table: Dict[str, List] = {}
+    for (table, message_id), (content, count, timestamp) in message_updates.items():
+        by_table.setdefault(table, []).append((content, count, timestamp, message_id))
+    for table, updates in by_table.items():
+        db.executemany(f'''
+            UPDATE {table}
+            SET content = ?, edited = 1, edit_count = COALESCE(edit_count, 0) + ?, last_edited_at = ?
+            WHERE id = ?
+        ''', updates)
+
+    return results
+
+
 @blamechain_bp.route('/api/blamechain/history/<message_table>/<int:message_id>')
 def get_message_history(message_table, message_id):
     """
@@ -54,8 +453,7 @@ def get_message_history(message_table, message_id):
     db = get_db()
 
     # Security: Only allow specific table names to prevent SQL injection
-    allowed_tables = ['messages', 'irc_messages', 'dm_messages', 'qr_chat_transcripts']
-    if message_table not in allowed_tables:
+    if message_table not in ALLOWED_TABLES:
         return jsonify({'error': 'Invalid message table'}), 400
 
     try:
@@ -125,8 +523,7 @@ def edit_message():
     if not all([message_table, message_id, new_content]):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    allowed_tables = ['messages', 'irc_messages', 'dm_messages', 'qr_chat_transcripts']
-    if message_table not in allowed_tables:
+    if message_table not in ALLOWED_TABLES:
         return jsonify({'error': 'Invalid message table'}), 400
 
     user_id = session.get('user_id')
@@ -134,77 +531,65 @@ def edit_message():
         return jsonify({'error': 'Not authenticated'}), 401
 
     try:
-        # Get latest version from history
-        latest = db.execute('''
-            SELECT version_number, chain_hash
-            FROM message_history
-            WHERE message_table = ? AND message_id = ?
-            ORDER BY version_number DESC
-            LIMIT 1
-        ''', (message_table, message_id)).fetchone()
+        result = append_edits(db, [{
+            'message_table': message_table,
+            'message_id': message_id,
+            'new_content': new_content,
+            'user_id': user_id,
+            'edit_reason': edit_reason,
+        }], editor_platform=request.headers.get('User-Agent', 'unknown')[:50])[0]
 
-        if not latest:
-            # No history exists - this is first edit after original message
-            # Fetch original message and create v1 history first
-            original = db.execute(f'SELECT content, from_user_id FROM {message_table} WHERE id = ?',
-                                 (message_id,)).fetchone()
+        db.commit()
 
-            if not original:
-                return jsonify({'error': 'Message not found'}), 404
-
-            # Create version 1 (original)
-            original_content = original['content']
-            original_hash = compute_content_hash(original_content)
-            original_chain_hash = compute_chain_hash(None, original_hash, datetime.now().isoformat())
-
-            db.execute('''
-                INSERT INTO message_history
-                (message_id, message_table, version_number, content,
-                 edited_by_user_id, content_hash, previous_hash, chain_hash)
-                VALUES (?, ?, 1, ?, ?, ?, NULL, ?)
-            ''', (message_id, message_table, original_content,
-                  original['from_user_id'], original_hash, original_chain_hash))
-
-            # Now set latest for the edit
-            latest = {
-                'version_number': 1,
-                'chain_hash': original_chain_hash
-            }
-
-        # Create new version
-        new_version = latest['version_number'] + 1
-        new_content_hash = compute_content_hash(new_content)
-        timestamp = datetime.now().isoformat()
-        new_chain_hash = compute_chain_hash(latest['chain_hash'], new_content_hash, timestamp)
+        return jsonify({'success': True, **result})
+
+    except LookupError:
+        db.rollback()
+        return jsonify({'error': 'Message not found'}), 404
+
+    except Exception as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 500
 
-        # Insert history entry
-        db.execute('''
-            INSERT INTO message_history
-            (message_id, message_table, version_number, content,
-             edited_by_user_id, edit_reason, content_hash, previous_hash, chain_hash,
-             editor_platform)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (message_id, message_table, new_version, new_content,
-              user_id, edit_reason, new_content_hash, latest['chain_hash'], new_chain_hash,
-              request.headers.get('User-Agent', 'unknown')[:50]))
-
-        # Update original message
-        db.execute(f'''
-            UPDATE {message_table}
-            SET content = ?, edited = 1, edit_count = edit_count + 1, last_edited_at = ?
-            WHERE id = ?
-        ''', (new_content, timestamp, message_id))
 
+@blamechain_bp.route('/api/blamechain/edit-batch', methods=['POST'])
+def edit_messages_batch():
+    """
+    Record many edits in one transaction (imports, bots, bridges)
+
+    POST /api/blamechain/edit-batch
+    {
+        "edits": [
+            {"message_table": "messages", "message_id": 123, "new_content": "...", "edit_reason": "..."},
+            ...
+        ]
+    }
+
+    Edits are applied in order; all succeed or none do.
+    """
+    db = get_db()
+    data = request.get_json() or {}
+    edits = data.get('edits') or []
+
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    for edit in edits:
+        if not all([edit.get('message_table'), edit.get('message_id'), edit.get('new_content')]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        if edit['message_table'] not in ALLOWED_TABLES:
+            return jsonify({'error': 'Invalid message table'}), 400
+        edit['user_id'] = user_id
+
+    try:
+        results = append_edits(db, edits, editor_platform=request.headers.get('User-Agent', 'unknown')[:50])
         db.commit()
+        return jsonify({'success': True, 'total_edits': len(results), 'edits': results})
 
-        return jsonify({
-            'success': True,
-            'message_id': message_id,
-            'version': new_version,
-            'chain_hash': new_chain_hash,
-            'previous_hash': latest['chain_hash'],
-            'edited_at': timestamp
-        })
+    except LookupError as e:
+        db.rollback()
+        return jsonify({'error': str(e)}), 404
 
     except Exception as e:
         db.rollback()
@@ -216,75 +601,58 @@ def verify_chain(message_table, message_id):
     """
     Verify the integrity of the blamechain for a message
 
-    Recalculates all hashes and ensures no tampering occurred
+    Replays hashes from the last signed checkpoint and ensures no
+    tampering occurred (?full=1 replays from version 1)
 
     GET /api/blamechain/verify/messages/123
     """
     db = get_db()
 
-    allowed_tables = ['messages', 'irc_messages', 'dm_messages', 'qr_chat_transcripts']
-    if message_table not in allowed_tables:
+    if message_table not in ALLOWED_TABLES:
         return jsonify({'error': 'Invalid message table'}), 400
 
     try:
-        history = db.execute('''
-            SELECT version_number, content, content_hash, previous_hash, chain_hash, edited_at
-            FROM message_history
-            WHERE message_table = ? AND message_id = ?
-            ORDER BY version_number ASC
-        ''', (message_table, message_id)).fetchall()
+        result = verify_message_chain(db, message_table, message_id, full=request.args.get('full') == '1')
 
-        if not history:
+        if not result:
             return jsonify({'error': 'No history found'}), 404
 
-        verification_results = []
-        chain_valid = True
-
-        for i, row in enumerate(history):
-            # Verify content hash
-            expected_content_hash = compute_content_hash(row['content'])
-            content_hash_valid = (expected_content_hash == row['content_hash'])
-
-            # Verify chain hash
-            expected_chain_hash = compute_chain_hash(
-                row['previous_hash'],
-                row['content_hash'],
-                row['edited_at']
-            )
-            chain_hash_valid = (expected_chain_hash == row['chain_hash'])
-
-            # Verify previous hash links correctly
-            if i > 0:
-                previous_row = history[i - 1]
-                previous_hash_valid = (row['previous_hash'] == previous_row['chain_hash'])
-            else:
-                # First version should have no previous_hash
-                previous_hash_valid = (row['previous_hash'] is None)
-
-            version_valid = content_hash_valid and chain_hash_valid and previous_hash_valid
-            chain_valid = chain_valid and version_valid
-
-            verification_results.append({
-                'version': row['version_number'],
-                'content_hash_valid': content_hash_valid,
-                'chain_hash_valid': chain_hash_valid,
-                'previous_hash_valid': previous_hash_valid,
-                'version_valid': version_valid
-            })
-
         return jsonify({
             'success': True,
             'message_table': message_table,
             'message_id': message_id,
-            'chain_valid': chain_valid,
-            'total_versions': len(verification_results),
-            'verification': verification_results
+            **result
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@blamechain_bp.route('/api/blamechain/audits')
+def list_audits():
+    """
+    Recent whole-database audit results (see audit_all_chains)
+
+    GET /api/blamechain/audits
+    """
+    db = get_db()
+
+    try:
+        audits = db.execute('''
+            SELECT * FROM blamechain_audits ORDER BY id DESC LIMIT 20
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        audits = []
+
+    return jsonify({
+        'success': True,
+        'audits': [
+            {**dict(a), 'invalid': json.loads(a['invalid_json'] or '[]')}
+            for a in audits
+        ]
+    })
+
+
 @blamechain_bp.route('/api/blamechain/flag-for-tribunal', methods=['POST'])
 def flag_for_tribunal():
     """
@@ -359,3 +727,122 @@ def flag_for_tribunal():
 def init_blamechain(app):
     """Initialize blamechain with Flask app"""
     app.register_blueprint(blamechain_bp)
+
+
+# ==============================================================================
+# BULK AUDIT
+# ==============================================================================
+
+def _audit_worker(job: Tuple) -> Dict:
+    """Verify one batch of chains on its own connection (read-only)"""
+    db_path, chains, full, key = job
+    db = sqlite3.connect(db_path)
+    db.row_factory = sqlite3.Row
+
+    checkpoints, invalid, legacy = [], [], []
+    replayed = 0
+    try:
+        for message_table, message_id in chains:
+            result = verify_message_chain(db, message_table, message_id, full=full, record=False, key=key)
+            if not result:
+                continue
+            replayed += result['versions_replayed']
+            if result['status'] == 'legacy':
+                legacy.append({'message_table': message_table, 'message_id': message_id})
+            elif not result['chain_valid']:
+                invalid.append({'message_table': message_table, 'message_id': message_id,
+                                'status': result['status'], 'error': result.get('error') or 'hash mismatch'})
+            elif result['versions_replayed']:
+                head = result['verification'][-1]
+                checkpoints.append((message_table, message_id, head['version'], head['chain_hash']))
+    finally:
+        db.close()
+
+    return {'chains': len(chains), 'replayed': replayed, 'invalid': invalid, 'legacy': legacy,
+            'checkpoints': checkpoints}
+
+
+def audit_all_chains(db_path: str = 'soulfra.db', workers: Optional[int] = None, full: bool = False) -> Dict:
+    """
+    Verify every blamechain in parallel and record the result
+
+    Chains are split into batches of AUDIT_BATCH and verified in a process
+    pool, each from its last checkpoint (or version 1 with full=True).
+    Every valid chain gets a fresh checkpoint at its head, so the next
+    audit only replays edits made since this one. Legacy chains (see
+    module docstring) are counted separately, not as invalid.
+
+    Returns:
+        {'audit_id', 'chains_checked', 'versions_replayed', 'invalid', 'legacy'}
+    """
+    key = _checkpoint_key()
+    db = sqlite3.connect(db_path)
+    db.row_factory = sqlite3.Row
+    started_at = datetime.now().isoformat()
+
+    try:
+        chains = [(row[0], row[1]) for row in db.execute('''
+            SELECT message_table, message_id FROM blamechain_heads ORDER BY message_table, message_id
+        ''')]
+    except sqlite3.OperationalError:
+        chains = [(row[0], row[1]) for row in db.execute('''
+            SELECT DISTINCT message_table, message_id FROM message_history ORDER BY message_table, message_id
+        ''')]
+
+    jobs = [(db_path, chains[i:i + AUDIT_BATCH], full, key) for i in range(0, len(chains), AUDIT_BATCH)]
+    print(f"🔍 Auditing {len(chains)} blamechains in {len(jobs)} batches{' (full replay)' if full else ''}...")
+
+    totals = {'chains_checked': 0, 'versions_replayed': 0, 'invalid': [], 'legacy': []}
+    pool = None
+    try:
+        if (workers or os.cpu_count() or 1) == 1 or len(jobs) < 2:
+            results = map(_audit_worker, jobs)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(_audit_worker, jobs)
+
+        for result in results:
+            totals['chains_checked'] += result['chains']
+            totals['versions_replayed'] += result['replayed']
+            totals['invalid'].extend(result['invalid'])
+            totals['legacy'].extend(result['legacy'])
+            if result['checkpoints']:
+                _write_checkpoints(db, result['checkpoints'], key)
+                db.commit()
+    finally:
+        if pool:
+            pool.shutdown()
+
+    cursor = db.execute('''
+        INSERT INTO blamechain_audits
+        (started_at, finished_at, full_replay, chains_checked, versions_replayed, invalid_chains, invalid_json,
+         legacy_chains)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (started_at, datetime.now().isoformat(), int(full), totals['chains_checked'],
+          totals['versions_replayed'], len(totals['invalid']), json.dumps(totals['invalid']), len(totals['legacy'])))
+    db.commit()
+    db.close()
+
+    print(f"✅ {totals['chains_checked']} chains, {totals['versions_replayed']} versions replayed")
+    if totals['legacy']:
+        print(f"⚪ {len(totals['legacy'])} legacy chains (recorded before exact timestamps; unverifiable)")
+    if totals['invalid']:
+        print(f"❌ {len(totals['invalid'])} invalid chains")
+
+    return {'audit_id': cursor.lastrowid, **totals}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Blamechain verification')
+    parser.add_argument('--audit', action='store_true', help='Verify every chain and record the result')
+    parser.add_argument('--full', action='store_true', help='Ignore checkpoints and replay from version 1')
+    parser.add_argument('--workers', type=int, help='Parallel audit processes (default: CPU count)')
+    parser.add_argument('--db', default='soulfra.db', help='Database path')
+    args = parser.parse_args()
+
+    if args.audit:
+        audit_all_chains(args.db, workers=args.workers, full=args.full)
+    else:
+        parser.print_help()
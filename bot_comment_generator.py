@@ -21,14 +21,22 @@ Usage:
         content_type="voice_memo"
     )
     # Returns: "This is really cool! Hope you make it happen!"
+
+    # Many targets at once: each target's content is evaluated once, comments
+    # are generated concurrently and saved as they finish
+    bot.generate_and_save_batch([
+        {'content': transcript, 'target_type': 'voice_memo', 'target_id': 7},
+        ...
+    ], comments_per_target=2)
 """
 
 import requests
 import json
 import random
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from database import get_db
+from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
 
 
 class BotCommentGenerator:
@@ -36,6 +44,15 @@ class BotCommentGenerator:
 
     # Ollama endpoint (local server)
     OLLAMA_URL = "http://192.168.1.87:11434/api/generate"
+    OLLAMA_MODEL = "llama3.2:latest"
+    CONCURRENCY = 4  # Comments generated at once in batch mode
+
+    COMMENT_INSTRUCTION = "Write a short, encouraging comment (1-2 sentences, simple words):"
+    GENERATION_OPTIONS = {
+        "temperature": 0.9,  # Higher temp for variety
+        "top_p": 0.95,
+        "num_predict": 50,  # Short responses only
+    }
 
     # Comment personality templates
     PERSONALITY_PROMPTS = [
@@ -105,24 +122,19 @@ class BotCommentGenerator:
         # Build Ollama prompt
         prompt = f"""{personality}
 
-Content to comment on:
-{content[:500]}
+{self._content_context(content)}
 
-Write a short, encouraging comment (1-2 sentences, simple words):"""
+{self.COMMENT_INSTRUCTION}"""
 
         try:
             # Call Ollama
             response = requests.post(
                 self.OLLAMA_URL,
                 json={
-                    "model": "llama3.2:latest",
+                    "model": self.OLLAMA_MODEL,
                     "prompt": prompt,
                     "stream": False,
-                    "options": {
-                        "temperature": 0.9,  # Higher temp for variety
-                        "top_p": 0.95,
-                        "num_predict": 50,  # Short responses only
-                    }
+                    "options": self.GENERATION_OPTIONS
                 },
                 timeout=10
             )
@@ -143,6 +155,48 @@ Write a short, encouraging comment (1-2 sentences, simple words):"""
             print(f"⚠️  Ollama error: {e}")
             return self._generate_fallback_comment(content)
 
+    @staticmethod
+    def _content_context(content: str) -> str:
+        """Shared part of every comment prompt for a piece of content"""
+        return f"Content to comment on:\n{content[:500]}"
+
+    def _batch(self, targets: List[Dict], comments_per_target: int, on_comment) -> GenerationOrchestrator:
+        """
+        Generate comments for many targets concurrently
+
+        Each target's content is evaluated once and shared by its comments;
+        on_comment(target, comment_text) runs as each comment finishes, with
+        a template comment standing in for failed generations.
+        """
+        engine = GenerationOrchestrator(self.OLLAMA_URL, model=self.OLLAMA_MODEL,
+                                        concurrency=self.CONCURRENCY, timeout=10)
+
+        def items():
+            for i, target in enumerate(targets):
+                jobs = [GenerationJob(key=n, system=random.choice(self.PERSONALITY_PROMPTS),
+                                      prompt=self.COMMENT_INSTRUCTION, options=self.GENERATION_OPTIONS)
+                        for n in range(comments_per_target)]
+                yield GenerationItem(key=i, prefix=self._content_context(target['content']), jobs=jobs)
+
+        def finished(result):
+            target = targets[result.item_key]
+            if result.ok and result.text:
+                comment = self._clean_comment(result.text, target.get('max_length', 100))
+            else:
+                print(f"⚠️  Ollama error: {result.error or 'empty response'}")
+                comment = self._generate_fallback_comment(target['content'])
+            on_comment(target, comment)
+
+        engine.run(items(), on_result=finished)
+        return engine
+
+    def generate_comments(self, content: str, count: int = 3, max_length: int = 100) -> List[str]:
+        """Generate several comments for one piece of content (content evaluated once)"""
+        comments = []
+        self._batch([{'content': content, 'max_length': max_length}], count,
+                    lambda target, comment: comments.append(comment))
+        return comments
+
     def _clean_comment(self, comment: str, max_length: int) -> str:
         """Clean up AI-generated comment"""
         # Remove quotes if AI added them
@@ -236,6 +290,47 @@ Write a short, encouraging comment (1-2 sentences, simple words):"""
             'generated_at': datetime.now().isoformat()
         }
 
+    def generate_and_save_batch(
+        self,
+        targets: List[Dict],
+        comments_per_target: int = 1
+    ) -> List[Dict]:
+        """
+        Generate and save comments for many targets concurrently
+
+        Args:
+            targets: [{'content', 'target_type', 'target_id'}, ...]
+            comments_per_target: Comments per target (share one prompt prefix)
+
+        Returns:
+            list: generate_and_save() dicts (plus target_type/target_id),
+            in the order they were saved
+        """
+        saved = []
+        db = get_db()
+
+        def save(target, comment_text):
+            cursor = db.execute('''
+                INSERT INTO bot_comments (target_type, target_id, comment_text)
+                VALUES (?, ?, ?)
+            ''', (target['target_type'], target['target_id'], comment_text))
+            db.commit()
+            saved.append({
+                'comment_id': cursor.lastrowid,
+                'comment_text': comment_text,
+                'generated_at': datetime.now().isoformat(),
+                'target_type': target['target_type'],
+                'target_id': target['target_id'],
+            })
+
+        try:
+            engine = self._batch(targets, comments_per_target, save)
+        finally:
+            db.close()
+
+        print(engine.report())
+        return saved
+
     def get_comments_for_target(
         self,
         target_type: str,
@@ -277,8 +372,7 @@ def main():
 
         if args.generate:
             print(f"Generating {args.generate} comments:\n")
-            for i in range(args.generate):
-                comment = bot.generate_comment(test_content)
+            for i, comment in enumerate(bot.generate_comments(test_content, count=args.generate)):
                 print(f"{i+1}. {comment}")
         else:
             comment = bot.generate_comment(test_content)
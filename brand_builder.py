@@ -12,6 +12,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from database import get_db
 from config import OLLAMA_HOST
+from llm_stream import ChainedStream, LLMStream
 
 # Conversation flow steps
 CONVERSATION_STEPS = {
@@ -115,26 +116,36 @@ def update_conversation(conversation_id: int, step: str, context: Dict):
     conn.close()
 
 
+def first_ollama_model() -> Optional[str]:
+    """First installed Ollama model, or None if Ollama is unavailable"""
+    models_response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
+    if models_response.status_code != 200 or not models_response.json().get('models'):
+        return None
+    return models_response.json()['models'][0]['name']
+
+
+def _generation_payload(model_name: str, prompt: str, max_tokens: int = 200) -> Dict:
+    return {
+        "model": model_name,
+        "prompt": prompt,
+        "stream": False,
+        "options": {
+            "num_predict": max_tokens,
+            "temperature": 0.7
+        }
+    }
+
+
 def call_ollama(prompt: str, max_tokens: int = 200) -> str:
     """Call Ollama API for text generation"""
     try:
         # Get first available model
-        models_response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-        if models_response.status_code != 200 or not models_response.json().get('models'):
+        model_name = first_ollama_model()
+        if not model_name:
             return "I'm having trouble connecting to my AI brain. Please try again in a moment."
 
-        model_name = models_response.json()['models'][0]['name']
-
         # Generate response
-        payload = {
-            "model": model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "num_predict": max_tokens,
-                "temperature": 0.7
-            }
-        }
+        payload = _generation_payload(model_name, prompt, max_tokens)
 
         response = requests.post(
             f"{OLLAMA_HOST}/api/generate",
@@ -152,11 +163,13 @@ def call_ollama(prompt: str, max_tokens: int = 200) -> str:
         return "I'm having trouble thinking right now. Please try again."
 
 
-def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[List[str]]]:
+def _advance_conversation(session_id: str, user_message: str):
     """
-    Process user message and return AI response + optional button options
+    Save the user's answer and move the scripted conversation forward
 
-    Returns: (response_text, options_list or None)
+    Returns: (response_text, options_list or None, pending) - pending is
+    (conversation_id, context) when the answers are complete and brand
+    concepts need generating (response_text is None then)
     """
     conversation_id = get_or_create_conversation(session_id)
 
@@ -175,7 +188,7 @@ def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[L
 
         response = CONVERSATION_STEPS['intro']['question']
         save_message(conversation_id, 'assistant', response)
-        return response, None
+        return response, None, None
 
     # Handle more info request
     if 'tell me more' in user_message.lower() or 'more first' in user_message.lower():
@@ -183,7 +196,7 @@ def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[L
                    "Then I'll use AI to generate 3 unique brand concepts - complete with names, "
                    "taglines, and visual directions. Ready?")
         save_message(conversation_id, 'assistant', response)
-        return response, ['Yes, let\'s start!']
+        return response, ['Yes, let\'s start!'], None
 
     # Store answer and move to next step
     if current_step in CONVERSATION_STEPS:
@@ -196,9 +209,7 @@ def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[L
 
         if not next_step:
             # End of conversation - generate brands
-            response = generate_brand_concepts(conversation_id, context)
-            save_message(conversation_id, 'assistant', response)
-            return response, None
+            return None, None, (conversation_id, context)
 
         # Move to next question
         update_conversation(conversation_id, next_step, context)
@@ -208,19 +219,72 @@ def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[L
         options = next_config.get('options')
 
         save_message(conversation_id, 'assistant', response)
-        return response, options
+        return response, options, None
 
     # Fallback
     response = "I didn't quite catch that. Can you tell me more?"
     save_message(conversation_id, 'assistant', response)
-    return response, None
+    return response, None, None
 
 
-def generate_brand_concepts(conversation_id: int, context: Dict) -> str:
-    """Generate 3 brand concepts using Ollama based on conversation"""
+def process_message(session_id: str, user_message: str) -> Tuple[str, Optional[List[str]]]:
+    """
+    Process user message and return AI response + optional button options
+
+    Returns: (response_text, options_list or None)
+    """
+    response, options, pending = _advance_conversation(session_id, user_message)
+
+    if pending:
+        conversation_id, context = pending
+        response = generate_brand_concepts(conversation_id, context)
+        save_message(conversation_id, 'assistant', response)
 
-    # Build prompt from context
-    prompt = f"""Based on this information, generate ONE creative brand name with a tagline:
+    return response, options
+
+
+def stream_message(session_id: str, user_message: str):
+    """
+    Streaming version of process_message()
+
+    Scripted questions come back immediately; the final step streams the
+    three brand concepts as they are generated.
+
+    Returns:
+        (response_text, options, None) for scripted steps, or
+        (None, None, (stream, finish)) - iterate stream (a ChainedStream),
+        then call finish(stream) to save the concepts; it returns the
+        formatted concepts message
+    """
+    response, options, pending = _advance_conversation(session_id, user_message)
+    if not pending:
+        return response, options, None
+
+    conversation_id, context = pending
+    try:
+        model_name = first_ollama_model()
+    except requests.RequestException:
+        model_name = None
+    if not model_name:
+        response = "I'm having trouble connecting to my AI brain. Please try again in a moment."
+        save_message(conversation_id, 'assistant', response)
+        return response, None, None
+
+    payload = _generation_payload(model_name, brand_concept_prompt(context))
+    stream = ChainedStream([lambda: LLMStream.generate(payload, ollama_url=OLLAMA_HOST, timeout=30)] * 3,
+                           separator='\n\n')
+
+    def finish(completed):
+        response = save_brand_concepts(conversation_id, context, [text.strip() for text in completed.texts])
+        save_message(conversation_id, 'assistant', response)
+        return response
+
+    return None, None, (stream, finish)
+
+
+def brand_concept_prompt(context: Dict) -> str:
+    """Build the brand concept prompt from the conversation answers"""
+    return f"""Based on this information, generate ONE creative brand name with a tagline:
 
 Problem: {context.get('problem', 'Unknown')}
 Target Audience: {context.get('audience', 'Unknown')}
@@ -233,10 +297,20 @@ BrandName - Tagline
 
 Be creative and memorable. Keep it short."""
 
+
+def generate_brand_concepts(conversation_id: int, context: Dict) -> str:
+    """Generate 3 brand concepts using Ollama based on conversation"""
+    prompt = brand_concept_prompt(context)
+
     # Generate 3 concepts
+    results = [call_ollama(prompt) for _ in range(3)]
+    return save_brand_concepts(conversation_id, context, results)
+
+
+def save_brand_concepts(conversation_id: int, context: Dict, results: List[str]) -> str:
+    """Save generated 'BrandName - Tagline' concepts and format them for the chat"""
     concepts = []
-    for i in range(3):
-        result = call_ollama(prompt)
+    for result in results:
         if result and '-' in result:
             parts = result.split('-', 1)
             brand_name = parts[0].strip()
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Broadcast Bus - Fan-out layer for WebSocket events
+
+Sits between websocket_server's Socket.IO handlers and the sockets:
+
+- Cross-worker pub/sub through a small SQLite (WAL) table, so every
+  gunicorn worker delivers room broadcasts to its own clients - no
+  external broker
+- Rooms tracked per worker and sharded across sender threads; a slow
+  client only delays its own shard
+- Per-client bounded send queues with a drop policy (drop_oldest /
+  drop_newest) instead of blocking the handler
+- Coalescing for high-frequency events (user_typing, live stats): only
+  the latest payload per key is sent each interval
+- Bounded executor for long-running handlers (test runs, Ollama chats,
+  training) instead of one thread per event
+- stats(): connected clients, fan-out latency, dropped messages
+
+Usage:
+    from broadcast_bus import BroadcastBus
+
+    bus = BroadcastBus(lambda event, data, sid: socketio.emit(event, data, to=sid))
+    bus.start()
+
+    bus.connect(sid)
+    bus.join(sid, 'brand:ocean-dreams')
+    bus.publish('new_post', {...}, room='brand:ocean-dreams')
+    bus.publish('typing_indicator', {...}, room='post:42', coalesce_key=('typing', 42, 'matt'))
+    bus.submit(run_slow_thing, sid)
+
+    # From any process (CLI, cron, other app worker) - delivered by socket workers
+    from broadcast_bus import publish_event
+    publish_event('brand_refresh', {...}, room='brand:ocean-dreams')
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+# Configuration
+BUS_DB_PATH = os.environ.get(
+    'SOULFRA_BUS_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'broadcast_bus.db')
+)
+DEFAULT_SHARDS = 4
+DEFAULT_QUEUE_LIMIT = 256          # Messages buffered per client
+DEFAULT_COALESCE_INTERVAL = 0.25   # Seconds
+DEFAULT_POLL_INTERVAL = 0.05       # Seconds between bus table reads
+DEFAULT_EXECUTOR_WORKERS = 4
+DEFAULT_EXECUTOR_BACKLOG = 32
+EVENT_RETENTION_SECONDS = 60
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+
+
+def _connect_bus(db_path: str):
+    conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS broadcast_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            origin TEXT NOT NULL,
+            room TEXT,
+            event TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            skip_sid TEXT,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_broadcast_events_created ON broadcast_events(created_at)')
+    conn.commit()
+    return conn
+
+
+def _insert_event(conn, origin, event, data, room, skip_sid, created_at):
+    conn.execute('''
+        INSERT INTO broadcast_events (origin, room, event, payload, skip_sid, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (origin, room, event, json.dumps(data, default=str), skip_sid, created_at))
+    conn.commit()
+
+
+def publish_event(event: str, data: Dict, room: Optional[str] = None, db_path: Optional[str] = None):
+    """
+    Publish from anywhere - the running bus if this process has one,
+    otherwise straight into the bus table for socket workers to deliver
+    """
+    if _active_bus is not None:
+        _active_bus.publish(event, data, room=room)
+        return
+
+    conn = _connect_bus(db_path or BUS_DB_PATH)
+    try:
+        _insert_event(conn, 'external', event, data, room, None, time.time())
+    finally:
+        conn.close()
+
+
+class _ClientQueue:
+    """Bounded outbound queue for one socket"""
+
+    __slots__ = ('sid', 'messages', 'dropped')
+
+    def __init__(self, sid: str, limit: int):
+        self.sid = sid
+        self.messages = deque(maxlen=limit)
+        self.dropped = 0
+
+
+class BroadcastBus:
+    """Sharded, backpressured fan-out with a SQLite cross-worker backbone"""
+
+    def __init__(self, emit_fn: Callable[[str, Any, str], None],
+                 db_path: Optional[str] = BUS_DB_PATH,
+                 shards: int = DEFAULT_SHARDS,
+                 queue_limit: int = DEFAULT_QUEUE_LIMIT,
+                 drop_policy: str = DROP_OLDEST,
+                 coalesce_interval: float = DEFAULT_COALESCE_INTERVAL,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 executor_workers: int = DEFAULT_EXECUTOR_WORKERS,
+                 executor_backlog: int = DEFAULT_EXECUTOR_BACKLOG,
+                 start_task: Optional[Callable] = None):
+        """
+        Args:
+            emit_fn: emit_fn(event, data, sid) - sends to exactly one socket
+            db_path: Bus table location (None = single-process, no cross-worker)
+            shards: Number of sender threads
+            queue_limit: Max queued messages per client
+            drop_policy: DROP_OLDEST or DROP_NEWEST when a client queue is full
+            coalesce_interval: Flush period for coalesced events
+            poll_interval: How often to read other workers' events
+            executor_workers: Threads for long-running handlers
+            executor_backlog: Max queued + running handler jobs
+            start_task: Background task launcher (socketio.start_background_task);
+                        defaults to daemon threads
+        """
+        if drop_policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.emit_fn = emit_fn
+        self.db_path = db_path
+        self.shard_count = max(1, shards)
+        self.queue_limit = queue_limit
+        self.drop_policy = drop_policy
+        self.coalesce_interval = coalesce_interval
+        self.poll_interval = poll_interval
+        self.worker_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._start_task = start_task or self._start_thread
+
+        self._lock = threading.RLock()
+        self._clients: Dict[str, _ClientQueue] = {}
+        self._rooms: Dict[str, set] = defaultdict(set)
+        self._client_rooms: Dict[str, set] = defaultdict(set)
+        self._shard_ready = [threading.Event() for _ in range(self.shard_count)]
+        self._coalesced: Dict[Hashable, tuple] = {}
+
+        self._executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix='ws-job')
+        self._executor_slots = threading.BoundedSemaphore(executor_backlog)
+
+        self._running = False
+        self._conn = None
+        self._last_event_id = 0
+
+        # Metrics
+        self._latencies = deque(maxlen=1000)
+        self.messages_published = 0
+        self.messages_sent = 0
+        self.messages_dropped = 0
+        self.messages_coalesced = 0
+        self.jobs_rejected = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _start_thread(target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        return thread
+
+    def start(self):
+        """Start sender shards, coalescer and (if db_path) the bus poller"""
+        global _active_bus
+
+        if self._running:
+            return self
+        self._running = True
+
+        if self.db_path:
+            self._conn = _connect_bus(self.db_path)
+            row = self._conn.execute('SELECT MAX(id) FROM broadcast_events').fetchone()
+            self._last_event_id = row[0] or 0
+            self._start_task(self._poll_loop)
+
+        for shard in range(self.shard_count):
+            self._start_task(self._sender_loop, shard)
+        self._start_task(self._coalesce_loop)
+
+        _active_bus = self
+        return self
+
+    def stop(self):
+        global _active_bus
+
+        self._running = False
+        for ready in self._shard_ready:
+            ready.set()
+        self._executor.shutdown(wait=False)
+        if _active_bus is self:
+            _active_bus = None
+
+    # ------------------------------------------------------------------
+    # Membership
+    # ------------------------------------------------------------------
+
+    def _shard_of(self, sid: str) -> int:
+        return hash(sid) % self.shard_count
+
+    def connect(self, sid: str):
+        with self._lock:
+            if sid not in self._clients:
+                self._clients[sid] = _ClientQueue(sid, self.queue_limit)
+
+    def disconnect(self, sid: str):
+        with self._lock:
+            self._clients.pop(sid, None)
+            for room in self._client_rooms.pop(sid, set()):
+                members = self._rooms.get(room)
+                if members is not None:
+                    members.discard(sid)
+                    if not members:
+                        del self._rooms[room]
+
+    def is_connected(self, sid: str) -> bool:
+        with self._lock:
+            return sid in self._clients
+
+    def join(self, sid: str, room: str):
+        with self._lock:
+            self.connect(sid)
+            self._rooms[room].add(sid)
+            self._client_rooms[sid].add(room)
+
+    def leave(self, sid: str, room: str):
+        with self._lock:
+            members = self._rooms.get(room)
+            if members is not None:
+                members.discard(sid)
+                if not members:
+                    del self._rooms[room]
+            self._client_rooms.get(sid, set()).discard(room)
+
+    def room_size(self, room: str) -> int:
+        """Members of room connected to this worker"""
+        with self._lock:
+            return len(self._rooms.get(room, ()))
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, event: str, data: Any, room: Optional[str] = None,
+                skip_sid: Optional[str] = None, coalesce_key: Optional[Hashable] = None):
+        """
+        Broadcast to a room (or every client when room is None) on all workers
+
+        coalesce_key: events sharing a key within coalesce_interval collapse
+                      to the latest one
+        """
+        if coalesce_key is not None:
+            with self._lock:
+                if coalesce_key in self._coalesced:
+                    self.messages_coalesced += 1
+                self._coalesced[coalesce_key] = (event, data, room, skip_sid)
+            return
+
+        created_at = time.time()
+        self.messages_published += 1
+
+        if self._conn is not None:
+            try:
+                with self._lock:
+                    _insert_event(self._conn, self.worker_id, event, data, room, skip_sid, created_at)
+            except sqlite3.Error as e:
+                print(f"⚠️  Broadcast bus write failed: {e}")
+
+        self._fan_out(event, data, room, skip_sid, created_at)
+
+    def send_to(self, sid: str, event: str, data: Any):
+        """Queue a message for one client (respects its queue limit)"""
+        self._enqueue(sid, event, data, time.time())
+
+    def _fan_out(self, event, data, room, skip_sid, created_at):
+        with self._lock:
+            if room is None:
+                targets = list(self._clients)
+            else:
+                targets = list(self._rooms.get(room, ()))
+
+        for sid in targets:
+            if sid != skip_sid:
+                self._enqueue(sid, event, data, created_at)
+
+    def _enqueue(self, sid, event, data, created_at):
+        with self._lock:
+            client = self._clients.get(sid)
+            if client is None:
+                return
+
+            if len(client.messages) >= self.queue_limit:
+                client.dropped += 1
+                self.messages_dropped += 1
+                if self.drop_policy == DROP_NEWEST:
+                    return
+                # DROP_OLDEST: deque(maxlen) evicts the head on append
+
+            client.messages.append((event, data, created_at))
+
+        self._shard_ready[self._shard_of(sid)].set()
+
+    # ------------------------------------------------------------------
+    # Background loops
+    # ------------------------------------------------------------------
+
+    def _sender_loop(self, shard: int):
+        ready = self._shard_ready[shard]
+
+        while self._running:
+            ready.wait(timeout=1.0)
+            ready.clear()
+            self.flush_shard(shard)
+
+    def flush_shard(self, shard: int) -> int:
+        """Send everything queued for one shard's clients; returns messages sent"""
+        sent = 0
+
+        with self._lock:
+            clients = [c for sid, c in self._clients.items() if self._shard_of(sid) == shard and c.messages]
+
+        for client in clients:
+            while True:
+                with self._lock:
+                    if not client.messages:
+                        break
+                    event, data, created_at = client.messages.popleft()
+                try:
+                    self.emit_fn(event, data, client.sid)
+                except Exception as e:
+                    print(f"⚠️  WebSocket send to {client.sid} failed: {e}")
+                    continue
+                self._latencies.append(time.time() - created_at)
+                self.messages_sent += 1
+                sent += 1
+
+        return sent
+
+    def flush(self) -> int:
+        """Flush coalesced events and every shard (tests / shutdown)"""
+        self.flush_coalesced()
+        return sum(self.flush_shard(shard) for shard in range(self.shard_count))
+
+    def flush_coalesced(self):
+        with self._lock:
+            pending, self._coalesced = self._coalesced, {}
+        for event, data, room, skip_sid in pending.values():
+            self.publish(event, data, room=room, skip_sid=skip_sid)
+
+    def _coalesce_loop(self):
+        while self._running:
+            time.sleep(self.coalesce_interval)
+            self.flush_coalesced()
+
+    def poll_bus(self) -> int:
+        """Deliver events other workers wrote since the last poll"""
+        if self._conn is None:
+            return 0
+
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT id, origin, room, event, payload, skip_sid, created_at
+                FROM broadcast_events
+                WHERE id > ?
+                ORDER BY id
+            ''', (self._last_event_id,)).fetchall()
+
+        delivered = 0
+        for event_id, origin, room, event, payload, skip_sid, created_at in rows:
+            self._last_event_id = event_id
+            if origin == self.worker_id:
+                continue
+            self._fan_out(event, json.loads(payload), room, skip_sid, created_at)
+            delivered += 1
+
+        return delivered
+
+    def _prune_bus(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM broadcast_events WHERE created_at < ?',
+                               (time.time() - EVENT_RETENTION_SECONDS,))
+            self._conn.commit()
+
+    def _poll_loop(self):
+        last_prune = time.time()
+
+        while self._running:
+            try:
+                self.poll_bus()
+                if time.time() - last_prune > EVENT_RETENTION_SECONDS / 4:
+                    self._prune_bus()
+                    last_prune = time.time()
+            except sqlite3.Error as e:
+                print(f"⚠️  Broadcast bus poll failed: {e}")
+            time.sleep(self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # Long-running handlers
+    # ------------------------------------------------------------------
+
+    def submit(self, fn: Callable, *args, **kwargs) -> bool:
+        """
+        Run fn on the bounded executor
+
+        Returns:
+            False (job not started) when the backlog is full
+        """
+        if not self._executor_slots.acquire(blocking=False):
+            self.jobs_rejected += 1
+            return False
+
+        def _run():
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print(f"⚠️  WebSocket job {getattr(fn, '__name__', fn)} failed: {e}")
+            finally:
+                self._executor_slots.release()
+
+        self._executor.submit(_run)
+        return True
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict:
+        """Connected clients, fan-out latency and drop counters for this worker"""
+        latencies = sorted(self._latencies)
+
+        def _pct(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+        with self._lock:
+            queued = sum(len(c.messages) for c in self._clients.values())
+            return {
+                'worker_id': self.worker_id,
+                'connected_clients': len(self._clients),
+                'rooms': len(self._rooms),
+                'queued_messages': queued,
+                'messages_published': self.messages_published,
+                'messages_sent': self.messages_sent,
+                'messages_dropped': self.messages_dropped,
+                'messages_coalesced': self.messages_coalesced,
+                'jobs_rejected': self.jobs_rejected,
+                'fanout_latency_ms': {'p50': _pct(0.50), 'p95': _pct(0.95), 'p99': _pct(0.99)},
+                'cross_worker': self._conn is not None,
+            }
+
+
+# The bus started by this process (set by BroadcastBus.start)
+_active_bus: Optional[BroadcastBus] = None
+
+
+def get_bus() -> Optional[BroadcastBus]:
+    """The running bus for this process, if any"""
+    return _active_bus
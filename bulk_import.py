@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Bulk Import - Chunked CSV/Excel imports with bulk slug resolution and job progress
+
+Posts (batch_import_posts), brands (import_domains_csv, the /api/domains
+import routes) and professionals (demo_seed_professionals) used to import
+one row at a time: a brand lookup, a slug-uniqueness query and an INSERT
+per row, sometimes for a whole file read into memory inside an HTTP
+request. They now run as targets on one engine:
+
+- Rows are streamed from the file (csv module / openpyxl read-only mode)
+  and processed in chunks, so memory stays bounded by the chunk size
+- Lookups a target needs (brand slug -> id, ...) are loaded once per
+  import; validation never touches the database
+- Slug collisions are resolved against an in-memory set of existing slugs
+  (`slug`, `slug-1`, `slug-2`, ... with a per-base counter, so a thousand
+  rows titled "Hello" don't re-probe each other)
+- Each chunk is written with executemany() in one transaction, together
+  with the job's progress row; if a chunk hits a constraint (another
+  writer got there first) only that chunk is retried row by row
+- Every import is an import_jobs row: poll get_import_job(job_id) or
+  GET /api/import-jobs/<job_id> for processed / imported / skipped / errors
+
+Usage:
+    from bulk_import import BulkImporter, read_rows, start_import_job
+
+    importer = BulkImporter(target, chunk_size=5000)
+    job = importer.run(read_rows('posts.csv'), source='posts.csv')
+    print(importer.report())
+
+    # Background (HTTP routes)
+    job_id = start_import_job(target, lambda: read_rows(path), source=path)
+"""
+
+import csv
+import json
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from database import get_db
+from schema_registry import ensure_schema, register_migration
+
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_ERROR_SAMPLES = 50          # Error messages kept on the job row
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+IMPORT_JOBS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        job_id TEXT PRIMARY KEY,
+        target TEXT NOT NULL,
+        source TEXT,
+        status TEXT NOT NULL DEFAULT 'queued',
+        dry_run INTEGER DEFAULT 0,
+        total_rows INTEGER,
+        processed INTEGER DEFAULT 0,
+        imported INTEGER DEFAULT 0,
+        skipped INTEGER DEFAULT 0,
+        errors INTEGER DEFAULT 0,
+        error_samples TEXT DEFAULT '[]',
+        message TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        finished_at TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_import_jobs_created ON import_jobs(created_at)',
+]
+register_migration(115, 'bulk import jobs', *IMPORT_JOBS_SCHEMA, module='bulk_import')
+
+
+# ==============================================================================
+# TARGETS
+# ==============================================================================
+
+class RowError(ValueError):
+    """Raised by a target's prepare() for a row that can't be imported"""
+
+
+@dataclass
+class ImportTarget:
+    """
+    Where rows go and how they are checked
+
+    prepare(row, lookups) turns a source row into a record (dict keyed by
+    column) or raises RowError. load_lookups(db) runs once per import and
+    its result is passed to every prepare() call. Columns missing from the
+    live table are left out of the INSERT.
+    """
+    name: str
+    table: str
+    columns: List[str]
+    prepare: Callable[[Dict, Dict], Dict]
+    slug_column: Optional[str] = None       # Made unique: slug, slug-1, slug-2, ...
+    unique_column: Optional[str] = None     # Rows whose value already exists are skipped
+    load_lookups: Optional[Callable] = None
+
+
+def slugify(text: str, max_length: int = 100) -> str:
+    """URL slug: lowercase ASCII letters, digits and single hyphens"""
+    slug = re.sub(r'[^a-z0-9\s-]', '', str(text).lower())
+    slug = re.sub(r'[\s_-]+', '-', slug).strip('-')
+    return slug[:max_length].rstrip('-')
+
+
+def clean(value) -> str:
+    """Cell value as a stripped string (None / NaN from spreadsheets -> '')"""
+    if value is None or value != value:
+        return ''
+    return str(value).strip()
+
+
+def parse_timestamp(value, default: Optional[str] = None) -> str:
+    """ISO timestamp from a date cell (string, datetime, or empty -> default/now)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    text = clean(value)
+    if text:
+        try:
+            return datetime.fromisoformat(text).isoformat()
+        except ValueError:
+            pass
+    return default or datetime.now().isoformat()
+
+
+# ==============================================================================
+# READING
+# ==============================================================================
+
+def normalize_header(name) -> str:
+    return clean(name).lower()
+
+
+def read_rows(source, sheet: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Stream rows from a CSV/Excel path or an open text file, keyed by
+    lowercased header
+
+    .xlsx needs openpyxl (read-only, streamed); .xls falls back to pandas,
+    which loads the whole sheet.
+    """
+    if not isinstance(source, (str, Path)):
+        yield from _csv_rows(source)
+        return
+
+    path = Path(source)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            yield from _csv_rows(f)
+    elif suffix == '.xlsx':
+        yield from _xlsx_rows(path, sheet)
+    elif suffix == '.xls':
+        yield from _pandas_rows(path, sheet)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}. Use .csv, .xlsx, or .xls")
+
+
+def _csv_rows(f) -> Iterator[Dict[str, str]]:
+    reader = csv.reader(f)
+    header = [normalize_header(name) for name in next(reader, [])]
+    for values in reader:
+        if any(values):
+            yield dict(zip(header, values))
+
+
+def _xlsx_rows(path: Path, sheet: Optional[str]) -> Iterator[Dict]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("openpyxl not installed. Run: pip install openpyxl")
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = (workbook[sheet] if sheet else workbook.active).iter_rows(values_only=True)
+        header = [normalize_header(name) for name in next(rows, ())]
+        for values in rows:
+            if any(value is not None for value in values):
+                yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _pandas_rows(path: Path, sheet: Optional[str]) -> Iterator[Dict]:
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("pandas not installed. Run: pip install pandas xlrd")
+
+    df = pd.read_excel(path, sheet_name=sheet or 0)
+    df.columns = [normalize_header(name) for name in df.columns]
+    yield from df.to_dict('records')
+
+
+def estimate_rows(path) -> Optional[int]:
+    """Data rows in a CSV (line count, so approximate with multi-line cells)"""
+    path = Path(path)
+    if path.suffix.lower() != '.csv':
+        return None
+    lines = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+    return max(0, lines - 1)
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ==============================================================================
+# ENGINE
+# ==============================================================================
+
+class BulkImporter:
+    """Imports rows into one target in chunked, bulk transactions"""
+
+    def __init__(self, target: ImportTarget, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 dry_run: bool = False, on_progress: Optional[Callable[[Dict], None]] = None):
+        self.target = target
+        self.chunk_size = max(1, chunk_size)
+        self.dry_run = dry_run
+        self.on_progress = on_progress
+        self.stats = {'processed': 0, 'imported': 0, 'skipped': 0, 'errors': 0, 'seconds': 0.0}
+        self.error_samples: List[str] = []
+        self._taken_slugs = set()
+        self._slug_counters: Dict[str, int] = {}
+        self._taken_unique = set()
+
+    def run(self, rows: Iterable[Dict], job_id: Optional[str] = None, total: Optional[int] = None,
+            source: str = '', first_row: int = 2) -> Dict:
+        """
+        Import rows (consumed lazily, chunk by chunk)
+
+        Args:
+            rows: Source rows, e.g. read_rows(path)
+            job_id: Existing import_jobs row to update (created if missing)
+            total: Expected row count, for progress
+            first_row: Number reported for the first row in errors (2 = after a CSV header)
+
+        Returns:
+            The finished job (see get_import_job)
+        """
+        target = self.target
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        started = time.perf_counter()
+
+        ensure_schema()
+        db = get_db()
+        try:
+            db.execute('''
+                INSERT INTO import_jobs (job_id, target, source, status, dry_run, total_rows)
+                VALUES (?, ?, ?, 'running', ?, ?)
+                ON CONFLICT(job_id) DO UPDATE SET status = 'running', total_rows = excluded.total_rows
+            ''', (self.job_id, target.name, source, int(self.dry_run), total))
+            db.commit()
+
+            columns = self._live_columns(db)
+            insert_sql = (f"INSERT INTO {target.table} ({', '.join(columns)}) "
+                          f"VALUES ({', '.join('?' * len(columns))})")
+            lookups = target.load_lookups(db) if target.load_lookups else {}
+            self._load_taken(db)
+
+            row_number = first_row
+            for chunk in chunked(rows, self.chunk_size):
+                records = self._prepare_chunk(chunk, lookups, row_number)
+                row_number += len(chunk)
+                self.stats['processed'] += len(chunk)
+
+                if records and not self.dry_run:
+                    self._write_chunk(db, insert_sql, columns, records)
+                else:
+                    self.stats['imported'] += len(records)
+                self._save_progress(db, 'running')
+                db.commit()
+                if self.on_progress:
+                    self.on_progress(dict(self.stats, job_id=self.job_id, total=total))
+
+            self.stats['seconds'] = round(time.perf_counter() - started, 3)
+            self._save_progress(db, 'completed', finished=True)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self._save_progress(db, 'failed', message=str(e), finished=True)
+            db.commit()
+            raise
+        finally:
+            db.close()
+
+        return get_import_job(self.job_id)
+
+    def _live_columns(self, db) -> List[str]:
+        existing = {row[1] for row in db.execute(f'PRAGMA table_info({self.target.table})')}
+        if not existing:
+            raise ValueError(f"Table not found: {self.target.table}")
+        return [column for column in self.target.columns if column in existing]
+
+    def _load_taken(self, db):
+        target = self.target
+        if target.slug_column:
+            self._taken_slugs = {row[0] for row in db.execute(
+                f'SELECT {target.slug_column} FROM {target.table} WHERE {target.slug_column} IS NOT NULL')}
+        if target.unique_column:
+            self._taken_unique = {str(row[0]).lower() for row in db.execute(
+                f'SELECT {target.unique_column} FROM {target.table} WHERE {target.unique_column} IS NOT NULL')}
+
+    def unique_slug(self, base: str) -> str:
+        """base, base-1, base-2, ... - first one not taken (in the table or this import)"""
+        base = base or self.target.name
+        slug, counter = base, self._slug_counters.get(base, 0)
+        while slug in self._taken_slugs:
+            counter += 1
+            slug = f'{base}-{counter}'
+        self._slug_counters[base] = counter
+        self._taken_slugs.add(slug)
+        return slug
+
+    def _prepare_chunk(self, chunk: List[Dict], lookups: Dict, first_row: int) -> List[Dict]:
+        target = self.target
+        records = []
+        for offset, row in enumerate(chunk):
+            try:
+                record = target.prepare(row, lookups)
+            except RowError as e:
+                self._error(f"Row {first_row + offset}: {e}")
+                continue
+
+            if target.unique_column:
+                key = str(record[target.unique_column]).lower()
+                if key in self._taken_unique:
+                    self.stats['skipped'] += 1
+                    continue
+                self._taken_unique.add(key)
+
+            if target.slug_column:
+                record[target.slug_column] = self.unique_slug(record.get(target.slug_column))
+            record['_row'] = first_row + offset
+            records.append(record)
+        return records
+
+    def _write_chunk(self, db, insert_sql: str, columns: List[str], records: List[Dict]):
+        values = [tuple(record.get(column) for column in columns) for record in records]
+        try:
+            db.executemany(insert_sql, values)
+            self.stats['imported'] += len(values)
+        except sqlite3.IntegrityError:
+            # A concurrent writer took a slug/unique value: retry this chunk row by row
+            db.rollback()
+            for record, row in zip(records, values):
+                try:
+                    db.execute(insert_sql, row)
+                    self.stats['imported'] += 1
+                except sqlite3.IntegrityError as e:
+                    self._error(f"Row {record['_row']}: {e}")
+
+    def _error(self, message: str):
+        self.stats['errors'] += 1
+        if len(self.error_samples) < MAX_ERROR_SAMPLES:
+            self.error_samples.append(message)
+
+    def _save_progress(self, db, status: str, message: Optional[str] = None, finished: bool = False):
+        stats = self.stats
+        db.execute(f'''
+            UPDATE import_jobs
+            SET status = ?, processed = ?, imported = ?, skipped = ?, errors = ?,
+                error_samples = ?, message = COALESCE(?, message)
+                {", finished_at = CURRENT_TIMESTAMP" if finished else ""}
+            WHERE job_id = ?
+        ''', (status, stats['processed'], stats['imported'], stats['skipped'], stats['errors'],
+              json.dumps(self.error_samples), message, self.job_id))
+
+    def report(self) -> str:
+        stats = self.stats
+        rate = stats['processed'] / stats['seconds'] if stats['seconds'] else 0.0
+        verb = 'would import' if self.dry_run else 'imported'
+        return (f"📊 {stats['processed']} rows in {stats['seconds']:.2f}s ({rate:,.0f} rows/sec): "
+                f"{verb} {stats['imported']}, skipped {stats['skipped']}, errors {stats['errors']}")
+
+
+# ==============================================================================
+# JOBS
+# ==============================================================================
+
+def get_import_job(job_id: str) -> Optional[Dict]:
+    """Progress of an import: status, total_rows, processed, imported, skipped, errors, error_samples"""
+    ensure_schema()
+    db = get_db()
+    try:
+        row = db.execute('SELECT * FROM import_jobs WHERE job_id = ?', (job_id,)).fetchone()
+    finally:
+        db.close()
+    if not row:
+        return None
+    job = dict(row)
+    job['error_samples'] = json.loads(job['error_samples'] or '[]')
+    job['dry_run'] = bool(job['dry_run'])
+    if job['total_rows']:
+        job['percent'] = min(100.0, round(100.0 * job['processed'] / job['total_rows'], 1))
+    return job
+
+
+def start_import_job(target: ImportTarget, rows_factory: Callable[[], Iterable[Dict]],
+                     source: str = '', total: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     dry_run: bool = False, on_finish: Optional[Callable[[], None]] = None) -> str:
+    """
+    Run an import on a background thread; returns its job_id immediately
+
+    rows_factory is called on the worker thread (open the file there).
+    on_finish runs afterwards either way (e.g. delete an uploaded temp file).
+    """
+    job_id = uuid.uuid4().hex[:12]
+    ensure_schema()
+    db = get_db()
+    db.execute('INSERT INTO import_jobs (job_id, target, source, dry_run, total_rows) VALUES (?, ?, ?, ?, ?)',
+               (job_id, target.name, source, int(dry_run), total))
+    db.commit()
+    db.close()
+
+    def work():
+        try:
+            BulkImporter(target, chunk_size=chunk_size, dry_run=dry_run).run(
+                rows_factory(), job_id=job_id, total=total, source=source)
+        except Exception as e:
+            print(f"⚠️  Import job {job_id} failed: {e}")
+            _fail_job(job_id, str(e))
+        finally:
+            if on_finish:
+                on_finish()
+
+    threading.Thread(target=work, name=f'import-{job_id}', daemon=True).start()
+    return job_id
+
+
+def run_import(target: ImportTarget, rows_factory: Callable[[], Iterable[Dict]], total: Optional[int],
+               source: str = '', inline_limit: int = DEFAULT_CHUNK_SIZE,
+               on_finish: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Import inline if it's small (one chunk), else start a background job
+
+    Returns the job either way: status 'completed' for inline imports,
+    'queued'/'running' for background ones (poll get_import_job).
+    """
+    if total is not None and total <= inline_limit:
+        try:
+            return BulkImporter(target).run(rows_factory(), total=total, source=source)
+        finally:
+            if on_finish:
+                on_finish()
+    job_id = start_import_job(target, rows_factory, source=source, total=total, on_finish=on_finish)
+    return get_import_job(job_id)
+
+
+def _fail_job(job_id: str, message: str):
+    """Mark a job failed if the importer never got to (e.g. the file couldn't be opened)"""
+    db = get_db()
+    db.execute('''
+        UPDATE import_jobs SET status = 'failed', message = COALESCE(message, ?),
+               finished_at = COALESCE(finished_at, CURRENT_TIMESTAMP)
+        WHERE job_id = ?
+    ''', (message, job_id))
+    db.commit()
+    db.close()
+
@@ -17,13 +17,16 @@ Domains:
 - cringeproof.com: authentic, social, cringe, genuine, trust, community...
 - soulfra.com: soul, infrastructure, meaning, purpose, growth...
 - deathtodata.com: privacy, data, surveillance, freedom, encryption...
+
+Re-route the whole backlog after wordmaps change:
+    python3 classify_idea.py --reclassify [--unassigned]
 """
 
-import json
 import re
 from typing import List, Dict, Tuple
 from collections import Counter
 from database import get_db
+from domain_match_index import get_classify_index
 
 
 def extract_keywords(text: str, min_length: int = 4) -> List[str]:
@@ -97,15 +100,10 @@ def classify_idea(transcription: str) -> List[Dict[str, any]]:
 
         Sorted by score (highest first)
     """
-    # Get all domain wordmaps
-    db = get_db()
-
-    domains = db.execute('''
-        SELECT domain, wordmap_json
-        FROM domain_wordmaps
-    ''').fetchall()
+    # Indexed domain wordmaps (re-parsed only when a wordmap changes)
+    index = get_classify_index()
 
-    if not domains:
+    if not len(index):
         print("⚠️  No domain wordmaps found - run seed_domain_wordmaps.py")
         return []
 
@@ -116,18 +114,13 @@ def classify_idea(transcription: str) -> List[Dict[str, any]]:
         print(f"⚠️  No keywords extracted from: {transcription[:100]}")
         return []
 
-    # Calculate match for each domain
+    # Score = share of keywords found in each domain wordmap (highest first)
     results = []
 
-    for domain_row in domains:
-        domain = domain_row['domain']
-        wordmap = json.loads(domain_row['wordmap_json'])
-
-        score = calculate_domain_match(keywords, wordmap)
-
-        # Find which keywords matched
-        domain_words = set(wordmap.keys())
-        matches = [kw for kw in keywords if kw in domain_words]
+    for domain, score, matched_words in index.match(keywords, metric='coverage'):
+        # Which keywords matched (with repeats, in transcription order)
+        matched_words = set(matched_words)
+        matches = [kw for kw in keywords if kw in matched_words]
 
         results.append({
             'domain': domain,
@@ -137,11 +130,6 @@ def classify_idea(transcription: str) -> List[Dict[str, any]]:
             'matched_keywords': len(matches)
         })
 
-    # Sort by score (highest first)
-    results.sort(key=lambda x: x['score'], reverse=True)
-
-    db.close()
-
     return results
 
 
@@ -212,7 +200,82 @@ def classify_and_store(idea_id: int, transcription: str, threshold: float = 0.2)
     return assigned_domains
 
 
+def reclassify_ideas(only_unassigned: bool = False, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Re-route the whole voice_ideas backlog in batches
+
+    Uses the same index and coverage score as classify_idea, but reads
+    ideas page by page and writes each page with one executemany. Ideas
+    sharing no keyword with any domain are left untouched.
+
+    Args:
+        only_unassigned: Only classify ideas without a domain_id
+        batch_size: Ideas per read/write batch
+
+    Returns: {'scanned': n, 'assigned': n, 'unmatched': n}
+    """
+    index = get_classify_index()
+    stats = {'scanned': 0, 'assigned': 0, 'unmatched': 0}
+
+    if not len(index):
+        print("⚠️  No domain wordmaps found - run seed_domain_wordmaps.py")
+        return stats
+
+    db = get_db()
+
+    brand_ids = {
+        row['domain']: row['id']
+        for row in db.execute('SELECT id, domain FROM brands WHERE domain IS NOT NULL')
+    }
+
+    unassigned = 'AND domain_id IS NULL' if only_unassigned else ''
+    last_id = 0
+
+    while True:
+        ideas = db.execute(f'''
+            SELECT id, text FROM voice_ideas
+            WHERE id > ? {unassigned}
+            ORDER BY id
+            LIMIT ?
+        ''', (last_id, batch_size)).fetchall()
+
+        if not ideas:
+            break
+
+        updates = []
+        for idea in ideas:
+            best = index.best(extract_keywords(idea['text'] or ''), metric='coverage')
+            domain_id = brand_ids.get(best[0]) if best else None
+            if domain_id is None:
+                stats['unmatched'] += 1
+            else:
+                updates.append((domain_id, idea['id']))
+
+        db.executemany('''
+            UPDATE voice_ideas
+            SET domain_id = ?, auto_assigned = 1
+            WHERE id = ?
+        ''', updates)
+        db.commit()
+
+        stats['scanned'] += len(ideas)
+        stats['assigned'] += len(updates)
+        last_id = ideas[-1]['id']
+
+    db.close()
+
+    print(f"✅ Reclassified {stats['assigned']}/{stats['scanned']} ideas ({stats['unmatched']} unmatched)")
+
+    return stats
+
+
 if __name__ == '__main__':
+    import sys
+
+    if '--reclassify' in sys.argv:
+        reclassify_ideas(only_unassigned='--unassigned' in sys.argv)
+        sys.exit(0)
+
     # Test classification
     test_transcriptions = [
         "I hate cringe on social media. Everyone's so fake. We need authentic community where people can be real.",
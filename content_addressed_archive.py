@@ -15,9 +15,15 @@ Usage:
     # Export all predictions
     python3 content_addressed_archive.py --export-all
 
-    # Verify archive integrity
+    # Export in parallel (re-runs skip unchanged pairings)
+    python3 content_addressed_archive.py --export-all --workers 8
+
+    # Verify archive integrity (all entries, in parallel)
     python3 content_addressed_archive.py --verify
 
+    # Spot-check: changed entries + 500 least recently verified
+    python3 content_addressed_archive.py --verify --sample 500
+
     # Generate RSS feed
     python3 content_addressed_archive.py --generate-rss
 
@@ -26,15 +32,25 @@ Key difference from Archive.org:
 - Content hash = permanent identifier
 - Others can mirror if they want
 - No central authority needed
+
+voice-archive/manifest.jsonl records every exported entry (hash, audio
+size/mtime, source fingerprint, last verified). Exports skip entries whose
+source rows haven't changed, verification skips or samples entries whose
+files haven't changed, and index/gallery/RSS are rendered from it.
 """
 
+import os
 import sqlite3
 import hashlib
 import json
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from syndication import write_document
 
 # ==============================================================================
 # CONFIG
@@ -45,6 +61,10 @@ ARCHIVE_ROOT.mkdir(parents=True, exist_ok=True)
 
 DB_PATH = 'soulfra.db'
 
+MANIFEST_FILE = 'manifest.jsonl'
+AUDIO_CHUNK_SIZE = 1024 * 1024      # Audio is hashed in 1MB reads, never loaded whole
+CHECKPOINT_EVERY = 500              # Exports between DB/manifest checkpoints
+
 
 # ==============================================================================
 # CONTENT ADDRESSING
@@ -72,6 +92,26 @@ def calculate_content_hash(
     # Add audio data
     hasher.update(audio_data)
 
+    return _finish_content_hash(hasher, metadata, timestamp)
+
+
+def calculate_content_hash_from_file(
+    audio_path: Path,
+    metadata: Dict,
+    timestamp: str,
+    chunk_size: int = AUDIO_CHUNK_SIZE
+) -> str:
+    """Same hash as calculate_content_hash, reading the audio in chunks"""
+    hasher = hashlib.sha256()
+
+    with open(audio_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+
+    return _finish_content_hash(hasher, metadata, timestamp)
+
+
+def _finish_content_hash(hasher, metadata: Dict, timestamp: str) -> str:
     # Add sorted metadata (for determinism)
     metadata_json = json.dumps(metadata, sort_keys=True)
     hasher.update(metadata_json.encode('utf-8'))
@@ -108,10 +148,171 @@ def scrub_pii(text: str) -> str:
     return scrubbed
 
 
+# ==============================================================================
+# MANIFEST
+# ==============================================================================
+
+class ArchiveManifest:
+    """
+    Append-only manifest of exported entries (one JSON object per line)
+
+    Later lines for the same pairing win, so checkpoints are cheap appends
+    and an interrupted run resumes from the last flushed line. compact()
+    rewrites it with one line per entry.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = {}
+        self._pending: List[Dict] = []
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue        # Torn line from an interrupted checkpoint
+                self.entries[str(entry['pairing_id'])] = entry
+
+    def get(self, pairing_id) -> Optional[Dict]:
+        return self.entries.get(str(pairing_id))
+
+    def record(self, entry: Dict):
+        self.entries[str(entry['pairing_id'])] = entry
+        self._pending.append(entry)
+
+    def flush(self):
+        if not self._pending:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for entry in self._pending:
+                f.write(json.dumps(entry, sort_keys=True) + '\n')
+        self._pending = []
+
+    def compact(self):
+        self._pending = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix='.manifest-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for key in sorted(self.entries, key=int):
+                f.write(json.dumps(self.entries[key], sort_keys=True) + '\n')
+        os.replace(tmp_name, self.path)
+
+    def catalog(self) -> List[Dict]:
+        """Entries newest first, in the shape the index/gallery/RSS render"""
+        return sorted(self.entries.values(), key=lambda e: e.get('paired_at') or '', reverse=True)
+
+
+def _file_stat(path: Path) -> Optional[Tuple[int, float]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime
+
+
+def _verify_dir(hash_dir: Path) -> Dict:
+    """Re-hash one exported entry (streams audio.webm)"""
+    metadata_file = hash_dir / 'metadata.json'
+    audio_file = hash_dir / 'audio.webm'
+
+    if not metadata_file.exists() or not audio_file.exists():
+        return {'hash': hash_dir.name, 'status': 'missing_files'}
+
+    metadata = json.loads(metadata_file.read_text())
+    stored_hash = metadata['content_hash']
+
+    # Only the article fields that went into the hash (metadata.json also
+    # carries summary/article_hash)
+    article = {key: metadata['article'].get(key) for key in ('title', 'url', 'source', 'topics')}
+
+    calculated_hash = calculate_content_hash_from_file(
+        audio_file,
+        metadata={
+            'pairing_id': metadata['pairing']['pairing_id'],
+            'prediction': metadata['prediction'],
+            'article': article,
+            'recorded_at': metadata['recording']['recorded_at'],
+            'time_lock_until': metadata['pairing']['time_lock_until'],
+        },
+        timestamp=metadata['recording']['recorded_at']
+    )
+
+    if calculated_hash == stored_hash:
+        return {'hash': short_hash(stored_hash), 'status': 'verified',
+                'pairing_id': metadata['pairing']['pairing_id'], 'audio': _file_stat(audio_file)}
+
+    return {
+        'hash': short_hash(stored_hash),
+        'status': 'hash_mismatch',
+        'expected': stored_hash,
+        'calculated': calculated_hash
+    }
+
+
+_worker_archive = None
+
+
+def _init_export_worker(db_path: str, archive_root: Path):
+    global _worker_archive
+    _worker_archive = ContentAddressedArchive(db_path, archive_root)
+
+
+def _export_worker(job: Tuple) -> Tuple[int, Optional[Dict]]:
+    """Export one pairing in a pool process (no DB writes - parent batches them)"""
+    pairing_id, fingerprint, scrub_pii_flag, transcribe = job
+    archive = _worker_archive
+    try:
+        data = archive.get_pairing_data(pairing_id)
+        if not data:
+            return pairing_id, None
+        content_hash = data['content_hash'] or archive._content_hash(data)
+        export_dir = archive._write_export(data, content_hash, scrub_pii_flag, transcribe)
+        return pairing_id, archive._manifest_entry(data, content_hash, export_dir, fingerprint)
+    except Exception as e:
+        print(f"❌ Pairing {pairing_id} export failed: {e}")
+        return pairing_id, None
+
+
 # ==============================================================================
 # EXPORT SYSTEM
 # ==============================================================================
 
+# Everything that ends up in an export except the audio bytes themselves
+SOURCE_FINGERPRINT_SQL = """
+    SELECT
+        p.id,
+        p.user_prediction, p.time_lock_until, p.cringe_factor, p.paired_at,
+        r.filename, r.file_size, r.transcription, r.created_at, length(r.audio_data),
+        a.title, a.url, a.source, a.summary, a.topics, a.article_hash
+    FROM voice_article_pairings p
+    JOIN simple_voice_recordings r ON p.recording_id = r.id
+    LEFT JOIN news_articles a ON p.article_id = a.id
+"""
+
+CATALOG_SQL = """
+    SELECT
+        p.content_hash,
+        p.user_prediction,
+        p.paired_at,
+        p.cringe_factor,
+        p.export_path,
+        a.title as article_title,
+        a.url as article_url,
+        a.source as article_source,
+        a.topics as article_topics
+    FROM voice_article_pairings p
+    LEFT JOIN news_articles a ON p.article_id = a.id
+    WHERE p.content_hash IS NOT NULL
+    ORDER BY p.paired_at DESC
+"""
+
+
 class ContentAddressedArchive:
     """Export predictions to content-addressed directories"""
 
@@ -120,6 +321,13 @@ class ContentAddressedArchive:
         self.archive_root = archive_root
         self.db = sqlite3.connect(db_path)
         self.db.row_factory = sqlite3.Row
+        self._manifest = None
+
+    @property
+    def manifest(self) -> ArchiveManifest:
+        if self._manifest is None:
+            self._manifest = ArchiveManifest(self.archive_root / MANIFEST_FILE)
+        return self._manifest
 
     def get_pairing_data(self, pairing_id: int) -> Optional[Dict]:
         """Get complete prediction data from database"""
@@ -165,6 +373,20 @@ class ContentAddressedArchive:
         if not data:
             return None
 
+        content_hash = self._content_hash(data)
+
+        # Save hash to database
+        self.db.execute("""
+            UPDATE voice_article_pairings
+            SET content_hash = ?
+            WHERE id = ?
+        """, (content_hash, pairing_id))
+        self.db.commit()
+
+        return content_hash
+
+    def _content_hash(self, data: Dict) -> str:
+        """Content hash for a get_pairing_data() row"""
         # Build metadata dict
         metadata = {
             'pairing_id': data['pairing_id'],
@@ -180,22 +402,12 @@ class ContentAddressedArchive:
         }
 
         # Calculate hash
-        content_hash = calculate_content_hash(
+        return calculate_content_hash(
             audio_data=data['audio_data'],
             metadata=metadata,
             timestamp=data['recorded_at']
         )
 
-        # Save hash to database
-        self.db.execute("""
-            UPDATE voice_article_pairings
-            SET content_hash = ?
-            WHERE id = ?
-        """, (content_hash, pairing_id))
-        self.db.commit()
-
-        return content_hash
-
     def export_pairing(self, pairing_id: int, scrub_pii_flag: bool = True, transcribe: bool = True) -> Optional[Path]:
         """
         Export prediction to content-addressed directory
@@ -226,6 +438,29 @@ class ContentAddressedArchive:
         if not content_hash:
             content_hash = self.generate_content_hash_for_pairing(pairing_id)
 
+        export_dir = self._write_export(data, content_hash, scrub_pii_flag, transcribe)
+
+        # Update database
+        self.db.execute("""
+            UPDATE voice_article_pairings
+            SET exported_at = datetime('now'),
+                export_path = ?
+            WHERE id = ?
+        """, (str(export_dir), pairing_id))
+        self.db.commit()
+
+        fingerprint = self._source_fingerprints(pairing_id=pairing_id).get(pairing_id)
+        self.manifest.record(self._manifest_entry(data, content_hash, export_dir, fingerprint, scrub_pii_flag))
+        self.manifest.flush()
+
+        print(f"✅ Exported: {export_dir}")
+        print(f"   Hash: {short_hash(content_hash)}")
+
+        return export_dir
+
+    def _write_export(self, data: Dict, content_hash: str, scrub_pii_flag: bool, transcribe: bool) -> Path:
+        """Write one entry's files (no database writes - safe in a worker process)"""
+
         # Create content-addressed directory
         export_dir = self.archive_root / content_hash[:8]  # Use first 8 chars (like Git)
         export_dir.mkdir(parents=True, exist_ok=True)
@@ -330,19 +565,57 @@ Exported: {datetime.now().isoformat()}
         html_file = export_dir / 'index.html'
         html_file.write_text(html_content)
 
-        # Update database
-        self.db.execute("""
-            UPDATE voice_article_pairings
-            SET exported_at = datetime('now'),
-                export_path = ?
-            WHERE id = ?
-        """, (str(export_dir), pairing_id))
-        self.db.commit()
+        return export_dir
 
-        print(f"✅ Exported: {export_dir}")
-        print(f"   Hash: {short_hash(content_hash)}")
+    def _manifest_entry(self, data: Dict, content_hash: str, export_dir: Path,
+                        fingerprint: Optional[str], scrub_pii_flag: bool = True) -> Dict:
+        """Manifest line for an exported entry (also what the catalogs render)"""
+        prediction = data['user_prediction'] or ''
+        if scrub_pii_flag:
+            prediction = scrub_pii(prediction)
 
-        return export_dir
+        audio = _file_stat(export_dir / 'audio.webm')
+        return {
+            'pairing_id': data['pairing_id'],
+            'dir': export_dir.name,
+            'content_hash': content_hash,
+            'fingerprint': fingerprint,
+            'audio_size': audio[0] if audio else None,
+            'audio_mtime': audio[1] if audio else None,
+            'exported_at': datetime.now().isoformat(),
+            'last_verified': None,
+            'export_path': str(export_dir),
+            'user_prediction': prediction,
+            'paired_at': data['paired_at'],
+            'cringe_factor': data['cringe_factor'],
+            'article_title': data['article_title'],
+            'article_url': data['article_url'],
+            'article_source': data['article_source'],
+            'article_topics': data['article_topics'],
+        }
+
+    def _source_fingerprints(self, limit: Optional[int] = None, pairing_id: Optional[int] = None) -> Dict[int, str]:
+        """{pairing_id: hash of its exported source columns} without reading audio blobs"""
+        query = SOURCE_FINGERPRINT_SQL
+        params: Tuple = ()
+        if pairing_id is not None:
+            query += " WHERE p.id = ?"
+            params = (pairing_id,)
+        query += " ORDER BY p.id"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+
+        return {
+            row[0]: hashlib.sha256(json.dumps(list(row)[1:], default=str).encode('utf-8')).hexdigest()
+            for row in self.db.execute(query, params)
+        }
+
+    def _is_current(self, pairing_id: int, fingerprint: str) -> bool:
+        entry = self.manifest.get(pairing_id)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return False
+        audio = _file_stat(self.archive_root / entry['dir'] / 'audio.webm')
+        return audio is not None and audio[0] == entry['audio_size']
 
     def _generate_markdown(
         self,
@@ -648,30 +921,91 @@ Exported: {datetime.now().isoformat()}
 </html>
 """
 
-    def export_all(self, limit: Optional[int] = None) -> List[Path]:
-        """Export all pairings to content-addressed archive"""
+    def export_all(self, limit: Optional[int] = None, workers: Optional[int] = None,
+                   force: bool = False, scrub_pii_flag: bool = True, transcribe: bool = True) -> List[Path]:
+        """
+        Export all pairings to content-addressed archive
 
-        query = "SELECT id FROM voice_article_pairings"
-        if limit:
-            query += f" LIMIT {limit}"
+        Pairings whose source rows match the manifest are skipped (unless
+        force). The rest are exported in a process pool; content hashes,
+        export paths and manifest lines are checkpointed every
+        CHECKPOINT_EVERY exports, so an interrupted run resumes where it
+        stopped.
 
-        pairing_ids = [row['id'] for row in self.db.execute(query).fetchall()]
+        Args:
+            limit: Only consider the first N pairings
+            workers: Pool size (default: CPU count, 1 = in-process)
+            force: Re-export everything
+        """
 
-        print(f"📦 Exporting {len(pairing_ids)} predictions...")
+        fingerprints = self._source_fingerprints(limit=limit)
+        todo = [pid for pid, fp in fingerprints.items() if force or not self._is_current(pid, fp)]
+        skipped = len(fingerprints) - len(todo)
+
+        print(f"📦 Exporting {len(todo)} predictions ({skipped} unchanged, skipped)...")
+
+        jobs = [(pid, fingerprints[pid], scrub_pii_flag, transcribe) for pid in todo]
+        workers = workers or os.cpu_count() or 1
+        exported = 0
+        batch: List[Dict] = []
+
+        def checkpoint():
+            if not batch:
+                return
+            self.db.executemany("""
+                UPDATE voice_article_pairings
+                SET content_hash = COALESCE(content_hash, ?),
+                    exported_at = datetime('now'),
+                    export_path = ?
+                WHERE id = ?
+            """, [(e['content_hash'], e['export_path'], e['pairing_id']) for e in batch])
+            self.db.commit()
+            self.manifest.flush()
+            batch.clear()
+            print(f"   ... {exported}/{len(todo)}")
+
+        def collect(results: Iterable[Tuple[int, Optional[Dict]]]):
+            nonlocal exported
+            for _, entry in results:
+                if not entry:
+                    continue
+                self.manifest.record(entry)
+                batch.append(entry)
+                exported += 1
+                if len(batch) >= CHECKPOINT_EVERY:
+                    checkpoint()
+
+        if workers == 1 or len(jobs) < 2:
+            global _worker_archive
+            _worker_archive = self
+            collect(map(_export_worker, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker,
+                                     initargs=(self.db_path, self.archive_root)) as pool:
+                collect(pool.map(_export_worker, jobs, chunksize=16))
 
-        exported = []
-        for pairing_id in pairing_ids:
-            export_dir = self.export_pairing(pairing_id)
-            if export_dir:
-                exported.append(export_dir)
+        checkpoint()
+        self.manifest.compact()
 
-        print(f"\n✅ Exported {len(exported)}/{len(pairing_ids)} predictions")
+        print(f"\n✅ Exported {exported}/{len(todo)} predictions ({skipped} already current)")
         print(f"📁 Archive: {self.archive_root}")
 
-        return exported
+        return [self.archive_root / self.manifest.get(pid)['dir']
+                for pid in fingerprints if self.manifest.get(pid)]
+
+    def verify_archive(self, sample: Optional[int] = None, workers: Optional[int] = None) -> Dict:
+        """
+        Verify integrity of exported predictions
 
-    def verify_archive(self) -> Dict:
-        """Verify integrity of all exported predictions"""
+        Audio is streamed in chunks and entries are hashed in a thread pool
+        (hashlib and file reads release the GIL).
+
+        Args:
+            sample: None = re-hash every entry. N = re-hash entries whose
+                files changed since their last verification, plus the N
+                least recently verified.
+            workers: Thread pool size
+        """
 
         print("🔍 Verifying archive integrity...")
 
@@ -680,82 +1014,68 @@ Exported: {datetime.now().isoformat()}
             'verified': 0,
             'failed': 0,
             'missing': 0,
+            'checked': 0,
             'details': []
         }
 
-        # Find all exported directories
-        for hash_dir in self.archive_root.iterdir():
-            if not hash_dir.is_dir():
-                continue
-
-            results['total'] += 1
-
-            # Check required files
-            metadata_file = hash_dir / 'metadata.json'
-            audio_file = hash_dir / 'audio.webm'
-
-            if not metadata_file.exists() or not audio_file.exists():
-                results['missing'] += 1
-                results['details'].append({
-                    'hash': hash_dir.name,
-                    'status': 'missing_files'
-                })
-                continue
-
-            # Load metadata
-            metadata = json.loads(metadata_file.read_text())
-            stored_hash = metadata['content_hash']
-
-            # Recalculate hash
-            audio_data = audio_file.read_bytes()
-            calculated_hash = calculate_content_hash(
-                audio_data=audio_data,
-                metadata={
-                    'pairing_id': metadata['pairing']['pairing_id'],
-                    'prediction': metadata['prediction'],
-                    'article': metadata['article'],
-                    'recorded_at': metadata['recording']['recorded_at'],
-                    'time_lock_until': metadata['pairing']['time_lock_until'],
-                },
-                timestamp=metadata['recording']['recorded_at']
-            )
-
-            # Verify
-            if calculated_hash == stored_hash:
-                results['verified'] += 1
-                results['details'].append({
-                    'hash': short_hash(stored_hash),
-                    'status': 'verified'
-                })
-            else:
-                results['failed'] += 1
-                results['details'].append({
-                    'hash': short_hash(stored_hash),
-                    'status': 'hash_mismatch',
-                    'expected': stored_hash,
-                    'calculated': calculated_hash
-                })
+        entries = self.manifest.entries
+        if entries:
+            targets = {self.archive_root / e['dir']: e for e in entries.values()}
+        else:
+            # Archive exported before the manifest existed
+            targets = {d: None for d in self.archive_root.iterdir() if d.is_dir()}
+
+        results['total'] = len(targets)
+
+        if sample is not None:
+            changed, unchanged = [], []
+            for hash_dir, entry in targets.items():
+                audio = _file_stat(hash_dir / 'audio.webm')
+                if entry is None or not entry.get('last_verified') or \
+                        audio != (entry['audio_size'], entry['audio_mtime']):
+                    changed.append(hash_dir)
+                else:
+                    unchanged.append(hash_dir)
+            unchanged.sort(key=lambda d: targets[d]['last_verified'])
+            check = changed + unchanged[:sample]
+        else:
+            check = list(targets)
+
+        results['checked'] = len(check)
+        now = datetime.now().isoformat()
+
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+            for hash_dir, detail in zip(check, pool.map(_verify_dir, check)):
+                status = detail['status']
+                if status == 'missing_files':
+                    results['missing'] += 1
+                elif status == 'verified':
+                    results['verified'] += 1
+                    entry = targets[hash_dir] or self.manifest.get(detail['pairing_id'])
+                    if entry:
+                        audio = detail['audio']
+                        self.manifest.record(dict(entry, last_verified=now,
+                                                  audio_size=audio[0], audio_mtime=audio[1]))
+                else:
+                    results['failed'] += 1
+                results['details'].append({k: v for k, v in detail.items() if k not in ('pairing_id', 'audio')})
+
+        if self.manifest.entries:
+            self.manifest.compact()
 
         return results
 
+    def _catalog(self) -> List[Dict]:
+        """Exported entries newest first - from the manifest, no directory walk"""
+        if self.manifest.entries:
+            return self.manifest.catalog()
+        return [dict(row) for row in self.db.execute(CATALOG_SQL).fetchall()]
+
     def generate_rss_feed(self) -> Path:
         """Generate RSS feed with content hashes"""
 
         # Get all exported pairings
-        pairings = self.db.execute("""
-            SELECT
-                p.content_hash,
-                p.user_prediction,
-                p.paired_at,
-                p.export_path,
-                a.title as article_title,
-                a.url as article_url,
-                a.source as article_source
-            FROM voice_article_pairings p
-            LEFT JOIN news_articles a ON p.article_id = a.id
-            WHERE p.content_hash IS NOT NULL
-            ORDER BY p.paired_at DESC
-        """).fetchall()
+        pairings = self._catalog()
 
         # Build RSS XML
         rss = f"""<?xml version="1.0" encoding="UTF-8"?>
@@ -794,28 +1114,17 @@ Exported: {datetime.now().isoformat()}
 
         # Save RSS feed
         rss_file = self.archive_root / 'feed.xml'
-        rss_file.write_text(rss)
-
-        print(f"✅ Generated RSS feed: {rss_file}")
+        if write_document(rss_file, [rss]):
+            print(f"✅ Generated RSS feed: {rss_file}")
+        else:
+            print(f"✓ RSS feed unchanged: {rss_file}")
 
         return rss_file
 
     def generate_index(self) -> Path:
         """Generate index.md catalog of all predictions"""
 
-        pairings = self.db.execute("""
-            SELECT
-                p.content_hash,
-                p.user_prediction,
-                p.paired_at,
-                p.cringe_factor,
-                a.title as article_title,
-                a.topics as article_topics
-            FROM voice_article_pairings p
-            LEFT JOIN news_articles a ON p.article_id = a.id
-            WHERE p.content_hash IS NOT NULL
-            ORDER BY p.paired_at DESC
-        """).fetchall()
+        pairings = self._catalog()
 
         index_md = f"""# Voice Predictions Archive
 
@@ -866,30 +1175,17 @@ git push my-mirror main
 """
 
         index_file = self.archive_root / 'index.md'
-        index_file.write_text(index_md)
-
-        print(f"✅ Generated index: {index_file}")
+        if write_document(index_file, [index_md]):
+            print(f"✅ Generated index: {index_file}")
+        else:
+            print(f"✓ Index unchanged: {index_file}")
 
         return index_file
 
     def generate_gallery(self) -> Path:
         """Generate index.html gallery for GitHub Pages"""
 
-        pairings = self.db.execute("""
-            SELECT
-                p.content_hash,
-                p.user_prediction,
-                p.paired_at,
-                p.cringe_factor,
-                a.title as article_title,
-                a.url as article_url,
-                a.source as article_source,
-                a.topics as article_topics
-            FROM voice_article_pairings p
-            LEFT JOIN news_articles a ON p.article_id = a.id
-            WHERE p.content_hash IS NOT NULL
-            ORDER BY p.paired_at DESC
-        """).fetchall()
+        pairings = self._catalog()
 
         gallery_html = f"""<!DOCTYPE html>
 <html lang="en">
@@ -1108,9 +1404,10 @@ git push my-mirror main
 """
 
         gallery_file = self.archive_root / 'index.html'
-        gallery_file.write_text(gallery_html)
-
-        print(f"✅ Generated gallery: {gallery_file}")
+        if write_document(gallery_file, [gallery_html]):
+            print(f"✅ Generated gallery: {gallery_file}")
+        else:
+            print(f"✓ Gallery unchanged: {gallery_file}")
 
         return gallery_file
 
@@ -1163,7 +1460,7 @@ git push my-mirror main
         # Commit changes
         if not commit_message:
             # Count predictions
-            num_predictions = len(list(self.archive_root.glob('*/metadata.json')))
+            num_predictions = len(self.manifest.entries) or len(list(self.archive_root.glob('*/metadata.json')))
             commit_message = f"Update archive: {num_predictions} predictions ({datetime.now().strftime('%Y-%m-%d')})"
 
         try:
@@ -1264,6 +1561,25 @@ def main():
         help='Limit number of exports (for testing)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Parallel export/verify workers (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-export pairings even if unchanged'
+    )
+
+    parser.add_argument(
+        '--sample',
+        type=int,
+        metavar='N',
+        help='Verify changed entries + N least recently verified instead of all'
+    )
+
     args = parser.parse_args()
 
     archive = ContentAddressedArchive()
@@ -1272,15 +1588,15 @@ def main():
         archive.export_pairing(args.export_pairing)
 
     elif args.export_all:
-        archive.export_all(limit=args.limit)
+        archive.export_all(limit=args.limit, workers=args.workers, force=args.force)
 
     elif args.verify:
-        results = archive.verify_archive()
+        results = archive.verify_archive(sample=args.sample, workers=args.workers)
 
         print(f"\n{'='*60}")
         print("  VERIFICATION RESULTS")
         print(f"{'='*60}\n")
-        print(f"Total:    {results['total']}")
+        print(f"Total:    {results['total']} ({results['checked']} checked)")
         print(f"✅ Verified: {results['verified']}")
         print(f"❌ Failed:   {results['failed']}")
         print(f"⚠️  Missing:  {results['missing']}\n")
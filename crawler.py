@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Crawler - Shared concurrent, polite HTTP engine for audits and scraping
+
+Domain audits (scrape_live_domains, domain_health, deployment_verifier,
+validate_links, api_health_scanner) used to fetch one URL at a time over a
+fresh connection, with fixed sleeps for politeness. They now run as jobs on
+one engine:
+
+- Global concurrency limit (worker pool) plus a per-host limit
+- Per-host keep-alive connection pools (one requests.Session per host)
+- Per-host politeness delay between request starts (robots Crawl-delay wins
+  if larger)
+- robots.txt fetched once per host and honoured for crawled pages
+- Conditional GET (ETag / Last-Modified) against a persistent response
+  cache in SQLite - unchanged pages come back as 304 and are served locally
+- Dedup: each (method, URL) is fetched once per Crawler (until reset());
+  concurrent callers asking for the same URL wait on the same request
+
+Results mimic requests.Response (status_code, headers, content, text, json(),
+ok, elapsed), so existing checks only swap `requests.get(...)` for
+`crawler.request('GET', ...)`, which re-raises the original requests
+exception on failure.
+
+Usage:
+    from crawler import Crawler
+
+    crawler = Crawler(concurrency=16, per_host=4, delay=0.5)
+
+    # Health-check style: warm everything concurrently, then check serially
+    crawler.prefetch([('HEAD', url) for url in urls])
+    response = crawler.request('HEAD', urls[0])
+
+    # Crawl style: follow links, on_page runs in the calling thread
+    stats = crawler.crawl(['https://soulfra.com/'], on_page=store, max_pages=200, max_depth=2)
+    print(crawler.report())
+
+    python3 crawler.py https://soulfra.com --max-pages 50
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib import robotparser
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from database import get_db
+from schema_registry import register_migration
+
+
+USER_AGENT = 'SoulfraCrawler/1.0 (+https://soulfra.com/bot)'
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_TIMEOUT = 10
+MAX_CACHED_BODY = 2 * 1024 * 1024       # Larger bodies aren't kept in the response cache
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+CRAWL_CACHE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS crawl_cache (
+        url TEXT PRIMARY KEY,
+        status_code INTEGER NOT NULL,
+        headers TEXT NOT NULL,
+        body BLOB,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+]
+register_migration(114, 'crawler response cache', *CRAWL_CACHE_SCHEMA, module='crawler')
+
+
+# ==============================================================================
+# RESULTS
+# ==============================================================================
+
+class CrawlResult:
+    """A fetched page, shaped like requests.Response"""
+
+    def __init__(self, url: str, method: str = 'GET', status_code: Optional[int] = None,
+                 headers=None, content: bytes = b'', elapsed: float = 0.0,
+                 error: Optional[Exception] = None, from_cache: bool = False, final_url: Optional[str] = None):
+        self.url = final_url or url
+        self.requested_url = url
+        self.method = method
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content
+        self.elapsed = timedelta(seconds=elapsed)
+        self.error = error
+        self.from_cache = from_cache        # True when a 304 was answered from crawl_cache
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        match = re.search(r'charset=([\w-]+)', self.headers.get('Content-Type', ''))
+        try:
+            return self.content.decode(match.group(1) if match else 'utf-8', errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.text)
+
+    @property
+    def is_html(self) -> bool:
+        return 'html' in self.headers.get('Content-Type', '')
+
+    def links(self) -> List[str]:
+        """Absolute, fragment-free hrefs of <a> tags"""
+        if not self.is_html:
+            return []
+        parser = _LinkParser()
+        parser.feed(self.text)
+        return [urldefrag(urljoin(self.url, href))[0] for href in parser.hrefs]
+
+    def raise_for_error(self) -> 'CrawlResult':
+        if self.error is not None:
+            raise self.error
+        return self
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href and not href.startswith(('mailto:', 'javascript:', 'tel:')):
+                self.hrefs.append(href)
+
+
+class _Host:
+    """Per-host connection pool and politeness state"""
+
+    def __init__(self, per_host: int, user_agent: str):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+        self.slots = threading.BoundedSemaphore(per_host)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.robots = None
+        self.crawl_delay = 0.0
+
+
+# ==============================================================================
+# ENGINE
+# ==============================================================================
+
+class Crawler:
+    """Concurrent HTTP fetcher with per-host politeness and a persistent response cache"""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_host: int = DEFAULT_PER_HOST,
+                 delay: float = 0.0, timeout: float = DEFAULT_TIMEOUT, user_agent: str = USER_AGENT,
+                 cache: bool = True, respect_robots: bool = True):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.delay = delay
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.cache = cache
+        self.respect_robots = respect_robots
+
+        self._hosts: Dict[str, _Host] = {}
+        self._seen: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self._global = threading.BoundedSemaphore(concurrency)
+        self.stats = {'requests': 0, 'pages': 0, 'not_modified': 0, 'errors': 0,
+                      'robots_blocked': 0, 'bytes': 0, 'seconds': 0.0}
+
+        if cache:
+            db = get_db()
+            for statement in CRAWL_CACHE_SCHEMA:
+                db.execute(statement)
+            db.commit()
+            db.close()
+
+    # --------------------------------------------------------------------------
+    # Single fetches
+    # --------------------------------------------------------------------------
+
+    def fetch(self, url: str, method: str = 'GET', allow_redirects: bool = True,
+              timeout: Optional[float] = None) -> CrawlResult:
+        """
+        Fetch a URL once per Crawler; repeats (and concurrent duplicates)
+        return the first result
+        """
+        key = (method.upper(), url)
+        with self._lock:
+            future = self._seen.get(key)
+            owner = future is None
+            if owner:
+                future = self._seen[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(self._fetch(url, key[0], allow_redirects, timeout or self.timeout))
+            except BaseException as e:      # never leave waiters hanging
+                future.set_result(CrawlResult(url, key[0], error=e))
+        return future.result()
+
+    def reset(self):
+        """Forget fetched URLs (start a new audit round); connection pools are kept"""
+        with self._lock:
+            self._seen = {}
+
+    def request(self, method: str, url: str, allow_redirects: bool = True,
+                timeout: Optional[float] = None) -> CrawlResult:
+        """Drop-in for requests.request: returns the result or raises its requests exception"""
+        return self.fetch(url, method, allow_redirects, timeout).raise_for_error()
+
+    def prefetch(self, items: Iterable, allow_redirects: bool = True) -> List[CrawlResult]:
+        """
+        Fetch many URLs concurrently (results in input order)
+
+        Items are URLs, (method, url) or (method, url, {'allow_redirects': ...}).
+        """
+        jobs = []
+        for item in items:
+            if isinstance(item, str):
+                item = ('GET', item)
+            method, url = item[0], item[1]
+            options = item[2] if len(item) > 2 else {}
+            jobs.append((url, method, options.get('allow_redirects', allow_redirects)))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(lambda job: self.fetch(*job), jobs))
+        self._add_time(time.perf_counter() - started)
+        return results
+
+    def _fetch(self, url: str, method: str, allow_redirects: bool, timeout: float) -> CrawlResult:
+        host = self._host(url)
+        cached = self._load_cached(url) if self.cache and method == 'GET' else None
+
+        headers = {}
+        if cached and cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        with self._global, host.slots:
+            self._wait_turn(host)
+            started = time.perf_counter()
+            try:
+                response = host.session.request(method, url, headers=headers, timeout=timeout,
+                                                allow_redirects=allow_redirects)
+            except requests.RequestException as e:
+                self._count(errors=1, requests=1)
+                return CrawlResult(url, method, error=e, elapsed=time.perf_counter() - started)
+            elapsed = time.perf_counter() - started
+
+        if response.status_code == 304 and cached:
+            self._count(requests=1, pages=1, not_modified=1)
+            return CrawlResult(url, method, cached['status_code'], json.loads(cached['headers']),
+                               cached['body'] or b'', elapsed, from_cache=True)
+
+        content = response.content
+        self._count(requests=1, pages=1, bytes=len(content))
+        if (self.cache and method == 'GET' and response.status_code == 200 and len(content) <= MAX_CACHED_BODY
+                and (response.headers.get('ETag') or response.headers.get('Last-Modified'))):
+            self._store_cached(url, response, content)
+
+        return CrawlResult(url, method, response.status_code, dict(response.headers), content,
+                           elapsed, final_url=response.url)
+
+    # --------------------------------------------------------------------------
+    # Crawling
+    # --------------------------------------------------------------------------
+
+    def crawl(self, seeds: Iterable[str], on_page: Optional[Callable[[CrawlResult], Optional[Iterable[str]]]] = None,
+              max_pages: int = 100, max_depth: Optional[int] = None, same_host: bool = True) -> Dict:
+        """
+        Breadth-first crawl from seeds
+
+        Args:
+            seeds: Starting URLs
+            on_page: Called in this thread for each result; may return the
+                     URLs to follow (default: the page's links)
+            max_pages: Stop scheduling after this many URLs
+            max_depth: 0 = seeds only, None = unlimited
+            same_host: Only follow links on the seed's host
+
+        Returns:
+            Stats for this crawl: pages, errors, not_modified, robots_blocked,
+            seconds, pages_per_sec
+        """
+        seed_hosts = {urlparse(seed).netloc for seed in seeds}
+        visited = set()
+        crawl = {'pages': 0, 'errors': 0, 'not_modified': 0, 'robots_blocked': 0}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = {}
+
+            def schedule(url, depth):
+                url = urldefrag(url)[0]
+                if url in visited or len(visited) >= max_pages:
+                    return
+                if urlparse(url).scheme not in ('http', 'https'):
+                    return
+                if same_host and urlparse(url).netloc not in seed_hosts:
+                    return
+                visited.add(url)
+                pending[pool.submit(self._crawl_fetch, url)] = depth
+
+            for seed in seeds:
+                schedule(seed, 0)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth = pending.pop(future)
+                    result = future.result()
+                    if result is None:
+                        crawl['robots_blocked'] += 1
+                        continue
+
+                    crawl['pages'] += 1
+                    crawl['errors'] += result.error is not None
+                    crawl['not_modified'] += result.from_cache
+
+                    follow = on_page(result) if on_page else None
+                    if follow is None:
+                        follow = result.links() if result.ok else []
+                    if max_depth is None or depth < max_depth:
+                        for link in follow:
+                            schedule(link, depth + 1)
+
+        seconds = time.perf_counter() - started
+        self._add_time(seconds)
+        crawl['seconds'] = round(seconds, 3)
+        crawl['pages_per_sec'] = round(crawl['pages'] / seconds, 1) if seconds else 0.0
+        return crawl
+
+    def _crawl_fetch(self, url: str) -> Optional[CrawlResult]:
+        if self.respect_robots and not self.allowed(url):
+            self._count(robots_blocked=1)
+            return None
+        return self.fetch(url)
+
+    # --------------------------------------------------------------------------
+    # Politeness
+    # --------------------------------------------------------------------------
+
+    def allowed(self, url: str) -> bool:
+        """robots.txt check (fetched once per host; unreachable robots.txt allows all)"""
+        parsed = urlparse(url)
+        host = self._host(url)
+        with host.lock:
+            robots = host.robots
+        if robots is None:
+            robots = robotparser.RobotFileParser()
+            result = self.fetch(f'{parsed.scheme}://{parsed.netloc}/robots.txt')
+            if result.status_code == 200:
+                robots.parse(result.text.splitlines())
+            else:
+                robots.allow_all = True
+            with host.lock:
+                host.robots = robots
+                host.crawl_delay = float(robots.crawl_delay(self.user_agent) or 0)
+        return robots.can_fetch(self.user_agent, url)
+
+    def _host(self, url: str) -> _Host:
+        netloc = urlparse(url).netloc
+        with self._lock:
+            host = self._hosts.get(netloc)
+            if host is None:
+                host = self._hosts[netloc] = _Host(self.per_host, self.user_agent)
+            return host
+
+    def _wait_turn(self, host: _Host):
+        """Space request starts to one host by the politeness delay"""
+        delay = max(self.delay, host.crawl_delay)
+        if not delay:
+            return
+        with host.lock:
+            now = time.monotonic()
+            start = max(now, host.next_start)
+            host.next_start = start + delay
+        if start > now:
+            time.sleep(start - now)
+
+    # --------------------------------------------------------------------------
+    # Response cache
+    # --------------------------------------------------------------------------
+
+    def _load_cached(self, url: str) -> Optional[Dict]:
+        db = get_db()
+        row = db.execute('SELECT status_code, headers, body, etag, last_modified FROM crawl_cache WHERE url = ?',
+                         (url,)).fetchone()
+        db.close()
+        return dict(row) if row else None
+
+    def _store_cached(self, url: str, response, content: bytes):
+        db = get_db()
+        db.execute('''
+            INSERT OR REPLACE INTO crawl_cache (url, status_code, headers, body, etag, last_modified, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (url, response.status_code, json.dumps(dict(response.headers)), content,
+              response.headers.get('ETag'), response.headers.get('Last-Modified')))
+        db.commit()
+        db.close()
+
+    # --------------------------------------------------------------------------
+    # Stats
+    # --------------------------------------------------------------------------
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def _add_time(self, seconds: float):
+        with self._lock:
+            self.stats['seconds'] += seconds
+
+    def report(self) -> str:
+        stats = self.stats
+        rate = stats['pages'] / stats['seconds'] if stats['seconds'] else 0.0
+        return (f"📊 {stats['pages']} pages in {stats['seconds']:.2f}s ({rate:.1f} pages/sec), "
+                f"{stats['not_modified']} not modified, {stats['errors']} errors, "
+                f"{stats['robots_blocked']} blocked by robots.txt, {stats['bytes'] / 1024:.0f} KB")
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Polite concurrent crawler')
+    parser.add_argument('seeds', nargs='+', help='Start URLs')
+    parser.add_argument('--max-pages', type=int, default=100)
+    parser.add_argument('--max-depth', type=int, default=None)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST)
+    parser.add_argument('--delay', type=float, default=0.5, help='Seconds between requests to one host')
+    args = parser.parse_args()
+
+    crawler = Crawler(concurrency=args.concurrency, per_host=args.per_host, delay=args.delay)
+
+    def show(result):
+        mark = '✅' if result.ok else '⚠️ '
+        print(f"{mark} {result.status_code or result.error} {result.url}{' (304)' if result.from_cache else ''}")
+
+    crawler.crawl(args.seeds, on_page=show, max_pages=args.max_pages, max_depth=args.max_depth)
+    print(crawler.report())
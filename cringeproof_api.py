@@ -765,17 +765,10 @@ def suggest_ideas_by_word(word):
     """
     db = get_db()
 
-    # Search in simple_voice_recordings transcriptions
-    search_pattern = f'%{word}%'
-
     try:
-        recordings = db.execute('''
-            SELECT id, filename, transcription, created_at
-            FROM simple_voice_recordings
-            WHERE transcription LIKE ?
-            ORDER BY created_at DESC
-            LIMIT 10
-        ''', (search_pattern,)).fetchall()
+        # Full-text search over simple_voice_recordings transcriptions
+        from full_text_search import search as full_text_search
+        recordings = full_text_search('recordings', word, limit=10, db=db)
 
         results = []
         for rec in recordings:
@@ -20,11 +20,22 @@ import os
 DB_NAME = os.environ.get('SOULFRA_DB', 'soulfra.db')
 DB_PATH = os.path.join(os.path.dirname(__file__), DB_NAME)
 
+# Optional trace hook (see schema_registry.IndexAdvisor) - receives every SQL statement
+_query_observer = None
+
+
+def set_query_observer(callback):
+    """Install (or clear with None) a callback that sees every statement run via get_db()"""
+    global _query_observer
+    _query_observer = callback
+
 
 def get_db():
     """Get database connection"""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # Return dict-like rows
+    if _query_observer is not None:
+        conn.set_trace_callback(_query_observer)
     return conn
 
 
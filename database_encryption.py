@@ -11,10 +11,21 @@ Encrypted Fields:
 - message content (messages table)
 - session tokens (sessions table)
 
+Keys and formats:
+- Values are stored as key_id:base64(iv):base64(ciphertext+tag). Values
+  written before key ids existed (iv:ciphertext) belong to the legacy key
+- DB_ENCRYPTION_KEY is the current key; DB_ENCRYPTION_OLD_KEYS (comma
+  separated, base64) keeps retired keys readable until rotation is done
+- One AEAD context per key id is built once and reused for every value
+  (get_encryption() shares one instance per process)
+
+Encrypting existing data and key rotation run online, in primary-key
+chunks with resumable checkpoints (see encryption_jobs.py).
+
 Usage:
-    from database_encryption import DatabaseEncryption
+    from database_encryption import DatabaseEncryption, get_encryption
 
-    db_enc = DatabaseEncryption()
+    db_enc = get_encryption()
 
     # Encrypt a value
     encrypted = db_enc.encrypt_field("secret@example.com")
@@ -22,17 +33,44 @@ Usage:
     # Decrypt a value
     decrypted = db_enc.decrypt_field(encrypted)
 
-    # Batch encrypt existing data
+    # List views: decrypt a page of rows at once
+    users = db_enc.decrypt_rows(rows, {'email_encrypted': 'email'})
+
+    # Batch encrypt existing data / rotate to the current key
     db_enc.encrypt_existing_data()
+    db_enc.rotate_keys()
+
+    python3 database_encryption.py --rotate
+    python3 database_encryption.py --benchmark
 """
 
 import os
 import base64
-from typing import Optional, Tuple
-from Crypto.Cipher import AES
-from Crypto.Random import get_random_bytes
+import hashlib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import voice_encryption
 from database import get_db
+from encryption_jobs import DEFAULT_CHUNK_SIZE, EncryptionJob
+
+
+LEGACY_KEY_ID = 'legacy'        # Values stored as iv:ciphertext (no key id)
+
+# (table, encrypted column, plaintext source column, primary key)
+ENCRYPTED_COLUMNS = [
+    ('soulfra_master_users', 'email_encrypted', 'email', 'id'),
+    ('professionals', 'phone_encrypted', 'phone', 'id'),
+    ('professionals', 'email_encrypted', 'email', 'id'),
+    ('messages', 'content_encrypted', 'content', 'id'),
+]
+
+
+def key_id_for(key: bytes) -> str:
+    """Short public identifier of a key (first 8 hex chars of its SHA-256)"""
+    return hashlib.sha256(key).hexdigest()[:8]
+
 
 class DatabaseEncryption:
     """
@@ -45,13 +83,15 @@ class DatabaseEncryption:
     - Session tokens
     """
 
-    def __init__(self, master_key: Optional[bytes] = None):
+    def __init__(self, master_key: Optional[bytes] = None, old_keys: Sequence[bytes] = ()):
         """
         Initialize database encryption
 
         Args:
             master_key: Optional master encryption key. If not provided,
                        loads from environment variable DB_ENCRYPTION_KEY
+            old_keys: Retired keys that can still decrypt. If not provided,
+                       loads from DB_ENCRYPTION_OLD_KEYS
         """
         # Get or generate master key
         if master_key:
@@ -67,6 +107,22 @@ class DatabaseEncryption:
                 print(f"⚠️  Generated new DB encryption key: {base64.b64encode(self.master_key).decode()}")
                 print("   Save this to environment variable DB_ENCRYPTION_KEY")
 
+        if not old_keys and os.environ.get('DB_ENCRYPTION_OLD_KEYS'):
+            old_keys = [base64.b64decode(k) for k in os.environ['DB_ENCRYPTION_OLD_KEYS'].split(',') if k.strip()]
+
+        # One AEAD context per key id, built once
+        self.key_id = key_id_for(self.master_key)
+        self._aeads: Dict[str, AESGCM] = {self.key_id: voice_encryption.get_aead(self.master_key)}
+        for key in old_keys:
+            self._aeads.setdefault(key_id_for(key), voice_encryption.get_aead(key))
+
+        # Legacy values carry no key id: try the oldest configured key first
+        self._legacy_candidates = [voice_encryption.get_aead(k) for k in (*reversed(old_keys), self.master_key)]
+
+    # --------------------------------------------------------------------------
+    # Single values
+    # --------------------------------------------------------------------------
+
     def encrypt_field(self, plaintext: str) -> str:
         """
         Encrypt a database field
@@ -75,165 +131,123 @@ class DatabaseEncryption:
             plaintext: Plain text to encrypt
 
         Returns:
-            Base64-encoded encrypted value in format: iv:ciphertext
+            Encrypted value in format: key_id:base64(iv):base64(ciphertext+tag)
         """
         if not plaintext or plaintext == "":
             return ""
 
-        # Generate IV
         iv = voice_encryption.generate_iv()
+        encrypted_data = self._aeads[self.key_id].encrypt(iv, plaintext.encode('utf-8'), None)
 
-        # Encrypt using AES-256-GCM
-        cipher = AES.new(self.master_key, AES.MODE_GCM, nonce=iv)
-        ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode('utf-8'))
-
-        # Combine ciphertext and tag
-        encrypted_data = ciphertext + tag
-
-        # Format: base64(iv):base64(ciphertext+tag)
         iv_b64 = base64.b64encode(iv).decode('utf-8')
         cipher_b64 = base64.b64encode(encrypted_data).decode('utf-8')
 
-        return f"{iv_b64}:{cipher_b64}"
+        return f"{self.key_id}:{iv_b64}:{cipher_b64}"
 
     def decrypt_field(self, encrypted: str) -> str:
         """
         Decrypt a database field
 
         Args:
-            encrypted: Encrypted value in format: iv:ciphertext
+            encrypted: Encrypted value (key_id:iv:ciphertext, or legacy iv:ciphertext)
 
         Returns:
-            Decrypted plaintext
+            Decrypted plaintext ("[ENCRYPTED]" if it can't be decrypted)
         """
         if not encrypted or encrypted == "":
             return ""
 
         try:
-            # Parse format: base64(iv):base64(ciphertext+tag)
-            iv_b64, cipher_b64 = encrypted.split(':', 1)
-            iv = base64.b64decode(iv_b64)
-            encrypted_data = base64.b64decode(cipher_b64)
-
-            # Split ciphertext and tag (tag is last 16 bytes)
-            ciphertext = encrypted_data[:-16]
-            tag = encrypted_data[-16:]
-
-            # Decrypt using AES-256-GCM
-            cipher = AES.new(self.master_key, AES.MODE_GCM, nonce=iv)
-            plaintext_bytes = cipher.decrypt_and_verify(ciphertext, tag)
-
-            return plaintext_bytes.decode('utf-8')
+            return self.decrypt_strict(encrypted)
         except Exception as e:
             print(f"⚠️  Decryption error: {e}")
             return "[ENCRYPTED]"
 
-    def encrypt_existing_data(self):
+    def decrypt_strict(self, encrypted: str) -> str:
+        """Decrypt or raise (ValueError / cryptography InvalidTag) - for jobs that must tell failures apart"""
+        parts = encrypted.split(':')
+        if len(parts) == 2:
+            iv, data = base64.b64decode(parts[0]), base64.b64decode(parts[1])
+            for aead in self._legacy_candidates:      # Oldest key first
+                try:
+                    return aead.decrypt(iv, data, None).decode('utf-8')
+                except Exception:
+                    continue
+            raise ValueError("No configured key decrypts this legacy value")
+
+        key_id, iv_b64, cipher_b64 = parts
+        aead = self._aeads.get(key_id)
+        if aead is None:
+            raise ValueError(f"Unknown key id: {key_id}")
+        return aead.decrypt(base64.b64decode(iv_b64), base64.b64decode(cipher_b64), None).decode('utf-8')
+
+    def value_key_id(self, encrypted: str) -> Optional[str]:
+        """Key id an encrypted value was written with (LEGACY_KEY_ID for iv:ciphertext)"""
+        if not encrypted:
+            return None
+        parts = encrypted.split(':')
+        return parts[0] if len(parts) == 3 else LEGACY_KEY_ID
+
+    def needs_rotation(self, encrypted: str) -> bool:
+        return bool(encrypted) and self.value_key_id(encrypted) != self.key_id
+
+    # --------------------------------------------------------------------------
+    # Batches (list views)
+    # --------------------------------------------------------------------------
+
+    def encrypt_many(self, values: Iterable[str]) -> List[str]:
+        return [self.encrypt_field(value) for value in values]
+
+    def decrypt_many(self, values: Iterable[str]) -> List[str]:
+        """Decrypt a batch (repeated ciphertexts are decrypted once)"""
+        seen: Dict[str, str] = {}
+        out = []
+        for value in values:
+            if value not in seen:
+                seen[value] = self.decrypt_field(value)
+            out.append(seen[value])
+        return out
+
+    def decrypt_rows(self, rows: Iterable, columns: Dict[str, str]) -> List[Dict]:
         """
-        Migrate existing plaintext data to encrypted format
+        Decrypt columns of a page of rows
 
-        This is a ONE-TIME operation to encrypt existing data.
-        Should be run after adding encryption columns to database.
+        Args:
+            rows: sqlite3.Row objects or dicts
+            columns: {'email_encrypted': 'email', ...} - encrypted column -> output key
 
-        Steps:
-        1. Check if encrypted columns exist
-        2. For each sensitive field, if encrypted version is NULL:
-           - Encrypt plaintext value
-           - Save to encrypted column
-           - Optionally clear plaintext column
+        Returns:
+            Rows as dicts with the decrypted values added under the output keys
         """
-        db = get_db()
+        rows = [dict(row) for row in rows]
+        for column, output in columns.items():
+            for row, plaintext in zip(rows, self.decrypt_many(row.get(column) for row in rows)):
+                row[output] = plaintext
+        return rows
+
+    # --------------------------------------------------------------------------
+    # Migration and rotation
+    # --------------------------------------------------------------------------
 
+    def encrypt_existing_data(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Migrate existing plaintext data to encrypted format
+
+        Safe to re-run and to interrupt: each column is encrypted in
+        primary-key chunks with a checkpoint, and rows that already have
+        an encrypted value are left alone. Plaintext columns are kept.
+        """
         print("🔐 Starting database encryption migration...")
         print()
 
-        # 1. Encrypt emails in soulfra_master_users
-        print("📧 Encrypting soulfra_master_users.email...")
-        rows = db.execute('''
-            SELECT master_user_id, email
-            FROM soulfra_master_users
-            WHERE email IS NOT NULL AND email != ''
-              AND (email_encrypted IS NULL OR email_encrypted = '')
-        ''').fetchall()
-
-        encrypted_count = 0
-        for row in rows:
-            encrypted_email = self.encrypt_field(row['email'])
-            db.execute('''
-                UPDATE soulfra_master_users
-                SET email_encrypted = ?
-                WHERE master_user_id = ?
-            ''', (encrypted_email, row['master_user_id']))
-            encrypted_count += 1
-
-        db.commit()
-        print(f"   ✅ Encrypted {encrypted_count} emails")
-
-        # 2. Encrypt phone numbers in professionals table
-        print("📞 Encrypting professionals.phone...")
-        rows = db.execute('''
-            SELECT id, phone
-            FROM professionals
-            WHERE phone IS NOT NULL AND phone != ''
-              AND (phone_encrypted IS NULL OR phone_encrypted = '')
-        ''').fetchall()
-
-        encrypted_count = 0
-        for row in rows:
-            encrypted_phone = self.encrypt_field(row['phone'])
-            db.execute('''
-                UPDATE professionals
-                SET phone_encrypted = ?
-                WHERE id = ?
-            ''', (encrypted_phone, row['id']))
-            encrypted_count += 1
-
-        db.commit()
-        print(f"   ✅ Encrypted {encrypted_count} phone numbers")
-
-        # 3. Encrypt email in professionals table
-        print("📧 Encrypting professionals.email...")
-        rows = db.execute('''
-            SELECT id, email
-            FROM professionals
-            WHERE email IS NOT NULL AND email != ''
-              AND (email_encrypted IS NULL OR email_encrypted = '')
-        ''').fetchall()
-
-        encrypted_count = 0
-        for row in rows:
-            encrypted_email = self.encrypt_field(row['email'])
-            db.execute('''
-                UPDATE professionals
-                SET email_encrypted = ?
-                WHERE id = ?
-            ''', (encrypted_email, row['id']))
-            encrypted_count += 1
-
-        db.commit()
-        print(f"   ✅ Encrypted {encrypted_count} professional emails")
-
-        # 4. Encrypt message content
-        print("💬 Encrypting messages.content...")
-        rows = db.execute('''
-            SELECT id, content
-            FROM messages
-            WHERE content IS NOT NULL AND content != ''
-              AND (content_encrypted IS NULL OR content_encrypted = '')
-        ''').fetchall()
-
-        encrypted_count = 0
-        for row in rows:
-            encrypted_content = self.encrypt_field(row['content'])
-            db.execute('''
-                UPDATE messages
-                SET content_encrypted = ?
-                WHERE id = ?
-            ''', (encrypted_content, row['id']))
-            encrypted_count += 1
-
-        db.commit()
-        print(f"   ✅ Encrypted {encrypted_count} messages")
+        for table, column, source, pk in ENCRYPTED_COLUMNS:
+            print(f"🔒 Encrypting {table}.{source}...")
+            job = EncryptionJob(self, table, column, source_column=source, pk=pk, chunk_size=chunk_size)
+            if not job.available():
+                print(f"   ⚠️  {table}.{column} not found - run migrations/add_encryption_columns.sql")
+                continue
+            stats = job.run()
+            print(f"   ✅ Encrypted {stats['changed']} values ({stats['rows_per_sec']:,.0f} rows/sec)")
 
         print()
         print("✅ Database encryption migration complete!")
@@ -243,6 +257,21 @@ class DatabaseEncryption:
         print("  2. Test decryption with: python3 database_encryption.py --test")
         print("  3. Optionally clear plaintext columns (BACKUP FIRST!)")
 
+    def rotate_keys(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Dict]:
+        """
+        Re-encrypt every encrypted column with the current key
+
+        Old keys must stay in DB_ENCRYPTION_OLD_KEYS until this finishes.
+        """
+        results = {}
+        for table, column, _source, pk in ENCRYPTED_COLUMNS:
+            job = EncryptionJob(self, table, column, pk=pk, chunk_size=chunk_size)
+            if job.available():
+                results[f"{table}.{column}"] = stats = job.run()
+                print(f"🔁 {table}.{column}: {stats['changed']} re-encrypted, {stats['conflicts']} changed "
+                      f"underneath, {stats['failed']} undecryptable ({stats['rows_per_sec']:,.0f} rows/sec)")
+        return results
+
     def verify_encryption(self):
         """
         Verify that encryption/decryption works correctly
@@ -310,10 +339,52 @@ class DatabaseEncryption:
         print("✅ Verification complete!")
 
 
+
+# ==============================================================================
+# SHARED INSTANCE AND BENCHMARK
+# ==============================================================================
+
+_shared: Optional[DatabaseEncryption] = None
+_shared_lock = threading.Lock()
+
+
+def get_encryption() -> DatabaseEncryption:
+    """Process-wide DatabaseEncryption (keys and AEAD contexts built once)"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DatabaseEncryption()
+        return _shared
+
+
+def benchmark(rows: int = 5000) -> Dict:
+    """
+    Per-row read cost: a fresh cipher per value (old decrypt_field) vs the
+    cached AEAD context; microseconds per row
+    """
+    enc = DatabaseEncryption(master_key=voice_encryption.generate_encryption_key())
+    values = [enc.encrypt_field(f"user{i}@example.com") for i in range(rows)]
+
+    def per_row(fn):
+        started = time.perf_counter()
+        fn()
+        return round((time.perf_counter() - started) / rows * 1e6, 2)
+
+    def fresh_cipher():
+        for value in values:
+            _, iv_b64, cipher_b64 = value.split(':')
+            AESGCM(enc.master_key).decrypt(base64.b64decode(iv_b64), base64.b64decode(cipher_b64), None)
+
+    return {
+        'rows': rows,
+        'fresh_cipher_us': per_row(fresh_cipher),
+        'cached_us': per_row(lambda: enc.decrypt_many(values)),
+    }
+
 if __name__ == "__main__":
     import sys
 
-    db_enc = DatabaseEncryption()
+    db_enc = get_encryption()
 
     if len(sys.argv) > 1:
         command = sys.argv[1]
@@ -322,6 +393,12 @@ if __name__ == "__main__":
             db_enc.encrypt_existing_data()
         elif command == "--test":
             db_enc.verify_encryption()
+        elif command == "--rotate":
+            db_enc.rotate_keys()
+        elif command == "--benchmark":
+            result = benchmark()
+            print(f"📊 Decrypt per row ({result['rows']} rows): fresh cipher {result['fresh_cipher_us']} µs, "
+                  f"cached {result['cached_us']} µs")
         elif command == "--key":
             print(f"DB_ENCRYPTION_KEY={base64.b64encode(db_enc.master_key).decode()}")
         else:
@@ -329,6 +406,8 @@ if __name__ == "__main__":
             print("Usage:")
             print("  python3 database_encryption.py --encrypt   # Encrypt existing data")
             print("  python3 database_encryption.py --test      # Verify encryption")
+            print("  python3 database_encryption.py --rotate    # Re-encrypt with the current key")
+            print("  python3 database_encryption.py --benchmark # Read-path cost per row")
             print("  python3 database_encryption.py --key       # Show encryption key")
     else:
         # Interactive demo
@@ -10,11 +10,14 @@ Prove that predictions weren't backdated by creating tamper-proof snapshots.
 
 **How It Works:**
 
-1. Export database state to JSON
-2. Generate SHA256 hash of entire snapshot
-3. Publish to voice-archive/database-snapshots/
-4. Git commit with timestamp (proof of when)
-5. Content hash proves what was in database at that time
+1. Hash each prediction into a Merkle leaf, grouped into stable pages
+2. Write only pages that changed since the last snapshot (pages/<hh>/<hash>.json)
+3. Chain the Merkle root to the previous snapshot's hash
+4. Publish to voice-archive/database-snapshots/
+5. Git commit with timestamp (proof of when)
+6. Inclusion proofs show a single prediction was in the database at that time
+
+See merkle_snapshot.py for the page format.
 
 **Usage:**
 
@@ -25,9 +28,12 @@ python3 database_snapshot.py --export
 # Verify snapshot integrity
 python3 database_snapshot.py --verify 2026-01-03.json
 
-# Verify all snapshots
+# Verify all snapshots (each page is re-hashed once, not once per snapshot)
 python3 database_snapshot.py --verify-all
 
+# Prove one prediction is in a snapshot
+python3 database_snapshot.py --prove 42 --snapshot 2026-01-03.json
+
 # Publish to GitHub Pages
 python3 database_snapshot.py --export --publish
 ```
@@ -36,18 +42,16 @@ python3 database_snapshot.py --export --publish
 
 ```json
 {
+  "format": "merkle",
+  "source": "predictions",
   "snapshot_hash": "abc123def456...",
+  "previous_snapshot_hash": "...",
+  "merkle_root": "...",
   "exported_at": "2026-01-03T09:00:00Z",
-  "version": "1.0",
+  "version": "3.0",
   "database_path": "soulfra.db",
-  "predictions": [
-    {
-      "content_hash": "d489b26c288a...",
-      "recorded_at": "2026-01-02T21:34:11",
-      "article_hash": "...",
-      "transcription_preview": "First 50 chars...",
-      "export_path": "voice-archive/d489b26c/"
-    }
+  "pages": [
+    {"hash": "d489b26c288a...", "count": 214, "first": 1, "last": 230}
   ],
   "statistics": {
     "total_predictions": 1,
@@ -56,6 +60,8 @@ python3 database_snapshot.py --export --publish
   }
 }
 ```
+
+Version 1.0 snapshots (full "predictions" list + whole-file hash) still verify.
 """
 
 import os
@@ -64,7 +70,9 @@ import hashlib
 import sqlite3
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
+
+from merkle_snapshot import MerkleSnapshotStore, verify_proof
 
 
 # ==============================================================================
@@ -87,13 +95,14 @@ class DatabaseSnapshot:
         self.db_path = db_path
         self.db = sqlite3.connect(db_path)
         self.db.row_factory = sqlite3.Row
+        self.store = MerkleSnapshotStore(SNAPSHOT_DIR, 'predictions', key='pairing_id')
 
     def get_all_predictions(self) -> List[Dict]:
         """
         Get all voice predictions from database
 
         Returns:
-            List of prediction dicts
+            List of prediction dicts, oldest pairing first (stable Merkle order)
         """
         cursor = self.db.execute("""
             SELECT
@@ -123,7 +132,7 @@ class DatabaseSnapshot:
             FROM voice_article_pairings p
             LEFT JOIN simple_voice_recordings r ON p.recording_id = r.id
             LEFT JOIN news_articles a ON p.article_id = a.id
-            ORDER BY p.paired_at DESC
+            ORDER BY p.id
         """)
 
         predictions = []
@@ -176,13 +185,16 @@ class DatabaseSnapshot:
 
     def export_snapshot(self, publish: bool = False) -> Path:
         """
-        Export database snapshot to JSON file
+        Export database snapshot as a Merkle manifest
+
+        Only pages containing new or changed predictions are written; the
+        rest are shared with earlier snapshots.
 
         Args:
             publish: If True, also publish to GitHub Pages
 
         Returns:
-            Path to snapshot file
+            Path to snapshot manifest
         """
         print("\n📸 Creating database snapshot...")
 
@@ -194,33 +206,32 @@ class DatabaseSnapshot:
         exported = sum(1 for p in predictions if p['exported_at'])
         time_locked = sum(1 for p in predictions if p['time_lock_until'])
 
-        # Create snapshot data (without hash yet)
-        snapshot_data = {
-            'version': '1.0',
-            'database_path': str(self.db_path),
-            'exported_at': datetime.now().isoformat(),
-            'predictions': predictions,
-            'statistics': {
+        today = datetime.now().strftime('%Y-%m-%d')
+        filename = f"{today}.json"
+        snapshot_path = SNAPSHOT_DIR / filename
+
+        previous = self.store.previous_manifest(filename)
+        snapshot_data, built = self.store.manifest(
+            predictions,
+            date=today,
+            previous_hash=previous.get('snapshot_hash') if previous else None,
+            statistics={
                 'total_predictions': total,
                 'exported_predictions': exported,
                 'time_locked_predictions': time_locked
-            }
-        }
-
-        # Calculate snapshot hash
-        snapshot_hash = self.calculate_snapshot_hash(snapshot_data)
-        snapshot_data['snapshot_hash'] = snapshot_hash
-
-        # Create filename with date
-        filename = f"{datetime.now().strftime('%Y-%m-%d')}.json"
-        snapshot_path = SNAPSHOT_DIR / filename
+            },
+            version='3.0',
+            database_path=str(self.db_path),
+            exported_at=datetime.now().isoformat(),
+        )
 
-        # Write snapshot
+        # Write snapshot manifest
         snapshot_path.write_text(json.dumps(snapshot_data, indent=2))
 
         print(f"✅ Snapshot created: {snapshot_path}")
-        print(f"   Hash: {snapshot_hash[:16]}...")
+        print(f"   Hash: {snapshot_data['snapshot_hash'][:16]}...")
         print(f"   Predictions: {total}")
+        print(f"   Pages: {built['written_pages']} written, {built['reused_pages']} unchanged")
 
         # Publish to GitHub if requested
         if publish:
@@ -228,12 +239,14 @@ class DatabaseSnapshot:
 
         return snapshot_path
 
-    def verify_snapshot(self, snapshot_path: Path) -> bool:
+    def verify_snapshot(self, snapshot_path: Path, trusted_pages: Optional[Set[str]] = None) -> bool:
         """
         Verify snapshot integrity
 
         Args:
             snapshot_path: Path to snapshot JSON
+            trusted_pages: Page hashes already verified (skipped, and
+                extended with pages verified here)
 
         Returns:
             True if verified, False otherwise
@@ -245,6 +258,16 @@ class DatabaseSnapshot:
         try:
             snapshot_data = json.loads(snapshot_path.read_text())
 
+            if snapshot_data.get('format') == 'merkle':
+                result = self.store.verify_manifest(snapshot_data, trusted_pages)
+                if result['valid']:
+                    print(f"✅ {snapshot_path.name} - VERIFIED")
+                    print(f"   Hash: {snapshot_data['snapshot_hash'][:16]}...")
+                    print(f"   Pages: {result['pages_checked']} checked, {result['pages_trusted']} already verified")
+                    return True
+                print(f"❌ {snapshot_path.name} - {result['error'].upper()}")
+                return False
+
             # Extract stored hash
             stored_hash = snapshot_data.get('snapshot_hash')
 
@@ -299,9 +322,10 @@ class DatabaseSnapshot:
         verified = 0
         failed = 0
         details = []
+        trusted_pages = set()
 
         for snapshot_path in sorted(snapshots):
-            is_verified = self.verify_snapshot(snapshot_path)
+            is_verified = self.verify_snapshot(snapshot_path, trusted_pages)
 
             if is_verified:
                 verified += 1
@@ -324,6 +348,33 @@ class DatabaseSnapshot:
             'details': details
         }
 
+    def prove_prediction(self, pairing_id: int, snapshot_path: Path) -> Optional[Dict]:
+        """
+        Inclusion proof that a prediction is in a snapshot
+
+        Args:
+            pairing_id: voice_article_pairings.id
+            snapshot_path: Path to a Merkle snapshot manifest
+
+        Returns:
+            Proof dict (checkable with merkle_snapshot.verify_proof) or None
+        """
+        manifest = json.loads(snapshot_path.read_text())
+        if manifest.get('format') != 'merkle':
+            print(f"⚠️  {snapshot_path.name} predates Merkle snapshots - no proofs available")
+            return None
+
+        proof = self.store.prove(manifest, pairing_id)
+        if not proof:
+            print(f"❌ Prediction #{pairing_id} not in {snapshot_path.name}")
+            return None
+
+        valid = verify_proof(proof['row'], proof, manifest['merkle_root'])
+        print(f"{'✅' if valid else '❌'} Prediction #{pairing_id} in {snapshot_path.name}")
+        print(f"   Leaf: {proof['leaf'][:16]}...")
+        print(f"   Root: {manifest['merkle_root'][:16]}... ({len(proof['page_path']) + len(proof['root_path'])} hashes)")
+        return proof
+
     def _publish_to_github(self, snapshot_path: Path):
         """
         Publish snapshot to GitHub Pages
@@ -391,6 +442,20 @@ if __name__ == '__main__':
         help='Verify all snapshots'
     )
 
+    parser.add_argument(
+        '--prove',
+        type=int,
+        metavar='PAIRING_ID',
+        help='Print an inclusion proof for one prediction'
+    )
+
+    parser.add_argument(
+        '--snapshot',
+        type=str,
+        metavar='FILENAME',
+        help='Snapshot to prove against (default: newest)'
+    )
+
     parser.add_argument(
         '--publish',
         action='store_true',
@@ -411,5 +476,17 @@ if __name__ == '__main__':
     elif args.verify_all:
         snapshot.verify_all_snapshots()
 
+    elif args.prove is not None:
+        if args.snapshot:
+            snapshot_path = SNAPSHOT_DIR / args.snapshot
+        else:
+            snapshot_path = max(SNAPSHOT_DIR.glob('*.json'), default=None)
+        if snapshot_path and snapshot_path.exists():
+            proof = snapshot.prove_prediction(args.prove, snapshot_path)
+            if proof:
+                print(json.dumps(proof, indent=2))
+        else:
+            print("❌ No snapshot found")
+
     else:
         parser.print_help()
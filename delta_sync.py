@@ -0,0 +1,791 @@
+#!/usr/bin/env python3
+"""
+Delta Sync - Trigger-based change capture and one-round-trip replication
+
+Replaces the offline sync queue (a full JSON copy of the row per change,
+replayed one at a time) with a replication protocol between two SQLite
+databases - laptop and production, or phone and server:
+
+- Triggers on each synced table record (table, row id, op) in
+  sync_changelog. A row has at most one entry: writing it again replaces
+  the entry with a new sequence number, so a row edited 100 times offline
+  is sent once, read as it is at sync time
+- sync_peers keeps per-peer, per-table high-water marks: the highest of our
+  sequence numbers the peer has acknowledged (sent_seq) and the highest of
+  its sequence numbers we have applied (received_seq)
+- A change set lists each table's columns once, then rows as value lists;
+  payloads are zlib-compressed JSON, capped at `limit` changes per exchange
+- Applying is idempotent: changes at or below received_seq are skipped, so
+  a retried exchange applies nothing twice. Each side applies a change set
+  in one transaction, together with its new high-water marks - an
+  interrupted sync resumes from the last exchange that committed
+- A change conflicts when the receiver changed the same row after the last
+  version the sender saw; by default the receiver keeps its row, reports
+  the conflict and sends its version back. The client holds the row in
+  sync_conflicts with the peer's version - nothing is overwritten or
+  acknowledged away - until resolve_conflict() picks a side
+- Changes applied from a peer are captured with that peer as origin: they
+  are forwarded to other peers, never echoed back
+
+One exchange is one round trip: the client sends its changes plus how far
+it has read the server's log, the server applies them and answers with its
+own changes since then.
+
+Rows are matched by their `id` primary key, so rows two devices create
+offline under the same id surface as a conflict to resolve. Triggers only
+see writes made after tracking is installed, so start from a copy of the
+same database. The changelog and triggers are schema_registry migrations.
+
+Usage:
+    from delta_sync import DeltaSync, HttpPeer, LocalPeer
+
+    laptop = DeltaSync('soulfra.db')
+    result = laptop.sync(LocalPeer('/mnt/server/soulfra.db'))
+    print(f"{result['sent']} sent, {result['received']} received in {result['round_trips']} round trip(s)")
+
+    # Server side (see session_sync /api/session/delta)
+    return Response(DeltaSync().handle_exchange(request.get_data(), owner=user_id))
+"""
+
+import base64
+import json
+import os
+import secrets
+import sqlite3
+import time
+import urllib.request
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from database import get_db
+from schema_registry import ensure_schema, register_migration
+
+
+DEFAULT_LIMIT = 5000            # Max changes per direction per exchange
+ROW_BATCH = 500                 # Row ids per IN (...) lookup
+
+# Synced tables (parents first) and the column holding the owning user
+SYNCED_TABLES = {
+    'posts': 'user_id',
+    'comments': 'user_id',
+    'ideas': 'user_id',
+    'simple_voice_recordings': 'user_id',
+    'professional_profile': 'user_id',
+}
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+SYNC_CONFLICTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS sync_conflicts (
+        peer TEXT NOT NULL,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        reason TEXT,
+        peer_op TEXT,
+        peer_row TEXT,
+        detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (peer, table_name, row_id)
+    )
+    '''
+
+DELTA_SYNC_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS sync_changelog (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        origin TEXT,
+        owner_id INTEGER,
+        UNIQUE (table_name, row_id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_sync_changelog_table_seq ON sync_changelog(table_name, seq)',
+    '''
+    CREATE TABLE IF NOT EXISTS sync_peers (
+        peer TEXT NOT NULL,
+        table_name TEXT NOT NULL,
+        sent_seq INTEGER NOT NULL DEFAULT 0,
+        received_seq INTEGER NOT NULL DEFAULT 0,
+        synced_at TIMESTAMP,
+        PRIMARY KEY (peer, table_name)
+    )
+    ''',
+    # Holds the origin while a peer's change set is applied (one row, same transaction)
+    'CREATE TABLE IF NOT EXISTS sync_applying (origin TEXT)',
+    '''
+    CREATE TABLE IF NOT EXISTS sync_node (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        node_id TEXT NOT NULL
+    )
+    ''',
+    SYNC_CONFLICTS_TABLE,
+]
+
+# Databases that installed the changelog before it carried owners and conflicts
+DELTA_SYNC_OWNERS_SCHEMA = [
+    'ALTER TABLE sync_changelog ADD COLUMN owner_id INTEGER',
+    SYNC_CONFLICTS_TABLE,
+]
+
+
+def capture_statements(table: str) -> List[str]:
+    """
+    Triggers that log every insert, update and delete on a table
+
+    The entry for a row is deleted and re-inserted rather than INSERT OR
+    REPLACE'd: a trigger inherits the conflict policy of the statement that
+    fired it, so an app-side INSERT OR IGNORE would otherwise keep the stale
+    entry. Each entry records the row's owner, so a device syncing through a
+    user session only hears about that user's rows - deletes included.
+    """
+    owner_column = SYNCED_TABLES[table]
+
+    def log(row: str, op: str) -> str:
+        return f'''
+            DELETE FROM sync_changelog WHERE table_name = '{table}' AND row_id = {row}.id;
+            INSERT INTO sync_changelog (table_name, row_id, op, origin, owner_id)
+            VALUES ('{table}', {row}.id, '{op}', (SELECT origin FROM sync_applying), {row}.{owner_column});'''
+
+    # Pending (no triggers) until the table and its owner column exist
+    statements = [f'SELECT id, {owner_column} FROM {table} LIMIT 0']
+    for suffix, event, row, op in (('ai', 'INSERT', 'NEW', 'upsert'), ('au', 'UPDATE', 'NEW', 'upsert'),
+                                   ('ad', 'DELETE', 'OLD', 'delete')):
+        statements.append(f'DROP TRIGGER IF EXISTS {table}_delta_sync_{suffix}')
+        statements.append(f"CREATE TRIGGER {table}_delta_sync_{suffix} AFTER {event} ON {table} "
+                          f"BEGIN{log(row, op)}\n        END")
+    return statements
+
+
+# 124+ add row owners to the changelog (owner-scoped deletes) and held conflicts
+register_migration(118, 'delta sync changelog', *DELTA_SYNC_SCHEMA, module='delta_sync')
+register_migration(119, 'delta sync: posts', *capture_statements('posts'), module='delta_sync', depends_on=(118,))
+register_migration(120, 'delta sync: comments', *capture_statements('comments'), module='delta_sync', depends_on=(118,))
+register_migration(121, 'delta sync: ideas', *capture_statements('ideas'), module='delta_sync', depends_on=(118,))
+register_migration(122, 'delta sync: voice recordings', *capture_statements('simple_voice_recordings'),
+                   module='delta_sync', depends_on=(118,))
+register_migration(123, 'delta sync: professional profiles', *capture_statements('professional_profile'),
+                   module='delta_sync', depends_on=(118,))
+register_migration(124, 'delta sync owners and conflicts', *DELTA_SYNC_OWNERS_SCHEMA, module='delta_sync',
+                   depends_on=(118,))
+register_migration(125, 'delta sync owners: posts', *capture_statements('posts'), module='delta_sync',
+                   depends_on=(124,))
+register_migration(126, 'delta sync owners: comments', *capture_statements('comments'), module='delta_sync',
+                   depends_on=(124,))
+register_migration(127, 'delta sync owners: ideas', *capture_statements('ideas'), module='delta_sync',
+                   depends_on=(124,))
+register_migration(128, 'delta sync owners: voice recordings', *capture_statements('simple_voice_recordings'),
+                   module='delta_sync', depends_on=(124,))
+register_migration(129, 'delta sync owners: professional profiles', *capture_statements('professional_profile'),
+                   module='delta_sync', depends_on=(124,))
+
+
+# ==============================================================================
+# PAYLOADS
+# ==============================================================================
+
+def _encode_value(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$b': base64.b64encode(bytes(value)).decode('ascii')}
+    raise TypeError(f"Cannot sync value of type {type(value).__name__}")
+
+
+def _decode_object(obj: Dict):
+    if len(obj) == 1 and '$b' in obj:
+        return base64.b64decode(obj['$b'])
+    return obj
+
+
+def encode_payload(payload: Dict) -> bytes:
+    """zlib-compressed JSON (BLOBs as base64)"""
+    return zlib.compress(json.dumps(payload, separators=(',', ':'), default=_encode_value).encode('utf-8'))
+
+
+def decode_payload(data: bytes) -> Dict:
+    """
+    Raises:
+        ValueError: Not a delta sync payload
+    """
+    try:
+        return json.loads(zlib.decompress(data), object_hook=_decode_object)
+    except zlib.error as e:
+        raise ValueError(f"Invalid sync payload: {e}")
+
+
+# ==============================================================================
+# REPLICATION
+# ==============================================================================
+
+class DeltaSync:
+    """Change sets for one SQLite database"""
+
+    def __init__(self, db_path: Optional[str] = None, limit: int = DEFAULT_LIMIT,
+                 on_conflict: str = 'keep', tables: Iterable[str] = SYNCED_TABLES):
+        """
+        Args:
+            db_path: SQLite file (default: the app database via get_db())
+            limit: Max changes per direction per exchange
+            on_conflict: 'keep' (receiver's row wins; a client holds the row
+                until resolve_conflict()) or 'overwrite' (incoming row wins)
+            tables: Tables to sync (keys of SYNCED_TABLES)
+        """
+        self.db_path = db_path
+        self.limit = limit
+        self.on_conflict = on_conflict
+        self.tables = [table for table in SYNCED_TABLES if table in set(tables)]
+        self._node_id = None
+
+    def connect(self):
+        """Open the database with the changelog and capture triggers installed (schema_registry 118+)"""
+        ensure_schema(self.db_path)
+
+        if self.db_path is None:
+            return get_db()
+        db = sqlite3.connect(self.db_path)
+        db.row_factory = sqlite3.Row
+        return db
+
+    @property
+    def node_id(self) -> str:
+        """Random id of this database, created on first use"""
+        if self._node_id is None:
+            db = self.connect()
+            try:
+                db.execute('INSERT OR IGNORE INTO sync_node (id, node_id) VALUES (1, ?)', (secrets.token_hex(8),))
+                db.commit()
+                self._node_id = db.execute('SELECT node_id FROM sync_node').fetchone()[0]
+            finally:
+                db.close()
+        return self._node_id
+
+    # ------------------------------------------------------------------
+    # Status
+    # ------------------------------------------------------------------
+
+    def record(self, table: str, row_id: int, op: str = 'upsert'):
+        """Log a change made where triggers can't see it (coalesced like any other)"""
+        db = self.connect()
+        try:
+            self._log(db, table, row_id, 'delete' if op == 'delete' else 'upsert')
+            db.commit()
+        finally:
+            db.close()
+
+    def pending(self, peer: str) -> Dict[str, int]:
+        """Changes per table the peer hasn't acknowledged (held conflicts excluded)"""
+        db = self.connect()
+        try:
+            sent = self._marks(db, peer, 'sent_seq')
+            counts = {}
+            for table in self.tables:
+                count = db.execute('''
+                    SELECT COUNT(*) FROM sync_changelog
+                    WHERE table_name = ? AND seq > ? AND (origin IS NULL OR origin != ?)
+                      AND row_id NOT IN (SELECT row_id FROM sync_conflicts WHERE peer = ? AND table_name = ?)
+                ''', (table, sent.get(table, 0), peer, peer, table)).fetchone()[0]
+                if count:
+                    counts[table] = count
+            return counts
+        finally:
+            db.close()
+
+    def conflicts(self, peer: str) -> List[Dict]:
+        """Rows held back from syncing with peer until resolve_conflict()"""
+        db = self.connect()
+        try:
+            rows = db.execute('''
+                SELECT table_name, row_id, reason, peer_op, peer_row, detected_at FROM sync_conflicts
+                WHERE peer = ? ORDER BY table_name, row_id
+            ''', (peer,)).fetchall()
+        finally:
+            db.close()
+
+        return [{
+            'table': row['table_name'],
+            'id': row['row_id'],
+            'reason': row['reason'],
+            'peer_op': row['peer_op'],
+            'peer_row': json.loads(row['peer_row'], object_hook=_decode_object) if row['peer_row'] else None,
+            'detected_at': row['detected_at'],
+        } for row in rows]
+
+    def resolve_conflict(self, peer: str, table: str, row_id: int, keep: str = 'peer'):
+        """
+        Settle a held row
+
+        Args:
+            keep: 'peer' takes the peer's version (if it sent one - a row it
+                refused as 'not owner' just stops syncing); 'local' sends our
+                row again on the next sync, where it wins unless the peer
+                changed the row once more
+
+        Raises:
+            KeyError: No conflict held for that row
+            ValueError: Unknown `keep`
+        """
+        if keep not in ('peer', 'local'):
+            raise ValueError(f"keep must be 'peer' or 'local', not {keep!r}")
+
+        db = self.connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            conflict = db.execute('''
+                SELECT peer_op, peer_row FROM sync_conflicts WHERE peer = ? AND table_name = ? AND row_id = ?
+            ''', (peer, table, row_id)).fetchone()
+            if conflict is None:
+                raise KeyError(f"No sync conflict for {table}/{row_id} with {peer}")
+            db.execute('DELETE FROM sync_conflicts WHERE peer = ? AND table_name = ? AND row_id = ?',
+                       (peer, table, row_id))
+
+            if keep == 'local':
+                exists = db.execute(f'SELECT 1 FROM {table} WHERE id = ?', (row_id,)).fetchone()
+                self._log(db, table, row_id, 'upsert' if exists else 'delete')
+            elif conflict['peer_op']:
+                db.execute('INSERT INTO sync_applying (origin) VALUES (?)', (peer,))
+                if conflict['peer_op'] == 'delete':
+                    db.execute(f'DELETE FROM {table} WHERE id = ?', (row_id,))
+                else:
+                    row = json.loads(conflict['peer_row'], object_hook=_decode_object)
+                    local_columns = {info[1] for info in db.execute(f'PRAGMA table_info({table})')}
+                    names = [name for name in row if name in local_columns]
+                    for sql, params in zip(self._upsert_sql(table, names), self._upsert_params(names, row)):
+                        db.execute(sql, params)
+                db.execute('DELETE FROM sync_applying')
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    def sync(self, peer, max_rounds: int = 1000) -> Dict:
+        """
+        Exchange change sets with a peer until both sides are caught up
+
+        A day of offline work under `limit` changes is one round trip. If an
+        exchange fails, everything before it is committed on both sides;
+        calling sync() again carries on from there.
+        """
+        totals = {'round_trips': 0, 'sent': 0, 'received': 0, 'skipped': 0,
+                  'bytes_sent': 0, 'bytes_received': 0, 'conflicts': []}
+        started = time.perf_counter()
+
+        for _ in range(max_rounds):
+            request = self.build_request(peer.name)
+            response = peer.exchange(request)
+            result = self.apply_response(peer.name, response)
+
+            totals['round_trips'] += 1
+            totals['bytes_sent'] += len(request)
+            totals['bytes_received'] += len(response)
+            totals['sent'] += result['sent']
+            totals['received'] += result['applied']
+            totals['skipped'] += result['skipped']
+            totals['conflicts'] += result['conflicts']
+            if not result['more']:
+                break
+
+        totals['seconds'] = round(time.perf_counter() - started, 3)
+        return totals
+
+    def build_request(self, peer: str) -> bytes:
+        """Client side: our unacknowledged changes + how far we've read the peer's log"""
+        db = self.connect()
+        try:
+            changes = self._changeset(db, peer, self._marks(db, peer, 'sent_seq'))
+            since = self._marks(db, peer, 'received_seq')
+        finally:
+            db.close()
+        return encode_payload({'node': self.node_id, 'since': since, 'changes': changes})
+
+    def handle_exchange(self, payload: bytes, owner: Optional[int] = None) -> bytes:
+        """
+        Server side: apply a client's change set, answer with ours since its `since`
+
+        Args:
+            payload: build_request() output
+            owner: Only accept and send rows owned by this user (device sync
+                through a user session). Rows owned by someone else - here
+                or in the change set - are refused as 'not owner'
+        """
+        request = decode_payload(payload)
+        origin = request['node']
+        since = {table: int(seq) for table, seq in request.get('since', {}).items()}
+
+        db = self.connect()
+        try:
+            result = self._apply(db, origin, request.get('changes', {}), seen=since, owner=owner)
+            changes = self._changeset(db, origin, since, owner=owner)
+        finally:
+            db.close()
+
+        return encode_payload({
+            'node': self.node_id,
+            'acked': result['acked'],
+            'applied': result['applied'],
+            'skipped': result['skipped'],
+            'conflicts': result['conflicts'],
+            'more': request.get('changes', {}).get('more', False),
+            'changes': changes,
+        })
+
+    def apply_response(self, peer: str, payload: bytes) -> Dict:
+        """
+        Client side: record the peer's acknowledgements and apply its changes
+
+        Rows the peer refused are held in sync_conflicts, together with the
+        peer's version when it sends one: neither side's row is overwritten
+        and the row stays out of later change sets until resolve_conflict().
+        """
+        response = decode_payload(payload)
+
+        db = self.connect()
+        try:
+            db.execute('BEGIN IMMEDIATE')
+            sent = sum(self._set_marks(db, peer, 'sent_seq', response.get('acked', {})).values())
+            self._hold(db, peer, [(c['table'], c['id'], c['reason']) for c in response.get('conflicts', [])])
+            seen = self._marks(db, peer, 'sent_seq')
+            result = self._apply(db, peer, response.get('changes', {}), seen=seen, hold=True, in_transaction=True)
+        finally:
+            db.close()
+
+        return {
+            'sent': response.get('applied', 0),
+            'acknowledged': sent,
+            'applied': result['applied'],
+            'skipped': response.get('skipped', 0) + result['skipped'],
+            'conflicts': response.get('conflicts', []) + result['conflicts'],
+            'more': bool(response.get('more') or response.get('changes', {}).get('more')),
+        }
+
+    # ------------------------------------------------------------------
+    # Change sets
+    # ------------------------------------------------------------------
+
+    def _changeset(self, db, peer: str, after: Dict[str, int], owner: Optional[int] = None) -> Dict:
+        """Net changes after the given per-table marks, excluding what came from peer or is held"""
+        budget = self.limit
+        tables = {}
+        more = False
+        owner_clause = ' AND owner_id = ?' if owner is not None else ''
+
+        for table in self.tables:
+            owner_column = SYNCED_TABLES[table]
+            if budget <= 0:
+                more = True
+                break
+            entries = db.execute(f'''
+                SELECT seq, row_id, op FROM sync_changelog
+                WHERE table_name = ? AND seq > ? AND (origin IS NULL OR origin != ?){owner_clause}
+                  AND row_id NOT IN (SELECT row_id FROM sync_conflicts WHERE peer = ? AND table_name = ?)
+                ORDER BY seq
+                LIMIT ?
+            ''', [table, after.get(table, 0), peer] + ([owner] if owner is not None else [])
+                + [peer, table, budget + 1]).fetchall()
+            if not entries:
+                continue
+            if len(entries) > budget:
+                entries = entries[:budget]
+                more = True
+            budget -= len(entries)
+
+            upsert_seqs = {entry['row_id']: entry['seq'] for entry in entries if entry['op'] == 'upsert'}
+            columns, rows = self._rows(db, table, list(upsert_seqs),
+                                       (owner_column, owner) if owner is not None else None)
+            id_index = columns.index('id') if columns else 0
+
+            tables[table] = {
+                'columns': columns,
+                'upserts': [[upsert_seqs[row[id_index]]] + list(row) for row in rows],
+                'deletes': [[entry['seq'], entry['row_id']] for entry in entries if entry['op'] == 'delete'],
+                'last_seq': entries[-1]['seq'],
+            }
+
+        return {'tables': tables, 'more': more}
+
+    def _rows(self, db, table: str, ids: List[int], owned_by: Optional[Tuple[str, int]]) -> Tuple[List[str], List[tuple]]:
+        columns, rows = [], []
+        owner_clause = f' AND {owned_by[0]} = ?' if owned_by else ''
+        for i in range(0, len(ids), ROW_BATCH):
+            batch = ids[i:i + ROW_BATCH]
+            cursor = db.execute(f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(batch))}){owner_clause}",
+                                batch + ([owned_by[1]] if owned_by else []))
+            columns = [d[0] for d in cursor.description]
+            rows.extend(tuple(row) for row in cursor)
+        return columns, rows
+
+    def _apply(self, db, origin: str, changes: Dict, seen: Dict[str, int], owner: Optional[int] = None,
+               hold: bool = False, in_transaction: bool = False) -> Dict:
+        """
+        Apply a change set from origin in one transaction
+
+        seen: per table, the highest of our sequence numbers origin had
+        when it made these changes - a newer local entry for the same row
+        means both sides changed it
+        hold: keep refused rows (and later changes to rows already held)
+        in sync_conflicts instead of dropping them
+        """
+        result = {'applied': 0, 'skipped': 0, 'conflicts': [], 'acked': {}}
+
+        if not in_transaction:
+            db.execute('BEGIN IMMEDIATE')
+        try:
+            db.execute('INSERT INTO sync_applying (origin) VALUES (?)', (origin,))
+            received = self._marks(db, origin, 'received_seq')
+
+            for table in SYNCED_TABLES:
+                part = changes.get('tables', {}).get(table)
+                if not part:
+                    continue
+                if table in self.tables:
+                    self._apply_table(db, origin, table, part, received.get(table, 0), seen.get(table, 0),
+                                      owner, hold, result)
+                result['acked'][table] = part['last_seq']
+
+            self._set_marks(db, origin, 'received_seq', result['acked'])
+            db.execute('DELETE FROM sync_applying')
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        return result
+
+    def _apply_table(self, db, origin: str, table: str, part: Dict, received: int, seen: int,
+                     owner: Optional[int], hold: bool, result: Dict):
+        owner_column = SYNCED_TABLES[table]
+        local_columns = {row[1] for row in db.execute(f'PRAGMA table_info({table})')}
+        columns = part['columns']
+        names = [column for column in columns if column in local_columns]
+
+        upserts = [dict(zip(columns, row[1:])) for row in part['upserts'] if row[0] > received]
+        deletes = [row_id for seq, row_id in part['deletes'] if seq > received]
+        result['skipped'] += len(part['upserts']) + len(part['deletes']) - len(upserts) - len(deletes)
+
+        ids = [row['id'] for row in upserts] + deletes
+        local = self._local_entries(db, table, ids)
+        owners = self._owners(db, table, ids) if owner is not None else {}
+        held = self._held_ids(db, origin, table) if hold else set()
+        rows_by_id = {row['id']: row for row in upserts}
+        refused = {}        # row id -> reason (None: already held)
+
+        def accepted(row_id: int, op: str, row: Optional[Dict] = None) -> bool:
+            if row_id in held:
+                refused[row_id] = None
+                return False
+            reason = None
+            if owner is not None and ((row is not None and row.get(owner_column) != owner)
+                                      or owners.get(row_id, owner) != owner):
+                reason = 'not owner'
+            else:
+                entry = local.get(row_id)
+                if entry and entry['origin'] != origin and entry['seq'] > seen and self.on_conflict == 'keep':
+                    reason = 'changed on both sides'
+            if reason:
+                result['conflicts'].append({'table': table, 'id': row_id, 'op': op, 'reason': reason})
+                refused[row_id] = reason
+                return False
+            return True
+
+        rows = [(row['id'], self._upsert_params(names, row, owner)) for row in upserts if accepted(row['id'], 'upsert', row)]
+        applied, failed = self._execute_rows(
+            db, self._upsert_sql(table, names, owner_column if owner is not None else None), rows)
+
+        owner_clause = f' AND {owner_column} = ?' if owner is not None else ''
+        ids = [(row_id, [(row_id,) + ((owner,) if owner is not None else ())])
+               for row_id in deletes if accepted(row_id, 'delete')]
+        deleted, failed_deletes = self._execute_rows(db, [f'DELETE FROM {table} WHERE id = ?{owner_clause}'], ids)
+        result['applied'] += applied + deleted
+
+        for op, failures in (('upsert', failed), ('delete', failed_deletes)):
+            for row_id, reason in failures:
+                result['conflicts'].append({'table': table, 'id': row_id, 'op': op, 'reason': reason})
+                refused[row_id] = reason
+
+        if hold and refused:
+            self._hold(db, origin, [(table, row_id, reason) for row_id, reason in refused.items()],
+                       {row_id: rows_by_id.get(row_id) for row_id in refused})
+
+    @staticmethod
+    def _upsert_sql(table: str, names: List[str], owner_column: Optional[str] = None) -> List[str]:
+        """
+        UPDATE by id, then INSERT if the row doesn't exist
+
+        Not INSERT ... ON CONFLICT DO UPDATE: other modules' triggers on these
+        tables (ownership_dirty, syndication) rely on INSERT OR REPLACE, and a
+        trigger inherits the upsert's ABORT instead. With owner_column, an
+        existing row is only updated if the trailing `?` owns it.
+        """
+        values = ', '.join('?' * len(names))
+        statements = [f"INSERT INTO {table} ({', '.join(names)}) SELECT {values} "
+                      f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE id = ?)"]
+        updates = ', '.join(f'{name} = ?' for name in names if name != 'id')
+        if updates:
+            owner_clause = f' AND {owner_column} = ?' if owner_column else ''
+            statements.insert(0, f'UPDATE {table} SET {updates} WHERE id = ?{owner_clause}')
+        return statements
+
+    @staticmethod
+    def _upsert_params(names: List[str], row: Dict, owner: Optional[int] = None) -> List[tuple]:
+        """Parameters for each _upsert_sql() statement"""
+        insert = tuple(row[name] for name in names) + (row['id'],)
+        if len(names) == 1:
+            return [insert]
+        update = tuple(row[name] for name in names if name != 'id') + (row['id'],)
+        return [update + ((owner,) if owner is not None else ()), insert]
+
+    def _execute_rows(self, db, statements: List[str], rows: List[Tuple[int, List[tuple]]]
+                      ) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Run statements for each (row id, params per statement) with executemany();
+        on a constraint error, redo row by row - returns (applied, [(row id, error)])
+        """
+        if not rows:
+            return 0, []
+        db.execute('SAVEPOINT delta_sync_rows')
+        try:
+            for i, sql in enumerate(statements):
+                db.executemany(sql, [params[i] for _, params in rows])
+            db.execute('RELEASE delta_sync_rows')
+            return len(rows), []
+        except sqlite3.IntegrityError:
+            db.execute('ROLLBACK TO delta_sync_rows')
+            db.execute('RELEASE delta_sync_rows')
+
+        applied, failed = 0, []
+        for row_id, params in rows:
+            db.execute('SAVEPOINT delta_sync_row')
+            try:
+                for sql, values in zip(statements, params):
+                    db.execute(sql, values)
+                applied += 1
+            except sqlite3.IntegrityError as e:
+                db.execute('ROLLBACK TO delta_sync_row')
+                failed.append((row_id, str(e)))
+            db.execute('RELEASE delta_sync_row')
+        return applied, failed
+
+    def _hold(self, db, peer: str, refused: List[Tuple[str, int, Optional[str]]],
+              peer_rows: Optional[Dict[int, Optional[Dict]]] = None):
+        """
+        Keep rows in sync_conflicts
+
+        refused: (table, row id, reason) - reason None keeps the held reason
+        peer_rows: the peer's version of each row (None: it deleted the row);
+            omitted when the peer refused our change and sent nothing
+        """
+        if peer_rows is None:
+            db.executemany('''
+                INSERT INTO sync_conflicts (peer, table_name, row_id, reason) VALUES (?, ?, ?, ?)
+                ON CONFLICT(peer, table_name, row_id) DO UPDATE SET reason = excluded.reason
+            ''', [(peer, table, row_id, reason) for table, row_id, reason in refused])
+            return
+
+        db.executemany('''
+            INSERT INTO sync_conflicts (peer, table_name, row_id, reason, peer_op, peer_row) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(peer, table_name, row_id) DO UPDATE SET
+                reason = COALESCE(excluded.reason, reason),
+                peer_op = excluded.peer_op,
+                peer_row = excluded.peer_row,
+                detected_at = CURRENT_TIMESTAMP
+        ''', [(peer, table, row_id, reason, 'delete' if peer_rows[row_id] is None else 'upsert',
+               None if peer_rows[row_id] is None else json.dumps(peer_rows[row_id], default=_encode_value))
+              for table, row_id, reason in refused])
+
+    def _held_ids(self, db, peer: str, table: str) -> set:
+        rows = db.execute('SELECT row_id FROM sync_conflicts WHERE peer = ? AND table_name = ?', (peer, table))
+        return {row[0] for row in rows}
+
+    def _owners(self, db, table: str, ids: List[int]) -> Dict[int, Optional[int]]:
+        """Current owner of each existing row"""
+        owner_column = SYNCED_TABLES[table]
+        owners = {}
+        for i in range(0, len(ids), ROW_BATCH):
+            batch = ids[i:i + ROW_BATCH]
+            for row in db.execute(f"SELECT id, {owner_column} FROM {table} WHERE id IN ({','.join('?' * len(batch))})",
+                                  batch):
+                owners[row[0]] = row[1]
+        return owners
+
+    def _log(self, db, table: str, row_id: int, op: str):
+        """Changelog entry with a fresh sequence number (what the triggers write)"""
+        db.execute('DELETE FROM sync_changelog WHERE table_name = ? AND row_id = ?', (table, row_id))
+        db.execute(f'''
+            INSERT INTO sync_changelog (table_name, row_id, op, owner_id)
+            VALUES (?, ?, ?, (SELECT {SYNCED_TABLES[table]} FROM {table} WHERE id = ?))
+        ''', (table, row_id, op, row_id))
+
+    def _local_entries(self, db, table: str, ids: List[int]) -> Dict[int, sqlite3.Row]:
+        entries = {}
+        for i in range(0, len(ids), ROW_BATCH):
+            batch = ids[i:i + ROW_BATCH]
+            for entry in db.execute(f'''
+                SELECT row_id, seq, origin FROM sync_changelog
+                WHERE table_name = ? AND row_id IN ({','.join('?' * len(batch))})
+            ''', [table] + batch):
+                entries[entry['row_id']] = entry
+        return entries
+
+    # ------------------------------------------------------------------
+    # High-water marks
+    # ------------------------------------------------------------------
+
+    def _marks(self, db, peer: str, column: str) -> Dict[str, int]:
+        rows = db.execute(f'SELECT table_name, {column} FROM sync_peers WHERE peer = ?', (peer,)).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def _set_marks(self, db, peer: str, column: str, marks: Dict[str, int]) -> Dict[str, int]:
+        """Raise marks (never lower them); returns how far each moved"""
+        before = self._marks(db, peer, column)
+        db.executemany(f'''
+            INSERT INTO sync_peers (peer, table_name, {column}, synced_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(peer, table_name) DO UPDATE SET
+                {column} = MAX({column}, excluded.{column}),
+                synced_at = CURRENT_TIMESTAMP
+        ''', [(peer, table, seq) for table, seq in marks.items()])
+        return {table: max(0, seq - before.get(table, 0)) for table, seq in marks.items()}
+
+
+# ==============================================================================
+# PEERS
+# ==============================================================================
+
+class LocalPeer:
+    """Another SQLite file served in-process (tests, a mounted server database)"""
+
+    def __init__(self, db_path: str, **options):
+        self.name = os.path.abspath(db_path)
+        self.sync = DeltaSync(db_path, **options)
+
+    def exchange(self, payload: bytes) -> bytes:
+        return self.sync.handle_exchange(payload)
+
+
+class HttpPeer:
+    """A server's delta exchange endpoint (e.g. /api/session/delta)"""
+
+    def __init__(self, url: str, headers: Optional[Dict] = None, timeout: float = 60, retries: int = 2):
+        self.name = url
+        self.headers = dict(headers or {}, **{'Content-Type': 'application/octet-stream'})
+        self.timeout = timeout
+        self.retries = retries
+
+    def exchange(self, payload: bytes) -> bytes:
+        """POST a request; retried exchanges are safe (the server skips what it applied)"""
+        for attempt in range(self.retries + 1):
+            try:
+                request = urllib.request.Request(self.name, data=payload, headers=self.headers)
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.read()
+            except OSError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
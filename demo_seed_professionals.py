@@ -10,6 +10,7 @@ Generates 10 fake professional profiles across Florida:
 
 Usage:
     python3 demo_seed_professionals.py
+    python3 demo_seed_professionals.py --import professionals.csv
 
 Creates:
     - 10 professional_profile records
@@ -22,6 +23,9 @@ import sqlite3
 from datetime import datetime, timedelta
 import random
 
+from bulk_import import BulkImporter, ImportTarget, RowError, clean, read_rows, slugify
+from database import get_db
+
 
 # ============================================================================
 # Demo Professional Data
@@ -280,7 +284,86 @@ DEMO_PROFESSIONALS = [
 # Seed Functions
 # ============================================================================
 
-def seed_demo_professionals():
+TRADE_EMOJI = {
+    'plumber': '🔧',
+    'electrician': '⚡',
+    'hvac': '❄️',
+    'podcast': '🎙️',
+    'blog': '✍️',
+    'youtube': '📹',
+    'restaurant': '🍽️'
+}
+
+PROFESSIONAL_COLUMNS = [
+    'user_id', 'business_name', 'subdomain', 'tagline', 'bio', 'trade_category', 'trade_specialty',
+    'phone', 'email', 'address_city', 'address_state', 'address_zip', 'logo_url', 'primary_color',
+    'accent_color', 'license_number', 'license_state', 'license_type', 'license_verified',
+    'license_verified_at', 'tier', 'subscription_status', 'created_at', 'updated_at'
+]
+
+
+def professionals_target(user_id: int) -> ImportTarget:
+    """
+    Import target for professional_profile rows owned by user_id
+
+    Rows whose subdomain already exists are skipped. created_days_ago
+    (optional) backdates the profile for metric weighting.
+    """
+
+    def prepare(row, lookups):
+        business_name = clean(row.get('business_name'))
+        trade_category = clean(row.get('trade_category')).lower()
+        if not business_name or not trade_category:
+            raise RowError("Missing business_name or trade_category")
+
+        subdomain = slugify(clean(row.get('subdomain')) or business_name)
+        days_ago = int(clean(row.get('created_days_ago')) or 0)
+        created_at = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        license_number = clean(row.get('license_number')) or None
+
+        record = {column: clean(row.get(column)) or None for column in PROFESSIONAL_COLUMNS}
+        record.update(
+            user_id=user_id,
+            business_name=business_name,
+            subdomain=subdomain,
+            trade_category=trade_category,
+            primary_color=record['primary_color'] or '#0066CC',
+            accent_color=record['accent_color'] or '#FF6600',
+            license_number=license_number,
+            license_verified=1 if license_number else 0,
+            license_verified_at=created_at if license_number else None,
+            tier=record['tier'] or 'free',
+            subscription_status='active',
+            created_at=created_at,
+            updated_at=datetime.now().isoformat(),
+        )
+        return record
+
+    return ImportTarget(name='professionals', table='professional_profile', columns=PROFESSIONAL_COLUMNS,
+                        prepare=prepare, unique_column='subdomain')
+
+
+def get_demo_user_id(conn) -> int:
+    """Demo user account that owns all demo profiles (created if missing)"""
+    try:
+        cursor = conn.execute('''
+            INSERT INTO users (username, email, password_hash, display_name, is_admin, created_at)
+            VALUES ('demo', 'demo@cringeproof.com', 'DEMO_HASH', 'Demo Account', 0, ?)
+        ''', (datetime.now().isoformat(),))
+        conn.commit()
+        print(f"✅ Created demo user account (ID: {cursor.lastrowid})")
+        return cursor.lastrowid
+    except sqlite3.IntegrityError:
+        # Demo user already exists, fetch ID
+        conn.rollback()
+        demo_user_id = conn.execute(
+            "SELECT id FROM users WHERE username = 'demo'"
+        ).fetchone()[0]
+        print(f"✅ Using existing demo user account (ID: {demo_user_id})")
+        return demo_user_id
+
+
+def seed_demo_professionals(rows=None):
     """
     Seed database with demo professional profiles
 
@@ -289,115 +372,30 @@ def seed_demo_professionals():
     - Case study generation
     - Geographic routing testing
     - Investor demos
+
+    Args:
+        rows: Profiles to import instead of DEMO_PROFESSIONALS (e.g. read_rows('pros.csv'))
     """
 
-    conn = sqlite3.connect('soulfra.db')
+    conn = get_db()
     cursor = conn.cursor()
 
     print("🌱 Seeding demo professional profiles...\n")
 
     # First, create a demo user account to own all profiles
-    try:
-        cursor.execute('''
-            INSERT INTO users (username, email, password_hash, display_name, is_admin, created_at)
-            VALUES ('demo', 'demo@cringeproof.com', 'DEMO_HASH', 'Demo Account', 0, ?)
-        ''', (datetime.now().isoformat(),))
-        demo_user_id = cursor.lastrowid
-        print(f"✅ Created demo user account (ID: {demo_user_id})")
-    except sqlite3.IntegrityError:
-        # Demo user already exists, fetch ID
-        demo_user_id = cursor.execute(
-            "SELECT id FROM users WHERE username = 'demo'"
-        ).fetchone()[0]
-        print(f"✅ Using existing demo user account (ID: {demo_user_id})")
+    demo_user_id = get_demo_user_id(conn)
 
     print("\n📝 Creating professional profiles:\n")
 
-    created_count = 0
-
-    for prof_data in DEMO_PROFESSIONALS:
-        # Calculate created_at based on days ago
-        created_at = datetime.now() - timedelta(days=prof_data['created_days_ago'])
-
-        try:
-            cursor.execute('''
-                INSERT INTO professional_profile (
-                    user_id,
-                    business_name,
-                    subdomain,
-                    tagline,
-                    bio,
-                    trade_category,
-                    trade_specialty,
-                    phone,
-                    email,
-                    address_city,
-                    address_state,
-                    address_zip,
-                    logo_url,
-                    primary_color,
-                    accent_color,
-                    license_number,
-                    license_state,
-                    license_type,
-                    license_verified,
-                    license_verified_at,
-                    tier,
-                    subscription_status,
-                    created_at,
-                    updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                demo_user_id,
-                prof_data['business_name'],
-                prof_data['subdomain'],
-                prof_data['tagline'],
-                prof_data['bio'],
-                prof_data['trade_category'],
-                prof_data['trade_specialty'],
-                prof_data['phone'],
-                prof_data['email'],
-                prof_data['address_city'],
-                prof_data['address_state'],
-                prof_data['address_zip'],
-                None,  # logo_url
-                prof_data['primary_color'],
-                prof_data['accent_color'],
-                prof_data['license_number'],
-                prof_data['license_state'],
-                prof_data['license_type'],
-                1 if prof_data['license_number'] else 0,  # license_verified
-                created_at.isoformat() if prof_data['license_number'] else None,
-                prof_data['tier'],
-                'active',
-                created_at.isoformat(),
-                datetime.now().isoformat()
-            ))
-
-            professional_id = cursor.lastrowid
-
-            # Trade emoji
-            trade_emoji = {
-                'plumber': '🔧',
-                'electrician': '⚡',
-                'hvac': '❄️',
-                'podcast': '🎙️',
-                'blog': '✍️',
-                'youtube': '📹',
-                'restaurant': '🍽️'
-            }.get(prof_data['trade_category'], '💼')
-
-            # Tier badge
-            tier_badge = '👑' if prof_data['tier'] == 'pro' else '🆓'
-
-            print(f"{trade_emoji} {tier_badge} {prof_data['business_name']:35} | {prof_data['address_city']:15} | {prof_data['subdomain']}.cringeproof.com")
-
-            created_count += 1
-
-        except sqlite3.IntegrityError as e:
-            print(f"⚠️  Skipped {prof_data['business_name']} (already exists)")
+    def progress(stats):
+        print(f"   … {stats['processed']} rows, {stats['imported']} created, {stats['skipped']} already existed")
 
-    conn.commit()
+    job = BulkImporter(professionals_target(demo_user_id), on_progress=progress).run(
+        DEMO_PROFESSIONALS if rows is None else rows, source='demo' if rows is None else 'import')
+    created_count = job['imported']
+
+    for error in job['error_samples']:
+        print(f"⚠️  Skipped {error}")
 
     print(f"\n✅ Created {created_count} demo professional profiles!")
 
@@ -413,14 +411,7 @@ def seed_demo_professionals():
     ''', (demo_user_id,)).fetchall()
 
     for trade, count in trade_counts:
-        trade_emoji = {
-            'plumber': '🔧',
-            'electrician': '⚡',
-            'hvac': '❄️',
-            'podcast': '🎙️',
-            'blog': '✍️',
-            'youtube': '📹'
-        }.get(trade, '💼')
+        trade_emoji = TRADE_EMOJI.get(trade, '💼')
         print(f"   {trade_emoji} {trade:15} | {count} profiles")
 
     # Count by city
@@ -557,6 +548,10 @@ if __name__ == '__main__':
     elif '--urls' in sys.argv:
         show_demo_urls()
 
+    elif '--import' in sys.argv:
+        # Bulk-load profiles from a CSV/Excel file (same columns as DEMO_PROFESSIONALS)
+        seed_demo_professionals(read_rows(sys.argv[sys.argv.index('--import') + 1]))
+
     else:
         print("""
 ╔══════════════════════════════════════════════════════════════════════╗
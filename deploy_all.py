@@ -20,6 +20,8 @@ import shutil
 import subprocess
 from datetime import datetime
 
+from git_publisher import GitError, get_queue
+
 # Paths
 SOULFRA_SIMPLE_DIR = os.path.dirname(__file__)
 SOULFRA_GITHUB_IO_DIR = '/Users/matthewmauer/Desktop/soulfra.github.io'
@@ -152,28 +154,29 @@ def push_to_github(target_name='soulfra.github.io'):
     print("\n1. Checking git status...")
     run_command('git status', cwd=local_path)
 
-    # Git add
-    print("\n2. Adding changes...")
-    if not run_command('git add waitlist/ domains/', cwd=local_path):
-        return False
-
-    # Git commit
-    print("\n3. Committing changes...")
+    # Commit waitlist/ + domains/ in one plumbing commit (working tree untouched)
+    print("\n2. Committing changes...")
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    commit_msg = f"🚀 Auto-deploy: {timestamp}\\n\\n✅ Waitlist updated\\n✅ Domain manager updated"
-
-    # Check if there are changes to commit
-    result = subprocess.run('git diff --staged --quiet', shell=True, cwd=local_path)
-    if result.returncode == 0:
-        print("  ℹ️  No changes to commit")
-        return True
+    commit_msg = f"🚀 Auto-deploy: {timestamp}\n\n✅ Waitlist updated\n✅ Domain manager updated"
 
-    if not run_command(f'git commit -m "{commit_msg}"', cwd=local_path):
+    queue = get_queue(local_path)
+    try:
+        published = queue.publish(['waitlist', 'domains'], commit_msg, flush=True)
+    except GitError as e:
+        print(f"  ❌ {e}")
         return False
 
-    # Git push
-    print("\n4. Pushing to GitHub...")
-    if not run_command('git push', cwd=local_path):
+    if not published['commit']:
+        print("  ℹ️  No changes to commit")
+        return True
+    print(f"  ✅ {published['commit'][:7]} ({published['files']} files)")
+
+    # Git push (background, with retry)
+    print("\n3. Pushing to GitHub...")
+    try:
+        queue.wait_push(published['push'])
+    except GitError as e:
+        print(f"  ❌ {e}")
         return False
 
     print(f"\n✅ Successfully pushed to {target['repo']}")
@@ -6,13 +6,17 @@ Automatically verifies that pushed code is actually live on production domains.
 Compares GitHub repo commits vs what's served, alerts on cache issues.
 """
 
-import requests
 import subprocess
 import json
 from datetime import datetime
 from bs4 import BeautifulSoup
 import time
 
+from crawler import Crawler
+
+# Shared engine: per-host keep-alive, each URL fetched once per run
+_crawler = Crawler(cache=False)
+
 # Domain → GitHub Repo mapping
 DEPLOYMENTS = {
     'cringeproof.com': {
@@ -42,7 +46,7 @@ def get_latest_commit_sha(repo, branch='main'):
     """Get latest commit SHA from GitHub repo"""
     url = f"https://api.github.com/repos/{repo}/commits/{branch}"
     try:
-        response = requests.get(url, timeout=10)
+        response = _crawler.request('GET', url)
         if response.ok:
             data = response.json()
             return {
@@ -60,7 +64,7 @@ def check_file_exists(domain, file_path):
     """Check if file exists on production domain"""
     url = f"https://{domain}/{file_path}"
     try:
-        response = requests.head(url, timeout=10, allow_redirects=True)
+        response = _crawler.request('HEAD', url)
         return response.status_code == 200
     except Exception as e:
         return False
@@ -70,7 +74,7 @@ def get_cache_headers(domain):
     """Get caching headers from production"""
     url = f"https://{domain}/"
     try:
-        response = requests.head(url, timeout=10)
+        response = _crawler.request('HEAD', url, allow_redirects=False)
         return {
             'last_modified': response.headers.get('Last-Modified'),
             'etag': response.headers.get('ETag'),
@@ -163,6 +167,16 @@ def verify_all_deployments():
     print("="*60)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
+    # Fetch commits, cache headers and critical files for every domain at once
+    _crawler.reset()
+    _crawler.prefetch(
+        [('GET', f"https://api.github.com/repos/{config['repo']}/commits/{config['branch']}")
+         for config in DEPLOYMENTS.values()] +
+        [('HEAD', f"https://{domain}/", {'allow_redirects': False}) for domain in DEPLOYMENTS] +
+        [('HEAD', f"https://{domain}/{path}") for domain, config in DEPLOYMENTS.items()
+         for path in config['critical_files']]
+    )
+
     results = {}
     for domain, config in DEPLOYMENTS.items():
         try:
@@ -210,6 +224,7 @@ def watch_deployment(domain, interval=30, timeout=300):
 
     while time.time() - start_time < timeout:
         print(f"\n[Attempt {attempt}] Checking...")
+        _crawler.reset()
 
         if verify_deployment(domain, config):
             print(f"\n✅ {domain} is LIVE!")
@@ -42,6 +42,7 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 from database import get_db
+import auth_cache
 
 
 class DeviceAuthManager:
@@ -206,6 +207,10 @@ class DeviceAuthManager:
         Returns:
             Dict with device info or None if invalid
         """
+        return auth_cache.cached_lookup('device', device_token, self._load_device)
+
+    def _load_device(self, device_token: str) -> Optional[Dict]:
+        """Cold path for verify_device - also where last_seen gets bumped"""
         db = get_db()
 
         device = db.execute('''
@@ -217,7 +222,7 @@ class DeviceAuthManager:
         if not device:
             return None
 
-        # Update last_seen
+        # Update last_seen (once per cache window rather than every request)
         db.execute('''
             UPDATE devices
             SET last_seen = CURRENT_TIMESTAMP
@@ -14,6 +14,11 @@ import sys
 import requests
 from datetime import datetime
 
+from crawler import Crawler
+
+# One engine per run: checks share per-host connections and each URL is fetched once
+_crawler = Crawler(cache=False, timeout=5)
+
 # GitHub Pages IPs (official)
 GITHUB_PAGES_IPS = {
     '185.199.108.153',
@@ -120,7 +125,7 @@ def check_github_pages(username, repo):
     url = f"https://{username}.github.io/{repo}/"
 
     try:
-        response = requests.head(url, timeout=5, allow_redirects=True)
+        response = _crawler.request('HEAD', url)
 
         if response.status_code == 200:
             return {
@@ -151,7 +156,7 @@ def check_github_pages(username, repo):
 def check_ssl(domain):
     """Check if SSL is working"""
     try:
-        response = requests.head(f'https://{domain}', timeout=5, allow_redirects=True)
+        response = _crawler.request('HEAD', f'https://{domain}')
         return {
             'status': 'OK',
             'message': 'SSL certificate valid'
@@ -183,6 +188,13 @@ def print_status(status):
     return f"{color}{symbol} {status}{reset}"
 
 
+def _brand_urls(brand_info, username='Soulfra'):
+    urls = [f"https://{username}.github.io/{brand_info['github_repo']}/"]
+    if brand_info['has_custom_domain'] and brand_info['domain']:
+        urls.append(f"https://{brand_info['domain']}")
+    return urls
+
+
 def check_brand(brand_name, brand_info, username='Soulfra'):
     """Check health of a single brand"""
     print(f"\n{'='*70}")
@@ -248,7 +260,8 @@ def main():
             print(f"Available brands: {', '.join(BRANDS.keys())}")
             sys.exit(1)
     else:
-        # Check all brands
+        # Check all brands - fetch every brand's URLs concurrently, then report in order
+        _crawler.prefetch([('HEAD', url) for brand_info in BRANDS.values() for url in _brand_urls(brand_info)])
         for brand_name, brand_info in BRANDS.items():
             check_brand(brand_name, brand_info)
 
@@ -28,6 +28,7 @@ import math
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from database import get_db
+from ledger import immediate
 
 # ==============================================================================
 # DATABASE SCHEMA
@@ -178,71 +179,67 @@ def add_liquidity(pool_id: int, user_id: int, amount_a: float, amount_b: float)
         }
     """
 
-    conn = get_db()
+    # Take the write lock before reading reserves: a concurrent swap can't
+    # compute against the same snapshot. Rolled back (lock released) on error.
+    with immediate() as conn:
+        # Get current pool state
+        pool = conn.execute(
+            'SELECT * FROM liquidity_pools WHERE id = ?',
+            (pool_id,)
+        ).fetchone()
 
-    # Get current pool state
-    pool = conn.execute(
-        'SELECT * FROM liquidity_pools WHERE id = ?',
-        (pool_id,)
-    ).fetchone()
+        if not pool:
+            return {'error': 'Pool not found'}
 
-    if not pool:
-        conn.close()
-        return {'error': 'Pool not found'}
-
-    # Calculate proportional amounts
-    # User must add liquidity in proportion to current reserves
-    ratio = pool['reserve_a'] / pool['reserve_b']
-    expected_b = amount_a / ratio
-
-    if abs(amount_b - expected_b) > 0.01:  # Allow 1% slippage
-        conn.close()
-        return {'error': f'Amounts must be proportional. Expected {expected_b:.2f} for domain B'}
+        # Calculate proportional amounts
+        # User must add liquidity in proportion to current reserves
+        ratio = pool['reserve_a'] / pool['reserve_b']
+        expected_b = amount_a / ratio
 
-    # Calculate LP tokens to mint
-    # LP tokens = (amount_a / reserve_a) × total_lp_tokens
-    lp_tokens_minted = (amount_a / pool['reserve_a']) * pool['total_lp_tokens']
+        if abs(amount_b - expected_b) > 0.01:  # Allow 1% slippage
+            return {'error': f'Amounts must be proportional. Expected {expected_b:.2f} for domain B'}
 
-    # Update pool reserves
-    new_reserve_a = pool['reserve_a'] + amount_a
-    new_reserve_b = pool['reserve_b'] + amount_b
-    new_k = new_reserve_a * new_reserve_b
-    new_total_lp = pool['total_lp_tokens'] + lp_tokens_minted
+        # Calculate LP tokens to mint
+        # LP tokens = (amount_a / reserve_a) × total_lp_tokens
+        lp_tokens_minted = (amount_a / pool['reserve_a']) * pool['total_lp_tokens']
 
-    conn.execute('''
-        UPDATE liquidity_pools
-        SET reserve_a = ?, reserve_b = ?, k_constant = ?, total_lp_tokens = ?
-        WHERE id = ?
-    ''', (new_reserve_a, new_reserve_b, new_k, new_total_lp, pool_id))
-
-    # Issue LP tokens to user
-    existing = conn.execute(
-        'SELECT lp_tokens FROM lp_token_holders WHERE pool_id = ? AND user_id = ?',
-        (pool_id, user_id)
-    ).fetchone()
+        # Update pool reserves
+        new_reserve_a = pool['reserve_a'] + amount_a
+        new_reserve_b = pool['reserve_b'] + amount_b
+        new_k = new_reserve_a * new_reserve_b
+        new_total_lp = pool['total_lp_tokens'] + lp_tokens_minted
 
-    if existing:
         conn.execute('''
-            UPDATE lp_token_holders
-            SET lp_tokens = lp_tokens + ?
-            WHERE pool_id = ? AND user_id = ?
-        ''', (lp_tokens_minted, pool_id, user_id))
-    else:
+            UPDATE liquidity_pools
+            SET reserve_a = ?, reserve_b = ?, k_constant = ?, total_lp_tokens = ?
+            WHERE id = ?
+        ''', (new_reserve_a, new_reserve_b, new_k, new_total_lp, pool_id))
+
+        # Issue LP tokens to user
+        existing = conn.execute(
+            'SELECT lp_tokens FROM lp_token_holders WHERE pool_id = ? AND user_id = ?',
+            (pool_id, user_id)
+        ).fetchone()
+
+        if existing:
+            conn.execute('''
+                UPDATE lp_token_holders
+                SET lp_tokens = lp_tokens + ?
+                WHERE pool_id = ? AND user_id = ?
+            ''', (lp_tokens_minted, pool_id, user_id))
+        else:
+            conn.execute('''
+                INSERT INTO lp_token_holders (pool_id, user_id, lp_tokens)
+                VALUES (?, ?, ?)
+            ''', (pool_id, user_id, lp_tokens_minted))
+
+        # Record event
         conn.execute('''
-            INSERT INTO lp_token_holders (pool_id, user_id, lp_tokens)
-            VALUES (?, ?, ?)
-        ''', (pool_id, user_id, lp_tokens_minted))
-
-    # Record event
-    conn.execute('''
-        INSERT INTO liquidity_events (
-            pool_id, user_id, event_type,
-            amount_a, amount_b, lp_tokens_change, k_before, k_after
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (pool_id, user_id, 'add_liquidity', amount_a, amount_b, lp_tokens_minted, pool['k_constant'], new_k))
-
-    conn.commit()
-    conn.close()
+            INSERT INTO liquidity_events (
+                pool_id, user_id, event_type,
+                amount_a, amount_b, lp_tokens_change, k_before, k_after
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (pool_id, user_id, 'add_liquidity', amount_a, amount_b, lp_tokens_minted, pool['k_constant'], new_k))
 
     return {
         'lp_tokens_minted': lp_tokens_minted,
@@ -278,67 +275,64 @@ def swap(pool_id: int, user_id: int, input_domain: str, amount_in: float) -> Dic
         }
     """
 
-    conn = get_db()
+    # Take the write lock before reading reserves: a concurrent swap can't
+    # compute against the same snapshot. Rolled back (lock released) on error.
+    with immediate() as conn:
+        pool = conn.execute(
+            'SELECT * FROM liquidity_pools WHERE id = ?',
+            (pool_id,)
+        ).fetchone()
+
+        if not pool:
+            return {'error': 'Pool not found'}
+
+        # Get reserves
+        reserve_in = pool['reserve_a'] if input_domain == 'a' else pool['reserve_b']
+        reserve_out = pool['reserve_b'] if input_domain == 'a' else pool['reserve_a']
+
+        # Apply fee (0.3% like Uniswap)
+        fee = pool['fee_percentage']
+        amount_in_with_fee = amount_in * (1 - fee)
+
+        # Constant product formula: k = x * y
+        # New reserves: (reserve_in + amount_in) * (reserve_out - amount_out) = k
+        # Solve for amount_out:
+        # amount_out = reserve_out - (k / (reserve_in + amount_in_with_fee))
+
+        k = pool['k_constant']
+        amount_out = reserve_out - (k / (reserve_in + amount_in_with_fee))
+
+        # Price impact
+        price_before = reserve_out / reserve_in
+        price_after = (reserve_out - amount_out) / (reserve_in + amount_in)
+        price_impact = abs((price_after - price_before) / price_before) * 100
+
+        # Update reserves
+        if input_domain == 'a':
+            new_reserve_a = reserve_in + amount_in
+            new_reserve_b = reserve_out - amount_out
+        else:
+            new_reserve_b = reserve_in + amount_in
+            new_reserve_a = reserve_out - amount_out
 
-    pool = conn.execute(
-        'SELECT * FROM liquidity_pools WHERE id = ?',
-        (pool_id,)
-    ).fetchone()
-
-    if not pool:
-        conn.close()
-        return {'error': 'Pool not found'}
-
-    # Get reserves
-    reserve_in = pool['reserve_a'] if input_domain == 'a' else pool['reserve_b']
-    reserve_out = pool['reserve_b'] if input_domain == 'a' else pool['reserve_a']
-
-    # Apply fee (0.3% like Uniswap)
-    fee = pool['fee_percentage']
-    amount_in_with_fee = amount_in * (1 - fee)
-
-    # Constant product formula: k = x * y
-    # New reserves: (reserve_in + amount_in) * (reserve_out - amount_out) = k
-    # Solve for amount_out:
-    # amount_out = reserve_out - (k / (reserve_in + amount_in_with_fee))
-
-    k = pool['k_constant']
-    amount_out = reserve_out - (k / (reserve_in + amount_in_with_fee))
-
-    # Price impact
-    price_before = reserve_out / reserve_in
-    price_after = (reserve_out - amount_out) / (reserve_in + amount_in)
-    price_impact = abs((price_after - price_before) / price_before) * 100
-
-    # Update reserves
-    if input_domain == 'a':
-        new_reserve_a = reserve_in + amount_in
-        new_reserve_b = reserve_out - amount_out
-    else:
-        new_reserve_b = reserve_in + amount_in
-        new_reserve_a = reserve_out - amount_out
-
-    conn.execute('''
-        UPDATE liquidity_pools
-        SET reserve_a = ?, reserve_b = ?
-        WHERE id = ?
-    ''', (new_reserve_a, new_reserve_b, pool_id))
-
-    # Record event
-    conn.execute('''
-        INSERT INTO liquidity_events (
-            pool_id, user_id, event_type,
-            amount_a, amount_b, k_before, k_after
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        pool_id, user_id, 'swap',
-        amount_in if input_domain == 'a' else -amount_out,
-        amount_in if input_domain == 'b' else -amount_out,
-        k, k  # k stays constant
-    ))
+        conn.execute('''
+            UPDATE liquidity_pools
+            SET reserve_a = ?, reserve_b = ?
+            WHERE id = ?
+        ''', (new_reserve_a, new_reserve_b, pool_id))
 
-    conn.commit()
-    conn.close()
+        # Record event
+        conn.execute('''
+            INSERT INTO liquidity_events (
+                pool_id, user_id, event_type,
+                amount_a, amount_b, k_before, k_after
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            pool_id, user_id, 'swap',
+            amount_in if input_domain == 'a' else -amount_out,
+            amount_in if input_domain == 'b' else -amount_out,
+            k, k  # k stays constant
+        ))
 
     return {
         'amount_out': amount_out,
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Domain Match Index - Inverted index over domain wordmaps
+
+auto_match_domains, classify_idea and the SHA256 content wrapper all score a
+bag of words against wordmaps. They used to do it by looping over every
+domain (and re-reading every wordmap from SQLite) for every query. This
+module keeps one inverted index instead:
+
+    word -> {domain: weight}
+
+plus per-domain vocabulary size and vector norm, so a query only touches the
+posting lists of its own distinct words. Cost is proportional to the query's
+vocabulary and the domains it actually hits, not to the number of domains.
+
+Scoring metrics (all computed from the same posting walk):
+- jaccard:  |Q ∩ D| / |Q ∪ D|                  (auto_match_domains)
+- coverage: query tokens found in D / tokens  (classify_idea)
+- recall:   |Q ∩ D| / |D|                      (content alignment)
+- cosine:   weighted dot product / (|Q| |D|)
+
+Table-backed indexes stay current incrementally: refresh() reads one cheap
+fingerprint row per domain (last_updated + JSON length) and only re-parses
+wordmaps whose fingerprint changed. Writers can call invalidate_domain() to
+force the next lookup to pick a change up immediately.
+
+Usage:
+    from domain_match_index import get_classify_index
+
+    index = get_classify_index()
+    for domain, score, matched in index.match(keywords, metric='coverage', k=3):
+        print(domain, score, matched)
+
+Benchmark:
+    python3 domain_match_index.py --benchmark
+"""
+
+import heapq
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from database import get_db
+
+
+# Configuration
+REFRESH_SECONDS = 30     # How often table-backed indexes re-check fingerprints
+LOAD_CHUNK = 500         # Max domains per IN (...) when loading changed wordmaps
+
+METRICS = ('jaccard', 'coverage', 'recall', 'cosine')
+
+Query = Union[Dict[str, float], Iterable[str]]
+Match = Tuple[str, float, List[str]]
+
+
+def _as_counts(query: Query) -> Dict[str, float]:
+    if isinstance(query, dict):
+        return query
+    return Counter(query)
+
+
+class WordmapIndex:
+    """In-memory inverted index of named wordmaps ({'word': weight})"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._wordmaps: Dict[str, Dict[str, float]] = {}
+        self._norms: Dict[str, float] = {}
+        self._rank: Dict[str, int] = {}   # insertion order, used to break ties
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._wordmaps)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._wordmaps
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return sorted(self._wordmaps, key=self._rank.get)
+
+    def set(self, key: str, wordmap: Dict[str, float]):
+        """Add or replace one wordmap (only its own postings are touched)"""
+        with self._lock:
+            self._remove(key)
+            wordmap = dict(wordmap)
+            for word, weight in wordmap.items():
+                self._postings.setdefault(word, {})[key] = weight
+            self._wordmaps[key] = wordmap
+            self._norms[key] = math.sqrt(sum(w * w for w in wordmap.values()))
+            self._rank.setdefault(key, len(self._rank))
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+            self._rank.pop(key, None)
+
+    def _remove(self, key: str):
+        for word in self._wordmaps.pop(key, ()):
+            posting = self._postings.get(word)
+            if posting is not None:
+                posting.pop(key, None)
+                if not posting:
+                    del self._postings[word]
+        self._norms.pop(key, None)
+
+    def match(self, query: Query, metric: str = 'jaccard', k: Optional[int] = None,
+              min_score: float = 0.0) -> List[Match]:
+        """
+        Score query against every indexed wordmap it shares a word with
+
+        Args:
+            query: Word list (repeats count as frequency) or {'word': weight}
+            metric: One of METRICS
+            k: Return only the k best matches
+            min_score: Drop matches below this score. With min_score <= 0,
+                       wordmaps sharing no word are appended with score 0.0.
+
+        Returns:
+            [(key, score, matched_words), ...] best first; matched_words are
+            in query order.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+
+        counts = _as_counts(query)
+        query_size = len(counts)
+        query_tokens = sum(counts.values())
+
+        # Shared-word counts per wordmap; Counter.update over posting keys
+        # runs in C, which keeps long posting lists (common words) cheap
+        overlap = Counter()
+        repeats = Counter()          # extra hits from words said more than once
+        dot: Dict[str, float] = {}
+
+        with self._lock:
+            for word, count in counts.items():
+                posting = self._postings.get(word)
+                if not posting:
+                    continue
+                overlap.update(posting.keys())
+                if metric == 'coverage':
+                    for _ in range(int(count) - 1):
+                        repeats.update(posting.keys())
+                elif metric == 'cosine':
+                    for key, weight in posting.items():
+                        dot[key] = dot.get(key, 0.0) + count * weight
+
+            wordmaps = self._wordmaps
+            if metric == 'cosine':
+                query_norm = math.sqrt(sum(c * c for c in counts.values()))
+
+            scored = []
+            for key, shared in overlap.items():
+                if metric == 'jaccard':
+                    score = shared / (query_size + len(wordmaps[key]) - shared)
+                elif metric == 'coverage':
+                    score = (shared + repeats[key]) / query_tokens
+                elif metric == 'recall':
+                    score = shared / len(wordmaps[key])
+                else:
+                    denominator = query_norm * self._norms[key]
+                    score = dot[key] / denominator if denominator else 0.0
+                if score >= min_score:
+                    scored.append((key, score))
+
+            rank = self._rank
+            if k is not None and k < len(scored):
+                scored = heapq.nsmallest(k, scored, key=lambda r: (-r[1], rank[r[0]]))
+            else:
+                scored.sort(key=lambda r: (-r[1], rank[r[0]]))
+
+            # Matched words only for the matches actually returned
+            results = [
+                (key, score, [word for word in counts if word in wordmaps[key]])
+                for key, score in scored
+            ]
+
+            if min_score <= 0 and (k is None or len(results) < k):
+                misses = [key for key in wordmaps if key not in overlap]
+                misses.sort(key=rank.get)
+                if k is not None:
+                    misses = misses[:k - len(results)]
+                results.extend((key, 0.0, []) for key in misses)
+
+        return results
+
+    def best(self, query: Query, metric: str = 'jaccard', min_score: float = 0.0) -> Optional[Match]:
+        """Single best match with a positive score (or None)"""
+        results = self.match(query, metric=metric, k=1, min_score=max(min_score, 1e-12))
+        return results[0] if results else None
+
+    def score(self, key: str, query: Query, metric: str = 'jaccard') -> float:
+        """Score query against one wordmap"""
+        for match_key, score, _ in self.match(query, metric=metric, min_score=1e-12):
+            if match_key == key:
+                return score
+        return 0.0
+
+
+class DomainIndex(WordmapIndex):
+    """
+    WordmapIndex kept in sync with the database
+
+    fingerprint_sql returns one row per domain: the domain first, then any
+    cheap columns that change when its wordmap changes (no JSON). load(db,
+    rows) receives the fingerprint rows of changed domains and returns
+    {domain: wordmap or None}; None drops the domain from the index.
+    """
+
+    def __init__(self, fingerprint_sql: str,
+                 load: Callable[[sqlite3.Connection, List[sqlite3.Row]], Dict[str, Optional[Dict]]],
+                 refresh_seconds: float = REFRESH_SECONDS):
+        super().__init__()
+        self.fingerprint_sql = fingerprint_sql
+        self.refresh_seconds = refresh_seconds
+        self._load = load
+        self._fingerprints: Dict[str, tuple] = {}
+        self._meta: Dict[str, Dict] = {}
+        self._refreshed_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def meta(self, domain: str) -> Dict:
+        """Fingerprint row of a domain as a dict (e.g. its tier)"""
+        return self._meta.get(domain, {})
+
+    def invalidate(self, domain: Optional[str] = None):
+        """Re-check fingerprints on next use (and re-load domain if given)"""
+        if domain is not None:
+            self._fingerprints.pop(domain, None)
+        self._refreshed_at = 0.0
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Re-index domains whose fingerprint changed
+
+        Returns:
+            Number of domains added, updated or removed
+        """
+        if not force and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return 0
+
+        with self._refresh_lock:
+            db = get_db()
+            try:
+                rows = db.execute(self.fingerprint_sql).fetchall()
+            except sqlite3.OperationalError as e:
+                print(f"⚠️  Domain index not refreshed: {e}")
+                db.close()
+                return 0
+
+            seen = set()
+            changed = []
+            for row in rows:
+                domain = row[0]
+                seen.add(domain)
+                fingerprint = tuple(row[1:])
+                if self._fingerprints.get(domain) != fingerprint:
+                    changed.append(row)
+
+            removed = [domain for domain in self._fingerprints if domain not in seen]
+            for domain in removed:
+                self.remove(domain)
+                self._fingerprints.pop(domain, None)
+                self._meta.pop(domain, None)
+
+            for start in range(0, len(changed), LOAD_CHUNK):
+                chunk = changed[start:start + LOAD_CHUNK]
+                wordmaps = self._load(db, chunk)
+                for row in chunk:
+                    domain = row[0]
+                    wordmap = wordmaps.get(domain)
+                    if wordmap:
+                        self.set(domain, wordmap)
+                    else:
+                        self.remove(domain)
+                    self._fingerprints[domain] = tuple(row[1:])
+                    self._meta[domain] = dict(row)
+
+            db.close()
+            self._refreshed_at = time.monotonic()
+            return len(changed) + len(removed)
+
+
+# ==============================================================================
+# TABLE-BACKED INDEXES
+# ==============================================================================
+
+def _placeholders(rows: List) -> str:
+    return ','.join('?' * len(rows))
+
+
+def _load_domain_wordmaps(db, rows) -> Dict[str, Optional[Dict]]:
+    """domain_wordmaps.wordmap_json for the given domains"""
+    domains = [row[0] for row in rows]
+    loaded = db.execute(f'''
+        SELECT domain, wordmap_json
+        FROM domain_wordmaps
+        WHERE domain IN ({_placeholders(domains)})
+    ''', domains).fetchall()
+    return {row['domain']: json.loads(row['wordmap_json']) for row in loaded}
+
+
+def _load_matching_wordmaps(db, rows) -> Dict[str, Optional[Dict]]:
+    """
+    Same rule as economy_mesh_network.get_domain_matching_wordmap:
+    owned domains use their dynamic wordmap, unowned ones their seed keywords
+    """
+    domains = [row[0] for row in rows]
+    owned = {row['domain'] for row in rows if row['has_owners']}
+    loaded = db.execute(f'''
+        SELECT dc.domain, dc.initial_keywords, dw.wordmap_json
+        FROM domain_contexts dc
+        LEFT JOIN domain_wordmaps dw ON dw.domain = dc.domain
+        WHERE dc.domain IN ({_placeholders(domains)})
+    ''', domains).fetchall()
+
+    wordmaps = {}
+    for row in loaded:
+        if row['domain'] in owned:
+            wordmaps[row['domain']] = json.loads(row['wordmap_json']) if row['wordmap_json'] else None
+        elif row['initial_keywords']:
+            wordmaps[row['domain']] = {word: 10 for word in json.loads(row['initial_keywords'])}
+    return wordmaps
+
+
+_classify_index = DomainIndex('''
+    SELECT domain, last_updated, length(wordmap_json) AS wordmap_size
+    FROM domain_wordmaps
+    ORDER BY rowid
+''', _load_domain_wordmaps)
+
+_matching_index = DomainIndex('''
+    SELECT dc.domain, dc.tier,
+           EXISTS(
+               SELECT 1 FROM domain_ownership do
+               WHERE do.domain_id = dc.id AND do.ownership_percentage > 0
+           ) AS has_owners,
+           length(dc.initial_keywords) AS keywords_size,
+           dw.last_updated,
+           length(dw.wordmap_json) AS wordmap_size
+    FROM domain_contexts dc
+    LEFT JOIN domain_wordmaps dw ON dw.domain = dc.domain
+    ORDER BY dc.domain
+''', _load_matching_wordmaps)
+
+
+def get_classify_index() -> DomainIndex:
+    """Index of domain_wordmaps (used by classify_idea)"""
+    _classify_index.refresh()
+    return _classify_index
+
+
+def get_matching_index() -> DomainIndex:
+    """Index of domain_contexts matching wordmaps (used by auto_match_domains)"""
+    _matching_index.refresh()
+    return _matching_index
+
+
+def invalidate_domain(domain: Optional[str] = None):
+    """Call after writing a domain wordmap so the next lookup re-indexes it"""
+    for index in (_classify_index, _matching_index):
+        index.invalidate(domain)
+
+
+# ==============================================================================
+# BENCHMARK
+# ==============================================================================
+
+def benchmark(domain_count: int = 500, idea_count: int = 100000,
+              words_per_domain: int = 200, vocabulary: int = 20000,
+              naive_sample: int = 2000, seed: int = 42) -> Dict:
+    """
+    Compare the index with the old scan-every-domain loop on synthetic data
+
+    Each domain draws most of its vocabulary from its own topic and the rest
+    from a shared Zipf-distributed pool (stop words are already filtered by
+    extract_keywords, so no word is in every domain). Ideas are drawn the
+    same way from a random topic. The naive loop is timed on naive_sample
+    ideas and extrapolated.
+    """
+    import random
+
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    topic_size = max(words_per_domain, vocabulary // max(domain_count // 5, 1))
+    shared_pool = words[:vocabulary // 10]
+    popularity = [1.0 / (i + 1) ** 0.8 for i in range(len(shared_pool))]
+
+    def draw(topic: int, k: int) -> List[str]:
+        start = (topic * topic_size) % (vocabulary - topic_size)
+        own = rng.choices(words[start:start + topic_size], k=int(k * 0.8))
+        return own + rng.choices(shared_pool, weights=popularity, k=k - len(own))
+
+    domains = {}
+    for d in range(domain_count):
+        picked = dict.fromkeys(draw(d // 5, words_per_domain * 2))
+        domains[f"domain{d}.com"] = {w: rng.randint(1, 50) for w in list(picked)[:words_per_domain]}
+
+    topics = max(domain_count // 5, 1)
+    ideas = [draw(rng.randrange(topics), rng.randint(8, 40)) for _ in range(idea_count)]
+
+    started = time.perf_counter()
+    index = WordmapIndex()
+    for domain, wordmap in domains.items():
+        index.set(domain, wordmap)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for keywords in ideas:
+        index.best(keywords, metric='coverage')
+    index_seconds = time.perf_counter() - started
+
+    domain_sets = [(domain, set(wordmap)) for domain, wordmap in domains.items()]
+    started = time.perf_counter()
+    for keywords in ideas[:naive_sample]:
+        best = None
+        for domain, vocabulary_set in domain_sets:
+            score = sum(1 for kw in keywords if kw in vocabulary_set) / len(keywords)
+            if best is None or score > best[1]:
+                best = (domain, score)
+    naive_seconds = (time.perf_counter() - started) * idea_count / min(naive_sample, idea_count)
+
+    started = time.perf_counter()
+    index.set('domain0.com', {w: 5 for w in rng.sample(words, words_per_domain)})
+    update_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        'domains': domain_count,
+        'ideas': idea_count,
+        'build_seconds': round(build_seconds, 3),
+        'index_seconds': round(index_seconds, 2),
+        'naive_seconds_estimated': round(naive_seconds, 2),
+        'speedup': round(naive_seconds / index_seconds, 1) if index_seconds else None,
+        'single_domain_update_ms': round(update_ms, 3),
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Domain match index')
+    parser.add_argument('--benchmark', action='store_true', help='Run synthetic benchmark')
+    parser.add_argument('--domains', type=int, default=500)
+    parser.add_argument('--ideas', type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"⏱️  Benchmarking {args.domains} domains × {args.ideas} ideas...")
+        for key, value in benchmark(args.domains, args.ideas).items():
+            print(f"   {key}: {value}")
+    else:
+        refreshed = _classify_index.refresh(force=True)
+        matching = _matching_index.refresh(force=True)
+        print(f"✅ domain_wordmaps indexed: {len(_classify_index)} domains ({refreshed} loaded)")
+        print(f"✅ domain_contexts indexed: {len(_matching_index)} domains ({matching} loaded)")
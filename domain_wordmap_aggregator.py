@@ -22,6 +22,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from collections import Counter
 from database import get_db
+from domain_match_index import invalidate_domain
 
 
 def init_domain_wordmap_table():
@@ -172,6 +173,7 @@ def recalculate_domain_wordmap(domain: str) -> Dict:
         datetime.now().isoformat()
     ))
     db.commit()
+    invalidate_domain(domain)
 
     return {
         'domain': domain,
@@ -44,6 +44,7 @@ from domain_wordmap_aggregator import recalculate_domain_wordmap, get_domain_wor
 from voice_content_generator import VoiceContentGenerator
 from ownership_rewards import claim_content_reward
 from domain_unlock_engine import unlock_domain, get_user_domains
+from domain_match_index import get_matching_index
 
 
 # Configuration
@@ -286,13 +287,8 @@ def auto_match_domains(user_id: int, min_alignment: float = MIN_ALIGNMENT_THRESH
 
     user_wordmap = user_wordmap_data['wordmap']
 
-    # Get all domains
-    db = get_db()
-    all_domains = db.execute('''
-        SELECT domain, tier
-        FROM domain_contexts
-        ORDER BY domain
-    ''').fetchall()
+    # Indexed domain wordmaps (initial keywords if no owners, dynamic if owned)
+    index = get_matching_index()
 
     # Get user's owned domains
     owned_domains = {}
@@ -303,41 +299,21 @@ def auto_match_domains(user_id: int, min_alignment: float = MIN_ALIGNMENT_THRESH
             for d in user_domains['domains']
         }
 
-    # Match against each domain
+    # Jaccard similarity against every domain sharing a word with the user
     matches = []
 
-    for domain_row in all_domains:
-        domain = domain_row['domain']
-        tier = domain_row['tier']
-
-        # Get domain wordmap (initial keywords if no owners, dynamic if owned)
-        domain_wordmap = get_domain_matching_wordmap(domain)
-
-        if not domain_wordmap:
-            continue
-
-        # Calculate alignment (Jaccard similarity between wordmaps)
-        user_words = set(user_wordmap.keys())
-        domain_words = set(domain_wordmap.keys())
-        intersection = len(user_words & domain_words)
-        union = len(user_words | domain_words)
-        alignment_score = intersection / union if union > 0 else 0.0
-
-        # Only include if meets threshold
-        if alignment_score >= min_alignment:
-            matched_words = user_words & domain_words
-            matches.append({
-                'domain': domain,
-                'domain_with_emoji': add_tier_emoji(domain, tier),
-                'tier': tier,
-                'alignment_score': alignment_score,
-                'is_owned': domain in owned_domains,
-                'ownership_pct': owned_domains.get(domain, 0.0),
-                'matched_keywords': list(matched_words)[:10]  # Show top 10 matched words
-            })
-
-    # Sort by alignment score (highest first)
-    matches.sort(key=lambda x: x['alignment_score'], reverse=True)
+    for domain, alignment_score, matched_words in index.match(user_wordmap, metric='jaccard',
+                                                              min_score=min_alignment):
+        tier = index.meta(domain).get('tier')
+        matches.append({
+            'domain': domain,
+            'domain_with_emoji': add_tier_emoji(domain, tier),
+            'tier': tier,
+            'alignment_score': alignment_score,
+            'is_owned': domain in owned_domains,
+            'ownership_pct': owned_domains.get(domain, 0.0),
+            'matched_keywords': matched_words[:10]  # Show top 10 matched words
+        })
 
     return matches
 
@@ -27,6 +27,8 @@ import re
 from pathlib import Path
 from database import get_db
 import markdown2
+from functools import lru_cache
+from syndication import write_document
 
 
 def get_all_brands():
@@ -473,14 +475,28 @@ def generate_post_page(brand, post, comments, site_dir):
 
 def generate_rss_feed(brand, posts):
     """Generate RSS feed for podcast"""
-    items = []
+    return ''.join(iter_rss_feed(brand, posts))
+
+
+def iter_rss_feed(brand, posts):
+    """Stream the podcast RSS feed in chunks (written with write_document)"""
+    yield f'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
+    <channel>
+        <title>{brand['name']}</title>
+        <link>https://{brand['slug']}.com</link>
+        <description>{brand['tagline']}</description>
+        <language>en-us</language>
+        <itunes:author>{brand['name']}</itunes:author>
+        <itunes:category text="{brand['category'].title()}"/>
+        '''
 
     for post in posts[:20]:  # Latest 20
         # Use full content for RSS (readers can handle it)
         # Wrap in CDATA to prevent XML parsing issues
-        description_html = markdown2.markdown(post['content'])
+        description_html = _markdown_html(post['content'])
 
-        items.append(f'''
+        yield f'''
         <item>
             <title>{post['title']}</title>
             <link>https://{brand['slug']}.com/post/{post['slug']}.html</link>
@@ -488,22 +504,19 @@ def generate_rss_feed(brand, posts):
             <pubDate>{post['published_at']}</pubDate>
             <guid>https://{brand['slug']}.com/post/{post['slug']}.html</guid>
         </item>
-        ''')
+        '''
 
-    return f'''<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">
-    <channel>
-        <title>{brand['name']}</title>
-        <link>https://{brand['slug']}.com</link>
-        <description>{brand['tagline']}</description>
-        <language>en-us</language>
-        <itunes:author>{brand['name']}</itunes:author>
-        <itunes:category text="{brand['category'].title()}"/>
-        {''.join(items)}
+    yield '''
     </channel>
 </rss>'''
 
 
+@lru_cache(maxsize=4096)
+def _markdown_html(content):
+    """Markdown -> HTML, memoized so unchanged posts aren't re-rendered per brand/build"""
+    return markdown2.markdown(content)
+
+
 def export_brand_to_static(brand_slug, output_dir='output'):
     """
     Export a single brand to static HTML
@@ -554,9 +567,11 @@ def export_brand_to_static(brand_slug, output_dir='output'):
     print(f"   ✅ Created {len(posts)} post page(s)")
 
     # Generate RSS feed
-    rss_xml = generate_rss_feed(brand, posts)
-    (site_dir / 'feed.xml').write_text(rss_xml)
-    print(f"   ✅ Created feed.xml")
+    # Generate RSS feed (file left untouched if nothing changed)
+    if write_document(site_dir / 'feed.xml', iter_rss_feed(brand, posts)):
+        print("   ✅ Created feed.xml")
+    else:
+        print("   ✓ feed.xml unchanged")
 
     # Create CNAME file for GitHub Pages
     (site_dir / 'CNAME').write_text(f"{brand_slug}.com")
@@ -40,12 +40,113 @@ Example template.html.tmpl:
 import json
 import re
 import ast
+import hashlib
 import operator
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Union, Callable, List
+from typing import Dict, Any, Union, Callable, List, Mapping, NamedTuple, Optional, Tuple
 import colorsys
 
 
+TEMPLATE_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+RENDER_CACHE_SIZE = 1024        # Rendered outputs kept per engine
+
+# Node types a formula may contain - everything else (attributes, subscripts,
+# comprehensions, lambdas...) is rejected before compile()
+SAFE_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+SAFE_NODES = (ast.Expression, ast.Constant, ast.Name, ast.Load, ast.BinOp, ast.UnaryOp,
+              ast.Call, ast.keyword, ast.List) + tuple(SAFE_OPERATORS)
+
+
+# ==============================================================================
+# COMPILED FORMULAS
+# ==============================================================================
+
+@lru_cache(maxsize=4096)
+def compile_expression(expression: str):
+    """
+    Parse, validate and compile a formula once
+
+    Returns a code object shared by every engine; evaluating it is a
+    single eval() instead of an AST walk per render.
+    """
+    tree = ast.parse(expression, mode='eval')
+    for node in ast.walk(tree):
+        if not isinstance(node, SAFE_NODES):
+            raise SyntaxError(f"Unsupported expression type: {type(node).__name__}")
+    return compile(tree, '<formula>', 'eval')
+
+
+class CompiledTemplate(NamedTuple):
+    digest: str                                 # sha256 of the template text
+    segments: Tuple[Tuple[str, Optional[str]], ...]   # (literal, expression or None)
+    names: frozenset                            # every name the formulas reference
+
+
+@lru_cache(maxsize=512)
+def compile_template(template: str) -> CompiledTemplate:
+    """Split a template into literal text and {{expression}} slots once"""
+    segments, names, pos = [], set(), 0
+    for match in TEMPLATE_PATTERN.finditer(template):
+        expression = match.group(1).strip()
+        segments.append((template[pos:match.start()], expression))
+        try:
+            names.update(compile_expression(expression).co_names)
+        except Exception:
+            pass                                # reported when rendered
+        pos = match.end()
+    segments.append((template[pos:], None))
+    return CompiledTemplate(
+        digest=hashlib.sha256(template.encode('utf-8')).hexdigest(),
+        segments=tuple(segments),
+        names=frozenset(names),
+    )
+
+
+class _FormulaScope(Mapping):
+    """Name lookup for eval(): variables, then functions, then defaults"""
+
+    __slots__ = ('variables', 'functions', 'defaults')
+
+    def __init__(self, variables, functions, defaults):
+        self.variables = variables
+        self.functions = functions
+        self.defaults = defaults
+
+    def __getitem__(self, name):
+        for source in (self.variables, self.functions, self.defaults):
+            if name in source:
+                return source[name]
+        raise NameError(f"Variable not defined: {name}")
+
+    def __iter__(self):
+        return iter({**self.defaults, **self.functions, **self.variables})
+
+    def __len__(self):
+        return len({**self.defaults, **self.functions, **self.variables})
+
+
+def _variables_digest(variables: Dict[str, Any]) -> Optional[str]:
+    """Stable hash of template variables, or None if they aren't plain data"""
+    try:
+        encoded = json.dumps(variables, sort_keys=True, separators=(',', ':'))
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
 class FormulaEngine:
     """Universal template engine with formula evaluation"""
 
@@ -79,17 +180,16 @@ class FormulaEngine:
         }
 
         # Safe operators for expression evaluation
-        self.operators = {
-            ast.Add: operator.add,
-            ast.Sub: operator.sub,
-            ast.Mult: operator.mul,
-            ast.Div: operator.truediv,
-            ast.FloorDiv: operator.floordiv,
-            ast.Mod: operator.mod,
-            ast.Pow: operator.pow,
-            ast.USub: operator.neg,
-            ast.UAdd: operator.pos,
-        }
+        self.operators = SAFE_OPERATORS
+
+        # Functions whose result can change between calls (never cached)
+        self.volatile_functions = set()
+
+        # Rendered output keyed by (template hash, variables hash)
+        self._render_cache = OrderedDict()
+        self._render_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
         # Default values for common variables (prevents template errors)
         self.default_values = {
@@ -175,66 +275,6 @@ class FormulaEngine:
     # EXPRESSION EVALUATION
     # ==================================================================
 
-    def _eval_expr(self, node, variables: Dict[str, Any]) -> Any:
-        """
-        Safely evaluate Python expressions in templates
-
-        Supports:
-        - Variables: x, primaryColor
-        - Math: 2 + 3, x * 2, x / 2
-        - Function calls: darken(color, 0.3), upper(name)
-        - Literals: numbers, strings
-        """
-        if isinstance(node, ast.Constant):
-            # Python 3.8+: literals
-            return node.value
-
-        elif isinstance(node, ast.Num):
-            # Python 3.7: numbers
-            return node.n
-
-        elif isinstance(node, ast.Str):
-            # Python 3.7: strings
-            return node.s
-
-        elif isinstance(node, ast.Name):
-            # Variable lookup
-            if node.id in variables:
-                return variables[node.id]
-            elif node.id in self.functions:
-                return self.functions[node.id]
-            elif node.id in self.default_values:
-                # Use default value instead of raising error
-                return self.default_values[node.id]
-            else:
-                raise NameError(f"Variable not defined: {node.id}")
-
-        elif isinstance(node, ast.BinOp):
-            # Binary operations: +, -, *, /, etc.
-            left = self._eval_expr(node.left, variables)
-            right = self._eval_expr(node.right, variables)
-            op = self.operators[type(node.op)]
-            return op(left, right)
-
-        elif isinstance(node, ast.UnaryOp):
-            # Unary operations: -, +
-            operand = self._eval_expr(node.operand, variables)
-            op = self.operators[type(node.op)]
-            return op(operand)
-
-        elif isinstance(node, ast.Call):
-            # Function calls: darken(color, 0.3)
-            func = self._eval_expr(node.func, variables)
-            args = [self._eval_expr(arg, variables) for arg in node.args]
-            return func(*args)
-
-        elif isinstance(node, ast.List):
-            # List literals: [1, 2, 3]
-            return [self._eval_expr(el, variables) for el in node.elts]
-
-        else:
-            raise SyntaxError(f"Unsupported expression type: {type(node).__name__}")
-
     def evaluate(self, expression: str, variables: Dict[str, Any]) -> Any:
         """
         Evaluate a formula expression
@@ -245,8 +285,9 @@ class FormulaEngine:
             evaluate("darken(color, 0.3)", {"color": "#4ecca3"}) → "#368e72"
         """
         try:
-            tree = ast.parse(expression, mode='eval')
-            return self._eval_expr(tree.body, variables)
+            code = compile_expression(expression)
+            return eval(code, {'__builtins__': {}},
+                        _FormulaScope(variables, self.functions, self.default_values))
         except Exception as e:
             raise ValueError(f"Error evaluating '{expression}': {e}")
 
@@ -292,22 +333,50 @@ class FormulaEngine:
         else:
             template = str(template_source)
 
-        # Find all {{...}} blocks
-        pattern = r'\{\{([^}]+)\}\}'
+        compiled = compile_template(template)
+
+        # Same template + same variables -> same output, unless a formula
+        # calls a volatile function
+        key = None
+        if not compiled.names & self.volatile_functions:
+            variables_digest = _variables_digest(all_variables)
+            if variables_digest:
+                key = (compiled.digest, variables_digest)
+                with self._render_lock:
+                    rendered = self._render_cache.get(key)
+                    if rendered is not None:
+                        self._render_cache.move_to_end(key)
+                        self.cache_hits += 1
+                        return rendered
+
+        rendered = self._render_compiled(compiled, all_variables)
+
+        if key:
+            with self._render_lock:
+                self.cache_misses += 1
+                self._render_cache[key] = rendered
+                if len(self._render_cache) > RENDER_CACHE_SIZE:
+                    self._render_cache.popitem(last=False)
+
+        return rendered
 
-        def replace_expression(match):
-            expression = match.group(1).strip()
+    def _render_compiled(self, compiled: CompiledTemplate, variables: Dict[str, Any]) -> str:
+        parts = []
+        for literal, expression in compiled.segments:
+            parts.append(literal)
+            if expression is None:
+                continue
             try:
-                result = self.evaluate(expression, all_variables)
-                return str(result)
+                parts.append(str(self.evaluate(expression, variables)))
             except Exception as e:
                 # Keep original if evaluation fails (helps debugging)
-                return f"{{{{ERROR: {e}}}}}"
+                parts.append(f"{{{{ERROR: {e}}}}}")
+        return ''.join(parts)
 
-        # Replace all expressions
-        rendered = re.sub(pattern, replace_expression, template)
-
-        return rendered
+    def clear_cache(self):
+        """Drop rendered outputs (call after changing default_values)"""
+        with self._render_lock:
+            self._render_cache.clear()
 
     def compile_file(
         self,
@@ -344,10 +413,14 @@ class FormulaEngine:
 
         return rendered
 
-    def register_function(self, name: str, func: Callable):
+    def register_function(self, name: str, func: Callable, volatile: bool = False):
         """
         Register a custom function for use in templates
 
+        Pass volatile=True for functions whose result isn't determined by
+        their arguments (clocks, random, DB lookups) so templates calling
+        them are re-rendered every time.
+
         Example:
             def greet(name):
                 return f"Hello, {name}!"
@@ -357,6 +430,33 @@ class FormulaEngine:
             # → "Hello, World!"
         """
         self.functions[name] = func
+        if volatile:
+            self.volatile_functions.add(name)
+        else:
+            self.volatile_functions.discard(name)
+        self.clear_cache()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'entries': len(self._render_cache),
+            'compiled_expressions': compile_expression.cache_info().currsize,
+            'compiled_templates': compile_template.cache_info().currsize,
+        }
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_engine() -> FormulaEngine:
+    """Process-wide engine so request handlers share its render cache"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = FormulaEngine()
+        return _shared_engine
 
 
 def main():
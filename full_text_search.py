@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Full-Text Search - One SQLite FTS5 search API for posts, transcripts, wiki,
+messages, comments, government data and aggregated feed items
+
+Text search used to be `LIKE '%term%'` scans (or a Python loop over feed
+items), which read every row and can't rank. Each searchable table now has
+an FTS5 index next to it:
+
+    posts                   -> posts_fts(title, content)
+    simple_voice_recordings -> simple_voice_recordings_fts(transcription)
+    concepts (wiki)         -> concepts_fts(title, description, content)
+    messages                -> messages_fts(content)
+    comments                -> comments_fts(content)
+    gov_data                -> gov_data_fts(title, summary, tags)
+    feed_items              -> feed_items_fts(title, description)
+
+The indexes are external-content FTS5 tables (no second copy of the text)
+kept in sync by INSERT/UPDATE/DELETE triggers. They are created by
+schema_registry migrations - see fts_statements().
+
+Features:
+- BM25 ranking with per-column weights (titles count more than bodies)
+- Snippets with highlight markers
+- Prefix queries ("encrypt" matches "encryption") via FTS5 prefix indexes
+- Per-brand filtering where the table has a brand column
+- Falls back to the old LIKE scan if an index hasn't been built yet
+
+Usage:
+    from full_text_search import search
+
+    results = search('posts', 'privacy encryption', limit=20, brand=3)
+    for row in results:
+        print(row['title'], row['rank'], row['snippet'])
+
+Benchmark:
+    python3 full_text_search.py --benchmark --docs 1000000
+"""
+
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from database import get_db
+from schema_registry import register_migration
+
+
+# Configuration
+TOKENIZER = 'porter unicode61 remove_diacritics 2'
+PREFIX_LENGTHS = '2 3 4'
+DEFAULT_HIGHLIGHT = ('<mark>', '</mark>')
+SNIPPET_TOKENS = 16
+
+
+@dataclass
+class SearchSource:
+    """One searchable table"""
+    kind: str                          # Name callers pass to search()
+    table: str
+    columns: Tuple[str, ...]           # Indexed text columns
+    weights: Tuple[float, ...]         # BM25 weight per column
+    brand_column: Optional[str] = None # Column compared with search(brand=...)
+    date_column: Optional[str] = None  # Newest-first order for the LIKE fallback
+    select: str = 't.*'                # Columns returned (alias t = base table)
+
+    @property
+    def fts_table(self) -> str:
+        return f"{self.table}_fts"
+
+
+SOURCES: Dict[str, SearchSource] = {}
+
+
+def register_source(source: SearchSource):
+    SOURCES[source.kind] = source
+
+
+register_source(SearchSource('posts', 'posts', ('title', 'content'), (10.0, 1.0),
+                             brand_column='brand_id', date_column='published_at'))
+register_source(SearchSource('recordings', 'simple_voice_recordings', ('transcription',), (1.0,),
+                             date_column='created_at',
+                             select='t.id, t.filename, t.transcription, t.created_at'))
+register_source(SearchSource('concepts', 'concepts', ('title', 'description', 'content'), (10.0, 4.0, 1.0),
+                             brand_column='narrative_brand_slug', date_column='updated_at'))
+register_source(SearchSource('messages', 'messages', ('content',), (1.0,), date_column='created_at'))
+register_source(SearchSource('comments', 'comments', ('content',), (1.0,), date_column='created_at'))
+register_source(SearchSource('gov_data', 'gov_data', ('title', 'summary', 'tags'), (10.0, 2.0, 4.0),
+                             date_column='published_date'))
+register_source(SearchSource('feed_items', 'feed_items', ('title', 'description'), (10.0, 1.0),
+                             brand_column='source', date_column='pub_date'))
+
+
+# ==============================================================================
+# SCHEMA
+# ==============================================================================
+
+FEED_ITEMS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS feed_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guid TEXT UNIQUE NOT NULL,
+        title TEXT,
+        description TEXT,
+        link TEXT,
+        source TEXT,
+        source_type TEXT,
+        pub_date TEXT,
+        enclosure_url TEXT,
+        enclosure_type TEXT,
+        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def fts_statements(kind: str) -> List[str]:
+    """
+    SQL that creates the FTS5 index and sync triggers for a source
+
+    Every statement is idempotent. The first one probes the base table so
+    the migration stays pending (and creates nothing) until it exists; the
+    final 'rebuild' indexes rows that existed before the triggers.
+    """
+    source = SOURCES[kind]
+    fts, table = source.fts_table, source.table
+    cols = ', '.join(source.columns)
+    new_cols = ', '.join(f'new.{c}' for c in source.columns)
+    old_cols = ', '.join(f'old.{c}' for c in source.columns)
+
+    return [
+        f"SELECT id, {cols} FROM {table} LIMIT 0",
+        f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='id',
+            tokenize='{TOKENIZER}', prefix='{PREFIX_LENGTHS}'
+        )
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END
+        ''',
+        f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END
+        ''',
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+# FTS5 index + sync triggers per searchable table. Pending until the table exists.
+register_migration(9, 'full-text search: posts', *fts_statements('posts'), module='full_text_search')
+register_migration(10, 'full-text search: voice transcripts', *fts_statements('recordings'), module='full_text_search')
+register_migration(11, 'full-text search: wiki concepts', *fts_statements('concepts'), module='full_text_search')
+register_migration(12, 'full-text search: messages', *fts_statements('messages'), module='full_text_search')
+register_migration(13, 'full-text search: comments', *fts_statements('comments'), module='full_text_search')
+register_migration(14, 'full-text search: gov data', *fts_statements('gov_data'), module='full_text_search')
+register_migration(15, 'full-text search: feed items', FEED_ITEMS_TABLE, *fts_statements('feed_items'),
+                   module='full_text_search')
+
+
+# ==============================================================================
+# QUERIES
+# ==============================================================================
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(text: str, prefix: bool = True, any_term: bool = False) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression
+
+    Each word is quoted (so user input can't inject FTS syntax) and, with
+    prefix=True, matches as a prefix. Words are ANDed unless any_term=True.
+    """
+    terms = [f'"{term}"' + ('*' if prefix else '') for term in _TERM_RE.findall(text or '')]
+    return (' OR ' if any_term else ' ').join(terms)
+
+
+def _source(kind: str) -> SearchSource:
+    if kind not in SOURCES:
+        raise ValueError(f"Unknown search source: {kind}")
+    return SOURCES[kind]
+
+
+def search(kind: str, text: str, limit: int = 20, offset: int = 0,
+           brand=None, where: Optional[str] = None, params: Sequence = (),
+           select: Optional[str] = None, join: str = '',
+           prefix: bool = True, any_term: bool = False,
+           highlight: Tuple[str, str] = DEFAULT_HIGHLIGHT, db=None) -> List[Dict]:
+    """
+    Ranked full-text search over one source
+
+    Args:
+        kind: Source name (see SOURCES)
+        text: Free-text query
+        limit, offset: Paging
+        brand: Only rows whose brand column equals this value
+        where: Extra SQL condition on the base table (alias t)
+        params: Parameters for where
+        select: Columns to return instead of the source default
+        join: Extra JOIN clauses (e.g. brands, users)
+        prefix: Match words as prefixes
+        any_term: Match rows containing any word instead of all words
+        highlight: (open, close) markers for the snippet
+        db: Connection to use (default: a new one, closed afterwards)
+
+    Returns:
+        Row dicts plus 'rank' (BM25, lower is better) and 'snippet'
+    """
+    source = _source(kind)
+    match = build_match_query(text, prefix=prefix, any_term=any_term)
+    if not match:
+        return []
+
+    conditions, args = [], [match]
+    if brand is not None:
+        if not source.brand_column:
+            raise ValueError(f"Search source {kind} has no brand column")
+        conditions.append(f"t.{source.brand_column} = ?")
+        args.append(brand)
+    if where:
+        conditions.append(f"({where})")
+        args.extend(params)
+
+    fts = source.fts_table
+    weights = ', '.join(str(w) for w in source.weights)
+    open_mark, close_mark = highlight
+    sql = f'''
+        SELECT {select or source.select},
+               bm25({fts}, {weights}) AS rank,
+               snippet({fts}, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet
+        FROM {fts}
+        JOIN {source.table} t ON t.id = {fts}.rowid
+        {join}
+        WHERE {fts} MATCH ?
+        {''.join(f' AND {c}' for c in conditions)}
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    '''
+
+    own_db = db is None
+    db = db or get_db()
+    try:
+        rows = db.execute(sql, [open_mark, close_mark] + args + [limit, offset]).fetchall()
+        return [dict(row) for row in rows]
+    except sqlite3.OperationalError as e:
+        if f'no such table: {fts}' not in str(e):
+            raise
+        # Index not built yet (migration pending) - old behaviour
+        return like_search(kind, text, limit=limit, offset=offset, brand=brand, where=where,
+                           params=params, select=select, join=join, db=db)
+    finally:
+        if own_db:
+            db.close()
+
+
+def like_search(kind: str, text: str, limit: int = 20, offset: int = 0,
+                brand=None, where: Optional[str] = None, params: Sequence = (),
+                select: Optional[str] = None, join: str = '', db=None) -> List[Dict]:
+    """
+    Unranked substring scan (the pre-FTS behaviour)
+
+    Used while an index is missing and as the benchmark baseline.
+    """
+    source = _source(kind)
+    pattern = f'%{text}%'
+    conditions = ['(' + ' OR '.join(f't.{c} LIKE ?' for c in source.columns) + ')']
+    args: List = [pattern] * len(source.columns)
+    if brand is not None and source.brand_column:
+        conditions.append(f"t.{source.brand_column} = ?")
+        args.append(brand)
+    if where:
+        conditions.append(f"({where})")
+        args.extend(params)
+
+    order = f'ORDER BY t.{source.date_column} DESC' if source.date_column else ''
+    sql = f'''
+        SELECT {select or source.select}, NULL AS rank, NULL AS snippet
+        FROM {source.table} t
+        {join}
+        WHERE {' AND '.join(conditions)}
+        {order}
+        LIMIT ? OFFSET ?
+    '''
+
+    own_db = db is None
+    db = db or get_db()
+    try:
+        return [dict(row) for row in db.execute(sql, args + [limit, offset]).fetchall()]
+    finally:
+        if own_db:
+            db.close()
+
+
+def search_all(text: str, kinds: Optional[Iterable[str]] = None, limit: int = 20, **kwargs) -> List[Dict]:
+    """Search several sources and merge by BM25 rank (each row gets 'kind')"""
+    merged = []
+    db = get_db()
+    try:
+        for kind in kinds or SOURCES:
+            if kwargs.get('brand') is not None and not SOURCES[kind].brand_column:
+                continue
+            try:
+                rows = search(kind, text, limit=limit, db=db, **kwargs)
+            except sqlite3.OperationalError:
+                continue   # source table doesn't exist in this database
+            for row in rows:
+                row['kind'] = kind
+                merged.append(row)
+    finally:
+        db.close()
+
+    merged.sort(key=lambda row: row['rank'] if row['rank'] is not None else 0.0)
+    return merged[:limit]
+
+
+# ==============================================================================
+# FEED ITEMS
+# ==============================================================================
+
+def index_feed_items(items: Iterable[Dict]) -> int:
+    """
+    Upsert aggregated RSS items into feed_items (triggers update the index)
+
+    Unchanged items are skipped so re-aggregating doesn't churn the index.
+
+    Returns:
+        Number of items written
+    """
+    rows = [(
+        item['guid'], item.get('title'), item.get('description'), item.get('link'),
+        item.get('source'), item.get('source_type'), item.get('pub_date_str') or None,
+        item.get('enclosure_url'), item.get('enclosure_type'),
+    ) for item in items if item and item.get('guid')]
+
+    if not rows:
+        return 0
+
+    db = get_db()
+    db.execute(FEED_ITEMS_TABLE)
+    cursor = db.executemany('''
+        INSERT INTO feed_items
+        (guid, title, description, link, source, source_type, pub_date, enclosure_url, enclosure_type)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(guid) DO UPDATE SET
+            title = excluded.title,
+            description = excluded.description,
+            link = excluded.link,
+            source = excluded.source,
+            source_type = excluded.source_type,
+            pub_date = excluded.pub_date,
+            enclosure_url = excluded.enclosure_url,
+            enclosure_type = excluded.enclosure_type,
+            indexed_at = CURRENT_TIMESTAMP
+        WHERE feed_items.title IS NOT excluded.title
+           OR feed_items.description IS NOT excluded.description
+           OR feed_items.link IS NOT excluded.link
+           OR feed_items.pub_date IS NOT excluded.pub_date
+    ''', rows)
+    db.commit()
+    written = cursor.rowcount
+    db.close()
+    return written
+
+
+# ==============================================================================
+# BENCHMARK
+# ==============================================================================
+
+def benchmark(documents: int = 1000000, queries: int = 50, db_path: Optional[str] = None,
+              seed: int = 7) -> Dict:
+    """
+    Compare FTS5 with the LIKE scan on a synthetic posts table
+
+    Builds a throwaway database (db_path or a temp file) with `documents`
+    posts, then times `queries` searches each way.
+    """
+    import itertools
+    import os
+    import random
+    import tempfile
+
+    import database
+
+    rng = random.Random(seed)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10)))
+                  for _ in range(50000)]
+    cum_weights = list(itertools.accumulate(1.0 / (i + 1) for i in range(len(vocabulary))))
+
+    tmpdir = None
+    if db_path is None:
+        tmpdir = tempfile.mkdtemp(prefix='soulfra_fts_bench_')
+        db_path = os.path.join(tmpdir, 'bench.db')
+
+    original_path = database.DB_PATH
+    database.DB_PATH = db_path
+    try:
+        db = get_db()
+        db.execute('''
+            CREATE TABLE posts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, content TEXT,
+                brand_id INTEGER, published_at TIMESTAMP
+            )
+        ''')
+
+        started = time.perf_counter()
+        for start in range(0, documents, 10000):
+            batch = []
+            for _ in range(min(10000, documents - start)):
+                words = rng.choices(vocabulary, cum_weights=cum_weights, k=60)
+                batch.append((' '.join(words[:6]), ' '.join(words[6:]), rng.randint(1, 20), '2026-01-01'))
+            db.executemany('INSERT INTO posts (title, content, brand_id, published_at) VALUES (?, ?, ?, ?)', batch)
+        db.commit()
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for statement in fts_statements('posts'):
+            db.execute(statement)
+        db.commit()
+        index_seconds = time.perf_counter() - started
+
+        # Mid-frequency words: realistic searches, not stop-word-like hits
+        terms = rng.sample(vocabulary[200:5000], queries)
+
+        started = time.perf_counter()
+        for term in terms:
+            search('posts', term, limit=20, db=db)
+        fts_ms = (time.perf_counter() - started) * 1000 / queries
+
+        like_sample = terms[:max(1, min(queries, 5))]
+        started = time.perf_counter()
+        for term in like_sample:
+            # LIMIT lets LIKE stop early, so scan for the full ranked set it would need
+            db.execute("SELECT COUNT(*) FROM posts WHERE title LIKE ? OR content LIKE ?",
+                       (f'%{term}%', f'%{term}%')).fetchone()
+        like_ms = (time.perf_counter() - started) * 1000 / len(like_sample)
+
+        db.close()
+    finally:
+        database.DB_PATH = original_path
+        if tmpdir:
+            import shutil
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    return {
+        'documents': documents,
+        'load_seconds': round(load_seconds, 1),
+        'index_build_seconds': round(index_seconds, 1),
+        'fts_ms_per_query': round(fts_ms, 2),
+        'like_ms_per_query': round(like_ms, 1),
+        'speedup': round(like_ms / fts_ms, 1) if fts_ms else None,
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Full-text search')
+    parser.add_argument('query', nargs='?', help='Search every source')
+    parser.add_argument('--kind', choices=sorted(SOURCES), help='Search one source')
+    parser.add_argument('--benchmark', action='store_true', help='Compare FTS5 with LIKE scans')
+    parser.add_argument('--docs', type=int, default=1000000, help='Benchmark document count')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(f"⏱️  Building {args.docs:,} posts and comparing FTS5 with LIKE...")
+        for key, value in benchmark(args.docs).items():
+            print(f"   {key}: {value}")
+    elif args.query:
+        rows = search(args.kind, args.query, highlight=('[', ']')) if args.kind else \
+            search_all(args.query, highlight=('[', ']'))
+        for row in rows:
+            print(f"{row.get('kind', args.kind):<12} {row.get('id')}: {row['snippet']}")
+    else:
+        parser.print_help()
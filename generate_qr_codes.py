@@ -9,14 +9,17 @@ Usage:
     python3 generate_qr_codes.py              # Generate for all missing QR codes
     python3 generate_qr_codes.py --id 21      # Generate for specific professional
     python3 generate_qr_codes.py --regenerate # Regenerate all QR codes (overwrites existing)
+    python3 generate_qr_codes.py --workers 8  # QR render processes (default: CPU count)
 """
 
 import sqlite3
-import qrcode
-import io
+import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import qr_service
+
 DB_PATH = "soulfra.db"
 SITE_URL = "https://soulfra.com/stpetepros"  # Production URL
 
@@ -32,21 +35,7 @@ def generate_qr_code(professional_id, url):
     Returns:
         bytes: PNG image data
     """
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=2
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-
-    # Convert to PNG bytes
-    buffer = io.BytesIO()
-    qr_img.save(buffer, format='PNG')
-    return buffer.getvalue()
+    return qr_service.png(url, ecc='L', version=1, box_size=10, border=2)
 
 
 def get_professionals_without_qr(db):
@@ -103,10 +92,63 @@ def generate_qr_for_professional(db, professional_id, business_name, force=False
     return True
 
 
+def _render_qr_job(professional):
+    """Render one profile QR code; process pool entry point"""
+    profile_url = f"{SITE_URL}/professional-{professional[0]}.html"
+    return profile_url, generate_qr_code(professional[0], profile_url)
+
+
+def generate_qr_batch(db, professionals, force=False, workers=None):
+    """
+    Generate and save QR codes for many professionals
+
+    QR codes are rendered in a process pool (workers > 1) and written
+    back in one transaction.
+
+    Args:
+        db: Database connection
+        professionals: Rows of (id, business_name[, approval_status])
+        force: Label output as regenerated
+        workers: Render processes (default: CPU count; 1 = in-process)
+
+    Returns:
+        int: Number of QR codes written
+    """
+    workers = workers or os.cpu_count() or 1
+    professionals = list(professionals)
+
+    if workers > 1 and len(professionals) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(professionals))) as pool:
+            rendered = list(pool.map(_render_qr_job, professionals,
+                                     chunksize=max(1, len(professionals) // (workers * 4))))
+    else:
+        rendered = [_render_qr_job(pro) for pro in professionals]
+
+    action = "Regenerated" if force else "Generated"
+    for pro, (profile_url, qr_bytes) in zip(professionals, rendered):
+        if len(pro) > 2:
+            approval_status = pro[2]
+            status_label = "[APPROVED]" if approval_status == "approved" else "[PENDING]" if approval_status == "pending" else "[OTHER]"
+            print(f"{status_label} {approval_status.upper()}: ", end="")
+        print(f"  [SUCCESS] {action} QR for #{pro[0]} {pro[1]}")
+        print(f"     URL: {profile_url}")
+        print(f"     Size: {len(qr_bytes)} bytes")
+
+    db.executemany('''
+        UPDATE professionals
+        SET qr_business_card = ?
+        WHERE id = ?
+    ''', [(qr_bytes, pro[0]) for pro, (_, qr_bytes) in zip(professionals, rendered)])
+    db.commit()
+
+    return len(rendered)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate QR codes for professional business cards")
     parser.add_argument('--id', type=int, help='Generate for specific professional ID')
     parser.add_argument('--regenerate', action='store_true', help='Regenerate all QR codes (overwrites existing)')
+    parser.add_argument('--workers', type=int, help='QR render processes (default: CPU count)')
     args = parser.parse_args()
 
     db = sqlite3.connect(DB_PATH)
@@ -134,10 +176,7 @@ def main():
 
         print(f"Found {len(professionals)} professionals\n")
 
-        count = 0
-        for pro_id, business_name in professionals:
-            if generate_qr_for_professional(db, pro_id, business_name, force=True):
-                count += 1
+        count = generate_qr_batch(db, professionals, force=True, workers=args.workers)
 
         print(f"\n[SUCCESS] Regenerated {count} QR codes!")
 
@@ -152,13 +191,7 @@ def main():
 
         print(f"Found {len(professionals)} professionals missing QR codes\n")
 
-        count = 0
-        for pro_id, business_name, approval_status in professionals:
-            status_label = "[APPROVED]" if approval_status == "approved" else "[PENDING]" if approval_status == "pending" else "[OTHER]"
-            print(f"{status_label} {approval_status.upper()}: ", end="")
-
-            if generate_qr_for_professional(db, pro_id, business_name):
-                count += 1
+        count = generate_qr_batch(db, professionals, workers=args.workers)
 
         print(f"\n[SUCCESS] Generated {count} QR codes!")
 
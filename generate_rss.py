@@ -18,6 +18,7 @@ Usage:
 import sqlite3
 import os
 import json
+import hashlib
 import argparse
 import requests
 from pathlib import Path
@@ -26,6 +27,8 @@ from xml.etree.ElementTree import Element, SubElement, tostring
 from xml.dom import minidom
 import html
 
+from syndication import rfc822, write_document
+
 
 # Configuration
 DB_PATH = "soulfra.db"
@@ -166,6 +169,45 @@ Respond ONLY with valid JSON:
         }
 
 
+def cached_enhancement(rec, user_info=None):
+    """
+    enhance_for_blog() result, memoised per recording + transcript hash
+
+    Rebuilding a feed only calls Ollama for new or re-transcribed recordings.
+    Fallback results (Ollama down) are not stored so they get retried.
+    """
+    transcript = rec['transcription']
+    digest = hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rss_enhancements (
+            recording_id INTEGER PRIMARY KEY,
+            transcript_hash TEXT NOT NULL,
+            enhanced_json TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = conn.execute(
+        "SELECT enhanced_json FROM rss_enhancements WHERE recording_id = ? AND transcript_hash = ?",
+        (rec['id'], digest)
+    ).fetchone()
+    if row:
+        conn.close()
+        print("  ♻️  Reusing cached enhancement")
+        return json.loads(row[0])
+
+    enhanced = enhance_for_blog(transcript, user_info)
+    if not enhanced.get('reasoning', '').startswith('Fallback'):
+        conn.execute(
+            "INSERT OR REPLACE INTO rss_enhancements (recording_id, transcript_hash, enhanced_json) VALUES (?, ?, ?)",
+            (rec['id'], digest, json.dumps(enhanced))
+        )
+        conn.commit()
+    conn.close()
+    return enhanced
+
+
 def generate_rss_feed(user_id=None, username=None, use_ollama=True):
     """Generate RSS 2.0 feed for user's blog"""
 
@@ -212,7 +254,8 @@ def generate_rss_feed(user_id=None, username=None, use_ollama=True):
         atom_link = "https://cringeproof.com/feed.xml"
 
     SubElement(channel, 'language').text = "en-us"
-    SubElement(channel, 'lastBuildDate').text = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
+    # Newest recording, not wall clock - unchanged input gives a byte-identical feed
+    SubElement(channel, 'lastBuildDate').text = rfc822(recordings[0]['created_at'])
     SubElement(channel, 'generator').text = "Soulfra Voice-to-RSS Generator"
 
     # Atom self-link
@@ -228,7 +271,7 @@ def generate_rss_feed(user_id=None, username=None, use_ollama=True):
 
         # Enhance transcript with Ollama (if enabled)
         if use_ollama:
-            enhanced = enhance_for_blog(rec['transcription'], user)
+            enhanced = cached_enhancement(rec, user)
         else:
             # Simple fallback
             title = rec.get('filename', f"Recording {rec['id']}").replace('.webm', '').replace('_', ' ').title()
@@ -305,10 +348,10 @@ def export_rss(xml_content, username):
         user_feed_dir.mkdir(exist_ok=True)
         rss_path = user_feed_dir / f"{username}.xml"
 
-    with open(rss_path, 'w', encoding='utf-8') as f:
-        f.write(xml_content)
-
-    print(f"\n📄 RSS feed exported: {rss_path}")
+    if write_document(rss_path, [xml_content]):
+        print(f"\n📄 RSS feed exported: {rss_path}")
+    else:
+        print(f"\n📄 RSS feed unchanged: {rss_path}")
 
     return rss_path
 
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Generation Orchestrator - Concurrent Ollama generation with prefix reuse
+
+Brand AI comments (ollama_auto_commenter), panel debates
+(ai_debate_generator), bot comments (bot_comment_generator) and workforce
+content (auto_content_generator) used to call Ollama one persona at a time,
+each call re-sending (and the model re-evaluating) the whole post as a
+fresh prompt. They now run as items on one engine:
+
+- An item is one piece of shared context (the post) plus one job per
+  persona. The shared prefix is evaluated once ("priming"): Ollama returns
+  its `context` tokens and keeps the model loaded (`keep_alive`), and every
+  persona job continues from that context with only its own system prompt
+  and instructions, so the post is never re-evaluated per persona
+- All jobs of an item are submitted together to a bounded worker pool
+  (set OLLAMA_NUM_PARALLEL on the server to the same value)
+- on_result() runs in the calling thread as each job completes, so callers
+  write results to the DB as they stream in (SQLite stays single-threaded)
+- Items are pulled lazily from any iterable, at most `concurrency` in
+  flight, so a backlog of thousands of posts streams through in bounded
+  memory
+- Per-item wall time and tokens/sec come from Ollama's eval counters
+
+If the server returns no context (older Ollama, or priming failed) jobs
+fall back to sending prefix + prompt in full.
+
+Usage:
+    from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
+
+    engine = GenerationOrchestrator(model='llama3.2:3b', concurrency=4)
+    item = GenerationItem(key=42, prefix=post_text, jobs=[
+        GenerationJob(key='ocean-dreams', system=persona_prompt, prompt='Comment:'),
+        ...
+    ])
+    engine.run([item], on_result=save_comment)
+    print(engine.report())
+
+    python3 generation_orchestrator.py "Some post text" --personas 3
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+OLLAMA_URL = 'http://localhost:11434'
+DEFAULT_MODEL = 'llama3.2:3b'
+DEFAULT_CONCURRENCY = 4
+DEFAULT_KEEP_ALIVE = '10m'      # Keep the model (and its KV cache) warm between items
+DEFAULT_TIMEOUT = 120
+
+
+@dataclass
+class GenerationJob:
+    """One persona's generation on top of an item's shared prefix"""
+    key: Hashable
+    prompt: str
+    system: Optional[str] = None
+    options: Dict = field(default_factory=dict)
+
+
+@dataclass
+class GenerationItem:
+    """Shared context (evaluated once) and the jobs that continue from it"""
+    key: Hashable
+    prefix: str
+    jobs: List[GenerationJob]
+
+
+@dataclass
+class GenerationResult:
+    item_key: Hashable
+    job_key: Hashable
+    text: str = ''
+    error: Optional[str] = None
+    eval_count: int = 0             # Generated tokens
+    prompt_eval_count: int = 0      # Prompt tokens the model had to evaluate
+    eval_seconds: float = 0.0
+    seconds: float = 0.0            # Wall time of the request
+    context: Optional[List[int]] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.eval_count / self.eval_seconds if self.eval_seconds else 0.0
+
+
+def ollama_base_url(url: str) -> str:
+    """Server root from either a base URL or a full /api/generate or /api/chat URL"""
+    url = url.rstrip('/')
+    for suffix in ('/api/generate', '/api/chat'):
+        if url.endswith(suffix):
+            return url[:-len(suffix)]
+    return url
+
+
+# ==============================================================================
+# ORCHESTRATOR
+# ==============================================================================
+
+class GenerationOrchestrator:
+    """Runs generation items on a bounded pool against one Ollama server"""
+
+    def __init__(self, ollama_url: str = OLLAMA_URL, model: str = DEFAULT_MODEL,
+                 concurrency: int = DEFAULT_CONCURRENCY, keep_alive: str = DEFAULT_KEEP_ALIVE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.base_url = ollama_base_url(ollama_url)
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.items: Dict[Hashable, Dict] = {}
+        self.stats = {'items': 0, 'jobs': 0, 'errors': 0, 'primed': 0,
+                      'tokens': 0, 'prompt_tokens': 0, 'eval_seconds': 0.0, 'seconds': 0.0}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------------------------------
+    # Single requests
+    # --------------------------------------------------------------------------
+
+    def generate(self, prompt: str, system: Optional[str] = None, context: Optional[List[int]] = None,
+                 options: Optional[Dict] = None, item_key: Hashable = None,
+                 job_key: Hashable = None) -> GenerationResult:
+        """One /api/generate call; errors are returned, not raised"""
+        payload = {'model': self.model, 'prompt': prompt, 'stream': False, 'keep_alive': self.keep_alive}
+        if system:
+            payload['system'] = system
+        if context:
+            payload['context'] = context
+        if options:
+            payload['options'] = options
+
+        result = GenerationResult(item_key=item_key, job_key=job_key)
+        started = time.perf_counter()
+        try:
+            response = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=self.timeout)
+            if response.ok:
+                data = response.json()
+                result.text = data.get('response', '').strip()
+                result.eval_count = data.get('eval_count', 0)
+                result.prompt_eval_count = data.get('prompt_eval_count', 0)
+                result.eval_seconds = data.get('eval_duration', 0) / 1e9
+                result.context = data.get('context')
+            else:
+                result.error = f'Ollama error: HTTP {response.status_code}'
+        except (requests.RequestException, ValueError) as e:
+            result.error = str(e)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def prime(self, prefix: str) -> Optional[List[int]]:
+        """Evaluate a shared prefix once; returns its context tokens (None if unavailable)"""
+        result = self.generate(prefix, options={'num_predict': 0})
+        if result.ok and result.context:
+            self._count(primed=1, prompt_tokens=result.prompt_eval_count)
+            return result.context
+        return None
+
+    def _run_job(self, item: GenerationItem, job: GenerationJob,
+                 context: Optional[List[int]]) -> GenerationResult:
+        prompt = job.prompt if context else f"{item.prefix}\n\n{job.prompt}"
+        return self.generate(prompt, system=job.system, context=context, options=job.options,
+                             item_key=item.key, job_key=job.key)
+
+    # --------------------------------------------------------------------------
+    # Batches
+    # --------------------------------------------------------------------------
+
+    def run(self, items: Iterable[GenerationItem],
+            on_result: Optional[Callable[[GenerationResult], None]] = None,
+            on_item: Optional[Callable[[GenerationItem, List[GenerationResult]], None]] = None
+            ) -> List[GenerationResult]:
+        """
+        Generate every job of every item
+
+        Args:
+            items: GenerationItems (consumed lazily)
+            on_result: Called in this thread as each job finishes
+            on_item: Called in this thread when all of an item's jobs are done
+
+        Returns:
+            All results, in completion order
+        """
+        items = iter(items)
+        results = []
+        pending = {}        # future -> ('prime' | 'job', item)
+        open_items = {}     # item key -> {'item', 'left', 'results', 'started'}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            def admit():
+                while len(open_items) < self.concurrency:
+                    item = next(items, None)
+                    if item is None:
+                        return
+                    if not item.jobs:
+                        continue
+                    open_items[item.key] = {'item': item, 'left': len(item.jobs),
+                                            'results': [], 'started': time.perf_counter()}
+                    pending[pool.submit(self.prime, item.prefix)] = ('prime', item)
+
+            admit()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, item = pending.pop(future)
+
+                    if kind == 'prime':
+                        context = future.result()
+                        for job in item.jobs:
+                            pending[pool.submit(self._run_job, item, job, context)] = ('job', item)
+                        continue
+
+                    result = future.result()
+                    results.append(result)
+                    self._record(result)
+                    if on_result:
+                        on_result(result)
+
+                    state = open_items[item.key]
+                    state['results'].append(result)
+                    state['left'] -= 1
+                    if not state['left']:
+                        del open_items[item.key]
+                        self._finish_item(state)
+                        if on_item:
+                            on_item(item, state['results'])
+                admit()
+
+        self._count(seconds=time.perf_counter() - started)
+        return results
+
+    def _record(self, result: GenerationResult):
+        self._count(jobs=1, errors=0 if result.ok else 1, tokens=result.eval_count,
+                    prompt_tokens=result.prompt_eval_count, eval_seconds=result.eval_seconds)
+
+    def _finish_item(self, state: Dict):
+        tokens = sum(r.eval_count for r in state['results'])
+        eval_seconds = sum(r.eval_seconds for r in state['results'])
+        self.items[state['item'].key] = {
+            'jobs': len(state['results']),
+            'errors': sum(1 for r in state['results'] if not r.ok),
+            'seconds': round(time.perf_counter() - state['started'], 3),
+            'tokens': tokens,
+            'tokens_per_sec': round(tokens / eval_seconds, 1) if eval_seconds else 0.0,
+        }
+        self._count(items=1)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, value in deltas.items():
+                self.stats[key] += value
+
+    def report(self) -> str:
+        stats = self.stats
+        rate = stats['tokens'] / stats['eval_seconds'] if stats['eval_seconds'] else 0.0
+        per_item = stats['seconds'] / stats['items'] if stats['items'] else 0.0
+        return (f"📊 {stats['items']} items / {stats['jobs']} generations in {stats['seconds']:.2f}s "
+                f"({per_item:.2f}s per item), {stats['tokens']} tokens at {rate:.1f} tokens/sec, "
+                f"{stats['primed']} shared prefixes, {stats['errors']} errors")
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Concurrent Ollama generation with prefix reuse')
+    parser.add_argument('text', help='Shared context (e.g. a post)')
+    parser.add_argument('--personas', type=int, default=3, help='Number of persona jobs')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--url', default=OLLAMA_URL)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    engine = GenerationOrchestrator(args.url, model=args.model, concurrency=args.concurrency)
+    jobs = [GenerationJob(key=i, system=f'You are commenter #{i + 1}. Be brief and specific.',
+                          prompt='Write a one-sentence comment on the post above:')
+            for i in range(args.personas)]
+
+    def show(result):
+        print(f"{'✅' if result.ok else '⚠️ '} #{result.job_key}: {result.text or result.error}")
+
+    engine.run([GenerationItem(key='cli', prefix=f'Post:\n{args.text}', jobs=jobs)], on_result=show)
+    print(engine.items.get('cli'))
+    print(engine.report())
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Git Publisher - Batched Commits for GitHub Pages Repos
+
+Every publisher used to run `git add` / `git commit` / `git push` per post
+or per run. Concurrent publishes fought over .git/index.lock and a burst of
+posts cost one push each.
+
+PublishQueue coalesces everything submitted during a publish window into
+ONE commit per repo, built with git plumbing:
+
+    hash-object -w --stdin-paths     blobs for changed files
+    read-tree + update-index         on a private temp index (no index.lock)
+    write-tree / commit-tree         new commit on top of the branch head
+    update-ref <new> <old>           compare-and-swap, retried on a race
+
+The working tree is never checked out or modified. Pushes run on a
+background thread with retry/backoff; several windows' commits go out in
+one push.
+
+Usage:
+    from git_publisher import get_queue
+
+    queue = get_queue(repo_path)
+    ticket = queue.submit(['posts/hello.md', 'index.html'], 'Publish: Hello')
+    result = ticket.result() # {'commit': sha, 'files': 2, 'coalesced': 3, 'push': 4}
+    queue.wait_push(result['push'])          # Raises GitError if that push failed
+    queue.publish(paths, message, flush=True)  # Commit now, don't wait out the window
+    queue.close()            # Flush + wait for push (scripts)
+
+    python3 git_publisher.py --benchmark     # Against a local bare repo
+"""
+
+import atexit
+import os
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+
+# ==============================================================================
+# CONFIG
+# ==============================================================================
+
+PUBLISH_WINDOW_SECONDS = float(os.environ.get('PUBLISH_WINDOW_SECONDS', '2.0'))
+PUSH_RETRIES = 5
+PUSH_BACKOFF_SECONDS = 2.0
+PUSH_FAILURES_KEPT = 1000       # Failed push numbers remembered for wait_push()
+DEFAULT_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'Soulfra Publisher',
+    'GIT_AUTHOR_EMAIL': 'publisher@soulfra.com',
+    'GIT_COMMITTER_NAME': 'Soulfra Publisher',
+    'GIT_COMMITTER_EMAIL': 'publisher@soulfra.com',
+}
+NULL_SHA = '0' * 40
+
+
+class GitError(Exception):
+    """A git plumbing command failed"""
+
+
+# ==============================================================================
+# PLUMBING
+# ==============================================================================
+
+class GitRepo:
+    """Thin wrapper over the plumbing commands the queue needs"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.env = dict(os.environ)
+        if not self.run('config', 'user.email', check=False).strip():
+            for key, value in DEFAULT_IDENTITY.items():
+                self.env.setdefault(key, value)
+
+    def run(self, *args, input: Optional[str] = None, env: Optional[Dict] = None, check: bool = True) -> str:
+        result = subprocess.run(
+            ['git', *args], cwd=self.path, input=input, capture_output=True, text=True,
+            env={**self.env, **(env or {})}
+        )
+        if check and result.returncode != 0:
+            raise GitError(f"git {' '.join(args)}: {result.stderr.strip()}")
+        return result.stdout
+
+    def head(self, branch: str) -> Optional[str]:
+        sha = self.run('rev-parse', '--verify', '-q', f'refs/heads/{branch}', check=False).strip()
+        return sha or None
+
+    def is_bare(self) -> bool:
+        return self.run('rev-parse', '--is-bare-repository').strip() == 'true'
+
+    def list_files(self, prefix: str) -> List[str]:
+        """Tracked + untracked-but-not-ignored files under prefix (what `git add prefix` stages)"""
+        out = self.run('ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', prefix)
+        return sorted({name for name in out.split('\0') if name})
+
+    def hash_files(self, paths: List[str]) -> List[str]:
+        """Write blobs for worktree files in one process"""
+        if not paths:
+            return []
+        out = self.run('hash-object', '-w', '--stdin-paths', input='\n'.join(paths) + '\n')
+        return out.split()
+
+    def commit_files(self, branch: str, updates: Dict[str, Optional[str]], message: str) -> Optional[str]:
+        """
+        Commit {path: blob sha or None (delete)} on top of branch
+
+        Returns the new commit sha, or None if the tree didn't change.
+        Raises GitError if another writer moved the branch meanwhile.
+        """
+        parent = self.head(branch)
+        fd, index_file = tempfile.mkstemp(prefix='publish-index-')
+        os.close(fd)
+        os.unlink(index_file)          # git wants to create it
+        env = {'GIT_INDEX_FILE': index_file}
+        try:
+            if parent:
+                self.run('read-tree', parent, env=env)
+            lines = [
+                f'100644 blob {sha}\t{path}' if sha else f'0 {NULL_SHA}\t{path}'
+                for path, sha in updates.items()
+            ]
+            self.run('update-index', '--index-info', input='\n'.join(lines) + '\n', env=env)
+            tree = self.run('write-tree', env=env).strip()
+        finally:
+            if os.path.exists(index_file):
+                os.unlink(index_file)
+
+        if parent and self.run('rev-parse', f'{parent}^{{tree}}').strip() == tree:
+            return None
+
+        args = ['commit-tree', tree, '-m', message]
+        if parent:
+            args += ['-p', parent]
+        commit = self.run(*args).strip()
+        self.run('update-ref', '-m', 'publish', f'refs/heads/{branch}', commit, parent or NULL_SHA)
+        return commit
+
+    def sync_index(self, updates: Dict[str, Optional[str]]):
+        """Point the real index at the committed blobs so `git status` stays clean"""
+        lines = [
+            f'100644 blob {sha}\t{path}' if sha else f'0 {NULL_SHA}\t{path}'
+            for path, sha in updates.items()
+        ]
+        self.run('update-index', '--index-info', input='\n'.join(lines) + '\n', check=False)
+
+
+# ==============================================================================
+# PUBLISH QUEUE
+# ==============================================================================
+
+class PublishQueue:
+    """
+    Coalesce submissions into one commit per window and push in the background
+
+    submit() returns a Future resolved with the window's commit. Files are
+    read when the window closes, so five updates to index.html in one
+    window commit the latest version once.
+    """
+
+    def __init__(self, repo_path: Union[str, Path], branch: str = 'main', remote: Optional[str] = 'origin',
+                 window: float = PUBLISH_WINDOW_SECONDS, push: bool = True):
+        self.repo = GitRepo(repo_path)
+        self.branch = branch
+        self.remote = remote
+        self.window = window
+        self.push_enabled = push and bool(remote)
+
+        self._lock = threading.Condition()
+        self._pending: Dict[str, None] = {}         # Ordered set of worktree paths/dirs
+        self._messages: List[str] = []
+        self._tickets: List[Future] = []
+        self._submitted_at: List[float] = []
+        self._first_at: Optional[float] = None
+        self._flush_now = False
+        self._closed = False
+
+        self._push_lock = threading.Condition()
+        self._push_wanted = 0
+        self._pushed = 0
+        self._push_failures: Dict[int, GitError] = {}   # push number -> error, until wait_push() reads it
+
+        self.stats_counters = {'submissions': 0, 'commits': 0, 'empty_windows': 0,
+                               'files': 0, 'pushes': 0, 'push_failures': 0}
+        self.latencies: List[float] = []
+
+        self._committer = threading.Thread(target=self._commit_loop, daemon=True)
+        self._committer.start()
+        self._pusher = threading.Thread(target=self._push_loop, daemon=True) if self.push_enabled else None
+        if self._pusher:
+            self._pusher.start()
+
+    # -- submit ---------------------------------------------------------------
+
+    def submit(self, paths: Iterable[Union[str, Path]], message: str, flush: bool = False) -> Future:
+        """
+        Queue worktree files or directories for the next commit
+
+        Paths are relative to the repo (or absolute inside it). A directory
+        stages like `git add dir/`, including deletions. flush=True closes
+        the current window now (with whatever else is pending) instead of
+        waiting it out.
+        """
+        ticket = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('PublishQueue is closed')
+            for path in paths:
+                self._pending[self._relative(path)] = None
+            self._messages.append(message)
+            self._tickets.append(ticket)
+            self._submitted_at.append(time.monotonic())
+            if self._first_at is None:
+                self._first_at = time.monotonic()
+            if flush:
+                self._flush_now = True
+            self.stats_counters['submissions'] += 1
+            self._lock.notify_all()
+        return ticket
+
+    def publish(self, paths: Iterable[Union[str, Path]], message: str, timeout: Optional[float] = None,
+                flush: bool = False) -> Dict:
+        """submit() and wait for the window's commit"""
+        return self.submit(paths, message, flush=flush).result(timeout)
+
+    def _relative(self, path: Union[str, Path]) -> str:
+        path = Path(path)
+        if path.is_absolute():
+            path = path.resolve().relative_to(self.repo.path.resolve())
+        return path.as_posix().rstrip('/') or '.'
+
+    # -- commit ---------------------------------------------------------------
+
+    def _commit_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._lock.wait()
+                if not self._pending and self._closed:
+                    return
+                # Hold the window open (close() / flush() cut it short)
+                while not self._closed and not self._flush_now:
+                    remaining = self._first_at + self.window - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._lock.wait(remaining)
+                batch = (list(self._pending), self._messages, self._tickets, self._submitted_at)
+                self._pending, self._messages, self._tickets, self._submitted_at = {}, [], [], []
+                self._first_at = None
+                self._flush_now = False
+
+            self._commit_batch(*batch)
+
+    def _commit_batch(self, paths: List[str], messages: List[str], tickets: List[Future], submitted_at: List[float]):
+        try:
+            commit, files = None, 0
+            for attempt in range(3):
+                updates = self._collect(paths)
+                try:
+                    commit = self.repo.commit_files(self.branch, updates, _window_message(messages)) if updates else None
+                    files = len(updates)
+                    break
+                except GitError as e:
+                    # update-ref lost a race with another process - rebuild on the new head
+                    if attempt == 2 or 'update-ref' not in str(e):
+                        raise
+            if commit and not self.repo.is_bare():
+                self.repo.sync_index(updates)
+        except Exception as e:
+            for ticket in tickets:
+                ticket.set_exception(e)
+            print(f"⚠️  Publish window failed: {e}")
+            return
+
+        now = time.monotonic()
+        self.latencies.extend(now - t for t in submitted_at)
+        push = None
+        if commit:
+            self.stats_counters['commits'] += 1
+            self.stats_counters['files'] += files
+            push = self._request_push()
+        else:
+            self.stats_counters['empty_windows'] += 1
+
+        result = {'commit': commit, 'files': files, 'coalesced': len(tickets), 'push': push}
+        for ticket in tickets:
+            ticket.set_result(result)
+
+    def _collect(self, paths: List[str]) -> Dict[str, Optional[str]]:
+        """{repo path: blob sha, or None for files deleted from the worktree}"""
+        head = self.repo.head(self.branch)
+        files: Dict[str, None] = {}
+        deleted: Dict[str, None] = {}
+        for path in paths:
+            full = self.repo.path / path
+            if full.is_dir() or path == '.':
+                for name in self.repo.list_files(path):
+                    (files if (self.repo.path / name).is_file() else deleted)[name] = None
+                if head:
+                    tracked = self.repo.run('ls-tree', '-r', '--name-only', head, '--', path).split('\n')
+                    for name in filter(None, tracked):
+                        if not (self.repo.path / name).exists():
+                            deleted[name] = None
+            elif full.is_file():
+                files[path] = None
+            else:
+                deleted[path] = None
+
+        names = list(files)
+        updates: Dict[str, Optional[str]] = dict(zip(names, self.repo.hash_files(names)))
+        updates.update({name: None for name in deleted if name not in updates})
+        return updates
+
+    # -- push -----------------------------------------------------------------
+
+    def _request_push(self) -> Optional[int]:
+        """Number of the push that will carry the commit just made (None when not pushing)"""
+        if not self.push_enabled:
+            return None
+        with self._push_lock:
+            self._push_wanted += 1
+            self._push_lock.notify_all()
+            return self._push_wanted
+
+    def _push_loop(self):
+        while True:
+            with self._push_lock:
+                while self._pushed >= self._push_wanted and not self._closed:
+                    self._push_lock.wait()
+                if self._pushed >= self._push_wanted and self._closed:
+                    return
+                first, target = self._pushed + 1, self._push_wanted   # Everything committed so far goes in one push
+
+            failure = None
+            for attempt in range(PUSH_RETRIES):
+                try:
+                    self.repo.run('push', self.remote, f'refs/heads/{self.branch}:refs/heads/{self.branch}')
+                    self.stats_counters['pushes'] += 1
+                    break
+                except GitError as e:
+                    if attempt == PUSH_RETRIES - 1:
+                        failure = e
+                        self.stats_counters['push_failures'] += 1
+                        print(f"⚠️  Push to {self.remote} failed after {PUSH_RETRIES} attempts: {e}")
+                    else:
+                        time.sleep(PUSH_BACKOFF_SECONDS * (2 ** attempt))
+
+            with self._push_lock:
+                if failure:
+                    self._push_failures.update(dict.fromkeys(range(first, target + 1), failure))
+                    for push in [p for p in self._push_failures if p <= target - PUSH_FAILURES_KEPT]:
+                        del self._push_failures[push]
+                self._pushed = target
+                self._push_lock.notify_all()
+
+    # -- lifecycle ------------------------------------------------------------
+
+    def flush(self, timeout: Optional[float] = None):
+        """Commit whatever is pending now instead of at the end of the window"""
+        with self._lock:
+            tickets = list(self._tickets)
+            self._flush_now = True
+            self._lock.notify_all()
+        for ticket in tickets:
+            ticket.result(timeout)
+
+    def wait_pushed(self, timeout: Optional[float] = None) -> bool:
+        if not self._pusher:
+            return True
+        deadline = time.monotonic() + (timeout if timeout is not None else 1e9)
+        with self._push_lock:
+            while self._pushed < self._push_wanted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._push_lock.wait(remaining)
+        return True
+
+    def wait_push(self, push: Optional[int], timeout: Optional[float] = None):
+        """
+        Wait for the push numbered `push` (a commit result's 'push')
+
+        Raises the push's GitError if it failed after every retry, and
+        TimeoutError if it hasn't run within timeout.
+        """
+        if push is None:
+            return
+        deadline = time.monotonic() + (timeout if timeout is not None else 1e9)
+        with self._push_lock:
+            while self._pushed < push:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f'Push {push} to {self.remote} still pending')
+                self._push_lock.wait(remaining)
+            failure = self._push_failures.pop(push, None)
+        if failure:
+            raise failure
+
+    def close(self, timeout: Optional[float] = 120):
+        """Flush, wait for the last push and stop the threads"""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        self._committer.join(timeout)
+        if self._pusher:
+            with self._push_lock:
+                self._push_lock.notify_all()
+            self._pusher.join(timeout)
+
+    def stats(self) -> Dict:
+        latencies = sorted(self.latencies)
+        counters = dict(self.stats_counters)
+        counters['commits_avoided'] = max(0, counters['submissions'] - counters['commits'])
+        if latencies:
+            counters['latency_p50_ms'] = round(statistics.median(latencies) * 1000, 1)
+            counters['latency_p95_ms'] = round(latencies[int((len(latencies) - 1) * 0.95)] * 1000, 1)
+        return counters
+
+
+def _window_message(messages: List[str]) -> str:
+    unique = list(dict.fromkeys(messages))
+    if len(unique) == 1:
+        return unique[0]
+    return f"Publish {len(unique)} updates\n\n" + '\n'.join(f"- {m}" for m in unique)
+
+
+# ==============================================================================
+# SHARED QUEUES
+# ==============================================================================
+
+_queues: Dict[str, PublishQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_queue(repo_path: Union[str, Path], branch: str = 'main', remote: Optional[str] = 'origin',
+              window: Optional[float] = None) -> PublishQueue:
+    """
+    One queue per repo/branch per process - every publisher shares its window
+
+    window only applies when the queue is created; asking for a different
+    window than the live queue's raises ValueError. To skip the window for
+    one publish, use submit(..., flush=True).
+    """
+    key = f"{Path(repo_path).resolve()}@{branch}"
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None or queue._closed:
+            queue = PublishQueue(repo_path, branch=branch, remote=remote,
+                                 window=PUBLISH_WINDOW_SECONDS if window is None else window)
+            _queues[key] = queue
+        elif window is not None and window != queue.window:
+            raise ValueError(f'Publish queue for {key} already runs a {queue.window}s window, not {window}s')
+        return queue
+
+
+@atexit.register
+def close_all_queues():
+    """Don't lose a pending window or push when a script exits"""
+    with _queues_lock:
+        queues = list(_queues.values())
+        _queues.clear()
+    for queue in queues:
+        queue.close()
+
+
+# ==============================================================================
+# BENCHMARK
+# ==============================================================================
+
+def benchmark(posts: int = 100, window: float = 0.25, writers: int = 8) -> Dict:
+    """
+    Publish `posts` posts from `writers` threads into a clone of a local bare
+    repo, per-post add/commit/push vs. PublishQueue
+    """
+    root = Path(tempfile.mkdtemp(prefix='publish-bench-'))
+    results = {}
+    try:
+        for mode in ('per_post', 'queue'):
+            bare, clone = root / f'{mode}.git', root / mode
+            subprocess.run(['git', 'init', '-q', '--bare', '-b', 'main', str(bare)], check=True)
+            subprocess.run(['git', 'clone', '-q', str(bare), str(clone)], check=True, capture_output=True)
+            subprocess.run(['git', 'checkout', '-q', '-b', 'main'], cwd=clone, check=True, capture_output=True)
+            env = {**os.environ, **DEFAULT_IDENTITY}
+            (clone / 'posts').mkdir()
+
+            queue = PublishQueue(clone, window=window) if mode == 'queue' else None
+            git_lock = threading.Lock()
+            latencies, failures = [], 0
+
+            def publish(i):
+                nonlocal failures
+                (clone / 'posts' / f'{i}.md').write_text(f'# Post {i}\n')
+                (clone / 'index.html').write_text(f'<h1>{i} posts</h1>')
+                start = time.monotonic()
+                if queue:
+                    queue.publish(['posts', 'index.html'], f'Publish: post {i}')
+                else:
+                    # Serialised the way a careful caller must to avoid index.lock errors
+                    with git_lock:
+                        for cmd in (['add', '.'], ['commit', '-q', '-m', f'Publish: post {i}'], ['push', '-q', 'origin', 'main']):
+                            if subprocess.run(['git', *cmd], cwd=clone, env=env, capture_output=True).returncode:
+                                failures += 1
+                latencies.append(time.monotonic() - start)
+
+            started = time.monotonic()
+            threads = [threading.Thread(target=lambda w=w: [publish(i) for i in range(w, posts, writers)])
+                       for w in range(writers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            if queue:
+                queue.close()
+            elapsed = time.monotonic() - started
+
+            commits = int(subprocess.run(['git', 'rev-list', '--count', 'main'], cwd=bare,
+                                         capture_output=True, text=True).stdout.strip() or 0)
+            latencies.sort()
+            results[mode] = {
+                'seconds': round(elapsed, 2),
+                'commits': commits,
+                'commits_avoided': posts - commits,
+                'latency_p50_ms': round(statistics.median(latencies) * 1000, 1),
+                'failures': failures,
+                **({'pushes': queue.stats()['pushes']} if queue else {'pushes': posts}),
+            }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return results
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Batched git publishing')
+    parser.add_argument('--benchmark', action='store_true', help='Compare per-post commits vs PublishQueue')
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--window', type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(benchmark(args.posts, args.window), indent=2))
+    else:
+        parser.print_help()
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+GitHub Cache - Local star/tier lookups backed by conditional GitHub requests
+
+Star gating used to make one or two synchronous GitHub API calls per gated
+request, so page latency followed GitHub round-trips and the 60/5000 per hour
+rate limit. This module keeps every GitHub response we depend on in SQLite
+and serves it locally:
+
+- Fresh entries (younger than their TTL)  -> returned with no network call
+- Stale entries (within STALE_SECONDS)    -> returned immediately, queued for
+                                             background revalidation
+- Missing/expired entries                 -> fetched synchronously
+
+Star denials (404) are the exception: they stay fresh for only
+DENIAL_TTL_SECONDS and are never served stale, so a user who was gated,
+stars the repo and retries gets in on the retry.
+
+Revalidation is a conditional GET (If-None-Match / If-Modified-Since); an
+unchanged resource answers 304, which GitHub doesn't count against the
+authenticated rate limit. All requests share one keep-alive requests.Session.
+The refresher reads X-RateLimit-Remaining/Reset and stops refreshing while
+fewer than RATE_LIMIT_RESERVE calls are left, keeping that budget for
+synchronous misses.
+
+Cached resources (keyed by API path):
+    /users/<user>/starred/<owner>/<repo>   204 = starred, 404 = not starred
+    /repos/<owner>/<repo>                  stargazers_count
+    /users/<user>                          public_repos, followers
+
+Usage:
+    from github_cache import get_github_cache
+
+    cache = get_github_cache()
+    cache.has_starred('octocat', 'soulfra', 'soulfra')     # True / False / None (unknown)
+    cache.network_stars('octocat')                         # (count, ['soulfra/soulfra', ...])
+
+    python3 github_cache.py --stats
+    python3 github_cache.py --refresh
+
+Point GITHUB_API_URL at a local mock server to test without GitHub.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from database import get_db
+from schema_registry import register_migration
+
+
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
+
+STAR_TTL_SECONDS = 600          # Star state: fresh for 10 minutes
+DENIAL_TTL_SECONDS = 5          # "Not starred": re-checked almost every time, never served stale
+REPO_TTL_SECONDS = 3600         # Repo star counts / profiles change slowly
+PROFILE_TTL_SECONDS = 3600
+STALE_SECONDS = 7 * 24 * 3600   # Serve stale (while revalidating) for up to a week
+REQUEST_TIMEOUT = 5
+RATE_LIMIT_RESERVE = 10         # Calls kept back for synchronous misses
+REFRESH_INTERVAL = 30           # Background refresher wake-up (seconds)
+REFRESH_BATCH = 50
+HOT_SECONDS = 24 * 3600         # Only proactively refresh paths read recently
+
+# Network repos counted for star tiers (github_star_validator, tier_progression_engine)
+NETWORK_REPOS = [
+    {'owner': 'soulfra', 'repo': 'soulfra', 'domain': 'soulfra.com'},
+    {'owner': 'soulfra', 'repo': 'deathtodata', 'domain': 'deathtodata.com'},
+    {'owner': 'soulfra', 'repo': 'calriven', 'domain': 'calriven.com'},
+    {'owner': 'soulfra', 'repo': 'howtocookathome', 'domain': 'howtocookathome.com'},
+    {'owner': 'soulfra', 'repo': 'stpetepros', 'domain': 'stpetepros.com'},
+]
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+GITHUB_CACHE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS github_api_cache (
+        path TEXT PRIMARY KEY,
+        status INTEGER NOT NULL,
+        body TEXT,
+        etag TEXT,
+        last_modified TEXT,
+        ttl INTEGER NOT NULL,
+        fetched_at REAL NOT NULL,
+        fresh_until REAL NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_github_api_cache_fresh ON github_api_cache(fresh_until)',
+]
+register_migration(113, 'GitHub response cache', *GITHUB_CACHE_SCHEMA, module='github_cache')
+
+
+class CachedResponse(NamedTuple):
+    status: Optional[int]       # None when GitHub couldn't be reached and nothing is cached
+    body: Optional[Dict]
+    source: str                 # 'hit', 'stale', 'revalidated', 'fetched' or 'unavailable'
+
+
+UNAVAILABLE = CachedResponse(None, None, 'unavailable')
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+
+class GitHubCache:
+    """SQLite-backed GitHub response cache with conditional revalidation"""
+
+    def __init__(self, api_url: Optional[str] = None, token: Optional[str] = None,
+                 stale_seconds: float = STALE_SECONDS, background: bool = True, clock=time.time):
+        self.api_url = (api_url or GITHUB_API_URL).rstrip('/')
+        self.stale_seconds = stale_seconds
+        self.background = background
+        self.clock = clock
+
+        self.session = requests.Session()
+        self.session.headers['Accept'] = 'application/vnd.github.v3+json'
+        token = token or GITHUB_TOKEN
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()        # stale paths awaiting revalidation
+        self._requested = {}                 # path -> last read (drives proactive refresh)
+        self._rate_remaining = None
+        self._rate_reset = 0.0
+        self._wake = threading.Event()
+        self._thread = None
+        self.stats = {'hit': 0, 'stale': 0, 'revalidated': 0, 'fetched': 0, 'unavailable': 0, 'requests': 0}
+
+        db = get_db()
+        for statement in GITHUB_CACHE_SCHEMA:
+            db.execute(statement)
+        db.commit()
+        db.close()
+
+    # --------------------------------------------------------------------------
+    # Lookups
+    # --------------------------------------------------------------------------
+
+    def get(self, path: str, ttl: int, denial_ttl: Optional[int] = None) -> CachedResponse:
+        """
+        Cached response for an API path, fetching only when missing or too stale
+
+        With denial_ttl, a 404 is cached for denial_ttl only and is revalidated
+        synchronously once expired instead of being served stale.
+        """
+        path = path.lower()
+        now = self.clock()
+        row = self._load(path)
+        with self._lock:
+            self._requested[path] = now
+
+        if row and now < row['fresh_until']:
+            return self._count(self._response(row, 'hit'))
+
+        denied = denial_ttl is not None and row is not None and row['status'] == 404
+        if row and not denied and now - row['fetched_at'] < self.stale_seconds:
+            self._schedule(path)
+            return self._count(self._response(row, 'stale'))
+
+        return self._count(self.revalidate(path, ttl, row, denial_ttl))
+
+    def star_lookup(self, username: str, owner: str, repo: str) -> CachedResponse:
+        return self.get(f'/users/{username}/starred/{owner}/{repo}', STAR_TTL_SECONDS, DENIAL_TTL_SECONDS)
+
+    def has_starred(self, username: str, owner: str, repo: str) -> Optional[bool]:
+        """True/False from GitHub's 204/404, None if unknown (GitHub unreachable, nothing cached)"""
+        response = self.star_lookup(username, owner, repo)
+        return None if response.status is None else response.status == 204
+
+    def repo_star_count(self, owner: str, repo: str) -> int:
+        response = self.get(f'/repos/{owner}/{repo}', REPO_TTL_SECONDS)
+        return (response.body or {}).get('stargazers_count', 0) if response.status == 200 else 0
+
+    def user_profile(self, username: str) -> Dict:
+        response = self.get(f'/users/{username}', PROFILE_TTL_SECONDS)
+        return (response.body or {}) if response.status == 200 else {}
+
+    def network_stars(self, username: str, repos: List[Dict] = NETWORK_REPOS) -> Tuple[int, List[str]]:
+        """Number of network repos the user starred, and which"""
+        starred = [f"{r['owner']}/{r['repo']}" for r in repos
+                   if self.has_starred(username, r['owner'], r['repo'])]
+        return len(starred), starred
+
+    # --------------------------------------------------------------------------
+    # Network
+    # --------------------------------------------------------------------------
+
+    def revalidate(self, path: str, ttl: int, row: Optional[Dict] = None,
+                   denial_ttl: Optional[int] = None) -> CachedResponse:
+        """Conditional GET for path; falls back to the cached row on any failure"""
+        fallback = self._response(row, 'stale') if row else UNAVAILABLE
+        if self._rate_limited(reserve=0):
+            return fallback
+
+        headers = {}
+        if row and row['etag']:
+            headers['If-None-Match'] = row['etag']
+        if row and row['last_modified']:
+            headers['If-Modified-Since'] = row['last_modified']
+
+        try:
+            with self._lock:
+                self.stats['requests'] += 1
+            response = self.session.get(self.api_url + path, headers=headers, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            return fallback
+
+        self._note_rate_limit(response)
+        now = self.clock()
+
+        if response.status_code == 404 and denial_ttl is not None:
+            ttl = denial_ttl
+        if response.status_code == 304 and row:
+            if row['status'] == 404 and denial_ttl is not None:
+                ttl = denial_ttl
+            db = get_db()
+            db.execute('UPDATE github_api_cache SET ttl = ?, fetched_at = ?, fresh_until = ? WHERE path = ?',
+                       (ttl, now, now + ttl, path))
+            db.commit()
+            db.close()
+            return self._response(row, 'revalidated')
+
+        # Rate limited / server errors: keep serving what we have
+        if response.status_code in (403, 429) or response.status_code >= 500:
+            return fallback
+
+        try:
+            body = response.json() if response.content else None
+        except ValueError:
+            body = None
+
+        db = get_db()
+        db.execute('''
+            INSERT INTO github_api_cache (path, status, body, etag, last_modified, ttl, fetched_at, fresh_until)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                status = excluded.status, body = excluded.body, etag = excluded.etag,
+                last_modified = excluded.last_modified, ttl = excluded.ttl,
+                fetched_at = excluded.fetched_at, fresh_until = excluded.fresh_until
+        ''', (path, response.status_code, json.dumps(body) if body is not None else None,
+              response.headers.get('ETag'), response.headers.get('Last-Modified'), ttl, now, now + ttl))
+        db.commit()
+        db.close()
+
+        return CachedResponse(response.status_code, body, 'fetched')
+
+    def _note_rate_limit(self, response):
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        with self._lock:
+            self._rate_remaining = int(remaining)
+            self._rate_reset = float(response.headers.get('X-RateLimit-Reset', 0))
+
+    def _rate_limited(self, reserve: int = RATE_LIMIT_RESERVE) -> bool:
+        with self._lock:
+            if self._rate_remaining is None or time.time() >= self._rate_reset:
+                return False
+            return self._rate_remaining <= reserve
+
+    # --------------------------------------------------------------------------
+    # Background refresh
+    # --------------------------------------------------------------------------
+
+    def refresh_pending(self, limit: int = REFRESH_BATCH) -> int:
+        """
+        Revalidate queued stale paths, then recently read paths past their TTL
+
+        Denials (404) aren't refreshed proactively - they are re-checked on
+        read. Stops early when the rate limit is down to RATE_LIMIT_RESERVE.
+
+        Returns:
+            Number of paths revalidated
+        """
+        now = self.clock()
+        with self._lock:
+            queued = list(self._pending)
+            hot = {path for path, seen in self._requested.items() if now - seen < HOT_SECONDS}
+
+        db = get_db()
+        due = [r[0] for r in db.execute(
+            'SELECT path FROM github_api_cache WHERE fresh_until <= ? AND status != 404 ORDER BY fresh_until LIMIT ?',
+            (now, limit * 4)
+        ) if r[0] in hot]
+        db.close()
+
+        refreshed = 0
+        for path in list(OrderedDict.fromkeys(queued + due))[:limit]:
+            if self._rate_limited():
+                break
+            row = self._load(path)
+            if row is None or row['fresh_until'] > self.clock():
+                self._discard(path)
+                continue
+            self.revalidate(path, row['ttl'], row)
+            self._discard(path)
+            refreshed += 1
+        return refreshed
+
+    def start(self, interval: float = REFRESH_INTERVAL):
+        """Start the background refresher thread (idempotent)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, args=(interval,),
+                                            name='github-cache-refresher', daemon=True)
+            self._thread.start()
+
+    def _run(self, interval: float):
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.refresh_pending()
+            except Exception as e:
+                print(f"⚠️  GitHub cache refresh failed: {e}")
+
+    def _schedule(self, path: str):
+        with self._lock:
+            self._pending[path] = True
+        if self.background:
+            self.start()
+            self._wake.set()
+
+    def _discard(self, path: str):
+        with self._lock:
+            self._pending.pop(path, None)
+
+    # --------------------------------------------------------------------------
+    # Helpers
+    # --------------------------------------------------------------------------
+
+    def _load(self, path: str) -> Optional[Dict]:
+        db = get_db()
+        row = db.execute('SELECT * FROM github_api_cache WHERE path = ?', (path,)).fetchone()
+        db.close()
+        return dict(row) if row else None
+
+    @staticmethod
+    def _response(row: Dict, source: str) -> CachedResponse:
+        return CachedResponse(row['status'], json.loads(row['body']) if row['body'] else None, source)
+
+    def _count(self, response: CachedResponse) -> CachedResponse:
+        with self._lock:
+            self.stats[response.source] += 1
+        return response
+
+    def cache_stats(self) -> Dict:
+        db = get_db()
+        entries = db.execute('SELECT COUNT(*) FROM github_api_cache').fetchone()[0]
+        db.close()
+        with self._lock:
+            return dict(self.stats, entries=entries, pending=len(self._pending),
+                        rate_remaining=self._rate_remaining)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_github_cache() -> GitHubCache:
+    """Process-wide cache sharing one HTTP session and refresher"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GitHubCache()
+        return _cache
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='GitHub response cache')
+    parser.add_argument('--stats', action='store_true', help='Show cache statistics')
+    parser.add_argument('--refresh', action='store_true', help='Revalidate expired entries now')
+    parser.add_argument('--check', type=str, help='Network stars for a GitHub username')
+    args = parser.parse_args()
+
+    cache = GitHubCache(background=False)
+
+    if args.refresh:
+        # Everything expired counts as hot when run by hand
+        db = get_db()
+        for (path,) in db.execute('SELECT path FROM github_api_cache'):
+            cache._requested[path] = time.time()
+        db.close()
+        print(f"✅ Revalidated {cache.refresh_pending(limit=10_000)} entries")
+
+    if args.check:
+        count, starred = cache.network_stars(args.check)
+        print(f"⭐ @{args.check}: {count} network repos starred {starred}")
+
+    if args.stats or not (args.refresh or args.check):
+        for key, value in cache.cache_stats().items():
+            print(f"   {key}: {value}")
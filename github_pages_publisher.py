@@ -27,6 +27,9 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import hashlib
 
+from git_publisher import GitError, get_queue
+
+
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
@@ -34,6 +37,7 @@ import hashlib
 GITHUB_PAGES_REPO = "soulfra/soulfra.github.io"
 LOCAL_REPO_PATH = Path.home() / "soulfra-github-pages"
 GITHUB_PAGES_URL = "https://soulfra.github.io/soulfra"
+PUSH_TIMEOUT_SECONDS = 120  # publish_post waits this long for the background push
 
 # ==============================================================================
 # GIT OPERATIONS
@@ -162,33 +166,15 @@ hash: "{post_hash}"
         # Update feed
         self._update_feed()
 
-        # Git commit and push
+        # Commit via the shared publish queue - posts published within one
+        # window land in a single commit and a single background push, which
+        # is waited on so a failed push is reported
         commit_msg = commit_message or f"Publish: {title}"
 
         try:
-            # Git add
-            subprocess.run(
-                ['git', 'add', '.'],
-                cwd=self.repo_path,
-                check=True
-            )
-
-            # Git commit
-            result = subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
-                cwd=self.repo_path,
-                check=True,
-                capture_output=True
-            )
-
-            commit_sha = result.stdout.decode().split('[')[1].split(']')[0] if '[' in result.stdout.decode() else 'unknown'
-
-            # Git push
-            subprocess.run(
-                ['git', 'push', 'origin', 'main'],
-                cwd=self.repo_path,
-                check=True
-            )
+            queue = get_queue(self.repo_path)
+            published = queue.publish([post_path, self.index_path, self.feed_path], commit_msg)
+            queue.wait_push(published['push'], timeout=PUSH_TIMEOUT_SECONDS)
 
             post_url = f"{GITHUB_PAGES_URL}/posts/{slug}.html"
 
@@ -196,14 +182,14 @@ hash: "{post_hash}"
                 'success': True,
                 'url': post_url,
                 'hash': post_hash,
-                'commit_sha': commit_sha,
+                'commit_sha': (published['commit'] or 'unchanged')[:7],
                 'file_path': str(post_path)
             }
 
-        except subprocess.CalledProcessError as e:
+        except (GitError, TimeoutError) as e:
             return {
                 'success': False,
-                'error': e.stderr.decode() if e.stderr else str(e)
+                'error': str(e)
             }
 
     def _update_index(self):
@@ -43,15 +43,20 @@ else:
 - GET /api/check-star?username=octocat&domain=soulfra.com
 - POST /api/require-star (middleware for comment endpoints)
 
+**Caching:**
+Star state, repo star counts and profiles come from github_cache.py, so a
+gated request is a local SQLite lookup; GitHub is only hit on a cold miss
+or by the background refresher (conditional requests).
+
 **Environment:**
 Uses GITHUB_CLIENT_ID and GITHUB_CLIENT_SECRET from github_faucet.py
 """
 
 import os
-import requests
 from typing import Dict, Optional
 from datetime import datetime
 from database import get_db
+from github_cache import NETWORK_REPOS, get_github_cache
 
 # GitHub API Config
 GITHUB_API_URL = 'https://api.github.com'
@@ -79,17 +84,17 @@ class GitHubStarValidator:
     Validate GitHub repository stars for engagement gating
     """
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self.client_id = GITHUB_CLIENT_ID
         self.client_secret = GITHUB_CLIENT_SECRET
+        self.cache = cache or get_github_cache()
 
 
     # ==========================================================================
     # STAR VALIDATION
     # ==========================================================================
 
-    def check_star(self, github_username: str, repo_owner: str, repo_name: str,
-                   access_token: Optional[str] = None) -> Dict:
+    def check_star(self, github_username: str, repo_owner: str, repo_name: str) -> Dict:
         """
         Check if a GitHub user has starred a repository
 
@@ -97,13 +102,13 @@ class GitHubStarValidator:
             github_username: GitHub username to check
             repo_owner: Repository owner (e.g., 'soulfra')
             repo_name: Repository name (e.g., 'soulfra')
-            access_token: Optional GitHub access token (for auth'd requests)
 
         Returns:
             Dict with:
                 - has_starred (bool): True if user starred repo
                 - starred_at (str): Timestamp when starred (if available)
                 - star_count (int): Total stars on repo
+                - source (str): Cache outcome ('hit', 'stale', 'fetched', ...)
 
         Example:
             >>> validator = GitHubStarValidator()
@@ -111,49 +116,33 @@ class GitHubStarValidator:
             >>> print(result['has_starred'])
             True
         """
-        # Build API URL
-        url = f'{GITHUB_API_URL}/users/{github_username}/starred/{repo_owner}/{repo_name}'
-
-        # Headers
-        headers = {'Accept': 'application/vnd.github.v3+json'}
-
-        if access_token:
-            headers['Authorization'] = f'token {access_token}'
-
-        # Check if user starred repo
-        # GitHub returns 204 if starred, 404 if not
-        response = requests.get(url, headers=headers)
-
-        has_starred = response.status_code == 204
+        # GitHub returns 204 if starred, 404 if not (served from cache when fresh)
+        lookup = self.cache.star_lookup(github_username, repo_owner, repo_name)
+        has_starred = lookup.status == 204
 
-        # Get repo info (star count)
-        repo_url = f'{GITHUB_API_URL}/repos/{repo_owner}/{repo_name}'
-        repo_response = requests.get(repo_url, headers=headers)
+        star_count = self.cache.repo_star_count(repo_owner, repo_name)
 
-        star_count = 0
-        if repo_response.status_code == 200:
-            repo_data = repo_response.json()
-            star_count = repo_data.get('stargazers_count', 0)
-
-        return {
+        result = {
             'has_starred': has_starred,
             'starred_at': datetime.now().isoformat() if has_starred else None,
             'star_count': star_count,
             'repo_owner': repo_owner,
             'repo_name': repo_name,
-            'github_username': github_username
+            'github_username': github_username,
+            'source': lookup.source
         }
+        if lookup.status is None:
+            result['error'] = 'GitHub unavailable - star status unknown'
+        return result
 
 
-    def check_star_for_domain(self, github_username: str, domain: str,
-                              access_token: Optional[str] = None) -> Dict:
+    def check_star_for_domain(self, github_username: str, domain: str) -> Dict:
         """
         Check if user starred repo associated with domain
 
         Args:
             github_username: GitHub username
             domain: Domain name (e.g., 'soulfra.com')
-            access_token: Optional GitHub access token
 
         Returns:
             Dict with star validation result + repo info
@@ -179,8 +168,7 @@ class GitHubStarValidator:
         result = self.check_star(
             github_username=github_username,
             repo_owner=repo_info['owner'],
-            repo_name=repo_info['repo'],
-            access_token=access_token
+            repo_name=repo_info['repo']
         )
 
         # Add repo URL
@@ -248,44 +236,25 @@ class GitHubStarValidator:
             Tier 2: 3 stars
         """
         # List of all network repos to check
-        network_repos = [
-            {'owner': 'soulfra', 'repo': 'soulfra', 'domain': 'soulfra.com'},
-            {'owner': 'soulfra', 'repo': 'deathtodata', 'domain': 'deathtodata.com'},
-            {'owner': 'soulfra', 'repo': 'calriven', 'domain': 'calriven.com'},
-            {'owner': 'soulfra', 'repo': 'howtocookathome', 'domain': 'howtocookathome.com'},
-            {'owner': 'soulfra', 'repo': 'stpetepros', 'domain': 'stpetepros.com'},
-        ]
+        network_repos = NETWORK_REPOS
 
         starred_repos = []
         stars_given = 0
 
-        # Check each network repo
+        # Check each network repo (star state only - repo counts aren't needed here)
         for repo in network_repos:
-            result = self.check_star(github_username, repo['owner'], repo['repo'])
-
-            if result['has_starred']:
+            if self.cache.has_starred(github_username, repo['owner'], repo['repo']):
                 stars_given += 1
                 starred_repos.append({
                     'repo': f"{repo['owner']}/{repo['repo']}",
                     'domain': repo['domain'],
-                    'starred_at': result.get('starred_at')
+                    'starred_at': datetime.now().isoformat()
                 })
 
         # Get GitHub profile stats (for Tier 3/4 calculation)
-        try:
-            profile_url = f'{GITHUB_API_URL}/users/{github_username}'
-            profile_response = requests.get(profile_url, timeout=5)
-
-            if profile_response.status_code == 200:
-                profile = profile_response.json()
-                repos_count = profile.get('public_repos', 0)
-                followers_count = profile.get('followers', 0)
-            else:
-                repos_count = 0
-                followers_count = 0
-        except:
-            repos_count = 0
-            followers_count = 0
+        profile = self.cache.user_profile(github_username)
+        repos_count = profile.get('public_repos', 0)
+        followers_count = profile.get('followers', 0)
 
         # Calculate tier
         tier = 0
@@ -508,8 +477,9 @@ def require_star_middleware():
     validator = GitHubStarValidator()
     result = validator.check_star_for_domain(github_username, domain)
 
-    # Record verification
-    validator.record_star_verification(github_username, domain, result['has_starred'])
+    # Record verification (only when GitHub actually answered - cache hits change nothing)
+    if result.get('source') == 'fetched':
+        validator.record_star_verification(github_username, domain, result['has_starred'])
 
     if result['has_starred']:
         return jsonify({
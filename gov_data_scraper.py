@@ -20,6 +20,7 @@ Usage:
 import requests
 from bs4 import BeautifulSoup
 from database import get_db
+from full_text_search import search as full_text_search
 from datetime import datetime, timezone, timedelta
 import json
 import hashlib
@@ -417,28 +418,31 @@ def search_gov_data(query, sources=None, data_types=None, limit=20):
     """
     db = get_db()
 
-    sql = "SELECT * FROM gov_data WHERE 1=1"
+    sql = "1=1"
     params = []
 
-    if query:
-        sql += " AND (title LIKE ? OR summary LIKE ? OR tags LIKE ?)"
-        search_term = f"%{query}%"
-        params.extend([search_term, search_term, search_term])
-
     if sources:
         placeholders = ','.join(['?' for _ in sources])
-        sql += f" AND source IN ({placeholders})"
+        sql += f" AND t.source IN ({placeholders})"
         params.extend(sources)
 
     if data_types:
         placeholders = ','.join(['?' for _ in data_types])
-        sql += f" AND data_type IN ({placeholders})"
+        sql += f" AND t.data_type IN ({placeholders})"
         params.extend(data_types)
 
-    sql += " ORDER BY published_date DESC LIMIT ?"
-    params.append(limit)
-
-    results = db.execute(sql, params).fetchall()
+    if query:
+        # Full-text search over title/summary/tags, BM25-ranked
+        results = full_text_search('gov_data', query, limit=limit, where=sql, params=params, db=db)
+        db.close()
+        return results
+
+    results = db.execute(f"""
+        SELECT * FROM gov_data t
+        WHERE {sql}
+        ORDER BY published_date DESC LIMIT ?
+    """, params + [limit]).fetchall()
+    db.close()
 
     return [dict(row) for row in results]
 
@@ -45,14 +45,33 @@ Architecture:
     - Each layer is RGBA (transparency support)
     - Compositing with PIL Image.alpha_composite()
     - Font support via PIL ImageFont
+
+Performance:
+    - Fonts, gradients, image assets and QR tiles are cached per process,
+      keyed by their parameters (load_font, _gradient_tile, _qr_tile)
+    - Gradients are built from a one-pixel ramp and composited in C
+      instead of being drawn row by row (or pixel by pixel) in Python
+    - render() output is cached under a hash of the layer stack, so an
+      identical composition is never rendered twice in a process
+    - render_batch() renders many compositions in a process pool, once
+      per distinct layer stack
 """
 
+import hashlib
 import io
+import json
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from dataclasses import dataclass, field
-import qrcode
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageFilter
+from dataclasses import dataclass, field, fields
+
+
+# Rendered outputs kept per process (PNG bytes of a 1200x630 header are ~100 KB)
+RENDER_CACHE_SIZE = 128
 
 
 # =============================================================================
@@ -131,6 +150,146 @@ class QRLayer(Layer):
     layer_type: str = field(default='qr', init=False)
 
 
+# =============================================================================
+# Per-Process Render Caches
+# =============================================================================
+
+@lru_cache(maxsize=64)
+def load_font(font_name: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Resolve and load a font once per process
+
+    Tries the system font directories, then font_name as a path, then
+    Arial, then PIL's built-in bitmap font.
+    """
+    font_paths = [
+        f"/usr/share/fonts/truetype/{font_name.lower()}.ttf",
+        f"/System/Library/Fonts/{font_name}.ttc",
+        f"/Library/Fonts/{font_name}.ttf",
+        f"C:\\Windows\\Fonts\\{font_name}.ttf",
+        font_name  # Direct path
+    ]
+
+    for path in font_paths:
+        if os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except:
+                continue
+
+    # Fallback to default font
+    try:
+        return ImageFont.truetype("Arial.ttf", size)
+    except:
+        return ImageFont.load_default()
+
+
+def _ramp(length: int, span: int) -> bytes:
+    """One row of an 'L' mask where pixel i is 255 * i / span"""
+    return bytes(int(255 * i / span) for i in range(length))
+
+
+@lru_cache(maxsize=32)
+def _gradient_tile(size: Tuple[int, int], start: Tuple, end: Tuple, angle: int) -> Image.Image:
+    """
+    Two-color gradient (angle 0 = horizontal, 90 = vertical, else diagonal)
+
+    The blend ratio is a one-pixel ramp stretched to the canvas with
+    NEAREST (two ramps summed for the diagonal); Image.composite then
+    blends every pixel in C. Callers must copy() before mutating.
+    """
+    width, height = size
+
+    if angle == 0:
+        mask = Image.frombytes('L', (width, 1), _ramp(width, width)).resize(size, Image.NEAREST)
+    elif angle == 90:
+        mask = Image.frombytes('L', (1, height), _ramp(height, height)).resize(size, Image.NEAREST)
+    else:
+        span = width + height
+        across = Image.frombytes('L', (width, 1), _ramp(width, span)).resize(size, Image.NEAREST)
+        down = Image.frombytes('L', (1, height), _ramp(height, span)).resize(size, Image.NEAREST)
+        mask = ImageChops.add(across, down)
+
+    return Image.composite(Image.new('RGBA', size, end), Image.new('RGBA', size, start), mask)
+
+
+@lru_cache(maxsize=32)
+def _image_asset(path: str, mtime_ns: int, size: Optional[Tuple[int, int]]) -> Image.Image:
+    """Image file decoded (and resized) once per version of the file"""
+    img = Image.open(path).convert('RGBA')
+    if size:
+        img = img.resize(size, Image.LANCZOS)
+    return img
+
+
+@lru_cache(maxsize=256)
+def _qr_tile(url: str, box_size: int, border: int, size: int) -> Image.Image:
+    """QR code scaled to size, from qr_service's shared matrix/mask caches"""
+    import qr_service
+
+    return qr_service.render(url, ecc='H', version=1, box_size=box_size, border=border,
+                             size=size).convert('RGBA')
+
+
+# Rendered output bytes by ImageComposer.cache_key()
+_render_cache: 'OrderedDict[str, bytes]' = OrderedDict()
+_render_stats = {'hits': 0, 'misses': 0}
+
+
+def _cached_output(key: str) -> Optional[bytes]:
+    data = _render_cache.get(key)
+    if data is not None:
+        _render_cache.move_to_end(key)
+        _render_stats['hits'] += 1
+    return data
+
+
+def _remember_output(key: str, data: bytes):
+    _render_cache[key] = data
+    _render_cache.move_to_end(key)
+    while len(_render_cache) > RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+
+
+def render_cache_stats() -> Dict:
+    """Hit/miss counters and entry counts of this process's render caches"""
+    return {
+        'hits': _render_stats['hits'],
+        'misses': _render_stats['misses'],
+        'outputs': len(_render_cache),
+        'fonts': load_font.cache_info().currsize,
+        'gradients': _gradient_tile.cache_info().currsize,
+        'assets': _image_asset.cache_info().currsize,
+        'qr_tiles': _qr_tile.cache_info().currsize,
+    }
+
+
+def clear_render_caches():
+    """Drop this process's fonts, tiles, assets and rendered outputs"""
+    for cached in (load_font, _gradient_tile, _image_asset, _qr_tile):
+        cached.cache_clear()
+    _render_cache.clear()
+    _render_stats.update(hits=0, misses=0)
+
+
+def _layer_fingerprint(layer: Layer) -> List:
+    """JSON-able description of everything a layer's pixels depend on"""
+    values = [type(layer).__name__]
+
+    for f in fields(layer):
+        value = getattr(layer, f.name)
+        if isinstance(value, Image.Image):
+            value = ['pil', value.mode, value.size, hashlib.sha256(value.tobytes()).hexdigest()]
+        elif isinstance(value, bytes):
+            value = ['bytes', hashlib.sha256(value).hexdigest()]
+        elif f.name == 'image' and isinstance(value, str) and os.path.exists(value):
+            stat = os.stat(value)
+            value = ['file', value, stat.st_mtime_ns, stat.st_size]
+        values.append([f.name, value])
+
+    return values
+
+
 # =============================================================================
 # Image Composer
 # =============================================================================
@@ -157,7 +316,6 @@ class ImageComposer:
         self.size = size
         self.background_color = background_color
         self.layers: List[Layer] = []
-        self.font_cache: Dict[str, ImageFont.FreeTypeFont] = {}
 
     def add_layer(self, layer_type: str, **kwargs) -> Layer:
         """
@@ -192,12 +350,30 @@ class ImageComposer:
         self.layers.append(layer)
         return layer
 
-    def render(self, format: str = 'PNG') -> bytes:
+    def cache_key(self, format: str = 'PNG') -> str:
+        """
+        Hash of everything render() depends on
+
+        Canvas size, output format and the visible layers in z-order.
+        Image layers contribute a digest of their pixels/bytes, or the
+        path, mtime and size of their file.
+        """
+        stack = [
+            _layer_fingerprint(layer)
+            for layer in sorted(self.layers, key=lambda layer: layer.z_index)
+            if layer.visible
+        ]
+        payload = json.dumps([list(self.size), format.upper(), stack], sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def render(self, format: str = 'PNG', use_cache: bool = True) -> bytes:
         """
         Render all layers to image bytes
 
         Args:
             format: Output format ('PNG', 'WEBP', 'JPEG')
+            use_cache: Return the stored bytes for an identical layer stack
+                rendered earlier in this process
 
         Returns:
             Image bytes
@@ -205,6 +381,13 @@ class ImageComposer:
         Example:
             >>> image_bytes = composer.render(format='PNG')
         """
+        key = self.cache_key(format) if use_cache else None
+        if key:
+            cached = _cached_output(key)
+            if cached is not None:
+                return cached
+            _render_stats['misses'] += 1
+
         # Create base canvas with transparency
         canvas = Image.new('RGBA', self.size, (255, 255, 255, 0))
 
@@ -238,7 +421,11 @@ class ImageComposer:
         # Export to bytes
         output = io.BytesIO()
         canvas.save(output, format=format.upper())
-        return output.getvalue()
+        data = output.getvalue()
+
+        if key:
+            _remember_output(key, data)
+        return data
 
     def _render_layer(self, layer: Layer) -> Optional[Image.Image]:
         """Render individual layer to RGBA image"""
@@ -263,42 +450,15 @@ class ImageComposer:
 
     def _render_gradient(self, layer: GradientLayer) -> Image.Image:
         """Render gradient background"""
-        img = Image.new('RGBA', self.size)
-        draw = ImageDraw.Draw(img)
-
-        width, height = self.size
         colors = [self._hex_to_rgba(c) for c in layer.colors]
-
-        # Horizontal gradient (angle=0)
-        if layer.angle == 0:
-            for x in range(width):
-                ratio = x / width
-                color = self._blend_colors(colors[0], colors[-1], ratio)
-                draw.line([(x, 0), (x, height)], fill=color)
-
-        # Vertical gradient (angle=90)
-        elif layer.angle == 90:
-            for y in range(height):
-                ratio = y / height
-                color = self._blend_colors(colors[0], colors[-1], ratio)
-                draw.line([(0, y), (width, y)], fill=color)
-
-        # Diagonal gradient (angle=45)
-        else:
-            # Simple diagonal for now
-            for x in range(width):
-                for y in range(height):
-                    ratio = (x + y) / (width + height)
-                    color = self._blend_colors(colors[0], colors[-1], ratio)
-                    draw.point((x, y), fill=color)
-
-        return img
+        return _gradient_tile(tuple(self.size), colors[0], colors[-1], layer.angle).copy()
 
     def _render_image(self, layer: ImageLayer) -> Image.Image:
         """Render image layer"""
         # Load image
         if isinstance(layer.image, str):
-            img = Image.open(layer.image).convert('RGBA')
+            img = _image_asset(layer.image, os.stat(layer.image).st_mtime_ns,
+                               tuple(layer.size) if layer.size else None)
         elif isinstance(layer.image, bytes):
             img = Image.open(io.BytesIO(layer.image)).convert('RGBA')
         elif isinstance(layer.image, Image.Image):
@@ -307,7 +467,7 @@ class ImageComposer:
             return None
 
         # Resize if needed
-        if layer.size:
+        if layer.size and not isinstance(layer.image, str):
             img = img.resize(layer.size, Image.LANCZOS)
 
         # Create layer canvas
@@ -353,10 +513,16 @@ class ImageComposer:
             shadow_y = y + shadow_offset[1]
             draw.text((shadow_x, shadow_y), layer.content, font=font, fill=shadow_color)
 
-            # Apply blur to shadow (expensive operation)
+            # Apply blur to shadow: only its box plus the kernel's reach,
+            # everything else on the layer is still transparent
             if shadow_blur > 0:
-                layer_img = layer_img.filter(ImageFilter.GaussianBlur(radius=shadow_blur // 2))
-                draw = ImageDraw.Draw(layer_img)
+                radius = shadow_blur // 2
+                pad = 4 * radius + 4
+                left, top, right, bottom = draw.textbbox((shadow_x, shadow_y), layer.content, font=font)
+                box = (max(0, left - pad), max(0, top - pad),
+                       min(self.size[0], right + pad), min(self.size[1], bottom + pad))
+                if box[0] < box[2] and box[1] < box[3]:
+                    layer_img.paste(layer_img.crop(box).filter(ImageFilter.GaussianBlur(radius=radius)), box[:2])
 
         # Draw text
         text_color = self._hex_to_rgba(layer.color)
@@ -395,18 +561,7 @@ class ImageComposer:
 
     def _render_qr(self, layer: QRLayer) -> Image.Image:
         """Render QR code layer"""
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            box_size=layer.box_size,
-            border=layer.border
-        )
-        qr.add_data(layer.url)
-        qr.make(fit=True)
-
-        qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGBA')
-        qr_img = qr_img.resize((layer.size, layer.size), Image.LANCZOS)
+        qr_img = _qr_tile(layer.url, layer.box_size, layer.border, layer.size)
 
         # Calculate position
         if layer.position == 'bottom-right':
@@ -435,38 +590,8 @@ class ImageComposer:
     # =========================================================================
 
     def _get_font(self, font_name: str, size: int) -> ImageFont.FreeTypeFont:
-        """Load font (with caching)"""
-        cache_key = f"{font_name}:{size}"
-
-        if cache_key in self.font_cache:
-            return self.font_cache[cache_key]
-
-        # Try to load font
-        font_paths = [
-            f"/usr/share/fonts/truetype/{font_name.lower()}.ttf",
-            f"/System/Library/Fonts/{font_name}.ttc",
-            f"/Library/Fonts/{font_name}.ttf",
-            f"C:\\Windows\\Fonts\\{font_name}.ttf",
-            font_name  # Direct path
-        ]
-
-        for path in font_paths:
-            if os.path.exists(path):
-                try:
-                    font = ImageFont.truetype(path, size)
-                    self.font_cache[cache_key] = font
-                    return font
-                except:
-                    continue
-
-        # Fallback to default font
-        try:
-            font = ImageFont.truetype("Arial.ttf", size)
-        except:
-            font = ImageFont.load_default()
-
-        self.font_cache[cache_key] = font
-        return font
+        """Load font (cached per process, see load_font)"""
+        return load_font(font_name, size)
 
     def _hex_to_rgba(self, hex_color: str, alpha: int = 255) -> Tuple[int, int, int, int]:
         """Convert hex color to RGBA tuple"""
@@ -544,12 +669,133 @@ def create_social_post(
     return composer.render()
 
 
+# =============================================================================
+# Batch Rendering
+# =============================================================================
+
+def _render_job(job: Tuple['ImageComposer', str]) -> bytes:
+    composer, format = job
+    return composer.render(format)
+
+
+def render_batch(
+    composers: List[ImageComposer],
+    format: str = 'PNG',
+    workers: Optional[int] = None
+) -> List[bytes]:
+    """
+    Render many compositions, each distinct layer stack once
+
+    Stacks already in this process's output cache are returned as is;
+    the rest are rendered in a process pool (workers > 1), and every
+    worker keeps its own font/gradient/QR caches warm across its share.
+
+    Args:
+        composers: Compositions to render
+        format: Output format for all of them
+        workers: Render processes (default: CPU count; 1 = in-process)
+
+    Returns:
+        Image bytes, in the same order as composers
+
+    Example:
+        >>> headers = render_batch([header_for(post) for post in posts], workers=8)
+    """
+    workers = workers or os.cpu_count() or 1
+    keys = [composer.cache_key(format) for composer in composers]
+
+    outputs: Dict[str, bytes] = {}
+    todo: Dict[str, ImageComposer] = {}
+    for key, composer in zip(keys, composers):
+        if key in outputs or key in todo:
+            continue
+        cached = _cached_output(key)
+        if cached is not None:
+            outputs[key] = cached
+        else:
+            todo[key] = composer
+
+    if workers > 1 and len(todo) > 1:
+        jobs = [(composer, format) for composer in todo.values()]
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            for key, data in zip(todo, pool.map(_render_job, jobs,
+                                                chunksize=max(1, len(jobs) // (workers * 4)))):
+                _render_stats['misses'] += 1
+                _remember_output(key, data)
+                outputs[key] = data
+    else:
+        for key, composer in todo.items():
+            outputs[key] = composer.render(format)
+
+    return [outputs[key] for key in keys]
+
+
+def _blog_header_composer(title: str, colors: Dict[str, str], brand: str, qr_url: Optional[str],
+                          size: Tuple[int, int] = (1200, 630)) -> ImageComposer:
+    """The layer stack of ImageWorkflow.create_blog_header"""
+    composer = ImageComposer(size=size)
+    composer.add_layer('gradient', colors=[colors['primary'], colors['secondary']], angle=45)
+    composer.add_layer('text', content=title, font='impact', font_size=min(64, size[0] // 15),
+                       color='#FFFFFF', position=(50, size[1] // 3),
+                       shadow={'offset': (3, 3), 'blur': 6, 'color': '#000000'})
+    composer.add_layer('shape', shape='rectangle', position=(50, size[1] - 120),
+                       size=(min(300, size[0] // 4), 60), fill_color=colors['secondary'], corner_radius=30)
+    composer.add_layer('text', content=brand.upper(), font='Arial', font_size=28,
+                       color='#FFFFFF', position=(70, size[1] - 110))
+    if qr_url:
+        composer.add_layer('qr', url=qr_url, position='bottom-right', size=150)
+    return composer
+
+
+def benchmark_blog_headers(count: int = 100, workers: Optional[int] = None, qr: bool = True) -> Dict:
+    """
+    Images/sec for the blog-header workload
+
+    Renders `count` distinct 1200x630 headers (create_blog_header's layer
+    stack) in-process and then in a process pool, each from cold caches,
+    and finally re-renders the same batch to measure output cache hits.
+
+    Returns:
+        {'images', 'serial', 'pool', 'cached'} with images/sec for each
+    """
+    workers = workers or os.cpu_count() or 1
+    colors = {'primary': '#8B5CF6', 'secondary': '#3B82F6'}
+    composers = [
+        _blog_header_composer(f'Post {i}: Building Brands That Matter', colors, 'soulfra',
+                              f'https://soulfra.com/b/{i:05d}' if qr else None)
+        for i in range(count)
+    ]
+
+    def timed(run_workers: int) -> float:
+        started = time.perf_counter()
+        render_batch(composers, workers=run_workers)
+        elapsed = time.perf_counter() - started
+        return round(count / elapsed, 1) if elapsed else 0.0
+
+    clear_render_caches()
+    serial = timed(1)
+    clear_render_caches()
+    pool = timed(workers)
+    cached = timed(workers)
+
+    return {'images': count, 'workers': workers, 'serial': serial, 'pool': pool, 'cached': cached}
+
+
 # =============================================================================
 # CLI Testing
 # =============================================================================
 
 if __name__ == '__main__':
     """Test image composer"""
+    import sys
+
+    if '--benchmark' in sys.argv:
+        stats = benchmark_blog_headers(qr='--no-qr' not in sys.argv)
+        print(f"Blog headers ({stats['images']} images, {stats['workers']} workers)")
+        print(f"  serial: {stats['serial']:>8.1f} images/sec")
+        print(f"  pool:   {stats['pool']:>8.1f} images/sec")
+        print(f"  cached: {stats['cached']:>8.1f} images/sec")
+        sys.exit(0)
 
     print("=" * 70)
     print("🎨 Image Composer Test")
@@ -14,7 +14,9 @@ This is the production-ready pipeline for generating branded images.
 
 import io
 import json
-from typing import Optional, Dict, List, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 from PIL import Image
 
@@ -393,29 +395,57 @@ class ImageWorkflow:
 # Batch Processing
 # =============================================================================
 
-def generate_blog_images_batch(posts: List[Dict], brand_slug: str = 'soulfra') -> List[Dict]:
+def _render_blog_post(job: Tuple[str, Dict]) -> Tuple[Optional[bytes], Optional[str]]:
+    """Render one blog header; process pool entry point. Returns (bytes, error)"""
+    brand_slug, post = job
+    try:
+        workflow = ImageWorkflow(brand_slug=brand_slug)
+        image_bytes = workflow.create_blog_header(
+            title=post['title'],
+            keywords=post.get('keywords', []),
+            url=post['url'],
+            author=post.get('author')
+        )
+        return image_bytes, None
+    except Exception as e:
+        return None, str(e)
+
+
+def generate_blog_images_batch(
+    posts: List[Dict],
+    brand_slug: str = 'soulfra',
+    workers: Optional[int] = None
+) -> List[Dict]:
     """
     Generate images for multiple blog posts
 
+    Headers are rendered in a process pool (workers > 1); each worker
+    keeps its fonts, gradients and QR tiles cached across its posts.
+    Files are written by this process, in post order.
+
     Args:
         posts: List of post dicts with 'title', 'keywords', 'url'
         brand_slug: Brand identifier
+        workers: Render processes (default: CPU count; 1 = in-process)
 
     Returns:
         List of results with image paths and metadata
     """
-    workflow = ImageWorkflow(brand_slug=brand_slug)
+    workers = workers or os.cpu_count() or 1
+    jobs = [(brand_slug, post) for post in posts]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            rendered = list(pool.map(_render_blog_post, jobs))
+    else:
+        rendered = [_render_blog_post(job) for job in jobs]
+
     results = []
 
-    for post in posts:
+    for post, (image_bytes, error) in zip(posts, rendered):
         try:
-            # Generate image
-            image_bytes = workflow.create_blog_header(
-                title=post['title'],
-                keywords=post.get('keywords', []),
-                url=post['url'],
-                author=post.get('author')
-            )
+            if error:
+                raise RuntimeError(error)
 
             # Save to file
             filename = f"blog_{post.get('slug', 'post')}_{datetime.now().strftime('%Y%m%d')}.jpg"
@@ -523,8 +553,6 @@ def quick_social_image(message: str, url: str, brand: str = 'soulfra') -> bytes:
 # =============================================================================
 
 if __name__ == '__main__':
-    import os
-
     print("Testing Complete Image Workflow...")
     print()
 
@@ -3,7 +3,7 @@
 Import domains from domains-master.csv into database
 
 Usage:
-    python3 import_domains_csv.py
+    python3 import_domains_csv.py [domains-master.csv]
 
 Validates:
 - No duplicate domains
@@ -12,82 +12,117 @@ Validates:
 - Proper domain format
 """
 
-import csv
-import sqlite3
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Optional
+
+from bulk_import import BulkImporter, ImportTarget, RowError, clean, read_rows, slugify
 
 # Config
 CSV_FILE = "domains-master.csv"
-DB_FILE = "soulfra.db"
 
 # Valid values
 VALID_CATEGORIES = ['cooking', 'tech', 'privacy', 'business', 'health', 'art', 'education', 'gaming', 'finance', 'local']
 VALID_TIERS = ['foundation', 'business', 'creative']
 VALID_TYPES = ['blog', 'game', 'community', 'platform', 'directory']
 
-def validate_domain(row, line_num):
-    """Validate a domain row from CSV"""
+BRAND_COLUMNS = ['name', 'slug', 'domain', 'category', 'tier', 'emoji', 'brand_type', 'tagline', 'created_at']
+
+def domain_errors(row):
+    """Problems with a domain row (messages without line numbers)"""
     errors = []
 
     # Required fields
     required = ['name', 'domain', 'category']
     for field in required:
-        if not row.get(field, '').strip():
-            errors.append(f"Line {line_num}: Missing required field '{field}'")
+        if not clean(row.get(field)):
+            errors.append(f"Missing required field '{field}'")
 
     # Category validation
-    category = row.get('category', '').strip().lower()
+    category = clean(row.get('category')).lower()
     if category and category not in VALID_CATEGORIES:
-        errors.append(f"Line {line_num}: Invalid category '{category}'. Must be one of: {', '.join(VALID_CATEGORIES)}")
+        errors.append(f"Invalid category '{category}'. Must be one of: {', '.join(VALID_CATEGORIES)}")
 
     # Tier validation
-    tier = row.get('tier', '').strip().lower()
+    tier = clean(row.get('tier')).lower()
     if tier and tier not in VALID_TIERS:
-        errors.append(f"Line {line_num}: Invalid tier '{tier}'. Must be one of: {', '.join(VALID_TIERS)}")
+        errors.append(f"Invalid tier '{tier}'. Must be one of: {', '.join(VALID_TIERS)}")
 
     # Brand type validation
-    brand_type = row.get('brand_type', '').strip().lower()
+    brand_type = clean(row.get('brand_type')).lower()
     if brand_type and brand_type not in VALID_TYPES:
-        errors.append(f"Line {line_num}: Invalid brand_type '{brand_type}'. Must be one of: {', '.join(VALID_TYPES)}")
+        errors.append(f"Invalid brand_type '{brand_type}'. Must be one of: {', '.join(VALID_TYPES)}")
 
     # Domain format
-    domain = row.get('domain', '').strip()
+    domain = clean(row.get('domain'))
     if domain and not ('.' in domain and len(domain) > 3):
-        errors.append(f"Line {line_num}: Invalid domain format '{domain}'")
+        errors.append(f"Invalid domain format '{domain}'")
 
     return errors
 
-def import_csv():
-    """Import domains from CSV to database"""
-
-    # Check CSV exists
-    if not Path(CSV_FILE).exists():
-        print(f"❌ Error: {CSV_FILE} not found")
-        print(f"   Create it first, then fill in your domains")
-        sys.exit(1)
-
-    # Open database
-    db = sqlite3.connect(DB_FILE)
-    cursor = db.cursor()
-
-    # Read CSV
-    print(f"📖 Reading {CSV_FILE}...")
-    with open(CSV_FILE, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = [row for row in reader if row.get('name', '').strip() and not row['name'].startswith('#')]
-
-    print(f"   Found {len(rows)} domains in CSV")
-
-    # Validate all rows first
+def validate_domain(row, line_num):
+    """Validate a domain row from CSV"""
+    return [f"Line {line_num}: {error}" for error in domain_errors(row)]
+
+def is_comment(row) -> bool:
+    """Blank or commented-out (#) rows in domains-master.csv"""
+    name = clean(row.get('name'))
+    return not name or name.startswith('#')
+
+def domain_slug(domain: str) -> str:
+    return domain.replace('.com', '').replace('.', '-').lower()
+
+def brands_target(slug_from: str = 'domain', defaults: Optional[Dict] = None, strict: bool = True,
+                  skip_existing_domains: bool = True) -> ImportTarget:
+    """
+    Import target for brands
+
+    Args:
+        slug_from: 'domain' (soulfra-com) or 'name' (Soulfra Labs -> soulfra-labs);
+            taken slugs get -1, -2, ... suffixes
+        defaults: Values for empty category/tier/emoji/brand_type/tagline cells
+        strict: Reject rows failing validate_domain() (otherwise only name/domain are required)
+        skip_existing_domains: Skip rows whose domain is already a brand
+    """
+    defaults = dict({'category': 'tech', 'tier': 'foundation', 'emoji': '', 'brand_type': 'blog',
+                     'tagline': ''}, **(defaults or {}))
+
+    def prepare(row: Dict, lookups: Dict) -> Dict:
+        if strict:
+            errors = domain_errors(row)
+            if errors:
+                raise RowError(errors[0])
+
+        name = clean(row.get('name'))
+        domain = clean(row.get('domain'))
+        if not name or not domain:
+            raise RowError("Missing name or domain")
+
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')     # = datetime('now')
+        record = {field: clean(row.get(field)) or default for field, default in defaults.items()}
+        record.update(name=name, domain=domain, created_at=now,
+                      slug=domain_slug(domain) if slug_from == 'domain' else slugify(name))
+        return record
+
+    return ImportTarget(name='brands', table='brands', columns=BRAND_COLUMNS, prepare=prepare,
+                        slug_column='slug', unique_column='domain' if skip_existing_domains else None)
+
+def validate_file(path):
+    """Validate every row (streamed) - duplicates within the file and field values"""
     all_errors = []
     seen_domains = set()
     seen_names = set()
+    count = 0
+
+    for i, row in enumerate(read_rows(path), start=2):  # Start at 2 (line 1 is header)
+        if is_comment(row):
+            continue
+        count += 1
 
-    for i, row in enumerate(rows, start=2):  # Start at 2 (line 1 is header)
         # Check for duplicates
-        domain = row.get('domain', '').strip().lower()
-        name = row.get('name', '').strip()
+        domain = clean(row.get('domain')).lower()
+        name = clean(row.get('name'))
 
         if domain in seen_domains:
             all_errors.append(f"Line {i}: Duplicate domain '{domain}'")
@@ -98,8 +133,24 @@ def import_csv():
         seen_names.add(name)
 
         # Validate fields
-        errors = validate_domain(row, i)
-        all_errors.extend(errors)
+        all_errors.extend(validate_domain(row, i))
+
+    return count, all_errors
+
+def import_csv(csv_file=CSV_FILE):
+    """Import domains from CSV to database"""
+
+    # Check CSV exists
+    if not Path(csv_file).exists():
+        print(f"❌ Error: {csv_file} not found")
+        print(f"   Create it first, then fill in your domains")
+        sys.exit(1)
+
+    # Validate all rows first (streamed pass; nothing is imported if anything is wrong)
+    print(f"📖 Reading {csv_file}...")
+    count, all_errors = validate_file(csv_file)
+
+    print(f"   Found {count} domains in CSV")
 
     # Stop if validation errors
     if all_errors:
@@ -112,57 +163,19 @@ def import_csv():
 
     print(f"✅ Validation passed!")
 
-    # Clear existing brands (optional - comment out if you want to keep existing)
-    # cursor.execute("DELETE FROM brands")
-
-    # Import each domain
-    imported = 0
-    skipped = 0
-
-    for row in rows:
-        name = row.get('name', '').strip()
-        domain = row.get('domain', '').strip()
-        category = row.get('category', '').strip()
-        tier = row.get('tier', 'foundation').strip()
-        emoji = row.get('emoji', '').strip()
-        brand_type = row.get('brand_type', 'blog').strip()
-        tagline = row.get('tagline', '').strip()
-        target_audience = row.get('target_audience', '').strip()
-        purpose = row.get('purpose', '').strip()
-
-        # Generate slug
-        slug = domain.replace('.com', '').replace('.', '-').lower()
-
-        # Check if already exists
-        existing = cursor.execute('SELECT id FROM brands WHERE slug = ? OR domain = ?', (slug, domain)).fetchone()
-
-        if existing:
-            print(f"⏭️  Skipping {name} (already exists)")
-            skipped += 1
-            continue
-
-        # Insert
-        try:
-            cursor.execute('''
-                INSERT INTO brands (
-                    name, slug, domain, category, tier, emoji, brand_type, tagline, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-            ''', (name, slug, domain, category, tier, emoji, brand_type, tagline))
+    # Import in chunks: existing domains are skipped, slug collisions get -1, -2, ...
+    importer = BulkImporter(brands_target())
+    rows = (row for row in read_rows(csv_file) if not is_comment(row))
+    job = importer.run(rows, total=count, source=str(csv_file))
 
-            imported += 1
-            print(f"✅ Imported: {name} ({domain})")
-
-        except sqlite3.Error as e:
-            print(f"❌ Error importing {name}: {e}")
-            skipped += 1
-
-    # Commit
-    db.commit()
-    db.close()
+    imported = job['imported']
+    skipped = job['skipped'] + job['errors']
+    for error in job['error_samples']:
+        print(f"❌ {error}")
 
     # Summary
     print(f"\n" + "="*50)
-    print(f"📊 Import Summary:")
+    print(f"📊 Import Summary (job {job['job_id']}):")
     print(f"   Imported: {imported}")
     print(f"   Skipped:  {skipped}")
     print(f"   Total:    {imported + skipped}")
@@ -173,5 +186,7 @@ def import_csv():
         print(f"   Visit: http://localhost:5001/admin/domains")
         print(f"   Or: http://localhost:5001/control")
 
+    return job
+
 if __name__ == '__main__':
-    import_csv()
+    import_csv(sys.argv[1] if len(sys.argv) > 1 else CSV_FILE)
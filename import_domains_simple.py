@@ -23,14 +23,15 @@ No complex CSV needed!
 
 import sys
 import json
-import sqlite3
 import urllib.request
 import urllib.error
 from pathlib import Path
 
+from bulk_import import BulkImporter
+from import_domains_csv import brands_target
+
 # Config
 DOMAIN_FILE = "domains-simple.txt"
-DB_FILE = "soulfra.db"
 OLLAMA_URL = "http://localhost:11434/api/generate"
 
 # Valid categories
@@ -201,62 +202,18 @@ def import_domains():
         print("❌ Import cancelled")
         sys.exit(0)
 
-    # Import to database
+    # Import to database (one bulk transaction; existing domains are skipped)
     print("\n📥 Importing to database...")
 
-    db = sqlite3.connect(DB_FILE)
-    cursor = db.cursor()
-
-    imported = 0
-    skipped = 0
-
-    for data in domain_data:
-        domain = data['domain']
-        name = data['name']
-        slug = domain.replace('.com', '').replace('.', '-').lower()
-
-        # Check if already exists
-        existing = cursor.execute(
-            'SELECT id FROM brands WHERE slug = ? OR domain = ?',
-            (slug, domain)
-        ).fetchone()
-
-        if existing:
-            print(f"⏭️  Skipping {name} (already exists)")
-            skipped += 1
-            continue
-
-        # Insert
-        try:
-            cursor.execute('''
-                INSERT INTO brands (
-                    name, slug, domain, category, tier, emoji, brand_type, tagline, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-            ''', (
-                name,
-                slug,
-                domain,
-                data['category'],
-                'foundation',  # Default tier
-                data['emoji'],
-                data['brand_type'],
-                data['tagline']
-            ))
-
-            imported += 1
-            print(f"✅ Imported: {name} ({domain})")
-
-        except sqlite3.Error as e:
-            print(f"❌ Error importing {name}: {e}")
-            skipped += 1
-
-    # Commit
-    db.commit()
-    db.close()
+    job = BulkImporter(brands_target(strict=False, defaults={'emoji': '🌐'})).run(domain_data, source=DOMAIN_FILE)
+    imported = job['imported']
+    skipped = job['skipped'] + job['errors']
+    for error in job['error_samples']:
+        print(f"❌ {error}")
 
     # Summary
     print("\n" + "="*80)
-    print("📊 Import Summary:")
+    print(f"📊 Import Summary (job {job['job_id']}):")
     print(f"   Imported: {imported}")
     print(f"   Skipped:  {skipped}")
     print(f"   Total:    {imported + skipped}")
@@ -64,6 +64,13 @@ def init_voice_memos_table():
         ON voice_memos(created_at)
     ''')
 
+    # ==========================================================================
+    # VOICE MEMO SEGMENTS - Encrypted segments of segmented memos (one row each)
+    # ==========================================================================
+    from voice_segments import VOICE_SEGMENTS_SCHEMA
+    for statement in VOICE_SEGMENTS_SCHEMA:
+        cursor.execute(statement)
+
     # ==========================================================================
     # VOICE MEMO ACCESS LOG - Track who accessed which memos
     # ==========================================================================
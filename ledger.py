@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Ledger - Append-only double-entry journal for tokens, credits and payouts
+
+Every balance change is a posting: legs of (account, amount) that sum to zero
+per currency, written atomically under BEGIN IMMEDIATE. Each account keeps a
+running-balance snapshot updated in the same transaction, so balance reads
+are a single primary-key lookup and never re-aggregate history.
+
+Accounts are keyed (owner_type, owner_id, currency):
+    ('user', 15, 'TOKEN')       a user's draft-timer tokens
+    ('user', 15, 'VIBE')        a player's betting balance
+    ('bet_pool', 7, 'VIBE')     escrow for an open betting pool
+    ('system', 0, 'TOKEN')      issuer - 'system' accounts may go negative
+
+Amounts are integers in the currency's smallest unit (tokens, VIBE, cents).
+A leg that would take a non-system account below zero aborts the whole
+posting with InsufficientFunds.
+
+Database schema:
+- ledger_accounts: Running balance + lifetime credit/debit per account
+- ledger_postings: One row per posting, with optional unique idempotency key
+- ledger_entries: The journal - one row per leg with the balance after it
+                  (UPDATE/DELETE are rejected by triggers)
+
+Usage:
+    from ledger import post, transfer, balance
+
+    transfer(('system', 0, 'TOKEN'), ('user', 15, 'TOKEN'), 5,
+             kind='earn', memo='voice_memo_recorded', idempotency_key='memo-991')
+    balance(('user', 15, 'TOKEN'))   # → 5
+
+    python3 ledger.py --verify
+    python3 ledger.py --load-test 20000 --workers 8
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database import get_db
+from schema_registry import register_migration
+
+
+AccountKey = Tuple[str, int, str]           # (owner_type, owner_id, currency)
+Leg = Tuple[AccountKey, int]
+
+NEGATIVE_BALANCE_OWNERS = ('system',)       # issuers/sinks that may go below zero
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+LEDGER_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS ledger_accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_type TEXT NOT NULL,
+        owner_id INTEGER NOT NULL,
+        currency TEXT NOT NULL,
+        balance INTEGER NOT NULL DEFAULT 0,
+        lifetime_credit INTEGER NOT NULL DEFAULT 0,
+        lifetime_debit INTEGER NOT NULL DEFAULT 0,
+        allow_negative BOOLEAN NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(owner_type, owner_id, currency)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS ledger_postings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        idempotency_key TEXT UNIQUE,
+        kind TEXT NOT NULL,
+        memo TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS ledger_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        posting_id INTEGER NOT NULL,
+        account_id INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        balance_after INTEGER NOT NULL,
+        FOREIGN KEY (posting_id) REFERENCES ledger_postings(id),
+        FOREIGN KEY (account_id) REFERENCES ledger_accounts(id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_ledger_entries_account ON ledger_entries(account_id, id)',
+    'CREATE INDEX IF NOT EXISTS idx_ledger_entries_posting ON ledger_entries(posting_id)',
+    # Leaderboards are index range scans kept current by every posting
+    'CREATE INDEX IF NOT EXISTS idx_ledger_accounts_balance ON ledger_accounts(currency, owner_type, balance)',
+    'CREATE INDEX IF NOT EXISTS idx_ledger_accounts_credit ON ledger_accounts(currency, owner_type, lifetime_credit)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ledger_entries_append_only BEFORE UPDATE ON ledger_entries
+    BEGIN
+        SELECT RAISE(ABORT, 'ledger_entries is append-only');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ledger_entries_no_delete BEFORE DELETE ON ledger_entries
+    BEGIN
+        SELECT RAISE(ABORT, 'ledger_entries is append-only');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ledger_postings_append_only BEFORE UPDATE ON ledger_postings
+    BEGIN
+        SELECT RAISE(ABORT, 'ledger_postings is append-only');
+    END
+    ''',
+]
+register_migration(112, 'double-entry ledger', *LEDGER_SCHEMA, module='ledger')
+
+
+# ==============================================================================
+# ERRORS / RESULTS
+# ==============================================================================
+
+class LedgerError(Exception):
+    """Posting rejected (unbalanced legs, bad amounts)"""
+
+
+class InsufficientFunds(LedgerError):
+    """A leg would take a non-system account below zero"""
+
+    def __init__(self, account: AccountKey, amount: int, available: int):
+        self.account = account
+        self.amount = amount
+        self.available = available
+        super().__init__(f"Insufficient funds in {account}: need {-amount}, have {available}")
+
+
+@dataclass
+class Posting:
+    id: Optional[int]               # None: every amount was zero, nothing was written
+    kind: str
+    memo: Optional[str]
+    legs: List[Tuple[AccountKey, int, int]] = field(default_factory=list)   # (account, amount, balance_after)
+    replayed: bool = False          # True if the idempotency key had already been posted
+
+    def balance_after(self, account: AccountKey) -> Optional[int]:
+        """Balance of account after its last leg in this posting"""
+        result = None
+        for key, _, after in self.legs:
+            if key == account:
+                result = after
+        return result
+
+
+# ==============================================================================
+# TRANSACTIONS
+# ==============================================================================
+
+@contextmanager
+def immediate(db=None):
+    """
+    Write transaction taken with BEGIN IMMEDIATE
+
+    The write lock is acquired before anything is read, so read-compute-write
+    sequences (balances, AMM reserves, odds) can't interleave with another
+    writer. Nested use runs in a savepoint of the outer transaction, so a
+    failed inner posting is undone without aborting the caller's work.
+    """
+    own_connection = db is None
+    conn = db or get_db()
+    outermost = not conn.in_transaction
+
+    conn.execute('BEGIN IMMEDIATE' if outermost else 'SAVEPOINT ledger_posting')
+    try:
+        yield conn
+        if outermost:
+            conn.commit()
+        else:
+            conn.execute('RELEASE ledger_posting')
+    except BaseException:
+        if outermost:
+            conn.rollback()
+        else:
+            conn.execute('ROLLBACK TO ledger_posting')
+            conn.execute('RELEASE ledger_posting')
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+
+
+# ==============================================================================
+# POSTINGS
+# ==============================================================================
+
+def post(legs: Sequence[Leg], kind: str, memo: Optional[str] = None,
+         idempotency_key: Optional[str] = None, db=None) -> Posting:
+    """
+    Atomically apply a balanced set of legs
+
+    Args:
+        legs: [((owner_type, owner_id, currency), amount), ...] summing to 0 per currency
+        kind: Posting type ('earn', 'spend', 'bet', 'payout', ...)
+        memo: Free-text reason
+        idempotency_key: Posting is applied at most once per key; repeats return
+                         the original posting with replayed=True
+        db: Connection to join (e.g. one already inside immediate())
+
+    A posting whose amounts are all zero (an empty pool resolving, a zero
+    opening balance) is a no-op: nothing is written and the returned
+    Posting has id None.
+
+    Raises:
+        LedgerError: no legs, unbalanced or non-integer legs
+        InsufficientFunds: a non-system account would go negative (nothing is written)
+    """
+    legs = [(tuple(account), amount) for account, amount in legs]
+    if legs and not any(amount for _, amount in legs):
+        return Posting(id=None, kind=kind, memo=memo)
+    legs = [(account, amount) for account, amount in legs if amount]
+    _validate(legs)
+
+    with immediate(db) as conn:
+        if idempotency_key is not None:
+            existing = conn.execute('SELECT id FROM ledger_postings WHERE idempotency_key = ?',
+                                    (idempotency_key,)).fetchone()
+            if existing:
+                return get_posting(existing[0], db=conn, replayed=True)
+
+        posting_id = conn.execute(
+            'INSERT INTO ledger_postings (idempotency_key, kind, memo) VALUES (?, ?, ?)',
+            (idempotency_key, kind, memo)
+        ).lastrowid
+
+        applied, entries = [], []
+        for account, amount in legs:
+            account_id, balance_after = _apply_leg(conn, account, amount)
+            applied.append((account, amount, balance_after))
+            entries.append((posting_id, account_id, amount, balance_after))
+
+        conn.executemany(
+            'INSERT INTO ledger_entries (posting_id, account_id, amount, balance_after) VALUES (?, ?, ?, ?)',
+            entries
+        )
+
+    return Posting(id=posting_id, kind=kind, memo=memo, legs=applied)
+
+
+def transfer(source: AccountKey, destination: AccountKey, amount: int, kind: str,
+             memo: Optional[str] = None, idempotency_key: Optional[str] = None, db=None) -> Posting:
+    """Two-leg posting: move amount from source to destination"""
+    return post([(source, -amount), (destination, amount)], kind, memo, idempotency_key, db)
+
+
+def _validate(legs: List[Leg]):
+    if not legs:
+        raise LedgerError('Posting has no legs')
+
+    totals = defaultdict(int)
+    for account, amount in legs:
+        if len(account) != 3:
+            raise LedgerError(f'Account key must be (owner_type, owner_id, currency): {account}')
+        if not isinstance(amount, int) or isinstance(amount, bool):
+            raise LedgerError(f'Amounts are integers in the smallest unit, got {amount!r}')
+        totals[account[2]] += amount
+
+    unbalanced = {currency: total for currency, total in totals.items() if total}
+    if unbalanced:
+        raise LedgerError(f'Legs must sum to zero per currency: {unbalanced}')
+
+
+def _apply_leg(conn, account: AccountKey, amount: int) -> Tuple[int, int]:
+    owner_type, owner_id, currency = account
+    conn.execute(
+        'INSERT OR IGNORE INTO ledger_accounts (owner_type, owner_id, currency, allow_negative) '
+        'VALUES (?, ?, ?, ?)',
+        (owner_type, owner_id, currency, owner_type in NEGATIVE_BALANCE_OWNERS)
+    )
+
+    # Guarded in the UPDATE itself - the check and the write are one statement
+    row = conn.execute('''
+        UPDATE ledger_accounts
+        SET balance = balance + :amount,
+            lifetime_credit = lifetime_credit + MAX(:amount, 0),
+            lifetime_debit = lifetime_debit + MAX(-:amount, 0),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE owner_type = :owner_type AND owner_id = :owner_id AND currency = :currency
+          AND (allow_negative OR balance + :amount >= 0)
+        RETURNING id, balance
+    ''', {'amount': amount, 'owner_type': owner_type, 'owner_id': owner_id, 'currency': currency}).fetchone()
+
+    if row is None:
+        raise InsufficientFunds(account, amount, balance(account, db=conn))
+    return row[0], row[1]
+
+
+def get_posting(posting_id: int, db=None, replayed: bool = False) -> Optional[Posting]:
+    own_connection = db is None
+    conn = db or get_db()
+    try:
+        header = conn.execute('SELECT id, kind, memo FROM ledger_postings WHERE id = ?', (posting_id,)).fetchone()
+        if not header:
+            return None
+        legs = conn.execute('''
+            SELECT a.owner_type, a.owner_id, a.currency, e.amount, e.balance_after
+            FROM ledger_entries e
+            JOIN ledger_accounts a ON a.id = e.account_id
+            WHERE e.posting_id = ?
+            ORDER BY e.id
+        ''', (posting_id,)).fetchall()
+    finally:
+        if own_connection:
+            conn.close()
+
+    return Posting(
+        id=header[0], kind=header[1], memo=header[2], replayed=replayed,
+        legs=[((r[0], r[1], r[2]), r[3], r[4]) for r in legs],
+    )
+
+
+# ==============================================================================
+# READS
+# ==============================================================================
+
+def balance(account: AccountKey, db=None) -> int:
+    """Current balance - one indexed lookup, 0 for accounts never posted to"""
+    row = get_account(account, db)
+    return row['balance'] if row else 0
+
+
+def get_account(account: AccountKey, db=None) -> Optional[Dict]:
+    own_connection = db is None
+    conn = db or get_db()
+    try:
+        row = conn.execute('''
+            SELECT id, balance, lifetime_credit, lifetime_debit, updated_at
+            FROM ledger_accounts
+            WHERE owner_type = ? AND owner_id = ? AND currency = ?
+        ''', tuple(account)).fetchone()
+    finally:
+        if own_connection:
+            conn.close()
+
+    if not row:
+        return None
+    return {'id': row[0], 'balance': row[1], 'lifetime_credit': row[2],
+            'lifetime_debit': row[3], 'updated_at': row[4]}
+
+
+def get_entries(account: AccountKey, limit: int = 50, db=None) -> List[Dict]:
+    """Most recent journal entries for an account"""
+    own_connection = db is None
+    conn = db or get_db()
+    try:
+        rows = conn.execute('''
+            SELECT e.id, e.posting_id, e.amount, e.balance_after, p.kind, p.memo, p.created_at
+            FROM ledger_accounts a
+            JOIN ledger_entries e ON e.account_id = a.id
+            JOIN ledger_postings p ON p.id = e.posting_id
+            WHERE a.owner_type = ? AND a.owner_id = ? AND a.currency = ?
+            ORDER BY e.id DESC
+            LIMIT ?
+        ''', (*account, limit)).fetchall()
+    finally:
+        if own_connection:
+            conn.close()
+
+    keys = ('id', 'posting_id', 'amount', 'balance_after', 'kind', 'memo', 'created_at')
+    return [dict(zip(keys, row)) for row in rows]
+
+
+LEADERBOARD_METRICS = ('balance', 'lifetime_credit', 'lifetime_debit')
+
+
+def leaderboard(currency: str, metric: str = 'balance', owner_type: str = 'user',
+                limit: int = 10, db=None) -> List[Dict]:
+    """Top-N accounts by balance or lifetime earnings (index range scan, no aggregation)"""
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"metric must be one of {LEADERBOARD_METRICS}")
+
+    own_connection = db is None
+    conn = db or get_db()
+    try:
+        rows = conn.execute(f'''
+            SELECT owner_id, balance, lifetime_credit, lifetime_debit
+            FROM ledger_accounts
+            WHERE currency = ? AND owner_type = ?
+            ORDER BY {metric} DESC
+            LIMIT ?
+        ''', (currency, owner_type, limit)).fetchall()
+    finally:
+        if own_connection:
+            conn.close()
+
+    return [{'owner_id': r[0], 'balance': r[1], 'lifetime_credit': r[2], 'lifetime_debit': r[3]}
+            for r in rows]
+
+
+def verify(db=None) -> Dict:
+    """
+    Reconcile snapshots against the journal
+
+    Checks every currency sums to zero, every account balance equals the
+    sum of its entries, and every posting balances.
+    """
+    own_connection = db is None
+    conn = db or get_db()
+    try:
+        currencies = {r[0]: r[1] for r in conn.execute(
+            'SELECT currency, SUM(balance) FROM ledger_accounts GROUP BY currency')}
+        drifted = [r[0] for r in conn.execute('''
+            SELECT a.id FROM ledger_accounts a
+            LEFT JOIN (SELECT account_id, SUM(amount) AS total FROM ledger_entries GROUP BY account_id) e
+                   ON e.account_id = a.id
+            WHERE a.balance != COALESCE(e.total, 0)
+               OR a.lifetime_credit - a.lifetime_debit != a.balance
+        ''')]
+        unbalanced = [r[0] for r in conn.execute('''
+            SELECT e.posting_id FROM ledger_entries e
+            JOIN ledger_accounts a ON a.id = e.account_id
+            GROUP BY e.posting_id, a.currency
+            HAVING SUM(e.amount) != 0
+        ''')]
+        postings = conn.execute('SELECT COUNT(*) FROM ledger_postings').fetchone()[0]
+    finally:
+        if own_connection:
+            conn.close()
+
+    return {
+        'valid': not drifted and not unbalanced and not any(currencies.values()),
+        'postings': postings,
+        'currency_totals': currencies,
+        'drifted_accounts': drifted,
+        'unbalanced_postings': unbalanced,
+    }
+
+
+# ==============================================================================
+# LOAD TEST
+# ==============================================================================
+
+def load_test(postings: int = 20000, workers: int = 8, accounts: int = 1000) -> Dict:
+    """
+    Concurrent random transfers from `workers` threads (one connection each)
+    against a scratch database, then a full verify()
+    """
+    import os
+    import random
+    import tempfile
+    import database
+
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory(prefix='ledger-load-') as tmp:
+        database.DB_PATH = os.path.join(tmp, 'ledger_load.db')
+        try:
+            conn = get_db()
+            conn.execute('PRAGMA journal_mode=WAL')
+            for statement in LEDGER_SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            conn.close()
+
+            issuer = ('system', 0, 'TOKEN')
+            post([(issuer, -100 * accounts)] + [(('user', i, 'TOKEN'), 100) for i in range(accounts)],
+                 kind='grant')
+
+            counts = {'posted': 0, 'insufficient': 0, 'replayed': 0}
+            lock = threading.Lock()
+
+            def worker(worker_id: int, n: int):
+                rng = random.Random(worker_id)
+                db = get_db()
+                db.execute('PRAGMA busy_timeout = 30000')
+                local = {'posted': 0, 'insufficient': 0, 'replayed': 0}
+                for i in range(n):
+                    a, b = rng.sample(range(accounts), 2)
+                    key = f'{worker_id}-{i // 2}'          # every other posting is a retry
+                    try:
+                        result = transfer(('user', a, 'TOKEN'), ('user', b, 'TOKEN'), rng.randint(1, 60),
+                                          kind='transfer', idempotency_key=key, db=db)
+                        local['replayed' if result.replayed else 'posted'] += 1
+                    except InsufficientFunds:
+                        local['insufficient'] += 1
+                db.close()
+                with lock:
+                    for k, v in local.items():
+                        counts[k] += v
+
+            per_worker = postings // workers
+            threads = [threading.Thread(target=worker, args=(w, per_worker)) for w in range(workers)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+
+            return {
+                'workers': workers,
+                'attempts': per_worker * workers,
+                **counts,
+                'seconds': round(elapsed, 2),
+                'postings_per_sec': round(counts['posted'] / elapsed),
+                'attempts_per_sec': round(per_worker * workers / elapsed),
+                'verify': verify(),
+            }
+        finally:
+            database.DB_PATH = original_path
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Double-entry ledger')
+    parser.add_argument('--verify', action='store_true', help='Reconcile balances against the journal')
+    parser.add_argument('--load-test', type=int, metavar='POSTINGS', help='Concurrent transfer load test')
+    parser.add_argument('--workers', type=int, default=8, help='Threads for --load-test')
+    args = parser.parse_args()
+
+    if args.load_test:
+        print(json.dumps(load_test(args.load_test, args.workers), indent=2))
+    elif args.verify:
+        result = verify()
+        print(f"{'✅' if result['valid'] else '⚠️'} Ledger: {json.dumps(result)}")
+    else:
+        parser.print_help()
@@ -15,6 +15,12 @@ Usage:
     if result['success']:
         print(f"Model: {result['model_used']}")
         print(f"Response: {result['response']}")
+
+    # Streaming, same fallback (tokens arrive as they are generated)
+    result = router.stream("Explain butter in 10 words")
+    if result['success']:
+        for token in result['stream']:
+            print(token, end='', flush=True)
 """
 
 import json
@@ -22,6 +28,8 @@ import urllib.request
 import urllib.error
 from typing import Dict, Optional, List
 
+from llm_stream import LLMStream
+
 
 class LLMRouter:
     """
@@ -118,6 +126,71 @@ class LLMRouter:
             'hint': f'Install models with: ollama pull {models_to_try[0]}'
         }
 
+    def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        timeout: int = 30
+    ) -> Dict:
+        """
+        Streaming version of call(), with the same model fallback
+
+        A model is chosen as soon as Ollama accepts the request, before the
+        first token, so fallback costs no generation time.
+
+        Returns:
+            Success: {'success': True, 'stream': LLMStream, 'model_used': 'llama2'}
+            Failure: same as call()
+        """
+        models_to_try = [model] if model else self.models
+        errors = []
+
+        for model_name in models_to_try:
+            payload = {
+                'model': model_name,
+                'prompt': prompt,
+                'options': {'temperature': temperature}
+            }
+            if system_prompt:
+                payload['system'] = system_prompt
+
+            try:
+                stream = LLMStream.generate(payload, ollama_url=self.ollama_url, timeout=timeout)
+                return {
+                    'success': True,
+                    'stream': stream,
+                    'model_used': model_name
+                }
+
+            except urllib.error.HTTPError as e:
+                if e.code == 404:
+                    errors.append(f'{model_name}: Not found (404)')
+                else:
+                    errors.append(f'{model_name}: HTTP {e.code}')
+                continue
+
+            except urllib.error.URLError as e:
+                return {
+                    'success': False,
+                    'error': f'Ollama not running or network error: {e.reason}',
+                    'tried_models': models_to_try,
+                    'hint': 'Start Ollama with: ollama serve'
+                }
+
+            except Exception as e:
+                errors.append(f'{model_name}: {type(e).__name__}: {str(e)}')
+                continue
+
+        return {
+            'success': False,
+            'error': f'All {len(models_to_try)} models failed',
+            'tried_models': models_to_try,
+            'errors': errors,
+            'hint': f'Install models with: ollama pull {models_to_try[0]}'
+        }
+
     def _call_single_model(
         self,
         model: str,
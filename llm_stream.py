@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+LLM Stream - Token streaming from Ollama with cancellation and TTFT metrics
+
+Chat-style endpoints (assistant, chapter chat, gallery chat, brand builder,
+Cal reasoning, voice queries, the websocket Ollama chat) used to call
+Ollama with stream: False and show nothing until the whole completion was
+done. They now share one streaming path:
+
+- LLMStream       one /api/generate call with stream: True, iterated as
+                  text chunks; raises the same urllib errors as a plain
+                  call when the request is rejected (404 model, no server)
+- ChainedStream   several generations played back to back as one stream
+- sse_response()  Flask response that forwards a stream as server-sent
+                  events: `data: {"token": ...}` per chunk, then
+                  `event: done` with the final payload and timings
+
+Cancellation: closing a stream closes the HTTP connection, and Ollama
+stops generating when its client goes away. sse_response() closes the
+stream when the browser disconnects (the WSGI server closes the response
+generator); cancel() can be called from another thread (websocket
+disconnect) and takes effect at the next chunk.
+
+Every stream records time-to-first-token next to total latency;
+stream_stats() reports percentiles for this process.
+
+Stdlib only (urllib), like llm_router; Flask is imported by the SSE
+helpers only.
+
+Usage:
+    from llm_stream import LLMStream, sse_response, wants_stream
+
+    stream = LLMStream.generate({'model': 'llama3.2', 'prompt': 'Hello'})
+    for token in stream:
+        print(token, end='', flush=True)
+    print(stream.summary())      # {'ttft_ms': 180, 'total_ms': 2400, ...}
+
+    # In a route
+    if wants_stream(request):
+        return sse_response(stream, on_complete=lambda text, summary: {'saved': save(text)})
+"""
+
+import json
+import threading
+import time
+import urllib.request
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+OLLAMA_URL = 'http://localhost:11434'
+RECENT_STREAMS = 500            # Streams kept for stream_stats() percentiles
+
+
+# ==============================================================================
+# STREAMS
+# ==============================================================================
+
+class LLMStream:
+    """Text chunks of one streaming Ollama /api/generate call"""
+
+    def __init__(self, url: str, payload: Dict, timeout: float = 60):
+        """
+        Open the stream (blocks until Ollama accepts the request)
+
+        Raises:
+            urllib.error.HTTPError: Model not found or other HTTP error
+            urllib.error.URLError: Ollama not running
+        """
+        payload = dict(payload, stream=True)
+        self.model = payload.get('model')
+        self.started = time.perf_counter()
+        self.ttft_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self.eval_count = 0
+        self.prompt_eval_count = 0
+        self.done = False
+        self.cancelled = False
+        self.error: Optional[str] = None
+        self._parts: List[str] = []
+        self._closed = False
+
+        request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        self._response = urllib.request.urlopen(request, timeout=timeout)
+
+    @classmethod
+    def generate(cls, payload: Dict, ollama_url: str = OLLAMA_URL, timeout: float = 60) -> 'LLMStream':
+        """Stream {ollama_url}/api/generate"""
+        return cls(f"{ollama_url.rstrip('/')}/api/generate", payload, timeout=timeout)
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for line in self._response:
+                if self.cancelled:
+                    break
+                if not line.strip():
+                    continue
+
+                chunk = json.loads(line)
+                if chunk.get('error'):
+                    self.error = chunk['error']
+                    break
+
+                token = chunk.get('response') or chunk.get('message', {}).get('content', '')
+                if token:
+                    if self.ttft_ms is None:
+                        self.ttft_ms = (time.perf_counter() - self.started) * 1000
+                    self._parts.append(token)
+                    yield token
+
+                if chunk.get('done'):
+                    self.done = True
+                    self.eval_count = chunk.get('eval_count', 0)
+                    self.prompt_eval_count = chunk.get('prompt_eval_count', 0)
+                    break
+        except (OSError, ValueError) as e:
+            if not self.cancelled:
+                self.error = str(e)
+        finally:
+            self.close()
+
+    @property
+    def text(self) -> str:
+        """Everything received so far"""
+        return ''.join(self._parts)
+
+    def read(self) -> str:
+        """Consume the rest of the stream and return the full text"""
+        for _ in self:
+            pass
+        return self.text
+
+    def cancel(self):
+        """Stop generating; safe from any thread (applies at the next chunk)"""
+        self.cancelled = True
+
+    def close(self):
+        """Close the connection (Ollama stops generating) and record timings"""
+        if self._closed:
+            return
+        self._closed = True
+        if not self.done and not self.error:
+            self.cancelled = True
+        try:
+            self._response.close()
+        except Exception:
+            pass
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        _record(self.summary())
+
+    def summary(self) -> Dict:
+        total_ms = self.total_ms if self.total_ms is not None else (time.perf_counter() - self.started) * 1000
+        generating = (total_ms - self.ttft_ms) / 1000 if self.ttft_ms is not None else 0
+        return {
+            'model': self.model,
+            'ttft_ms': round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            'total_ms': round(total_ms, 1),
+            'tokens': self.eval_count or len(self._parts),
+            'tokens_per_sec': round((self.eval_count or len(self._parts)) / generating, 1) if generating > 0 else 0.0,
+            'cancelled': self.cancelled and not self.done,
+        }
+
+
+class ChainedStream:
+    """Several streams played back to back (each opened when the previous ends)"""
+
+    def __init__(self, factories: Iterable[Callable[[], LLMStream]], separator: str = ''):
+        self._factories = list(factories)
+        self.separator = separator
+        self.streams: List[LLMStream] = []
+        self.started = time.perf_counter()
+        self.cancelled = False
+        self.error: Optional[str] = None
+
+    def __iter__(self) -> Iterator[str]:
+        for i, factory in enumerate(self._factories):
+            if self.cancelled:
+                return
+            try:
+                stream = factory()
+            except OSError as e:        # urllib errors: model missing, server gone
+                self.error = str(e)
+                return
+            self.streams.append(stream)
+            if i and self.separator:
+                yield self.separator
+            for token in stream:
+                if self.cancelled:
+                    stream.cancel()
+                yield token
+            if stream.error:
+                self.error = stream.error
+                return
+
+    @property
+    def texts(self) -> List[str]:
+        """Full text of each generation, in order"""
+        return [stream.text for stream in self.streams]
+
+    @property
+    def text(self) -> str:
+        return self.separator.join(self.texts)
+
+    def cancel(self):
+        self.cancelled = True
+        for stream in self.streams:
+            stream.cancel()
+
+    def close(self):
+        self.cancelled = self.cancelled or len(self.streams) < len(self._factories)
+        for stream in self.streams:
+            stream.close()
+
+    def summary(self) -> Dict:
+        first = self.streams[0].summary() if self.streams else {}
+        parts = [stream.summary() for stream in self.streams]
+        return {
+            'model': first.get('model'),
+            'ttft_ms': first.get('ttft_ms'),
+            'total_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'tokens': sum(part['tokens'] for part in parts),
+            'generations': len(parts),
+            'cancelled': self.cancelled or any(part['cancelled'] for part in parts),
+        }
+
+
+# ==============================================================================
+# METRICS
+# ==============================================================================
+
+_recent = deque(maxlen=RECENT_STREAMS)
+_lock = threading.Lock()
+
+
+def _record(summary: Dict):
+    with _lock:
+        _recent.append(summary)
+
+
+def stream_stats() -> Dict:
+    """Time-to-first-token and total latency percentiles for recent streams"""
+    with _lock:
+        recent = list(_recent)
+
+    def pct(values, p):
+        if not values:
+            return None
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * p))]
+
+    ttft = [s['ttft_ms'] for s in recent if s['ttft_ms'] is not None]
+    total = [s['total_ms'] for s in recent if not s['cancelled']]
+    return {
+        'streams': len(recent),
+        'cancelled': sum(1 for s in recent if s['cancelled']),
+        'ttft_ms': {'p50': pct(ttft, 0.50), 'p95': pct(ttft, 0.95)},
+        'total_ms': {'p50': pct(total, 0.50), 'p95': pct(total, 0.95)},
+    }
+
+
+def reset_stream_stats():
+    with _lock:
+        _recent.clear()
+
+
+# ==============================================================================
+# FLASK (SERVER-SENT EVENTS)
+# ==============================================================================
+
+def wants_stream(request) -> bool:
+    """Client asked for SSE: ?stream=1, Accept: text/event-stream or {"stream": true}"""
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return True
+    body = request.get_json(silent=True)
+    return isinstance(body, dict) and body.get('stream') is True
+
+
+def sse_event(data: Dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ''
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+def sse_response(stream, on_complete: Optional[Callable[[str, Dict], Optional[Dict]]] = None,
+                 meta: Optional[Dict] = None):
+    """
+    Forward a stream to the browser as server-sent events
+
+    Args:
+        stream: LLMStream or ChainedStream
+        on_complete: on_complete(text, summary) after the last chunk (save
+            to the DB here); its dict is merged into the `done` event.
+            Not called if the client disconnects or generation fails.
+        meta: Sent first as `event: meta` (model, persona, search results...)
+
+    Events: meta?, data {"token"}..., then done {ttft_ms, total_ms, ...}
+    or error {"error"}
+    """
+    from flask import Response, stream_with_context
+
+    def events():
+        try:
+            if meta:
+                yield sse_event(meta, 'meta')
+            for token in stream:
+                yield sse_event({'token': token})
+
+            if stream.error:
+                yield sse_event({'error': stream.error}, 'error')
+                return
+
+            stream.close()
+            summary = stream.summary()
+            extra = on_complete(stream.text, summary) if on_complete else None
+            yield sse_event(dict(summary, **(extra or {})), 'done')
+        finally:
+            stream.close()      # client went away: stop the generation
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(stream.close)     # also covers a disconnect before the first chunk
+    return response
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Stream a completion from Ollama')
+    parser.add_argument('prompt')
+    parser.add_argument('--model', default='llama3.2')
+    parser.add_argument('--url', default=OLLAMA_URL)
+    args = parser.parse_args()
+
+    stream = LLMStream.generate({'model': args.model, 'prompt': args.prompt}, ollama_url=args.url)
+    for token in stream:
+        print(token, end='', flush=True)
+    summary = stream.summary()
+    print(f"\n\n⏱️  First token: {summary['ttft_ms']} ms, total: {summary['total_ms']} ms, "
+          f"{summary['tokens_per_sec']} tokens/sec")
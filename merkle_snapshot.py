@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Merkle Snapshots - Incremental, Provable Table Snapshots
+
+Shared storage format for database_snapshot.py and snapshot_exporter.py.
+
+**How It Works:**
+
+1. Each row is serialized canonically and hashed into a leaf
+2. Leaves are cut into pages at content-defined boundaries (a page ends
+   after a leaf whose hash hits the boundary pattern), so inserting or
+   editing one row only changes the page it lands in
+3. Pages are stored content-addressed under pages/<hh>/<hash>.json and
+   only written if that hash does not exist yet
+4. The snapshot manifest lists page hashes; the Merkle root over them is
+   chained to the previous snapshot's hash
+
+A snapshot therefore writes (and verification re-hashes) only the pages
+that changed since the previous one, and any single row can be proven
+against a published root with an O(log n) inclusion proof.
+
+**Manifest:**
+
+```json
+{
+  "format": "merkle",
+  "source": "voice_memos",
+  "key": "id",
+  "merkle_root": "...",
+  "previous_snapshot_hash": "...",
+  "snapshot_hash": "sha256(previous + root + date + statistics)",
+  "pages": [{"hash": "...", "count": 214, "first": 1, "last": 230}]
+}
+```
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# ==============================================================================
+# CONFIG
+# ==============================================================================
+
+PAGE_TARGET = 256       # Average rows per page (boundary probability 1/PAGE_TARGET)
+PAGE_MIN = 32           # Never cut before this many rows
+PAGE_MAX = 2048         # Always cut at this many rows
+
+LEAF_PREFIX = b'\x00'   # Domain separation: a leaf can never pose as a node
+NODE_PREFIX = b'\x01'
+
+
+# ==============================================================================
+# HASHING
+# ==============================================================================
+
+def canonical(row: Dict) -> bytes:
+    return json.dumps(row, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def leaf_hash(row: Dict) -> str:
+    return hashlib.sha256(LEAF_PREFIX + canonical(row)).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def merkle_root(hashes: List[str]) -> str:
+    """Root of a binary tree; an unpaired node is promoted unchanged"""
+    if not hashes:
+        return hashlib.sha256(NODE_PREFIX).hexdigest()
+    level = list(hashes)
+    while len(level) > 1:
+        paired = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def merkle_path(hashes: List[str], index: int) -> List[Tuple[str, str]]:
+    """Sibling hashes from leaf to root as (side, hash), side = sibling position"""
+    path = []
+    level = list(hashes)
+    while len(level) > 1:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(('L' if sibling < index else 'R', level[sibling]))
+        paired = [node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+        index //= 2
+    return path
+
+
+def fold_path(start: str, path: List[Tuple[str, str]]) -> str:
+    current = start
+    for side, sibling in path:
+        current = node_hash(sibling, current) if side == 'L' else node_hash(current, sibling)
+    return current
+
+
+def chain_hash(previous: Optional[str], root: str, date: str, statistics: Dict) -> str:
+    """Snapshot hash linking this root to the previous snapshot"""
+    payload = {'previous': previous, 'root': root, 'date': date, 'statistics': statistics}
+    return hashlib.sha256(canonical(payload)).hexdigest()
+
+
+def _is_boundary(leaf: str, size: int) -> bool:
+    if size >= PAGE_MAX:
+        return True
+    return size >= PAGE_MIN and int(leaf[:8], 16) % PAGE_TARGET == 0
+
+
+# ==============================================================================
+# PAGE STORE
+# ==============================================================================
+
+class MerkleSnapshotStore:
+    """Content-addressed pages plus manifests for one snapshot directory"""
+
+    def __init__(self, directory: Path, source: str, key: str = 'id'):
+        self.directory = Path(directory)
+        self.source = source
+        self.key = key
+        self.pages_dir = self.directory / 'pages'
+
+    def page_path(self, page_hash: str) -> Path:
+        return self.pages_dir / page_hash[:2] / f'{page_hash}.json'
+
+    def _write_page(self, page_hash: str, rows: List[Dict]) -> bool:
+        path = self.page_path(page_hash)
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.page-')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'hash': page_hash, 'key': self.key, 'rows': rows}, f, separators=(',', ':'))
+        os.replace(tmp_name, path)
+        return True
+
+    def load_page(self, page_hash: str) -> Dict:
+        return json.loads(self.page_path(page_hash).read_text())
+
+    def build(self, rows: Iterable[Dict]) -> Dict:
+        """
+        Hash rows (sorted by self.key) into pages, writing only new pages
+
+        Returns:
+            {'merkle_root', 'pages', 'rows', 'written_pages', 'reused_pages'}
+        """
+        pages = []
+        written = reused = total = 0
+        current_rows, current_leaves = [], []
+
+        def flush():
+            nonlocal written, reused
+            page_hash = merkle_root(current_leaves)
+            if self._write_page(page_hash, current_rows):
+                written += 1
+            else:
+                reused += 1
+            pages.append({
+                'hash': page_hash,
+                'count': len(current_rows),
+                'first': current_rows[0][self.key],
+                'last': current_rows[-1][self.key],
+            })
+
+        for row in rows:
+            leaf = leaf_hash(row)
+            current_rows.append(row)
+            current_leaves.append(leaf)
+            total += 1
+            if _is_boundary(leaf, len(current_rows)):
+                flush()
+                current_rows, current_leaves = [], []
+        if current_rows:
+            flush()
+
+        return {
+            'merkle_root': merkle_root([page['hash'] for page in pages]),
+            'pages': pages,
+            'rows': total,
+            'written_pages': written,
+            'reused_pages': reused,
+        }
+
+    def manifest(self, rows: Iterable[Dict], date: str, previous_hash: Optional[str],
+                 statistics: Dict, **extra) -> Tuple[Dict, Dict]:
+        """Build pages and return (manifest, build stats)"""
+        built = self.build(rows)
+        manifest = {
+            'format': 'merkle',
+            'source': self.source,
+            'key': self.key,
+            'date': date,
+            'merkle_root': built['merkle_root'],
+            'previous_snapshot_hash': previous_hash,
+            'snapshot_hash': chain_hash(previous_hash, built['merkle_root'], date, statistics),
+            'statistics': statistics,
+            'pages': built['pages'],
+        }
+        manifest.update(extra)
+        return manifest, built
+
+    def previous_manifest(self, before: str) -> Optional[Dict]:
+        """Newest manifest of this source whose file name sorts before `before`"""
+        for path in sorted(self.directory.glob('*.json'), reverse=True):
+            if path.name >= before:
+                continue
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if _manifest_source(data) == self.source:
+                return data
+        return None
+
+    def verify_manifest(self, manifest: Dict, trusted: Optional[Set[str]] = None) -> Dict:
+        """
+        Check a manifest's pages, root and chain hash
+
+        Pages whose hash is in `trusted` (already verified, e.g. by an older
+        snapshot in the same run) are not re-read. Newly verified pages are
+        added to `trusted`.
+        """
+        trusted = trusted if trusted is not None else set()
+        checked = 0
+
+        for entry in manifest['pages']:
+            if entry['hash'] in trusted:
+                continue
+            try:
+                rows = self.load_page(entry['hash'])['rows']
+            except (OSError, ValueError) as e:
+                return {'valid': False, 'error': f"page {entry['hash'][:16]} unreadable: {e}", 'pages_checked': checked}
+            if merkle_root([leaf_hash(row) for row in rows]) != entry['hash'] or len(rows) != entry['count']:
+                return {'valid': False, 'error': f"page {entry['hash'][:16]} hash mismatch", 'pages_checked': checked}
+            trusted.add(entry['hash'])
+            checked += 1
+
+        root = merkle_root([entry['hash'] for entry in manifest['pages']])
+        if root != manifest['merkle_root']:
+            return {'valid': False, 'error': 'merkle root mismatch', 'pages_checked': checked}
+
+        expected = chain_hash(manifest.get('previous_snapshot_hash'), root, manifest['date'], manifest['statistics'])
+        if expected != manifest['snapshot_hash']:
+            return {'valid': False, 'error': 'snapshot hash mismatch', 'pages_checked': checked}
+
+        return {'valid': True, 'error': None, 'pages_checked': checked,
+                'pages_trusted': len(manifest['pages']) - checked}
+
+    def prove(self, manifest: Dict, key_value) -> Optional[Dict]:
+        """
+        Inclusion proof for one row, or None if it is not in the snapshot
+
+        Only the page holding the row is read.
+        """
+        pages = manifest['pages']
+        index = bisect_left([entry['last'] for entry in pages], key_value)
+        if index >= len(pages) or pages[index]['first'] > key_value:
+            return None
+
+        entry = pages[index]
+        rows = self.load_page(entry['hash'])['rows']
+        position = next((i for i, row in enumerate(rows) if row[self.key] == key_value), None)
+        if position is None:
+            return None
+
+        leaves = [leaf_hash(row) for row in rows]
+        return {
+            'row': rows[position],
+            'leaf': leaves[position],
+            'page': entry['hash'],
+            'page_path': merkle_path(leaves, position),
+            'root_path': merkle_path([page['hash'] for page in pages], index),
+            'merkle_root': manifest['merkle_root'],
+            'snapshot_hash': manifest['snapshot_hash'],
+        }
+
+
+def _manifest_source(data: Dict) -> Optional[str]:
+    """Source of a manifest, including pre-Merkle snapshot files"""
+    if 'source' in data:
+        return data['source']
+    if 'predictions' in data:
+        return 'predictions'
+    if 'voice_memos' in data:
+        return 'voice_memos'
+    return None
+
+
+def verify_proof(row: Dict, proof: Dict, root: str) -> bool:
+    """Check that row is included under root"""
+    page = fold_path(leaf_hash(row), proof['page_path'])
+    return page == proof['page'] and fold_path(page, proof['root_path']) == root
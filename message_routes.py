@@ -412,104 +412,125 @@ def get_messages_rss(domain):
     """
     Generate RSS feed from IRC/Usenet messages + Voice Recordings
 
-    Merges both IRC messages and voice recordings into unified RSS feed
+    Merges both IRC messages and voice recordings into unified RSS feed.
+    Rendered XML is cached until domain_messages or recordings change and
+    served with ETag/Last-Modified (304 for unchanged feeds).
 
     Returns:
         RSS 2.0 XML feed with all messages from domain
     """
     try:
-        from flask import Response
-        import html as html_lib
+        from syndication import cached_document, respond
 
-        db = get_db()
+        document = cached_document(
+            ('messages', domain),
+            ('domain_messages', 'simple_voice_recordings', 'users'),
+            lambda: _render_messages_rss(domain),
+            mimetype='application/rss+xml'
+        )
+        return respond(document)
 
-        # Get all IRC messages for domain
-        irc_messages = db.execute('''
-            SELECT
-                id,
-                from_user,
-                to_domain,
-                channel,
-                subject,
-                body,
-                created_at,
-                message_type,
-                'irc' as source
-            FROM domain_messages
-            WHERE to_domain = ?
-            ORDER BY created_at DESC
-            LIMIT 50
-        ''', (domain,)).fetchall()
-
-        # Get voice recordings (we'll show all for now, could add domain detection later)
-        # Join with users table to get email/username if available
-        voice_messages = db.execute('''
-            SELECT
-                svr.id,
-                COALESCE(u.email, 'anonymous') as from_user,
-                ? as to_domain,
-                'voice' as channel,
-                '' as subject,
-                svr.transcription as body,
-                svr.created_at,
-                'voice' as message_type,
-                'voice' as source
-            FROM simple_voice_recordings svr
-            LEFT JOIN users u ON svr.user_id = u.id
-            WHERE svr.transcription IS NOT NULL
-            ORDER BY svr.created_at DESC
-            LIMIT 50
-        ''', (domain,)).fetchall()
-
-        # Merge and sort by created_at - convert Row objects to dicts
-        all_items = [dict(row) for row in irc_messages] + [dict(row) for row in voice_messages]
-        all_items = sorted(all_items, key=lambda x: x['created_at'], reverse=True)[:50]
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Failed to generate RSS feed: {str(e)}'
+        }), 500
 
-        messages = all_items
 
-        # Domain metadata
-        domain_metadata = {
-            'soulfra': {
-                'title': 'Soulfra Messages',
-                'link': 'https://soulfra.com',
-                'description': 'IRC/Usenet messages from the Soulfra network'
-            },
-            'cringeproof': {
-                'title': 'CringeProof Ideas',
-                'link': 'https://cringeproof.com',
-                'description': 'AI-extracted insights from voice recordings. Zero cringe, maximum authenticity.'
-            },
-            'deathtodata': {
-                'title': 'DeathToData Messages',
-                'link': 'https://deathtodata.com',
-                'description': 'Privacy-first messaging from DeathToData'
-            },
-            'calriven': {
-                'title': 'CalRiven Messages',
-                'link': 'https://calriven.com',
-                'description': 'Messages from the CalRiven network'
-            },
-            'stpetepros': {
-                'title': 'StPetePros Messages',
-                'link': 'https://stpetepros.com',
-                'description': 'Professional services messages and announcements'
-            }
+def _render_messages_rss(domain):
+    """Build the messages feed XML; returns ([xml], last modified datetime)"""
+    import html as html_lib
+    from syndication import parse_timestamp
+
+    db = get_db()
+
+    # Get all IRC messages for domain
+    irc_messages = db.execute('''
+        SELECT
+            id,
+            from_user,
+            to_domain,
+            channel,
+            subject,
+            body,
+            created_at,
+            message_type,
+            'irc' as source
+        FROM domain_messages
+        WHERE to_domain = ?
+        ORDER BY created_at DESC
+        LIMIT 50
+    ''', (domain,)).fetchall()
+
+    # Get voice recordings (we'll show all for now, could add domain detection later)
+    # Join with users table to get email/username if available
+    voice_messages = db.execute('''
+        SELECT
+            svr.id,
+            COALESCE(u.email, 'anonymous') as from_user,
+            ? as to_domain,
+            'voice' as channel,
+            '' as subject,
+            svr.transcription as body,
+            svr.created_at,
+            'voice' as message_type,
+            'voice' as source
+        FROM simple_voice_recordings svr
+        LEFT JOIN users u ON svr.user_id = u.id
+        WHERE svr.transcription IS NOT NULL
+        ORDER BY svr.created_at DESC
+        LIMIT 50
+    ''', (domain,)).fetchall()
+
+    # Merge and sort by created_at - convert Row objects to dicts
+    all_items = [dict(row) for row in irc_messages] + [dict(row) for row in voice_messages]
+    all_items = sorted(all_items, key=lambda x: x['created_at'], reverse=True)[:50]
+
+    messages = all_items
+
+    # Domain metadata
+    domain_metadata = {
+        'soulfra': {
+            'title': 'Soulfra Messages',
+            'link': 'https://soulfra.com',
+            'description': 'IRC/Usenet messages from the Soulfra network'
+        },
+        'cringeproof': {
+            'title': 'CringeProof Ideas',
+            'link': 'https://cringeproof.com',
+            'description': 'AI-extracted insights from voice recordings. Zero cringe, maximum authenticity.'
+        },
+        'deathtodata': {
+            'title': 'DeathToData Messages',
+            'link': 'https://deathtodata.com',
+            'description': 'Privacy-first messaging from DeathToData'
+        },
+        'calriven': {
+            'title': 'CalRiven Messages',
+            'link': 'https://calriven.com',
+            'description': 'Messages from the CalRiven network'
+        },
+        'stpetepros': {
+            'title': 'StPetePros Messages',
+            'link': 'https://stpetepros.com',
+            'description': 'Professional services messages and announcements'
         }
+    }
 
-        metadata = domain_metadata.get(domain, {
-            'title': f'{domain.title()} Messages',
-            'link': f'https://{domain}.com',
-            'description': f'IRC/Usenet messages from {domain}'
-        })
+    metadata = domain_metadata.get(domain, {
+        'title': f'{domain.title()} Messages',
+        'link': f'https://{domain}.com',
+        'description': f'IRC/Usenet messages from {domain}'
+    })
 
-        # Get last build date
-        last_build_date = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
-        if messages:
-            last_msg_date = datetime.fromisoformat(messages[0]['created_at'])
-            last_build_date = last_msg_date.strftime('%a, %d %b %Y %H:%M:%S +0000')
+    # Get last build date
+    last_build_date = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
+    if messages:
+        last_msg_date = datetime.fromisoformat(messages[0]['created_at'])
+        last_build_date = last_msg_date.strftime('%a, %d %b %Y %H:%M:%S +0000')
 
-        # Build RSS XML
-        xml = f'''<?xml version="1.0" encoding="UTF-8"?>
+    # Build RSS XML
+    xml = f'''<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
   <channel>
     <title>{html_lib.escape(metadata["title"])}</title>
@@ -520,42 +541,42 @@ def get_messages_rss(domain):
     <atom:link href="https://192.168.1.87:5002/api/messages/{domain}/feed.xml" rel="self" type="application/rss+xml"/>
 '''
 
-        # Add items
-        for msg in messages:
-            # Parse date
-            try:
-                pub_date = datetime.fromisoformat(msg['created_at']).strftime('%a, %d %b %Y %H:%M:%S +0000')
-            except:
-                pub_date = last_build_date
-
-            # Create item title based on source
-            source_type = msg.get('source', 'irc')
-
-            if source_type == 'voice':
-                # Voice recording - use first 50 chars of transcript as title
-                title = html_lib.escape(msg['body'][:50] + '...' if len(msg['body']) > 50 else msg['body'])
-                item_type_prefix = '🎤 '
-            else:
-                # IRC message
-                if msg['subject']:
-                    title = html_lib.escape(msg['subject'])
-                else:
-                    title = f"Message to alt.{domain}.{msg['channel']}"
-                item_type_prefix = '💬 '
-
-            # Escape body
-            body = html_lib.escape(msg['body']) if msg['body'] else ''
-
-            # Channel name for link
-            channel_slug = msg['channel'].replace(' ', '-').lower()
-
-            # Link path depends on source
-            if source_type == 'voice':
-                link_path = f"/voice/{msg['id']}"
+    # Add items
+    for msg in messages:
+        # Parse date
+        try:
+            pub_date = datetime.fromisoformat(msg['created_at']).strftime('%a, %d %b %Y %H:%M:%S +0000')
+        except:
+            pub_date = last_build_date
+
+        # Create item title based on source
+        source_type = msg.get('source', 'irc')
+
+        if source_type == 'voice':
+            # Voice recording - use first 50 chars of transcript as title
+            title = html_lib.escape(msg['body'][:50] + '...' if len(msg['body']) > 50 else msg['body'])
+            item_type_prefix = '🎤 '
+        else:
+            # IRC message
+            if msg['subject']:
+                title = html_lib.escape(msg['subject'])
             else:
-                link_path = f"/messages/{msg['id']}"
+                title = f"Message to alt.{domain}.{msg['channel']}"
+            item_type_prefix = '💬 '
+
+        # Escape body
+        body = html_lib.escape(msg['body']) if msg['body'] else ''
+
+        # Channel name for link
+        channel_slug = msg['channel'].replace(' ', '-').lower()
+
+        # Link path depends on source
+        if source_type == 'voice':
+            link_path = f"/voice/{msg['id']}"
+        else:
+            link_path = f"/messages/{msg['id']}"
 
-            xml += f'''    <item>
+        xml += f'''    <item>
       <title>{item_type_prefix}{title}</title>
       <link>{html_lib.escape(metadata["link"])}{link_path}/</link>
       <description>{body}</description>
@@ -566,16 +587,12 @@ def get_messages_rss(domain):
     </item>
 '''
 
-        xml += '''  </channel>
+    xml += '''  </channel>
 </rss>'''
 
-        return Response(xml, mimetype='application/rss+xml')
+    db.close()
 
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Failed to generate RSS feed: {str(e)}'
-        }), 500
+    return [xml], parse_timestamp(messages[0]['created_at']) if messages else None
 
 
 @message_bp.route('/api/messages/<domain>/<post_id>/comments', methods=['GET'])
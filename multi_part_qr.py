@@ -22,13 +22,13 @@ Example:
     # User scans all 3 → Phone assembles full content
 """
 
-import qrcode
 import json
 import hashlib
 from typing import List, Dict, Tuple
-from io import BytesIO
 import base64
 
+import qr_service
+
 
 class MultiPartQRGenerator:
     """
@@ -168,32 +168,8 @@ class MultiPartQRGenerator:
         Returns:
             QR code PNG bytes
         """
-        # Map error correction levels
-        ec_map = {
-            'L': qrcode.constants.ERROR_CORRECT_L,
-            'M': qrcode.constants.ERROR_CORRECT_M,
-            'Q': qrcode.constants.ERROR_CORRECT_Q,
-            'H': qrcode.constants.ERROR_CORRECT_H
-        }
-        
-        qr = qrcode.QRCode(
-            version=None,  # Auto-select version
-            error_correction=ec_map.get(self.error_correction, qrcode.constants.ERROR_CORRECT_M),
-            box_size=10,
-            border=4
-        )
-        
-        qr.add_data(data)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Convert to bytes
-        img_bytes = BytesIO()
-        img.save(img_bytes, format='PNG')
-        img_bytes.seek(0)
-        
-        return img_bytes.read()
+        # Auto-select version; parts repeat across packs, so the PNG is cached
+        return qr_service.png(data, ecc=self.error_correction)
     
     @staticmethod
     def assemble_parts(scanned_parts: List[Dict]) -> Tuple[bool, str]:
@@ -30,6 +30,7 @@ Usage:
 """
 
 from database import get_db
+from schema_registry import ensure_schema
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -114,36 +115,8 @@ class NotificationManager:
         self.init_database()
 
     def init_database(self):
-        """Create notifications table if not exists"""
-        db = get_db()
-
-        db.execute('''
-            CREATE TABLE IF NOT EXISTS notifications (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                type TEXT NOT NULL,
-                title TEXT NOT NULL,
-                message TEXT NOT NULL,
-                url TEXT,
-                icon TEXT,
-                read BOOLEAN DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-        ''')
-
-        # Create index for faster queries
-        db.execute('''
-            CREATE INDEX IF NOT EXISTS idx_notifications_user_read
-            ON notifications(user_id, read)
-        ''')
-
-        db.execute('''
-            CREATE INDEX IF NOT EXISTS idx_notifications_created
-            ON notifications(created_at DESC)
-        ''')
-
-        db.commit()
+        """Create notifications table if not exists (once per process, via schema_registry)"""
+        ensure_schema()
 
     def create_notification(self, user_id: int, type: str, title: str,
                           message: str, url: Optional[str] = None,
@@ -14,22 +14,29 @@ Usage:
     # Work offline
     python3 offline_sync_manager.py --work-offline
 
-    # Sync when online
-    python3 offline_sync_manager.py --sync
+    # Sync when online (server URL or a local copy of the server database)
+    python3 offline_sync_manager.py --sync [--to URL_OR_PATH]
 
     # Preload all assets
     python3 offline_sync_manager.py --preload
 
     # Check status
     python3 offline_sync_manager.py --status
+
+    # Settle a row held back as a conflict
+    python3 offline_sync_manager.py --resolve TABLE ID --keep local|peer [--to URL_OR_PATH]
+
+Changes are captured by triggers into a compact changelog (delta_sync.py)
+and synced as one compressed change set per round trip - see delta_sync
+for the protocol.
 """
 
 import sqlite3
-import json
 import os
 from datetime import datetime
-from typing import List, Dict
-import hashlib
+from typing import Dict
+
+from delta_sync import DeltaSync, HttpPeer, LocalPeer
 
 
 # ============================================================================
@@ -37,7 +44,8 @@ import hashlib
 # ============================================================================
 
 LOCAL_DB = 'soulfra.db'  # Local SQLite (works offline)
-SYNC_QUEUE_DB = 'sync_queue.db'  # Queue of changes to sync
+SYNC_SERVER = os.environ.get('SOULFRA_SYNC_URL', 'https://soulfra.com/api/session/delta')  # Production exchange
+SYNC_SESSION = os.environ.get('SOULFRA_SYNC_SESSION')  # Session cookie for the server
 PRELOAD_DIR = 'preloaded_assets'  # Static assets cached locally
 COMPILE_DIR = 'compiled_sites'  # Pre-compiled sites
 
@@ -47,87 +55,48 @@ COMPILE_DIR = 'compiled_sites'  # Pre-compiled sites
 # ============================================================================
 
 def init_sync_queue():
-    """Initialize sync queue database"""
+    """Install change capture (changelog + triggers) on the local database"""
 
-    conn = sqlite3.connect(SYNC_QUEUE_DB)
-    cursor = conn.cursor()
+    db = DeltaSync(LOCAL_DB).connect()
+    db.close()
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sync_queue (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            action TEXT NOT NULL,
-            table_name TEXT NOT NULL,
-            record_id INTEGER,
-            data JSON NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            synced BOOLEAN DEFAULT 0,
-            synced_at TIMESTAMP
-        )
-    ''')
-
-    conn.commit()
-    conn.close()
+    print("✅ Change capture installed")
 
-    print("✅ Sync queue initialized")
 
-
-def queue_change(action: str, table: str, record_id: int, data: Dict):
+def queue_change(action: str, table: str, record_id: int, data: Dict = None):
     """
     Queue a change for sync
 
+    Writes to synced tables are captured by triggers; call this only for
+    changes made where they can't see them. The row itself is read at sync
+    time, so `data` is ignored and repeated changes to a row coalesce.
+
     Args:
         action: 'insert', 'update', 'delete'
         table: Table name
         record_id: Record ID
-        data: Change data
+        data: Ignored (kept for older callers)
     """
 
-    conn = sqlite3.connect(SYNC_QUEUE_DB)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        INSERT INTO sync_queue (action, table_name, record_id, data)
-        VALUES (?, ?, ?, ?)
-    ''', (action, table, record_id, json.dumps(data)))
-
-    conn.commit()
-    conn.close()
+    DeltaSync(LOCAL_DB).record(table, record_id, action)
 
     print(f"📝 Queued: {action} {table}/{record_id}")
 
 
-def get_pending_syncs() -> List[Dict]:
-    """Get all pending syncs"""
-
-    conn = sqlite3.connect(SYNC_QUEUE_DB)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    pending = cursor.execute('''
-        SELECT * FROM sync_queue
-        WHERE synced = 0
-        ORDER BY created_at ASC
-    ''').fetchall()
-
-    conn.close()
-
-    return [dict(row) for row in pending]
+def get_pending_syncs(peer: str = None) -> Dict[str, int]:
+    """Changes per table not yet acknowledged by the server"""
 
+    return DeltaSync(LOCAL_DB).pending(peer or SYNC_SERVER)
 
-def mark_synced(sync_id: int):
-    """Mark a sync as completed"""
 
-    conn = sqlite3.connect(SYNC_QUEUE_DB)
-    cursor = conn.cursor()
+def get_sync_peer(target: str = None):
+    """Server to sync with: an exchange URL or the path of a server database"""
 
-    cursor.execute('''
-        UPDATE sync_queue
-        SET synced = 1, synced_at = ?
-        WHERE id = ?
-    ''', (datetime.now().isoformat(), sync_id))
-
-    conn.commit()
-    conn.close()
+    target = target or SYNC_SERVER
+    if target.startswith(('http://', 'https://')):
+        headers = {'Cookie': f'session={SYNC_SESSION}'} if SYNC_SESSION else None
+        return HttpPeer(target, headers=headers)
+    return LocalPeer(target)
 
 
 # ============================================================================
@@ -228,22 +197,17 @@ def compile_professional_sites():
 
     for prof_id, business_name, subdomain in professionals:
         # Generate site HTML
-        from template_generator import generate_professional_site
+        from template_generator import generate_professional_site, write_site
 
         try:
             site_html = generate_professional_site(prof_id)
 
-            # Save to compile dir
+            # Save to compile dir (unchanged pages are left alone)
             site_dir = os.path.join(COMPILE_DIR, subdomain or str(prof_id))
             os.makedirs(site_dir, exist_ok=True)
+            written = write_site(site_html, site_dir)
 
-            for page_name, html_content in site_html.items():
-                file_path = os.path.join(site_dir, f"{page_name}.html")
-
-                with open(file_path, 'w') as f:
-                    f.write(html_content)
-
-            print(f"✅ Compiled: {business_name} ({subdomain or prof_id})")
+            print(f"✅ Compiled: {business_name} ({subdomain or prof_id}) - {written} files written")
 
         except Exception as e:
             print(f"❌ Failed: {business_name} - {e}")
@@ -255,46 +219,44 @@ def compile_professional_sites():
 # Syncing
 # ============================================================================
 
-def sync_to_production():
+def sync_to_production(target: str = None) -> Dict:
     """
-    Sync queued changes to production
+    Sync captured changes with production
+
+    One round trip per DeltaSync limit changes: local changes go up, server
+    changes since the last sync come back. Safe to re-run after a failure.
 
     Requires online connection
     """
 
     if is_offline_mode():
         print("⚠️  Still in offline mode. Remove .offline_mode file to sync.")
-        return
-
-    pending = get_pending_syncs()
+        return {}
 
-    if not pending:
-        print("✅ No changes to sync")
-        return
+    peer = get_sync_peer(target)
+    pending = sum(DeltaSync(LOCAL_DB).pending(peer.name).values())
 
-    print(f"🔄 Syncing {len(pending)} changes...\n")
+    print(f"🔄 Syncing {pending} changes with {peer.name}...\n")
 
-    for sync in pending:
-        action = sync['action']
-        table = sync['table_name']
-        record_id = sync['record_id']
-        data = json.loads(sync['data'])
+    result = DeltaSync(LOCAL_DB).sync(peer)
 
-        print(f"   {action} {table}/{record_id}")
+    for conflict in result['conflicts']:
+        print(f"   ⚠️  Conflict: {conflict['op']} {conflict['table']}/{conflict['id']} ({conflict['reason']})")
+    if result['conflicts']:
+        print("   Held until resolved: python3 offline_sync_manager.py --resolve TABLE ID --keep local|peer")
 
-        # TODO: Implement actual sync to production
-        # This would use API calls or database connection to production
+    print(f"\n✅ Sent {result['sent']}, received {result['received']} changes "
+          f"in {result['round_trips']} round trip(s), "
+          f"{result['bytes_sent'] + result['bytes_received']:,} bytes")
 
-        # For now, mark as synced
-        mark_synced(sync['id'])
-
-    print(f"\n✅ Synced {len(pending)} changes")
+    return result
 
 
 def check_sync_status():
     """Check sync status"""
 
-    pending_count = len(get_pending_syncs())
+    pending = get_pending_syncs()
+    pending_count = sum(pending.values())
 
     if is_offline_mode():
         print("🔌 Offline mode: ACTIVE")
@@ -302,11 +264,28 @@ def check_sync_status():
         print("🌐 Online mode: ACTIVE")
 
     print(f"📊 Pending syncs: {pending_count}")
+    for table, count in pending.items():
+        print(f"   {table}: {count}")
+
+    conflicts = DeltaSync(LOCAL_DB).conflicts(SYNC_SERVER)
+    if conflicts:
+        print(f"⚠️  Held conflicts: {len(conflicts)}")
+        for conflict in conflicts:
+            print(f"   {conflict['table']}/{conflict['id']} ({conflict['reason'] or 'changed on server'})")
 
     if pending_count > 0:
         print("\n   Run: python3 offline_sync_manager.py --sync")
 
 
+def resolve_conflict(table: str, record_id: int, keep: str, target: str = None):
+    """Settle a held row: keep 'local' (sent on the next sync) or take the server's 'peer' version"""
+
+    peer = get_sync_peer(target)
+    DeltaSync(LOCAL_DB).resolve_conflict(peer.name, table, record_id, keep=keep)
+
+    print(f"✅ {table}/{record_id}: kept {keep} version")
+
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
@@ -318,7 +297,14 @@ if __name__ == '__main__':
         enable_offline_mode()
 
     elif '--sync' in sys.argv:
-        sync_to_production()
+        target = sys.argv[sys.argv.index('--to') + 1] if '--to' in sys.argv else None
+        sync_to_production(target)
+
+    elif '--resolve' in sys.argv:
+        index = sys.argv.index('--resolve')
+        keep = sys.argv[sys.argv.index('--keep') + 1] if '--keep' in sys.argv else 'peer'
+        target = sys.argv[sys.argv.index('--to') + 1] if '--to' in sys.argv else None
+        resolve_conflict(sys.argv[index + 1], int(sys.argv[index + 2]), keep, target)
 
     elif '--preload' in sys.argv:
         preload_static_assets()
@@ -342,9 +328,11 @@ if __name__ == '__main__':
 Usage:
     python3 offline_sync_manager.py --work-offline    # Enable offline mode
     python3 offline_sync_manager.py --sync            # Sync to production
+    python3 offline_sync_manager.py --sync --to PATH  # Sync with a server database file
     python3 offline_sync_manager.py --preload         # Preload assets
     python3 offline_sync_manager.py --compile         # Compile sites
     python3 offline_sync_manager.py --status          # Check status
+    python3 offline_sync_manager.py --resolve posts 12 --keep local   # Settle a conflict
 
 Workflow:
     1. Enable offline mode: --work-offline
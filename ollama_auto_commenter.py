@@ -18,11 +18,11 @@ Usage:
         post_id=42
     )
 
-    # Generate comments for all selected AIs
-    from brand_ai_orchestrator import orchestrate_brand_comments
-    selected = orchestrate_brand_comments(post_id=42)
-    for brand in selected:
-        generate_ai_comment(brand['brand_slug'], post_id=42)
+    # Generate comments for all selected AIs (concurrently, post evaluated once)
+    comment_ids = generate_comments_for_post(post_id=42)
+
+    # Every post without AI comments yet
+    python3 ollama_auto_commenter.py backlog --concurrency 4
 """
 
 import urllib.request
@@ -32,6 +32,7 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from database import get_db
 from brand_ai_persona_generator import get_brand_ai_persona_config
+from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
 
 
 # ==============================================================================
@@ -40,6 +41,7 @@ from brand_ai_persona_generator import get_brand_ai_persona_config
 
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "llama3.2:3b"  # Fast, lightweight model for comments
+GENERATION_CONCURRENCY = 4    # Persona comments in flight at once (match OLLAMA_NUM_PARALLEL)
 
 
 # ==============================================================================
@@ -91,26 +93,24 @@ def call_ollama_api(system_prompt: str, user_prompt: str, model: str = OLLAMA_MO
 # COMMENT GENERATION
 # ==============================================================================
 
-def build_comment_prompt(post_title: str, post_content: str, brand_name: str) -> str:
+def build_post_context(post_title: str, post_content: str) -> str:
     """
-    Build the prompt for generating a comment
+    Shared part of every persona's prompt for a post
 
-    Args:
-        post_title: Post title
-        post_content: Post content
-        brand_name: AI persona brand name
-
-    Returns:
-        Formatted prompt for Ollama
+    Evaluated once per post by the generation orchestrator and reused
+    (as Ollama context) by each persona's comment.
     """
-    prompt = f"""You are commenting on this post:
+    return f"""You are commenting on this post:
 
 Title: {post_title}
 
 Content:
-{post_content[:500]}{"..." if len(post_content) > 500 else ""}
+{post_content[:500]}{"..." if len(post_content) > 500 else ""}"""
 
-Generate a thoughtful comment from the perspective of {brand_name}. Your comment should:
+
+def build_comment_instructions(brand_name: str) -> str:
+    """Persona-specific part of the comment prompt"""
+    return f"""Generate a thoughtful comment from the perspective of {brand_name}. Your comment should:
 1. Be 2-3 paragraphs (150-250 words)
 2. Stay true to your personality and tone
 3. Provide constructive feedback or ask thoughtful questions
@@ -122,7 +122,75 @@ Do not include any preamble like "Here's my comment:" - just write the comment d
 
 Comment:"""
 
-    return prompt
+
+def build_comment_prompt(post_title: str, post_content: str, brand_name: str) -> str:
+    """
+    Build the prompt for generating a comment
+
+    Args:
+        post_title: Post title
+        post_content: Post content
+        brand_name: AI persona brand name
+
+    Returns:
+        Formatted prompt for Ollama
+    """
+    return f"{build_post_context(post_title, post_content)}\n\n{build_comment_instructions(brand_name)}"
+
+
+def clean_comment_text(generated_text: str) -> Optional[str]:
+    """
+    Post-process a generated comment
+
+    Strips AI preambles and trims to the last sentence before 1000 chars.
+
+    Returns:
+        Comment text, or None if too short to post
+    """
+    comment_text = generated_text.strip()
+
+    # Remove common AI preambles if present
+    preambles_to_remove = [
+        "Here's my comment:",
+        "Here is my comment:",
+        "Comment:",
+        "My comment:",
+        "Here's what I think:"
+    ]
+
+    for preamble in preambles_to_remove:
+        if comment_text.startswith(preamble):
+            comment_text = comment_text[len(preamble):].strip()
+
+    # Ensure reasonable length
+    if len(comment_text) < 50:
+        print(f"❌ Generated comment too short ({len(comment_text)} chars)")
+        return None
+
+    if len(comment_text) > 1000:
+        # Truncate to last complete sentence before 1000 chars
+        comment_text = comment_text[:1000]
+        last_period = comment_text.rfind('.')
+        if last_period > 500:  # Don't truncate too aggressively
+            comment_text = comment_text[:last_period + 1]
+
+    return comment_text
+
+
+def save_ai_comment(db, post_id: int, user_id: int, comment_text: str) -> int:
+    """Insert an AI comment and return its ID"""
+    cursor = db.execute('''
+        INSERT INTO comments (post_id, user_id, content, created_at)
+        VALUES (?, ?, ?, ?)
+    ''', (
+        post_id,
+        user_id,
+        comment_text,
+        datetime.now().isoformat()
+    ))
+
+    db.commit()
+    return cursor.lastrowid
 
 
 def generate_ai_comment(brand_slug: str, post_id: int, dry_run: bool = False) -> Optional[int]:
@@ -196,34 +264,11 @@ def generate_ai_comment(brand_slug: str, post_id: int, dry_run: bool = False) ->
         return None
 
     # Post-process comment
-    comment_text = generated_text.strip()
-
-    # Remove common AI preambles if present
-    preambles_to_remove = [
-        "Here's my comment:",
-        "Here is my comment:",
-        "Comment:",
-        "My comment:",
-        "Here's what I think:"
-    ]
-
-    for preamble in preambles_to_remove:
-        if comment_text.startswith(preamble):
-            comment_text = comment_text[len(preamble):].strip()
-
-    # Ensure reasonable length
-    if len(comment_text) < 50:
+    comment_text = clean_comment_text(generated_text)
+    if not comment_text:
         db.close()
-        print(f"❌ Generated comment too short ({len(comment_text)} chars)")
         return None
 
-    if len(comment_text) > 1000:
-        # Truncate to last complete sentence before 1000 chars
-        comment_text = comment_text[:1000]
-        last_period = comment_text.rfind('.')
-        if last_period > 500:  # Don't truncate too aggressively
-            comment_text = comment_text[:last_period + 1]
-
     # Print preview
     preview = comment_text[:100] + "..." if len(comment_text) > 100 else comment_text
     print(f"✅ Generated comment ({len(comment_text)} chars): {preview}")
@@ -240,18 +285,7 @@ def generate_ai_comment(brand_slug: str, post_id: int, dry_run: bool = False) ->
         return None
 
     # Store comment in database
-    db.execute('''
-        INSERT INTO comments (post_id, user_id, content, created_at)
-        VALUES (?, ?, ?, ?)
-    ''', (
-        post_id,
-        persona['user_id'],
-        comment_text,
-        datetime.now().isoformat()
-    ))
-
-    db.commit()
-    comment_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
+    comment_id = save_ai_comment(db, post_id, persona['user_id'], comment_text)
 
     db.close()
 
@@ -260,21 +294,103 @@ def generate_ai_comment(brand_slug: str, post_id: int, dry_run: bool = False) ->
     return comment_id
 
 
-def generate_comments_for_post(post_id: int, dry_run: bool = False) -> List[int]:
+# ==============================================================================
+# BATCHED GENERATION
+# ==============================================================================
+
+def build_comment_item(post_id: int, brand_slugs: List[str],
+                       personas: Dict[str, Dict]) -> Optional[GenerationItem]:
+    """
+    One post's shared context plus a comment job per persona
+
+    Personas that already commented on the post are skipped. Loaded
+    persona configs are cached in `personas` (by brand slug) so results
+    can be saved as they stream in.
+    """
+    db = get_db()
+    post = db.execute('''
+        SELECT id, title, content FROM posts WHERE id = ?
+    ''', (post_id,)).fetchone()
+
+    if not post:
+        db.close()
+        print(f"❌ Post {post_id} not found")
+        return None
+
+    jobs = []
+    for brand_slug in brand_slugs:
+        if brand_slug not in personas:
+            personas[brand_slug] = get_brand_ai_persona_config(brand_slug)
+        persona = personas[brand_slug]
+        if not persona:
+            print(f"❌ AI persona '{brand_slug}' not found")
+            continue
+
+        existing = db.execute('''
+            SELECT id FROM comments
+            WHERE post_id = ? AND user_id = ?
+        ''', (post_id, persona['user_id'])).fetchone()
+        if existing:
+            print(f"⚠️  {persona['display_name']} has already commented on post {post_id}")
+            continue
+
+        jobs.append(GenerationJob(key=brand_slug, system=persona['system_prompt'],
+                                  prompt=build_comment_instructions(persona['brand_name'])))
+
+    db.close()
+    return GenerationItem(key=post_id, prefix=build_post_context(post['title'], post['content']), jobs=jobs)
+
+
+def _comment_saver(personas: Dict[str, Dict], comment_ids: List[int], dry_run: bool):
+    """on_result callback: clean each finished comment and insert it immediately"""
+    db = get_db()
+
+    def save(result):
+        persona = personas[result.job_key]
+        if not result.ok or not result.text:
+            print(f"❌ Failed to generate comment from {persona['display_name']}: {result.error or 'empty'}")
+            return
+
+        comment_text = clean_comment_text(result.text)
+        if not comment_text:
+            return
+
+        preview = comment_text[:100] + "..." if len(comment_text) > 100 else comment_text
+        print(f"✅ {persona['emoji']} {persona['display_name']} on post {result.item_key} "
+              f"({len(comment_text)} chars, {result.seconds:.1f}s, "
+              f"{result.tokens_per_sec:.1f} tok/s): {preview}")
+
+        if dry_run:
+            return
+        comment_ids.append(save_ai_comment(db, result.item_key, persona['user_id'], comment_text))
+
+    return db, save
+
+
+def _report_post(item: GenerationItem, engine: GenerationOrchestrator):
+    stats = engine.items[item.key]
+    print(f"⏱️  Post {item.key}: {stats['jobs']} persona(s) in {stats['seconds']:.2f}s, "
+          f"{stats['tokens_per_sec']} tokens/sec")
+
+
+def generate_comments_for_post(post_id: int, dry_run: bool = False,
+                               concurrency: int = GENERATION_CONCURRENCY) -> List[int]:
     """
     Generate AI comments for a post using orchestration
 
     Args:
         post_id: Post ID
         dry_run: If True, generate but don't post
+        concurrency: Persona comments generated at once
 
     Returns:
         List of comment IDs
 
     Process:
     1. Use orchestrator to select which AIs should comment
-    2. Generate comment from each selected AI
-    3. Return list of comment IDs
+    2. Evaluate the post once, then generate every selected AI's comment
+       concurrently on top of it
+    3. Save each comment as soon as it is generated
     """
     from brand_ai_orchestrator import orchestrate_brand_comments
 
@@ -296,20 +412,19 @@ def generate_comments_for_post(post_id: int, dry_run: bool = False) -> List[int]
         print(f"   {i}. {brand['brand_name']} (relevance={brand['relevance']:.2f})")
     print()
 
+    personas = {}
+    item = build_comment_item(post_id, [brand['brand_slug'] for brand in selected_brands], personas)
+    if not item or not item.jobs:
+        return []
+
     # Generate comments
     comment_ids = []
-
-    for brand_info in selected_brands:
-        comment_id = generate_ai_comment(
-            brand_slug=brand_info['brand_slug'],
-            post_id=post_id,
-            dry_run=dry_run
-        )
-
-        if comment_id:
-            comment_ids.append(comment_id)
-
-        print()  # Spacing
+    engine = GenerationOrchestrator(OLLAMA_API_URL, model=OLLAMA_MODEL, concurrency=concurrency)
+    db, save = _comment_saver(personas, comment_ids, dry_run)
+    try:
+        engine.run([item], on_result=save, on_item=lambda item, results: _report_post(item, engine))
+    finally:
+        db.close()
 
     print("=" * 70)
     print(f"✅ Generated {len(comment_ids)} comment(s)")
@@ -319,6 +434,67 @@ def generate_comments_for_post(post_id: int, dry_run: bool = False) -> List[int]
     return comment_ids
 
 
+def get_uncommented_post_ids(limit: Optional[int] = None) -> List[int]:
+    """Posts no AI persona has commented on yet, oldest first"""
+    db = get_db()
+    rows = db.execute('''
+        SELECT p.id FROM posts p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM comments c
+            JOIN users u ON u.id = c.user_id
+            WHERE c.post_id = p.id AND u.is_ai_persona = 1
+        )
+        ORDER BY p.id ASC
+        LIMIT ?
+    ''', (limit if limit else -1,)).fetchall()
+    db.close()
+    return [row['id'] for row in rows]
+
+
+def comment_backlog(limit: Optional[int] = None, concurrency: int = GENERATION_CONCURRENCY,
+                    dry_run: bool = False) -> Dict:
+    """
+    Work through every post without AI comments
+
+    Posts are orchestrated lazily as generation slots free up, with at most
+    `concurrency` generations in flight across all posts.
+
+    Returns:
+        {'posts', 'comments', 'comment_ids', 'stats', 'per_post'}
+    """
+    from brand_ai_orchestrator import orchestrate_brand_comments
+
+    post_ids = get_uncommented_post_ids(limit)
+    print(f"🗂️  {len(post_ids)} post(s) without AI comments")
+
+    personas = {}
+
+    def items():
+        for post_id in post_ids:
+            selected = orchestrate_brand_comments(post_id, dry_run=False)
+            if selected:
+                item = build_comment_item(post_id, [brand['brand_slug'] for brand in selected], personas)
+                if item:
+                    yield item
+
+    comment_ids = []
+    engine = GenerationOrchestrator(OLLAMA_API_URL, model=OLLAMA_MODEL, concurrency=concurrency)
+    db, save = _comment_saver(personas, comment_ids, dry_run)
+    try:
+        engine.run(items(), on_result=save, on_item=lambda item, results: _report_post(item, engine))
+    finally:
+        db.close()
+
+    print(engine.report())
+    return {
+        'posts': len(engine.items),
+        'comments': len(comment_ids),
+        'comment_ids': comment_ids,
+        'stats': dict(engine.stats),
+        'per_post': dict(engine.items),
+    }
+
+
 # ==============================================================================
 # CLI
 # ==============================================================================
@@ -331,6 +507,7 @@ def main():
         print("Usage:")
         print("  python3 ollama_auto_commenter.py comment <brand_slug> <post_id> [--dry-run]")
         print("  python3 ollama_auto_commenter.py auto <post_id> [--dry-run]")
+        print("  python3 ollama_auto_commenter.py backlog [--limit N] [--concurrency N] [--dry-run]")
         print()
         print("Examples:")
         print("  python3 ollama_auto_commenter.py comment ocean-dreams 42")
@@ -377,6 +554,16 @@ def main():
             print()
             print("⚠️  No comments generated")
 
+    elif command == 'backlog':
+        def flag(name, default=None):
+            return int(sys.argv[sys.argv.index(name) + 1]) if name in sys.argv else default
+
+        result = comment_backlog(limit=flag('--limit'),
+                                 concurrency=flag('--concurrency', GENERATION_CONCURRENCY),
+                                 dry_run='--dry-run' in sys.argv)
+        print()
+        print(f"✅ {result['comments']} comment(s) on {result['posts']} post(s)")
+
     else:
         print(f"Unknown command: {command}")
 
@@ -11,6 +11,8 @@ import json
 from typing import Dict, Optional, List, Any
 from pathlib import Path
 
+from llm_stream import LLMStream
+
 OLLAMA_BASE_URL = 'http://127.0.0.1:11434'
 
 class OllamaClient:
@@ -71,45 +73,12 @@ class OllamaClient:
             - time_ms: int
         """
 
-        # Build full prompt with context
-        full_prompt = prompt
-
-        # Add file context if provided
-        if context_files:
-            context_parts = []
-            for file_path in context_files:
-                try:
-                    path = Path(file_path)
-                    if path.exists():
-                        content = path.read_text()
-                        context_parts.append(f"\n--- File: {file_path} ---\n{content}\n")
-                except Exception as e:
-                    context_parts.append(f"\n--- Error reading {file_path}: {e} ---\n")
-
-            if context_parts:
-                full_prompt = "".join(context_parts) + "\n\nUser question:\n" + prompt
-
-        # Build system prompt
-        if not system_prompt:
-            system_prompt = "You are a helpful AI assistant. You can see file contents provided as context."
-
-        # Build final prompt
-        final_prompt = f"{system_prompt}\n\nUser: {full_prompt}\n\nAssistant:"
+        payload = self._payload(prompt, model, system_prompt, temperature, max_tokens, context_files)
 
         try:
             response = requests.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": final_prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": max(0.1, min(2.0, temperature)),
-                        "num_predict": max_tokens,
-                        "top_p": 0.9,
-                        "top_k": 40
-                    }
-                },
+                json=payload,
                 timeout=timeout
             )
 
@@ -145,6 +114,76 @@ class OllamaClient:
                 'response': ''
             }
 
+    def _payload(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        context_files: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Build the /api/generate request body (stream: False)"""
+        # Build full prompt with context
+        full_prompt = prompt
+
+        # Add file context if provided
+        if context_files:
+            context_parts = []
+            for file_path in context_files:
+                try:
+                    path = Path(file_path)
+                    if path.exists():
+                        content = path.read_text()
+                        context_parts.append(f"\n--- File: {file_path} ---\n{content}\n")
+                except Exception as e:
+                    context_parts.append(f"\n--- Error reading {file_path}: {e} ---\n")
+
+            if context_parts:
+                full_prompt = "".join(context_parts) + "\n\nUser question:\n" + prompt
+
+        # Build system prompt
+        if not system_prompt:
+            system_prompt = "You are a helpful AI assistant. You can see file contents provided as context."
+
+        # Build final prompt
+        final_prompt = f"{system_prompt}\n\nUser: {full_prompt}\n\nAssistant:"
+
+        return {
+            "model": model,
+            "prompt": final_prompt,
+            "stream": False,
+            "options": {
+                "temperature": max(0.1, min(2.0, temperature)),
+                "num_predict": max_tokens,
+                "top_p": 0.9,
+                "top_k": 40
+            }
+        }
+
+    def generate_stream(
+        self,
+        prompt: str,
+        model: str = 'llama3.2',
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        context_files: Optional[List[str]] = None,
+        timeout: int = 60
+    ) -> LLMStream:
+        """
+        Streaming version of generate()
+
+        Returns:
+            LLMStream - iterate for text chunks; .summary() has
+            ttft_ms, total_ms and token counts
+
+        Raises:
+            urllib.error.URLError: Ollama not reachable or model missing
+        """
+        payload = self._payload(prompt, model, system_prompt, temperature, max_tokens, context_files)
+        return LLMStream.generate(payload, ollama_url=self.base_url, timeout=timeout)
+
     def generate_with_template_context(
         self,
         prompt: str,
@@ -25,6 +25,7 @@ import urllib.error
 from datetime import datetime
 from typing import List
 from database import get_db
+from full_text_search import search as full_text_search
 
 
 # AI Persona definitions
@@ -264,24 +265,16 @@ User Question: {prompt}"""
         db = get_db()
 
         # Search posts for topic
-        posts = db.execute('''
-            SELECT id, title, content
-            FROM posts
-            WHERE title LIKE ? OR content LIKE ?
-            ORDER BY published_at DESC
-            LIMIT 5
-        ''', (f'%{topic}%', f'%{topic}%')).fetchall()
+        posts = full_text_search('posts', topic, limit=5,
+                                 select='t.id, t.title, t.content', db=db)
 
         # Search comments for topic
-        comments = db.execute('''
-            SELECT c.content, p.title as post_title, u.display_name
-            FROM comments c
-            JOIN posts p ON c.post_id = p.id
-            JOIN users u ON c.user_id = u.id
-            WHERE c.content LIKE ?
-            ORDER BY c.created_at DESC
-            LIMIT 5
-        ''', (f'%{topic}%',)).fetchall()
+        comments = full_text_search(
+            'comments', topic, limit=5,
+            select='t.content, p.title as post_title, u.display_name',
+            join='JOIN posts p ON t.post_id = p.id JOIN users u ON t.user_id = u.id',
+            db=db
+        )
 
         db.close()
 
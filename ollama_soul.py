@@ -4,18 +4,8 @@ Ollama Soul Integration - All Ollama calls go through soul document
 import requests
 from soul_document_routes import load_soul_document_for_ollama
 
-def ask_ollama_with_soul(user_prompt, model='llama3.2:latest', use_soul=True):
-    """
-    Ask Ollama with soul document personality injected
-
-    Args:
-        user_prompt: User's question/input
-        model: Ollama model to use
-        use_soul: Whether to inject soul document (default True)
-
-    Returns:
-        AI response as string
-    """
+def _soul_prompt(user_prompt, use_soul=True):
+    """Wrap a prompt in the soul document principles"""
     # Load soul document
     soul_doc = ""
     if use_soul:
@@ -42,6 +32,23 @@ User question: {user_prompt}
     else:
         system_prompt = user_prompt
 
+    return system_prompt
+
+
+def ask_ollama_with_soul(user_prompt, model='llama3.2:latest', use_soul=True):
+    """
+    Ask Ollama with soul document personality injected
+
+    Args:
+        user_prompt: User's question/input
+        model: Ollama model to use
+        use_soul: Whether to inject soul document (default True)
+
+    Returns:
+        AI response as string
+    """
+    system_prompt = _soul_prompt(user_prompt, use_soul)
+
     # Call Ollama with auto-fallback
     try:
         # ✅ FIXED: Use smart client with auto-fallback (localhost → remote → mock)
@@ -51,6 +58,28 @@ User question: {user_prompt}
         print(f"Ollama request failed: {e}")
         return ''
 
+def stream_ollama_with_soul(user_prompt, model='llama3.2:latest', use_soul=True):
+    """
+    Streaming version of ask_ollama_with_soul()
+
+    Returns:
+        LLMStream of the response, or None if no Ollama endpoint is
+        reachable (fall back to ask_ollama_with_soul for the mock reply)
+    """
+    from ollama_smart_client import get_ollama_endpoint
+    from llm_stream import LLMStream
+
+    endpoint = get_ollama_endpoint()
+    if endpoint is None:
+        return None
+
+    try:
+        return LLMStream.generate({'model': model, 'prompt': _soul_prompt(user_prompt, use_soul)},
+                                  ollama_url=endpoint, timeout=120)
+    except OSError as e:
+        print(f"Ollama stream failed: {e}")
+        return None
+
 def ask_ollama_simple(prompt, model='llama3.2:latest'):
     """
     Simple Ollama call WITHOUT soul document
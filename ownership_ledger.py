@@ -14,12 +14,20 @@ Database schema:
 - domain_ownership: Ownership percentages per user per domain
 - ownership_history: Audit trail of ownership changes
 - github_profiles: Cached GitHub data for tier calculation
+- ownership_dirty: Users whose stars/posts/referrals changed since the last run
+
+Batch recalculation:
+    python ownership_ledger.py --recalculate   # every user × domain, one transaction
+    python ownership_ledger.py --events        # only users queued by triggers
 """
 
 import sqlite3
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 from database import get_db
+from schema_registry import register_migration
 
 
 # ==============================================================================
@@ -167,14 +175,20 @@ def get_base_tier_percentage(tier: int) -> float:
     Tier 3: 10%
     Tier 4: 25%
     """
-    tier_base = {
-        0: 0.0,
-        1: 5.0,
-        2: 7.0,
-        3: 10.0,
-        4: 25.0
-    }
-    return tier_base.get(tier, 0.0)
+    return TIER_BASE_PERCENTAGE.get(tier, 0.0)
+
+
+TIER_BASE_PERCENTAGE = {
+    0: 0.0,
+    1: 5.0,
+    2: 7.0,
+    3: 10.0,
+    4: 25.0
+}
+STAR_BONUS = 0.5
+POST_BONUS = 0.2
+REFERRAL_BONUS = 1.0
+MAX_OWNERSHIP = 50.0
 
 
 # ==============================================================================
@@ -331,6 +345,275 @@ def update_ownership(user_id: int, domain_id: int, reason: str = "recalculation"
     return new_percentage
 
 
+# ==============================================================================
+# BATCH RECALCULATION
+# ==============================================================================
+#
+# Recomputes every (user, domain) pair in scope with grouped queries instead of
+# three lookups per pair, then writes only the rows whose values changed (plus
+# one ownership_history entry per changed percentage) in a single transaction.
+#
+# Incremental mode: triggers on posts, referrals, github_profiles and
+# user_domains queue the affected user in ownership_dirty; process_ownership_events()
+# recalculates just those users.
+
+OWNERSHIP_ENGINE_SCHEMA = [
+    # calculate_ownership() counts posts per domain
+    'ALTER TABLE posts ADD COLUMN domain_id INTEGER',
+    'CREATE INDEX IF NOT EXISTS idx_posts_user_domain ON posts(user_id, domain_id)',
+    '''
+    CREATE TABLE IF NOT EXISTS ownership_dirty (
+        user_id INTEGER PRIMARY KEY,
+        reason TEXT,
+        queued_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_post_insert AFTER INSERT ON posts
+    WHEN NEW.domain_id IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.user_id, 'post');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_post_delete AFTER DELETE ON posts
+    WHEN OLD.domain_id IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (OLD.user_id, 'post_deleted');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_post_move AFTER UPDATE OF domain_id, user_id ON posts
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (OLD.user_id, 'post_moved');
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.user_id, 'post_moved');
+    END
+    ''',
+    # Tables below come from init_ownership_tables(); pending until it has run
+    'CREATE INDEX IF NOT EXISTS idx_referrals_referrer ON referrals(referrer_user_id)',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_referral AFTER INSERT ON referrals
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.referrer_user_id, 'referral');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_github_insert AFTER INSERT ON github_profiles
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.user_id, 'github');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_github_update AFTER UPDATE OF tier, total_stars ON github_profiles
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.user_id, 'star');
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS ownership_dirty_unlock AFTER INSERT ON user_domains
+    BEGIN
+        INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (NEW.user_id, 'domain_unlocked');
+    END
+    ''',
+]
+register_migration(111, 'ownership recalculation queue', *OWNERSHIP_ENGINE_SCHEMA, module='ownership_ledger')
+
+_SCOPE_TABLE = '''
+    CREATE TEMP TABLE IF NOT EXISTS ownership_scope (user_id INTEGER PRIMARY KEY)
+'''
+_CALC_TABLE = '''
+    CREATE TEMP TABLE IF NOT EXISTS ownership_calc (
+        user_id INTEGER NOT NULL,
+        domain_id INTEGER NOT NULL,
+        ownership_percentage REAL,
+        base_tier_percentage REAL,
+        stars_bonus REAL,
+        posts_bonus REAL,
+        referrals_bonus REAL,
+        PRIMARY KEY (user_id, domain_id)
+    ) WITHOUT ROWID
+'''
+
+
+def _calc_sql(scoped: bool) -> str:
+    """Ownership formula for every pair in scope, as one grouped query"""
+    scope = 'WHERE user_id IN (SELECT user_id FROM ownership_scope)' if scoped else ''
+    and_scope = scope.replace('WHERE', 'AND')
+    base_case = ' '.join(f'WHEN {tier} THEN {pct}' for tier, pct in TIER_BASE_PERCENTAGE.items())
+    return f'''
+        INSERT INTO ownership_calc
+        WITH pairs AS (
+            SELECT user_id, domain_id FROM user_domains {scope}
+            UNION
+            SELECT user_id, domain_id FROM domain_ownership {scope}
+        ),
+        post_counts AS (
+            SELECT user_id, domain_id, COUNT(*) AS n FROM posts
+            WHERE domain_id IS NOT NULL {and_scope}
+            GROUP BY user_id, domain_id
+        ),
+        referral_counts AS (
+            SELECT referrer_user_id AS user_id, COUNT(*) AS n FROM referrals
+            {scope.replace('user_id IN', 'referrer_user_id IN')}
+            GROUP BY referrer_user_id
+        ),
+        parts AS (
+            SELECT p.user_id, p.domain_id, g.user_id IS NOT NULL AS has_github,
+                   CASE COALESCE(g.tier, 0) {base_case} ELSE 0.0 END AS base,
+                   COALESCE(g.total_stars, 0) * {STAR_BONUS} AS stars_bonus,
+                   COALESCE(pc.n, 0) * {POST_BONUS} AS posts_bonus,
+                   COALESCE(rc.n, 0) * {REFERRAL_BONUS} AS referrals_bonus
+            FROM pairs p
+            LEFT JOIN github_profiles g ON g.user_id = p.user_id
+            LEFT JOIN post_counts pc ON pc.user_id = p.user_id AND pc.domain_id = p.domain_id
+            LEFT JOIN referral_counts rc ON rc.user_id = p.user_id
+        )
+        SELECT user_id, domain_id,
+               CASE WHEN has_github
+                    THEN MIN(base + stars_bonus + posts_bonus + referrals_bonus, {MAX_OWNERSHIP})
+                    ELSE 0.0 END,
+               base, stars_bonus, posts_bonus, referrals_bonus
+        FROM parts
+    '''
+
+
+_CHANGED = '''
+    FROM ownership_calc c
+    LEFT JOIN domain_ownership o ON o.user_id = c.user_id AND o.domain_id = c.domain_id
+    WHERE o.id IS NULL
+       OR o.ownership_percentage IS NOT c.ownership_percentage
+       OR o.base_tier_percentage IS NOT c.base_tier_percentage
+       OR o.stars_bonus IS NOT c.stars_bonus
+       OR o.posts_bonus IS NOT c.posts_bonus
+       OR o.referrals_bonus IS NOT c.referrals_bonus
+'''
+
+
+def recalculate_ownership(user_ids: Optional[Iterable[int]] = None,
+                          reason: str = "batch_recalculation", db=None) -> Dict:
+    """
+    Recalculate ownership for every (user, domain) pair - all users, or just
+    user_ids - in one transaction
+
+    Pairs are the user's unlocked domains plus any existing ownership rows.
+    Results match update_ownership() pair for pair, but unchanged rows are
+    not rewritten and history is only recorded when a percentage moves.
+
+    Returns:
+        {'pairs': 500000, 'changed': 1200, 'history': 800, 'seconds': 2.1}
+    """
+    start = time.perf_counter()
+    own_connection = db is None
+    conn = db or get_db()
+
+    try:
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        conn.execute(_SCOPE_TABLE)
+        conn.execute(_CALC_TABLE)
+        conn.execute('DELETE FROM ownership_scope')
+        conn.execute('DELETE FROM ownership_calc')
+
+        scoped = user_ids is not None
+        if scoped:
+            conn.executemany('INSERT OR IGNORE INTO ownership_scope (user_id) VALUES (?)',
+                             ((user_id,) for user_id in user_ids))
+        result = _apply_recalculation(conn, scoped, reason)
+
+        if scoped:
+            conn.execute('DELETE FROM ownership_dirty WHERE user_id IN (SELECT user_id FROM ownership_scope)')
+        else:
+            conn.execute('DELETE FROM ownership_dirty')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def process_ownership_events(limit: Optional[int] = None, db=None) -> Dict:
+    """
+    Incremental mode: recalculate only users queued by new stars, posts,
+    referrals or unlocks since the last run
+    """
+    start = time.perf_counter()
+    own_connection = db is None
+    conn = db or get_db()
+
+    try:
+        if not conn.in_transaction:
+            conn.execute('BEGIN IMMEDIATE')
+        conn.execute(_SCOPE_TABLE)
+        conn.execute(_CALC_TABLE)
+        conn.execute('DELETE FROM ownership_scope')
+        conn.execute('DELETE FROM ownership_calc')
+        conn.execute(
+            'INSERT INTO ownership_scope (user_id) SELECT user_id FROM ownership_dirty ORDER BY queued_at LIMIT ?',
+            (-1 if limit is None else limit,)
+        )
+        users = conn.execute('SELECT COUNT(*) FROM ownership_scope').fetchone()[0]
+        result = _apply_recalculation(conn, True, 'event') if users else {'pairs': 0, 'changed': 0, 'history': 0}
+        conn.execute('DELETE FROM ownership_dirty WHERE user_id IN (SELECT user_id FROM ownership_scope)')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_connection:
+            conn.close()
+
+    result['users'] = users
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def record_ownership_event(user_id: int, reason: str, db=None):
+    """Queue a user for the next incremental run (for changes made outside the tracked tables)"""
+    own_connection = db is None
+    conn = db or get_db()
+    conn.execute('INSERT OR REPLACE INTO ownership_dirty (user_id, reason) VALUES (?, ?)', (user_id, reason))
+    if own_connection:
+        conn.commit()
+        conn.close()
+
+
+def _apply_recalculation(conn, scoped: bool, reason: str) -> Dict:
+    conn.execute(_calc_sql(scoped))
+    pairs = conn.execute('SELECT COUNT(*) FROM ownership_calc').fetchone()[0]
+
+    history = conn.execute(f'''
+        INSERT INTO ownership_history (user_id, domain_id, old_percentage, new_percentage, change_reason)
+        SELECT c.user_id, c.domain_id, COALESCE(o.ownership_percentage, 0.0), c.ownership_percentage, ?
+        {_CHANGED} AND (o.id IS NULL OR o.ownership_percentage IS NOT c.ownership_percentage)
+    ''', (reason,)).rowcount
+
+    changed = conn.execute(f'''
+        INSERT INTO domain_ownership (
+            user_id, domain_id, ownership_percentage,
+            base_tier_percentage, stars_bonus, posts_bonus, referrals_bonus,
+            last_calculated
+        )
+        SELECT c.user_id, c.domain_id, c.ownership_percentage,
+               c.base_tier_percentage, c.stars_bonus, c.posts_bonus, c.referrals_bonus, ?
+        {_CHANGED}
+        ON CONFLICT(user_id, domain_id) DO UPDATE SET
+            ownership_percentage = excluded.ownership_percentage,
+            base_tier_percentage = excluded.base_tier_percentage,
+            stars_bonus = excluded.stars_bonus,
+            posts_bonus = excluded.posts_bonus,
+            referrals_bonus = excluded.referrals_bonus,
+            last_calculated = excluded.last_calculated
+    ''', (datetime.utcnow(),)).rowcount
+
+    conn.execute('DELETE FROM ownership_calc')
+    return {'pairs': pairs, 'changed': changed, 'history': history}
+
+
 # ==============================================================================
 # DOMAIN UNLOCKING
 # ==============================================================================
@@ -514,25 +797,53 @@ def calculate_revenue_share(domain_id: int, monthly_revenue: float) -> List[Dict
             ...
         ]
     """
+    return calculate_revenue_shares({domain_id: monthly_revenue}).get(domain_id, [])
 
-    distribution = get_domain_ownership_distribution(domain_id)
 
-    # Revenue available for distribution (after platform reserve)
-    distributable_revenue = monthly_revenue * (distribution['total_distributed'] / 100.0)
+def calculate_revenue_shares(revenue_by_domain: Dict[int, float]) -> Dict[int, List[Dict]]:
+    """
+    calculate_revenue_share() for many domains with one owners query
 
-    payouts = []
-    for owner in distribution['owners']:
-        # Owner's payout = revenue × (ownership / total_distributed)
-        payout = monthly_revenue * (owner['ownership_percentage'] / distribution['total_distributed'])
+    Args:
+        revenue_by_domain: {domain_id: monthly_revenue}
 
-        payouts.append({
+    Returns:
+        {domain_id: [payout, ...]} - same payout dicts as calculate_revenue_share()
+    """
+    domain_ids = list(revenue_by_domain)
+    if not domain_ids:
+        return {}
+
+    conn = get_db()
+    owners_by_domain = defaultdict(list)
+    for chunk_start in range(0, len(domain_ids), 500):
+        chunk = domain_ids[chunk_start:chunk_start + 500]
+        rows = conn.execute(f'''
+            SELECT do.domain_id, do.user_id, u.username, do.ownership_percentage
+            FROM domain_ownership do
+            JOIN users u ON do.user_id = u.id
+            WHERE do.domain_id IN ({','.join('?' * len(chunk))}) AND do.ownership_percentage > 0
+            ORDER BY do.domain_id, do.ownership_percentage DESC
+        ''', chunk).fetchall()
+        for row in rows:
+            owners_by_domain[row['domain_id']].append(row)
+    conn.close()
+
+    shares = {}
+    for domain_id, owners in owners_by_domain.items():
+        monthly_revenue = revenue_by_domain[domain_id]
+        # Same split as get_domain_ownership_distribution (max 80%, 20% platform reserve)
+        total_distributed = min(sum(o['ownership_percentage'] for o in owners), 80.0)
+
+        shares[domain_id] = [{
             'user_id': owner['user_id'],
             'username': owner['username'],
             'ownership_percentage': owner['ownership_percentage'],
-            'payout': round(payout, 2)
-        })
+            # Owner's payout = revenue × (ownership / total_distributed)
+            'payout': round(monthly_revenue * (owner['ownership_percentage'] / total_distributed), 2)
+        } for owner in owners]
 
-    return payouts
+    return shares
 
 
 # ==============================================================================
@@ -655,16 +966,94 @@ def seed_domains():
     conn.close()
 
 
+def benchmark(users: int = 100_000, domains: int = 500, domains_per_user: int = 5,
+              posts: int = 200_000) -> Dict:
+    """
+    Full and incremental recalculation over users × domains in a scratch
+    database, plus the per-pair update_ownership() path on a sample
+    """
+    import os
+    import tempfile
+    import database
+
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory(prefix='ownership-bench-') as tmp:
+        database.DB_PATH = os.path.join(tmp, 'ownership_bench.db')
+        try:
+            database.init_db()
+            init_ownership_tables()
+            from schema_registry import run_migrations
+            run_migrations()
+
+            conn = get_db()
+            conn.executemany('INSERT INTO domains (domain_name, tier_requirement) VALUES (?, ?)',
+                             [(f'domain{i}.com', i % 5) for i in range(1, domains + 1)])
+            conn.executemany('INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, \'x\')',
+                             [(i, f'user{i}', f'user{i}@example.com') for i in range(1, users + 1)])
+            conn.executemany('''INSERT INTO github_profiles (user_id, github_username, github_id, total_stars, tier)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             [(i, f'gh{i}', i, i % 40, i % 5) for i in range(1, users + 1)])
+            conn.executemany('INSERT INTO user_domains (user_id, domain_id, unlocked_via) VALUES (?, ?, \'bench\')',
+                             [(i, (i * 7 + k * 97) % domains + 1)
+                              for i in range(1, users + 1) for k in range(domains_per_user)])
+            conn.executemany('INSERT INTO referrals (referrer_user_id, referred_user_id) VALUES (?, ?)',
+                             [((i * 13) % users + 1, i) for i in range(1, users // 2)])
+            conn.executemany('''INSERT INTO posts (user_id, title, slug, content, published_at, domain_id)
+                                VALUES (?, 'post', ?, '', '2026-01-01', ?)''',
+                             [(i % users + 1, f'post-{i}', ((i % users + 1) * 7) % domains + 1)
+                              for i in range(posts)])
+            conn.commit()
+            conn.close()
+
+            results = {'users': users, 'domains': domains}
+            results['full_first'] = recalculate_ownership()
+            results['full_unchanged'] = recalculate_ownership()
+
+            conn = get_db()
+            conn.executemany('UPDATE github_profiles SET total_stars = total_stars + 1 WHERE user_id = ?',
+                             [(i,) for i in range(1, users + 1, users // 1000 or 1)])
+            conn.commit()
+            conn.close()
+            results['incremental_1000_events'] = process_ownership_events()
+
+            sample = 200
+            start = time.perf_counter()
+            for i in range(1, sample + 1):
+                update_ownership(i, (i * 7) % domains + 1)
+            per_pair = (time.perf_counter() - start) / sample
+            results['per_pair_estimate_seconds'] = round(per_pair * results['full_first']['pairs'], 1)
+            return results
+        finally:
+            database.DB_PATH = original_path
+
+
 if __name__ == '__main__':
-    print("Initializing ownership ledger...")
-    init_ownership_tables()
-    seed_domains()
-    print("✅ Ownership ledger initialized")
-    print()
-    print("Tables created:")
-    print("  - domains")
-    print("  - github_profiles")
-    print("  - user_domains")
-    print("  - domain_ownership")
-    print("  - ownership_history")
-    print("  - referrals")
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Ownership ledger')
+    parser.add_argument('--recalculate', action='store_true', help='Recalculate every user/domain pair')
+    parser.add_argument('--events', action='store_true', help='Recalculate users queued by new stars/posts/referrals')
+    parser.add_argument('--benchmark', type=int, metavar='USERS', help='Benchmark recalculation for N users')
+    parser.add_argument('--domains', type=int, default=500, help='Domains for --benchmark')
+    args = parser.parse_args()
+
+    if args.recalculate:
+        print(f"✅ Recalculated ownership: {recalculate_ownership()}")
+    elif args.events:
+        print(f"✅ Processed ownership events: {process_ownership_events()}")
+    elif args.benchmark:
+        print(json.dumps(benchmark(args.benchmark, args.domains), indent=2))
+    else:
+        print("Initializing ownership ledger...")
+        init_ownership_tables()
+        seed_domains()
+        print("✅ Ownership ledger initialized")
+        print()
+        print("Tables created:")
+        print("  - domains")
+        print("  - github_profiles")
+        print("  - user_domains")
+        print("  - domain_ownership")
+        print("  - ownership_history")
+        print("  - referrals")
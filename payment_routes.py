@@ -23,7 +23,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, sessio
 from database import get_db
 from ownership_ledger import (
     get_domain_ownership_distribution,
-    calculate_revenue_share,
+    calculate_revenue_shares,
     get_user_ownership_summary
 )
 from datetime import datetime, timedelta
@@ -110,7 +110,7 @@ def admin_calculate_payouts():
     revenue_data = request.form.to_dict()
 
     # revenue_data = {'domain_1': '10000.00', 'domain_2': '5000.00', ...}
-    payouts_by_domain = {}
+    revenue_by_domain = {}
 
     for key, value in revenue_data.items():
         if key.startswith('domain_'):
@@ -118,11 +118,17 @@ def admin_calculate_payouts():
             monthly_revenue = float(value) if value else 0.0
 
             if monthly_revenue > 0:
-                payouts = calculate_revenue_share(domain_id, monthly_revenue)
-                payouts_by_domain[domain_id] = {
-                    'monthly_revenue': monthly_revenue,
-                    'payouts': payouts
-                }
+                revenue_by_domain[domain_id] = monthly_revenue
+
+    # One owners query for every domain instead of one per domain
+    shares = calculate_revenue_shares(revenue_by_domain)
+    payouts_by_domain = {
+        domain_id: {
+            'monthly_revenue': monthly_revenue,
+            'payouts': shares.get(domain_id, [])
+        }
+        for domain_id, monthly_revenue in revenue_by_domain.items()
+    }
 
     # Aggregate payouts per user (across all domains)
     user_totals = {}
@@ -27,7 +27,7 @@ from typing import Optional, Dict, List
 from template_generator import generate_professional_site
 from voice_quality_checker import check_voice_quality, generate_user_feedback
 from content_taxonomy import detect_trade, get_trade_config, TRADE_CATEGORIES
-from pseo_generator import generate_pseo_landing_pages, generate_landing_page_html
+from pseo_generator import generate_pseo_landing_pages
 
 # Create Blueprint
 professional_bp = Blueprint('professional', __name__)
@@ -222,7 +222,7 @@ def professional_tutorials(subdomain):
     # Generate tutorials page
     site_html = generate_professional_site(professional['id'])
 
-    return render_template_string(site_html['tutorials_page'],
+    return render_template_string(site_html['tutorials'],
                                    professional=professional,
                                    tutorials=tutorials)
 
@@ -538,16 +538,23 @@ def publish_tutorial(tutorial_id):
     conn.close()
 
     # Generate pSEO landing pages
-    pseo_pages = generate_pseo_landing_pages(tutorial_id)
+    pseo_pages_generated = generate_pseo_landing_pages(tutorial_id)
+
+    conn = get_db_connection()
+    sample_slugs = conn.execute(
+        'SELECT slug FROM pseo_landing_page WHERE tutorial_id = ? ORDER BY id LIMIT 5',
+        (tutorial_id,)
+    ).fetchall()
+    conn.close()
 
     return jsonify({
         'success': True,
         'tutorial_id': tutorial_id,
         'status': 'published',
-        'pseo_pages_generated': len(pseo_pages),
+        'pseo_pages_generated': pseo_pages_generated,
         'sample_urls': [
             f"/professionals/{professional['subdomain']}/l/{page['slug']}"
-            for page in pseo_pages[:5]  # Show first 5
+            for page in sample_slugs  # Show first 5
         ]
     })
 
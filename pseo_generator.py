@@ -13,23 +13,37 @@ Example:
       - clearwater-24-7-plumber
       - etc.
 
+Bulk generation:
+    Each tutorial's content is compiled once with city/keyword slots and
+    bound to each city once; per-city and per-keyword fragments are
+    computed once per process. Pages are written with executemany UPSERTs
+    in large transactions, and pages whose content hash hasn't changed are
+    skipped entirely on regeneration. Tutorials render in parallel worker
+    processes while the parent writes.
+
 Usage:
-    from pseo_generator import generate_pseo_landing_pages
+    from pseo_generator import generate_pseo_landing_pages, generate_pseo_pages_bulk
 
     # Generate pages for tutorial
     pages_created = generate_pseo_landing_pages(tutorial_id=123)
     # Returns: 52 (52 landing pages created)
+
+    # Many tutorials at once
+    stats = generate_pseo_pages_bulk([1, 2, 3], workers=4)
+    # {'pages': 156, 'created': 156, 'unchanged': 0, 'pages_per_sec': 41000.0, ...}
 """
 
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import json
+import os
 import re
-from datetime import datetime
-from models import (
-    db,
-    Tutorial,
-    ProfessionalProfile,
-    PSEOLandingPage
-)
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Dict, Optional, Tuple
+
+from database import get_db
+from schema_registry import register_migration
 
 
 # ============================================================================
@@ -108,6 +122,31 @@ CITY_FACTS = {
     'Jacksonville': 'Serving Jacksonville and the First Coast region.',
 }
 
+# Page columns in write order (content_hash last - see migration 109)
+PAGE_COLUMNS = (
+    'tutorial_id', 'professional_id', 'slug', 'full_url',
+    'target_city', 'target_keyword', 'long_tail_keyword',
+    'h1_headline', 'meta_title', 'meta_description', 'content_html',
+    'content_hash'
+)
+
+WRITE_BATCH = 10000     # Rows per executemany/transaction
+
+# Lets regeneration skip pages whose rendered content hasn't changed
+CONTENT_HASH_SCHEMA = 'ALTER TABLE pseo_landing_page ADD COLUMN content_hash TEXT'
+register_migration(109, 'pSEO content hashes', CONTENT_HASH_SCHEMA, module='pseo_generator')
+
+# A page belongs to the tutorial that first generated its slug; other
+# tutorials of the same professional never overwrite it
+INSERT_SQL = f"""
+    INSERT INTO pseo_landing_page ({', '.join(PAGE_COLUMNS)})
+    VALUES ({', '.join('?' * len(PAGE_COLUMNS))})
+"""
+UPSERT_SQL = INSERT_SQL + f"""    ON CONFLICT(professional_id, slug) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in PAGE_COLUMNS[3:])}
+    WHERE pseo_landing_page.tutorial_id = excluded.tutorial_id
+"""
+
 
 # ============================================================================
 # Main Generator Function
@@ -121,76 +160,76 @@ def generate_pseo_landing_pages(tutorial_id: int) -> int:
         tutorial_id: ID of tutorial to generate pages for
 
     Returns:
-        Number of pages created
+        Number of pages created or updated (unchanged pages are skipped)
 
     Example:
         >>> pages_created = generate_pseo_landing_pages(123)
         >>> print(f"Created {pages_created} landing pages")
         Created 52 landing pages
     """
-    tutorial = Tutorial.query.get(tutorial_id)
+    db = get_db()
+    jobs = _load_jobs(db, [tutorial_id])
+    db.close()
 
-    if not tutorial:
+    if not jobs:
         raise ValueError(f"Tutorial {tutorial_id} not found")
 
-    professional = tutorial.professional
-
-    if not professional:
+    if not jobs[0][1]:
         raise ValueError(f"Tutorial {tutorial_id} has no associated professional")
 
-    # Get service area cities
-    cities = get_service_area_cities(professional)
-
-    # Extract keywords from tutorial
-    keywords = extract_keywords_from_tutorial(tutorial)
-
-    # Generate landing pages
-    pages_created = 0
-
-    for city in cities:
-        for keyword in keywords:
-            # Create landing page
-            landing_page = create_pseo_landing_page(
-                tutorial=tutorial,
-                professional=professional,
-                city=city,
-                keyword=keyword
-            )
+    stats = generate_pseo_pages_bulk([tutorial_id], workers=1)
+    pages_created = stats['created'] + stats['updated']
 
-            if landing_page:
-                pages_created += 1
+    print(f"✅ Created {pages_created} pSEO landing pages for tutorial #{tutorial_id} "
+          f"({stats['unchanged']} unchanged)")
 
-    # Update tutorial stats
-    tutorial.pseo_pages_count = pages_created
-    db.session.commit()
+    return pages_created
 
-    print(f"✅ Created {pages_created} pSEO landing pages for tutorial #{tutorial_id}")
 
-    return pages_created
+def _load_jobs(db, tutorial_ids: Iterable[int]) -> List[Tuple[Dict, Optional[Dict]]]:
+    """(tutorial, professional) pairs in id order, one query for all tutorials"""
+    rows = db.execute('''
+        SELECT t.id, t.title, t.html_content, t.professional_id,
+               p.id AS p_id, p.business_name, p.phone, p.subdomain, p.address_city, p.license_type
+        FROM tutorial t
+        LEFT JOIN professional_profile p ON p.id = t.professional_id
+        WHERE t.id IN (SELECT value FROM json_each(?))
+        ORDER BY t.id
+    ''', (json.dumps(list(tutorial_ids)),)).fetchall()
+
+    jobs = []
+    for row in rows:
+        tutorial = {key: row[key] for key in ('id', 'title', 'html_content', 'professional_id')}
+        professional = None
+        if row['p_id'] is not None:
+            professional = {key: row[key] for key in ('business_name', 'phone', 'subdomain', 'address_city', 'license_type')}
+            professional['id'] = row['p_id']
+        jobs.append((tutorial, professional))
+    return jobs
 
 
 # ============================================================================
 # Service Area Detection
 # ============================================================================
 
-def get_service_area_cities(professional: ProfessionalProfile) -> List[str]:
+def get_service_area_cities(professional: Dict) -> List[str]:
     """
     Get cities in professional's service area
 
     Args:
-        professional: Professional profile
+        professional: Professional profile row
 
     Returns:
         List of city names
 
     Example:
-        >>> prof = ProfessionalProfile.query.get(1)
+        >>> prof = {'address_city': 'Clearwater'}
         >>> cities = get_service_area_cities(prof)
         >>> print(cities)
         ['Tampa', 'St. Petersburg', 'Clearwater', ...]
     """
     # Start with professional's city
-    primary_city = professional.address_city or 'Tampa'
+    primary_city = professional.get('address_city') or 'Tampa'
 
     # Find which metro area this city belongs to
     metro_cities = []
@@ -212,37 +251,37 @@ def get_service_area_cities(professional: ProfessionalProfile) -> List[str]:
 # Keyword Extraction
 # ============================================================================
 
-def extract_keywords_from_tutorial(tutorial: Tutorial) -> List[str]:
+def extract_keywords_from_tutorial(tutorial: Dict, professional: Dict) -> List[str]:
     """
     Extract targetable keywords from tutorial content
 
     Args:
-        tutorial: Tutorial object
+        tutorial: Tutorial row
+        professional: Professional profile row (license type picks the trade)
 
     Returns:
         List of keyword phrases
 
     Example:
-        >>> tutorial = Tutorial.query.get(1)
-        >>> keywords = extract_keywords_from_tutorial(tutorial)
+        >>> keywords = extract_keywords_from_tutorial(tutorial, professional)
         >>> print(keywords)
         ['plumber', 'emergency plumber', '24/7 plumber', ...]
     """
     # Detect trade from license type
-    license_type = tutorial.professional.license_type or 'plumber'
+    license_type = professional.get('license_type') or 'plumber'
     trade = detect_trade(license_type)
 
     # Get keyword modifiers for this trade
     base_keywords = KEYWORD_MODIFIERS.get(trade, KEYWORD_MODIFIERS['plumber'])
 
     # Extract specific keywords from tutorial title
-    title_keywords = extract_title_keywords(tutorial.title)
+    title_keywords = extract_title_keywords(tutorial['title'])
 
     # Combine
     all_keywords = base_keywords + title_keywords
 
-    # Remove duplicates
-    return list(set(all_keywords))
+    # Remove duplicates (order kept so page ids are stable across runs)
+    return list(dict.fromkeys(all_keywords))
 
 
 def detect_trade(license_type: str) -> str:
@@ -324,17 +363,17 @@ def extract_title_keywords(title: str) -> List[str]:
 # ============================================================================
 
 def create_pseo_landing_page(
-    tutorial: Tutorial,
-    professional: ProfessionalProfile,
+    tutorial: Dict,
+    professional: Dict,
     city: str,
     keyword: str
-) -> Optional[PSEOLandingPage]:
+) -> Optional[Dict]:
     """
     Create individual pSEO landing page
 
     Args:
-        tutorial: Source tutorial
-        professional: Professional profile
+        tutorial: Source tutorial row
+        professional: Professional profile row
         city: Target city
         keyword: Target keyword
 
@@ -348,65 +387,87 @@ def create_pseo_landing_page(
         ...     city='Tampa',
         ...     keyword='emergency plumber'
         ... )
-        >>> print(page.slug)
+        >>> print(page['slug'])
         'tampa-emergency-plumber'
     """
-    # Generate slug
     slug = generate_slug(city, keyword)
+    template = compile_content_template(tutorial['html_content'] or '', professional.get('phone') or '')
+    row = _render_page(_bind_city(template, city), tutorial['id'], professional, city, keyword, slug)
 
-    # Check if already exists
-    existing = PSEOLandingPage.query.filter_by(
-        professional_id=professional.id,
-        slug=slug
-    ).first()
+    db = get_db()
+    cursor = db.execute(
+        INSERT_SQL + 'ON CONFLICT(professional_id, slug) DO NOTHING', row
+    )
+    db.commit()
+    db.close()
 
-    if existing:
+    if not cursor.rowcount:
         print(f"  ⏭️  Skipping {slug} (already exists)")
         return None
 
-    # Generate SEO content
-    long_tail_keyword = f"{keyword} in {city}"
-    h1_headline = generate_h1(city, keyword, professional.business_name)
-    meta_title = generate_meta_title(city, keyword, professional.business_name)
-    meta_description = generate_meta_description(city, keyword, professional)
-
-    # Customize content for city
-    content_html = customize_content_for_city(
-        base_content=tutorial.html_content,
-        city=city,
-        keyword=keyword,
-        professional=professional
-    )
+    print(f"  ✅ Created: {slug}")
 
-    # Full URL
-    if professional.subdomain:
-        full_url = f"{professional.subdomain}.cringeproof.com/{slug}"
-    else:
-        full_url = f"cringeproof.com/p/{professional.id}/{slug}"
-
-    # Create landing page
-    landing_page = PSEOLandingPage(
-        tutorial_id=tutorial.id,
-        professional_id=professional.id,
-        slug=slug,
-        full_url=full_url,
-        target_city=city,
-        target_keyword=keyword,
-        long_tail_keyword=long_tail_keyword,
-        h1_headline=h1_headline,
-        meta_title=meta_title,
-        meta_description=meta_description,
-        content_html=content_html,
-        impressions=0,
-        clicks=0,
-        leads=0
-    )
+    return dict(zip(PAGE_COLUMNS, row))
 
-    db.session.add(landing_page)
 
-    print(f"  ✅ Created: {slug}")
+def render_tutorial_pages(job: Tuple[Dict, Dict]) -> List[Tuple]:
+    """
+    Render every city × keyword page for one tutorial (no DB access)
 
-    return landing_page
+    Runs in pool workers. The tutorial's content is compiled once and
+    variants whose slugs collide are rendered once.
+
+    Args:
+        job: (tutorial, professional) from _load_jobs()
+
+    Returns:
+        Page rows in PAGE_COLUMNS order
+    """
+    tutorial, professional = job
+    template = compile_content_template(tutorial['html_content'] or '', professional.get('phone') or '')
+    keywords = [(keyword, _keyword_slug(keyword)) for keyword in extract_keywords_from_tutorial(tutorial, professional)]
+
+    rows = []
+    seen = set()
+    for city in get_service_area_cities(professional):
+        city_slug = _city_fragment(city)[0]
+        city_content = _bind_city(template, city)
+        for keyword, keyword_slug in keywords:
+            slug = _truncate_slug('-'.join(part for part in (city_slug, keyword_slug) if part))
+            if slug in seen:
+                continue
+            seen.add(slug)
+            rows.append(_render_page(city_content, tutorial['id'], professional, city, keyword, slug))
+
+    return rows
+
+
+def _render_page(city_content: List[str], tutorial_id: int, professional: Dict,
+                 city: str, keyword: str, slug: str) -> Tuple:
+    """One page row from a city-bound content template (see _bind_city)"""
+    business_name = professional['business_name']
+
+    if professional.get('subdomain'):
+        full_url = f"{professional['subdomain']}.cringeproof.com/{slug}"
+    else:
+        full_url = f"cringeproof.com/p/{professional['id']}/{slug}"
+
+    fields = (
+        tutorial_id,
+        professional['id'],
+        slug,
+        full_url,
+        city,
+        keyword,
+        f"{keyword} in {city}",
+        generate_h1(city, keyword, business_name),
+        generate_meta_title(city, keyword, business_name),
+        generate_meta_description(city, keyword, professional),
+        keyword.join(city_content),
+    )
+    content_hash = hashlib.sha256('\x1f'.join(map(str, fields)).encode('utf-8')).hexdigest()
+
+    return fields + (content_hash,)
 
 
 # ============================================================================
@@ -440,6 +501,10 @@ def generate_slug(city: str, keyword: str) -> str:
     # Remove leading/trailing hyphens
     slug = slug.strip('-')
 
+    return _truncate_slug(slug)
+
+
+def _truncate_slug(slug: str) -> str:
     # Limit length (max 100 chars)
     if len(slug) > 100:
         slug = slug[:100].rsplit('-', 1)[0]  # Cut at last hyphen
@@ -447,6 +512,17 @@ def generate_slug(city: str, keyword: str) -> str:
     return slug
 
 
+@lru_cache(maxsize=None)
+def _keyword_slug(keyword: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', keyword.lower()).strip('-')
+
+
+@lru_cache(maxsize=None)
+def _city_fragment(city: str) -> Tuple[str, str]:
+    """(slug part, city fact) - shared by every page for this city"""
+    return _keyword_slug(city), CITY_FACTS.get(city, f'Proud to serve the {city} community.')
+
+
 def generate_h1(city: str, keyword: str, business_name: str) -> str:
     """
     Generate H1 headline for landing page
@@ -500,7 +576,7 @@ def generate_meta_title(city: str, keyword: str, business_name: str) -> str:
 def generate_meta_description(
     city: str,
     keyword: str,
-    professional: ProfessionalProfile
+    professional: Dict
 ) -> str:
     """
     Generate meta description tag (150-160 chars optimal)
@@ -519,8 +595,8 @@ def generate_meta_description(
     """
     description = (
         f"Need a {keyword} in {city}? "
-        f"{professional.business_name} is licensed, insured, and available 24/7. "
-        f"Call {professional.phone} for fast service."
+        f"{professional['business_name']} is licensed, insured, and available 24/7. "
+        f"Call {professional.get('phone')} for fast service."
     )
 
     # Truncate if too long (max 160 chars)
@@ -534,7 +610,7 @@ def customize_content_for_city(
     base_content: str,
     city: str,
     keyword: str,
-    professional: ProfessionalProfile
+    professional: Dict
 ) -> str:
     """
     Add city-specific context to base tutorial content
@@ -561,14 +637,38 @@ def customize_content_for_city(
         </div>
         <div>Tutorial content...</div>
     """
-    # City intro paragraph
-    city_fact = CITY_FACTS.get(city, f'Proud to serve the {city} community.')
+    template = compile_content_template(base_content, professional.get('phone') or '')
+
+    return keyword.join(_bind_city(template, city))
+
+
+# Slot markers used while compiling; NUL never appears in tutorial HTML
+_SLOTS = {name: f'\x00{name}\x00' for name in ('city', 'keyword', 'fact')}
+
+
+@lru_cache(maxsize=256)
+def compile_content_template(base_content: str, phone: str) -> str:
+    """
+    Compile customize_content_for_city() for one tutorial
+
+    The header/main search, placeholder replacement and <h1> rewrite run
+    once with marker values instead of once per page.
+
+    Args:
+        base_content: Base HTML content from tutorial
+        phone: Professional's phone number
 
+    Returns:
+        Customized content with _SLOTS markers for city, keyword and fact
+    """
+    city, keyword, city_fact = _SLOTS['city'], _SLOTS['keyword'], _SLOTS['fact']
+
+    # City intro paragraph
     city_intro = f"""
     <div class="city-intro" style="background: #f8f9fa; padding: 20px; border-left: 4px solid var(--primary-color); margin: 20px 0;">
         <p><strong>Serving {city}</strong></p>
         <p>Professional {keyword} services in {city} and surrounding areas. {city_fact}</p>
-        <p>📞 Call now: <a href="tel:{professional.phone.replace(' ', '').replace('-', '')}">{professional.phone}</a></p>
+        <p>📞 Call now: <a href="tel:{phone.replace(' ', '').replace('-', '')}">{phone}</a></p>
     </div>
 """
 
@@ -597,16 +697,124 @@ def customize_content_for_city(
     return customized
 
 
+def _bind_city(template: str, city: str) -> List[str]:
+    """Fill the city slots; joining the result with a keyword gives the page content"""
+    city_fact = _city_fragment(city)[1]
+    return template.replace(_SLOTS['city'], city).replace(_SLOTS['fact'], city_fact).split(_SLOTS['keyword'])
+
+
 # ============================================================================
 # Batch Operations
 # ============================================================================
 
-def generate_pseo_for_all_tutorials(professional_id: int) -> Tuple[int, int]:
+def generate_pseo_pages_bulk(tutorial_ids: Iterable[int], workers: Optional[int] = None) -> Dict:
+    """
+    Generate landing pages for many tutorials with set-based writes
+
+    Tutorials are rendered in a process pool (workers > 1) while this
+    process writes: pages are diffed against the stored content hashes
+    in memory, unchanged pages are skipped, and the rest go out as
+    executemany UPSERTs of WRITE_BATCH rows per transaction.
+
+    Args:
+        tutorial_ids: Tutorial IDs
+        workers: Render processes (default: CPU count; 1 = in-process)
+
+    Returns:
+        {'tutorials', 'pages', 'created', 'updated', 'unchanged',
+         'skipped', 'seconds', 'pages_per_sec'}
+
+    Example:
+        >>> stats = generate_pseo_pages_bulk(range(1, 601), workers=8)
+        >>> print(f"{stats['pages']} pages at {stats['pages_per_sec']:.0f}/sec")
+        99000 pages at 14200/sec
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+
+    db = get_db()
+    jobs = [job for job in _load_jobs(db, tutorial_ids) if job[1]]
+    writer = _PageWriter(db, {professional['id'] for _, professional in jobs})
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() keeps tutorial order, so slug ownership matches a sequential run
+            for rows in pool.map(render_tutorial_pages, jobs, chunksize=max(1, len(jobs) // (workers * 4))):
+                writer.add(rows)
+    else:
+        for job in jobs:
+            writer.add(render_tutorial_pages(job))
+    writer.flush()
+
+    db.execute('''
+        UPDATE tutorial
+        SET pseo_pages_count = (SELECT COUNT(*) FROM pseo_landing_page p WHERE p.tutorial_id = tutorial.id)
+        WHERE id IN (SELECT value FROM json_each(?))
+    ''', (json.dumps([tutorial['id'] for tutorial, _ in jobs]),))
+    db.commit()
+    db.close()
+
+    elapsed = time.perf_counter() - started
+    stats = dict(writer.stats, tutorials=len(jobs), seconds=round(elapsed, 3))
+    stats['pages_per_sec'] = round(stats['pages'] / elapsed, 1) if elapsed else 0.0
+
+    return stats
+
+
+class _PageWriter:
+    """Diffs rendered pages against what's stored and batches the writes"""
+
+    def __init__(self, db, professional_ids: Iterable[int]):
+        self.db = db
+        self.pending: List[Tuple] = []
+        self.stats = {'pages': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0}
+
+        # (professional_id, slug) -> (owning tutorial_id, content_hash)
+        self.existing = {
+            (row[0], row[1]): (row[2], row[3])
+            for row in db.execute(
+                '''SELECT professional_id, slug, tutorial_id, content_hash FROM pseo_landing_page
+                   WHERE professional_id IN (SELECT value FROM json_each(?))''',
+                (json.dumps(sorted(professional_ids)),)
+            )
+        }
+
+    def add(self, rows: List[Tuple]):
+        for row in rows:
+            self.stats['pages'] += 1
+            key = (row[1], row[2])
+            current = self.existing.get(key)
+
+            if current is None:
+                self.stats['created'] += 1
+            elif current[0] != row[0]:
+                self.stats['skipped'] += 1          # Slug owned by another tutorial
+                continue
+            elif current[1] == row[-1]:
+                self.stats['unchanged'] += 1
+                continue
+            else:
+                self.stats['updated'] += 1
+
+            self.existing[key] = (row[0], row[-1])
+            self.pending.append(row)
+            if len(self.pending) >= WRITE_BATCH:
+                self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.db.executemany(UPSERT_SQL, self.pending)
+            self.db.commit()
+            self.pending = []
+
+
+def generate_pseo_for_all_tutorials(professional_id: int, workers: Optional[int] = None) -> Tuple[int, int]:
     """
     Generate pSEO landing pages for all tutorials from a professional
 
     Args:
         professional_id: Professional profile ID
+        workers: Render processes (see generate_pseo_pages_bulk)
 
     Returns:
         Tuple of (tutorials_processed, pages_created)
@@ -616,30 +824,29 @@ def generate_pseo_for_all_tutorials(professional_id: int) -> Tuple[int, int]:
         >>> print(f"Processed {tutorials} tutorials, created {pages} pages")
         Processed 10 tutorials, created 520 pages
     """
-    tutorials = Tutorial.query.filter_by(
-        professional_id=professional_id,
-        status='published'
-    ).all()
-
-    tutorials_processed = 0
-    total_pages_created = 0
-
-    for tutorial in tutorials:
-        print(f"\n📝 Processing tutorial #{tutorial.id}: {tutorial.title}")
+    db = get_db()
+    tutorial_ids = [row[0] for row in db.execute(
+        "SELECT id FROM tutorial WHERE professional_id = ? AND status = 'published' ORDER BY id",
+        (professional_id,)
+    )]
+    db.close()
 
-        pages_created = generate_pseo_landing_pages(tutorial.id)
-        total_pages_created += pages_created
-        tutorials_processed += 1
+    stats = generate_pseo_pages_bulk(tutorial_ids, workers=workers)
+    total_pages_created = stats['created'] + stats['updated']
 
-    print(f"\n✅ COMPLETE: Processed {tutorials_processed} tutorials, created {total_pages_created} landing pages")
+    print(f"\n✅ COMPLETE: Processed {stats['tutorials']} tutorials, created {total_pages_created} landing pages "
+          f"({stats['unchanged']} unchanged, {stats['pages_per_sec']:,.0f} pages/sec)")
 
-    return tutorials_processed, total_pages_created
+    return stats['tutorials'], total_pages_created
 
 
 def regenerate_pseo_for_tutorial(tutorial_id: int, force: bool = False) -> int:
     """
     Regenerate pSEO landing pages for a tutorial
 
+    Without force, only pages whose content changed are rewritten (their
+    impressions/clicks/leads are kept).
+
     Args:
         tutorial_id: Tutorial ID
         force: If True, delete existing pages first
@@ -652,18 +859,15 @@ def regenerate_pseo_for_tutorial(tutorial_id: int, force: bool = False) -> int:
         >>> print(f"Regenerated {pages} pages")
         Regenerated 52 pages
     """
-    tutorial = Tutorial.query.get(tutorial_id)
-
-    if not tutorial:
-        raise ValueError(f"Tutorial {tutorial_id} not found")
-
     if force:
         # Delete existing pages
-        existing_pages = PSEOLandingPage.query.filter_by(
-            tutorial_id=tutorial_id
-        ).delete()
-
-        db.session.commit()
+        db = get_db()
+        existing_pages = db.execute(
+            'DELETE FROM pseo_landing_page WHERE tutorial_id = ?',
+            (tutorial_id,)
+        ).rowcount
+        db.commit()
+        db.close()
 
         print(f"🗑️  Deleted {existing_pages} existing pages")
 
@@ -699,14 +903,15 @@ def get_pseo_stats(professional_id: int) -> Dict:
             'conversion_rate': 12.1
         }
     """
-    pages = PSEOLandingPage.query.filter_by(
-        professional_id=professional_id
-    ).all()
+    db = get_db()
+    row = db.execute(
+        '''SELECT COUNT(*), COALESCE(SUM(impressions), 0), COALESCE(SUM(clicks), 0), COALESCE(SUM(leads), 0)
+           FROM pseo_landing_page WHERE professional_id = ?''',
+        (professional_id,)
+    ).fetchone()
+    db.close()
 
-    total_pages = len(pages)
-    total_impressions = sum(p.impressions for p in pages)
-    total_clicks = sum(p.clicks for p in pages)
-    total_leads = sum(p.leads for p in pages)
+    total_pages, total_impressions, total_clicks, total_leads = row
 
     ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
     conversion_rate = (total_leads / total_clicks * 100) if total_clicks > 0 else 0
@@ -721,7 +926,7 @@ def get_pseo_stats(professional_id: int) -> Dict:
     }
 
 
-def get_top_performing_pages(professional_id: int, limit: int = 10) -> List[PSEOLandingPage]:
+def get_top_performing_pages(professional_id: int, limit: int = 10) -> List[Dict]:
     """
     Get top performing pSEO landing pages by leads
 
@@ -735,16 +940,61 @@ def get_top_performing_pages(professional_id: int, limit: int = 10) -> List[PSEO
     Example:
         >>> top_pages = get_top_performing_pages(1, limit=5)
         >>> for page in top_pages:
-        ...     print(f"{page.slug}: {page.leads} leads")
+        ...     print(f"{page['slug']}: {page['leads']} leads")
         tampa-emergency-plumber: 23 leads
         st-petersburg-plumber: 18 leads
         clearwater-24-7-plumber: 14 leads
     """
-    return PSEOLandingPage.query.filter_by(
-        professional_id=professional_id
-    ).order_by(
-        PSEOLandingPage.leads.desc()
-    ).limit(limit).all()
+    db = get_db()
+    pages = db.execute(
+        '''SELECT id, slug, full_url, impressions, clicks, leads FROM pseo_landing_page
+           WHERE professional_id = ? ORDER BY leads DESC LIMIT ?''',
+        (professional_id, limit)
+    ).fetchall()
+    db.close()
+
+    return [dict(page) for page in pages]
+
+
+def benchmark(professionals: int = 600, workers: Optional[int] = None) -> Dict:
+    """
+    Generate ~100k pages (one tutorial per professional) into a scratch
+    database, then regenerate with nothing changed
+    """
+    import tempfile
+    import database
+
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory(prefix='pseo-bench-') as tmp:
+        database.DB_PATH = os.path.join(tmp, 'pseo_bench.db')
+        try:
+            database.init_db()
+            from schema_registry import run_migrations
+            run_migrations()
+
+            db = get_db()
+            cities = [city for metro in CITY_DATABASES.values() for city in metro]
+            titles = ['How to Fix a Leaky Faucet', 'How to Replace Water Heater Elements', 'How to Install Ceiling Fans']
+            body = '<header><h1>[KEYWORD] guide</h1></header><main>' + '<p>Step by step in [CITY].</p>' * 60 + '</main>'
+            for i in range(1, professionals + 1):
+                db.execute(
+                    '''INSERT INTO professional_profile (id, user_id, business_name, subdomain, trade_category,
+                                                       phone, address_city, license_type)
+                       VALUES (?, ?, ?, ?, 'plumbing', '813-555-0100', ?, 'Plumbing Contractor')''',
+                    (i, i, f'Pro {i} Plumbing', f'pro{i}', cities[i % len(cities)])
+                )
+                db.execute(
+                    '''INSERT INTO tutorial (id, professional_id, title, audio_url, html_content, status)
+                       VALUES (?, ?, ?, '', ?, 'published')''',
+                    (i, i, titles[i % len(titles)], body)
+                )
+            db.commit()
+            db.close()
+
+            ids = range(1, professionals + 1)
+            return {'first_run': generate_pseo_pages_bulk(ids, workers), 'unchanged_rerun': generate_pseo_pages_bulk(ids, workers)}
+        finally:
+            database.DB_PATH = original_path
 
 
 # ============================================================================
@@ -760,6 +1010,7 @@ def main():
         python pseo_generator.py --professional-id 1 --all
         python pseo_generator.py --regenerate 123 --force
         python pseo_generator.py --stats 1
+        python pseo_generator.py --benchmark 600 --workers 8
     """
     import argparse
 
@@ -771,6 +1022,9 @@ def main():
     parser.add_argument('--regenerate', type=int, help='Regenerate pages for tutorial')
     parser.add_argument('--force', action='store_true', help='Force regeneration (delete existing)')
     parser.add_argument('--stats', type=int, help='Show stats for professional')
+    parser.add_argument('--workers', type=int, help='Render processes for --all (default: CPU count)')
+    parser.add_argument('--benchmark', type=int, metavar='PROFESSIONALS',
+                        help='Generate ~165 pages per professional into a scratch DB and report pages/sec')
 
     args = parser.parse_args()
 
@@ -779,7 +1033,7 @@ def main():
         print(f"\n✅ Created {pages} landing pages for tutorial #{args.tutorial_id}")
 
     elif args.all and args.professional_id:
-        tutorials, pages = generate_pseo_for_all_tutorials(args.professional_id)
+        tutorials, pages = generate_pseo_for_all_tutorials(args.professional_id, workers=args.workers)
         print(f"\n✅ Processed {tutorials} tutorials, created {pages} landing pages")
 
     elif args.regenerate:
@@ -799,7 +1053,14 @@ def main():
         print(f"\n🏆 Top Performing Pages:")
         top_pages = get_top_performing_pages(args.professional_id, limit=5)
         for page in top_pages:
-            print(f"  {page.slug}: {page.leads} leads ({page.clicks} clicks, {page.impressions} views)")
+            print(f"  {page['slug']}: {page['leads']} leads ({page['clicks']} clicks, {page['impressions']} views)")
+
+    elif args.benchmark:
+        results = benchmark(args.benchmark, workers=args.workers)
+        for run, stats in results.items():
+            print(f"{run}: {stats['pages']:,} pages in {stats['seconds']}s "
+                  f"({stats['pages_per_sec']:,.0f} pages/sec) - "
+                  f"{stats['created']} created, {stats['updated']} updated, {stats['unchanged']} unchanged")
 
     else:
         parser.print_help()
@@ -9,10 +9,11 @@ Usage:
 """
 
 import sqlite3
-import subprocess
 from pathlib import Path
 from datetime import datetime
 
+from git_publisher import GitError, get_queue
+
 # Paths
 DB_PATH = "soulfra.db"
 GITHUB_REPO_PATH = Path("/Users/matthewmauer/Desktop/roommate-chat/github-repos/soulfra")
@@ -882,13 +883,15 @@ def publish():
     print("Step 7: Pushing to GitHub...")
 
     try:
-        # Change to repo directory
-        subprocess.run(['git', 'add', 'blog/', 'index.html', 'feed.xml'], cwd=GITHUB_REPO_PATH, check=True)
-
         commit_msg = f"Update blog: {posts[0]['title']} ({datetime.now().strftime('%Y-%m-%d %H:%M')})"
-        subprocess.run(['git', 'commit', '-m', commit_msg], cwd=GITHUB_REPO_PATH, check=True)
+        queue = get_queue(GITHUB_REPO_PATH)
+        published = queue.publish(['blog', 'index.html', 'feed.xml'], commit_msg)
+        queue.close()       # Wait for the background push before exiting
 
-        subprocess.run(['git', 'push', 'origin', 'main'], cwd=GITHUB_REPO_PATH, check=True)
+        if not published['commit']:
+            print("   ℹ️  No changes since last publish")
+        elif queue.stats()['push_failures']:
+            raise GitError('push failed')
 
         print("   ✅ Pushed to GitHub!")
         print()
@@ -906,7 +909,7 @@ def publish():
         print("⏰ Wait ~30 seconds for GitHub Pages to build, then visit the URLs above")
         print()
 
-    except subprocess.CalledProcessError as e:
+    except GitError as e:
         print(f"   ❌ Git error: {e}")
         print()
         print("Manual steps:")
@@ -43,6 +43,7 @@ import json
 from datetime import datetime, timedelta
 import hmac
 import base64
+from auth_cache import NonceSet
 
 
 # ==============================================================================
@@ -157,20 +158,33 @@ def verify_auth_token(token):
         return None
 
 
-def token_already_used(nonce):
-    """Check if one-time token has already been used"""
+def _load_used_nonces():
+    """All nonces already spent (loaded once into _used_nonces)"""
     conn = sqlite3.connect('soulfra.db')
-    cursor = conn.cursor()
+    try:
+        rows = conn.execute('SELECT nonce FROM qr_auth_log WHERE used = 1').fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
 
-    cursor.execute('''
-        SELECT COUNT(*) FROM qr_auth_log
-        WHERE nonce = ? AND used = 1
-    ''', (nonce,))
 
-    count = cursor.fetchone()[0]
-    conn.close()
+def _nonce_used_in_db(nonce):
+    """Fallback for nonces not in _used_nonces (spent by another worker)"""
+    conn = sqlite3.connect('soulfra.db')
+    try:
+        row = conn.execute('SELECT 1 FROM qr_auth_log WHERE nonce = ? AND used = 1', (nonce,)).fetchone()
+    finally:
+        conn.close()
+    return row is not None
+
 
-    return count > 0
+# In-memory set of used one-time nonces - replays rejected without a DB query
+_used_nonces = NonceSet(_load_used_nonces, confirm=_nonce_used_in_db)
+
+
+def token_already_used(nonce):
+    """Check if one-time token has already been used"""
+    return nonce in _used_nonces
 
 
 def mark_token_used(nonce, user_id):
@@ -186,6 +200,8 @@ def mark_token_used(nonce, user_id):
     conn.commit()
     conn.close()
 
+    _used_nonces.add(nonce)
+
 
 # ==============================================================================
 # DATABASE FUNCTIONS
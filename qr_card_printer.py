@@ -17,7 +17,11 @@ Usage:
         f.write(pdf_bytes)
 """
 
-from typing import Dict, List, Optional
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
@@ -34,6 +38,26 @@ except ImportError:
     print("   (Required for PDF generation)")
 
 
+@lru_cache(maxsize=1)
+def _card_fonts() -> Tuple:
+    """Title, subtitle and text fonts, loaded once per process"""
+    try:
+        return (
+            ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48),
+            ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36),
+            ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24),
+        )
+    except:
+        default = ImageFont.load_default()
+        return default, default, default
+
+
+def _render_chapter_cards(job: Tuple[str, Dict]) -> List[Image.Image]:
+    """Card images for one chapter; process pool entry point"""
+    brand, chapter = job
+    return QRCardPrinter(brand=brand).chapter_cards(chapter)
+
+
 class QRCardPrinter:
     """
     Generate printable QR trading cards for story chapters
@@ -172,15 +196,8 @@ class QRCardPrinter:
         card = Image.new('RGB', (width_px, height_px), color='#1F2937')
         draw = ImageDraw.Draw(card)
 
-        # Load fonts (try to use system fonts, fallback to default)
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 48)
-            subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-            text_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            text_font = ImageFont.load_default()
+        # Load fonts (system fonts or default, cached per process)
+        title_font, subtitle_font, text_font = _card_fonts()
 
         # Colors
         colors = self.brand_colors.get(self.brand, self.brand_colors['soulfra'])
@@ -278,54 +295,90 @@ class QRCardPrinter:
 
         return card
 
-    def generate_full_book_pack(self, book_number: int = 1) -> bytes:
+    def chapter_cards(self, chapter: Dict) -> List[Image.Image]:
+        """
+        Card images for one chapter, one per QR part
+
+        Args:
+            chapter: Chapter dict from generate_soulfra_story()
+
+        Returns:
+            Card images in part order
+        """
+        qr_gen = MultiPartQRGenerator(max_size=2500)
+        qr_parts = qr_gen.split_and_generate(
+            chapter['content'],
+            brand=self.brand,
+            content_type='chapter'
+        )
+
+        return [
+            self._create_card_image(
+                chapter_title=chapter['title'],
+                chapter_number=chapter['chapter_number'],
+                part_number=part['part'],
+                total_parts=part['total'],
+                qr_bytes=part['qr_bytes'],
+                collectible_id=f"SD-{chapter['chapter_number']:02d}-{part['part']:02d}"
+            )
+            for part in qr_parts
+        ]
+
+    def render_book_cards(self, workers: Optional[int] = None) -> List[Image.Image]:
+        """
+        Card images for every chapter of the book
+
+        Chapters are rendered in a process pool (workers > 1): QR encoding
+        and card drawing for each chapter run in parallel, and the cards
+        come back in chapter order.
+
+        Args:
+            workers: Render processes (default: CPU count; 1 = in-process)
+
+        Returns:
+            Card images in print order
+        """
+        workers = workers or os.cpu_count() or 1
+        jobs = [(self.brand, chapter) for chapter in generate_soulfra_story()]
+
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                per_chapter = list(pool.map(_render_chapter_cards, jobs))
+        else:
+            per_chapter = [_render_chapter_cards(job) for job in jobs]
+
+        return [card for cards in per_chapter for card in cards]
+
+    def generate_full_book_pack(self, book_number: int = 1, workers: Optional[int] = None) -> bytes:
         """
         Generate card pack for entire book (all chapters)
 
         Args:
             book_number: Book number (1-10)
+            workers: Card render processes (see render_book_cards)
 
         Returns:
             PDF bytes with all chapter cards
         """
-        chapters = generate_soulfra_story()
-
         # For now, Book 1 = all 7 chapters
         # Future: Book 2-10 will have 10 chapters each
+        cards = self.render_book_cards(workers=workers)
+
         pdf_buffer = BytesIO()
         c = canvas.Canvas(pdf_buffer, pagesize=letter)
 
-        for chapter in chapters:
-            # Generate multi-part QR for chapter
-            qr_gen = MultiPartQRGenerator(max_size=2500)
-            qr_parts = qr_gen.split_and_generate(
-                chapter['content'],
-                brand=self.brand,
-                content_type='chapter'
+        for card_img in cards:
+            x = (letter[0] - self.card_width) / 2
+            y = (letter[1] - self.card_height) / 2
+
+            c.drawImage(
+                ImageReader(card_img),
+                x, y,
+                width=self.card_width,
+                height=self.card_height
             )
 
-            # Create card for each part
-            for part in qr_parts:
-                card_img = self._create_card_image(
-                    chapter_title=chapter['title'],
-                    chapter_number=chapter['chapter_number'],
-                    part_number=part['part'],
-                    total_parts=part['total'],
-                    qr_bytes=part['qr_bytes'],
-                    collectible_id=f"SD-{chapter['chapter_number']:02d}-{part['part']:02d}"
-                )
-
-                x = (letter[0] - self.card_width) / 2
-                y = (letter[1] - self.card_height) / 2
-
-                c.drawImage(
-                    ImageReader(card_img),
-                    x, y,
-                    width=self.card_width,
-                    height=self.card_height
-                )
-
-                c.showPage()
+            c.showPage()
 
         c.save()
         pdf_buffer.seek(0)
@@ -351,18 +404,40 @@ def generate_chapter_card_pack(chapter_number: int, brand: str = 'soulfra') -> b
     return printer.generate_chapter_card_pack(chapter_number)
 
 
-def generate_full_book_pack(brand: str = 'soulfra') -> bytes:
+def generate_full_book_pack(brand: str = 'soulfra', workers: Optional[int] = None) -> bytes:
     """
     Quick helper: Generate card pack for entire Book 1 (all 7 chapters)
 
     Args:
         brand: Brand slug
+        workers: Card render processes (default: CPU count)
 
     Returns:
         PDF bytes
     """
     printer = QRCardPrinter(brand=brand)
-    return printer.generate_full_book_pack(book_number=1)
+    return printer.generate_full_book_pack(book_number=1, workers=workers)
+
+
+def benchmark_card_pack(brand: str = 'soulfra', workers: Optional[int] = None) -> Dict:
+    """
+    Images/sec for the card-pack workload (every card of Book 1)
+
+    Returns:
+        {'images', 'workers', 'serial', 'pool'} with images/sec for each
+    """
+    workers = workers or os.cpu_count() or 1
+    printer = QRCardPrinter(brand=brand)
+    stats = {'workers': workers}
+
+    for label, run_workers in (('serial', 1), ('pool', workers)):
+        started = time.perf_counter()
+        cards = printer.render_book_cards(workers=run_workers)
+        elapsed = time.perf_counter() - started
+        stats['images'] = len(cards)
+        stats[label] = round(len(cards) / elapsed, 1) if elapsed else 0.0
+
+    return stats
 
 
 def save_chapter_cards(chapter_number: int, output_path: str = '.', brand: str = 'soulfra'):
@@ -393,6 +468,15 @@ def save_chapter_cards(chapter_number: int, output_path: str = '.', brand: str =
 # =============================================================================
 
 if __name__ == '__main__':
+    import sys
+
+    if '--benchmark' in sys.argv:
+        stats = benchmark_card_pack()
+        print(f"Card pack ({stats['images']} cards, {stats['workers']} workers)")
+        print(f"  serial: {stats['serial']:>6.1f} images/sec")
+        print(f"  pool:   {stats['pool']:>6.1f} images/sec")
+        sys.exit(0)
+
     print("=== QR Card Printer Demo ===\n")
 
     # Example 1: Generate cards for Chapter 1
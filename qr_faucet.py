@@ -43,11 +43,11 @@ import secrets
 import time
 import hmac
 import base64
-import qrcode
-import io
 from datetime import datetime
 from typing import Dict, Optional
 
+import qr_service
+
 
 # ==============================================================================
 # CONFIG
@@ -515,26 +515,7 @@ def generate_qr_code_image(url: str) -> bytes:
     Returns:
         PNG image data as bytes
     """
-    # Create QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    # Generate image
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Save to bytes buffer
-    img_buffer = io.BytesIO()
-    img.save(img_buffer, format='PNG')
-    img_buffer.seek(0)
-
-    return img_buffer.getvalue()
+    return qr_service.png(url, ecc='L', version=1)
 
 
 def generate_qr_faucet(payload_type: str, data: Dict, ttl_seconds: int = 3600) -> Dict:
@@ -25,9 +25,9 @@ Architecture:
 
 import os
 import sys
-import qrcode
 from pathlib import Path
 from database import get_db
+import qr_service
 import hashlib
 from datetime import datetime
 import json
@@ -50,21 +50,12 @@ def generate_qr_code(url, output_path, box_size=10, border=4):
     Returns:
         Path to QR code
     """
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=box_size,
-        border=border,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
+    png_bytes = qr_service.png(url, ecc='L', version=1, box_size=box_size, border=border)
 
     # Ensure directory exists
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    img.save(output_path)
+    Path(output_path).write_bytes(png_bytes)
     return output_path
 
 
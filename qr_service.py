@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+QR Service - Shared QR encoder, module-mask renderer and PNG cache
+
+Every QR generator in the app (vanity_qr, advanced_qr, multi_part_qr,
+qr_faucet, url_shortener, qr_gallery_system, image_composer, the practice
+room route, generate_qr_codes) used to build its own qrcode.QRCode, encode
+the payload and draw the image module by module, on every request. This
+module does each step once:
+
+1. encode()       data -> module matrix, memoized by (data, ECC, version)
+2. module_mask()  matrix -> 'L' mask (255 = dark) for a style, memoized;
+                  squares are the module grid scaled with NEAREST, dots
+                  and gapped squares multiply it by a tiled module sprite,
+                  rounded modules are a blur + threshold of the squares
+3. render()       mask -> image: Image.composite of a solid (or gradient)
+                  fill over the background, no per-pixel Python
+4. png()          render() as PNG bytes, kept in an LRU (PNG_CACHE_SIZE)
+                  so hot codes (brand codes, user cards) are a dict lookup
+
+remember(key, build) puts any caller-composed PNG (logo, label, gradient)
+in the same LRU. qr_stats() reports latency and hit rates.
+
+Usage:
+    import qr_service
+
+    png_bytes = qr_service.png('https://soulfra.com', ecc='M')
+    img = qr_service.render(url, ecc='H', style='circles', fill=(139, 92, 246), size=512)
+
+    python3 qr_service.py --benchmark
+"""
+
+import io
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageOps
+
+
+PNG_CACHE_SIZE = 1024           # Final PNG bytes kept per process
+STYLES = ('square', 'gapped', 'circles', 'rounded')
+
+Color = Tuple[int, int, int]
+BLACK: Color = (0, 0, 0)
+WHITE: Color = (255, 255, 255)
+
+
+@dataclass(frozen=True)
+class QRMatrix:
+    """Encoded QR symbol: `size` x `size` modules, one byte each (255 = dark)"""
+    version: int
+    size: int
+    modules: bytes
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+@lru_cache(maxsize=4096)
+def encode(data: str, ecc: str = 'M', version: Optional[int] = None) -> QRMatrix:
+    """
+    Encode data into a module matrix (memoized)
+
+    Args:
+        data: Payload
+        ecc: Error correction level (L/M/Q/H)
+        version: Smallest version to use (1-40); grows to fit the data,
+            like qrcode's make(fit=True). None = smallest that fits.
+
+    Returns:
+        QRMatrix (hashable, shared between callers)
+    """
+    import qrcode
+
+    levels = {
+        'L': qrcode.constants.ERROR_CORRECT_L,
+        'M': qrcode.constants.ERROR_CORRECT_M,
+        'Q': qrcode.constants.ERROR_CORRECT_Q,
+        'H': qrcode.constants.ERROR_CORRECT_H,
+    }
+    qr = qrcode.QRCode(version=version, error_correction=levels.get(ecc, levels['M']),
+                       box_size=1, border=0)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    modules = bytes(255 if dark else 0 for row in qr.modules for dark in row)
+    return QRMatrix(version=qr.version, size=qr.modules_count, modules=modules)
+
+
+def best_version(data: str, ecc: str = 'M') -> int:
+    """Smallest QR version that holds data at this ECC level (exact, memoized)"""
+    return encode(data, ecc, None).version
+
+
+# =============================================================================
+# Rendering
+# =============================================================================
+
+@lru_cache(maxsize=32)
+def _sprite(style: str, box_size: int) -> Image.Image:
+    """One module's shape as an 'L' mask"""
+    sprite = Image.new('L', (box_size, box_size), 0)
+    draw = ImageDraw.Draw(sprite)
+
+    if style == 'circles':
+        draw.ellipse([0, 0, box_size - 1, box_size - 1], fill=255)
+    else:  # gapped: 80% square, centered
+        inset = round(box_size * 0.1)
+        draw.rectangle([inset, inset, box_size - 1 - inset, box_size - 1 - inset], fill=255)
+
+    return sprite
+
+
+@lru_cache(maxsize=64)
+def _tiled(style: str, box_size: int, count: int) -> Image.Image:
+    """Module sprite repeated count x count times (2 * count pastes)"""
+    sprite = _sprite(style, box_size)
+    row = Image.new('L', (count * box_size, box_size))
+    for i in range(count):
+        row.paste(sprite, (i * box_size, 0))
+
+    tiled = Image.new('L', (count * box_size, count * box_size))
+    for i in range(count):
+        tiled.paste(row, (0, i * box_size))
+    return tiled
+
+
+@lru_cache(maxsize=512)
+def module_mask(matrix: QRMatrix, style: str = 'square', box_size: int = 10, border: int = 4,
+                size: Optional[int] = None) -> Image.Image:
+    """
+    'L' mask of a symbol: 255 where modules are dark (memoized)
+
+    Shared between callers: copy() before drawing on it.
+
+    Args:
+        matrix: Encoded symbol
+        style: square, gapped, circles or rounded
+        box_size: Pixels per module
+        border: Quiet zone in modules
+        size: Final width/height in pixels (LANCZOS); None = natural size
+    """
+    grid = Image.frombytes('L', (matrix.size, matrix.size), matrix.modules)
+    grid = ImageOps.expand(grid, border=border, fill=0)
+    count = matrix.size + 2 * border
+    mask = grid.resize((count * box_size, count * box_size), Image.NEAREST)
+
+    if style in ('gapped', 'circles'):
+        mask = ImageChops.multiply(mask, _tiled(style, box_size, count))
+    elif style == 'rounded':
+        # Rounds outer corners and softens inner ones, like neighbour-aware drawers
+        mask = mask.filter(ImageFilter.GaussianBlur(radius=box_size * 0.3)).point(
+            lambda v: 255 if v >= 128 else 0)
+
+    if size and size != mask.size[0]:
+        mask = mask.resize((size, size), Image.LANCZOS)
+    return mask
+
+
+def _vertical_gradient(size: Tuple[int, int], top: Color, bottom: Color) -> Image.Image:
+    width, height = size
+    ramp = Image.frombytes('L', (1, height), bytes(int(255 * y / height) for y in range(height)))
+    return Image.composite(Image.new('RGB', size, bottom), Image.new('RGB', size, top),
+                           ramp.resize(size, Image.NEAREST))
+
+
+def colorize(mask: Image.Image, fill: Color = BLACK, back: Color = WHITE,
+             gradient_to: Optional[Color] = None) -> Image.Image:
+    """
+    Paint a module mask: fill (or a top-to-bottom fill -> gradient_to
+    gradient) where dark, back elsewhere. Black on white stays 'L'.
+    """
+    if fill == BLACK and back == WHITE and not gradient_to:
+        return ImageOps.invert(mask)
+
+    if gradient_to:
+        front = _vertical_gradient(mask.size, fill, gradient_to)
+    else:
+        front = Image.new('RGB', mask.size, fill)
+    return Image.composite(front, Image.new('RGB', mask.size, back), mask)
+
+
+def render(data: str, ecc: str = 'M', version: Optional[int] = None, style: str = 'square',
+           fill: Color = BLACK, back: Color = WHITE, gradient_to: Optional[Color] = None,
+           size: Optional[int] = None, box_size: int = 10, border: int = 4) -> Image.Image:
+    """
+    Render a QR code image from the cached matrix and mask
+
+    Returns:
+        New PIL image ('L' for black on white, else 'RGB'), safe to modify
+    """
+    mask = module_mask(encode(data, ecc, version), style, box_size, border, size)
+    return colorize(mask, fill, back, gradient_to)
+
+
+# =============================================================================
+# PNG Cache
+# =============================================================================
+
+_png_cache: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+_lock = threading.Lock()
+_stats = {'calls': 0, 'hits': 0, 'seconds': 0.0}
+
+
+def to_png(img: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def remember(key: Hashable, build: Callable[[], bytes]) -> bytes:
+    """
+    PNG bytes for key from the LRU, or build() and keep them
+
+    Args:
+        key: Everything the image depends on (include file mtimes for logos)
+        build: Produces the PNG bytes on a miss
+    """
+    started = time.perf_counter()
+    with _lock:
+        data = _png_cache.get(key)
+        hit = data is not None
+        if hit:
+            _png_cache.move_to_end(key)
+
+    if not hit:
+        data = build()
+        with _lock:
+            _png_cache[key] = data
+            while len(_png_cache) > PNG_CACHE_SIZE:
+                _png_cache.popitem(last=False)
+
+    with _lock:
+        _stats['calls'] += 1
+        _stats['hits'] += hit
+        _stats['seconds'] += time.perf_counter() - started
+    return data
+
+
+def png(data: str, ecc: str = 'M', version: Optional[int] = None, style: str = 'square',
+        fill: Color = BLACK, back: Color = WHITE, gradient_to: Optional[Color] = None,
+        size: Optional[int] = None, box_size: int = 10, border: int = 4) -> bytes:
+    """render() as PNG bytes, served from the LRU for repeat codes"""
+    params = (data, ecc, version, style, fill, back, gradient_to, size, box_size, border)
+    return remember(('qr',) + params, lambda: to_png(render(*params)))
+
+
+def qr_stats() -> Dict:
+    """Per-QR latency and hit rates for this process"""
+    matrices = encode.cache_info()
+    masks = module_mask.cache_info()
+    calls = _stats['calls']
+
+    def rate(hits, total):
+        return round(hits / total, 3) if total else 0.0
+
+    return {
+        'calls': calls,
+        'avg_ms': round(1000 * _stats['seconds'] / calls, 3) if calls else 0.0,
+        'png_hit_rate': rate(_stats['hits'], calls),
+        'matrix_hit_rate': rate(matrices.hits, matrices.hits + matrices.misses),
+        'mask_hit_rate': rate(masks.hits, masks.hits + masks.misses),
+        'png_entries': len(_png_cache),
+        'matrices': matrices.currsize,
+    }
+
+
+def clear_caches():
+    """Drop matrices, masks, PNGs and counters"""
+    for cached in (encode, module_mask, _sprite, _tiled):
+        cached.cache_clear()
+    with _lock:
+        _png_cache.clear()
+        _stats.update(calls=0, hits=0, seconds=0.0)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def benchmark(codes: int = 200, repeats: int = 5) -> Dict:
+    """
+    Per-QR latency for a card-style workload
+
+    `codes` distinct user-card URLs, requested `repeats` times each in
+    rounds (the way brand and profile codes are re-requested), in all
+    four styles.
+
+    Returns:
+        {'cold_ms', 'warm_ms', 'qr_stats'}
+    """
+    clear_caches()
+    urls = [f'https://soulfra.com/u/user{i:05d}' for i in range(codes)]
+
+    started = time.perf_counter()
+    for i, url in enumerate(urls):
+        png(url, ecc='H', style=STYLES[i % len(STYLES)], fill=(139, 92, 246), size=300)
+    cold = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(repeats - 1):
+        for i, url in enumerate(urls):
+            png(url, ecc='H', style=STYLES[i % len(STYLES)], fill=(139, 92, 246), size=300)
+    warm = time.perf_counter() - started
+
+    return {
+        'cold_ms': round(1000 * cold / codes, 3),
+        'warm_ms': round(1000 * warm / (codes * (repeats - 1)), 4) if repeats > 1 else 0.0,
+        'qr_stats': qr_stats(),
+    }
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Shared QR encoder and cache')
+    parser.add_argument('--benchmark', action='store_true', help='Measure per-QR latency and hit rates')
+    parser.add_argument('--codes', type=int, default=200)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        result = benchmark(codes=args.codes)
+        print(f"⏱️  First render:  {result['cold_ms']} ms/QR")
+        print(f"⏱️  Repeat render: {result['warm_ms']} ms/QR")
+        for key, value in result['qr_stats'].items():
+            print(f"   {key}: {value}")
+    else:
+        parser.print_help()
@@ -21,6 +21,7 @@ Usage:
 """
 
 from database import get_db
+from schema_registry import ensure_schema
 from datetime import datetime, timedelta
 from typing import Tuple, Optional
 
@@ -183,28 +184,8 @@ def format_time_remaining(seconds: int) -> str:
 
 # Initialize database tables if they don't exist
 def init_rate_limit_tables():
-    """Create tables for rate limiting (call on app startup)"""
-    db = get_db()
-
-    db.execute('''
-        CREATE TABLE IF NOT EXISTS user_question_answers (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            question_id INTEGER NOT NULL,
-            answered_at TEXT NOT NULL,
-            xp_earned INTEGER DEFAULT 10,
-            FOREIGN KEY (user_id) REFERENCES users(id)
-        )
-    ''')
-
-    # Create index for fast lookups
-    db.execute('''
-        CREATE INDEX IF NOT EXISTS idx_user_question_answers_time
-        ON user_question_answers(user_id, answered_at)
-    ''')
-
-    db.commit()
-    db.close()
+    """Create tables for rate limiting (call on app startup) - schema lives in schema_registry"""
+    ensure_schema()
 
 
 if __name__ == '__main__':
@@ -35,6 +35,11 @@ import sqlite3
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from database import get_db
+import ledger
+
+
+PAYOUT_CURRENCY = 'USD'                         # ledger amounts are cents
+TREASURY_ACCOUNT = ('system', 0, PAYOUT_CURRENCY)
 
 
 class ReactorPayoutSystem:
@@ -344,37 +349,65 @@ class ReactorPayoutSystem:
 
         return results
 
-    def distribute_payouts(self, total_revenue: float, payout_type: str = 'sponsor') -> List[Dict]:
+    def distribute_payouts(self, total_revenue: float, payout_type: str = 'sponsor',
+                           idempotency_key: Optional[str] = None) -> List[Dict]:
         """
         Distribute revenue to reactors based on weights
 
+        The whole run is one ledger posting from the treasury, split in cents
+        by largest remainder so the shares add up exactly.
+
         Args:
             total_revenue: Total amount to distribute (USD)
             payout_type: sponsor, treasury_yield, bonus
+            idempotency_key: Distribute at most once per key (e.g. 'sponsor:2026-10')
 
         Returns:
             List of payout records
         """
-        # Get all reactor weights
-        reactors = self.db.execute('''
-            SELECT user_id, total_weight
-            FROM reactor_weights
-            WHERE total_weight > 0
-            ORDER BY total_weight DESC
-        ''').fetchall()
-
-        if not reactors:
-            return []
-
+        with ledger.immediate(self.db):
+            if idempotency_key and self.db.execute(
+                    'SELECT 1 FROM ledger_postings WHERE idempotency_key = ?', (idempotency_key,)).fetchone():
+                return []
+
+            # Get all reactor weights
+            reactors = self.db.execute('''
+                SELECT user_id, total_weight
+                FROM reactor_weights
+                WHERE total_weight > 0
+                ORDER BY total_weight DESC
+            ''').fetchall()
+
+            if not reactors:
+                return []
+
+            return self._distribute(reactors, total_revenue, payout_type, idempotency_key)
+
+    def _distribute(self, reactors, total_revenue: float, payout_type: str,
+                    idempotency_key: Optional[str]) -> List[Dict]:
         # Calculate total weight pool
         total_weight_sum = sum(r['total_weight'] for r in reactors)
+        total_cents = int(round(total_revenue * 100))
+
+        # Largest remainder: floor every share, hand leftover cents to the biggest fractions
+        exact = [total_cents * r['total_weight'] / total_weight_sum for r in reactors]
+        cents = [int(share) for share in exact]
+        by_remainder = sorted(range(len(exact)), key=lambda i: exact[i] - cents[i], reverse=True)
+        for i in by_remainder[:total_cents - sum(cents)]:
+            cents[i] += 1
+
+        ledger.post(
+            [(TREASURY_ACCOUNT, -total_cents)] +
+            [(('user', r['user_id'], PAYOUT_CURRENCY), c) for r, c in zip(reactors, cents)],
+            kind='reactor_payout', memo=payout_type, idempotency_key=idempotency_key, db=self.db
+        )
 
         payouts = []
 
-        for reactor in reactors:
+        for reactor, share_cents in zip(reactors, cents):
             # Proportional share based on weight
             weight_ratio = reactor['total_weight'] / total_weight_sum
-            payout_amount = total_revenue * weight_ratio
+            payout_amount = share_cents / 100
 
             # Record payout
             self.db.execute('''
@@ -397,8 +430,6 @@ class ReactorPayoutSystem:
                 'share_percentage': round(weight_ratio * 100, 2)
             })
 
-        self.db.commit()
-
         return payouts
 
     def get_leaderboard(self, limit: int = 10) -> List[Dict]:
@@ -30,6 +30,8 @@ import urllib.request
 import urllib.error
 from email.utils import parsedate_to_datetime
 
+from full_text_search import index_feed_items, search as full_text_search
+
 # ANSI colors
 GREEN = '\033[92m'
 YELLOW = '\033[93m'
@@ -244,19 +246,41 @@ class RSSAggregator:
 
         self.items = deduplicated
 
+        # Keep the full-text index current (only changed items are rewritten)
+        try:
+            index_feed_items(self.items)
+        except Exception as e:
+            print(f"{YELLOW}⚠️  Could not index feed items: {e}{NC}")
+
         print(f"{GREEN}✅ Total items aggregated: {len(self.items)}{NC}\n")
 
         return self.items
 
-    def search(self, query: str, case_sensitive=False) -> List[Dict]:
-        """Search aggregated items by keyword"""
+    def search(self, query: str, case_sensitive=False, limit: int = 100, source: str = None) -> List[Dict]:
+        """
+        Search aggregated items by keyword
+
+        Uses the feed_items full-text index (BM25-ranked, prefix matching);
+        case_sensitive=True keeps the exact substring scan.
+        """
         if not self.items:
             self.aggregate_all(fetch_remote=False)
 
+        if not case_sensitive:
+            try:
+                by_guid = {item['guid']: item for item in self.items}
+                rows = full_text_search('feed_items', query, limit=limit, brand=source, select='t.guid')
+                return [by_guid[row['guid']] for row in rows if row['guid'] in by_guid]
+            except Exception as e:
+                print(f"{YELLOW}⚠️  Full-text search unavailable, scanning: {e}{NC}")
+
         query_lower = query if case_sensitive else query.lower()
 
         results = []
         for item in self.items:
+            if source and item.get('source') != source:
+                continue
+
             title = item.get('title', '')
             description = item.get('description', '')
             combined = f"{title} {description}"
@@ -267,7 +291,7 @@ class RSSAggregator:
             if query_lower in combined:
                 results.append(item)
 
-        return results
+        return results[:limit]
 
     def get_paginated(self, offset=0, limit=10) -> Dict:
         """Get paginated items for API response"""
@@ -422,6 +446,7 @@ def search_aggregated_feed():
     Query params:
       - q: Search query
       - limit: Max results (default 20)
+      - source: Only items from this feed source
 
     Response:
       {
@@ -437,7 +462,7 @@ def search_aggregated_feed():
         return jsonify({'error': 'Missing query parameter "q"'}), 400
 
     aggregator = get_aggregator()
-    results = aggregator.search(query)[:limit]
+    results = aggregator.search(query, limit=limit, source=request.args.get('source'))
 
     return jsonify({
         'query': query,
@@ -0,0 +1,883 @@
+#!/usr/bin/env python3
+"""
+Schema Registry - Declarative, versioned schema for soulfra.db
+
+One place that owns table/index definitions instead of dozens of
+init_*_tables() functions each running CREATE TABLE on every call.
+
+Features:
+- Versioned migrations recorded in schema_migrations (applied once)
+- Loose SQL files in migrations/ registered as ordinary versions
+- Feature modules register their own versions; they are imported lazily
+  (MIGRATION_MODULES) the first time migrations run, not when this module
+  is imported
+- A version whose table doesn't exist yet stays pending with its reason;
+  versions that depend on it (depends_on) wait instead of running against
+  a partial schema
+- ensure_schema() is a cheap no-op once everything is applied, and
+  retries pending versions every ENSURE_RETRY_SECONDS
+- IndexAdvisor: captures real query shapes during a workload run,
+  flags full-table scans via EXPLAIN QUERY PLAN and proposes (or
+  creates) covering indexes, with a before/after plan report per route
+
+Usage:
+    from schema_registry import ensure_schema
+    ensure_schema()                      # app startup
+
+    from schema_registry import IndexAdvisor
+    advisor = IndexAdvisor()
+    with advisor.capture():
+        client.get('/brands')            # any workload
+    advisor.analyze()
+    advisor.apply()                      # optional: create proposed indexes
+    print(advisor.report())
+
+CLI:
+    python3 schema_registry.py                 # apply pending migrations
+    python3 schema_registry.py status          # list applied/pending versions
+    python3 schema_registry.py advise [--apply] [/route ...]
+"""
+
+import importlib
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import database
+from database import get_db
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+ENSURE_RETRY_SECONDS = 60       # How often ensure_schema() retries pending versions
+
+# Modules that register their own versions (imported on first get_migrations())
+MIGRATION_MODULES = (
+    'full_text_search',     # 9-15
+    'syndication',          # 16-21, 131
+    'blamechain',           # 108, 130
+    'pseo_generator',       # 109
+    'ownership_ledger',     # 111
+    'ledger',               # 112
+    'github_cache',         # 113
+    'crawler',              # 114
+    'bulk_import',          # 115
+    'encryption_jobs',      # 116
+    'voice_segments',       # 117
+    'delta_sync',           # 118-129
+)
+
+# Errors that mean "this statement already ran" - treated as success
+_ALREADY_APPLIED_ERRORS = ('duplicate column name', 'already exists')
+
+# Errors that mean "the owning module hasn't created this table/column yet" - retried next startup
+_MISSING_OBJECT_ERRORS = ('no such table', 'no such column')
+
+
+@dataclass
+class Migration:
+    """A single schema version"""
+    version: int
+    name: str
+    statements: List[str] = field(default_factory=list)
+    module: Optional[str] = None     # Module that owns the tables (documentation only)
+    depends_on: Tuple[int, ...] = ()  # Versions that must be applied first
+
+
+_MIGRATIONS: Dict[int, Migration] = {}
+_modules_loaded = False
+_modules_lock = threading.RLock()
+_ensured_until: Dict[str, float] = {}    # db path -> next retry (inf once nothing is pending)
+_last_pending: Dict[str, Dict[int, str]] = {}
+_ensure_lock = threading.Lock()
+
+
+def register_migration(version: int, name: str, *statements: str, module: Optional[str] = None,
+                       depends_on: Tuple[int, ...] = ()) -> Migration:
+    """
+    Register a schema version
+
+    Args:
+        version: Unique, increasing integer
+        name: Short description
+        statements: SQL statements (each run separately)
+        module: Owning module name
+        depends_on: Earlier versions this one builds on; it waits while any
+            of them is pending
+
+    Returns:
+        The registered Migration
+    """
+    existing = _MIGRATIONS.get(version)
+    if existing is not None:
+        if (existing.name, existing.module) == (name, module):
+            return existing             # Same module imported twice (e.g. run as __main__)
+        raise ValueError(f"Schema version {version} already registered ({existing.name})")
+    if any(dependency >= version for dependency in depends_on):
+        raise ValueError(f"Schema version {version} can only depend on earlier versions: {depends_on}")
+
+    migration = Migration(version=version, name=name, statements=list(statements), module=module,
+                          depends_on=tuple(depends_on))
+    _MIGRATIONS[version] = migration
+    return migration
+
+
+def register_sql_file(version: int, filename: str) -> Migration:
+    """Register a loose .sql file from migrations/ as a schema version"""
+    with open(os.path.join(MIGRATIONS_DIR, filename)) as f:
+        statements = split_sql(f.read())
+    return register_migration(version, f"file:{filename}", *statements, module='migrations')
+
+
+def split_sql(script: str) -> List[str]:
+    """Split a SQL script into complete statements (handles triggers/strings)"""
+    statements = []
+    buffer = ''
+
+    for line in script.splitlines(keepends=True):
+        if not buffer.strip() and line.strip().startswith('--'):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip()
+            # COMMENT ON is PostgreSQL-only documentation; SQLite can't parse it
+            if statement.rstrip(';').strip() and not statement.upper().startswith('COMMENT ON'):
+                statements.append(statement)
+            buffer = ''
+
+    if buffer.strip():
+        statements.append(buffer.strip())
+
+    return statements
+
+
+def _load_migration_modules():
+    """Import MIGRATION_MODULES once so their register_migration() calls run"""
+    global _modules_loaded
+    if _modules_loaded:
+        return
+    with _modules_lock:
+        if _modules_loaded:
+            return
+        _modules_loaded = True
+        for name in MIGRATION_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError as e:
+                # Its versions stay unregistered; versions depending on them wait
+                print(f"⚠️  Schema migrations from {name} not loaded: {e}")
+
+
+def get_migrations() -> List[Migration]:
+    """All registered migrations in version order"""
+    _load_migration_modules()
+    return [_MIGRATIONS[v] for v in sorted(_MIGRATIONS)]
+
+
+# ==============================================================================
+# MIGRATION RUNNER
+# ==============================================================================
+
+def _init_migrations_table(db):
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+
+
+def get_applied_versions(db=None) -> Dict[int, str]:
+    """Map of applied version -> applied_at"""
+    own_db = db is None
+    db = db or get_db()
+    try:
+        _init_migrations_table(db)
+        rows = db.execute('SELECT version, applied_at FROM schema_migrations').fetchall()
+        return {row[0]: row[1] for row in rows}
+    finally:
+        if own_db:
+            db.close()
+
+
+def _apply_migration(db, migration: Migration) -> Optional[str]:
+    """
+    Run one migration's statements
+
+    Returns:
+        None if fully applied, else why it is pending: the error of a
+        statement targeting a table/column that doesn't exist yet (retried
+        later, along with the versions that depend on it)
+    """
+    for statement in migration.statements:
+        try:
+            db.execute(statement)
+        except sqlite3.OperationalError as e:
+            message = str(e).lower()
+            if any(err in message for err in _ALREADY_APPLIED_ERRORS):
+                continue
+            if any(err in message for err in _MISSING_OBJECT_ERRORS):
+                # Later statements may depend on the missing object
+                return str(e)
+            raise
+
+    db.execute('''
+        INSERT OR REPLACE INTO schema_migrations (version, name, applied_at)
+        VALUES (?, ?, ?)
+    ''', (migration.version, migration.name, datetime.now().isoformat()))
+    return None
+
+
+def _connect(db_path: Optional[str] = None):
+    if db_path is None:
+        return get_db()
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def run_migrations(verbose: bool = False, db_path: Optional[str] = None) -> Dict[str, List[int]]:
+    """
+    Apply every pending migration
+
+    Args:
+        verbose: Print each version as it runs
+        db_path: SQLite file (default: the app database)
+
+    Returns:
+        Dict with 'applied' and 'pending' version lists, and 'reasons'
+        (pending version -> missing table/column or the versions it waits for)
+    """
+    db = _connect(db_path)
+    applied, pending, reasons = [], [], {}
+
+    try:
+        done = set(get_applied_versions(db))
+
+        for migration in get_migrations():
+            if migration.version in done:
+                continue
+
+            waiting = [v for v in migration.depends_on if v not in done]
+            if waiting:
+                reason = f"waits for {', '.join(map(str, waiting))}"
+            else:
+                try:
+                    reason = _apply_migration(db, migration)
+                    db.commit()         # Statements are idempotent; partial progress is kept
+                except Exception:
+                    db.rollback()
+                    raise
+
+            if reason is None:
+                applied.append(migration.version)
+                done.add(migration.version)
+            else:
+                pending.append(migration.version)
+                reasons[migration.version] = reason
+            if verbose:
+                status = '✅' if reason is None else f'⏳ ({reason})'
+                print(f"   {migration.version:>4}  {migration.name}  {status}")
+    finally:
+        db.close()
+
+    return {'applied': applied, 'pending': pending, 'reasons': reasons}
+
+
+def ensure_schema(db_path: Optional[str] = None):
+    """
+    Apply pending migrations for a database
+
+    Safe to call from every init_*_tables() / constructor - once every
+    version is applied it returns without touching SQLite. While some are
+    pending (their tables not created yet) they are retried at most every
+    ENSURE_RETRY_SECONDS, and the reasons are printed when they change.
+
+    Args:
+        db_path: SQLite file other than the app database (a laptop copy,
+            a mounted server database)
+    """
+    path = db_path or database.DB_PATH
+    if time.monotonic() < _ensured_until.get(path, 0):
+        return
+
+    with _ensure_lock:
+        if time.monotonic() < _ensured_until.get(path, 0):
+            return
+        result = run_migrations(db_path=db_path)
+        if result['pending']:
+            _ensured_until[path] = time.monotonic() + ENSURE_RETRY_SECONDS
+            if _last_pending.get(path) != result['reasons']:
+                _last_pending[path] = result['reasons']
+                print(f"⏳ {len(result['pending'])} schema migrations pending for {os.path.basename(path)}: "
+                      + '; '.join(f"{v} {reason}" for v, reason in sorted(result['reasons'].items())))
+        else:
+            _ensured_until[path] = math.inf
+
+
+def reset_ensure_cache():
+    """Forget which databases were ensured (tests / SOULFRA_DB switches)"""
+    _ensured_until.clear()
+    _last_pending.clear()
+
+
+# ==============================================================================
+# INDEX ADVISOR
+# ==============================================================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?![\w])")
+_BINDINGS_ERROR = re.compile(r'uses (\d+)')
+_FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_SQL_KEYWORDS = {
+    'where', 'on', 'join', 'left', 'right', 'inner', 'outer', 'cross', 'order', 'group',
+    'limit', 'set', 'using', 'natural', 'having', 'union', 'values', 'select', 'as',
+}
+_ANALYZABLE = ('select', 'update', 'delete', 'with')
+
+
+def normalize_query(sql: str) -> str:
+    """
+    Reduce an expanded SQL statement to its shape
+
+    Literal values become ?, JSON paths ('$.brand_id') are kept because they
+    are part of the indexed expression.
+    """
+    def _string(match):
+        literal = match.group(0)
+        return literal if literal.startswith("'$") else '?'
+
+    shape = _STRING_LITERAL.sub(_string, sql)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = re.sub(r'\s+', ' ', shape).strip().rstrip(';')
+    shape = re.sub(r'\bIN \((?:\?,? ?)+\)', 'IN (?)', shape, flags=re.IGNORECASE)
+    return shape
+
+
+@dataclass
+class QueryShape:
+    """A normalized query seen during a workload run"""
+    sql: str
+    count: int = 0
+    routes: Counter = field(default_factory=Counter)
+    plan_before: List[str] = field(default_factory=list)
+    plan_after: List[str] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+    proposals: List[str] = field(default_factory=list)
+
+
+class IndexAdvisor:
+    """Capture a workload, find full scans, propose covering indexes"""
+
+    def __init__(self):
+        self.shapes: Dict[str, QueryShape] = {}
+        self.proposed: Dict[str, str] = {}      # index name -> CREATE INDEX statement
+        self.created: List[str] = []
+        self._lock = threading.Lock()
+        self._route = None
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+
+    def _current_route(self) -> str:
+        if self._route:
+            return self._route
+        try:
+            from flask import has_request_context, request
+            if has_request_context():
+                return request.url_rule.rule if request.url_rule else request.path
+        except ImportError:
+            pass
+        return '(no route)'
+
+    def observe(self, sql: str):
+        """Trace callback - record one executed statement"""
+        if not sql.lstrip().lower().startswith(_ANALYZABLE):
+            return
+
+        shape = normalize_query(sql)
+        route = self._current_route()
+
+        with self._lock:
+            entry = self.shapes.get(shape)
+            if entry is None:
+                entry = self.shapes[shape] = QueryShape(sql=shape)
+            entry.count += 1
+            entry.routes[route] += 1
+
+    @contextmanager
+    def capture(self):
+        """Record every statement run through database.get_db() in this block"""
+        database.set_query_observer(self.observe)
+        try:
+            yield self
+        finally:
+            database.set_query_observer(None)
+
+    @contextmanager
+    def route(self, label: str):
+        """Attribute captured queries to a label (when not inside a Flask request)"""
+        previous, self._route = self._route, label
+        try:
+            yield
+        finally:
+            self._route = previous
+
+    # ------------------------------------------------------------------
+    # Analysis
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def explain(db, sql: str) -> List[str]:
+        """EXPLAIN QUERY PLAN with NULL bound to every placeholder"""
+        params: Tuple = ()
+        for _ in range(2):
+            try:
+                rows = db.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+                return [row[3] for row in rows]
+            except sqlite3.ProgrammingError as e:
+                match = _BINDINGS_ERROR.search(str(e))
+                if not match:
+                    raise
+                params = (None,) * int(match.group(1))
+        return []
+
+    @staticmethod
+    def _table_columns(db, table: str) -> List[str]:
+        return [row[1] for row in db.execute(f'PRAGMA table_info("{table}")').fetchall()]
+
+    @staticmethod
+    def _aliases(sql: str) -> Dict[str, str]:
+        """Map alias (or table name) -> table name for FROM/JOIN/UPDATE clauses"""
+        aliases = {}
+        for table, alias in _TABLE_REF.findall(sql):
+            if table.lower() in _SQL_KEYWORDS:
+                continue
+            aliases[table] = table
+            if alias and alias.lower() not in _SQL_KEYWORDS:
+                aliases[alias] = table
+        return aliases
+
+    def propose_index(self, db, sql: str, scanned: str) -> Optional[str]:
+        """
+        Build a CREATE INDEX for a scanned table from the query's filters
+
+        Equality columns first, then one range column, then ORDER BY
+        columns - the usual left-prefix rule for B-tree indexes.
+        """
+        aliases = self._aliases(sql)
+        table = aliases.get(scanned, scanned)
+        columns = set(self._table_columns(db, table))
+        if not columns:
+            return None
+
+        names = [name for name, target in aliases.items() if target == table]
+        qualifier = r'(?:(?:' + '|'.join(map(re.escape, names)) + r')\.)?'
+
+        where_match = re.search(r'\bWHERE\b(.*?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)', sql,
+                                re.IGNORECASE | re.DOTALL)
+        where = where_match.group(1) if where_match else ''
+        order_match = re.search(r'\bORDER BY\b(.*?)(?:\bLIMIT\b|$)', sql, re.IGNORECASE | re.DOTALL)
+        order = order_match.group(1) if order_match else ''
+
+        keys: List[str] = []
+
+        def _add(key):
+            if key not in keys:
+                keys.append(key)
+
+        # json_extract(metadata, '$.x') = ?  -> expression index
+        for col, path in re.findall(
+                qualifier + r"json_extract\(\s*" + qualifier + r"(\w+)\s*,\s*('\$[^']*')\s*\)\s*(?:=|\bIN\b|\bIS\b)",
+                where, re.IGNORECASE):
+            if col in columns:
+                _add(f"json_extract({col}, {path})")
+
+        for col in re.findall(r'(?<![\w.])' + qualifier + r'(\w+)\s*(?:=|\bIN\b|\bIS\b)(?!=)', where,
+                              re.IGNORECASE):
+            if col in columns:
+                _add(col)
+
+        for col in re.findall(r'(?<![\w.])' + qualifier + r'(\w+)\s*(?:>=|<=|>|<|\bBETWEEN\b|\bLIKE\b)',
+                              where, re.IGNORECASE):
+            if col in columns:
+                _add(col)
+                break
+
+        for col in re.findall(r'(?<![\w.])' + qualifier + r'(\w+)', order):
+            if col in columns:
+                _add(col)
+
+        if not keys:
+            return None
+
+        slug = '_'.join(re.sub(r'\W+', '_', key).strip('_') for key in keys)
+        index_name = f"idx_auto_{table}_{slug}"[:60].rstrip('_')
+        return f'CREATE INDEX IF NOT EXISTS {index_name} ON {table}({", ".join(keys)})'
+
+    def analyze(self) -> List[QueryShape]:
+        """EXPLAIN every captured shape; return the ones doing full scans"""
+        db = get_db()
+        flagged = []
+
+        try:
+            for shape in self.shapes.values():
+                try:
+                    shape.plan_before = self.explain(db, shape.sql)
+                except sqlite3.Error as e:
+                    shape.plan_before = [f'(explain failed: {e})']
+                    continue
+
+                shape.full_scans = [m.group(1) for m in map(_FULL_SCAN.match, shape.plan_before) if m]
+                for scanned in shape.full_scans:
+                    statement = self.propose_index(db, shape.sql, scanned)
+                    if statement:
+                        shape.proposals.append(statement)
+                        self.proposed[statement.split()[5]] = statement
+
+                if shape.full_scans:
+                    flagged.append(shape)
+        finally:
+            db.close()
+
+        return flagged
+
+    def apply(self) -> List[str]:
+        """Create every proposed index and record after-plans"""
+        db = get_db()
+
+        try:
+            for name, statement in self.proposed.items():
+                db.execute(statement)
+                self.created.append(name)
+            db.commit()
+
+            for shape in self.shapes.values():
+                if shape.full_scans:
+                    try:
+                        shape.plan_after = self.explain(db, shape.sql)
+                    except sqlite3.Error as e:
+                        shape.plan_after = [f'(explain failed: {e})']
+        finally:
+            db.close()
+
+        return self.created
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self, top_routes: int = 10) -> str:
+        """Before/after plans for full-scan queries, grouped by busiest route"""
+        by_route = defaultdict(list)
+        route_totals = Counter()
+
+        for shape in self.shapes.values():
+            for route, count in shape.routes.items():
+                route_totals[route] += count
+                if shape.full_scans:
+                    by_route[route].append(shape)
+
+        lines = ['=' * 80, 'INDEX ADVISOR REPORT', '=' * 80,
+                 f"Query shapes: {len(self.shapes)}   "
+                 f"Full-scan shapes: {sum(1 for s in self.shapes.values() if s.full_scans)}   "
+                 f"Proposed indexes: {len(self.proposed)}   Created: {len(self.created)}", '']
+
+        for route, total in route_totals.most_common(top_routes):
+            lines.append(f"{route}  ({total} queries)")
+            shapes = sorted(by_route.get(route, []), key=lambda s: -s.routes[route])
+            if not shapes:
+                lines.append('   ✅ no full-table scans')
+            for shape in shapes:
+                lines.append(f"   [{shape.routes[route]}x] {shape.sql[:140]}")
+                lines.extend(f"      before: {step}" for step in shape.plan_before)
+                lines.extend(f"      after:  {step}" for step in shape.plan_after)
+                lines.extend(f"      ➕ {statement}" for statement in shape.proposals)
+            lines.append('')
+
+        return '\n'.join(lines)
+
+
+# ==============================================================================
+# SCHEMA DEFINITIONS
+# ==============================================================================
+
+# --- rate_limiter -------------------------------------------------------------
+register_migration(
+    1, 'question rate limiting',
+    '''
+    CREATE TABLE IF NOT EXISTS user_question_answers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        answered_at TEXT NOT NULL,
+        xp_earned INTEGER DEFAULT 10,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_user_question_answers_time ON user_question_answers(user_id, answered_at)',
+    module='rate_limiter',
+)
+
+# --- notifications ------------------------------------------------------------
+register_migration(
+    2, 'in-app notifications',
+    '''
+    CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        title TEXT NOT NULL,
+        message TEXT NOT NULL,
+        url TEXT,
+        icon TEXT,
+        read BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_notifications_user_read ON notifications(user_id, read)',
+    'CREATE INDEX IF NOT EXISTS idx_notifications_created ON notifications(created_at DESC)',
+    module='notifications',
+)
+
+# --- anki_learning_system -----------------------------------------------------
+register_migration(
+    3, 'spaced repetition learning',
+    '''
+    CREATE TABLE IF NOT EXISTS learning_cards (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tutorial_id INTEGER,
+        question TEXT NOT NULL,
+        answer TEXT,
+        explanation TEXT,
+        question_type TEXT,
+        difficulty_predicted REAL,
+        neural_classifier TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (tutorial_id) REFERENCES tutorials(id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS learning_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        card_id INTEGER NOT NULL,
+        user_id INTEGER,
+        repetitions INTEGER DEFAULT 0,
+        ease_factor REAL DEFAULT 2.5,
+        interval_days INTEGER DEFAULT 1,
+        last_reviewed TIMESTAMP,
+        next_review TIMESTAMP,
+        total_reviews INTEGER DEFAULT 0,
+        correct_reviews INTEGER DEFAULT 0,
+        streak INTEGER DEFAULT 0,
+        status TEXT DEFAULT 'new',
+        FOREIGN KEY (card_id) REFERENCES learning_cards(id),
+        FOREIGN KEY (user_id) REFERENCES users(id),
+        UNIQUE(card_id, user_id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS learning_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        session_start TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        session_end TIMESTAMP,
+        cards_reviewed INTEGER DEFAULT 0,
+        cards_correct INTEGER DEFAULT 0,
+        session_duration_seconds INTEGER,
+        session_type TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS review_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        card_id INTEGER NOT NULL,
+        user_id INTEGER,
+        session_id INTEGER,
+        quality INTEGER NOT NULL,
+        time_to_answer_seconds INTEGER,
+        reviewed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (card_id) REFERENCES learning_cards(id),
+        FOREIGN KEY (user_id) REFERENCES users(id),
+        FOREIGN KEY (session_id) REFERENCES learning_sessions(id)
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS learning_paths (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        path_name TEXT NOT NULL,
+        description TEXT,
+        topic TEXT,
+        card_count INTEGER DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS path_cards (
+        path_id INTEGER NOT NULL,
+        card_id INTEGER NOT NULL,
+        position INTEGER,
+        FOREIGN KEY (path_id) REFERENCES learning_paths(id),
+        FOREIGN KEY (card_id) REFERENCES learning_cards(id),
+        UNIQUE(path_id, card_id)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_next_review ON learning_progress(next_review)',
+    'CREATE INDEX IF NOT EXISTS idx_card_user ON learning_progress(card_id, user_id)',
+    'CREATE INDEX IF NOT EXISTS idx_session_user ON learning_sessions(user_id)',
+    module='anki_learning_system',
+)
+# Per-user due queue + new-card cursor (get_cards_due / NEW_CARDS_SQL)
+register_migration(
+    110, 'spaced repetition due queue',
+    'CREATE INDEX IF NOT EXISTS idx_progress_user_due ON learning_progress(user_id, next_review)',
+    '''
+    CREATE TABLE IF NOT EXISTS learning_new_cursor (
+        user_id INTEGER PRIMARY KEY,
+        last_card_id INTEGER NOT NULL DEFAULT 0
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_learning_cards_tutorial ON learning_cards(tutorial_id, question)',
+    module='anki_learning_system',
+)
+
+# --- affiliate_link_tracker ---------------------------------------------------
+register_migration(
+    4, 'referral tracking',
+    '''
+    CREATE TABLE IF NOT EXISTS referral_codes (
+        code TEXT PRIMARY KEY,
+        domain TEXT NOT NULL,
+        referrer_user_id INTEGER,
+        campaign TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS user_journeys (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        domain_sequence TEXT,
+        entry_domain TEXT,
+        current_domain TEXT,
+        referral_code TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS referral_earnings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        referrer_domain TEXT NOT NULL,
+        referred_user_id INTEGER NOT NULL,
+        target_domain TEXT NOT NULL,
+        ownership_earned REAL NOT NULL,
+        referral_type TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_user_journeys_user ON user_journeys(user_id)',
+    module='affiliate_link_tracker',
+)
+
+# --- hot lookups with no supporting index -------------------------------------
+# Tables owned by other modules; if a table doesn't exist yet this version stays
+# pending and is retried on the next startup.
+register_migration(
+    5, 'voice idea share links',
+    'CREATE INDEX IF NOT EXISTS idx_voice_ideas_public_hash ON voice_ideas(public_hash)',
+    module='voice_idea_board_routes',
+)
+register_migration(
+    6, 'cringe vote lookups',
+    'CREATE INDEX IF NOT EXISTS idx_cringe_votes_pairing ON cringe_votes(pairing_id)',
+    module='cringe_feed',
+)
+register_migration(
+    7, 'brand lookups by domain/slug',
+    'CREATE INDEX IF NOT EXISTS idx_brands_domain ON brands(domain)',
+    'CREATE INDEX IF NOT EXISTS idx_brands_slug ON brands(slug)',
+    module='brand_router',
+)
+register_migration(
+    8, 'images by brand metadata',
+    "CREATE INDEX IF NOT EXISTS idx_images_meta_brand ON images(json_extract(metadata, '$.brand_id'), json_extract(metadata, '$.type'))",
+    "CREATE INDEX IF NOT EXISTS idx_images_meta_user ON images(json_extract(metadata, '$.username'), json_extract(metadata, '$.type'))",
+    module='image_dataset',
+)
+
+# --- migrations/*.sql ---------------------------------------------------------
+# add_cringe_feed.sql is superseded by add_cringe_feed_fixed.sql and not registered.
+register_sql_file(100, 'add_blamechain.sql')
+register_sql_file(101, 'add_ai_workforce.sql')
+register_sql_file(102, 'add_categories_table.sql')
+register_sql_file(103, 'add_cringe_feed_fixed.sql')
+register_sql_file(104, 'add_content_hash_to_pairings.sql')
+register_sql_file(105, 'add_encryption_columns.sql')
+register_sql_file(106, 'add_purchases_table.sql')
+register_sql_file(107, 'add_wall_comments.sql')
+
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+DEFAULT_ADVISOR_ROUTES = ['/', '/brands', '/voice-ideas', '/cringeproof', '/learn', '/notifications']
+
+
+def _advise(paths: List[str], apply: bool):
+    """Run GET requests through the Flask test client and print the advisor report"""
+    from app import app
+
+    advisor = IndexAdvisor()
+    client = app.test_client()
+
+    with advisor.capture():
+        for path in paths:
+            try:
+                client.get(path)
+            except Exception as e:
+                print(f"⚠️  {path}: {e}")
+
+    flagged = advisor.analyze()
+    print(f"🔎 {len(flagged)} query shapes doing full-table scans")
+
+    if apply:
+        created = advisor.apply()
+        print(f"✅ Created {len(created)} indexes")
+
+    print(advisor.report())
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'migrate'
+
+    if command == 'status':
+        done = get_applied_versions()
+        for migration in get_migrations():
+            mark = '✅' if migration.version in done else '⏳'
+            print(f"{mark} {migration.version:>4}  {migration.name:40} {migration.module or ''}")
+
+    elif command == 'advise':
+        args = sys.argv[2:]
+        apply = '--apply' in args
+        paths = [a for a in args if a != '--apply'] or DEFAULT_ADVISOR_ROUTES
+        _advise(paths, apply)
+
+    else:
+        print("🗄️  Applying schema migrations...")
+        result = run_migrations(verbose=True)
+        print(f"\n✅ Applied {len(result['applied'])}, pending {len(result['pending'])} (tables not created yet)")
@@ -8,7 +8,10 @@ Scrapes your live GitHub Pages sites to find:
 - Mismatched titles/meta tags
 - Content that should be in database but isn't
 
-Uses BeautifulSoup to parse HTML and store structured audit data.
+Uses BeautifulSoup to parse HTML and store structured audit data. Pages are
+fetched by crawler.Crawler: all domains are crawled concurrently with a
+per-host politeness delay, robots.txt is honoured, and unchanged pages are
+revalidated with conditional GETs.
 
 Usage:
     python3 scrape_live_domains.py
@@ -23,7 +26,8 @@ import json
 from datetime import datetime
 from urllib.parse import urljoin, urlparse
 import argparse
-import time
+
+from crawler import Crawler
 
 DB_PATH = 'soulfra.db'
 
@@ -42,15 +46,12 @@ DOMAINS = [
 class DomainScraper:
     """Scrape live sites and audit content"""
 
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, crawler=None):
         self.db = sqlite3.connect(db_path)
         self.db.row_factory = sqlite3.Row
-        self.visited_urls = set()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
-                         'AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Half a second between requests to one host (the old per-page sleep),
+        # but every host is crawled at the same time
+        self.crawler = crawler or Crawler(per_host=2, delay=0.5)
 
     def init_audit_tables(self):
         """Create tables for storing scrape results"""
@@ -102,14 +103,15 @@ class DomainScraper:
 
     def scrape_url(self, url, domain):
         """Scrape a single URL and extract structured data"""
-        if url in self.visited_urls:
-            return None
+        return self.store_page(self.crawler.fetch(url), domain)
 
-        self.visited_urls.add(url)
+    def store_page(self, response, domain):
+        """Parse a fetched page and store its audit rows"""
+        url = response.requested_url
         print(f"🔍 Scraping: {url}")
 
         try:
-            response = self.session.get(url, timeout=10)
+            response.raise_for_error()
             status_code = response.status_code
 
             if status_code != 200:
@@ -214,10 +216,33 @@ class DomainScraper:
 
     def scrape_domain(self, domain, full_crawl=False):
         """Scrape a domain and optionally crawl all internal links"""
+        return self.scrape_domains([domain], full_crawl)
+
+    def scrape_domains(self, domains, full_crawl=False):
+        """Scrape several domains in one concurrent crawl"""
         print(f"\n{'='*80}")
-        print(f"🌐 Scraping Domain: {domain}")
+        print(f"🌐 Scraping Domains: {', '.join(domains)}")
         print(f"{'='*80}\n")
 
+        seeds = [url for domain in domains for url in self._seed_urls(domain)]
+        scraped_data = []
+
+        def on_page(response):
+            result = self.store_page(response, urlparse(response.requested_url).netloc)
+            if not result:
+                return []
+            scraped_data.append(result)
+            # If full crawl, follow the first 20 links (same host only)
+            return [urljoin(response.url, link.get('href')) for link in result['links'][:20]]
+
+        stats = self.crawler.crawl(seeds, on_page=on_page, max_pages=len(seeds) * 21,
+                                   max_depth=1 if full_crawl else 0)
+        print(f"\n📊 {stats['pages']} pages in {stats['seconds']}s ({stats['pages_per_sec']} pages/sec), "
+              f"{stats['not_modified']} unchanged, {stats['robots_blocked']} blocked by robots.txt")
+
+        return scraped_data
+
+    def _seed_urls(self, domain):
         # Try both http and https
         urls_to_try = [
             f'https://{domain}',
@@ -231,25 +256,7 @@ class DomainScraper:
                 f'https://{domain}/soulfra/index.html',
             ])
 
-        scraped_data = []
-        for url in urls_to_try:
-            result = self.scrape_url(url, domain)
-            if result:
-                scraped_data.append(result)
-
-                # If full crawl, follow internal links
-                if full_crawl:
-                    for link in result['links'][:20]:  # Limit to first 20 links
-                        href = link.get('href')
-                        abs_url = urljoin(url, href)
-
-                        # Only crawl same domain
-                        if urlparse(abs_url).netloc == urlparse(url).netloc:
-                            if abs_url not in self.visited_urls:
-                                time.sleep(0.5)  # Be polite
-                                self.scrape_url(abs_url, domain)
-
-        return scraped_data
+        return urls_to_try
 
     def detect_duplicates(self):
         """Find duplicate content across different URLs"""
@@ -313,7 +320,7 @@ class DomainScraper:
         if errors:
             print(f"\n❌ Errors ({len(errors)}):")
             for error in errors[:10]:
-                print(f"  • {error['url']} - {error['http_error'] or f'HTTP {error['status_code']}'}")
+                print(f"  • {error['url']} - {error['http_error'] or 'HTTP ' + str(error['status_code'])}")
 
         # Duplicates
         dups = self.db.execute('''
@@ -364,10 +371,8 @@ def main():
         if args.domain:
             scraper.scrape_domain(args.domain, full_crawl=args.full_crawl)
         else:
-            # Scrape all configured domains
-            for domain in DOMAINS:
-                scraper.scrape_domain(domain, full_crawl=args.full_crawl)
-                time.sleep(1)  # Be polite between domains
+            # Scrape all configured domains (concurrently, polite per host)
+            scraper.scrape_domains(DOMAINS, full_crawl=args.full_crawl)
 
         # Detect duplicates
         dup_count = scraper.detect_duplicates()
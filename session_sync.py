@@ -7,10 +7,14 @@ User workflow:
 1. Laptop generates QR code with session token
 2. Phone scans QR -> inherits session (user_id, domains, voice memos, progress)
 3. Phone can generate QR -> laptop scans to pull session back
+4. Signed-in devices keep their offline work in sync through
+   /api/session/delta - one round trip per sync carrying only the rows that
+   changed (delta_sync.py), instead of a snapshot per device sync
 """
 
-from flask import Blueprint, request, jsonify, session, render_template_string
+from flask import Blueprint, request, jsonify, session, render_template_string, Response
 from database import get_db
+from delta_sync import DeltaSync
 import secrets
 import time
 from typing import Dict, Optional
@@ -172,6 +176,7 @@ class SessionSyncManager:
 
 # Initialize manager
 sync_manager = SessionSyncManager()
+delta_exchange = DeltaSync()
 
 
 @session_sync_bp.route('/api/session/generate-qr', methods=['GET'])
@@ -356,6 +361,38 @@ def session_status():
     })
 
 
+@session_sync_bp.route('/api/session/delta', methods=['POST'])
+def delta_sync_exchange():
+    """
+    Delta sync for a signed-in device
+
+    Body: a delta_sync request (compressed change set). The device's changes
+    to rows the user owns are applied; the response carries acknowledgements,
+    conflicts and the user's rows changed since the device last synced.
+
+    Device workflow:
+    1. DeltaSync(local_db).sync(HttpPeer(url, headers={'Cookie': ...}))
+    2. Retries are safe - already-applied changes are skipped
+    """
+    user_id = session.get('user_id')
+
+    if not user_id:
+        return jsonify({
+            'success': False,
+            'error': 'Not authenticated. Please log in first.'
+        }), 401
+
+    try:
+        payload = delta_exchange.handle_exchange(request.get_data(), owner=user_id)
+    except (ValueError, KeyError) as e:
+        return jsonify({
+            'success': False,
+            'error': f'Invalid sync payload: {e}'
+        }), 400
+
+    return Response(payload, mimetype='application/octet-stream')
+
+
 # Initialize session_sync_tokens table
 def init_session_sync_db():
     """Create session_sync_tokens table if it doesn't exist"""
@@ -37,7 +37,8 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from database import get_db
 from user_wordmap_engine import get_user_wordmap
-from wordmap_pitch_integrator import calculate_wordmap_alignment, extract_wordmap_from_transcript
+from wordmap_pitch_integrator import tokenize, extract_wordmap_from_transcript
+from domain_match_index import WordmapIndex
 
 
 # ==============================================================================
@@ -77,6 +78,10 @@ class SHA256ContentWrapper:
         self.word_count = len(self.wordmap)
         self.signature_hash = self._calculate_signature_hash()
 
+        # Indexed once so each alignment check only walks the content's words
+        self._index = WordmapIndex()
+        self._index.set(str(user_id), self.wordmap)
+
     def _calculate_signature_hash(self) -> str:
         """Calculate SHA256 hash of user's wordmap (voice signature)"""
         # Sort for deterministic hashing
@@ -101,7 +106,7 @@ class SHA256ContentWrapper:
 
     def calculate_content_alignment(self, content: str) -> float:
         """Calculate how well content aligns with user's wordmap (0.0 - 1.0)"""
-        return calculate_wordmap_alignment(self.wordmap, content)
+        return self._index.score(str(self.user_id), tokenize(content), metric='recall')
 
     def get_tier_from_alignment(self, alignment: float) -> str:
         """Determine content tier from alignment score"""
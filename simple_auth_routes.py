@@ -26,6 +26,7 @@ Uses existing `users` table from soulfra.db
 
 from flask import Blueprint, request, render_template_string, redirect, url_for, session, jsonify
 from database import get_db
+import auth_cache
 from datetime import datetime, timezone
 import hashlib
 import secrets
@@ -800,6 +801,7 @@ def logout():
     Clear session and redirect to login
     """
     username = session.get('username', 'Unknown')
+    auth_cache.invalidate_user(session.get('user_id'))
     session.clear()
     print(f"✅ User logged out: {username}")
 
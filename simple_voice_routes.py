@@ -11,6 +11,7 @@ Features:
 
 from flask import Blueprint, render_template, request, jsonify, send_file, session, redirect, url_for
 from database import get_db
+from llm_stream import sse_response, wants_stream
 import os
 import tempfile
 from datetime import datetime
@@ -1183,6 +1184,10 @@ def process_voice_query():
         "user_id": 1  # Optional (will use session)
     }
 
+    Streaming (?stream=1 or Accept: text/event-stream): `meta` event with
+    the response below minus ai_response, then AI response tokens, then
+    `done` with ai_response, ttft_ms and total_ms.
+
     Response: {
         "success": true,
         "query_result": {
@@ -1229,6 +1234,22 @@ def process_voice_query():
             user_id = rec['user_id']
 
     try:
+        if wants_stream(request):
+            # Search + faucet results first, then the AI response token by token
+            from voice_query_processor import VoiceQueryProcessor
+
+            query_result, stream = VoiceQueryProcessor().process_stream(transcription, user_id)
+            faucet_result = process_voice_for_faucet(user_id, transcription, recording_id)
+            meta = {
+                'success': True,
+                'transcription': transcription,
+                'query_result': query_result,
+                'faucet_result': faucet_result
+            }
+            if stream is None:
+                return jsonify(meta)
+            return sse_response(stream, meta=meta, on_complete=lambda text, summary: {'ai_response': text.strip()})
+
         # Step 1: Process as search query with Ollama
         query_result = process_query(transcription, user_id)
 
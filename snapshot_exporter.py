@@ -14,6 +14,10 @@ Use cases:
 - Daily snapshots showing AI processing activity
 - Proof-of-work for fine-tuning claims
 - Public audit trail without exposing private data
+
+Snapshots are Merkle manifests (see merkle_snapshot.py): each export only
+writes the pages of memos that are new or changed, and any memo can be
+proven against a published root via /api/snapshot/<date>/proof/<id>.
 """
 
 from flask import Blueprint, jsonify
@@ -23,29 +27,15 @@ import hashlib
 from datetime import datetime
 import os
 from pathlib import Path
+from merkle_snapshot import MerkleSnapshotStore, verify_proof
 
 snapshot_bp = Blueprint('snapshot', __name__)
 
 SNAPSHOT_DIR = Path(__file__).parent / 'voice-archive' / 'database-snapshots'
 
 
-def _hash_snapshot(data: dict) -> str:
-    """Generate cryptographic hash of snapshot"""
-    json_str = json.dumps(data, sort_keys=True)
-    return hashlib.sha256(json_str.encode()).hexdigest()
-
-
-def _get_previous_snapshot_hash() -> str | None:
-    """Get hash of most recent snapshot for chain verification"""
-    try:
-        snapshots = sorted(SNAPSHOT_DIR.glob('*.json'), reverse=True)
-        if snapshots:
-            with open(snapshots[0]) as f:
-                data = json.load(f)
-                return data.get('snapshot_hash')
-    except Exception:
-        pass
-    return None
+def _store() -> MerkleSnapshotStore:
+    return MerkleSnapshotStore(SNAPSHOT_DIR, 'voice_memos', key='id')
 
 
 @snapshot_bp.route('/api/export-snapshot', methods=['POST'])
@@ -61,7 +51,9 @@ def export_snapshot():
             "snapshot_file": "2026-01-03.json",
             "total_memos": 42,
             "snapshot_hash": "abc123...",
-            "previous_hash": "def456..."
+            "previous_hash": "def456...",
+            "pages_written": 1,
+            "pages_unchanged": 12
         }
     """
     try:
@@ -77,7 +69,7 @@ def export_snapshot():
                 transcription,
                 transcription_method
             FROM simple_voice_recordings
-            ORDER BY created_at DESC
+            ORDER BY id
         ''')
 
         memos = []
@@ -100,32 +92,33 @@ def export_snapshot():
 
         # Build snapshot
         today = datetime.now().strftime('%Y-%m-%d')
-        previous_hash = _get_previous_snapshot_hash()
-
-        snapshot = {
-            'version': '2.0',
-            'exported_at': datetime.now().isoformat(),
-            'date': today,
-            'previous_snapshot_hash': previous_hash,
-            'voice_memos': memos,
-            'statistics': {
-                'total_memos': len(memos),
-                'encrypted_memos': sum(1 for m in memos if m['encrypted']),
-                'public_memos': sum(1 for m in memos if not m['encrypted']),
-                'categories': {}
-            }
+        store = _store()
+        previous = store.previous_manifest(f"{today}.json")
+        previous_hash = previous.get('snapshot_hash') if previous else None
+
+        statistics = {
+            'total_memos': len(memos),
+            'encrypted_memos': sum(1 for m in memos if m['encrypted']),
+            'public_memos': sum(1 for m in memos if not m['encrypted']),
+            'categories': {}
         }
 
         # Category breakdown
         for memo in memos:
             cat = memo['category']
-            snapshot['statistics']['categories'][cat] = \
-                snapshot['statistics']['categories'].get(cat, 0) + 1
-
-        # Generate hash for chain verification
-        snapshot['snapshot_hash'] = _hash_snapshot(snapshot)
-
-        # Write to file
+            statistics['categories'][cat] = statistics['categories'].get(cat, 0) + 1
+
+        # Only new/changed pages are written; root is chained to previous_hash
+        snapshot, built = store.manifest(
+            memos,
+            date=today,
+            previous_hash=previous_hash,
+            statistics=statistics,
+            version='3.0',
+            exported_at=datetime.now().isoformat(),
+        )
+
+        # Write manifest
         SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
         snapshot_file = SNAPSHOT_DIR / f"{today}.json"
 
@@ -138,6 +131,9 @@ def export_snapshot():
             'total_memos': len(memos),
             'snapshot_hash': snapshot['snapshot_hash'],
             'previous_hash': previous_hash,
+            'merkle_root': snapshot['merkle_root'],
+            'pages_written': built['written_pages'],
+            'pages_unchanged': built['reused_pages'],
             'export_path': str(snapshot_file),
             'message': f'Exported {len(memos)} voice memos to encrypted snapshot'
         })
@@ -184,7 +180,12 @@ def list_snapshots():
                     chain_valid = False
 
                 # Handle both old and new snapshot formats
-                if 'voice_memos' in data:
+                if data.get('format') == 'merkle':
+                    stats = data['statistics']
+                    memos = stats.get('total_memos', stats.get('total_predictions', 0))
+                    encrypted = stats.get('encrypted_memos', 0)
+                    public = stats.get('public_memos', memos)
+                elif 'voice_memos' in data:
                     # New format
                     memos = len(data['voice_memos'])
                     encrypted = data['statistics'].get('encrypted_memos', 0)
@@ -245,6 +246,50 @@ def get_snapshot(date):
         }), 500
 
 
+@snapshot_bp.route('/api/snapshot/<date>/proof/<int:memo_id>', methods=['GET'])
+def get_memo_proof(date, memo_id):
+    """
+    Merkle inclusion proof for one memo in a snapshot
+
+    GET /api/snapshot/2026-01-03/proof/42
+
+    Returns:
+        {
+            "row": {...memo as exported...},
+            "leaf": "...",
+            "page": "...",
+            "page_path": [["L", "..."], ...],
+            "root_path": [["R", "..."], ...],
+            "merkle_root": "...",
+            "verified": true
+        }
+    """
+    try:
+        snapshot_file = SNAPSHOT_DIR / f"{date}.json"
+
+        if not snapshot_file.exists():
+            return jsonify({'error': 'Snapshot not found'}), 404
+
+        with open(snapshot_file) as f:
+            manifest = json.load(f)
+
+        if manifest.get('format') != 'merkle':
+            return jsonify({'error': 'Snapshot predates Merkle format - no proofs available'}), 400
+
+        proof = _store().prove(manifest, memo_id)
+        if not proof:
+            return jsonify({'error': f'Memo {memo_id} not in snapshot'}), 404
+
+        proof['verified'] = verify_proof(proof['row'], proof, manifest['merkle_root'])
+        return jsonify(proof)
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 def register_snapshot_routes(app):
     """Register snapshot export routes"""
     app.register_blueprint(snapshot_bp)
@@ -252,3 +297,4 @@ def register_snapshot_routes(app):
     print("   Export: POST /api/export-snapshot")
     print("   List: GET /api/snapshots")
     print("   View: GET /api/snapshot/<date>")
+    print("   Proof: GET /api/snapshot/<date>/proof/<id>")
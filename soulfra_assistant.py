@@ -24,6 +24,8 @@ import logging
 import traceback
 import os
 
+from llm_stream import LLMStream
+
 # Setup logging
 log_dir = os.path.join(os.path.dirname(__file__), 'logs')
 os.makedirs(log_dir, exist_ok=True)
@@ -46,6 +48,8 @@ class SoulAssistant:
     # Assistant AI user ID (created by create_assistant_user.py)
     ASSISTANT_USER_ID = 14
 
+    OLLAMA_URL = 'http://localhost:11434'
+
     def __init__(self, user_id=None, context=None, session_id=None):
         """
         Initialize assistant
@@ -398,27 +402,20 @@ class SoulAssistant:
 
         try:
             from database import get_db
+            from full_text_search import search as full_text_search
 
             # Search posts
             db = get_db()
-            posts = db.execute('''
-                SELECT id, title, content
-                FROM posts
-                WHERE title LIKE ? OR content LIKE ?
-                ORDER BY published_at DESC
-                LIMIT 5
-            ''', (f'%{args}%', f'%{args}%')).fetchall()
+            posts = full_text_search('posts', args, limit=5,
+                                     select='t.id, t.title, t.content', db=db)
 
             # Search comments
-            comments = db.execute('''
-                SELECT c.content, p.title as post_title, u.display_name
-                FROM comments c
-                JOIN posts p ON c.post_id = p.id
-                JOIN users u ON c.user_id = u.id
-                WHERE c.content LIKE ?
-                ORDER BY c.created_at DESC
-                LIMIT 5
-            ''', (f'%{args}%',)).fetchall()
+            comments = full_text_search(
+                'comments', args, limit=5,
+                select='t.content, p.title as post_title, u.display_name',
+                join='JOIN posts p ON t.post_id = p.id JOIN users u ON t.user_id = u.id',
+                db=db
+            )
 
             db.close()
 
@@ -702,19 +699,18 @@ class SoulAssistant:
             'response': self._get_help_text()
         }
 
-    def _handle_chat(self, message):
-        """Handle natural language chat via Ollama"""
-        try:
-            # Build context-aware prompt with full post content
-            prompt = message
-            if self.context.get('post'):
-                post = self.context['post']
-                # Include title and excerpt of content (first 800 chars to fit in context)
-                content_excerpt = post.get('content', '')[:800]
-                if len(post.get('content', '')) > 800:
-                    content_excerpt += '...'
+    def _chat_payload(self, message):
+        """Ollama request for a chat message, with the current post as context"""
+        # Build context-aware prompt with full post content
+        prompt = message
+        if self.context.get('post'):
+            post = self.context['post']
+            # Include title and excerpt of content (first 800 chars to fit in context)
+            content_excerpt = post.get('content', '')[:800]
+            if len(post.get('content', '')) > 800:
+                content_excerpt += '...'
 
-                prompt = f"""You are viewing a blog post titled: "{post.get('title', 'Untitled')}"
+            prompt = f"""You are viewing a blog post titled: "{post.get('title', 'Untitled')}"
 
 Post content excerpt:
 {content_excerpt}
@@ -723,19 +719,51 @@ User question: {message}
 
 Please answer based on the post content above."""
 
-            # Call Ollama
-            request_data = {
-                'model': 'llama2',
-                'prompt': prompt,
-                'stream': False,
-                'options': {
-                    'temperature': 0.7,
-                    'num_predict': 300
-                }
+        return {
+            'model': 'llama2',
+            'prompt': prompt,
+            'stream': False,
+            'options': {
+                'temperature': 0.7,
+                'num_predict': 300
             }
+        }
+
+    def stream_message(self, message):
+        """
+        Streaming version of handle_message() for natural language chat
+
+        Args:
+            message: User's message
+
+        Returns:
+            LLMStream of the reply, or None for slash commands (use
+            handle_message). Call finish_stream() with the full text when
+            the stream completes.
+
+        Raises:
+            urllib.error.URLError: Ollama not connected
+        """
+        message = message.strip()
+        if message.startswith('/'):
+            return None
+
+        self._save_message('user', message)
+        return LLMStream.generate(self._chat_payload(message), ollama_url=self.OLLAMA_URL)
+
+    def finish_stream(self, text):
+        """Save a completed streamed reply; returns extra fields for the client"""
+        self._save_message('ai', text.strip())
+        return {'session_id': self.session_id} if self.session_id else {}
+
+    def _handle_chat(self, message):
+        """Handle natural language chat via Ollama"""
+        try:
+            # Call Ollama
+            request_data = self._chat_payload(message)
 
             req = urllib.request.Request(
-                'http://localhost:11434/api/generate',
+                f'{self.OLLAMA_URL}/api/generate',
                 data=json.dumps(request_data).encode('utf-8'),
                 headers={'Content-Type': 'application/json'}
             )
@@ -22,6 +22,7 @@ Flow:
 from flask import Blueprint, request, session, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
 from database import get_db
+import auth_cache
 import jwt
 import datetime
 import os
@@ -357,44 +358,30 @@ def verify_token():
     if not token:
         return jsonify({'error': 'Token required'}), 400
 
-    try:
-        # Decode JWT
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    # Decode JWT (served from auth_cache after the first verification)
+    payload = auth_cache.verify_jwt(token, JWT_SECRET, JWT_ALGORITHM, check=session_token_active)
 
-        master_user_id = payload.get('master_user_id')
-        username = payload.get('username')
-        email = payload.get('email')
+    if not payload:
+        return jsonify({'valid': False, 'error': 'Invalid or expired token'}), 401
 
-        # Update session last_used
-        db = get_db()
-        db.execute(
-            'UPDATE soulfra_session_tokens SET last_used = CURRENT_TIMESTAMP WHERE token = ?',
-            (token,)
-        )
-        db.commit()
+    master_user_id = payload.get('master_user_id')
+    username = payload.get('username')
+    email = payload.get('email')
 
-        # Get domain moniker
-        user = db.execute(
-            'SELECT * FROM soulfra_master_users WHERE id = ?',
-            (master_user_id,)
-        ).fetchone()
-
-        moniker_field = domain.replace('.com', '_moniker')
-        domain_moniker = user.get(moniker_field, username)
+    # Get domain moniker
+    user = auth_cache.get_user('master', master_user_id, load_master_user) or {}
 
-        return jsonify({
-            'valid': True,
-            'master_user_id': master_user_id,
-            'username': username,
-            'email': email,
-            'domain': domain,
-            'domain_moniker': domain_moniker
-        })
+    moniker_field = domain.replace('.com', '_moniker')
+    domain_moniker = user.get(moniker_field, username)
 
-    except jwt.ExpiredSignatureError:
-        return jsonify({'valid': False, 'error': 'Token expired'}), 401
-    except jwt.InvalidTokenError:
-        return jsonify({'valid': False, 'error': 'Invalid token'}), 401
+    return jsonify({
+        'valid': True,
+        'master_user_id': master_user_id,
+        'username': username,
+        'email': email,
+        'domain': domain,
+        'domain_moniker': domain_moniker
+    })
 
 
 @master_auth_bp.route('/api/master/me')
@@ -404,12 +391,7 @@ def get_master_user():
         return jsonify({'logged_in': False}), 401
 
     master_user_id = session.get('master_user_id')
-
-    db = get_db()
-    user = db.execute(
-        'SELECT * FROM soulfra_master_users WHERE id = ?',
-        (master_user_id,)
-    ).fetchone()
+    user = auth_cache.get_user('master', master_user_id, load_master_user)
 
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -445,12 +427,52 @@ def master_logout():
         )
         db.commit()
 
+        # Drop cached tokens/user so no worker-local fast path outlives the logout
+        auth_cache.revoke_user(master_user_id)
+
     session.clear()
     return jsonify({'success': True})
 
 
 # Helper functions
 
+def load_master_user(master_user_id):
+    """Load a master user row as a dict (cold path for auth_cache)"""
+    db = get_db()
+    user = db.execute(
+        'SELECT * FROM soulfra_master_users WHERE id = ?',
+        (master_user_id,)
+    ).fetchone()
+    db.close()
+
+    return dict(user) if user else None
+
+
+def session_token_active(token, payload):
+    """
+    Cold-path revocation check for auth_cache.verify_jwt
+
+    Rejects tokens expired by /api/master/logout and records last_used.
+    Tokens with no session row (issued elsewhere) stay valid on signature alone.
+    """
+    db = get_db()
+
+    revoked = db.execute(
+        'SELECT 1 FROM soulfra_session_tokens WHERE token = ? AND expires_at <= CURRENT_TIMESTAMP',
+        (token,)
+    ).fetchone()
+
+    if not revoked:
+        db.execute(
+            'UPDATE soulfra_session_tokens SET last_used = CURRENT_TIMESTAMP WHERE token = ?',
+            (token,)
+        )
+        db.commit()
+
+    db.close()
+    return revoked is None
+
+
 def _mirror_accounts_to_domains(db, master_user_id, email, monikers):
     """
     Create accounts in domain-specific users tables
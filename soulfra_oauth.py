@@ -28,6 +28,7 @@ import time
 import json
 from datetime import datetime, timedelta
 from database import get_db
+import auth_cache
 from qr_auth import generate_auth_token, verify_auth_token
 from device_hash import capture_device_info, get_or_create_device
 import qrcode
@@ -537,6 +538,23 @@ def get_user():
 
     access_token = auth_header.replace('Bearer ', '')
 
+    user = auth_cache.cached_lookup('oauth_token', access_token, _load_token_user)
+
+    if user is None:
+        return jsonify({'error': 'invalid_token'}), 401
+
+    if not user:
+        return jsonify({'error': 'user_not_found'}), 404
+
+    return jsonify(user)
+
+
+def _load_token_user(access_token):
+    """
+    Cold path for /oauth/user: access token -> public user fields
+
+    Returns None for an unknown token, {} when the token's user is gone.
+    """
     db = get_db()
 
     # Verify token
@@ -545,7 +563,7 @@ def get_user():
     ''', (access_token,)).fetchone()
 
     if not token_data:
-        return jsonify({'error': 'invalid_token'}), 401
+        return None
 
     # Get user
     user = db.execute('''
@@ -554,16 +572,16 @@ def get_user():
     ''', (token_data['user_id'],)).fetchone()
 
     if not user:
-        return jsonify({'error': 'user_not_found'}), 404
+        return {}
 
-    return jsonify({
+    return {
         'id': user['id'],
         'username': user['username'],
         'email': user['email'],
         'display_name': user['display_name'],
         'avatar_url': user['avatar_url'],
         'created_at': user['created_at']
-    })
+    }
 
 
 # =============================================================================
@@ -6,6 +6,8 @@ Integrates with:
 - story_predictor.py for AI predictions
 - reverse_wpm.py for storyteller reputation
 - VIBE token economy (from soulfra.github.io/misc/VIBE_TOKEN_ECONOMY.py)
+- ledger.py for balances: stakes move into a per-pool escrow account and
+  each pool resolves as a single posting, with the house netting the spread
 
 Bet Types:
 - "AI Correct": Bet that AI will predict correctly (< 30% unpredictability)
@@ -16,15 +18,31 @@ Bet Types:
 """
 
 import sqlite3
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 import json
 from decimal import Decimal
 
+import ledger
+from ledger import InsufficientFunds, immediate
+
 
 DATABASE_PATH = Path(__file__).parent / 'soulfra.db'
 
+VIBE = 'VIBE'
+VIBE_HOUSE = ('system', 0, VIBE)
+STARTING_VIBE = 1000
+
+
+def vibe_account(player_id: int):
+    return ('user', int(player_id), VIBE)
+
+
+def pool_escrow(pool_id: int):
+    return ('bet_pool', int(pool_id), VIBE)
+
 
 class StoryBettingMarket:
     """
@@ -35,6 +53,8 @@ class StoryBettingMarket:
 
     def __init__(self):
         self.db = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+        # One connection is shared across request threads; postings hold it for their transaction
+        self._lock = threading.RLock()
         self.init_tables()
 
         # Betting configuration
@@ -130,7 +150,8 @@ class StoryBettingMarket:
             )
         ''')
 
-        # Player VIBE balances (simple version - full economy in VIBE_TOKEN_ECONOMY.py)
+        # Player VIBE stats (balances live in the ledger; the balance column is
+        # only read once, to open the ledger account of a pre-ledger player)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS vibe_balances (
                 player_id INTEGER PRIMARY KEY,
@@ -158,6 +179,9 @@ class StoryBettingMarket:
             )
         ''')
 
+        for statement in ledger.LEDGER_SCHEMA:
+            cursor.execute(statement)
+
         self.db.commit()
         print("✅ Story betting market tables initialized")
 
@@ -295,14 +319,24 @@ class StoryBettingMarket:
                 'new_balance': int
             }
         """
-        cursor = self.db.cursor()
-
         # Validate bet amount
         if amount < self.config['min_bet']:
             return {'success': False, 'error': f"Minimum bet is {self.config['min_bet']} VIBE"}
         if amount > self.config['max_bet']:
             return {'success': False, 'error': f"Maximum bet is {self.config['max_bet']} VIBE"}
 
+        # Pool status, odds, stake and bet row are read and written under one
+        # write lock, so two bets can't both spend the same balance
+        with self._lock:
+            try:
+                with immediate(self.db):
+                    return self._place_bet(player_id, pool_id, bet_type, amount)
+            except InsufficientFunds as e:
+                return {'success': False, 'error': f'Insufficient balance ({e.available} VIBE)'}
+
+    def _place_bet(self, player_id: int, pool_id: int, bet_type: str, amount: int) -> Dict:
+        cursor = self.db.cursor()
+
         # Check pool status
         cursor.execute('SELECT status, odds_ai_correct, odds_ai_wrong FROM story_bet_pools WHERE id = ?', (pool_id,))
         result = cursor.fetchone()
@@ -313,13 +347,7 @@ class StoryBettingMarket:
         if status != 'open':
             return {'success': False, 'error': 'Betting is closed'}
 
-        # Get or create player balance
-        cursor.execute('INSERT OR IGNORE INTO vibe_balances (player_id) VALUES (?)', (player_id,))
-        cursor.execute('SELECT balance FROM vibe_balances WHERE player_id = ?', (player_id,))
-        balance = cursor.fetchone()[0]
-
-        if balance < amount:
-            return {'success': False, 'error': f'Insufficient balance ({balance} VIBE)'}
+        self._ensure_player(player_id)
 
         # Determine odds
         if bet_type == 'ai_correct':
@@ -340,15 +368,6 @@ class StoryBettingMarket:
         platform_fee = int(gross_payout * self.config['platform_fee'])
         potential_payout = gross_payout - platform_fee
 
-        # Deduct balance
-        cursor.execute('''
-            UPDATE vibe_balances
-            SET balance = balance - ?,
-                total_wagered = total_wagered + ?,
-                last_bet = CURRENT_TIMESTAMP
-            WHERE player_id = ?
-        ''', (amount, amount, player_id))
-
         # Place bet
         cursor.execute('''
             INSERT INTO story_bets (pool_id, player_id, bet_type, amount, odds, potential_payout)
@@ -357,6 +376,18 @@ class StoryBettingMarket:
 
         bet_id = cursor.lastrowid
 
+        # Move the stake into the pool's escrow (raises InsufficientFunds, undoing the bet row)
+        posting = ledger.transfer(vibe_account(player_id), pool_escrow(pool_id), amount,
+                                  kind='bet', memo=f'bet #{bet_id}', db=self.db)
+        new_balance = posting.balance_after(vibe_account(player_id))
+
+        cursor.execute('''
+            UPDATE vibe_balances
+            SET total_wagered = total_wagered + ?,
+                last_bet = CURRENT_TIMESTAMP
+            WHERE player_id = ?
+        ''', (amount, player_id))
+
         # Update pool stats
         if bet_type == 'ai_correct':
             cursor.execute('''
@@ -386,10 +417,6 @@ class StoryBettingMarket:
         if total_vibe % self.config['odds_update_threshold'] < amount:
             self._update_pool_odds(pool_id)
 
-        self.db.commit()
-
-        new_balance = balance - amount
-
         print(f"💰 Bet placed: Player {player_id} bet {amount} VIBE on '{bet_type}' @ {odds:.2f}x")
         print(f"   Potential payout: {potential_payout} VIBE")
         print(f"   New balance: {new_balance} VIBE")
@@ -402,8 +429,25 @@ class StoryBettingMarket:
             'new_balance': new_balance
         }
 
+    def _ensure_player(self, player_id: int):
+        """
+        Open the player's VIBE ledger account on first bet
+
+        New players are granted STARTING_VIBE from the house; players from
+        before the ledger carry over their vibe_balances balance.
+        """
+        if ledger.get_account(vibe_account(player_id), db=self.db):
+            return
+
+        legacy = self.db.execute('SELECT balance FROM vibe_balances WHERE player_id = ?', (player_id,)).fetchone()
+        opening = legacy[0] if legacy else STARTING_VIBE
+        self.db.execute('INSERT OR IGNORE INTO vibe_balances (player_id) VALUES (?)', (player_id,))
+
+        ledger.transfer(VIBE_HOUSE, vibe_account(player_id), opening, kind='grant',
+                        memo='starting VIBE', idempotency_key=f'vibe:grant:{player_id}', db=self.db)
+
     def _update_pool_odds(self, pool_id: int):
-        """Update odds based on betting volume (move odds toward underdogs)"""
+        """Update odds based on betting volume (move odds toward underdogs); caller commits"""
         cursor = self.db.cursor()
 
         cursor.execute('''
@@ -445,8 +489,6 @@ class StoryBettingMarket:
             VALUES (?, ?, ?, ?, ?)
         ''', (pool_id, total_vibe, new_ai_correct_odds, new_ai_wrong_odds, ai_correct_ratio / max(ai_wrong_ratio, 0.01)))
 
-        self.db.commit()
-
         print(f"📊 Updated odds for pool #{pool_id}: AI Correct {new_ai_correct_odds:.2f}x | AI Wrong {new_ai_wrong_odds:.2f}x")
 
     def close_betting(self, pool_id: int):
@@ -491,8 +533,18 @@ class StoryBettingMarket:
                 'losers_count': int
             }
         """
+        with self._lock, immediate(self.db):
+            return self._resolve_bets(pool_id, actual_unpredictability, special_results)
+
+    def _resolve_bets(self, pool_id: int, actual_unpredictability: float,
+                      special_results: Dict[str, bool] = None) -> Dict:
         cursor = self.db.cursor()
 
+        # Re-resolving a pool would pay twice; the posting key also guards this
+        status = cursor.execute('SELECT status FROM story_bet_pools WHERE id = ?', (pool_id,)).fetchone()
+        if status and status[0] == 'resolved':
+            return {'total_paid_out': 0, 'winners_count': 0, 'losers_count': 0, 'already_resolved': True}
+
         # Determine winning side
         # AI is "correct" if unpredictability < 30%, "wrong" if >= 70%, "push" if in between
         if actual_unpredictability < 0.3:
@@ -524,6 +576,7 @@ class StoryBettingMarket:
         total_paid_out = 0
         winners_count = 0
         losers_count = 0
+        legs = []
 
         for bet_id, player_id, bet_type, amount, potential_payout in bets:
             won = False
@@ -561,12 +614,12 @@ class StoryBettingMarket:
 
             # Update player balance
             if payout > 0:
+                legs.append((vibe_account(player_id), payout))
                 cursor.execute('''
                     UPDATE vibe_balances
-                    SET balance = balance + ?,
-                        total_won = total_won + ?
+                    SET total_won = total_won + ?
                     WHERE player_id = ?
-                ''', (payout, payout - amount if won else amount, player_id))
+                ''', (payout - amount if won else amount, player_id))
 
                 winners_count += 1
                 total_paid_out += payout
@@ -579,7 +632,12 @@ class StoryBettingMarket:
 
                 losers_count += 1
 
-        self.db.commit()
+        # One posting: escrow is emptied, winners are paid, the house keeps
+        # (or covers) the difference
+        escrow = ledger.balance(pool_escrow(pool_id), db=self.db)
+        legs += [(pool_escrow(pool_id), -escrow), (VIBE_HOUSE, escrow - total_paid_out)]
+        ledger.post(legs, kind='bet_resolution', memo=f'pool #{pool_id}: {winning_side}',
+                    idempotency_key=f'vibe:resolve:{pool_id}', db=self.db)
 
         print(f"\n💸 Resolved pool #{pool_id}: {winning_side.upper()}")
         print(f"   Total paid out: {total_paid_out} VIBE")
@@ -627,17 +685,18 @@ class StoryBettingMarket:
         }
 
     def get_player_balance(self, player_id: int) -> Dict:
-        """Get player's VIBE balance and stats"""
-        cursor = self.db.cursor()
-
-        cursor.execute('INSERT OR IGNORE INTO vibe_balances (player_id) VALUES (?)', (player_id,))
-        cursor.execute('''
-            SELECT balance, total_wagered, total_won, total_lost
-            FROM vibe_balances
-            WHERE player_id = ?
-        ''', (player_id,))
-
-        balance, total_wagered, total_won, total_lost = cursor.fetchone()
+        """Get player's VIBE balance and stats (a plain read - accounts open on first bet)"""
+        with self._lock:
+            account = ledger.get_account(vibe_account(player_id), db=self.db)
+            stats = self.db.execute('''
+                SELECT balance, total_wagered, total_won, total_lost
+                FROM vibe_balances
+                WHERE player_id = ?
+            ''', (player_id,)).fetchone()
+
+        # Not opened yet: what _ensure_player will grant on the first bet
+        legacy_balance, total_wagered, total_won, total_lost = stats or (STARTING_VIBE, 0, 0, 0)
+        balance = account['balance'] if account else legacy_balance
 
         return {
             'balance': balance,
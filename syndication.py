@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+"""
+Syndication - Cached, sharded sitemaps and feeds with conditional GET
+
+/sitemap.xml used to select every post, brand and user on each crawler hit
+and stamp every URL with today's date; /feed.xml and the message feeds were
+rebuilt per request. Now:
+
+- /sitemap.xml is a sitemap index pointing at 50k-URL shards per entity
+  (/sitemaps/posts-1.xml, /sitemaps/souls-1.xml, ...) with real <lastmod>
+  values taken from row timestamps
+- Rendered XML is cached in memory (the MAX_DOCUMENTS most recently used)
+  with an ETag and Last-Modified, so repeat crawlers get 304 Not Modified
+- Triggers bump a per-table counter in syndication_versions whenever posts,
+  brands, users, domain_messages or voice recordings change. The cache reads
+  those counters at most once per REVALIDATE_SECONDS - every other request
+  is served from memory without opening the database
+- When a table changes only shards whose fingerprint (row count, id sum,
+  newest timestamp) moved are re-rendered
+- Cold shard renders are streamed to the client while being cached
+
+Usage:
+    from syndication import respond, sitemap_index, sitemap_shard, posts_feed
+
+    @app.route('/sitemap.xml')
+    def sitemap_xml():
+        return respond(sitemap_index())
+
+    mark_changed('posts')   # optional: skip the revalidation delay in-process
+"""
+
+import hashlib
+import html
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from database import get_db
+from schema_registry import register_migration
+
+
+# Configuration
+SHARD_SIZE = 50000              # Max URLs per sitemap file (sitemaps.org limit)
+REVALIDATE_SECONDS = 60         # How often cached documents re-check the DB
+CLIENT_MAX_AGE = 300            # Cache-Control max-age sent to crawlers
+MAX_DOCUMENTS = 2000            # Rendered documents kept in memory (least recently used dropped)
+TRACKED_TABLES = ('posts', 'brands', 'users', 'domain_messages', 'simple_voice_recordings')
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+# ==============================================================================
+# CHANGE TRACKING
+# ==============================================================================
+
+VERSIONS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS syndication_versions (
+        entity TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+def change_tracking_statements(table: str, update_of: Optional[str] = None) -> List[str]:
+    """
+    Triggers that bump syndication_versions for a table on every write
+
+    update_of limits the UPDATE trigger to columns that appear in sitemaps
+    or feeds, so unrelated writes (last login, credits) don't invalidate.
+    """
+    bump = f'''
+            UPDATE syndication_versions
+            SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE entity = '{table}';'''
+    update_clause = f'UPDATE OF {update_of}' if update_of else 'UPDATE'
+
+    return [
+        f'SELECT 1 FROM {table} LIMIT 0',
+        f"INSERT OR IGNORE INTO syndication_versions (entity, version) VALUES ('{table}', 0)",
+        f'CREATE TRIGGER IF NOT EXISTS {table}_syndication_ai AFTER INSERT ON {table} BEGIN{bump}\n        END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_syndication_ad AFTER DELETE ON {table} BEGIN{bump}\n        END',
+        f'CREATE TRIGGER IF NOT EXISTS {table}_syndication_au AFTER {update_clause} ON {table} BEGIN{bump}\n        END',
+    ]
+
+
+def update_tracking_statements(table: str, update_of: str) -> List[str]:
+    """
+    Re-create an already tracked table's UPDATE trigger with a new column list
+
+    Stays pending (probe fails) on databases missing any of the columns.
+    """
+    return [
+        f'SELECT {update_of} FROM {table} LIMIT 0',
+        f'DROP TRIGGER IF EXISTS {table}_syndication_au',
+        change_tracking_statements(table, update_of)[-1],
+    ]
+
+
+# Triggers bump syndication_versions so cached sitemaps/feeds know when to re-render.
+register_migration(16, 'syndication versions', VERSIONS_TABLE, module='syndication')
+register_migration(17, 'syndication: posts',
+                   *change_tracking_statements('posts', 'slug, title, content, published_at, user_id'),
+                   module='syndication', depends_on=(16,))
+register_migration(18, 'syndication: brands', *change_tracking_statements('brands', 'slug'),
+                   module='syndication', depends_on=(16,))
+register_migration(19, 'syndication: users',
+                   *change_tracking_statements('users', 'username, display_name, is_ai_persona'),
+                   module='syndication', depends_on=(16,))
+register_migration(20, 'syndication: domain messages', *change_tracking_statements('domain_messages'),
+                   module='syndication', depends_on=(16,))
+register_migration(21, 'syndication: voice recordings',
+                   *change_tracking_statements('simple_voice_recordings', 'transcription'),
+                   module='syndication', depends_on=(16,))
+register_migration(131, 'syndication: users email',
+                   *update_tracking_statements('users', 'username, display_name, email, is_ai_persona'),
+                   module='syndication', depends_on=(19,))
+
+
+@dataclass
+class Document:
+    """Rendered XML plus validators for conditional GET"""
+    body: bytes
+    etag: str
+    last_modified: datetime
+    mimetype: str = 'application/xml'
+
+
+def make_document(chunks: Iterable[str], last_modified: Optional[datetime] = None,
+                  mimetype: str = 'application/xml') -> Document:
+    body = ''.join(chunks).encode('utf-8')
+    return Document(
+        body=body,
+        etag=hashlib.sha256(body).hexdigest()[:32],
+        last_modified=(last_modified or datetime.now(timezone.utc)).replace(microsecond=0),
+        mimetype=mimetype,
+    )
+
+
+class SyndicationCache:
+    """
+    In-memory cache of rendered documents keyed by the table versions they
+    were built from
+
+    Table versions are read from syndication_versions at most once per
+    revalidate_seconds; between reads every lookup is pure memory.
+    """
+
+    def __init__(self, revalidate_seconds: float = REVALIDATE_SECONDS, max_entries: int = MAX_DOCUMENTS):
+        self.revalidate_seconds = revalidate_seconds
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple]' = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._local: Dict[str, int] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.renders = 0
+        self.revalidations = 0
+
+    def _revalidate(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.revalidate_seconds:
+            return
+        self._checked_at = now
+        self.revalidations += 1
+
+        db = get_db()
+        try:
+            rows = db.execute('SELECT entity, version FROM syndication_versions').fetchall()
+            versions = {row['entity']: row['version'] for row in rows}
+        except Exception:
+            # Change tracking not migrated yet - expire everything each window
+            versions = {table: int(time.time() // self.revalidate_seconds) for table in TRACKED_TABLES}
+        finally:
+            db.close()
+
+        with self._lock:
+            self._versions = versions
+
+    def _stamp(self, deps: Tuple[str, ...]) -> Tuple:
+        return tuple((self._versions.get(dep), self._local.get(dep, 0)) for dep in deps)
+
+    def mark_changed(self, *tables: str):
+        """Invalidate documents built from these tables (this process, immediately)"""
+        with self._lock:
+            for table in tables:
+                self._local[table] = self._local.get(table, 0) + 1
+
+    def lookup(self, key: Hashable, deps: Tuple[str, ...], fingerprint=None):
+        """Return (value, stamp); value is None when it must be rebuilt"""
+        self._revalidate()
+        with self._lock:
+            stamp = self._stamp(deps)
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, entry_stamp, entry_fingerprint = entry
+                self._entries.move_to_end(key)
+                if entry_stamp == stamp:
+                    self.hits += 1
+                    return value, stamp
+                if fingerprint is not None and fingerprint == entry_fingerprint:
+                    # Table changed but not this part of it
+                    self._entries[key] = (value, stamp, fingerprint)
+                    self.hits += 1
+                    return value, stamp
+        return None, stamp
+
+    def store(self, key: Hashable, value, stamp: Tuple, fingerprint=None):
+        with self._lock:
+            self._entries[key] = (value, stamp, fingerprint)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.renders += 1
+
+    def get(self, key: Hashable, deps: Tuple[str, ...], compute: Callable[[], object], fingerprint=None):
+        """Cached value for key, recomputed when a dependency table changed"""
+        value, stamp = self.lookup(key, deps, fingerprint)
+        if value is None:
+            value = compute()
+            self.store(key, value, stamp, fingerprint)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._checked_at = 0.0
+
+    def stats(self) -> Dict:
+        return {
+            'documents': len(self._entries),
+            'hits': self.hits,
+            'renders': self.renders,
+            'revalidations': self.revalidations,
+        }
+
+
+_cache = SyndicationCache()
+
+
+def mark_changed(*tables: str):
+    _cache.mark_changed(*tables)
+
+
+def get_cache() -> SyndicationCache:
+    return _cache
+
+
+# ==============================================================================
+# HELPERS
+# ==============================================================================
+
+def _base_url() -> str:
+    from config import BASE_URL
+    return BASE_URL
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """SQLite TIMESTAMP/ISO text -> aware UTC datetime (None if unparseable)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def rfc822(value) -> str:
+    parsed = parse_timestamp(value) or datetime.now(timezone.utc)
+    return format_datetime(parsed)
+
+
+def _columns(db, table: str) -> List[str]:
+    return [row[1] for row in db.execute(f'PRAGMA table_info({table})').fetchall()]
+
+
+def write_document(path: Union[str, Path], chunks: Iterable[str]) -> bool:
+    """
+    Stream chunks to path, replacing it only if the content changed
+
+    Keeps mtimes (and git diffs of static exports) stable across rebuilds.
+
+    Returns:
+        True if the file was written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk.encode('utf-8'))
+
+        if path.exists():
+            existing = hashlib.sha256(path.read_bytes()).hexdigest()
+            if existing == digest.hexdigest():
+                os.unlink(tmp_name)
+                return False
+
+        os.replace(tmp_name, path)
+        return True
+    except Exception:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+# ==============================================================================
+# SITEMAPS
+# ==============================================================================
+
+@dataclass
+class SitemapEntity:
+    """One table whose rows become sitemap URLs"""
+    name: str                   # Shard file prefix: /sitemaps/<name>-<n>.xml
+    table: str
+    loc_column: str
+    path: str                   # URL path template, {} = loc_column value
+    where: str = '1=1'
+    changefreq: str = 'weekly'
+    priority: str = '0.6'
+    lastmod_candidates: Tuple[str, ...] = ('updated_at', 'published_at', 'created_at')
+
+
+SITEMAP_ENTITIES: Dict[str, SitemapEntity] = {
+    'posts': SitemapEntity('posts', 'posts', 'slug', '/post/{}', changefreq='weekly', priority='0.8'),
+    'brands': SitemapEntity('brands', 'brands', 'slug', '/brand/{}', priority='0.7'),
+    'souls': SitemapEntity('souls', 'users', 'username', '/soul/{}', where='is_ai_persona = 0'),
+}
+
+# Public routes (exclude admin, API, POST-only routes)
+STATIC_PAGES = [
+    '/', '/live', '/shipyard', '/brands', '/tiers', '/souls', '/showcase', '/code',
+    '/status', '/reasoning', '/ml', '/dashboard', '/train', '/about', '/feedback',
+    '/subscribe', '/login', '/signup', '/sitemap', '/feed.xml',
+]
+
+
+def _lastmod_column(db, entity: SitemapEntity) -> Optional[str]:
+    columns = _columns(db, entity.table)
+    return next((c for c in entity.lastmod_candidates if c in columns), None)
+
+
+def shard_fingerprints(entity_name: str) -> Dict[int, Tuple]:
+    """
+    {shard number: (count, min id, max id, newest lastmod, id sum, loc length sum)}
+
+    One grouped query per table change; shards whose tuple is unchanged keep
+    their cached XML.
+    """
+    entity = SITEMAP_ENTITIES[entity_name]
+
+    def compute():
+        db = get_db()
+        try:
+            lastmod = _lastmod_column(db, entity)
+            lastmod_sql = f'MAX({lastmod})' if lastmod else 'NULL'
+            rows = db.execute(f'''
+                SELECT shard, COUNT(*) AS urls, MIN(id) AS first_id, MAX(id) AS last_id,
+                       {lastmod_sql} AS lastmod, SUM(id) AS id_sum, SUM(length(loc)) AS loc_size
+                FROM (
+                    SELECT id, {entity.loc_column} AS loc{', ' + lastmod if lastmod else ''},
+                           (ROW_NUMBER() OVER (ORDER BY id) - 1) / {SHARD_SIZE} + 1 AS shard
+                    FROM {entity.table}
+                    WHERE {entity.where} AND {entity.loc_column} IS NOT NULL
+                )
+                GROUP BY shard
+                ORDER BY shard
+            ''').fetchall()
+        except Exception as e:
+            print(f"⚠️  Sitemap shards unavailable for {entity.table}: {e}")
+            rows = []
+        finally:
+            db.close()
+        return {row['shard']: tuple(row)[1:] for row in rows}
+
+    return _cache.get(('shards', entity_name), (entity.table,), compute)
+
+
+def _iter_urlset(urls: Iterable[Tuple[str, Optional[datetime], str, str]]) -> Iterator[str]:
+    yield XML_HEADER
+    yield f'<urlset xmlns="{SITEMAP_NS}">\n'
+    for loc, lastmod, changefreq, priority in urls:
+        yield '  <url>\n'
+        yield f'    <loc>{html.escape(loc)}</loc>\n'
+        if lastmod:
+            yield f'    <lastmod>{lastmod.strftime("%Y-%m-%d")}</lastmod>\n'
+        yield f'    <changefreq>{changefreq}</changefreq>\n'
+        yield f'    <priority>{priority}</priority>\n'
+        yield '  </url>\n'
+    yield '</urlset>\n'
+
+
+def iter_sitemap_shard(entity_name: str, number: int, fingerprint: Tuple) -> Iterator[str]:
+    """Stream one shard's XML (rows fetched in id range, 1000 at a time)"""
+    entity = SITEMAP_ENTITIES[entity_name]
+    base_url = _base_url()
+    first_id, last_id = fingerprint[1], fingerprint[2]
+
+    def urls():
+        db = get_db()
+        try:
+            lastmod = _lastmod_column(db, entity)
+            cursor = db.execute(f'''
+                SELECT {entity.loc_column} AS loc{', ' + lastmod + ' AS lastmod' if lastmod else ''}
+                FROM {entity.table}
+                WHERE id BETWEEN ? AND ? AND {entity.where} AND {entity.loc_column} IS NOT NULL
+                ORDER BY id
+            ''', (first_id, last_id))
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    yield (
+                        base_url + entity.path.format(quote(str(row['loc']), safe='')),
+                        parse_timestamp(row['lastmod']) if lastmod else None,
+                        entity.changefreq,
+                        entity.priority,
+                    )
+        finally:
+            db.close()
+
+    return _iter_urlset(urls())
+
+
+def sitemap_shard(entity_name: str, number: int) -> Optional[Union[Document, Iterator[bytes]]]:
+    """
+    Cached shard document, or a streaming body on a cold render
+
+    Returns None for unknown entities/shards.
+    """
+    if entity_name == 'pages':
+        if number != 1:
+            return None
+        base_url = _base_url()
+        return _cache.get(('sitemap', 'pages', 1), (), lambda: make_document(_iter_urlset(
+            (base_url + page, None, 'daily', '0.8') for page in STATIC_PAGES)))
+
+    if entity_name not in SITEMAP_ENTITIES:
+        return None
+    fingerprints = shard_fingerprints(entity_name)
+    if number not in fingerprints:
+        return None
+
+    entity = SITEMAP_ENTITIES[entity_name]
+    fingerprint = fingerprints[number]
+    key = ('sitemap', entity_name, number)
+    document, stamp = _cache.lookup(key, (entity.table,), fingerprint)
+    if document is not None:
+        return document
+
+    return _stream_and_store(key, stamp, fingerprint, iter_sitemap_shard(entity_name, number, fingerprint),
+                             parse_timestamp(fingerprint[3]))
+
+
+def _stream_and_store(key, stamp, fingerprint, chunks: Iterator[str],
+                      last_modified: Optional[datetime]) -> Iterator[bytes]:
+    """Yield encoded chunks to the client and cache the full document at the end"""
+    parts = []
+    for chunk in chunks:
+        parts.append(chunk)
+        yield chunk.encode('utf-8')
+    _cache.store(key, make_document(parts, last_modified), stamp, fingerprint)
+
+
+def sitemap_index() -> Document:
+    """Sitemap index listing every shard with its newest lastmod"""
+    deps = tuple(entity.table for entity in SITEMAP_ENTITIES.values())
+
+    def compute():
+        base_url = _base_url()
+        entries = [('pages', 1, None)]
+        for name in SITEMAP_ENTITIES:
+            for number, fingerprint in shard_fingerprints(name).items():
+                entries.append((name, number, parse_timestamp(fingerprint[3])))
+
+        def chunks():
+            yield XML_HEADER
+            yield f'<sitemapindex xmlns="{SITEMAP_NS}">\n'
+            for name, number, lastmod in entries:
+                yield '  <sitemap>\n'
+                yield f'    <loc>{html.escape(base_url)}/sitemaps/{name}-{number}.xml</loc>\n'
+                if lastmod:
+                    yield f'    <lastmod>{lastmod.strftime("%Y-%m-%d")}</lastmod>\n'
+                yield '  </sitemap>\n'
+            yield '</sitemapindex>\n'
+
+        dates = [lastmod for _, _, lastmod in entries if lastmod]
+        return make_document(chunks(), max(dates) if dates else None)
+
+    return _cache.get(('sitemap-index',), deps, compute)
+
+
+# ==============================================================================
+# FEEDS
+# ==============================================================================
+
+def iter_posts_feed(posts: List[Dict], base_url: str) -> Iterator[str]:
+    yield XML_HEADER
+    yield '<rss version="2.0">\n  <channel>\n'
+    yield '    <title>Soulfra</title>\n'
+    yield f'    <link>{html.escape(base_url)}</link>\n'
+    yield '    <description>AI, privacy, and the future of technology</description>\n'
+    yield '    <language>en-us</language>\n'
+    if posts:
+        yield f'    <lastBuildDate>{rfc822(posts[0]["published_at"])}</lastBuildDate>\n'
+    for post in posts:
+        link = f"{base_url}/post/{quote(post['slug'], safe='')}"
+        yield f'''    <item>
+      <title>{html.escape(post['title'] or '')}</title>
+      <link>{html.escape(link)}</link>
+      <guid>{html.escape(link)}</guid>
+      <description>{html.escape((post['content'] or '')[:300])}...</description>
+      <pubDate>{rfc822(post['published_at'])}</pubDate>
+      <author>{html.escape(post['author'] or 'Unknown')}</author>
+    </item>
+'''
+    yield '  </channel>\n</rss>\n'
+
+
+def posts_feed(limit: int = 20) -> Document:
+    """Cached RSS 2.0 feed of the latest published posts"""
+
+    def compute():
+        db = get_db()
+        posts = [dict(row) for row in db.execute('''
+            SELECT p.title, p.slug, p.content, p.published_at, u.display_name AS author
+            FROM posts p
+            LEFT JOIN users u ON u.id = p.user_id
+            WHERE p.published_at IS NOT NULL
+            ORDER BY p.published_at DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()]
+        db.close()
+        last_modified = parse_timestamp(posts[0]['published_at']) if posts else None
+        return make_document(iter_posts_feed(posts, _base_url()), last_modified,
+                             mimetype='application/rss+xml')
+
+    return _cache.get(('feed', 'posts', limit), ('posts', 'users'), compute)
+
+
+def cached_document(key: Hashable, deps: Tuple[str, ...], render: Callable[[], Tuple[Iterable[str], Optional[datetime]]],
+                    mimetype: str = 'application/xml') -> Document:
+    """
+    Cache any rendered feed
+
+    render() returns (chunks, last_modified) and only runs when one of the
+    deps tables changed.
+    """
+    def compute():
+        chunks, last_modified = render()
+        return make_document(chunks, last_modified, mimetype=mimetype)
+
+    return _cache.get(key, deps, compute)
+
+
+# ==============================================================================
+# HTTP
+# ==============================================================================
+
+def respond(document: Union[Document, Iterator[bytes], None], mimetype: str = 'application/xml'):
+    """
+    Flask response with ETag/Last-Modified, answering 304 when the client's
+    copy is current. A streaming body (cold shard render) is sent as-is.
+    """
+    from flask import Response, abort, request
+
+    if document is None:
+        abort(404)
+
+    if not isinstance(document, Document):
+        return Response(document, mimetype=mimetype)
+
+    response = Response(document.body, mimetype=document.mimetype)
+    response.set_etag(document.etag)
+    response.last_modified = document.last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = CLIENT_MAX_AGE
+    return response.make_conditional(request)
+
+
+if __name__ == '__main__':
+    import sys
+
+    if '--stats' in sys.argv:
+        sitemap_index()
+        print(_cache.stats())
+    else:
+        index = sitemap_index()
+        print(index.body.decode('utf-8'))
@@ -21,9 +21,36 @@ Usage:
     # Returns: {'homepage': '<html>...', 'tutorials': '<html>...', ...}
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime
-from models import ProfessionalProfile, Tutorial
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from database import get_db
+
+# Rows are exposed with attribute access, so the page builders below read the
+# same as when they were written against ORM models
+ProfessionalProfile = SimpleNamespace
+Tutorial = SimpleNamespace
+
+# Everything a rendered page depends on - a site is re-rendered only when
+# one of these values changes (branding/theme inputs included)
+PROFILE_COLUMNS = (
+    'id', 'business_name', 'tagline', 'phone', 'email',
+    'address_street', 'address_city', 'address_state', 'address_zip',
+    'license_number', 'license_state', 'license_type',
+    'logo_url', 'primary_color', 'accent_color',
+)
+TUTORIAL_COLUMNS = ('id', 'professional_id', 'title', 'meta_description', 'audio_url',
+                    'published_at', 'view_count')
+SITE_CACHE_SIZE = 2048
+
+_site_cache: "OrderedDict[int, tuple]" = OrderedDict()    # id -> (fingerprint, site)
+_site_lock = threading.Lock()
+_site_stats = {'rendered': 0, 'reused': 0}
 
 
 # ============================================================================
@@ -34,6 +61,10 @@ def generate_professional_site(professional_id: int) -> Dict[str, str]:
     """
     Generate complete website for professional
 
+    Pages are cached per professional and re-rendered only when the
+    profile, branding or published tutorials change, or the date does
+    (pages show the © year and a "Last verified" date).
+
     Args:
         professional_id: Professional profile ID
 
@@ -45,19 +76,114 @@ def generate_professional_site(professional_id: int) -> Dict[str, str]:
         >>> print(site.keys())
         dict_keys(['homepage', 'tutorials', 'license', 'contact', 'base_css'])
     """
-    professional = ProfessionalProfile.query.get(professional_id)
+    sites = generate_professional_sites([professional_id])
 
-    if not professional:
+    if professional_id not in sites:
         raise ValueError(f"Professional {professional_id} not found")
 
-    # Get published tutorials
-    tutorials = Tutorial.query.filter_by(
-        professional_id=professional_id,
-        status='published'
-    ).order_by(Tutorial.published_at.desc()).all()
+    return sites[professional_id]
+
+
+def generate_professional_sites(professional_ids: Optional[Iterable[int]] = None) -> Dict[int, Dict[str, str]]:
+    """
+    Generate sites for many professionals (all if ids is None) with two
+    queries total, reusing every cached site whose inputs are unchanged
+    """
+    profiles, tutorials = _load_site_inputs(professional_ids)
+    rendered_on = _render_date()
+    sites = {}
+
+    for professional_id, profile in profiles.items():
+        site_tutorials = tutorials.get(professional_id, [])
+        fingerprint = site_fingerprint(profile, site_tutorials, rendered_on)
+
+        with _site_lock:
+            cached = _site_cache.get(professional_id)
+            if cached and cached[0] == fingerprint:
+                _site_cache.move_to_end(professional_id)
+                _site_stats['reused'] += 1
+                sites[professional_id] = dict(cached[1])
+                continue
+
+        site = _render_site(_as_professional(profile), [_as_tutorial(t) for t in site_tutorials])
+
+        with _site_lock:
+            _site_stats['rendered'] += 1
+            _site_cache[professional_id] = (fingerprint, site)
+            if len(_site_cache) > SITE_CACHE_SIZE:
+                _site_cache.popitem(last=False)
+        sites[professional_id] = dict(site)
+
+    return sites
+
+
+def site_fingerprint(profile: Dict, tutorials: List[Dict], rendered_on: Optional[date] = None) -> str:
+    """Hash of every input the pages are rendered from, including the date they show"""
+    payload = json.dumps([profile, tutorials, rendered_on or _render_date()],
+                         sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _render_date() -> date:
+    return date.today()
 
-    # Generate all pages
-    site = {
+
+def site_cache_stats() -> Dict[str, int]:
+    with _site_lock:
+        return {**_site_stats, 'cached_sites': len(_site_cache)}
+
+
+def clear_site_cache():
+    with _site_lock:
+        _site_cache.clear()
+
+
+def _load_site_inputs(professional_ids: Optional[Iterable[int]]):
+    ids = None if professional_ids is None else sorted(set(professional_ids))
+    where, params = '', ()
+    if ids is not None:
+        if not ids:
+            return {}, {}
+        where = f" WHERE id IN ({','.join('?' * len(ids))})"
+        params = tuple(ids)
+
+    db = get_db()
+    try:
+        profiles = {
+            row['id']: dict(row) for row in db.execute(
+                f"SELECT {', '.join(PROFILE_COLUMNS)} FROM professional_profile{where}", params
+            )
+        }
+        tutorials: Dict[int, List[Dict]] = {}
+        tutorial_where = where.replace('id IN', 'professional_id IN') + (' AND' if where else ' WHERE')
+        for row in db.execute(
+            f"SELECT {', '.join(TUTORIAL_COLUMNS)} FROM tutorial{tutorial_where} status = 'published' "
+            f"ORDER BY professional_id, published_at DESC",
+            params
+        ):
+            tutorials.setdefault(row['professional_id'], []).append(dict(row))
+    finally:
+        db.close()
+
+    return profiles, tutorials
+
+
+def _as_professional(profile: Dict) -> ProfessionalProfile:
+    return ProfessionalProfile(**profile)
+
+
+def _as_tutorial(tutorial: Dict) -> Tutorial:
+    published_at = tutorial['published_at']
+    if isinstance(published_at, str):
+        try:
+            published_at = datetime.fromisoformat(published_at)
+        except ValueError:
+            published_at = None
+    return Tutorial(**{**tutorial, 'published_at': published_at})
+
+
+def _render_site(professional: ProfessionalProfile, tutorials: List[Tutorial]) -> Dict[str, str]:
+    return {
         'homepage': generate_homepage(professional, tutorials),
         'tutorials': generate_tutorials_page(professional, tutorials),
         'license': generate_license_page(professional),
@@ -65,12 +191,6 @@ def generate_professional_site(professional_id: int) -> Dict[str, str]:
         'base_css': generate_base_css(professional)
     }
 
-    print(f"✅ Generated complete site for {professional.business_name}")
-    print(f"   - {len(tutorials)} tutorials")
-    print(f"   - {len(site)} pages")
-
-    return site
-
 
 # ============================================================================
 # Homepage
@@ -1072,6 +1192,116 @@ body {{
     return css
 
 
+# ============================================================================
+# Static Export
+# ============================================================================
+
+def write_site(site: Dict[str, str], output_dir: str) -> int:
+    """
+    Write a generated site to output_dir, skipping files whose content is
+    unchanged (keeps mtimes and static-host uploads stable)
+
+    Returns:
+        Number of files written
+    """
+    import os
+    from syndication import write_document
+
+    written = 0
+    for page_name, content in site.items():
+        file_name = 'base.css' if page_name == 'base_css' else f'{page_name}.html'
+        written += write_document(os.path.join(output_dir, file_name), [content])
+    return written
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def benchmark(sites: int = 1000) -> Dict:
+    """
+    Render `sites` professional sites, theme CSS files and formula templates
+    cold (empty caches) and warm (nothing changed) against scratch data
+    """
+    import contextlib
+    import io
+    import os
+    import tempfile
+    import time
+
+    import database
+    from formula_engine import FormulaEngine, compile_expression, compile_template
+    from theme_compiler import ThemeCache, ThemeCompiler
+
+    def timed(fn):
+        start = time.perf_counter()
+        fn()
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    original_path = database.DB_PATH
+    with tempfile.TemporaryDirectory(prefix='sites-bench-') as tmp:
+        database.DB_PATH = os.path.join(tmp, 'sites_bench.db')
+        try:
+            database.init_db()
+            db = get_db()
+            for i in range(1, sites + 1):
+                db.execute(
+                    '''INSERT INTO professional_profile (id, user_id, business_name, subdomain, trade_category,
+                                                       phone, address_city, address_state, license_number,
+                                                       license_state, license_type, primary_color)
+                       VALUES (?, ?, ?, ?, 'plumbing', '813-555-0100', 'Tampa', 'FL', ?, 'FL', 'Plumbing', ?)''',
+                    (i, i, f'Pro {i} Plumbing', f'pro{i}', f'CFC{i:07d}', f'#{i * 2654435 % 0xFFFFFF:06x}')
+                )
+                db.executemany(
+                    '''INSERT INTO tutorial (professional_id, title, audio_url, meta_description, status, published_at)
+                       VALUES (?, ?, '', 'Step-by-step guide', 'published', ?)''',
+                    [(i, f'Tutorial {n}', f'2026-0{n + 1}-01 09:00:00') for n in range(3)]
+                )
+            db.commit()
+            db.close()
+
+            clear_site_cache()
+            results = {'sites': sites}
+            results['sites_cold_ms'] = timed(generate_professional_sites)
+            results['sites_warm_ms'] = timed(generate_professional_sites)
+
+            # Themes: compile then serve from a fresh in-memory cache
+            domains_dir = os.path.join(tmp, 'domains')
+            domains = [f'brand{i}' for i in range(sites)]
+            for i, domain in enumerate(domains):
+                brand_dir = os.path.join(domains_dir, domain, 'brand')
+                os.makedirs(brand_dir)
+                with open(os.path.join(brand_dir, f'{domain}.json'), 'w') as f:
+                    json.dump({'concepts': {'styling': [{'metadata': {'primaryColor': f'#{i * 40503 % 0xFFFFFF:06x}'}}]}}, f)
+
+            compiler = ThemeCompiler(domains_dir=domains_dir)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results['themes_compile_cold_ms'] = timed(compiler.compile_all_themes)
+                results['themes_compile_warm_ms'] = timed(compiler.compile_all_themes)
+
+            cache = ThemeCache(domains_dir)
+            results['themes_serve_cold_ms'] = timed(lambda: [cache.get(d) for d in domains])
+            results['themes_serve_warm_ms'] = timed(lambda: [cache.get(d) for d in domains])
+
+            # Formulas: one template, per-site variables
+            template = ':root { --primary: {{primary}}; --dark: {{darken(primary, 0.3)}}; ' \
+                       '--light: {{lighten(primary, 0.3)}}; --size: {{fontSize * 1.5}}px; } ' \
+                       '<h1>{{upper(brandName)}}</h1>' * 5
+            variables = [{'primary': f'#{i * 40503 % 0xFFFFFF:06x}', 'fontSize': 16, 'brandName': f'pro{i}'}
+                         for i in range(sites)]
+            compile_expression.cache_clear()
+            compile_template.cache_clear()
+            engine = FormulaEngine()
+            results['formulas_cold_ms'] = timed(lambda: [engine.render_template(template, v) for v in variables])
+            results['formulas_warm_ms'] = timed(lambda: [engine.render_template(template, v) for v in variables])
+
+            results['site_cache'] = site_cache_stats()
+            results['theme_cache'] = cache.stats()
+            return results
+        finally:
+            database.DB_PATH = original_path
+
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
@@ -1083,35 +1313,35 @@ def main():
     Usage:
         python template_generator.py --professional-id 1
         python template_generator.py --professional-id 1 --output-dir ./output
+        python template_generator.py --benchmark 1000
     """
     import argparse
     import os
 
     parser = argparse.ArgumentParser(description='Professional Site Template Generator')
 
-    parser.add_argument('--professional-id', type=int, required=True, help='Professional ID')
+    parser.add_argument('--professional-id', type=int, help='Professional ID')
     parser.add_argument('--output-dir', default='./output', help='Output directory')
+    parser.add_argument('--benchmark', type=int, metavar='SITES',
+                        help='Benchmark cold vs warm rendering of N sites and themes')
 
     args = parser.parse_args()
 
+    if args.benchmark:
+        print(json.dumps(benchmark(args.benchmark), indent=2))
+        return
+
+    if not args.professional_id:
+        parser.error('--professional-id is required')
+
     # Generate site
     site = generate_professional_site(args.professional_id)
 
-    # Create output directory
-    os.makedirs(args.output_dir, exist_ok=True)
-
     # Write files
-    for page_name, html_content in site.items():
-        if page_name == 'base_css':
-            file_path = os.path.join(args.output_dir, 'base.css')
-        else:
-            file_path = os.path.join(args.output_dir, f'{page_name}.html')
-
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-
-        print(f"✅ Written: {file_path}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    written = write_site(site, args.output_dir)
 
+    print(f"✅ Written: {written} of {len(site)} files (others unchanged)")
     print(f"\n✅ Site generated successfully in {args.output_dir}")
 
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Spaced Repetition Due Queue
+
+Demonstrates:
+- Due cards are an indexed range read on (user_id, next_review)
+- New cards fill reserved slots from a per-user cursor
+- A batch of offline reviews schedules exactly like one-at-a-time reviews
+- Ease resets reschedule every matching card in one pass
+
+Usage:
+    python3 -m pytest test_anki_learning_system.py
+"""
+
+from datetime import datetime, timedelta
+
+import database
+import schema_registry
+from anki_learning_system import (
+    DUE_CARDS_SQL, NEW_CARD_SLOTS, get_cards_due, import_tutorial_questions,
+    reschedule_cards, review_card, sm2_schedule, submit_reviews
+)
+
+
+def _db(monkeypatch, tmp_path, cards=200):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    schema_registry.run_migrations()
+    questions = [{'question': f'Q{i}', 'answer': f'A{i}'} for i in range(cards)]
+    assert import_tutorial_questions(1, questions) == cards
+    assert import_tutorial_questions(1, questions) == 0          # duplicates skipped
+    return database.get_db()
+
+
+def test_due_queue_with_new_card_slots(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    plan = ' '.join(row[3] for row in db.execute('EXPLAIN QUERY PLAN ' + DUE_CARDS_SQL, (1, '9999', 20)))
+    assert 'idx_progress_user_due' in plan
+
+    first = get_cards_due(1, limit=20)
+    assert [card['id'] for card in first] == list(range(1, 21))      # nothing due yet: all new
+
+    past = datetime.now() - timedelta(days=3)
+    submit_reviews(1, [{'card_id': i, 'quality': 4, 'reviewed_at': past.isoformat()} for i in range(1, 31)])
+
+    cards = get_cards_due(1, limit=20)
+    new = [card for card in cards if card['next_review'] is None]
+    assert len(new) == NEW_CARD_SLOTS and new[0]['id'] == 31
+    assert len(cards) == 20 and all(card['id'] <= 30 for card in cards if card['next_review'])
+    assert db.execute('SELECT last_card_id FROM learning_new_cursor WHERE user_id = 1').fetchone()[0] == 30
+    db.close()
+
+
+def test_batch_reviews_match_single_reviews(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path, cards=3)
+    session_id = db.execute("INSERT INTO learning_sessions (user_id, session_type) VALUES (2, 'review')").lastrowid
+    db.commit()
+
+    start = datetime(2026, 1, 1, 9, 0)
+    reviews = [
+        {'card_id': 1, 'quality': 5, 'reviewed_at': (start + timedelta(days=7)).isoformat()},
+        {'card_id': 1, 'quality': 4, 'reviewed_at': start.isoformat()},          # out of order
+        {'card_id': 2, 'quality': 1, 'reviewed_at': start.isoformat()},
+    ]
+    results = submit_reviews(2, reviews, session_id)
+
+    reps, ease, interval = sm2_schedule(4, 0, 2.5, 1)
+    reps, ease, interval = sm2_schedule(5, reps, ease, interval)
+    assert results[0]['repetitions'] == reps and results[0]['interval_days'] == interval
+    assert results[0]['ease_factor'] == ease and results[0]['streak'] == 2
+    assert results[1]['interval_days'] == 1 and results[2]['status'] == 'learning'
+
+    single = review_card(3, 4, user_id=2, session_id=session_id)
+    assert single['repetitions'] == 1 and single['accuracy'] == 100
+
+    assert db.execute('SELECT COUNT(*) FROM review_history WHERE user_id = 2').fetchone()[0] == 4
+    assert db.execute('SELECT cards_reviewed, cards_correct FROM learning_sessions WHERE id = ?',
+                      (session_id,)).fetchone()[:] == (4, 3)
+    db.close()
+
+
+def test_reschedule_ease_reset(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path, cards=50)
+    submit_reviews(1, [{'card_id': i, 'quality': 5} for i in range(1, 51)] * 3)
+
+    before = db.execute('SELECT ease_factor, interval_days FROM learning_progress WHERE card_id = 1').fetchone()
+    assert reschedule_cards(user_id=1, ease_factor=1.3) == 50
+
+    after = db.execute('SELECT ease_factor, interval_days FROM learning_progress WHERE card_id = 1').fetchone()
+    assert after['ease_factor'] == 1.3
+    assert after['interval_days'] == round(before['interval_days'] * 1.3 / before['ease_factor'])
+    db.close()
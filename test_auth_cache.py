@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test Auth Cache
+
+Demonstrates:
+- Verified JWTs are served from memory (DB check runs once)
+- revoke_user() rejects cached tokens immediately; logging in again right
+  afterwards works
+- Revocations outlive a flood of logouts and expire with the tokens they cover
+- NonceSet catches replays in memory and falls back to confirm()
+
+Usage:
+    python3 -m pytest test_auth_cache.py
+"""
+
+import datetime
+import time
+
+import jwt
+
+import auth_cache
+from auth_cache import ExpiringMap, NonceSet, TTLCache
+
+
+SECRET = 'soulfra-auth-cache-test-secret-0123456789'
+
+
+def _token(master_user_id=1, issued_ago=5):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    payload = {
+        'master_user_id': master_user_id,
+        'iat': now - datetime.timedelta(seconds=issued_ago),
+        'exp': now + datetime.timedelta(hours=1),
+    }
+    return jwt.encode(payload, SECRET, algorithm='HS256')
+
+
+def test_jwt_check_runs_once():
+    auth_cache.clear_all()
+    token = _token()
+    calls = []
+
+    def check(tok, payload):
+        calls.append(tok)
+        return True
+
+    for _ in range(5):
+        assert auth_cache.verify_jwt(token, SECRET, check=check)['master_user_id'] == 1
+
+    assert len(calls) == 1
+
+
+def test_failed_check_is_remembered():
+    auth_cache.clear_all()
+    token = _token()
+    calls = []
+
+    def check(tok, payload):
+        calls.append(tok)
+        return False
+
+    assert auth_cache.verify_jwt(token, SECRET, check=check) is None
+    assert auth_cache.verify_jwt(token, SECRET, check=check) is None
+    assert len(calls) == 1
+
+
+def test_revoke_user_drops_cached_tokens():
+    auth_cache.clear_all()
+    token = _token(master_user_id=7)
+
+    assert auth_cache.verify_jwt(token, SECRET)
+    auth_cache.revoke_user(7)
+    assert auth_cache.verify_jwt(token, SECRET) is None
+
+    relogin = _token(master_user_id=7, issued_ago=0)
+    assert auth_cache.verify_jwt(relogin, SECRET)['master_user_id'] == 7
+
+
+def test_revocations_outlive_flood():
+    auth_cache.clear_all()
+    token = _token()
+    auth_cache.revoke_token(token)
+    for i in range(auth_cache.MAX_ENTRIES + 10):
+        auth_cache.revoke_token(f'flood-{i}')
+    assert auth_cache.verify_jwt(token, SECRET) is None
+    auth_cache.clear_all()
+
+    revoked = ExpiringMap()
+    revoked.set('user', time.time(), time.time() - 1)
+    assert revoked.get('user') is None
+
+
+def test_cached_lookup_skips_loader_on_hit():
+    auth_cache.clear_all()
+    loads = []
+
+    def loader(token):
+        loads.append(token)
+        return {'user_id': 3, 'permissions': ['deploy_git']}
+
+    auth_cache.cached_lookup('device', 'abc', loader)
+    auth_cache.cached_lookup('device', 'abc', loader)
+    assert loads == ['abc']
+
+    auth_cache.revoke_token('abc')
+    assert auth_cache.cached_lookup('device', 'abc', loader) is None
+
+
+def test_ttl_cache_evicts_oldest():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+
+    assert cache.get('a', None) is None
+    assert cache.get('c') == 3
+
+
+def test_nonce_set():
+    spent_elsewhere = {'n2'}
+    nonces = NonceSet(lambda: ['n1'], confirm=lambda n: n in spent_elsewhere)
+
+    assert 'n1' in nonces
+    assert 'n2' in nonces
+    assert 'n3' not in nonces
+
+    nonces.add('n3')
+    assert 'n3' in nonces
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Blamechain Checkpoints
+
+Demonstrates:
+- append_edits() ingests a batch of edits with one head lookup per table
+- Verification signs a checkpoint and later replays only newer versions
+- Rewriting a checkpointed version is caught without a full replay
+- audit_all_chains() verifies every chain and records the result; chains
+  recorded before exact timestamps were stored are reported as legacy,
+  not as tampered
+
+Usage:
+    python3 -m pytest test_blamechain.py
+"""
+
+import database
+import schema_registry
+from blamechain import append_edits, audit_all_chains, verify_message_chain
+
+
+def _db(monkeypatch, tmp_path):
+    monkeypatch.setenv('BLAMECHAIN_CHECKPOINT_KEY', 'test-key')
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    db = database.get_db()
+    db.execute('CREATE TABLE messages (id INTEGER PRIMARY KEY, content TEXT, from_user_id INTEGER)')
+    db.executemany('INSERT INTO messages (id, content, from_user_id) VALUES (?, ?, 1)',
+                   [(1, 'original one'), (2, 'original two'), (3, 'original three')])
+    db.commit()
+    db.close()
+    schema_registry.run_migrations()
+    return database.get_db()
+
+
+def _edits(message_id, count, start=0):
+    return [{'message_table': 'messages', 'message_id': message_id,
+             'new_content': f'edit {i}', 'user_id': 2} for i in range(start, start + count)]
+
+
+def test_batch_edits_and_checkpointed_verification(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    results = append_edits(db, _edits(1, 40) + _edits(2, 3))
+    db.commit()
+
+    assert results[0]['version'] == 2 and results[39]['version'] == 41
+    assert db.execute("SELECT content, edit_count FROM messages WHERE id = 1").fetchone()[:] == ('edit 39', 40)
+    assert db.execute("SELECT version_number FROM blamechain_heads WHERE message_id = 1").fetchone()[0] == 41
+
+    first = verify_message_chain(db, 'messages', 1)
+    assert first['chain_valid'] and first['versions_replayed'] == 41
+
+    append_edits(db, _edits(1, 2, start=40))
+    db.commit()
+    second = verify_message_chain(db, 'messages', 1)
+    assert second['chain_valid']
+    assert second['checkpoint_version'] == 41 and second['versions_replayed'] == 2
+
+    assert verify_message_chain(db, 'messages', 2)['versions_replayed'] == 4   # below interval - no checkpoint
+    db.close()
+
+
+def test_tampering_detected(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    append_edits(db, _edits(1, 40))
+    db.commit()
+    verify_message_chain(db, 'messages', 1)
+
+    # Re-hashed rewrite of the checkpointed head
+    db.execute("UPDATE message_history SET chain_hash = 'forged' WHERE message_id = 1 AND version_number = 41")
+    db.commit()
+    result = verify_message_chain(db, 'messages', 1)
+    assert not result['chain_valid'] and 'modified' in result['error']
+    assert result['status'] == 'checkpoint_mismatch'
+
+    # Forged checkpoint signature is ignored -> full replay finds the break
+    db.execute("UPDATE blamechain_checkpoints SET signature = 'x'")
+    db.commit()
+    result = verify_message_chain(db, 'messages', 1)
+    assert not result['chain_valid'] and result['versions_replayed'] == 41 and result['status'] == 'tampered'
+    db.close()
+
+
+def test_audit_all_chains(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    append_edits(db, _edits(1, 5) + _edits(2, 5) + _edits(3, 2))
+    db.execute("UPDATE message_history SET content = 'rewritten' WHERE message_id = 2 AND version_number = 3")
+    # Old rows kept the column default, not the timestamp that was hashed
+    db.execute("UPDATE message_history SET edited_at = '2025-06-01 12:00:00' WHERE message_id = 3")
+    db.commit()
+    assert verify_message_chain(db, 'messages', 3)['status'] == 'legacy'
+    db.close()
+
+    audit = audit_all_chains(database.DB_PATH, workers=1)
+    assert audit['chains_checked'] == 3 and audit['versions_replayed'] == 15
+    assert [(c['message_id'], c['status']) for c in audit['invalid']] == [(2, 'tampered')]
+    assert [c['message_id'] for c in audit['legacy']] == [3]
+
+    again = audit_all_chains(database.DB_PATH, workers=1)
+    assert again['versions_replayed'] == 9          # valid chain 1 resumes from its checkpoint
+
+    db = database.get_db()
+    assert db.execute('SELECT COUNT(*) FROM blamechain_audits').fetchone()[0] == 2
+    db.close()
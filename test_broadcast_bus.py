@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test Broadcast Bus
+
+Demonstrates:
+- A room broadcast on one worker reaches clients on another worker
+- Full client queues drop the oldest message and count it
+- Coalesced events collapse to the latest payload
+- The job executor rejects work past its backlog
+
+Usage:
+    python3 -m pytest test_broadcast_bus.py
+"""
+
+import threading
+
+from broadcast_bus import BroadcastBus, DROP_OLDEST
+
+
+def _bus(sent, db_path=None, **kwargs):
+    bus = BroadcastBus(
+        lambda event, data, sid: sent.append((sid, event, data)),
+        db_path=db_path,
+        start_task=lambda *args: None,   # drive loops by hand
+        **kwargs
+    )
+    return bus.start()
+
+
+def test_cross_worker_room_broadcast(tmp_path):
+    db_path = str(tmp_path / 'bus.db')
+    sent_a, sent_b = [], []
+    worker_a = _bus(sent_a, db_path)
+    worker_b = _bus(sent_b, db_path)
+
+    worker_a.join('alice', 'GAME-1')
+    worker_b.join('bob', 'GAME-1')
+    worker_b.join('carol', 'brand:other')
+
+    worker_a.publish('room_message', {'message': 'hi'}, room='GAME-1')
+    worker_a.flush()
+    assert worker_b.poll_bus() == 1
+    worker_b.flush()
+
+    assert sent_a == [('alice', 'room_message', {'message': 'hi'})]
+    assert sent_b == [('bob', 'room_message', {'message': 'hi'})]
+
+    worker_a.stop()
+    worker_b.stop()
+
+
+def test_full_queue_drops_oldest():
+    sent = []
+    bus = _bus(sent, queue_limit=2, drop_policy=DROP_OLDEST)
+    bus.connect('slow')
+
+    for i in range(5):
+        bus.send_to('slow', 'tick', i)
+    bus.flush()
+
+    assert [data for _, _, data in sent] == [3, 4]
+    assert bus.stats()['messages_dropped'] == 3
+    bus.stop()
+
+
+def test_typing_events_coalesce():
+    sent = []
+    bus = _bus(sent)
+    bus.join('reader', 'post:42')
+    bus.join('writer', 'post:42')
+
+    for n in range(10):
+        bus.publish('typing_indicator', {'n': n}, room='post:42', skip_sid='writer',
+                    coalesce_key=('typing', 42, 'writer'))
+    bus.flush()
+
+    assert sent == [('reader', 'typing_indicator', {'n': 9})]
+    assert bus.stats()['messages_coalesced'] == 9
+    bus.stop()
+
+
+def test_executor_backlog_is_bounded():
+    bus = _bus([], executor_workers=1, executor_backlog=1)
+    release = threading.Event()
+
+    assert bus.submit(release.wait)
+    assert not bus.submit(release.wait)
+    assert bus.stats()['jobs_rejected'] == 1
+
+    release.set()
+    bus.stop()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Import Engine
+
+Demonstrates:
+- Post imports stream the file in chunks, look brands up once, make slugs
+  unique in bulk (hello-world-1, -2, ...) and write each chunk with one
+  executemany() - no per-row queries - while the job row tracks progress
+- Domain imports skip existing domains, and large imports run as a
+  background job that can be polled by ID
+- Demo professionals seed through the same engine and re-seeding skips
+  existing subdomains
+
+Usage:
+    python3 -m pytest test_bulk_import.py
+"""
+
+import csv
+import time
+
+import pytest
+
+import database
+import schema_registry
+from bulk_import import BulkImporter, get_import_job, read_rows, run_import
+
+
+@pytest.fixture
+def db_path(monkeypatch, tmp_path):
+    path = str(tmp_path / 'soulfra_test.db')
+    monkeypatch.setattr(database, 'DB_PATH', path)
+    database.init_db()
+    db = database.get_db()
+    db.execute('ALTER TABLE posts ADD COLUMN excerpt TEXT')
+    db.execute('ALTER TABLE posts ADD COLUMN brand_id INTEGER')
+    db.execute('''CREATE TABLE brands (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                  slug TEXT UNIQUE NOT NULL, domain TEXT, category TEXT, tier TEXT, emoji TEXT,
+                  brand_type TEXT, tagline TEXT, created_at TIMESTAMP)''')
+    db.execute("INSERT INTO brands (name, slug, domain) VALUES ('Death To Data', 'deathtodata', 'deathtodata.com')")
+    db.execute("INSERT INTO users (username, email, password_hash) VALUES ('admin', 'admin@soulfra.com', 'x')")
+    db.execute("INSERT INTO posts (user_id, title, slug, content, published_at) "
+               "VALUES (1, 'Hello', 'hello-world', 'existing', '2025-01-01')")
+    db.commit()
+    db.close()
+    schema_registry.ensure_schema()         # startup migrations, outside the queries counted below
+    return tmp_path
+
+
+def _write_csv(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_posts_import_in_chunks_with_bulk_slugs(db_path):
+    from batch_import_posts import import_posts, map_columns, posts_target
+
+    path = _write_csv(db_path / 'posts.csv', ['Title', 'Content', 'Brand', 'Published_Date'], [
+        ['Hello World', 'First body', 'deathtodata', '2025-01-15'],
+        ['Hello World', 'Second body', '', ''],
+        ['', 'No title', '', ''],
+        ['Hello World!', 'Third body', 'nosuchbrand', ''],
+        ['Hello World!', 'Fourth body', '', 'not a date'],
+    ])
+
+    statements = []
+    database.set_query_observer(statements.append)
+    try:
+        stats = import_posts(map_columns(read_rows(path)), chunk_size=2, source=path)
+    finally:
+        database.set_query_observer(None)
+
+    assert stats['success'] == 3 and stats['errors'] == 2
+    assert stats['error_messages'] == ['Row 4: Missing title', 'Row 5: Brand not found: nosuchbrand']
+    assert sum('FROM brands' in sql for sql in statements) == 1
+    assert not any('WHERE slug =' in sql for sql in statements)
+
+    db = database.get_db()
+    posts = db.execute('SELECT slug, brand_id, excerpt FROM posts WHERE id > 1 ORDER BY id').fetchall()
+    assert [p['slug'] for p in posts] == ['hello-world-1', 'hello-world-2', 'hello-world-3']
+    assert posts[0]['brand_id'] == 1 and posts[1]['brand_id'] is None and posts[0]['excerpt'] == 'First body'
+    db.close()
+
+    job = get_import_job(stats['job_id'])
+    assert job['status'] == 'completed' and job['processed'] == 5 and job['target'] == 'posts'
+
+    # Scale: 20k rows with colliding titles in bounded chunks
+    big = _write_csv(db_path / 'big.csv', ['title', 'content'],
+                     ([f'Post {i % 100}', f'Body {i}'] for i in range(20000)))
+    importer = BulkImporter(posts_target(), chunk_size=5000)
+    started = time.perf_counter()
+    job = importer.run(map_columns(read_rows(big)))
+    print(f"✅ {importer.report()}")
+    assert job['imported'] == 20000 and time.perf_counter() - started < 30
+
+    db = database.get_db()
+    assert db.execute('SELECT COUNT(DISTINCT slug) FROM posts').fetchone()[0] == 20004
+    assert db.execute("SELECT 1 FROM posts WHERE slug = 'post-7-199'").fetchone()
+    db.close()
+
+
+def test_domains_skip_existing_and_large_imports_run_in_background(db_path):
+    from import_domains_csv import brands_target, import_csv
+
+    path = _write_csv(db_path / 'domains.csv', ['name', 'domain', 'category', 'tier', 'emoji'], [
+        ['Death To Data', 'deathtodata.com', 'privacy', 'foundation', '🔒'],
+        ['# Commented Out', 'nope.com', 'tech', '', ''],
+        ['Soulfra', 'soulfra.com', 'tech', 'foundation', '🌐'],
+        ['Cal Riven', 'calriven.com', 'tech', 'creative', '🤖'],
+    ])
+    job = import_csv(path)
+    assert job['imported'] == 2 and job['skipped'] == 1
+
+    db = database.get_db()
+    assert {row['slug'] for row in db.execute('SELECT slug FROM brands')} == {'deathtodata', 'soulfra', 'calriven'}
+    db.close()
+
+    with pytest.raises(SystemExit):
+        import_csv(_write_csv(db_path / 'bad.csv', ['name', 'domain', 'category'], [['X', 'x.com', 'cheese']]))
+
+    # The /api/domains/import-csv payload: name slugs get suffixes, large lists go to the background
+    rows = [{'name': 'Soulfra', 'domain': f'soulfra{i}.net'} for i in range(30)]
+    target = brands_target(slug_from='name', strict=False, skip_existing_domains=False)
+    job = run_import(target, lambda: rows, total=len(rows), inline_limit=10)
+    assert job['status'] in ('queued', 'running', 'completed')
+
+    deadline = time.monotonic() + 10
+    while get_import_job(job['job_id'])['status'] != 'completed' and time.monotonic() < deadline:
+        time.sleep(0.05)
+    job = get_import_job(job['job_id'])
+    assert job['status'] == 'completed' and job['imported'] == 30 and job['percent'] == 100.0
+
+    db = database.get_db()
+    assert db.execute("SELECT COUNT(*) FROM brands WHERE slug LIKE 'soulfra-%'").fetchone()[0] == 30
+    db.close()
+
+
+def test_demo_professionals_seed_through_the_engine(db_path):
+    from demo_seed_professionals import DEMO_PROFESSIONALS, seed_demo_professionals
+
+    assert seed_demo_professionals() == len(DEMO_PROFESSIONALS)
+    assert seed_demo_professionals() == 0
+
+    path = _write_csv(db_path / 'pros.csv', ['business_name', 'subdomain', 'trade_category', 'address_city'], [
+        ['Gulf Coast Roofing', '', 'roofer', 'Sarasota'],
+        ['No Trade LLC', 'notrade', '', 'Tampa'],
+    ])
+    assert seed_demo_professionals(read_rows(path)) == 1
+
+    db = database.get_db()
+    row = db.execute("SELECT tier, license_verified FROM professional_profile WHERE subdomain = 'gulf-coast-roofing'").fetchone()
+    assert tuple(row) == ('free', 0)
+    assert db.execute('SELECT COUNT(*) FROM professional_profile').fetchone()[0] == len(DEMO_PROFESSIONALS) + 1
+    db.close()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test Content-Addressed Archive Engine
+
+Demonstrates:
+- export_all() runs in a process pool and records every entry in the manifest
+- Re-runs skip unchanged pairings and re-export only edited ones
+- Streaming verification matches the in-memory content hash
+- Sampled verification always re-checks files that changed on disk
+- Index is rendered from the manifest and not rewritten when unchanged
+
+Usage:
+    python3 -m pytest test_content_addressed_archive.py
+"""
+
+import sqlite3
+
+
+def _archive(monkeypatch, tmp_path, pairings=20):
+    monkeypatch.chdir(tmp_path)
+    from content_addressed_archive import ContentAddressedArchive
+
+    db_path = str(tmp_path / 'soulfra_test.db')
+    db = sqlite3.connect(db_path)
+    db.executescript('''
+        CREATE TABLE simple_voice_recordings (
+            id INTEGER PRIMARY KEY, filename TEXT, audio_data BLOB, file_size INTEGER,
+            transcription TEXT, created_at TEXT
+        );
+        CREATE TABLE news_articles (
+            id INTEGER PRIMARY KEY, title TEXT, url TEXT, source TEXT, summary TEXT,
+            topics TEXT, article_hash TEXT
+        );
+        CREATE TABLE voice_article_pairings (
+            id INTEGER PRIMARY KEY, recording_id INTEGER, article_id INTEGER,
+            user_prediction TEXT, time_lock_until TEXT, cringe_factor REAL, paired_at TEXT,
+            content_hash TEXT, exported_at TEXT, export_path TEXT
+        );
+    ''')
+    for i in range(1, pairings + 1):
+        audio = bytes([i]) * (3000 + i)
+        db.execute('INSERT INTO simple_voice_recordings VALUES (?, ?, ?, ?, ?, ?)',
+                   (i, f'memo{i}.webm', audio, len(audio), f'Memo {i}', f'2026-01-{i:02d}T10:00:00'))
+        db.execute('INSERT INTO news_articles (id, title, url, topics) VALUES (?, ?, ?, ?)',
+                   (i, f'Article {i}', f'https://news.test/{i}', 'ai, privacy'))
+        db.execute('INSERT INTO voice_article_pairings (id, recording_id, article_id, user_prediction, cringe_factor, paired_at) '
+                   'VALUES (?, ?, ?, ?, ?, ?)', (i, i, i, f'Prediction {i}', 0.5, f'2026-01-{i:02d}T11:00:00'))
+    db.commit()
+    db.close()
+
+    return ContentAddressedArchive(db_path, tmp_path / 'voice-archive'), db_path
+
+
+def test_parallel_export_skips_unchanged(monkeypatch, tmp_path):
+    archive, db_path = _archive(monkeypatch, tmp_path)
+    (tmp_path / 'voice-archive').mkdir(exist_ok=True)
+
+    paths = archive.export_all(workers=2, transcribe=False)
+    assert len(paths) == 20 and all((p / 'audio.webm').exists() for p in paths)
+    assert archive.db.execute('SELECT COUNT(*) FROM voice_article_pairings WHERE export_path IS NOT NULL').fetchone()[0] == 20
+
+    db = sqlite3.connect(db_path)
+    db.execute("UPDATE voice_article_pairings SET cringe_factor = 0.9 WHERE id = 7")
+    db.commit()
+    db.close()
+
+    rerun = type(archive)(db_path, tmp_path / 'voice-archive')      # fresh manifest load
+    fingerprints = rerun._source_fingerprints()
+    assert [pid for pid, fp in fingerprints.items() if not rerun._is_current(pid, fp)] == [7]
+    assert len(rerun.export_all(workers=1, transcribe=False)) == 20
+
+
+def test_verification_full_and_sampled(monkeypatch, tmp_path):
+    archive, _ = _archive(monkeypatch, tmp_path, pairings=10)
+    (tmp_path / 'voice-archive').mkdir(exist_ok=True)
+    archive.export_all(workers=1, transcribe=False)
+
+    results = archive.verify_archive()
+    assert results['verified'] == 10 and results['checked'] == 10
+
+    assert archive.verify_archive(sample=2)['checked'] == 2         # nothing changed on disk
+
+    entry = archive.manifest.get(4)
+    (tmp_path / 'voice-archive' / entry['dir'] / 'audio.webm').write_bytes(b'tampered')
+    results = archive.verify_archive(sample=0)
+    assert results['checked'] == 1 and results['failed'] == 1
+
+
+def test_index_from_manifest(monkeypatch, tmp_path):
+    archive, _ = _archive(monkeypatch, tmp_path, pairings=3)
+    (tmp_path / 'voice-archive').mkdir(exist_ok=True)
+    archive.export_all(workers=1, transcribe=False)
+
+    index = archive.generate_index()
+    text = index.read_text()
+    assert '**Total predictions:** 3' in text
+    assert text.index('Prediction 3') < text.index('Prediction 1')     # newest first
+
+    mtime = index.stat().st_mtime_ns
+    archive.generate_index()
+    assert index.stat().st_mtime_ns == mtime
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test Concurrent Polite Crawler
+
+Demonstrates:
+- A crawl visits each page once, honours robots.txt and reports pages/sec
+- Re-crawling unchanged pages is answered by 304s from the response cache
+- Per-host concurrency and politeness delay hold under a wide worker pool
+- The API health scanner runs as a prefetch job on the engine
+
+Runs against a local test HTTP server.
+
+Usage:
+    python3 -m pytest test_crawler.py
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import database
+from api_health_scanner import APIHealthScanner
+from crawler import Crawler
+
+PAGES = {
+    '/': '<a href="/a">A</a> <a href="/b#top">B</a> <a href="/private/x">secret</a>',
+    '/a': '<a href="/b">B</a> <a href="/">home</a> <a href="https://example.com/">out</a>',
+    '/b': '<a href="/a">A</a> <a href="/slow/1">1</a> <a href="/slow/2">2</a>',
+    '/slow/1': 'one',
+    '/slow/2': 'two',
+}
+
+
+class LocalSite(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    hits = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with LocalSite.lock:
+            LocalSite.hits.append((self.path, time.monotonic()))
+            LocalSite.in_flight += 1
+            LocalSite.max_in_flight = max(LocalSite.max_in_flight, LocalSite.in_flight)
+        try:
+            if self.path.startswith('/slow'):
+                time.sleep(0.05)
+            if self.path == '/robots.txt':
+                status, body, kind = 200, 'User-agent: *\nDisallow: /private/\n', 'text/plain'
+            elif self.path == '/status/routes':
+                status, body, kind = 200, '{"routes": {"API Endpoints": ["/api/ok", "/api/nulls", "/api/<id>"]}}', 'application/json'
+            elif self.path.startswith('/api/'):
+                body = '{"name": "x", "bio": null}' if self.path == '/api/nulls' else '{"name": "x"}'
+                status, kind = 200, 'application/json'
+            elif self.path in PAGES:
+                status, body, kind = 200, f'<html><body>{PAGES[self.path]}</body></html>', 'text/html'
+            else:
+                status, body, kind = 404, 'missing', 'text/plain'
+
+            etag = f'"{hash(body) & 0xffff}"'
+            if self.headers.get('If-None-Match') == etag:
+                status, body = 304, ''
+            payload = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', kind)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with LocalSite.lock:
+                LocalSite.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    LocalSite.hits, LocalSite.in_flight, LocalSite.max_in_flight = [], 0, 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LocalSite)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def test_crawl_dedups_honours_robots_and_revalidates(site):
+    seen = []
+    stats = Crawler().crawl([site + '/'], on_page=lambda result: seen.append(result.url))
+
+    assert sorted(url[len(site):] for url in seen) == ['/', '/a', '/b', '/slow/1', '/slow/2']
+    assert stats['pages'] == 5 and stats['robots_blocked'] == 1 and stats['pages_per_sec'] > 0
+    assert [path for path, _ in LocalSite.hits].count('/a') == 1
+    assert '/private/x' not in [path for path, _ in LocalSite.hits]
+
+    again = Crawler()
+    stats = again.crawl([site + '/'])
+    assert stats['pages'] == 5 and stats['not_modified'] == 5
+    assert again.fetch(site + '/a').text.count('href') == 3          # body served from the cache
+    assert 'pages/sec' in again.report()
+
+
+def test_per_host_limit_and_politeness(site):
+    crawler = Crawler(concurrency=16, per_host=2, cache=False)
+    results = crawler.prefetch([f'{site}/slow/{i}' for i in range(12)] + [f'{site}/slow/0'] * 5)
+    assert len(results) == 17 and results[0] is results[-1]          # duplicate fetched once
+    assert len(LocalSite.hits) == 12 and LocalSite.max_in_flight == 2
+
+    LocalSite.hits = []
+    polite = Crawler(per_host=4, delay=0.05, cache=False)
+    polite.prefetch([f'{site}/a?{i}' for i in range(5)])
+    starts = sorted(at for _, at in LocalSite.hits)
+    assert all(later - earlier >= 0.04 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_api_health_scanner_runs_on_engine(site, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    scanner = APIHealthScanner(localhost=site, lan_ip=site)
+    scanner.scan_all(ip_only=True)
+
+    by_route = {r['route']: r for r in scanner.results}
+    assert by_route['/api/ok']['status'] == 'OK'
+    assert by_route['/api/nulls']['status'] == 'WARNING' and by_route['/api/nulls']['nulls_found']
+    assert by_route['/api/<id>']['status'] == 'SKIPPED'
+    assert scanner.crawler.stats['pages'] == 2 and (tmp_path / 'API_HEALTH_REPORT.json').exists()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Database Encryption
+
+Demonstrates:
+- Values carry the id of the key that wrote them; legacy iv:ciphertext
+  values still decrypt, AEAD contexts are reused per key and
+  passphrase-derived keys are cached
+- Key rotation runs in resumable chunks, never overwrites a value the app
+  changed mid-chunk, and reports rows/sec
+- encrypt_existing_data() fills encrypted columns chunk by chunk and is a
+  no-op when re-run
+
+Usage:
+    python3 -m pytest test_database_encryption.py
+"""
+
+import base64
+import os
+import time
+
+import pytest
+
+pytest.importorskip('cryptography')
+
+import database
+import voice_encryption
+from database_encryption import DatabaseEncryption, benchmark
+from encryption_jobs import EncryptionJob
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    conn = database.get_db()
+    conn.execute('CREATE TABLE messages (id INTEGER PRIMARY KEY, content TEXT, content_encrypted TEXT)')
+    conn.execute('CREATE TABLE professionals (id INTEGER PRIMARY KEY, phone TEXT, email TEXT, '
+                 'phone_encrypted TEXT, email_encrypted TEXT)')
+    yield conn
+    conn.close()
+
+
+def _legacy(key, plaintext):
+    """iv:ciphertext, the format written before key ids"""
+    iv = os.urandom(12)
+    data = voice_encryption.get_aead(key).encrypt(iv, plaintext.encode(), None)
+    return f"{base64.b64encode(iv).decode()}:{base64.b64encode(data).decode()}"
+
+
+def test_key_ids_legacy_values_and_caches():
+    old, new = os.urandom(32), os.urandom(32)
+    enc = DatabaseEncryption(master_key=new, old_keys=[old])
+
+    value = enc.encrypt_field('joe@example.com')
+    assert value.startswith(enc.key_id + ':') and enc.decrypt_field(value) == 'joe@example.com'
+    assert enc.decrypt_field(_legacy(old, 'legacy@example.com')) == 'legacy@example.com'
+    assert enc.needs_rotation(_legacy(old, 'x')) and not enc.needs_rotation(value)
+    assert DatabaseEncryption(master_key=os.urandom(32)).decrypt_field(value) == '[ENCRYPTED]'
+
+    rows = enc.decrypt_rows([{'id': 1, 'email_encrypted': value}, {'id': 2, 'email_encrypted': ''}],
+                            {'email_encrypted': 'email'})
+    assert [r['email'] for r in rows] == ['joe@example.com', '']
+
+    assert voice_encryption.get_aead(new) is voice_encryption.get_aead(new)
+
+    salt = os.urandom(16)
+    started = time.perf_counter()
+    key, _ = voice_encryption.derive_key_from_passphrase('correct horse', salt)
+    first = time.perf_counter() - started
+    started = time.perf_counter()
+    again, _ = voice_encryption.derive_key_from_passphrase('correct horse', salt)
+    assert again == key and time.perf_counter() - started < first / 10
+    assert voice_encryption.derive_key_from_passphrase('wrong horse', salt)[0] != key
+
+    result = benchmark(rows=500)
+    print(f"✅ Decrypt per row: fresh cipher {result['fresh_cipher_us']} µs, cached {result['cached_us']} µs")
+
+
+def test_rotation_is_chunked_resumable_and_respects_concurrent_writes(db):
+    old, new = os.urandom(32), os.urandom(32)
+    writer = DatabaseEncryption(master_key=old)
+    db.executemany('INSERT INTO messages (id, content_encrypted) VALUES (?, ?)',
+                   [(i, _legacy(old, f'msg {i}') if i % 2 else writer.encrypt_field(f'msg {i}'))
+                    for i in range(1, 2001)])
+    db.commit()
+
+    enc = DatabaseEncryption(master_key=new, old_keys=[old])
+    job = EncryptionJob(enc, 'messages', 'content_encrypted', chunk_size=250)
+
+    # The app rewrites row 3 while the first chunk is being re-encrypted
+    compute = job._chunk_updates
+
+    def racing_chunk(rows):
+        updates = compute(rows)
+        if rows[0][0] == 1:
+            db.execute('UPDATE messages SET content_encrypted = ? WHERE id = 3', (writer.encrypt_field('edited'),))
+            db.commit()
+        return updates
+
+    job._chunk_updates = racing_chunk
+    stats = job.run(max_chunks=2)
+    assert stats['status'] == 'running' and stats['last_pk'] == 500 and stats['conflicts'] == 1
+
+    stats = EncryptionJob(enc, 'messages', 'content_encrypted', chunk_size=250).run()
+    assert stats['status'] == 'done' and stats['processed'] == 2000 and stats['changed'] == 1999
+    print(f"✅ Rotation: {stats['rows_per_sec']:,.0f} rows/sec")
+
+    values = {row['id']: row['content_encrypted'] for row in db.execute('SELECT * FROM messages')}
+    assert enc.decrypt_field(values[3]) == 'edited' and enc.needs_rotation(values[3])
+    assert sum(enc.needs_rotation(v) for v in values.values()) == 1
+    assert enc.decrypt_many([values[10], values[11]]) == ['msg 10', 'msg 11']
+
+    # Running again picks up what the race left behind
+    assert EncryptionJob(enc, 'messages', 'content_encrypted').run()['changed'] == 1
+
+
+def test_encrypt_existing_data_in_chunks(db):
+    db.executemany('INSERT INTO professionals (id, phone, email) VALUES (?, ?, ?)',
+                   [(i, f'555-{i:04}', f'pro{i}@example.com' if i % 3 else '') for i in range(1, 301)])
+    db.execute("INSERT INTO messages (id, content) VALUES (1, 'hello')")
+    db.commit()
+
+    enc = DatabaseEncryption(master_key=os.urandom(32))
+    enc.encrypt_existing_data(chunk_size=64)
+
+    rows = db.execute('SELECT * FROM professionals ORDER BY id').fetchall()
+    assert all(enc.decrypt_field(r['phone_encrypted']) == r['phone'] for r in rows)
+    assert sum(1 for r in rows if r['email_encrypted']) == 200
+    assert enc.decrypt_field(db.execute('SELECT content_encrypted FROM messages').fetchone()[0]) == 'hello'
+
+    before = [tuple(r) for r in db.execute('SELECT * FROM professionals ORDER BY id')]
+    enc.encrypt_existing_data()
+    assert [tuple(r) for r in db.execute('SELECT * FROM professionals ORDER BY id')] == before
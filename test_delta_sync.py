@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test Delta Sync
+
+Demonstrates:
+- Triggers capture a day of offline laptop work into a compact changelog;
+  a row edited many times is sent once, and the whole day syncs to the
+  server in one round trip with a compressed payload sized by the net
+  changes - replaying the same request applies nothing twice
+- Rows changed on both sides - including rows created offline under the
+  same id - are reported as conflicts and held with both versions until
+  resolved; small batches sync over several round trips, and a sync that
+  fails midway resumes without duplicates
+- /api/session/delta syncs a signed-in device, limited to the user's rows:
+  other users' rows can't be overwritten and their deletes aren't sent
+
+Runs against two local SQLite files.
+
+Usage:
+    python3 -m pytest test_delta_sync.py
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+import database
+from delta_sync import DeltaSync, LocalPeer, decode_payload
+
+
+def _make_db(path, posts=10):
+    db = sqlite3.connect(path)
+    db.execute('''CREATE TABLE posts (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, title TEXT NOT NULL,
+                  slug TEXT UNIQUE NOT NULL, content TEXT NOT NULL)''')
+    db.execute('''CREATE TABLE ideas (id INTEGER PRIMARY KEY AUTOINCREMENT, recording_id INTEGER NOT NULL,
+                  user_id INTEGER, idea_text TEXT NOT NULL, keywords TEXT)''')
+    db.executemany('INSERT INTO posts (user_id, title, slug, content) VALUES (?, ?, ?, ?)',
+                   [(1 + i % 2, f'Post {i}', f'post-{i}', f'Body {i}') for i in range(1, posts + 1)])
+    db.commit()
+    db.close()
+    DeltaSync(str(path)).connect().close()      # install change capture on the shared starting copy
+    return str(path)
+
+
+def _rows(path, table='posts'):
+    db = sqlite3.connect(path)
+    rows = db.execute(f'SELECT * FROM {table} ORDER BY id').fetchall()
+    db.close()
+    return rows
+
+
+@pytest.fixture
+def laptop_and_server(tmp_path):
+    return _make_db(tmp_path / 'laptop.db'), _make_db(tmp_path / 'server.db')
+
+
+def test_offline_day_syncs_in_one_round_trip(laptop_and_server):
+    laptop_path, server_path = laptop_and_server
+    laptop, server = DeltaSync(laptop_path), LocalPeer(server_path)
+
+    db = sqlite3.connect(laptop_path)
+    db.executemany('INSERT INTO posts (user_id, title, slug, content) VALUES (1, ?, ?, ?)',
+                   [(f'Draft {i}', f'draft-{i}', 'Offline work ' * 20) for i in range(300)])
+    for revision in range(50):
+        db.execute('UPDATE posts SET content = ? WHERE id = 1', (f'Revision {revision}',))
+    db.execute('DELETE FROM posts WHERE id = 2')
+    db.execute("INSERT INTO ideas (recording_id, user_id, idea_text) VALUES (1, 1, 'Sync ideas too')")
+    db.execute("UPDATE ideas SET keywords = 'sync' WHERE id = 1")
+    db.commit()
+    assert db.execute('SELECT COUNT(*) FROM sync_changelog').fetchone()[0] == 303
+    db.close()
+
+    db = sqlite3.connect(server_path)
+    db.execute("INSERT INTO posts (id, user_id, title, slug, content) VALUES (1000, 2, 'Server post', 'server-post', 'x')")
+    db.commit()
+    db.close()
+
+    assert laptop.pending(server.name) == {'posts': 302, 'ideas': 1}
+    request = laptop.build_request(server.name)
+    result = laptop.sync(server)
+    assert result['round_trips'] == 1 and result['sent'] == 303 and result['received'] == 1
+    assert result['conflicts'] == [] and laptop.pending(server.name) == {}
+
+    assert _rows(laptop_path) == _rows(server_path) and _rows(laptop_path, 'ideas') == _rows(server_path, 'ideas')
+    assert _rows(server_path)[0][4] == 'Revision 49'
+
+    raw = len(json.dumps(decode_payload(request)))
+    print(f"✅ 303 net changes: {result['bytes_sent']:,} bytes sent ({raw:,} uncompressed)")
+    assert result['bytes_sent'] < raw / 5
+
+    # Replaying the same request (lost response) applies nothing twice
+    replay = decode_payload(server.exchange(request))
+    assert replay['applied'] == 0 and replay['skipped'] == 303
+
+    # Nothing echoes back
+    again = laptop.sync(server)
+    assert (again['sent'], again['received'], again['round_trips']) == (0, 0, 1)
+
+
+class FlakyPeer:
+    """Loses the server's response on one exchange"""
+
+    def __init__(self, peer, fail_on):
+        self.peer, self.name, self.fail_on, self.calls = peer, peer.name, fail_on, 0
+
+    def exchange(self, payload):
+        self.calls += 1
+        response = self.peer.exchange(payload)
+        if self.calls == self.fail_on:
+            raise ConnectionResetError('connection dropped')
+        return response
+
+
+def test_conflicts_converge_and_batches_resume(laptop_and_server):
+    laptop_path, server_path = laptop_and_server
+
+    for path, title in ((laptop_path, 'Laptop title'), (server_path, 'Server title')):
+        db = sqlite3.connect(path)
+        db.execute('UPDATE posts SET title = ? WHERE id = 3', (title,))
+        db.execute('INSERT INTO posts (user_id, title, slug, content) VALUES (1, ?, ?, ?)',
+                   (title, title.lower().replace(' ', '-'), 'new'))
+        db.commit()
+        db.close()
+
+    laptop, server = DeltaSync(laptop_path), LocalPeer(server_path)
+    result = laptop.sync(server)
+    assert result['conflicts'] == [{'table': 'posts', 'id': 3, 'op': 'upsert', 'reason': 'changed on both sides'},
+                                   {'table': 'posts', 'id': 11, 'op': 'upsert', 'reason': 'changed on both sides'}]
+    assert _rows(laptop_path)[2][2] == 'Laptop title' and _rows(server_path)[2][2] == 'Server title'
+    assert _rows(laptop_path)[10][2] == 'Laptop title' and _rows(server_path)[10][2] == 'Server title'
+
+    # Held, not acknowledged away: nothing more is sent or overwritten until resolved
+    held = laptop.conflicts(server.name)
+    assert [(c['id'], c['peer_row']['title']) for c in held] == [(3, 'Server title'), (11, 'Server title')]
+    assert laptop.sync(server)['conflicts'] == [] and _rows(laptop_path)[2][2] == 'Laptop title'
+
+    laptop.resolve_conflict(server.name, 'posts', 3, keep='local')
+    laptop.resolve_conflict(server.name, 'posts', 11, keep='peer')
+    assert laptop.sync(server)['sent'] == 1 and laptop.conflicts(server.name) == []
+    assert _rows(laptop_path)[2][2] == _rows(server_path)[2][2] == 'Laptop title'
+    assert _rows(laptop_path) == _rows(server_path)
+
+    db = sqlite3.connect(laptop_path)
+    db.executemany('INSERT INTO posts (user_id, title, slug, content) VALUES (1, ?, ?, ?)',
+                   [(f'Batch {i}', f'batch-{i}', 'x') for i in range(180)])
+    db.commit()
+    db.close()
+
+    laptop = DeltaSync(laptop_path, limit=50)
+    flaky = FlakyPeer(LocalPeer(server_path), fail_on=2)
+    with pytest.raises(ConnectionResetError):
+        laptop.sync(flaky)
+    assert laptop.pending(flaky.name) == {'posts': 130}        # first batch acknowledged
+
+    result = laptop.sync(flaky)
+    assert result['round_trips'] == 3 and result['sent'] == 80 and result['skipped'] == 50
+    assert laptop.pending(flaky.name) == {} and _rows(laptop_path) == _rows(server_path)
+    assert len(_rows(server_path)) == 191
+
+
+def test_session_delta_route_is_owner_scoped(laptop_and_server, monkeypatch):
+    pytest.importorskip('qrcode')
+    from flask import Flask
+    from session_sync import session_sync_bp
+
+    laptop_path, server_path = laptop_and_server
+    monkeypatch.setattr(database, 'DB_PATH', server_path)
+
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(session_sync_bp)
+    client = app.test_client()
+
+    class SessionPeer:
+        name = 'https://soulfra.com/api/session/delta'
+
+        def exchange(self, payload):
+            response = client.post('/api/session/delta', data=payload)
+            assert response.status_code == 200
+            return response.data
+
+    assert client.post('/api/session/delta', data=b'x').status_code == 401
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    assert client.post('/api/session/delta', data=b'not a payload').status_code == 400
+
+    # Odd post ids belong to user 2
+    db = sqlite3.connect(laptop_path)
+    db.execute("INSERT INTO posts (id, user_id, title, slug, content) VALUES (500, 1, 'Mine', 'mine', 'x')")
+    db.execute("UPDATE posts SET title = 'Not mine' WHERE id = 3")
+    db.execute("UPDATE posts SET user_id = 1, content = 'pwned' WHERE id = 1")
+    db.commit()
+    db.close()
+    db = sqlite3.connect(server_path)
+    db.execute("UPDATE posts SET content = 'Server edit' WHERE id IN (1, 2, 4)")
+    db.execute('DELETE FROM posts WHERE id IN (5, 6)')
+    db.commit()
+    db.close()
+
+    result = DeltaSync(laptop_path).sync(SessionPeer())
+    assert result['sent'] == 1 and result['received'] == 3
+    assert sorted(c['id'] for c in result['conflicts']) == [1, 3]
+    assert {c['reason'] for c in result['conflicts']} == {'not owner'}
+
+    server = {row[0]: row for row in _rows(server_path)}
+    laptop = {row[0]: row for row in _rows(laptop_path)}
+    assert server[500][2] == 'Mine' and server[3][2] == 'Post 3'
+    assert server[1][1] == 2 and server[1][4] == 'Server edit'
+    assert laptop[2][4] == laptop[4][4] == 'Server edit' and 5 in laptop and 6 not in laptop
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test Domain Match Index
+
+Demonstrates:
+- Indexed scores equal the old loop-over-every-domain scores
+- Replacing one wordmap only changes that domain's results
+- The table-backed index re-parses only changed domain_wordmaps rows
+- reclassify_ideas() routes the voice_ideas backlog in batches
+
+Usage:
+    python3 -m pytest test_domain_match_index.py
+"""
+
+import json
+
+import database
+from domain_match_index import DomainIndex, WordmapIndex, _load_domain_wordmaps
+
+
+DOMAINS = {
+    'cringeproof.com': {'authentic': 10, 'social': 8, 'cringe': 12, 'community': 5},
+    'deathtodata.com': {'privacy': 12, 'data': 9, 'surveillance': 7, 'encryption': 4},
+    'soulfra.com': {'community': 3, 'growth': 6, 'meaning': 5},
+}
+
+
+def _index():
+    index = WordmapIndex()
+    for domain, wordmap in DOMAINS.items():
+        index.set(domain, wordmap)
+    return index
+
+
+def test_scores_match_naive_loop():
+    index = _index()
+    keywords = ['social', 'cringe', 'community', 'community', 'privacy', 'pizza']
+
+    coverage = {domain: score for domain, score, _ in index.match(keywords, metric='coverage')}
+    jaccard = {domain: score for domain, score, _ in index.match(keywords, metric='jaccard')}
+
+    for domain, wordmap in DOMAINS.items():
+        words = set(wordmap)
+        assert coverage[domain] == sum(1 for kw in keywords if kw in words) / len(keywords)
+        query = set(keywords)
+        assert jaccard[domain] == len(query & words) / len(query | words)
+
+    assert index.best(keywords, metric='coverage')[0] == 'cringeproof.com'
+    assert index.score('soulfra.com', ['growth', 'nothing'], metric='recall') == 1 / 3
+
+
+def test_incremental_update_and_zero_tail():
+    index = _index()
+    assert index.best(['privacy'])[0] == 'deathtodata.com'
+
+    index.set('soulfra.com', {'privacy': 1})
+    assert index.best(['privacy'])[0] == 'soulfra.com'     # smaller vocab wins Jaccard
+
+    index.remove('soulfra.com')
+    results = index.match(['privacy'], min_score=0.0)
+    assert [domain for domain, _, _ in results] == ['deathtodata.com', 'cringeproof.com']
+    assert results[-1][1] == 0.0
+
+
+def _seed_wordmaps(db_path):
+    db = database.get_db()
+    db.execute('''
+        CREATE TABLE domain_wordmaps (
+            domain TEXT PRIMARY KEY,
+            wordmap_json TEXT NOT NULL,
+            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    for domain, wordmap in DOMAINS.items():
+        db.execute('INSERT INTO domain_wordmaps (domain, wordmap_json, last_updated) VALUES (?, ?, ?)',
+                   (domain, json.dumps(wordmap), '2026-01-01'))
+    db.commit()
+    db.close()
+
+
+def test_domain_index_reloads_only_changed_rows(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    _seed_wordmaps(tmp_path)
+
+    loaded = []
+
+    def load(db, rows):
+        loaded.extend(row[0] for row in rows)
+        return _load_domain_wordmaps(db, rows)
+
+    index = DomainIndex('SELECT domain, last_updated, length(wordmap_json) FROM domain_wordmaps', load)
+    assert index.refresh(force=True) == 3
+    assert index.refresh(force=True) == 0
+
+    db = database.get_db()
+    db.execute("UPDATE domain_wordmaps SET wordmap_json = ?, last_updated = '2026-02-01' WHERE domain = 'soulfra.com'",
+               (json.dumps({'privacy': 1}),))
+    db.execute("DELETE FROM domain_wordmaps WHERE domain = 'cringeproof.com'")
+    db.commit()
+    db.close()
+
+    assert index.refresh(force=True) == 2
+    assert loaded == ['cringeproof.com', 'deathtodata.com', 'soulfra.com', 'soulfra.com']
+    assert 'cringeproof.com' not in index
+    assert index.best(['privacy'])[0] == 'soulfra.com'
+
+
+def test_reclassify_ideas(monkeypatch, tmp_path):
+    import classify_idea
+    import domain_match_index
+
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    _seed_wordmaps(tmp_path)
+    domain_match_index.invalidate_domain()
+
+    db = database.get_db()
+    db.execute('CREATE TABLE brands (id INTEGER PRIMARY KEY, domain TEXT)')
+    db.execute('CREATE TABLE voice_ideas (id INTEGER PRIMARY KEY, text TEXT, domain_id INTEGER, auto_assigned INTEGER)')
+    db.executemany('INSERT INTO brands (id, domain) VALUES (?, ?)',
+                   [(1, 'cringeproof.com'), (2, 'deathtodata.com'), (3, 'soulfra.com')])
+    db.executemany('INSERT INTO voice_ideas (text) VALUES (?)', [
+        ('Stop the cringe, be authentic on social media',),
+        ('Privacy matters, end data surveillance',),
+        ('Pizza recipes',),
+    ])
+    db.commit()
+    db.close()
+
+    stats = classify_idea.reclassify_ideas(batch_size=2)
+    assert stats == {'scanned': 3, 'assigned': 2, 'unmatched': 1}
+
+    db = database.get_db()
+    assigned = [row['domain_id'] for row in db.execute('SELECT domain_id FROM voice_ideas ORDER BY id')]
+    db.close()
+    assert assigned == [1, 2, None]
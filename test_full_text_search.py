@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test Full-Text Search
+
+Demonstrates:
+- Triggers keep the FTS5 index in sync with inserts, updates and deletes
+- Results are BM25-ranked (title hits first) with highlighted snippets
+- Prefix queries, per-brand filtering and FTS syntax in user input
+- Feed items are upserted and searchable
+- Searching before the index exists falls back to LIKE
+
+Usage:
+    python3 -m pytest test_full_text_search.py
+"""
+
+import database
+import schema_registry
+from full_text_search import build_match_query, index_feed_items, search
+
+
+def _posts_db(monkeypatch, tmp_path, migrate=True):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    db = database.get_db()
+    db.execute('''
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, content TEXT,
+            brand_id INTEGER, published_at TIMESTAMP
+        )
+    ''')
+    db.executemany('INSERT INTO posts (title, content, brand_id, published_at) VALUES (?, ?, ?, ?)', [
+        ('Gardening tips', 'Mention encryption once in passing', 1, '2026-01-01'),
+        ('Encryption for everyone', 'Why encrypted messaging matters', 2, '2026-01-02'),
+    ])
+    db.commit()
+    db.close()
+    if migrate:
+        schema_registry.run_migrations()
+
+
+def test_ranked_prefix_search_with_snippets(monkeypatch, tmp_path):
+    _posts_db(monkeypatch, tmp_path)
+
+    results = search('posts', 'encrypting')     # porter stemming
+    assert [row['title'] for row in results] == ['Encryption for everyone', 'Gardening tips']
+    assert '<mark>' in results[0]['snippet']
+
+    assert [row['id'] for row in search('posts', 'encryption', brand=1)] == [1]
+    assert search('posts', 'encr', prefix=False) == []
+    assert len(search('posts', 'encr')) == 2
+
+
+def test_triggers_keep_index_in_sync(monkeypatch, tmp_path):
+    _posts_db(monkeypatch, tmp_path)
+
+    db = database.get_db()
+    db.execute("INSERT INTO posts (title, content) VALUES ('Privacy', 'Surveillance capitalism')")
+    db.execute("UPDATE posts SET content = 'Composting' WHERE id = 1")
+    db.execute("DELETE FROM posts WHERE id = 2")
+    db.commit()
+    db.close()
+
+    assert [row['id'] for row in search('posts', 'surveillance')] == [3]
+    assert search('posts', 'encryption') == []
+    assert [row['id'] for row in search('posts', 'composting')] == [1]
+
+
+def test_user_input_cannot_inject_fts_syntax():
+    assert build_match_query('privacy" OR NEAR(data') == '"privacy"* "OR"* "NEAR"* "data"*'
+    assert build_match_query('a b', prefix=False, any_term=True) == '"a" OR "b"'
+    assert build_match_query('  ') == ''
+
+
+def test_feed_items_upsert(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    schema_registry.run_migrations()
+
+    item = {'guid': 'g1', 'title': 'Voice memos', 'description': 'Recorded ideas', 'source': 'soulfra'}
+    assert index_feed_items([item]) == 1
+    assert index_feed_items([item]) == 0      # unchanged - index untouched
+
+    assert [row['guid'] for row in search('feed_items', 'memo', brand='soulfra')] == ['g1']
+    assert search('feed_items', 'memo', brand='cringeproof') == []
+
+
+def test_like_fallback_before_index_exists(monkeypatch, tmp_path):
+    _posts_db(monkeypatch, tmp_path, migrate=False)
+
+    results = search('posts', 'Encryption')
+    assert [row['id'] for row in results] == [2, 1]     # newest first, unranked
+    assert results[0]['rank'] is None
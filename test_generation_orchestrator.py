@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test Generation Orchestrator
+
+Demonstrates:
+- Each item's shared prefix is evaluated once and every persona job
+  continues from its context, concurrently, with results handed back in
+  the calling thread as they finish (full prompts if no context comes back)
+- The comment backlog works through every uncommented post with bounded
+  concurrency, saving comments as they stream in and reporting wall time
+  and tokens/sec per post
+- Panel debates, bot comments and workforce tasks run on the same engine
+
+Runs against a local mock Ollama server.
+
+Usage:
+    python3 -m pytest test_generation_orchestrator.py
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import database
+from generation_orchestrator import GenerationItem, GenerationJob, GenerationOrchestrator
+
+
+class LocalOllama(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    requests = []
+    give_context = True
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with LocalOllama.lock:
+            LocalOllama.requests.append(payload)
+            LocalOllama.in_flight += 1
+            LocalOllama.max_in_flight = max(LocalOllama.max_in_flight, LocalOllama.in_flight)
+        try:
+            prompt = payload['prompt']
+            if payload.get('options', {}).get('num_predict') == 0:
+                status, body = 200, {'response': '', 'prompt_eval_count': len(prompt.split()),
+                                     'eval_count': 0, 'eval_duration': 0}
+                if LocalOllama.give_context:
+                    body['context'] = [len(prompt)]
+            elif 'FAIL' in prompt:
+                status, body = 500, {'error': 'boom'}
+            else:
+                time.sleep(0.05)
+                who = (payload.get('system') or 'anon').split('.')[0]
+                status, body = 200, {'response': f'{who} thinks this is a thoughtful, specific and '
+                                                 f'genuinely useful point worth discussing further.',
+                                     'prompt_eval_count': len(prompt.split()),
+                                     'eval_count': 20, 'eval_duration': 100_000_000}
+
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with LocalOllama.lock:
+                LocalOllama.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    LocalOllama.requests, LocalOllama.give_context = [], True
+    LocalOllama.in_flight, LocalOllama.max_in_flight = 0, 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LocalOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def _primes():
+    return [r for r in LocalOllama.requests if r.get('options', {}).get('num_predict') == 0]
+
+
+def test_prefix_evaluated_once_and_jobs_run_concurrently(ollama):
+    engine = GenerationOrchestrator(ollama + '/api/generate', model='test', concurrency=3)
+    items = [GenerationItem(key=post, prefix=f'Post {post}: a long shared post body',
+                            jobs=[GenerationJob(key=p, system=f'Persona {p}. Be kind.', prompt='Comment:')
+                                  for p in 'abc'])
+             for post in (1, 2)]
+
+    callers = []
+    results = engine.run(items, on_result=lambda r: callers.append(threading.current_thread()))
+
+    assert len(results) == 6 and all(r.ok for r in results)
+    assert len(_primes()) == 2 and engine.stats['primed'] == 2
+    jobs = [r for r in LocalOllama.requests if r not in _primes()]
+    assert all(r['context'] and r['prompt'] == 'Comment:' and r['keep_alive'] for r in jobs)
+    assert LocalOllama.max_in_flight == 3
+    assert set(callers) == {threading.main_thread()}
+    assert engine.items[1]['jobs'] == 3 and engine.items[1]['tokens_per_sec'] == 200.0
+    assert 'tokens/sec' in engine.report()
+
+    # No context from the server: jobs send the full prompt instead
+    LocalOllama.requests, LocalOllama.give_context = [], False
+    result = engine.run([GenerationItem(key=3, prefix='Post 3', jobs=[GenerationJob(key='a', prompt='Comment:')])])[0]
+    assert result.ok and LocalOllama.requests[-1]['prompt'] == 'Post 3\n\nComment:'
+    assert 'context' not in LocalOllama.requests[-1]
+
+
+def test_comment_backlog_streams_comments_per_post(ollama, monkeypatch):
+    import brand_ai_orchestrator
+    import ollama_auto_commenter
+
+    database.init_db()
+    db = database.get_db()
+    for name in ('human', 'ocean-dreams', 'techflow'):
+        db.execute('INSERT INTO users (username, email, password_hash, is_ai_persona) VALUES (?, ?, ?, ?)',
+                   (name, f'{name}@soulfra.com', 'x', name != 'human'))
+    for i in range(1, 5):
+        db.execute('INSERT INTO posts (user_id, title, slug, content, published_at) VALUES (1, ?, ?, ?, ?)',
+                   (f'Post {i}', f'post-{i}', f'Body of post {i} ' * 10, '2026-01-01'))
+    db.execute("INSERT INTO comments (post_id, user_id, content) VALUES (4, 2, 'already there')")
+    db.commit()
+    db.close()
+
+    brands = [{'brand_slug': slug, 'brand_name': slug.title(), 'relevance': 0.9}
+              for slug in ('ocean-dreams', 'techflow')]
+    personas = {slug: {'user_id': user_id, 'display_name': slug.title(), 'emoji': '🤖',
+                       'brand_name': slug.title(), 'system_prompt': f'{slug}. Stay in character.'}
+                for user_id, slug in ((2, 'ocean-dreams'), (3, 'techflow'))}
+    monkeypatch.setattr(brand_ai_orchestrator, 'orchestrate_brand_comments', lambda post_id, dry_run=False: brands)
+    monkeypatch.setattr(ollama_auto_commenter, 'get_brand_ai_persona_config', personas.get)
+    monkeypatch.setattr(ollama_auto_commenter, 'OLLAMA_API_URL', ollama + '/api/generate')
+
+    result = ollama_auto_commenter.comment_backlog(concurrency=2)
+    assert result['posts'] == 3 and result['comments'] == 6        # post 4 already has an AI comment
+    assert len(_primes()) == 3 and LocalOllama.max_in_flight == 2
+    assert all(stats['seconds'] > 0 and stats['tokens_per_sec'] > 0 for stats in result['per_post'].values())
+
+    db = database.get_db()
+    saved = db.execute('SELECT post_id, user_id, content FROM comments WHERE post_id < 4').fetchall()
+    assert len(saved) == 6 and all(row['content'].startswith(('ocean-dreams', 'techflow')) for row in saved)
+    db.close()
+    assert ollama_auto_commenter.comment_backlog()['posts'] == 0
+
+    # Single post: the persona that already commented is skipped
+    assert len(ollama_auto_commenter.generate_comments_for_post(4)) == 1
+
+
+def test_debate_bot_and_workforce_share_the_engine(ollama, monkeypatch):
+    from ai_debate_generator import AIDebateGenerator
+    from auto_content_generator import AIContentGenerator
+    from bot_comment_generator import BotCommentGenerator
+
+    panel = AIDebateGenerator(ollama).generate_panel_debate('Privacy is dead', model='test')
+    assert [r['persona'] for r in panel['responses']] == ['calriven', 'soulfra', 'deathtodata']
+    assert len(_primes()) == 1 and 'Privacy is dead' in _primes()[0]['prompt']
+
+    LocalOllama.requests = []
+    saved = BotCommentGenerator(ollama + '/api/generate').generate_and_save_batch(
+        [{'content': 'my startup', 'target_type': 'voice_memo', 'target_id': 1},
+         {'content': 'my garden', 'target_type': 'voice_memo', 'target_id': 2}], comments_per_target=2)
+    assert len(saved) == 4 and len(_primes()) == 2
+    assert sorted(s['target_id'] for s in saved) == [1, 1, 2, 2]
+
+    db_path = database.DB_PATH
+    db = sqlite3.connect(db_path)
+    db.execute('''CREATE TABLE ai_workforce_tasks (id INTEGER PRIMARY KEY, domain TEXT, task_type TEXT,
+                  assigned_to_persona TEXT, prompt TEXT, keywords_target TEXT, status TEXT,
+                  output_content TEXT, output_title TEXT, output_slug TEXT, completed_at TIMESTAMP,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    for topic in ('coffee tips', 'FAIL this one', 'tide pools'):
+        db.execute("INSERT INTO ai_workforce_tasks (domain, task_type, assigned_to_persona, prompt, keywords_target, status) "
+                   "VALUES ('soulfra.com', 'blog_post', 'calriven', ?, '[\"seo\"]', 'pending')", (topic,))
+    db.commit()
+
+    LocalOllama.requests = []
+    generator = AIContentGenerator(db_path)
+    generator.ollama_url = ollama + '/api/chat'
+    generator.execute_all_pending(concurrency=3)
+    generator.close()
+
+    statuses = dict(db.execute('SELECT prompt, status FROM ai_workforce_tasks').fetchall())
+    assert statuses == {'coffee tips': 'completed', 'FAIL this one': 'pending', 'tide pools': 'completed'}
+    assert len(_primes()) == 1
+    db.close()
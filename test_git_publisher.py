@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Batched Git Publishing
+
+Demonstrates:
+- Submissions inside one window land in a single commit and a single push
+- The working tree and real index stay clean (no `git add` / index.lock)
+- Directory submissions stage new files and deletions like `git add dir/`
+- A window with no content changes makes no commit
+- flush=True commits without waiting out a shared queue's window, a
+  conflicting window is refused, and a failed push reaches wait_push()
+
+Usage:
+    python3 -m pytest test_git_publisher.py
+"""
+
+import subprocess
+import threading
+import time
+
+import pytest
+
+import git_publisher
+from git_publisher import DEFAULT_IDENTITY, GitError, PublishQueue, get_queue
+
+
+def _git(cwd, *args):
+    return subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True, text=True,
+                          env={**DEFAULT_IDENTITY, 'PATH': '/usr/bin:/bin:/usr/local/bin'}).stdout.strip()
+
+
+def _repos(tmp_path):
+    bare, clone = tmp_path / 'pages.git', tmp_path / 'pages'
+    _git(tmp_path, 'init', '-q', '--bare', '-b', 'main', str(bare))
+    _git(tmp_path, 'clone', '-q', str(bare), str(clone))
+    _git(clone, 'checkout', '-q', '-b', 'main')
+    (clone / 'posts').mkdir()
+    return bare, clone
+
+
+def test_window_coalesces_into_one_commit(tmp_path):
+    bare, clone = _repos(tmp_path)
+    queue = PublishQueue(clone, window=0.5)
+
+    def publish(i):
+        (clone / 'posts' / f'{i}.md').write_text(f'# Post {i}\n')
+        queue.submit([f'posts/{i}.md', 'index.html'], f'Publish: post {i}')
+
+    (clone / 'index.html').write_text('<h1>index</h1>')
+    threads = [threading.Thread(target=publish, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    queue.close()
+
+    stats = queue.stats()
+    assert stats['commits'] == 1 and stats['commits_avoided'] == 5 and stats['pushes'] == 1
+    assert _git(bare, 'rev-list', '--count', 'main') == '1'
+    assert len(_git(bare, 'ls-tree', '-r', '--name-only', 'main').split()) == 7
+    assert _git(clone, 'status', '--porcelain') == ''
+
+
+def test_directory_deletions_and_empty_windows(tmp_path):
+    bare, clone = _repos(tmp_path)
+    queue = PublishQueue(clone, window=0, push=False)
+    for name in ('a.md', 'b.md'):
+        (clone / 'posts' / name).write_text(name)
+    first = queue.publish(['posts'], 'Publish posts')
+    assert first['commit'] and first['files'] == 2
+
+    assert queue.publish(['posts'], 'Nothing new')['commit'] is None
+
+    (clone / 'posts' / 'a.md').unlink()
+    (clone / 'posts' / 'c.md').write_text('c')
+    queue.publish(['posts'], 'Replace a with c')
+    assert _git(clone, 'ls-tree', '-r', '--name-only', 'main').split() == ['posts/b.md', 'posts/c.md']
+    assert _git(clone, 'status', '--porcelain') == ''
+    queue.close()
+
+
+def test_flush_window_conflicts_and_push_failures(tmp_path, monkeypatch):
+    bare, clone = _repos(tmp_path)
+    queue = get_queue(clone, window=60)
+    with pytest.raises(ValueError):
+        get_queue(clone, window=0)
+
+    (clone / 'index.html').write_text('<h1>now</h1>')
+    started = time.monotonic()
+    published = queue.publish(['index.html'], 'Deploy', flush=True)
+    assert time.monotonic() - started < 30
+    queue.wait_push(published['push'], timeout=30)
+    assert _git(bare, 'ls-tree', '--name-only', 'main') == 'index.html'
+    git_publisher.close_all_queues()
+
+    monkeypatch.setattr(git_publisher, 'PUSH_BACKOFF_SECONDS', 0)
+    broken = PublishQueue(clone, window=0, remote='nowhere')
+    (clone / 'index.html').write_text('<h1>later</h1>')
+    published = broken.publish(['index.html'], 'Deploy again')
+    with pytest.raises(GitError):
+        broken.wait_push(published['push'], timeout=30)
+    broken.close()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test GitHub Star Cache
+
+Demonstrates:
+- Gated star checks are local lookups after the first fetch
+- Expired entries revalidate with If-None-Match and accept a 304
+- A "not starred" answer is short-lived and never served stale, so starring
+  the repo and retrying gets through
+- Stale entries are served immediately and refreshed in the background;
+  the refresher backs off when the rate limit is nearly spent
+- Star tiers make no GitHub requests once warm
+
+Runs against a local mock GitHub server (no network access needed).
+
+Usage:
+    python3 -m pytest test_github_cache.py
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import database
+from github_cache import DENIAL_TTL_SECONDS, GitHubCache, STAR_TTL_SECONDS
+from github_star_validator import GitHubStarValidator
+
+
+class MockGitHub(BaseHTTPRequestHandler):
+    starred = {('alice', 'soulfra')}
+    rate_remaining = 5000
+    log = []
+
+    def do_GET(self):
+        parts = self.path.strip('/').split('/')
+        MockGitHub.log.append((self.path, self.headers.get('If-None-Match')))
+
+        if parts[0] == 'users' and len(parts) == 5:
+            status, body = (204 if (parts[1], parts[4]) in self.starred else 404), b''
+        elif parts[0] == 'repos':
+            status, body = 200, b'{"stargazers_count": 42}'
+        else:
+            status, body = 200, b'{"public_repos": 60, "followers": 7}'
+
+        etag = f'"{status}-{len(self.starred)}"'
+        if self.headers.get('If-None-Match') == etag:
+            status, body = 304, b''
+
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        self.send_header('X-RateLimit-Remaining', str(self.rate_remaining))
+        self.send_header('X-RateLimit-Reset', '9999999999')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def github(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    MockGitHub.starred = {('alice', 'soulfra')}
+    MockGitHub.rate_remaining = 5000
+    MockGitHub.log = []
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockGitHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    now = [1_000_000.0]
+    cache = GitHubCache(api_url=f'http://127.0.0.1:{server.server_port}', background=False,
+                        clock=lambda: now[0])
+    yield cache, now
+    server.shutdown()
+
+
+def test_star_checks_are_local_after_first_fetch(github):
+    cache, now = github
+    validator = GitHubStarValidator(cache=cache)
+
+    first = validator.check_star_for_domain('alice', 'www.soulfra.com:5001')
+    assert first['has_starred'] and first['star_count'] == 42 and first['source'] == 'fetched'
+    assert len(MockGitHub.log) == 2
+
+    for _ in range(20):
+        assert validator.check_star('Alice', 'soulfra', 'soulfra')['source'] == 'hit'
+    assert not validator.check_star('alice', 'soulfra', 'calriven')['has_starred']
+    assert len(MockGitHub.log) == 4                            # calriven: star state + repo count
+
+    # Past the TTL and the stale window: synchronous conditional request, answered 304
+    cache.stale_seconds = 0
+    now[0] += STAR_TTL_SECONDS + 1
+    assert cache.star_lookup('alice', 'soulfra', 'soulfra') == (204, None, 'revalidated')
+    assert MockGitHub.log[-1] == ('/users/alice/starred/soulfra/soulfra', '"204-1"')
+
+
+def test_denials_expire_fast_and_stale_while_revalidate(github):
+    cache, now = github
+    assert cache.has_starred('bob', 'soulfra', 'soulfra') is False
+
+    # Gated, stars the repo, retries: the denial is re-checked, not served stale
+    MockGitHub.starred.add(('bob', 'soulfra'))
+    now[0] += DENIAL_TTL_SECONDS + 1
+    assert cache.star_lookup('bob', 'soulfra', 'soulfra') == (204, None, 'fetched')
+
+    MockGitHub.starred.discard(('bob', 'soulfra'))
+    now[0] += STAR_TTL_SECONDS + 1
+    stale = cache.star_lookup('bob', 'soulfra', 'soulfra')
+    assert stale.source == 'stale' and stale.status == 204      # answered without waiting on GitHub
+    assert cache.cache_stats()['pending'] == 1
+
+    assert cache.refresh_pending() == 1
+    assert cache.star_lookup('bob', 'soulfra', 'soulfra') == (404, None, 'hit')
+
+    # Nearly out of calls: the refresher leaves expired entries alone
+    MockGitHub.rate_remaining = 3
+    cache.has_starred('alice', 'soulfra', 'soulfra')
+    now[0] += STAR_TTL_SECONDS + 1
+    assert cache.star_lookup('alice', 'soulfra', 'soulfra').source == 'stale'
+    requests_before = len(MockGitHub.log)
+    assert cache.refresh_pending() == 0 and len(MockGitHub.log) == requests_before
+
+
+def test_tier_from_stars_is_cached(github):
+    cache, _ = github
+    MockGitHub.starred = {('alice', 'soulfra'), ('alice', 'calriven')}
+    validator = GitHubStarValidator(cache=cache)
+
+    tier = validator.check_user_tier_from_stars('alice')
+    assert tier['stars_given'] == 2 and tier['tier'] == 3      # 60 public repos
+    assert len(MockGitHub.log) == 6                            # 5 star checks + profile
+
+    assert validator.get_stars_needed_for_next_tier('alice')['next_tier'] == 4
+    assert cache.network_stars('alice') == (2, ['soulfra/soulfra', 'soulfra/calriven'])
+    assert len(MockGitHub.log) == 6
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Image Render Caches
+
+Demonstrates:
+- Gradients are composited in C and match the per-pixel blend they replaced
+- Fonts and gradient tiles are loaded once per process and shared by composers
+- Identical layer stacks are rendered once; any change to a layer (or to an
+  image layer's file) produces a new cache key
+- render_batch() renders each distinct stack once, in a process pool,
+  with the same bytes as an in-process render
+
+Usage:
+    python3 -m pytest test_image_render_cache.py
+"""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import image_composer
+from image_composer import ImageComposer, clear_render_caches, render_batch, render_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    clear_render_caches()
+    yield
+    clear_render_caches()
+
+
+def _header(title, size=(320, 200)):
+    composer = ImageComposer(size=size)
+    composer.add_layer('gradient', colors=['#FF6B35', '#2C3E50'], angle=45)
+    composer.add_layer('text', content=title, font='impact', font_size=24, color='#FFFFFF',
+                       position=(10, 80), shadow={'offset': (2, 2), 'blur': 4, 'color': '#000000'})
+    composer.add_layer('shape', shape='rectangle', position=(10, 150), size=(120, 30),
+                       fill_color='#3498DB', corner_radius=15, opacity=0.5)
+    return composer
+
+
+def test_gradients_and_fonts_are_cached():
+    composer = ImageComposer(size=(300, 120))
+    start, end = composer._hex_to_rgba('#FF6B35'), composer._hex_to_rgba('#2C3E50')
+
+    for angle, ratio in ((0, lambda x, y: x / 300), (90, lambda x, y: y / 120),
+                         (45, lambda x, y: (x + y) / 420)):
+        layer = composer.add_layer('gradient', colors=['#FF6B35', '#2C3E50'], angle=angle)
+        img = composer._render_gradient(layer)
+        for x, y in ((0, 0), (17, 99), (150, 60), (299, 119)):
+            expected = composer._blend_colors(start, end, ratio(x, y))
+            assert all(abs(a - b) <= 2 for a, b in zip(img.getpixel((x, y)), expected))
+
+    # Tiles hand out copies, so opacity on one render can't leak into the next
+    img.putalpha(0)
+    assert composer._render_gradient(layer).getpixel((0, 0))[3] == 255
+
+    clear_render_caches()
+    for title in ('one', 'two', 'three'):
+        _header(title).render()
+    fonts = image_composer.load_font.cache_info()
+    assert fonts.misses == 1 and fonts.hits == 2       # resolved from disk once, shared after
+    assert render_cache_stats()['gradients'] == 1 and render_cache_stats()['fonts'] == 1
+
+
+def test_output_cache_keyed_by_layer_stack(tmp_path):
+    first = _header('Same Title').render()
+    again = _header('Same Title').render()
+    assert again is first and render_cache_stats()['hits'] == 1
+    assert _header('Same Title').render(use_cache=False) == first
+
+    changed = _header('Same Title')
+    changed.layers[2].fill_color = '#E74C3C'
+    hidden = _header('Same Title')
+    hidden.add_layer('text', content='draft', visible=False)
+    assert changed.cache_key() != hidden.cache_key() == _header('Same Title').cache_key()
+    assert _header('Same Title').cache_key('JPEG') != _header('Same Title').cache_key('PNG')
+
+    logo = tmp_path / 'logo.png'
+    Image.new('RGBA', (40, 40), '#FF0000').save(logo)
+    with_logo = _header('Same Title')
+    with_logo.add_layer('image', image=str(logo), position=(5, 5), size=(20, 20))
+    red = Image.open(io.BytesIO(with_logo.render())).getpixel((10, 10))
+
+    Image.new('RGBA', (40, 40), '#00FF00').save(logo)
+    os.utime(logo, ns=(1, 1))                       # new version of the file
+    green = Image.open(io.BytesIO(with_logo.render())).getpixel((10, 10))
+    assert red[:3] == (255, 0, 0) and green[:3] == (0, 255, 0)
+
+
+def test_render_batch_pool_matches_serial():
+    titles = ['Alpha', 'Beta', 'Alpha', 'Gamma', 'Beta', 'Delta']
+    serial = [_header(title).render(use_cache=False) for title in titles]
+
+    pooled = render_batch([_header(title) for title in titles], workers=2)
+    assert pooled == serial and pooled[0] is pooled[2]
+    assert render_cache_stats()['misses'] == 4      # one render per distinct stack
+
+    assert render_batch([_header('Gamma'), _header('Epsilon')], workers=1)[0] == serial[3]
+    assert render_cache_stats()['hits'] == 1 and render_cache_stats()['misses'] == 5
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test Append-Only Ledger
+
+Demonstrates:
+- Postings are balanced, idempotent and all-or-nothing: an overdraft leg
+  rolls back every leg, including inside a caller's transaction; an
+  all-zero posting writes nothing
+- Journal rows can't be edited or deleted
+- Concurrent transfers never overdraw and snapshots reconcile with verify();
+  a pool swap that fails mid-transaction releases the write lock, and reading
+  a player's VIBE balance writes nothing
+- The token API earns/spends through the ledger and imports pre-ledger balances
+
+Usage:
+    python3 -m pytest test_ledger.py
+"""
+
+import random
+import threading
+
+import pytest
+from flask import Flask
+
+import database
+import ledger
+import schema_registry
+from ledger import InsufficientFunds, LedgerError
+
+
+ISSUER = ('system', 0, 'TOKEN')
+
+
+def _db(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    database.init_db()
+    schema_registry.run_migrations()
+    return database.get_db()
+
+
+def test_postings_are_atomic_and_idempotent(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    alice, bob = ('user', 1, 'TOKEN'), ('user', 2, 'TOKEN')
+
+    first = ledger.transfer(ISSUER, alice, 50, kind='earn', idempotency_key='grant-1')
+    again = ledger.transfer(ISSUER, alice, 50, kind='earn', idempotency_key='grant-1')
+    assert again.replayed and again.id == first.id and ledger.balance(alice) == 50
+
+    with pytest.raises(LedgerError):
+        ledger.post([(alice, -10), (bob, 5)], kind='bad')
+    with pytest.raises(LedgerError):
+        ledger.post([], kind='bad')
+
+    # An empty pool resolving / a zero opening balance
+    assert ledger.post([(('pool', 9, 'TOKEN'), 0), (ISSUER, 0)], kind='noop').id is None
+    assert ledger.get_account(('pool', 9, 'TOKEN')) is None
+
+    with pytest.raises(InsufficientFunds) as excinfo:
+        ledger.post([(alice, -30), (bob, 30), (alice, -30), (bob, 30)], kind='spend')
+    assert excinfo.value.available == 20
+    assert ledger.balance(alice) == 50 and ledger.balance(bob) == 0
+
+    # Inside a caller's transaction only the failed posting is undone
+    with ledger.immediate(db):
+        ledger.transfer(alice, bob, 20, kind='tip', db=db)
+        with pytest.raises(InsufficientFunds):
+            ledger.transfer(alice, bob, 100, kind='tip', db=db)
+    assert ledger.balance(alice) == 30 and ledger.balance(bob) == 20
+    assert [e['balance_after'] for e in ledger.get_entries(alice)] == [30, 50]
+
+    with pytest.raises(Exception, match='append-only'):
+        db.execute('UPDATE ledger_entries SET amount = 1000')
+    db.rollback()
+    assert ledger.verify()['valid']
+    db.close()
+
+
+def test_concurrent_transfers_never_overdraw(monkeypatch, tmp_path):
+    _db(monkeypatch, tmp_path).close()
+    accounts = [('user', i, 'TOKEN') for i in range(1, 6)]
+    for account in accounts:
+        ledger.transfer(ISSUER, account, 100, kind='grant')
+
+    rejected = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        for _ in range(60):
+            source, dest = rng.sample(accounts, 2)
+            try:
+                ledger.transfer(source, dest, rng.randint(1, 80), kind='transfer')
+            except InsufficientFunds:
+                rejected.append(source)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    balances = [ledger.balance(account) for account in accounts]
+    assert sum(balances) == 500 and min(balances) >= 0
+    assert ledger.verify()['valid']
+
+    top = ledger.leaderboard('TOKEN', limit=2)
+    assert [row['balance'] for row in top] == sorted(balances, reverse=True)[:2]
+
+
+def test_failed_swap_releases_lock_and_balance_is_read_only(monkeypatch, tmp_path):
+    import domain_liquidity_pools
+    import story_betting_market
+
+    db = _db(monkeypatch, tmp_path)
+    domain_liquidity_pools.init_liquidity_pool_tables()
+    db.execute('INSERT INTO liquidity_pools (domain_a_id, domain_b_id) VALUES (1, 2)')
+    db.commit()
+
+    with pytest.raises(ZeroDivisionError):                  # empty reserves
+        domain_liquidity_pools.swap(1, user_id=1, input_domain='a', amount_in=0)
+    db.execute('BEGIN IMMEDIATE')                            # not blocked by the failed swap
+    db.rollback()
+
+    monkeypatch.setattr(story_betting_market, 'DATABASE_PATH', database.DB_PATH)
+    market = story_betting_market.StoryBettingMarket()
+    changes = market.db.total_changes
+    assert market.get_player_balance(42)['balance'] == story_betting_market.STARTING_VIBE
+    assert market.db.total_changes == changes and not market.db.in_transaction
+    assert ledger.get_account(story_betting_market.vibe_account(42)) is None
+
+
+def test_token_api_uses_ledger(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    from token_economy_api import init_token_tables, token_economy_bp
+
+    db.executemany("INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, 'x')",
+                   [(1, 'newbie', 'n@example.com'), (2, 'veteran', 'v@example.com'), (3, 'idle', 'i@example.com')])
+    db.commit()
+    init_token_tables()
+    db.executemany("INSERT INTO user_tokens (user_id, token_balance, lifetime_earned, lifetime_spent, last_updated) "
+                   "VALUES (?, ?, ?, ?, '2026-01-01')", [(2, 40, 70, 30), (3, 0, 0, 0)])
+    db.commit()
+
+    app = Flask(__name__)
+    app.register_blueprint(token_economy_bp)
+    client = app.test_client()
+
+    assert client.get('/api/tokens/balance/1').get_json()['token_balance'] == 15
+    veteran = client.get('/api/tokens/balance/2').get_json()
+    assert (veteran['token_balance'], veteran['lifetime_earned'], veteran['lifetime_spent']) == (40, 70, 30)
+    assert client.get('/api/tokens/balance/3').get_json()['token_balance'] == 0
+
+    earn = {'user_id': 1, 'action': 'voice_memo_recorded', 'idempotency_key': 'memo-7'}
+    assert client.post('/api/tokens/earn', json=earn).get_json()['new_balance'] == 20
+    assert client.post('/api/tokens/earn', json=earn).get_json()['replayed']
+
+    spend = client.post('/api/tokens/spend', json={'user_id': 1, 'action': 'custom', 'amount': 25})
+    assert spend.status_code == 400 and spend.get_json()['available'] == 20
+    assert client.post('/api/tokens/spend', json={'user_id': 1, 'action': 'custom', 'amount': 5}
+                       ).get_json()['new_balance'] == 15
+
+    history = client.get('/api/tokens/transactions/1').get_json()['transactions']
+    assert [t['amount'] for t in history] == [-5, 5, 15]
+
+    # An account with no users row doesn't break (or crowd) the leaderboard
+    for _ in range(20):
+        client.post('/api/tokens/earn', json={'user_id': 99, 'action': 'voice_memo_recorded'})
+    board = client.get('/api/tokens/leaderboard').get_json()['leaderboard']
+    assert [row['username'] for row in board] == ['veteran', 'newbie']
+    db.close()
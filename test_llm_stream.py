@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test Streaming LLM Responses
+
+Demonstrates:
+- LLMStream yields tokens as Ollama produces them and records
+  time-to-first-token next to total latency
+- Cancelling or closing a stream drops the connection, so the backend
+  stops generating
+- Flask routes stream server-sent events, save only completed answers,
+  and stop the generation when the browser disconnects
+- The router falls back past missing models before the first token;
+  OllamaClient streams the same prompt as generate()
+
+Runs against a local mock Ollama server.
+
+Usage:
+    python3 -m pytest test_llm_stream.py
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from flask import Flask, request
+
+import llm_stream
+from llm_router import LLMRouter
+from llm_stream import ChainedStream, LLMStream, sse_response, stream_stats, wants_stream
+from ollama_client import OllamaClient
+
+WORDS = ['Salted', ' butter', ' is', ' churned', ' cream', ' plus', ' salt', '.']
+
+
+class StreamingOllama(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    payloads = []
+    finished = []           # 'done' or 'aborted', one per generation
+    delay = 0.01
+    tokens = WORDS
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        StreamingOllama.payloads.append(payload)
+
+        if payload['model'] == 'missing':
+            body = b'{"error": "model not found"}'
+            self.send_response(404)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        try:
+            lines = [{'response': token, 'done': False} for token in StreamingOllama.tokens]
+            lines.append({'response': '', 'done': True, 'eval_count': len(StreamingOllama.tokens)})
+            for line in lines:
+                time.sleep(StreamingOllama.delay)
+                data = (json.dumps(line) + '\n').encode()
+                self.wfile.write(f'{len(data):x}\r\n'.encode() + data + b'\r\n')
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+            StreamingOllama.finished.append('done')
+        except (BrokenPipeError, ConnectionResetError):
+            StreamingOllama.finished.append('aborted')
+            self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    StreamingOllama.payloads, StreamingOllama.finished = [], []
+    StreamingOllama.delay, StreamingOllama.tokens = 0.01, WORDS
+    llm_stream.reset_stream_stats()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StreamingOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def _wait_finished(count=1, timeout=5):
+    deadline = time.monotonic() + timeout
+    while len(StreamingOllama.finished) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return StreamingOllama.finished
+
+
+def _events(body):
+    events = []
+    for block in body.decode().strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.split('\n'))
+        events.append((lines.get('event', 'message'), json.loads(lines['data'])))
+    return events
+
+
+def test_stream_tokens_ttft_and_cancel(ollama):
+    stream = LLMStream.generate({'model': 'llama3.2', 'prompt': 'butter?', 'stream': False}, ollama_url=ollama)
+    tokens = list(stream)
+    assert tokens == WORDS and stream.text == ''.join(WORDS) and stream.done
+    assert StreamingOllama.payloads[0]['stream'] is True
+
+    summary = stream.summary()
+    assert 0 < summary['ttft_ms'] < summary['total_ms'] and summary['tokens'] == len(WORDS)
+    assert not summary['cancelled']
+
+    # Cancel after the first token: the backend sees its client go away
+    StreamingOllama.tokens = ['tok '] * 400
+    stream = LLMStream.generate({'model': 'llama3.2', 'prompt': 'long'}, ollama_url=ollama)
+    for token in stream:
+        stream.cancel()
+    assert stream.text == 'tok ' and stream.summary()['cancelled']
+    assert _wait_finished(2) == ['done', 'aborted']
+
+    stats = stream_stats()
+    assert stats['streams'] == 2 and stats['cancelled'] == 1
+    assert stats['ttft_ms']['p50'] is not None and stats['total_ms']['p50'] is not None
+
+
+def test_sse_route_saves_completed_answers_and_stops_on_disconnect(ollama):
+    app = Flask(__name__)
+    saved = []
+
+    @app.route('/chat', methods=['POST'])
+    def chat():
+        assert wants_stream(request)
+        result = LLMRouter(models=['missing', 'llama3.2'], ollama_url=ollama).stream(request.get_json()['q'])
+        return sse_response(result['stream'], meta={'model': result['model_used']},
+                            on_complete=lambda text, summary: {'answer': saved.append(text) or text})
+
+    client = app.test_client()
+    events = _events(client.post('/chat', json={'q': 'butter?', 'stream': True}).data)
+    assert events[0] == ('meta', {'model': 'llama3.2'})
+    assert [data['token'] for kind, data in events if kind == 'message'] == WORDS
+    kind, done = events[-1]
+    assert kind == 'done' and done['answer'] == ''.join(WORDS) and done['ttft_ms'] <= done['total_ms']
+    assert saved == [''.join(WORDS)]
+    assert [p['model'] for p in StreamingOllama.payloads] == ['missing', 'llama3.2']
+
+    # Browser goes away after the first token
+    StreamingOllama.tokens = ['tok '] * 400
+    response = client.post('/chat?stream=1', json={'q': 'long'}, buffered=False)
+    chunks = iter(response.response)
+    next(chunks)                            # meta
+    assert 'token' in next(chunks).decode()
+    response.close()
+    assert _wait_finished(2) == ['done', 'aborted'] and saved == [''.join(WORDS)]
+
+
+def test_client_and_chained_streams(ollama):
+    client = OllamaClient(base_url=ollama)
+    stream = client.generate_stream('Say hi', system_prompt='Be brief.', max_tokens=20)
+    assert stream.read() == ''.join(WORDS)
+    sent = StreamingOllama.payloads[-1]
+    assert sent['prompt'] == 'Be brief.\n\nUser: Say hi\n\nAssistant:' and sent['options']['num_predict'] == 20
+
+    chained = ChainedStream([lambda: LLMStream.generate({'model': 'm', 'prompt': 'x'}, ollama_url=ollama)] * 3,
+                            separator='\n\n')
+    assert ''.join(chained) == '\n\n'.join([''.join(WORDS)] * 3)
+    assert chained.texts == [''.join(WORDS)] * 3 and chained.summary()['generations'] == 3
+
+    broken = ChainedStream([lambda: LLMStream.generate({'model': 'missing', 'prompt': 'x'}, ollama_url=ollama)])
+    assert list(broken) == [] and 'Not Found' in broken.error
+
+    assert LLMRouter(models=['missing'], ollama_url=ollama).stream('x')['success'] is False
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test Merkle Snapshots
+
+Demonstrates:
+- Editing one row rewrites one page; the rest are shared with the last snapshot
+- Appending rows only touches the tail of the tree
+- Verifying a chain re-hashes each page once, not once per snapshot
+- Inclusion proofs check a single memo against the published root
+- A tampered page is detected
+
+Usage:
+    python3 -m pytest test_merkle_snapshot.py
+"""
+
+import json
+
+from merkle_snapshot import MerkleSnapshotStore, verify_proof
+
+
+def _memos(count, edited=None):
+    return [
+        {'id': i, 'timestamp': f'2026-01-01 00:{i % 60:02d}:00',
+         'processing_hash': 'edited' if i == edited else f'{i:016x}'}
+        for i in range(1, count + 1)
+    ]
+
+
+def test_snapshots_scale_with_delta(tmp_path):
+    store = MerkleSnapshotStore(tmp_path, 'voice_memos')
+
+    first, built = store.manifest(_memos(5000), '2026-01-01', None, {'total_memos': 5000})
+    assert built['written_pages'] == len(first['pages']) > 5
+
+    second, built = store.manifest(_memos(5000, edited=2500), '2026-01-02', first['snapshot_hash'], {'total_memos': 5000})
+    assert built['written_pages'] == 1
+    assert second['merkle_root'] != first['merkle_root']
+
+    third, built = store.manifest(_memos(5010, edited=2500), '2026-01-03', second['snapshot_hash'], {'total_memos': 5010})
+    assert built['written_pages'] <= 2
+
+    trusted = set()
+    results = [store.verify_manifest(m, trusted) for m in (first, second, third)]
+    assert all(result['valid'] for result in results)
+    assert results[0]['pages_checked'] == len(first['pages'])
+    assert results[1]['pages_checked'] == 1
+    assert results[2]['pages_checked'] <= 2
+
+
+def test_inclusion_proof(tmp_path):
+    store = MerkleSnapshotStore(tmp_path, 'voice_memos')
+    manifest, _ = store.manifest(_memos(3000), '2026-01-01', None, {'total_memos': 3000})
+
+    proof = json.loads(json.dumps(store.prove(manifest, 1234)))     # survives a JSON round trip
+    assert proof['row']['id'] == 1234
+    assert verify_proof(proof['row'], proof, manifest['merkle_root'])
+
+    forged = dict(proof['row'], timestamp='2025-12-31 00:00:00')     # backdated
+    assert not verify_proof(forged, proof, manifest['merkle_root'])
+    assert store.prove(manifest, 99999) is None
+
+
+def test_tampered_page_detected(tmp_path):
+    store = MerkleSnapshotStore(tmp_path, 'voice_memos')
+    manifest, _ = store.manifest(_memos(500), '2026-01-01', None, {'total_memos': 500})
+
+    path = store.page_path(manifest['pages'][0]['hash'])
+    page = json.loads(path.read_text())
+    page['rows'][0]['timestamp'] = '2020-01-01 00:00:00'
+    path.write_text(json.dumps(page))
+
+    result = store.verify_manifest(manifest)
+    assert not result['valid']
+    assert 'mismatch' in result['error']
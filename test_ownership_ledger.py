@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test Batch Ownership Recalculation
+
+Demonstrates:
+- recalculate_ownership() matches update_ownership() pair for pair (50% cap,
+  users without a GitHub profile) and rewrites nothing when nothing changed
+- New stars, posts and referrals queue only the affected users for
+  process_ownership_events()
+- calculate_revenue_shares() pays out every domain with one owners query
+
+Usage:
+    python3 -m pytest test_ownership_ledger.py
+"""
+
+import database
+import schema_registry
+from ownership_ledger import (
+    calculate_ownership, calculate_revenue_share, calculate_revenue_shares, init_ownership_tables,
+    process_ownership_events, recalculate_ownership
+)
+
+
+def _db(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    database.init_db()
+    init_ownership_tables()
+    schema_registry.run_migrations()
+
+    db = database.get_db()
+    db.executemany('INSERT INTO domains (id, domain_name, tier_requirement) VALUES (?, ?, 0)',
+                   [(1, 'soulfra.com'), (2, 'calriven.com')])
+    db.executemany("INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, 'x')",
+                   [(i, f'user{i}', f'user{i}@example.com') for i in range(1, 5)])
+    db.executemany('INSERT INTO github_profiles (user_id, github_username, github_id, total_stars, tier) '
+                   'VALUES (?, ?, ?, ?, ?)',
+                   [(1, 'one', 1, 3, 2), (2, 'two', 2, 200, 4), (3, 'three', 3, 0, 1)])   # user 4: no GitHub
+    db.executemany('INSERT INTO user_domains (user_id, domain_id) VALUES (?, ?)',
+                   [(u, d) for u in range(1, 5) for d in (1, 2)])
+    db.executemany("INSERT INTO posts (user_id, title, slug, content, published_at, domain_id) "
+                   "VALUES (?, 't', ?, '', '2026-01-01', ?)",
+                   [(1, 'a', 1), (1, 'b', 1), (4, 'c', 2)])
+    db.execute('INSERT INTO referrals (referrer_user_id, referred_user_id) VALUES (1, 3)')
+    db.commit()
+    return db
+
+
+def test_batch_matches_per_pair_formula(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+
+    first = recalculate_ownership()
+    assert first['pairs'] == first['changed'] == first['history'] == 8
+
+    rows = db.execute('SELECT user_id, domain_id, ownership_percentage FROM domain_ownership').fetchall()
+    for row in rows:
+        assert row['ownership_percentage'] == calculate_ownership(row['user_id'], row['domain_id'])
+    by_pair = {(r['user_id'], r['domain_id']): r['ownership_percentage'] for r in rows}
+    assert by_pair[(1, 1)] == 7.0 + 1.5 + 0.4 + 1.0 and by_pair[(2, 1)] == 50.0 and by_pair[(4, 2)] == 0.0
+
+    again = recalculate_ownership()
+    assert again['changed'] == again['history'] == 0
+    assert db.execute('SELECT COUNT(*) FROM ownership_dirty').fetchone()[0] == 0
+    db.close()
+
+
+def test_events_recalculate_only_affected_users(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    recalculate_ownership()
+
+    db.execute('UPDATE github_profiles SET total_stars = 5 WHERE user_id = 3')
+    db.execute("INSERT INTO posts (user_id, title, slug, content, published_at, domain_id) "
+               "VALUES (1, 't', 'd', '', '2026-01-02', 2)")
+    db.commit()
+    assert sorted(r[0] for r in db.execute('SELECT user_id FROM ownership_dirty')) == [1, 3]
+
+    result = process_ownership_events()
+    assert result['users'] == 2 and result['pairs'] == 4 and result['changed'] == 3
+    assert db.execute("SELECT ownership_percentage FROM domain_ownership WHERE user_id = 3 AND domain_id = 1"
+                      ).fetchone()[0] == 5.0 + 2.5
+    assert db.execute("SELECT COUNT(*) FROM ownership_history WHERE change_reason = 'event'").fetchone()[0] == 3
+    assert process_ownership_events()['users'] == 0
+    db.close()
+
+
+def test_revenue_shares_for_all_domains(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+    recalculate_ownership()
+
+    shares = calculate_revenue_shares({1: 10000.0, 2: 5000.0})
+    assert shares[1] == calculate_revenue_share(1, 10000.0)
+    assert shares[2] == calculate_revenue_share(2, 5000.0)
+    assert [p['user_id'] for p in shares[1]] == [2, 1, 3]
+    db.close()
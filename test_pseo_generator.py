@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Bulk pSEO Generation
+
+Demonstrates:
+- Compiled templates render the same pages as the per-page helpers
+- Bulk generation writes every city × keyword page in batched UPSERTs
+- Regenerating unchanged tutorials writes nothing
+- Edited tutorials update their pages in place (stats are kept)
+- Slugs already owned by another tutorial are left alone
+
+Usage:
+    python3 -m pytest test_pseo_generator.py
+"""
+
+import database
+import schema_registry
+from pseo_generator import (
+    customize_content_for_city, generate_pseo_pages_bulk, generate_slug, render_tutorial_pages
+)
+
+CONTENT = '<header><h1>Fix [KEYWORD] leaks</h1></header><main><p>Tips for [CITY] {homes}</p></main>'
+
+
+def _db(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    database.init_db()
+    schema_registry.run_migrations()
+    db = database.get_db()
+    db.execute("""INSERT INTO professional_profile (id, user_id, business_name, subdomain, trade_category,
+                                                   phone, address_city, license_type)
+                  VALUES (1, 1, 'Joe''s Plumbing', 'joes', 'plumbing', '813-555-0100', 'Tampa', 'Plumbing')""")
+    db.executemany("INSERT INTO tutorial (id, professional_id, title, audio_url, html_content, status) "
+                   "VALUES (?, 1, ?, '', ?, 'published')",
+                   [(1, 'How to Fix a Leaky Faucet', CONTENT), (2, 'How to Install Ceiling Fans', CONTENT)])
+    db.commit()
+    return db
+
+
+def test_compiled_rendering_matches_helpers():
+    professional = {'id': 1, 'business_name': 'Joe', 'phone': '813-555-0100', 'subdomain': None,
+                    'address_city': 'Clearwater', 'license_type': 'Plumbing'}
+    tutorial = {'id': 7, 'title': 'How to Fix a Leaky Faucet', 'html_content': CONTENT}
+
+    rows = render_tutorial_pages((tutorial, professional))
+    assert len(rows) == len({row[2] for row in rows}) == 15 * 11
+
+    for row in rows[::17]:
+        _, _, slug, full_url, city, keyword = row[:6]
+        assert slug == generate_slug(city, keyword)
+        assert full_url == f'cringeproof.com/p/1/{slug}'
+        assert row[10] == customize_content_for_city(CONTENT, city, keyword, professional)
+
+    page = customize_content_for_city(CONTENT, 'St. Petersburg', 'emergency plumber', professional)
+    assert '<h1>Fix emergency plumber leaks in St. Petersburg</h1>' in page
+    assert 'Tips for St. Petersburg {homes}' in page
+    assert 'Serving St. Pete from the Pier' in page
+
+
+def test_bulk_generate_and_regenerate(monkeypatch, tmp_path):
+    db = _db(monkeypatch, tmp_path)
+
+    first = generate_pseo_pages_bulk([1, 2], workers=1)
+    assert first['created'] == first['pages'] - first['skipped'] > 0
+    assert first['skipped'] == 15 * 8          # second tutorial shares the trade keywords
+    total = db.execute('SELECT COUNT(*) FROM pseo_landing_page').fetchone()[0]
+    assert total == first['created']
+    assert db.execute('SELECT pseo_pages_count FROM tutorial WHERE id = 1').fetchone()[0] == 15 * 11
+
+    again = generate_pseo_pages_bulk([1, 2], workers=1)
+    assert again['created'] == again['updated'] == 0 and again['unchanged'] == total
+
+    db.execute("UPDATE pseo_landing_page SET leads = 3 WHERE slug = 'tampa-plumber'")
+    db.execute("UPDATE tutorial SET html_content = ? WHERE id = 1", (CONTENT + '<p>new</p>',))
+    db.commit()
+
+    edited = generate_pseo_pages_bulk([1, 2], workers=1)
+    assert edited['updated'] == 15 * 11 and edited['created'] == 0
+    page = db.execute("SELECT leads, content_html FROM pseo_landing_page WHERE slug = 'tampa-plumber'").fetchone()
+    assert page['leads'] == 3 and page['content_html'].endswith('<p>new</p>')
+    db.close()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test Shared QR Service
+
+Demonstrates:
+- Square codes drawn from the cached module matrix match qrcode's own
+  rendering pixel for pixel, and versions come from the real encoding
+- Every generator shares one matrix per (data, ECC, version) and hot codes
+  come straight from the PNG LRU, with hit rate and latency reported
+- Styled, gradient and logo codes only paint inside dark modules, and a
+  changed logo file is re-rendered
+
+Requires the qrcode package (skipped without it).
+
+Usage:
+    python3 -m pytest test_qr_service.py
+"""
+
+import io
+import os
+
+import pytest
+from PIL import Image, ImageChops
+
+qrcode = pytest.importorskip('qrcode')
+
+import qr_service
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    qr_service.clear_caches()
+    yield
+    qr_service.clear_caches()
+
+
+def test_square_render_matches_qrcode():
+    for data, ecc, level in (('https://soulfra.com/v/abc123', 'L', qrcode.constants.ERROR_CORRECT_L),
+                             ('x' * 300, 'M', qrcode.constants.ERROR_CORRECT_M),
+                             ('https://soulfra.com/practice/room/42', 'H', qrcode.constants.ERROR_CORRECT_H)):
+        qr = qrcode.QRCode(version=1, error_correction=level, box_size=10, border=4)
+        qr.add_data(data)
+        qr.make(fit=True)
+        expected = qr.make_image(fill_color='black', back_color='white').convert('L')
+
+        rendered = qr_service.render(data, ecc=ecc, version=1)
+        assert rendered.size == expected.size
+        assert ImageChops.difference(rendered, expected).getbbox() is None
+        assert qr_service.best_version(data, ecc) == qr.version
+
+    assert qr_service.encode.cache_info().misses == 6       # 3 codes x (version=1, auto)
+
+    # Exact version instead of a size table, reusing the same encoding
+    from vanity_qr import calculate_qr_version
+    assert calculate_qr_version('x' * 300, 'M') == qr_service.best_version('x' * 300, 'M') > 5
+    assert qr_service.encode.cache_info().misses == 6
+
+
+def test_generators_share_matrices_and_png_cache(monkeypatch):
+    from qr_faucet import generate_qr_code_image
+    from multi_part_qr import MultiPartQRGenerator
+
+    url = 'https://soulfra.com/brand-card'
+    first = generate_qr_code_image(url)
+    for _ in range(9):
+        assert generate_qr_code_image(url) is first           # hot code: LRU hit
+    assert qr_service.png(url, ecc='L', version=1, size=200) != first
+    assert qr_service.encode.cache_info().misses == 1         # resized variant reuses the matrix
+
+    stats = qr_service.qr_stats()
+    assert stats['calls'] == 11 and stats['png_hit_rate'] == round(9 / 11, 3) and stats['avg_ms'] > 0
+
+    parts = MultiPartQRGenerator(max_size=1000).split_and_generate('chapter text ' * 40)
+    assert len(parts) > 1 and all(Image.open(io.BytesIO(p['qr_bytes'])).mode == 'L' for p in parts)
+
+    monkeypatch.setattr(qr_service, 'PNG_CACHE_SIZE', 3)
+    for i in range(5):
+        qr_service.png(f'https://soulfra.com/u/{i}')
+    assert qr_service.qr_stats()['png_entries'] == 3
+
+
+def test_styles_gradient_and_logo(tmp_path):
+    from advanced_qr import AdvancedQRGenerator
+    from vanity_qr import generate_branded_qr
+
+    data = 'https://soulfra.com/styled'
+    square = qr_service.render(data, ecc='H', fill=(255, 0, 0))
+    for style in ('gapped', 'circles'):
+        styled = qr_service.render(data, ecc='H', style=style, fill=(255, 0, 0))
+        red_outside = ImageChops.subtract(square.getchannel('G'), styled.getchannel('G'))
+        assert red_outside.getbbox() is None                  # dots stay inside dark modules
+        assert styled.getchannel('G').histogram()[0] < square.getchannel('G').histogram()[0]
+
+    png = AdvancedQRGenerator(data, style='rounded', primary_color='#FF0000',
+                              secondary_color='#0000FF', label='Scan Me', size=256).generate()
+    img = Image.open(io.BytesIO(png)).convert('RGB')
+    assert img.size == (256, 316)
+    top, bottom = ([img.getpixel((x, y)) for x in range(256) if sum(img.getpixel((x, y))) < 400]
+                   for y in (40, 215))
+    assert top[0][0] > top[0][2] and bottom[0][2] > bottom[0][0]    # red at the top, blue at the bottom
+
+    logo = tmp_path / 'logo.png'
+    Image.new('RGB', (50, 50), '#00FF00').save(logo)
+    first = generate_branded_qr(data, 'soulfra', size=300, embed_logo=True, logo_path=str(logo))
+    assert Image.open(io.BytesIO(first)).convert('RGB').getpixel((150, 150)) == (0, 255, 0)
+    assert generate_branded_qr(data, 'soulfra', size=300, embed_logo=True, logo_path=str(logo)) is first
+
+    Image.new('RGB', (50, 50), '#0000FF').save(logo)
+    os.utime(logo, (1, 1))
+    again = generate_branded_qr(data, 'soulfra', size=300, embed_logo=True, logo_path=str(logo))
+    assert Image.open(io.BytesIO(again)).convert('RGB').getpixel((150, 150)) == (0, 0, 255)
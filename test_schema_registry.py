@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Schema Registry + Index Advisor
+
+Demonstrates:
+- Migrations apply once and are recorded in schema_migrations
+- Versions targeting missing tables stay pending, with the reason
+- A version whose dependency is pending waits instead of running
+- ensure_schema() retries pending versions, then stops touching SQLite
+- Index advisor flags a full scan and the proposed index removes it
+
+Usage:
+    python3 -m pytest test_schema_registry.py
+"""
+
+import database
+import schema_registry
+from schema_registry import IndexAdvisor, normalize_query, run_migrations, ensure_schema
+
+
+def _use_temp_db(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    schema_registry.reset_ensure_cache()
+
+
+def test_migrations_apply_once(monkeypatch, tmp_path):
+    _use_temp_db(monkeypatch, tmp_path)
+
+    first = run_migrations()
+    assert 1 in first['applied']
+    assert 5 in first['pending']          # voice_ideas doesn't exist yet
+
+    assert 'no such table' in first['reasons'][19]     # users doesn't exist yet
+    assert first['reasons'][131] == 'waits for 19'
+
+    second = run_migrations()
+    assert 1 not in second['applied']
+    assert 5 in second['pending']
+
+    db = database.get_db()
+    db.execute('CREATE TABLE voice_ideas (id INTEGER PRIMARY KEY, public_hash TEXT)')
+    db.commit()
+    db.close()
+
+    third = run_migrations()
+    assert 5 in third['applied']
+
+
+def test_ensure_schema_retries_pending_then_caches(monkeypatch, tmp_path):
+    _use_temp_db(monkeypatch, tmp_path)
+    monkeypatch.setattr(schema_registry, 'ENSURE_RETRY_SECONDS', 0)
+
+    ensure_schema()                       # Leaves versions pending -> retried next call
+    calls = []
+
+    def fake_run(db_path=None):
+        calls.append(db_path)
+        return {'applied': [5], 'pending': [], 'reasons': {}}
+
+    monkeypatch.setattr(schema_registry, 'run_migrations', fake_run)
+    ensure_schema()
+    ensure_schema()                       # Nothing pending any more
+
+    assert calls == [None]
+
+
+def test_normalize_keeps_json_paths():
+    shape = normalize_query("SELECT hash FROM images WHERE json_extract(metadata, '$.brand_id') = 7 AND kind = 'x'")
+    assert shape == "SELECT hash FROM images WHERE json_extract(metadata, '$.brand_id') = ? AND kind = ?"
+
+
+def test_advisor_proposes_and_applies_index(monkeypatch, tmp_path):
+    _use_temp_db(monkeypatch, tmp_path)
+
+    db = database.get_db()
+    db.execute('CREATE TABLE cringe_votes (id INTEGER PRIMARY KEY, pairing_id INTEGER, user_id TEXT)')
+    db.commit()
+    db.close()
+
+    advisor = IndexAdvisor()
+    with advisor.capture(), advisor.route('/cringe/feed'):
+        db = database.get_db()
+        db.execute('SELECT COUNT(*) FROM cringe_votes WHERE pairing_id = ?', (3,)).fetchall()
+        db.close()
+
+    flagged = advisor.analyze()
+    assert len(flagged) == 1
+    assert 'cringe_votes(pairing_id)' in flagged[0].proposals[0]
+
+    advisor.apply()
+    assert any('USING' in step for step in flagged[0].plan_after)
+    assert '/cringe/feed' in advisor.report()
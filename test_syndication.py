@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test Syndication Cache
+
+Demonstrates:
+- The sitemap index lists one shard per entity with real lastmod dates
+- Warm requests are served from memory without touching the database
+- A post update re-renders only the shard it falls in
+- Feeds showing author emails re-render when a user's email changes, and
+  the document cache keeps only the most recently used documents
+- Conditional GETs with a matching ETag get 304 Not Modified
+- Static feed exports skip the write when nothing changed
+
+Usage:
+    python3 -m pytest test_syndication.py
+"""
+
+import pytest
+
+import database
+import schema_registry
+import syndication
+from syndication import make_document, respond, sitemap_index, sitemap_shard, write_document
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    monkeypatch.setattr(syndication, 'SHARD_SIZE', 2)
+    monkeypatch.setattr(syndication, '_base_url', lambda: 'https://soulfra.test')
+
+    db = database.get_db()
+    db.execute('''
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, slug TEXT, title TEXT, content TEXT,
+            user_id INTEGER, published_at TIMESTAMP
+        )
+    ''')
+    db.execute('CREATE TABLE brands (id INTEGER PRIMARY KEY, slug TEXT, created_at TIMESTAMP)')
+    db.execute('''
+        CREATE TABLE users (
+            id INTEGER PRIMARY KEY, username TEXT, display_name TEXT, email TEXT,
+            is_ai_persona INTEGER DEFAULT 0, created_at TIMESTAMP
+        )
+    ''')
+    db.executemany('INSERT INTO posts (slug, title, content, published_at) VALUES (?, ?, ?, ?)', [
+        ('first', 'First', 'Hello', '2026-01-01 09:00:00'),
+        ('second', 'Second', 'World', '2026-01-02 09:00:00'),
+        ('third', 'Third', 'Again', '2026-01-03 09:00:00'),
+    ])
+    db.execute("INSERT INTO users (username, is_ai_persona, created_at) VALUES ('matt', 0, '2025-12-01')")
+    db.execute("INSERT INTO users (username, is_ai_persona, created_at) VALUES ('bot', 1, '2025-12-01')")
+    db.commit()
+    db.close()
+
+    schema_registry.run_migrations()
+    cache = syndication.get_cache()
+    cache.clear()
+    monkeypatch.setattr(cache, 'revalidate_seconds', 0)
+    yield cache
+    cache.clear()
+
+
+def _body(document):
+    if isinstance(document, syndication.Document):
+        return document.body.decode('utf-8')
+    return b''.join(document).decode('utf-8')
+
+
+def test_sitemap_index_shards_with_real_lastmod(site):
+    index = sitemap_index().body.decode('utf-8')
+    assert '/sitemaps/posts-1.xml' in index
+    assert '/sitemaps/posts-2.xml' in index
+    assert '/sitemaps/souls-1.xml' in index
+    assert '/sitemaps/brands-1.xml' not in index          # no rows, no shard
+    assert '<lastmod>2026-01-03</lastmod>' in index
+
+    shard = _body(sitemap_shard('posts', 1))
+    assert 'https://soulfra.test/post/first' in shard
+    assert '<lastmod>2026-01-02</lastmod>' in shard
+    assert 'third' not in shard
+
+    souls = _body(sitemap_shard('souls', 1))
+    assert '/soul/matt' in souls and '/soul/bot' not in souls
+    assert sitemap_shard('posts', 9) is None
+
+
+def test_warm_path_skips_database(site, monkeypatch):
+    _body(sitemap_shard('posts', 1))
+    site.revalidate_seconds = 3600
+    site._checked_at = 0
+    sitemap_index()
+
+    def no_db():
+        raise AssertionError('warm path touched the database')
+
+    monkeypatch.setattr(syndication, 'get_db', no_db)
+    for _ in range(3):
+        assert isinstance(sitemap_shard('posts', 1), syndication.Document)
+        sitemap_index()
+
+
+def test_update_rerenders_only_changed_shard(site):
+    _body(sitemap_shard('posts', 1))
+    _body(sitemap_shard('posts', 2))
+    renders = site.renders
+
+    db = database.get_db()
+    db.execute("UPDATE posts SET slug = 'third-renamed' WHERE id = 3")
+    db.commit()
+    db.close()
+
+    first = sitemap_shard('posts', 1)
+    assert isinstance(first, syndication.Document)          # fingerprint unchanged
+    assert 'third-renamed' in _body(sitemap_shard('posts', 2))
+    assert site.renders == renders + 2                      # fingerprints + shard 2
+
+
+def test_user_email_change_and_bounded_cache(site, monkeypatch):
+    calls = []
+
+    def render():
+        calls.append(1)
+        return ['<rss/>'], None
+
+    syndication.cached_document(('messages', 'soulfra.test'), ('users',), render)
+    db = database.get_db()
+    db.execute("UPDATE users SET email = 'matt@soulfra.test' WHERE id = 1")
+    db.commit()
+    db.close()
+    syndication.cached_document(('messages', 'soulfra.test'), ('users',), render)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(site, 'max_entries', 3)
+    for domain in ('a.test', 'b.test', 'c.test', 'd.test', 'e.test'):
+        syndication.cached_document(('messages', domain), ('users',), render)
+    assert site.stats()['documents'] == 3
+    syndication.cached_document(('messages', 'a.test'), ('users',), render)
+    assert len(calls) == 8                                   # evicted, rendered again
+
+
+def test_conditional_get_returns_304():
+    from flask import Flask
+
+    document = make_document(['<rss/>'])
+    app = Flask(__name__)
+    with app.test_request_context(headers={'If-None-Match': f'"{document.etag}"'}):
+        assert respond(document).status_code == 304
+    with app.test_request_context():
+        response = respond(document)
+        assert response.status_code == 200
+        assert response.headers['ETag'] == f'"{document.etag}"'
+
+
+def test_write_document_skips_unchanged(tmp_path):
+    path = tmp_path / 'feed.xml'
+    assert write_document(path, ['<rss>', '</rss>'])
+    assert not write_document(path, ['<rss></rss>'])
+    assert write_document(path, ['<rss/>'])
+    assert path.read_text() == '<rss/>'
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Compiled Template and Theme Caches
+
+Demonstrates:
+- Formulas compile once to code objects and renders are memoized by
+  (template hash, variables hash); volatile functions bypass the cache
+- Unsafe expressions are still rejected before compiling
+- Theme CSS is served from memory with a content-hash ETag, immutable
+  when requested with the current ?v= hash
+- Professional sites re-render only when their profile/theme inputs or
+  the date they show change
+
+Usage:
+    python3 -m pytest test_template_cache.py
+"""
+
+import os
+from datetime import date
+
+from flask import Flask
+
+import database
+import template_generator
+from formula_engine import FormulaEngine
+from theme_compiler import ThemeCompiler, get_theme_cache, respond_theme, theme_url
+
+
+def test_formula_render_cache():
+    engine = FormulaEngine()
+    template = '--c: {{darken(color, 0.3)}}; --s: {{size * 1.5}}px; {{missing}}'
+
+    first = engine.render_template(template, {'color': '#4ecca3', 'size': 16})
+    assert first.startswith('--c: #368e72; --s: 24.0px; {{ERROR:')
+    assert engine.render_template(template, {'size': 16, 'color': '#4ecca3'}) == first
+    assert engine.cache_stats()['hits'] == 1
+    assert engine.render_template(template, {'color': '#4ecca3', 'size': 20}) != first
+
+    assert 'Unsupported expression type: Attribute' in engine.render_template('{{color.__class__}}', {'color': 'x'})
+
+    ticks = iter(range(10))
+    engine.register_function('tick', lambda: next(ticks), volatile=True)
+    assert engine.render_template('{{tick()}}', {}) == '0'
+    assert engine.render_template('{{tick()}}', {}) == '1'
+
+
+def test_theme_served_from_memory(tmp_path):
+    brand = tmp_path / 'soulfra' / 'brand'
+    brand.mkdir(parents=True)
+    (brand / 'soulfra.json').write_text(
+        '{"concepts": {"styling": [{"metadata": {"primaryColor": "#4ecca3"}}]}}')
+
+    compiler = ThemeCompiler(domains_dir=tmp_path)
+    css_path = compiler.compile_theme('soulfra')
+    mtime = os.stat(css_path).st_mtime_ns
+    compiler.compile_theme('soulfra')
+    assert os.stat(css_path).st_mtime_ns == mtime            # unchanged CSS is not rewritten
+
+    cache = get_theme_cache(tmp_path)
+    document = cache.get('soulfra')
+    assert cache.get('soulfra') is document and cache.get('../soulfra') is None
+    url = theme_url('soulfra', tmp_path)
+    version = url.split('?v=')[1]
+
+    app = Flask(__name__)
+    with app.test_request_context(url):
+        response = respond_theme(document, version)
+        assert response.status_code == 200 and response.mimetype == 'text/css'
+        assert response.cache_control.immutable and response.cache_control.max_age == 365 * 24 * 3600
+    with app.test_request_context('/theme-soulfra.css', headers={'If-None-Match': f'"{document.etag}"'}):
+        response = respond_theme(document)
+        assert response.status_code == 304 and not response.cache_control.immutable
+
+
+def test_sites_rerender_only_on_input_change(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    database.init_db()
+    db = database.get_db()
+    for i in (1, 2):
+        db.execute("""INSERT INTO professional_profile (id, user_id, business_name, subdomain, trade_category)
+                      VALUES (?, ?, ?, ?, 'plumbing')""", (i, i, f'Pro {i}', f'pro{i}'))
+    db.execute("""INSERT INTO tutorial (professional_id, title, audio_url, status, published_at)
+                  VALUES (1, 'Fix a Faucet', '', 'published', '2026-03-01 09:00:00')""")
+    db.commit()
+
+    template_generator.clear_site_cache()
+    before = template_generator.site_cache_stats()
+    sites = template_generator.generate_professional_sites()
+    assert 'March 01, 2026' in sites[1]['tutorials']
+
+    db.execute("UPDATE professional_profile SET primary_color = '#123456' WHERE id = 2")
+    db.commit()
+    again = template_generator.generate_professional_sites()
+    assert again[1] == sites[1] and '#123456' in again[2]['base_css']
+
+    stats = template_generator.site_cache_stats()
+    assert stats['rendered'] - before['rendered'] == 3 and stats['reused'] - before['reused'] == 1
+
+    # A new day re-renders the "Last verified" date and © year
+    monkeypatch.setattr(template_generator, '_render_date', lambda: date(2099, 1, 1))
+    template_generator.generate_professional_sites([1])
+    assert template_generator.site_cache_stats()['rendered'] - stats['rendered'] == 1
+    db.close()
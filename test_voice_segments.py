@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test Segmented Voice Memo Encryption
+
+Demonstrates:
+- Audio files are encrypted one 64 KiB segment at a time; any byte range
+  decrypts from its own segments only, and reordered, truncated or edited
+  segments fail authentication
+- Uploads are stored a segment per row; playback answers Range requests
+  with 206 Partial Content by reading and decrypting only the segments the
+  range covers, and counts a play only for requests starting at byte 0
+- Memos stored whole still play (with ranges), and federation peers can
+  stream the encrypted container
+
+Usage:
+    python3 -m pytest test_voice_segments.py
+"""
+
+import base64
+import io
+import os
+
+import pytest
+
+pytest.importorskip('cryptography')
+
+import database
+import voice_encryption
+from voice_encryption import (SEGMENT_HEADER, SEGMENT_SIZE, SegmentedMemo, encrypt_audio_file,
+                              decrypt_audio_file, encrypt_voice_memo, hash_access_key, key_from_base64)
+from voice_segments import VOICE_SEGMENTS_SCHEMA
+
+
+def test_segmented_files_decrypt_any_range_and_detect_tampering(tmp_path, monkeypatch):
+    audio = os.urandom(5 * SEGMENT_SIZE + 1234)
+    path = tmp_path / 'memo.webm'
+    path.write_bytes(audio)
+
+    result = encrypt_audio_file(str(path))
+    encrypted = open(result['encrypted_file'], 'rb').read()
+    assert len(encrypted) == voice_encryption.segmented_size(len(audio))
+    assert open(decrypt_audio_file(result['encrypted_file'], result['key_b64'], result['iv_b64']), 'rb').read() == audio
+
+    key = key_from_base64(result['key_b64'])
+    memo = SegmentedMemo(key, encrypted[:SEGMENT_HEADER.size])
+    assert memo.segments == 6 and memo.iv_b64 == result['iv_b64']
+
+    decrypted = []
+    original = SegmentedMemo.decrypt_segment
+    monkeypatch.setattr(SegmentedMemo, 'decrypt_segment',
+                        lambda self, index, data: decrypted.append(index) or original(self, index, data))
+
+    f = io.BytesIO(encrypted)
+    start = 4 * SEGMENT_SIZE + 10
+    assert b''.join(memo.read_range(f, start, start + 100)) == audio[start:start + 100]
+    assert decrypted == [4]
+    assert b''.join(memo.read_range(f, SEGMENT_SIZE - 1, SEGMENT_SIZE + 1)) == audio[SEGMENT_SIZE - 1:SEGMENT_SIZE + 1]
+    assert b''.join(memo.read_range(f, len(audio) - 5)) == audio[-5:]
+
+    segment = SEGMENT_SIZE + 16
+    first, second = encrypted[SEGMENT_HEADER.size:][:segment], encrypted[SEGMENT_HEADER.size:][segment:2 * segment]
+    with pytest.raises(ValueError):
+        list(memo.decrypt_range([second, first], 0, 2 * SEGMENT_SIZE))
+    with pytest.raises(ValueError):
+        list(memo.decrypt_range([first], 0, 2 * SEGMENT_SIZE))      # truncated
+    with pytest.raises(ValueError):                                  # last segment dropped, header shortened
+        shorter = bytearray(memo.header)
+        shorter[9:17] = (5 * SEGMENT_SIZE).to_bytes(8, 'big')
+        shorter[17:21] = (5).to_bytes(4, 'big')
+        forged = SegmentedMemo(key, bytes(shorter))
+        list(forged.read_range(io.BytesIO(bytes(shorter) + encrypted[SEGMENT_HEADER.size:])))
+
+    empty = SegmentedMemo.new(0)
+    container = empty.header + b''.join(empty.encrypt_stream(io.BytesIO()))
+    assert b''.join(SegmentedMemo(empty.key, empty.header).read_range(io.BytesIO(container))) == b''
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    pytest.importorskip('qrcode')
+    from flask import Flask
+    from voice_federation_routes import voice_federation_bp
+
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'soulfra_test.db'))
+    db = database.get_db()
+    db.execute('''CREATE TABLE voice_memos (id TEXT PRIMARY KEY, user_id INTEGER, domain TEXT NOT NULL,
+                  encrypted_audio BLOB NOT NULL, encryption_iv TEXT NOT NULL, access_key_hash TEXT NOT NULL,
+                  duration_seconds INTEGER, file_size_bytes INTEGER, audio_format TEXT DEFAULT 'audio/webm',
+                  access_type TEXT DEFAULT 'qr', federation_shared BOOLEAN DEFAULT 1, trusted_domains TEXT,
+                  access_count INTEGER DEFAULT 0, last_accessed_at TIMESTAMP,
+                  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, expires_at TIMESTAMP, metadata TEXT)''')
+    db.execute('''CREATE TABLE voice_memo_access_log (id INTEGER PRIMARY KEY AUTOINCREMENT, memo_id TEXT NOT NULL,
+                  requesting_domain TEXT, requesting_ip TEXT, access_granted BOOLEAN,
+                  access_denied_reason TEXT, accessed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    for statement in VOICE_SEGMENTS_SCHEMA:
+        db.execute(statement)
+    db.commit()
+    db.close()
+
+    app = Flask(__name__)
+    app.register_blueprint(voice_federation_bp)
+    return app.test_client()
+
+
+def test_upload_streams_segments_and_playback_serves_ranges(client):
+    audio = os.urandom(20 * SEGMENT_SIZE + 777)
+    response = client.post('/voice/upload', data={'audio': (io.BytesIO(audio), 'memo.m4a', 'audio/m4a')},
+                           content_type='multipart/form-data')
+    body = response.get_json()
+    memo_id, key_b64 = body['memo_id'], body['play_url'].split('key=')[1]
+
+    db = database.get_db()
+    assert db.execute('SELECT COUNT(*) FROM voice_memo_segments WHERE memo_id = ?', (memo_id,)).fetchone()[0] == 21
+    assert db.execute('SELECT length(encrypted_audio), file_size_bytes FROM voice_memos').fetchone()[:] == \
+        (SEGMENT_HEADER.size, len(audio))
+
+    statements = []
+    database.set_query_observer(statements.append)
+    try:
+        start = 17 * SEGMENT_SIZE + 5
+        response = client.get(f'/voice/{memo_id}?key={key_b64}', headers={'Range': f'bytes={start}-{start + 999}'})
+        assert response.status_code == 206 and response.data == audio[start:start + 1000]
+    finally:
+        database.set_query_observer(None)
+    assert response.headers['Content-Range'] == f'bytes {start}-{start + 999}/{len(audio)}'
+    segment_queries = [sql for sql in statements if 'voice_memo_segments' in sql]
+    assert len(segment_queries) == 1 and 'seq >= 17 AND seq < 18' in segment_queries[0]
+    assert db.execute('SELECT access_count FROM voice_memos').fetchone()[0] == 0
+
+    response = client.get(f'/voice/{memo_id}?key={key_b64}')
+    assert response.status_code == 200 and response.data == audio and response.headers['Accept-Ranges'] == 'bytes'
+    assert client.get(f'/voice/{memo_id}?key={key_b64}', headers={'Range': 'bytes=0-99'}).data == audio[:100]
+    assert db.execute('SELECT access_count FROM voice_memos').fetchone()[0] == 2
+    assert client.get(f'/voice/{memo_id}?key={key_b64}', headers={'Range': f'bytes={len(audio)}-'}).status_code == 416
+    db.close()
+
+
+def test_whole_file_memos_still_play_and_federation_streams_container(client):
+    audio = os.urandom(3000)
+    result = encrypt_voice_memo(audio)
+    db = database.get_db()
+    db.execute('INSERT INTO voice_memos (id, domain, encrypted_audio, encryption_iv, access_key_hash) '
+               'VALUES (?, ?, ?, ?, ?)', ('old', 'soulfra.com', result['encrypted_data'], result['iv_b64'],
+                                          hash_access_key(result['key'])))
+    db.commit()
+    db.close()
+
+    response = client.get(f"/voice/old?key={result['key_b64']}", headers={'Range': 'bytes=1000-1999'})
+    assert response.status_code == 206 and response.data == audio[1000:2000]
+
+    body = client.post('/api/federation/voice/fetch', json={'memo_id': 'old', 'access_key': result['key_b64']}).get_json()
+    assert body['encryption_format'] == 'whole'
+
+    audio = os.urandom(3 * SEGMENT_SIZE)
+    body = client.post('/voice/upload', data={'audio': (io.BytesIO(audio), 'memo.webm', 'audio/webm')},
+                       content_type='multipart/form-data').get_json()
+    key_b64 = body['play_url'].split('key=')[1]
+
+    request = {'memo_id': body['memo_id'], 'access_key': key_b64, 'stream': True}
+    response = client.post('/api/federation/voice/fetch', json=request)
+    assert response.headers['X-Encryption-Format'] == 'segmented'
+    container = response.data
+    memo = SegmentedMemo(key_from_base64(key_b64), container[:SEGMENT_HEADER.size])
+    assert b''.join(memo.read_range(io.BytesIO(container))) == audio
+
+    request['stream'] = False
+    body = client.post('/api/federation/voice/fetch', json=request).get_json()
+    assert base64.b64decode(body['encrypted_audio_b64']) == container
+    print(f"✅ {memo.segments} segments, {len(container) - len(audio)} bytes of overhead")
@@ -20,14 +20,128 @@ Usage:
     from theme_compiler import ThemeCompiler
     compiler = ThemeCompiler()
     compiler.compile_theme('soulfra')
+
+Serving:
+    Compiled CSS is held in memory by ThemeCache with a content-hash ETag.
+    Link themes with theme_url('soulfra') -> /theme-soulfra.css?v=<hash> so
+    browsers cache them as immutable; the bare URL still revalidates by ETag.
 """
 
 import json
+import re
 import argparse
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import colorsys
 
+from syndication import Document, make_document, respond, write_document
+
+
+DEFAULT_DOMAINS_DIR = Path(__file__).parent.parent / 'domains'
+THEME_MAX_AGE = 365 * 24 * 3600        # Versioned theme URLs never change
+VERSION_LENGTH = 12                    # ETag prefix used as ?v=
+DOMAIN_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9_-]*(\.[A-Za-z0-9_-]+)*$')
+
+
+# ==============================================================================
+# IN-MEMORY THEME CACHE
+# ==============================================================================
+
+class ThemeCache:
+    """
+    Compiled theme CSS held in memory, keyed by domain
+
+    Each lookup stats the file and reloads only when its mtime/size changed,
+    so themes recompiled by another process are picked up without restarts.
+    """
+
+    def __init__(self, domains_dir=DEFAULT_DOMAINS_DIR):
+        self.domains_dir = Path(domains_dir)
+        self._documents: Dict[str, Tuple[Tuple[int, int], Document]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def path(self, domain: str) -> Optional[Path]:
+        if not DOMAIN_PATTERN.match(domain):
+            return None
+        return self.domains_dir / domain / f'theme-{domain}.css'
+
+    def get(self, domain: str) -> Optional[Document]:
+        path = self.path(domain)
+        if path is None:
+            return None
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._documents.pop(domain, None)
+            return None
+
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._documents.get(domain)
+            if entry and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+        return self._store(domain, path.read_text(), stat)
+
+    def put(self, domain: str, css: str) -> Optional[Document]:
+        """Prime the cache right after compiling (skips the re-read)"""
+        path = self.path(domain)
+        if path is None or not path.exists():
+            return None
+        return self._store(domain, css, path.stat())
+
+    def _store(self, domain: str, css: str, stat) -> Document:
+        document = make_document(
+            [css],
+            last_modified=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            mimetype='text/css',
+        )
+        with self._lock:
+            self.loads += 1
+            self._documents[domain] = ((stat.st_mtime_ns, stat.st_size), document)
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        return {'themes': len(self._documents), 'hits': self.hits, 'loads': self.loads}
+
+
+_caches: Dict[Path, ThemeCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_theme_cache(domains_dir=DEFAULT_DOMAINS_DIR) -> ThemeCache:
+    """One cache per domains directory"""
+    key = Path(domains_dir).resolve()
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ThemeCache(key)
+        return _caches[key]
+
+
+def theme_url(domain: str, domains_dir=DEFAULT_DOMAINS_DIR) -> str:
+    """Versioned theme URL: /theme-soulfra.css?v=<content hash>"""
+    document = get_theme_cache(domains_dir).get(domain)
+    if document is None:
+        return f'/theme-{domain}.css'
+    return f'/theme-{domain}.css?v={document.etag[:VERSION_LENGTH]}'
+
+
+def respond_theme(document: Optional[Document], version: Optional[str] = None):
+    """
+    Theme CSS response with ETag/304 handling. A request carrying the current
+    ?v= hash is cacheable forever; anything else revalidates.
+    """
+    response = respond(document, 'text/css')
+    if version and version == document.etag[:VERSION_LENGTH]:
+        response.cache_control.max_age = THEME_MAX_AGE
+        response.cache_control.immutable = True
+    return response
+
 
 class ThemeCompiler:
     """Compiles brand configs into universal CSS themes"""
@@ -270,13 +384,20 @@ class ThemeCompiler:
         # Generate CSS
         css = self.generate_css(domain, colors)
 
-        # Save to domain directory
+        # Save to domain directory (untouched if the CSS is identical, so
+        # the served ETag and file mtime only move on real changes)
         output_path = self.output_dir / domain / f'theme-{domain}.css'
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(css)
-
-        print(f"   ✅ Generated: {output_path}")
-        print(f"   Size: {len(css)} bytes")
+        cache = get_theme_cache(self.output_dir)
+        current = cache.get(domain)
+        written = current is None or current.body != css.encode('utf-8')
+        if written and write_document(output_path, [css]):
+            cache.put(domain, css)
+
+        if written:
+            print(f"   ✅ Generated: {output_path}")
+            print(f"   Size: {len(css)} bytes")
+        else:
+            print(f"   ✅ Unchanged: {output_path}")
 
         return output_path
 
@@ -349,26 +349,8 @@ class TierProgression:
         if not github_username:
             return 0
 
-        # List of Soulfra network repos
-        network_repos = [
-            {'owner': 'soulfra', 'repo': 'soulfra'},
-            {'owner': 'soulfra', 'repo': 'deathtodata'},
-            {'owner': 'soulfra', 'repo': 'calriven'},
-            {'owner': 'soulfra', 'repo': 'howtocookathome'},
-            {'owner': 'soulfra', 'repo': 'stpetepros'},
-        ]
-
-        stars_count = 0
-
-        for repo in network_repos:
-            result = self.star_validator.check_star(
-                github_username,
-                repo['owner'],
-                repo['repo']
-            )
-            if result['has_starred']:
-                stars_count += 1
-
+        # Local lookups against github_cache; GitHub is only hit on a cold miss
+        stars_count, _ = self.star_validator.cache.network_stars(github_username)
         return stars_count
 
 
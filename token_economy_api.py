@@ -3,11 +3,17 @@ Token Economy API
 
 Manages time tokens/coins that users earn and spend to extend draft timers.
 Part of the "Chat → Yap → Ideate → Lock In" pipeline.
+
+Balances live in the double-entry ledger (ledger.py): earning and spending
+are postings against the token issuer, balance reads are O(1) snapshot
+lookups, and the leaderboard reads running totals instead of summing history.
 """
 
 from flask import Blueprint, jsonify, request
 import sqlite3
-from datetime import datetime, timedelta
+
+import ledger
+from database import get_db
 
 token_economy_bp = Blueprint('token_economy', __name__)
 
@@ -27,18 +33,22 @@ TOKEN_COSTS = {
     'priority_publish': 30  # Skip timer and publish immediately
 }
 
+# Ledger accounts: user balances are ('user', id, 'TOKEN'); the issuer mints
+# earned tokens and takes spent ones back
+TOKEN_CURRENCY = 'TOKEN'
+TOKEN_ISSUER = ('system', 0, TOKEN_CURRENCY)
+STARTING_BALANCE = 15
+
 def get_db_connection():
     """Get database connection with Row factory"""
-    conn = sqlite3.connect('soulfra.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    return get_db()
 
 def init_token_tables():
-    """Initialize token economy tables"""
+    """Initialize legacy token tables (balances now live in the ledger)"""
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # User tokens balance
+    # User tokens balance (pre-ledger; imported once per user by _ensure_account)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS user_tokens (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -51,7 +61,7 @@ def init_token_tables():
         )
     ''')
 
-    # Token transaction history
+    # Token transaction history (pre-ledger)
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS token_transactions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -67,45 +77,56 @@ def init_token_tables():
     conn.commit()
     conn.close()
 
-@token_economy_bp.route('/api/tokens/balance/<int:user_id>', methods=['GET'])
-def get_token_balance(user_id):
-    """Get user's current token balance"""
-    try:
-        init_token_tables()
-        conn = get_db_connection()
-        cursor = conn.cursor()
+def _account(user_id):
+    return ('user', int(user_id), TOKEN_CURRENCY)
 
-        cursor.execute('''
-            SELECT * FROM user_tokens
-            WHERE user_id = ?
-        ''', (user_id,))
+def _ensure_account(user_id, starting_balance=STARTING_BALANCE):
+    """
+    Ledger account for user, opened on first use
 
-        balance_row = cursor.fetchone()
+    Users with a pre-ledger user_tokens row get an opening posting that
+    reproduces their earned/spent totals; new users get the starting balance.
+    """
+    account = ledger.get_account(_account(user_id))
+    if account:
+        return account
 
-        if not balance_row:
-            # Initialize balance for new user
-            cursor.execute('''
-                INSERT INTO user_tokens (user_id, token_balance, lifetime_earned, lifetime_spent, last_updated)
-                VALUES (?, 15, 15, 0, ?)
-            ''', (user_id, datetime.utcnow().isoformat()))
-            conn.commit()
+    conn = get_db_connection()
+    try:
+        legacy = conn.execute(
+            'SELECT token_balance, lifetime_earned, lifetime_spent FROM user_tokens WHERE user_id = ?', (user_id,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        legacy = None
+    conn.close()
 
-            return jsonify({
-                'success': True,
-                'user_id': user_id,
-                'token_balance': 15,  # Starting balance
-                'lifetime_earned': 15,
-                'lifetime_spent': 0
-            })
+    if legacy:
+        earned, spent = legacy['lifetime_earned'], legacy['lifetime_spent']
+        # Any drift between the stored balance and earned - spent is posted as its own leg
+        drift = legacy['token_balance'] - (earned - spent)
+        legs = [(TOKEN_ISSUER, -earned), (_account(user_id), earned),
+                (_account(user_id), -spent), (TOKEN_ISSUER, spent),
+                (_account(user_id), drift), (TOKEN_ISSUER, -drift)]
+        ledger.post(legs, kind='opening_balance', memo='user_tokens import',
+                    idempotency_key=f'tokens:opening:{user_id}')
+    elif starting_balance:
+        ledger.transfer(TOKEN_ISSUER, _account(user_id), starting_balance, kind='starting_balance',
+                        idempotency_key=f'tokens:opening:{user_id}')
+
+    return ledger.get_account(_account(user_id)) or {'balance': 0, 'lifetime_credit': 0, 'lifetime_debit': 0}
 
-        conn.close()
+@token_economy_bp.route('/api/tokens/balance/<int:user_id>', methods=['GET'])
+def get_token_balance(user_id):
+    """Get user's current token balance"""
+    try:
+        account = _ensure_account(user_id)
 
         return jsonify({
             'success': True,
             'user_id': user_id,
-            'token_balance': balance_row['token_balance'],
-            'lifetime_earned': balance_row['lifetime_earned'],
-            'lifetime_spent': balance_row['lifetime_spent']
+            'token_balance': account['balance'],
+            'lifetime_earned': account['lifetime_credit'],
+            'lifetime_spent': account['lifetime_debit']
         })
 
     except Exception as e:
@@ -113,7 +134,7 @@ def get_token_balance(user_id):
 
 @token_economy_bp.route('/api/tokens/earn', methods=['POST'])
 def earn_tokens():
-    """Earn tokens for an action"""
+    """Earn tokens for an action (pass idempotency_key to make retries safe)"""
     try:
         data = request.get_json()
         user_id = data.get('user_id')
@@ -127,44 +148,19 @@ def earn_tokens():
 
         tokens_earned = TOKEN_RATES[action]
 
-        init_token_tables()
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Get or create user balance
-        cursor.execute('SELECT * FROM user_tokens WHERE user_id = ?', (user_id,))
-        balance_row = cursor.fetchone()
-
-        if not balance_row:
-            cursor.execute('''
-                INSERT INTO user_tokens (user_id, token_balance, lifetime_earned, lifetime_spent, last_updated)
-                VALUES (?, ?, ?, 0, ?)
-            ''', (user_id, tokens_earned, tokens_earned, datetime.utcnow().isoformat()))
-        else:
-            new_balance = balance_row['token_balance'] + tokens_earned
-            new_lifetime = balance_row['lifetime_earned'] + tokens_earned
-
-            cursor.execute('''
-                UPDATE user_tokens
-                SET token_balance = ?, lifetime_earned = ?, last_updated = ?
-                WHERE user_id = ?
-            ''', (new_balance, new_lifetime, datetime.utcnow().isoformat(), user_id))
-
-        # Log transaction
-        cursor.execute('''
-            INSERT INTO token_transactions (user_id, transaction_type, amount, reason, created_at)
-            VALUES (?, 'earn', ?, ?, ?)
-        ''', (user_id, tokens_earned, action, datetime.utcnow().isoformat()))
-
-        conn.commit()
-        conn.close()
+        # First action opens the account without the starting bonus
+        _ensure_account(user_id, starting_balance=0)
+        key = data.get('idempotency_key')
+        posting = ledger.transfer(TOKEN_ISSUER, _account(user_id), tokens_earned, kind='earn', memo=action,
+                                  idempotency_key=f'tokens:earn:{user_id}:{key}' if key else None)
 
         return jsonify({
             'success': True,
             'user_id': user_id,
             'action': action,
             'tokens_earned': tokens_earned,
-            'new_balance': balance_row['token_balance'] + tokens_earned if balance_row else tokens_earned
+            'new_balance': posting.balance_after(_account(user_id)),
+            'replayed': posting.replayed
         })
 
     except Exception as e:
@@ -172,7 +168,7 @@ def earn_tokens():
 
 @token_economy_bp.route('/api/tokens/spend', methods=['POST'])
 def spend_tokens():
-    """Spend tokens on an action"""
+    """Spend tokens on an action (pass idempotency_key to make retries safe)"""
     try:
         data = request.get_json()
         user_id = data.get('user_id')
@@ -184,53 +180,37 @@ def spend_tokens():
 
         # Determine cost
         if amount:
-            tokens_cost = amount
+            tokens_cost = int(amount)
         elif action in TOKEN_COSTS:
             tokens_cost = TOKEN_COSTS[action]
         else:
             return jsonify({'success': False, 'error': f'Unknown action: {action}'}), 400
 
-        init_token_tables()
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        if tokens_cost <= 0:
+            return jsonify({'success': False, 'error': 'Amount must be positive'}), 400
 
-        # Get user balance
-        cursor.execute('SELECT * FROM user_tokens WHERE user_id = ?', (user_id,))
-        balance_row = cursor.fetchone()
+        _ensure_account(user_id, starting_balance=0)
+        key = data.get('idempotency_key')
 
-        if not balance_row or balance_row['token_balance'] < tokens_cost:
+        # Balance check and deduction are one guarded UPDATE inside the posting
+        try:
+            posting = ledger.transfer(_account(user_id), TOKEN_ISSUER, tokens_cost, kind='spend', memo=action,
+                                      idempotency_key=f'tokens:spend:{user_id}:{key}' if key else None)
+        except ledger.InsufficientFunds as e:
             return jsonify({
                 'success': False,
                 'error': 'Insufficient tokens',
                 'required': tokens_cost,
-                'available': balance_row['token_balance'] if balance_row else 0
+                'available': e.available
             }), 400
 
-        # Deduct tokens
-        new_balance = balance_row['token_balance'] - tokens_cost
-        new_spent = balance_row['lifetime_spent'] + tokens_cost
-
-        cursor.execute('''
-            UPDATE user_tokens
-            SET token_balance = ?, lifetime_spent = ?, last_updated = ?
-            WHERE user_id = ?
-        ''', (new_balance, new_spent, datetime.utcnow().isoformat(), user_id))
-
-        # Log transaction
-        cursor.execute('''
-            INSERT INTO token_transactions (user_id, transaction_type, amount, reason, created_at)
-            VALUES (?, 'spend', ?, ?, ?)
-        ''', (user_id, -tokens_cost, action, datetime.utcnow().isoformat()))
-
-        conn.commit()
-        conn.close()
-
         return jsonify({
             'success': True,
             'user_id': user_id,
             'action': action,
             'tokens_spent': tokens_cost,
-            'new_balance': new_balance
+            'new_balance': posting.balance_after(_account(user_id)),
+            'replayed': posting.replayed
         })
 
     except Exception as e:
@@ -240,31 +220,19 @@ def spend_tokens():
 def get_transactions(user_id):
     """Get user's token transaction history"""
     try:
-        init_token_tables()
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
         limit = request.args.get('limit', 50, type=int)
-
-        cursor.execute('''
-            SELECT * FROM token_transactions
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (user_id, limit))
-
-        transactions = cursor.fetchall()
-        conn.close()
+        entries = ledger.get_entries(_account(user_id), limit=limit)
 
         return jsonify({
             'success': True,
             'transactions': [{
-                'id': t['id'],
-                'type': t['transaction_type'],
-                'amount': t['amount'],
-                'reason': t['reason'],
-                'created_at': t['created_at']
-            } for t in transactions]
+                'id': e['id'],
+                'type': 'earn' if e['amount'] > 0 else 'spend',
+                'amount': e['amount'],
+                'reason': e['memo'] or e['kind'],
+                'balance_after': e['balance_after'],
+                'created_at': e['created_at']
+            } for e in entries]
         })
 
     except Exception as e:
@@ -272,30 +240,27 @@ def get_transactions(user_id):
 
 @token_economy_bp.route('/api/tokens/leaderboard', methods=['GET'])
 def token_leaderboard():
-    """Get top token earners"""
+    """Get top token earners (read from running totals, not transaction history)"""
     try:
-        init_token_tables()
+        # Joined so accounts without a users row (earn accepts any user_id) don't take places
         conn = get_db_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT u.username, ut.token_balance, ut.lifetime_earned
-            FROM user_tokens ut
-            JOIN users u ON ut.user_id = u.id
-            ORDER BY ut.lifetime_earned DESC
+        top = conn.execute('''
+            SELECT u.username, a.balance, a.lifetime_credit
+            FROM ledger_accounts a
+            JOIN users u ON u.id = a.owner_id
+            WHERE a.currency = ? AND a.owner_type = 'user'
+            ORDER BY a.lifetime_credit DESC
             LIMIT 10
-        ''')
-
-        leaderboard = cursor.fetchall()
+        ''', (TOKEN_CURRENCY,)).fetchall()
         conn.close()
 
         return jsonify({
             'success': True,
             'leaderboard': [{
                 'username': row['username'],
-                'current_balance': row['token_balance'],
-                'lifetime_earned': row['lifetime_earned']
-            } for row in leaderboard]
+                'current_balance': row['balance'],
+                'lifetime_earned': row['lifetime_credit']
+            } for row in top]
         })
 
     except Exception as e:
@@ -16,9 +16,20 @@ import json
 from datetime import datetime
 from flask import Blueprint, jsonify, request, session, g
 
+from blamechain import verify_message_chain
+
 
 tribunal_bp = Blueprint('tribunal_blamechain', __name__)
 
+# Evidence wording per blamechain verification status (None: no verification ran)
+CHAIN_STATUS_LABELS = {
+    'verified': 'VERIFIED',
+    'legacy': 'UNVERIFIABLE - recorded before exact timestamps were kept (not evidence of tampering)',
+    'checkpoint_mismatch': 'BROKEN - a signed checkpoint no longer matches the history',
+    'tampered': 'BROKEN - history was tampered with',
+    None: 'UNKNOWN - the chain could not be verified',
+}
+
 
 def get_db():
     """Get database connection"""
@@ -100,10 +111,15 @@ class TribunalJudge:
             'suspicion_level': max(0, self._calculate_suspicion(history) - 30)  # More lenient
         }
 
+        # Incremental - replays only versions since the last signed checkpoint
+        verification = verify_message_chain(self.db, message_table, message_id)
+
         return {
             'message_table': message_table,
             'message_id': message_id,
             'total_versions': len(history),
+            'chain_valid': verification['chain_valid'] if verification else None,
+            'chain_status': verification['status'] if verification else None,
             'analyses': analyses,
             'consensus': self._calculate_consensus(analyses)
         }
@@ -287,6 +303,7 @@ def submit_to_tribunal_with_edits():
             f"Accusation: {accusation}",
             f"",
             f"=== EDIT HISTORY ({len(history)} versions) ===",
+            f"Blamechain integrity: {CHAIN_STATUS_LABELS[analysis['chain_status']]}",
         ]
 
         for h in history:
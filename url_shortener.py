@@ -241,7 +241,7 @@ def generate_marketing_qr(username, base_url=None):
     - Can track clicks
     - Perfect for print/ads
     """
-    import qrcode
+    import qr_service
     from PIL import Image
 
     if base_url is None:
@@ -251,18 +251,8 @@ def generate_marketing_qr(username, base_url=None):
     # Generate short URL
     short_url = generate_short_url(username, base_url)
 
-    # Create QR code
-    qr = qrcode.QRCode(
-        version=None,  # Auto-size
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-
-    qr.add_data(short_url)
-    qr.make(fit=True)
-
-    img = qr.make_image(fill_color="black", back_color="white")
+    # Create QR code (auto-sized, from the shared matrix cache)
+    img = qr_service.render(short_url, ecc='M')
 
     # Resize to standard size
     img = img.resize((256, 256), Image.NEAREST)
@@ -13,12 +13,16 @@ from urllib.parse import urlparse
 import requests
 from typing import List, Dict, Set
 
+from crawler import Crawler
+
 class LinkValidator:
     def __init__(self, root_dir: str = "."):
         self.root_dir = Path(root_dir)
         self.errors: List[Dict] = []
         self.warnings: List[Dict] = []
         self.checked_urls: Set[str] = set()
+        self.pending_urls: List[tuple] = []      # (url, file, link_type), checked together at the end
+        self.crawler = Crawler(cache=False, timeout=5)
 
     def validate_all(self):
         """Validate all links in the project"""
@@ -39,6 +43,7 @@ class LinkValidator:
             if ".git" not in str(json_file) and "node_modules" not in str(json_file):
                 self._check_json_file(json_file)
 
+        self._check_external_urls()
         self._print_report()
 
     def _check_html_file(self, file_path: Path):
@@ -138,7 +143,7 @@ class LinkValidator:
             })
 
     def _validate_external_url(self, url: str, file_path: Path, link_type: str):
-        """Validate an external URL (cached)"""
+        """Queue an external URL for the concurrent check (each URL once)"""
         # Skip localhost URLs
         if 'localhost' in url or '127.0.0.1' in url or '192.168' in url:
             return
@@ -148,10 +153,22 @@ class LinkValidator:
             return
 
         self.checked_urls.add(url)
+        self.pending_urls.append((url, file_path, link_type))
+
+    def _check_external_urls(self):
+        """HEAD every collected external URL concurrently (per-host politeness in the crawler)"""
+        if not self.pending_urls:
+            return
+        print(f"🌐 Checking {len(self.pending_urls)} external URLs...")
+        self.crawler.prefetch([('HEAD', url) for url, _, _ in self.pending_urls])
+        for url, file_path, link_type in self.pending_urls:
+            self._check_external_response(url, file_path, link_type)
+        print(self.crawler.report())
 
+    def _check_external_response(self, url: str, file_path: Path, link_type: str):
         try:
             # HEAD request to check if URL exists
-            response = requests.head(url, timeout=5, allow_redirects=True)
+            response = self.crawler.request('HEAD', url)
 
             if response.status_code >= 400:
                 self.errors.append({
@@ -12,16 +12,15 @@ Uses owned domains for vanity URLs.
 """
 
 import io
+import os
 import hashlib
-import qrcode
-from qrcode.image.styledpil import StyledPilImage
-from qrcode.image.styles.moduledrawers import RoundedModuleDrawer, CircleModuleDrawer, GappedSquareModuleDrawer
-from qrcode.image.styles.colormasks import SolidFillColorMask
 from PIL import Image, ImageDraw, ImageFont
 from typing import Optional, Dict, Tuple
 from datetime import datetime
 import sqlite3
 
+import qr_service
+
 
 # =============================================================================
 # Brand Domain Configuration
@@ -173,12 +172,9 @@ def calculate_qr_version(data: str, error_correction: str = 'H') -> int:
     """
     Calculate optimal QR code version based on data size
 
-    QR Code Capacity (approximate):
-    - V1 (21x21): ~25 bytes (ERROR_CORRECT_H)
-    - V5 (37x37): ~350 bytes (ERROR_CORRECT_M)
-    - V10 (57x57): ~1,700 bytes (ERROR_CORRECT_M)
-    - V20 (97x97): ~3,700 bytes (ERROR_CORRECT_M)
-    - V40 (177x177): ~4,296 bytes (ERROR_CORRECT_L)
+    The smallest version that holds the data at this error correction
+    level (V1 = 21x21 ... V40 = 177x177), taken from the memoized
+    encoding in qr_service, which generate_branded_qr then reuses.
 
     Args:
         data: Data to encode
@@ -187,45 +183,15 @@ def calculate_qr_version(data: str, error_correction: str = 'H') -> int:
     Returns:
         QR code version (1-40)
     """
-    data_size = len(data.encode('utf-8'))
-
-    # Capacity estimates with error correction factored in
-    if error_correction == 'H':
-        # High error correction (30% recovery)
-        if data_size <= 25:
-            return 1
-        elif data_size <= 200:
-            return 5
-        elif data_size <= 800:
-            return 10
-        elif data_size <= 1800:
-            return 20
-        else:
-            return 40
-    elif error_correction == 'M':
-        # Medium error correction (15% recovery) - most common for business docs
-        if data_size <= 25:
-            return 1
-        elif data_size <= 350:
-            return 5
-        elif data_size <= 1700:
-            return 10
-        elif data_size <= 3700:
-            return 20
-        else:
-            return 40
-    else:
-        # Low error correction (7% recovery) - maximum capacity
-        if data_size <= 25:
-            return 1
-        elif data_size <= 500:
-            return 5
-        elif data_size <= 2000:
-            return 10
-        elif data_size <= 4000:
-            return 20
-        else:
-            return 40
+    return qr_service.best_version(data, error_correction)
+
+
+# Brand style -> qr_service module style
+QR_STYLES = {
+    'rounded': 'rounded',
+    'circles': 'circles',
+    'minimal': 'gapped',
+}
 
 
 def generate_branded_qr(
@@ -257,48 +223,31 @@ def generate_branded_qr(
     colors = brand_config['colors']
     style = brand_config['style']
 
-    # Auto-calculate QR version if not specified
-    if qr_version is None:
-        error_correction_level = 'H' if embed_logo else 'M'
-        qr_version = calculate_qr_version(url, error_correction_level)
-
-    # Create QR code with dynamic version
-    qr = qrcode.QRCode(
-        version=qr_version,  # DYNAMIC VERSION - supports V1 to V40
-        error_correction=qrcode.constants.ERROR_CORRECT_H if embed_logo else qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-
-    qr.add_data(url)
-    qr.make(fit=True)
-
-    # Choose module drawer based on style
-    if style == 'rounded':
-        module_drawer = RoundedModuleDrawer()
-    elif style == 'circles':
-        module_drawer = CircleModuleDrawer()
-    else:  # minimal
-        module_drawer = GappedSquareModuleDrawer()
-
-    # Color mask
-    color_mask = SolidFillColorMask(
-        back_color=(255, 255, 255),  # White background
-        front_color=hex_to_rgb(colors['primary'])  # Brand primary color
+    error_correction_level = 'H' if embed_logo else 'M'
+    use_logo = bool(embed_logo and logo_path)
+    logo_mtime = os.path.getmtime(logo_path) if use_logo and os.path.exists(logo_path) else None
+    cache_key = ('branded', url, brand_slug, size, embed_logo, logo_path, logo_mtime, qr_version)
+
+    return qr_service.remember(cache_key, lambda: _render_branded_qr(
+        url, size, colors['primary'], style, error_correction_level,
+        logo_path if use_logo else None, qr_version
+    ))
+
+
+def _render_branded_qr(url: str, size: int, color: str, style: str, error_correction_level: str,
+                       logo_path: Optional[str], qr_version: Optional[int]) -> bytes:
+    """Styled QR from the shared matrix cache, with optional center logo"""
+    img = qr_service.render(
+        url,
+        ecc=error_correction_level,
+        version=qr_version,  # Minimum version; grows to fit (V1 to V40)
+        style=QR_STYLES.get(style, 'gapped'),
+        fill=hex_to_rgb(color),  # Brand primary color on white
+        size=size
     )
 
-    # Generate styled QR code
-    img = qr.make_image(
-        image_factory=StyledPilImage,
-        module_drawer=module_drawer,
-        color_mask=color_mask
-    )
-
-    # Resize to target size
-    img = img.resize((size, size), Image.LANCZOS)
-
     # Embed logo if requested
-    if embed_logo and logo_path:
+    if logo_path:
         try:
             logo = Image.open(logo_path)
 
@@ -324,10 +273,7 @@ def generate_branded_qr(
         except Exception as e:
             print(f"Warning: Could not embed logo: {e}")
 
-    # Convert to bytes
-    output = io.BytesIO()
-    img.save(output, format='PNG')
-    return output.getvalue()
+    return qr_service.to_png(img)
 
 
 def generate_vanity_qr_with_label(
@@ -8,12 +8,34 @@ Provides:
 - IV (initialization vector) management
 - Base64 encoding for QR code embedding
 - Secure key derivation from QR data
+- Segmented format for streaming encryption and random-access playback
 
 Security:
 - AES-256-GCM (authenticated encryption)
 - Random 256-bit keys
 - Unique IV per encryption
 - PBKDF2 key derivation
+
+Performance:
+- AES-GCM contexts are cached per key (get_aead), so repeated
+  encrypt/decrypt calls with the same key skip key setup
+- Passphrase-derived keys are cached for DERIVED_KEY_TTL seconds per
+  (passphrase, salt), keyed by a hash - PBKDF2 runs once per unlock
+  instead of on every request
+- Segmented memos (SegmentedMemo) are encrypted and decrypted one
+  SEGMENT_SIZE piece at a time: memory per memo is one segment, and a seek
+  only decrypts the segments it touches
+
+Segmented format:
+    header    magic 'SFVS' | version | segment size | plaintext size |
+              segment count | 7-byte nonce prefix              (28 bytes)
+    segments  AES-GCM(segment i) + 16-byte tag, i = 0..count-1
+
+Segments are fixed-size (only the last is shorter), so segment i starts at
+HEADER + i * (segment size + 16) - the header is the index. Each segment's
+nonce is nonce prefix | i | last-segment flag and the header is its
+associated data, so segments cannot be reordered, dropped, truncated or
+moved between memos without failing authentication.
 """
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
@@ -22,8 +44,23 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import os
 import base64
+import hashlib
 import secrets
-from typing import Tuple, Dict
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional, Tuple
+
+PBKDF2_ITERATIONS = 100000
+DERIVED_KEY_TTL = 300           # Seconds a passphrase-derived key stays cached
+MAX_CACHED_KEYS = 256           # AEAD contexts / derived keys kept in memory
+SEGMENT_SIZE = 64 * 1024        # Plaintext bytes per segment (segmented format)
+
+SEGMENT_MAGIC = b'SFVS'
+SEGMENT_VERSION = 1
+SEGMENT_HEADER = struct.Struct('>4sBIQI7s')
+TAG_SIZE = 16
 
 
 def generate_encryption_key() -> bytes:
@@ -46,6 +83,42 @@ def generate_iv() -> bytes:
     return os.urandom(12)
 
 
+_aead_cache: "OrderedDict[bytes, AESGCM]" = OrderedDict()
+_derived_keys: "OrderedDict[bytes, Tuple[bytes, float]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_aead(key: bytes) -> AESGCM:
+    """
+    AES-GCM context for a key, reused across calls (LRU of MAX_CACHED_KEYS)
+
+    Args:
+        key: 16/24/32-byte key
+
+    Returns:
+        AESGCM instance (thread-safe for encrypt/decrypt)
+    """
+    with _cache_lock:
+        aead = _aead_cache.get(key)
+        if aead is not None:
+            _aead_cache.move_to_end(key)
+            return aead
+
+    aead = AESGCM(key)
+    with _cache_lock:
+        _aead_cache[key] = aead
+        while len(_aead_cache) > MAX_CACHED_KEYS:
+            _aead_cache.popitem(last=False)
+    return aead
+
+
+def clear_key_caches():
+    """Drop cached AEAD contexts and derived keys (e.g. after a key rotation)"""
+    with _cache_lock:
+        _aead_cache.clear()
+        _derived_keys.clear()
+
+
 def encrypt_voice_memo(audio_data: bytes, key: bytes = None) -> Dict:
     """
     Encrypt audio data using AES-256-GCM
@@ -67,8 +140,8 @@ def encrypt_voice_memo(audio_data: bytes, key: bytes = None) -> Dict:
 
     iv = generate_iv()
 
-    # Create AES-GCM cipher
-    aesgcm = AESGCM(key)
+    # AES-GCM cipher (cached per key)
+    aesgcm = get_aead(key)
 
     # Encrypt (includes authentication tag)
     encrypted = aesgcm.encrypt(iv, audio_data, None)
@@ -97,7 +170,7 @@ def decrypt_voice_memo(encrypted_data: bytes, key: bytes, iv: bytes) -> bytes:
     Raises:
         Exception: If decryption fails (wrong key, corrupted data, etc.)
     """
-    aesgcm = AESGCM(key)
+    aesgcm = get_aead(key)
 
     try:
         decrypted = aesgcm.decrypt(iv, encrypted_data, None)
@@ -147,20 +220,37 @@ def derive_key_from_passphrase(passphrase: str, salt: bytes = None) -> Tuple[byt
 
     Returns:
         Tuple of (key, salt)
+
+    Keys derived for a given (passphrase, salt) are cached for
+    DERIVED_KEY_TTL seconds, so unlocking the same memo again skips PBKDF2.
     """
     if salt is None:
         salt = os.urandom(16)
 
+    # Cache key is a hash: the passphrase itself is never kept
+    cache_key = hashlib.sha256(salt + b'\0' + passphrase.encode('utf-8')).digest()
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _derived_keys.get(cache_key)
+        if cached and cached[1] > now:
+            _derived_keys.move_to_end(cache_key)
+            return cached[0], salt
+
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
-        iterations=100000,
+        iterations=PBKDF2_ITERATIONS,
         backend=default_backend()
     )
 
     key = kdf.derive(passphrase.encode('utf-8'))
 
+    with _cache_lock:
+        _derived_keys[cache_key] = (key, now + DERIVED_KEY_TTL)
+        while len(_derived_keys) > MAX_CACHED_KEYS:
+            _derived_keys.popitem(last=False)
+
     return key, salt
 
 
@@ -268,12 +358,199 @@ def verify_access_key(key: bytes, key_hash: str) -> bool:
     return computed_hash == key_hash
 
 
+# ==============================================================================
+# SEGMENTED (STREAMING) FORMAT
+# ==============================================================================
+
+def is_segmented(data: bytes) -> bool:
+    """True if data starts with a segmented-format header"""
+    return len(data) >= SEGMENT_HEADER.size and data[:5] == SEGMENT_MAGIC + bytes([SEGMENT_VERSION])
+
+
+def segmented_size(plaintext_size: int, segment_size: int = SEGMENT_SIZE) -> int:
+    """Bytes of header + encrypted segments for a plaintext of this size"""
+    segments = max(1, -(-plaintext_size // segment_size))
+    return SEGMENT_HEADER.size + plaintext_size + segments * TAG_SIZE
+
+
+class SegmentedMemo:
+    """
+    Header and per-segment AES-256-GCM for one segmented memo
+
+    Encrypt:
+        memo = SegmentedMemo.new(size)
+        out.write(memo.header)
+        for segment in memo.encrypt_stream(src):
+            out.write(segment)
+
+    Decrypt bytes [start, stop) of a container file:
+        memo = SegmentedMemo(key, f.read(SEGMENT_HEADER.size))
+        for chunk in memo.read_range(f, start, stop):
+            ...
+    """
+
+    def __init__(self, key: bytes, header: bytes):
+        """
+        Raises:
+            ValueError: Not a segmented header, or an unsupported version
+        """
+        if not is_segmented(header):
+            raise ValueError("Not a segmented voice memo")
+        header = bytes(header[:SEGMENT_HEADER.size])
+        _, _, self.segment_size, self.size, self.segments, self.nonce_prefix = SEGMENT_HEADER.unpack(header)
+        if not self.segment_size or self.segments != max(1, -(-self.size // self.segment_size)):
+            raise ValueError("Corrupted segmented voice memo header")
+        self.key = key
+        self.header = header
+        self._aead = get_aead(key)
+
+    @classmethod
+    def new(cls, plaintext_size: int, key: bytes = None, segment_size: int = SEGMENT_SIZE) -> 'SegmentedMemo':
+        """Fresh header (random nonce prefix) for a plaintext of known size"""
+        segments = max(1, -(-plaintext_size // segment_size))
+        header = SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION, segment_size, plaintext_size,
+                                     segments, os.urandom(7))
+        return cls(key or generate_encryption_key(), header)
+
+    @property
+    def key_b64(self) -> str:
+        return base64.urlsafe_b64encode(self.key).decode('utf-8')
+
+    @property
+    def iv_b64(self) -> str:
+        """Nonce prefix, stored where whole-file memos keep their IV"""
+        return base64.urlsafe_b64encode(self.nonce_prefix).decode('utf-8')
+
+    @property
+    def encrypted_size(self) -> int:
+        return segmented_size(self.size, self.segment_size)
+
+    def _nonce(self, index: int) -> bytes:
+        return self.nonce_prefix + struct.pack('>I?', index, index == self.segments - 1)
+
+    def segment_offset(self, index: int) -> int:
+        """Position of encrypted segment `index` in a container file"""
+        return SEGMENT_HEADER.size + index * (self.segment_size + TAG_SIZE)
+
+    def segment_range(self, start: int = 0, stop: Optional[int] = None) -> range:
+        """Indexes of the segments holding plaintext bytes [start, stop)"""
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return range(0) if self.size else range(1)
+        return range(start // self.segment_size, (stop - 1) // self.segment_size + 1)
+
+    def encrypt_segment(self, index: int, plaintext: bytes) -> bytes:
+        return self._aead.encrypt(self._nonce(index), plaintext, self.header)
+
+    def decrypt_segment(self, index: int, encrypted: bytes) -> bytes:
+        """
+        Raises:
+            ValueError: Wrong key, or the segment was altered, moved or truncated
+        """
+        try:
+            return self._aead.decrypt(self._nonce(index), bytes(encrypted), self.header)
+        except Exception:
+            raise ValueError(f"Decryption failed: segment {index} is corrupted or the key is wrong")
+
+    def encrypt_stream(self, src: BinaryIO) -> Iterator[bytes]:
+        """
+        Read the plaintext from src one segment at a time and yield encrypted segments
+
+        Raises:
+            ValueError: src holds more or fewer bytes than the header declares
+        """
+        for index in range(self.segments):
+            want = min(self.segment_size, self.size - index * self.segment_size)
+            plaintext = _read_exactly(src, want)
+            if len(plaintext) != want:
+                raise ValueError(f"Stream ended early: expected {self.size} bytes")
+            yield self.encrypt_segment(index, plaintext)
+        if src.read(1):
+            raise ValueError(f"Stream is longer than {self.size} bytes")
+
+    def decrypt_range(self, segments: Iterable[bytes], start: int = 0,
+                      stop: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Plaintext bytes [start, stop), given the encrypted segments of
+        segment_range(start, stop) in order
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        segments = iter(segments)
+        for index in self.segment_range(start, stop):
+            encrypted = next(segments, None)
+            if encrypted is None:
+                raise ValueError(f"Segment {index} is missing")
+            plaintext = self.decrypt_segment(index, encrypted)
+            offset = index * self.segment_size
+            chunk = plaintext[max(start - offset, 0):stop - offset]
+            if chunk:
+                yield chunk
+
+    def read_range(self, f: BinaryIO, start: int = 0, stop: Optional[int] = None) -> Iterator[bytes]:
+        """Plaintext bytes [start, stop) of a container file (seeks straight to the first segment)"""
+        def segments():
+            for index in self.segment_range(start, stop):
+                f.seek(self.segment_offset(index))
+                yield _read_exactly(f, self._encrypted_length(index))
+
+        return self.decrypt_range(segments(), start, stop)
+
+    def _encrypted_length(self, index: int) -> int:
+        return min(self.segment_size, self.size - index * self.segment_size) + TAG_SIZE
+
+
+def _read_exactly(f: BinaryIO, size: int) -> bytes:
+    """Read size bytes (fewer only at end of stream) from a file or upload stream"""
+    parts = []
+    while size > 0:
+        part = f.read(size)
+        if not part:
+            break
+        parts.append(part)
+        size -= len(part)
+    return b''.join(parts)
+
+
+def stream_size(f: BinaryIO) -> int:
+    """Bytes left in a seekable stream (uploads, files), leaving the position unchanged"""
+    position = f.tell()
+    end = f.seek(0, os.SEEK_END)
+    f.seek(position)
+    return end - position
+
+
+def encrypt_voice_stream(src: BinaryIO, dst: BinaryIO, key: bytes = None, size: int = None,
+                         segment_size: int = SEGMENT_SIZE) -> Dict:
+    """
+    Encrypt a seekable stream into a segmented container, one segment in memory at a time
+
+    Returns:
+        Dictionary with key, key_b64, iv_b64 (nonce prefix), plaintext_size
+        and encrypted_size
+    """
+    memo = SegmentedMemo.new(stream_size(src) if size is None else size, key, segment_size)
+    dst.write(memo.header)
+    for segment in memo.encrypt_stream(src):
+        dst.write(segment)
+
+    return {
+        'key': memo.key,
+        'key_b64': memo.key_b64,
+        'iv_b64': memo.iv_b64,
+        'plaintext_size': memo.size,
+        'encrypted_size': memo.encrypted_size,
+    }
+
+
 # Convenience functions for common operations
 
 def encrypt_audio_file(file_path: str, output_path: str = None) -> Dict:
     """
     Encrypt an audio file and save encrypted version
 
+    Written in the segmented format, streaming: the file is never fully in
+    memory and the result can be decrypted from any offset.
+
     Args:
         file_path: Path to audio file
         output_path: Optional output path (defaults to file_path + '.encrypted')
@@ -284,16 +561,8 @@ def encrypt_audio_file(file_path: str, output_path: str = None) -> Dict:
     if output_path is None:
         output_path = file_path + '.encrypted'
 
-    # Read audio file
-    with open(file_path, 'rb') as f:
-        audio_data = f.read()
-
-    # Encrypt
-    result = encrypt_voice_memo(audio_data)
-
-    # Write encrypted file
-    with open(output_path, 'wb') as f:
-        f.write(result['encrypted_data'])
+    with open(file_path, 'rb') as src, open(output_path, 'wb') as dst:
+        result = encrypt_voice_stream(src, dst)
 
     return {
         'encrypted_file': output_path,
@@ -318,15 +587,22 @@ def decrypt_audio_file(encrypted_path: str, key_b64: str, iv_b64: str, output_pa
     if output_path is None:
         output_path = encrypted_path.replace('.encrypted', '.decrypted')
 
-    # Read encrypted file
-    with open(encrypted_path, 'rb') as f:
-        encrypted_data = f.read()
-
-    # Decrypt
     key = key_from_base64(key_b64)
-    iv = iv_from_base64(iv_b64)
 
-    decrypted = decrypt_voice_memo(encrypted_data, key, iv)
+    with open(encrypted_path, 'rb') as src:
+        header = src.read(SEGMENT_HEADER.size)
+
+        if is_segmented(header):
+            memo = SegmentedMemo(key, header)
+            with open(output_path, 'wb') as dst:
+                for chunk in memo.read_range(src):
+                    dst.write(chunk)
+            return output_path
+
+        # Whole-file format (written before segmented memos)
+        encrypted_data = header + src.read()
+
+    decrypted = decrypt_voice_memo(encrypted_data, key, iv_from_base64(iv_b64))
 
     # Write decrypted file
     with open(output_path, 'wb') as f:
@@ -334,7 +610,6 @@ def decrypt_audio_file(encrypted_path: str, key_b64: str, iv_b64: str, output_pa
 
     return output_path
 
-
 if __name__ == '__main__':
     print("Voice Memo Encryption Test")
     print("=" * 60)
@@ -8,13 +8,20 @@ Flask routes for federated encrypted voice memos:
 - /api/federation/voice/store - Store encrypted voice memo
 - /api/federation/voice/fetch - Federation endpoint to fetch encrypted memo
 - /api/federation/voice/qr - Generate QR code for voice memo
+
+Uploads are stored in the segmented format: the upload stream is encrypted
+one segment at a time into voice_memo_segments, and playback answers HTTP
+Range requests by decrypting only the segments the range covers. Memos
+stored whole (before segmented storage) still play.
 """
 
 from flask import Blueprint, request, jsonify, render_template_string, send_file, Response
 from database import get_db
 from voice_encryption import (
-    encrypt_voice_memo,
+    SegmentedMemo,
     decrypt_voice_memo,
+    is_segmented,
+    stream_size,
     key_from_base64,
     iv_from_base64,
     create_qr_access_data,
@@ -22,8 +29,10 @@ from voice_encryption import (
     hash_access_key,
     verify_access_key
 )
+from voice_segments import iter_segments, range_response, store_segments
 import qrcode
 from io import BytesIO
+from itertools import chain
 import base64
 import secrets
 from datetime import datetime, timedelta
@@ -54,44 +63,19 @@ def _log_access(memo_id: str, requesting_domain: str, granted: bool, reason: str
     db.commit()
 
 
-@voice_federation_bp.route('/voice/record', methods=['GET', 'POST'])
-def record_voice_memo():
+def _store_voice_memo(audio_file, user_id, access_type, expires_at, default_format):
     """
-    Record a voice memo and encrypt it
+    Encrypt an upload segment by segment and store it
 
-    GET: Show recording interface
-    POST: Store encrypted voice memo
+    Returns:
+        (memo_id, SegmentedMemo) - memo.key_b64 goes into the QR code
     """
-    if request.method == 'GET':
-        return render_template_string(RECORD_TEMPLATE)
-
-    # POST: Store voice memo
-    if 'audio' not in request.files:
-        return jsonify({'success': False, 'error': 'No audio file uploaded'}), 400
-
-    audio_file = request.files['audio']
-    user_id = request.form.get('user_id', 1)  # TODO: Get from session
-    access_type = request.form.get('access_type', 'qr')
-    expires_hours = int(request.form.get('expires_hours', 0))
-
-    # Read audio data
-    audio_data = audio_file.read()
-
-    # Encrypt audio
-    result = encrypt_voice_memo(audio_data)
-
-    # Generate unique memo ID
     memo_id = secrets.token_urlsafe(16)
-
-    # Calculate expiration
-    expires_at = None
-    if expires_hours > 0:
-        expires_at = datetime.now() + timedelta(hours=expires_hours)
+    memo = SegmentedMemo.new(stream_size(audio_file.stream))
 
     # Hash the access key (don't store the key itself!)
-    key_hash = hash_access_key(result['key'])
+    key_hash = hash_access_key(memo.key)
 
-    # Store in database
     db = get_db()
     db.execute('''
         INSERT INTO voice_memos
@@ -103,20 +87,65 @@ def record_voice_memo():
         memo_id,
         user_id,
         _get_current_domain(),
-        result['encrypted_data'],
-        result['iv_b64'],
+        memo.header,
+        memo.iv_b64,
         key_hash,
         0,  # TODO: Calculate duration from audio
-        len(audio_data),
-        audio_file.content_type or 'audio/webm',
+        memo.size,
+        audio_file.content_type or default_format,
         access_type,
         1,  # federation_shared
         expires_at
     ))
+    store_segments(db, memo_id, memo.encrypt_stream(audio_file.stream))
     db.commit()
+    db.close()
+
+    return memo_id, memo
+
+
+def _memo_reader(memo_id, memo, key):
+    """(plaintext size, read_range(start, stop)) for a segmented or whole-file memo"""
+    if is_segmented(memo['encrypted_audio']):
+        segmented = SegmentedMemo(key, memo['encrypted_audio'])
+        return segmented.size, lambda start, stop: segmented.decrypt_range(
+            iter_segments(memo_id, segmented.segment_range(start, stop)), start, stop)
+
+    # Stored whole: decrypt once, serve slices
+    audio = decrypt_voice_memo(memo['encrypted_audio'], key, iv_from_base64(memo['encryption_iv']))
+    return len(audio), lambda start, stop: iter([audio[start:stop]])
+
+
+@voice_federation_bp.route('/voice/record', methods=['GET', 'POST'])
+def record_voice_memo():
+    """
+    Record a voice memo and encrypt it
+
+    GET: Show recording interface
+    POST: Store encrypted voice memo
+    """
+    if request.method == 'GET':
+        return render_template_string(RECORD_TEMPLATE)
+
+    # POST: Store voice memo
+    if 'audio' not in request.files:
+        return jsonify({'success': False, 'error': 'No audio file uploaded'}), 400
+
+    audio_file = request.files['audio']
+    user_id = request.form.get('user_id', 1)  # TODO: Get from session
+    access_type = request.form.get('access_type', 'qr')
+    expires_hours = int(request.form.get('expires_hours', 0))
+
+    # Calculate expiration
+    expires_at = None
+    if expires_hours > 0:
+        expires_at = datetime.now() + timedelta(hours=expires_hours)
+
+    # Encrypt and store, one segment at a time
+    memo_id, result = _store_voice_memo(audio_file, user_id, access_type, expires_at, 'audio/webm')
 
     # Create QR code data
-    qr_data = create_qr_access_data(memo_id, result['key_b64'], _get_current_domain())
+    qr_data = create_qr_access_data(memo_id, result.key_b64, _get_current_domain())
 
     # Generate QR code image
     qr = qrcode.QRCode(version=1, box_size=10, border=4)
@@ -136,7 +165,7 @@ def record_voice_memo():
         'memo_id': memo_id,
         'qr_data': qr_data,
         'qr_code_image': f'data:image/png;base64,{qr_code_base64}',
-        'play_url': f"{BASE_URL}/voice/{memo_id}?key={result['key_b64']}"
+        'play_url': f"{BASE_URL}/voice/{memo_id}?key={result.key_b64}"
     })
 
 
@@ -146,6 +175,10 @@ def play_voice_memo(memo_id):
     Play a voice memo (requires key in URL or QR scan data)
 
     URL: /voice/{memo_id}?key={base64_key}
+
+    Honours `Range: bytes=...` (206 Partial Content), so players can seek
+    without downloading the memo; only the segments in the range are
+    decrypted. Plays are counted and logged on requests starting at byte 0.
     """
     key_b64 = request.args.get('key')
 
@@ -183,35 +216,38 @@ def play_voice_memo(memo_id):
         _log_access(memo_id, _get_current_domain(), False, 'Invalid key')
         return jsonify({'error': 'Invalid access key'}), 403
 
-    # Decrypt audio
-    try:
-        iv = iv_from_base64(memo['encryption_iv'])
-        decrypted_audio = decrypt_voice_memo(memo['encrypted_audio'], key, iv)
-    except Exception as e:
-        _log_access(memo_id, _get_current_domain(), False, f'Decryption failed: {str(e)}')
-        return jsonify({'error': 'Failed to decrypt audio'}), 500
+    def record_play(start, stop):
+        if start:
+            return
 
-    # Update access count
-    db.execute('''
-        UPDATE voice_memos
-        SET access_count = access_count + 1,
-            last_accessed_at = datetime('now')
-        WHERE id = ?
-    ''', (memo_id,))
-    db.commit()
+        # Update access count
+        db.execute('''
+            UPDATE voice_memos
+            SET access_count = access_count + 1,
+                last_accessed_at = datetime('now')
+            WHERE id = ?
+        ''', (memo_id,))
+        db.commit()
 
-    # Log successful access
-    _log_access(memo_id, _get_current_domain(), True)
+        # Log successful access
+        _log_access(memo_id, _get_current_domain(), True)
 
-    # Return audio file
-    return Response(
-        decrypted_audio,
-        mimetype=memo['audio_format'] or 'audio/webm',
-        headers={
-            'Content-Disposition': f'inline; filename="voice_memo_{memo_id}.webm"',
-            'Cache-Control': 'no-cache'
-        }
-    )
+    # Decrypt audio (the first chunk is decrypted before the response starts)
+    try:
+        size, read_range = _memo_reader(memo_id, memo, key)
+        return range_response(
+            size,
+            read_range,
+            memo['audio_format'] or 'audio/webm',
+            headers={
+                'Content-Disposition': f'inline; filename="voice_memo_{memo_id}.webm"',
+                'Cache-Control': 'no-cache'
+            },
+            on_start=record_play
+        )
+    except ValueError as e:
+        _log_access(memo_id, _get_current_domain(), False, f'Decryption failed: {str(e)}')
+        return jsonify({'error': 'Failed to decrypt audio'}), 500
 
 
 @voice_federation_bp.route('/api/federation/voice/fetch', methods=['POST'])
@@ -227,6 +263,12 @@ def federation_fetch_voice_memo():
     }
 
     Returns encrypted audio + IV for local decryption
+
+    Segmented memos return the whole container (header + segments) in
+    encrypted_audio_b64 with "encryption_format": "segmented". Send
+    "stream": true (or Accept: application/octet-stream) to receive the
+    container as a raw byte stream instead, read from the database a batch
+    of segments at a time; IV and audio format then come in X- headers.
     """
     data = request.get_json()
 
@@ -283,12 +325,29 @@ def federation_fetch_voice_memo():
     # Log successful federation access
     _log_access(memo_id, requesting_domain, True)
 
+    encrypted_audio = memo['encrypted_audio']
+    encryption_format = 'whole'
+    if is_segmented(encrypted_audio):
+        encryption_format = 'segmented'
+        segmented = SegmentedMemo(key, encrypted_audio)
+        container = chain([segmented.header], iter_segments(memo_id, range(segmented.segments)))
+
+        if data.get('stream') is True or 'application/octet-stream' in request.headers.get('Accept', ''):
+            return Response(container, mimetype='application/octet-stream', headers={
+                'Content-Length': str(segmented.encrypted_size),
+                'X-Encryption-Format': encryption_format,
+                'X-Encryption-IV': memo['encryption_iv'],
+                'X-Audio-Format': memo['audio_format'] or 'audio/webm'
+            })
+        encrypted_audio = b''.join(container)
+
     # Return encrypted audio (caller will decrypt locally)
     return jsonify({
         'success': True,
         'memo_id': memo_id,
-        'encrypted_audio_b64': base64.b64encode(memo['encrypted_audio']).decode(),
+        'encrypted_audio_b64': base64.b64encode(encrypted_audio).decode(),
         'encryption_iv': memo['encryption_iv'],
+        'encryption_format': encryption_format,
         'audio_format': memo['audio_format']
     })
 
@@ -362,49 +421,16 @@ def upload_voice_memo():
     access_type = request.form.get('access_type', 'qr')
     expires_hours = int(request.form.get('expires_hours', 0))
 
-    # Read audio data
-    audio_data = audio_file.read()
-
-    # Encrypt audio
-    result = encrypt_voice_memo(audio_data)
-
-    # Generate unique memo ID
-    memo_id = secrets.token_urlsafe(16)
-
     # Calculate expiration
     expires_at = None
     if expires_hours > 0:
         expires_at = datetime.now() + timedelta(hours=expires_hours)
 
-    # Hash the access key
-    key_hash = hash_access_key(result['key'])
-
-    # Store in database
-    db = get_db()
-    db.execute('''
-        INSERT INTO voice_memos
-        (id, user_id, domain, encrypted_audio, encryption_iv, access_key_hash,
-         duration_seconds, file_size_bytes, audio_format, access_type,
-         federation_shared, expires_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        memo_id,
-        user_id,
-        _get_current_domain(),
-        result['encrypted_data'],
-        result['iv_b64'],
-        key_hash,
-        0,
-        len(audio_data),
-        audio_file.content_type or 'audio/m4a',
-        access_type,
-        1,
-        expires_at
-    ))
-    db.commit()
+    # Encrypt and store, one segment at a time
+    memo_id, result = _store_voice_memo(audio_file, user_id, access_type, expires_at, 'audio/m4a')
 
     # Create QR code data
-    qr_data = create_qr_access_data(memo_id, result['key_b64'], _get_current_domain())
+    qr_data = create_qr_access_data(memo_id, result.key_b64, _get_current_domain())
 
     # Generate QR code image
     qr = qrcode.QRCode(version=1, box_size=10, border=4)
@@ -424,7 +450,7 @@ def upload_voice_memo():
         'memo_id': memo_id,
         'qr_data': qr_data,
         'qr_code_image': f'data:image/png;base64,{qr_code_base64}',
-        'play_url': f"{BASE_URL}/voice/{memo_id}?key={result['key_b64']}"
+        'play_url': f"{BASE_URL}/voice/{memo_id}?key={result.key_b64}"
     })
 
 
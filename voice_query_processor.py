@@ -35,6 +35,8 @@ import requests
 import json
 from typing import Dict, List, Optional
 from database import get_db
+from full_text_search import search as full_text_search
+from llm_stream import LLMStream
 import re
 
 
@@ -65,6 +67,37 @@ class VoiceQueryProcessor:
                 'domains_unlocked': [domain names]
             }
         """
+        result, faucet_result = self._analyze(transcription, user_id)
+
+        # Step 6: Generate natural language response
+        result['ai_response'] = self._generate_response(transcription, result['intent'],
+                                                        result['results'], faucet_result)
+        return result
+
+    def process_stream(self, transcription: str, user_id: Optional[int] = None):
+        """
+        Streaming version of process(): search results now, AI response as it generates
+
+        Returns:
+            (result, stream) - result is process() output without
+            'ai_response'; stream is an LLMStream of the response, or None
+            if Ollama is unavailable (result then carries the fallback
+            'ai_response')
+        """
+        result, faucet_result = self._analyze(transcription, user_id)
+        prompt = self._response_prompt(transcription, result['intent'], result['results'], faucet_result)
+
+        try:
+            stream = LLMStream.generate(self._response_payload(prompt), ollama_url=self.ollama_url, timeout=15)
+        except OSError as e:
+            print(f"AI response stream failed: {e}")
+            result['ai_response'] = self._fallback_response(transcription, result['results'])
+            return result, None
+
+        return result, stream
+
+    def _analyze(self, transcription: str, user_id: Optional[int]):
+        """Steps 1-5: intent, keywords, enhanced query, search, faucet"""
         # Step 1: Detect intent
         intent = self._detect_intent(transcription)
 
@@ -80,19 +113,15 @@ class VoiceQueryProcessor:
         # Step 5: Check faucet unlock
         faucet_result = self._check_faucet_unlock(keywords, user_id)
 
-        # Step 6: Generate natural language response
-        ai_response = self._generate_response(transcription, intent, results, faucet_result)
-
         return {
             'intent': intent,
             'original_text': transcription,
             'enhanced_query': enhanced_query,
             'keywords': keywords,
             'results': results,
-            'ai_response': ai_response,
             'faucet_unlocked': faucet_result['unlocked'],
             'domains_unlocked': faucet_result.get('domains', [])
-        }
+        }, faucet_result
 
     def _detect_intent(self, text: str) -> str:
         """
@@ -184,33 +213,20 @@ Search keywords:"""
 
         Returns list of matching content
         """
-        results = []
-
-        # Search posts
-        for keyword in keywords[:5]:  # Top 5 keywords
-            posts = self.db.execute('''
-                SELECT id, title, content, slug, brand, created_at
-                FROM posts
-                WHERE title LIKE ? OR content LIKE ?
-                ORDER BY created_at DESC
-                LIMIT 5
-            ''', (f'%{keyword}%', f'%{keyword}%')).fetchall()
+        # One ranked full-text query for the top 5 keywords (any may match)
+        top_keywords = keywords[:5]
+        posts = full_text_search('posts', ' '.join(top_keywords), limit=10,
+                                 any_term=True, db=self.db)
 
-            for post in posts:
-                result = dict(post)
-                result['type'] = 'post'
-                result['match_keyword'] = keyword
-                results.append(result)
-
-        # Remove duplicates
-        seen_ids = set()
-        unique_results = []
-        for result in results:
-            if result['id'] not in seen_ids:
-                seen_ids.add(result['id'])
-                unique_results.append(result)
+        results = []
+        for post in posts:
+            text = f"{post.get('title') or ''} {post.get('content') or ''}".lower()
+            post['type'] = 'post'
+            post['match_keyword'] = next((kw for kw in top_keywords if kw.lower() in text),
+                                         top_keywords[0] if top_keywords else None)
+            results.append(post)
 
-        return unique_results[:10]  # Top 10 results
+        return results
 
     def _check_faucet_unlock(self, keywords: List[str], user_id: Optional[int]) -> Dict:
         """
@@ -256,36 +272,11 @@ Search keywords:"""
         Returns conversational response
         """
         try:
-            # Build context from results
-            result_summary = ""
-            if results:
-                result_summary = f"\nFound {len(results)} results:\n"
-                for i, result in enumerate(results[:3], 1):
-                    result_summary += f"{i}. {result['title']} (in {result['brand']})\n"
-
-            # Build faucet context
-            faucet_summary = ""
-            if faucet_result['unlocked']:
-                domains = [d['domain'] for d in faucet_result['domains']]
-                faucet_summary = f"\n🎉 You unlocked access to: {', '.join(domains)}"
-
-            # Generate response
-            prompt = f"""You are a helpful voice assistant. Respond naturally to this voice query.
-
-Query: "{transcription}"
-Intent: {intent}
-{result_summary}{faucet_summary}
-
-Provide a concise, conversational response (2-3 sentences):"""
+            prompt = self._response_prompt(transcription, intent, results, faucet_result)
 
             response = requests.post(
                 f'{self.ollama_url}/api/generate',
-                json={
-                    'model': 'llama3.2:latest',
-                    'prompt': prompt,
-                    'stream': False,
-                    'options': {'temperature': 0.7}
-                },
+                json=self._response_payload(prompt),
                 timeout=15
             )
 
@@ -299,6 +290,39 @@ Provide a concise, conversational response (2-3 sentences):"""
             print(f"AI response generation failed: {e}")
             return self._fallback_response(transcription, results)
 
+    def _response_prompt(self, transcription: str, intent: str,
+                         results: List[Dict], faucet_result: Dict) -> str:
+        """Prompt for the conversational answer to a voice query"""
+        # Build context from results
+        result_summary = ""
+        if results:
+            result_summary = f"\nFound {len(results)} results:\n"
+            for i, result in enumerate(results[:3], 1):
+                result_summary += f"{i}. {result['title']} (in {result['brand']})\n"
+
+        # Build faucet context
+        faucet_summary = ""
+        if faucet_result['unlocked']:
+            domains = [d['domain'] for d in faucet_result['domains']]
+            faucet_summary = f"\n🎉 You unlocked access to: {', '.join(domains)}"
+
+        return f"""You are a helpful voice assistant. Respond naturally to this voice query.
+
+Query: "{transcription}"
+Intent: {intent}
+{result_summary}{faucet_summary}
+
+Provide a concise, conversational response (2-3 sentences):"""
+
+    @staticmethod
+    def _response_payload(prompt: str) -> Dict:
+        return {
+            'model': 'llama3.2:latest',
+            'prompt': prompt,
+            'stream': False,
+            'options': {'temperature': 0.7}
+        }
+
     def _fallback_response(self, transcription: str, results: List[Dict]) -> str:
         """Simple fallback response when Ollama unavailable"""
         if results:
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Voice Segments - Segment storage and HTTP Range playback for voice memos
+
+Segmented voice memos (voice_encryption.SegmentedMemo) keep their 28-byte
+header in voice_memos.encrypted_audio and each encrypted segment in its own
+voice_memo_segments row. A SQLite BLOB is a linked list of overflow pages,
+so reaching byte N of one big value reads every page before it; a row per
+segment makes any seek one primary-key lookup, whatever the memo's length.
+
+- store_segments()  executemany() over a generator - an upload is encrypted
+                    and written one segment at a time
+- iter_segments()   encrypted segments by index, fetched SEGMENT_BATCH at a
+                    time so no read lock is held while a slow client drains
+                    the response
+- range_response()  Flask response for a `Range: bytes=...` request: 206 with
+                    Content-Range, 416 when unsatisfiable, plain 200 otherwise
+
+Kept free of crypto imports (like encryption_jobs), so migrations can load
+the schema without cryptography installed.
+
+Usage:
+    memo = SegmentedMemo(key, header)
+    return range_response(memo.size, lambda start, stop: memo.decrypt_range(
+        iter_segments(memo_id, memo.segment_range(start, stop)), start, stop), 'audio/webm')
+"""
+
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from database import get_db
+from schema_registry import register_migration
+
+
+SEGMENT_BATCH = 16              # Segments per query (1 MiB at 64 KiB segments)
+
+
+# ==============================================================================
+# DATABASE SCHEMA
+# ==============================================================================
+
+VOICE_SEGMENTS_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS voice_memo_segments (
+        memo_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (memo_id, seq)
+    )
+    ''',
+]
+register_migration(117, 'voice memo segments', *VOICE_SEGMENTS_SCHEMA, module='voice_segments')
+
+
+# ==============================================================================
+# STORAGE
+# ==============================================================================
+
+def store_segments(db, memo_id: str, segments: Iterable[bytes]) -> int:
+    """
+    Insert a memo's encrypted segments in order (caller commits)
+
+    Returns:
+        Number of segments written
+    """
+    count = 0
+
+    def rows():
+        nonlocal count
+        for seq, data in enumerate(segments):
+            count += 1
+            yield memo_id, seq, data
+
+    db.executemany('INSERT INTO voice_memo_segments (memo_id, seq, data) VALUES (?, ?, ?)', rows())
+    return count
+
+
+def delete_segments(db, memo_id: str):
+    """Remove a memo's segments (caller commits)"""
+    db.execute('DELETE FROM voice_memo_segments WHERE memo_id = ?', (memo_id,))
+
+
+def iter_segments(memo_id: str, indexes: range, batch: int = SEGMENT_BATCH) -> Iterator[bytes]:
+    """
+    Encrypted segments `indexes` of a memo, in order
+
+    Raises:
+        ValueError: A segment row is missing
+    """
+    db = get_db()
+    try:
+        for first in range(indexes.start, indexes.stop, batch):
+            last = min(first + batch, indexes.stop)
+            rows = db.execute('''
+                SELECT seq, data FROM voice_memo_segments
+                WHERE memo_id = ? AND seq >= ? AND seq < ?
+                ORDER BY seq
+            ''', (memo_id, first, last)).fetchall()
+
+            for expected, row in zip(range(first, last), rows + [None] * (last - first - len(rows))):
+                if row is None or row['seq'] != expected:
+                    raise ValueError(f"Segment {expected} of voice memo {memo_id} is missing")
+                yield row['data']
+    finally:
+        db.close()
+
+
+# ==============================================================================
+# HTTP RANGE RESPONSES
+# ==============================================================================
+
+def range_response(size: int, read_range: Callable[[int, int], Iterator[bytes]], mimetype: str,
+                   headers: Optional[Dict] = None, on_start: Optional[Callable[[int, int], None]] = None):
+    """
+    Serve bytes of a memo, honouring a single-range `Range` header
+
+    Args:
+        size: Total plaintext size
+        read_range: read_range(start, stop) -> chunks of bytes [start, stop)
+        mimetype: Content type of the audio
+        headers: Extra response headers
+        on_start: on_start(start, stop) once the first chunk is ready (count
+            plays, log access)
+
+    Multi-range requests get the whole memo (allowed by RFC 9110). The first
+    chunk is produced before the response is returned, so a decryption error
+    raises here and the caller can still answer with an error status.
+    """
+    from flask import Response, request
+
+    start, stop, status = 0, size, 200
+    requested = request.range
+    if requested is not None and len(requested.ranges) == 1:
+        span = requested.range_for_length(size)
+        if span is None:
+            return Response(status=416, headers={'Content-Range': f'bytes */{size}', 'Accept-Ranges': 'bytes'})
+        start, stop, status = span[0], span[1], 206
+
+    chunks = read_range(start, stop)
+    first = next(chunks, b'')
+    if on_start:
+        on_start(start, stop)
+
+    response_headers = dict(headers or {})
+    response_headers['Accept-Ranges'] = 'bytes'
+    response_headers['Content-Length'] = str(stop - start)
+    if status == 206:
+        response_headers['Content-Range'] = f'bytes {start}-{stop - 1}/{size}'
+
+    response = Response(chain([first], chunks), status=status, mimetype=mimetype, headers=response_headers)
+    if hasattr(chunks, 'close'):
+        response.call_on_close(chunks.close)    # client went away: release the DB connection
+    return response
@@ -9,6 +9,11 @@ Adds WebSocket support to Flask app for:
 - Live newsletter activity
 - Collaborative editing
 
+All broadcasts go through broadcast_bus.BroadcastBus: rooms are shared by
+every worker via a SQLite-backed bus, each client has a bounded send queue,
+typing/flow events are coalesced and slow handlers (tests, Ollama, training)
+run on a bounded executor. Live counters: GET /api/ws/stats
+
 Setup:
     pip install flask-socketio
 
@@ -22,8 +27,10 @@ Usage:
 """
 
 from flask import Flask, render_template, request, g
-from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
+from flask_socketio import SocketIO, emit
 from database import get_db
+from broadcast_bus import BroadcastBus, publish_event
+from llm_stream import LLMStream
 from subdomain_router import detect_brand_from_subdomain
 from datetime import datetime
 import json
@@ -45,6 +52,23 @@ def setup_websockets(app):
     """
     socketio = SocketIO(app, cors_allowed_origins="*")
 
+    # Fan-out layer: cross-worker rooms, per-client queues, bounded job executor
+    bus = BroadcastBus(
+        lambda event, data, sid: socketio.emit(event, data, to=sid),
+        start_task=socketio.start_background_task
+    )
+    bus.start()
+    socketio.bus = bus
+
+    # Ollama generations in flight per client, cancelled when it disconnects
+    ollama_streams = {}
+
+    @app.route('/api/ws/stats')
+    def websocket_stats():
+        """Connected clients, fan-out latency and dropped messages (this worker)"""
+        from flask import jsonify
+        return jsonify(bus.stats())
+
     # ==============================================================================
     # CONNECTION MANAGEMENT
     # ==============================================================================
@@ -53,6 +77,7 @@ def setup_websockets(app):
     def handle_connect():
         """Client connected via WebSocket"""
         client_id = request.sid
+        bus.connect(client_id)
         print(f"🔌 WebSocket connected: {client_id}")
 
         # Send welcome message
@@ -66,6 +91,9 @@ def setup_websockets(app):
     def handle_disconnect():
         """Client disconnected"""
         client_id = request.sid
+        bus.disconnect(client_id)
+        for stream in ollama_streams.pop(client_id, set()):
+            stream.cancel()
         print(f"🔌 WebSocket disconnected: {client_id}")
 
     # ==============================================================================
@@ -89,7 +117,7 @@ def setup_websockets(app):
             return
 
         room = f"brand:{brand_slug}"
-        join_room(room)
+        bus.join(request.sid, room)
 
         print(f"👥 Client {request.sid} joined {room}")
 
@@ -100,9 +128,9 @@ def setup_websockets(app):
         })
 
         # Notify room (broadcast to all members)
-        emit('member_joined', {
+        bus.publish('member_joined', {
             'brand_slug': brand_slug,
-            'member_count': len(rooms(room=room))
+            'member_count': bus.room_size(room)
         }, room=room)
 
     @socketio.on('leave_brand')
@@ -111,7 +139,7 @@ def setup_websockets(app):
         brand_slug = data.get('brand_slug')
         room = f"brand:{brand_slug}"
 
-        leave_room(room)
+        bus.leave(request.sid, room)
         print(f"👥 Client {request.sid} left {room}")
 
         emit('left_brand', {'brand_slug': brand_slug})
@@ -147,12 +175,12 @@ def setup_websockets(app):
         print(f"🎨 Brand updated: {brand_slug}")
 
         # Broadcast to all clients in brand room
-        emit('brand_refresh', {
+        bus.publish('brand_refresh', {
             'brand_slug': brand_slug,
             'changes': data.get('changes', {}),
             'timestamp': datetime.now().isoformat(),
             'message': f'{brand_slug} theme updated! Refreshing...'
-        }, room=room, broadcast=True)
+        }, room=room)
 
     # ==============================================================================
     # SUBSCRIPTION UPDATES (Real-time subscriber counts)
@@ -195,19 +223,19 @@ def setup_websockets(app):
 
         db.close()
 
-        # Broadcast to admin dashboard
-        emit('subscriber_count_update', {
+        # Broadcast to admin dashboard (live stat - latest count wins)
+        bus.publish('subscriber_count_update', {
             'brand_slug': brand_slug,
             'count': count,
             'latest_subscriber': email,
             'timestamp': datetime.now().isoformat()
-        }, room='admin', broadcast=True)
+        }, room='admin', coalesce_key=('subscriber_count', brand_slug))
 
         # Also broadcast to brand room
-        emit('subscription_notification', {
+        bus.publish('subscription_notification', {
             'message': f'New subscriber to {brand["name"]}!',
             'count': count
-        }, room=f"brand:{brand_slug}", broadcast=True)
+        }, room=f"brand:{brand_slug}")
 
     # ==============================================================================
     # DATA FLOW TRACKING (For interactive concept map)
@@ -227,12 +255,12 @@ def setup_websockets(app):
                 'data': {...}
             }
         """
-        emit('data_flow', {
+        bus.publish('data_flow', {
             'from': data.get('from'),
             'to': data.get('to'),
             'data': data.get('data', {}),
             'timestamp': datetime.now().isoformat()
-        }, broadcast=True)
+        }, coalesce_key=('data_flow', data.get('from'), data.get('to')))
 
     # ==============================================================================
     # ADMIN ROOM (Admin dashboard updates)
@@ -246,7 +274,7 @@ def setup_websockets(app):
         #     emit('error', {'message': 'Unauthorized'})
         #     return
 
-        join_room('admin')
+        bus.join(request.sid, 'admin')
         print(f"👑 Admin {request.sid} joined admin room")
 
         emit('joined_admin', {
@@ -274,12 +302,12 @@ def setup_websockets(app):
         brand_slug = data.get('brand_slug')
         room = f"brand:{brand_slug}"
 
-        emit('new_post', {
+        bus.publish('new_post', {
             'post_id': data.get('post_id'),
             'title': data.get('title'),
             'message': f'New post: {data.get("title")}',
             'timestamp': datetime.now().isoformat()
-        }, room=room, broadcast=True)
+        }, room=room)
 
     # ==============================================================================
     # COLLABORATIVE FEATURES
@@ -301,15 +329,19 @@ def setup_websockets(app):
         post_id = data.get('post_id')
         room = f"post:{post_id}"
 
-        emit('typing_indicator', {
+        bus.publish('typing_indicator', {
             'username': data.get('username'),
             'post_id': post_id
-        }, room=room, broadcast=True, include_self=False)
+        }, room=room, skip_sid=request.sid, coalesce_key=('typing', post_id, data.get('username')))
 
     # ==============================================================================
     # TEST RUNNER - Visual test execution
     # ==============================================================================
 
+    def _busy(sid):
+        """Tell a client the job executor is saturated"""
+        bus.send_to(sid, 'error', {'message': 'Server busy - too many running jobs, try again shortly'})
+
     @socketio.on('run_single_test')
     def handle_run_single_test(data):
         """
@@ -321,25 +353,23 @@ def setup_websockets(app):
             }
         """
         from test_runner import run_test
-        import threading
 
+        sid = request.sid
         test_name = data.get('test_name')
 
         if not test_name:
             emit('error', {'message': 'Missing test_name'})
             return
 
-        emit('test_started', {'test_name': test_name})
-
         def output_callback(line):
             """Stream test output to client"""
-            emit('test_output', {'line': line})
+            bus.send_to(sid, 'test_output', {'line': line})
 
-        def run_in_thread():
-            """Run test in background thread"""
+        def run_job():
+            """Run test on the bounded executor"""
             passed, stdout, stderr = run_test(test_name, output_callback)
 
-            emit('test_complete', {
+            bus.send_to(sid, 'test_complete', {
                 'test_name': test_name,
                 'passed': passed,
                 'stdout': stdout,
@@ -347,10 +377,10 @@ def setup_websockets(app):
                 'error': stderr if not passed else None
             })
 
-        # Run test in background
-        thread = threading.Thread(target=run_in_thread)
-        thread.daemon = True
-        thread.start()
+        emit('test_started', {'test_name': test_name})
+
+        if not bus.submit(run_job):
+            _busy(sid)
 
     @socketio.on('run_all_tests')
     def handle_run_all_tests(data=None):
@@ -360,27 +390,25 @@ def setup_websockets(app):
         Streams output in real-time
         """
         from test_runner import discover_tests, run_test
-        import threading
 
+        sid = request.sid
         tests = discover_tests()
 
-        emit('test_started', {'test_name': 'All Tests', 'count': len(tests)})
-
         def output_callback(line):
             """Stream test output to client"""
-            emit('test_output', {'line': line})
+            bus.send_to(sid, 'test_output', {'line': line})
 
-        def run_in_thread():
-            """Run all tests in background thread"""
+        def run_job():
+            """Run all tests on the bounded executor"""
             results = {}
 
             for test_file in tests:
-                emit('test_started', {'test_name': test_file})
+                bus.send_to(sid, 'test_started', {'test_name': test_file})
 
                 passed, stdout, stderr = run_test(test_file, output_callback)
                 results[test_file] = passed
 
-                emit('test_complete', {
+                bus.send_to(sid, 'test_complete', {
                     'test_name': test_file,
                     'passed': passed,
                     'stdout': stdout,
@@ -391,16 +419,16 @@ def setup_websockets(app):
             # Send summary
             passed_count = sum(1 for p in results.values() if p)
 
-            emit('all_tests_complete', {
+            bus.send_to(sid, 'all_tests_complete', {
                 'results': results,
                 'passed_count': passed_count,
                 'total_count': len(results)
             })
 
-        # Run tests in background
-        thread = threading.Thread(target=run_in_thread)
-        thread.daemon = True
-        thread.start()
+        emit('test_started', {'test_name': 'All Tests', 'count': len(tests)})
+
+        if not bus.submit(run_job):
+            _busy(sid)
 
     @socketio.on('auto_loop')
     def handle_auto_loop(data=None):
@@ -410,36 +438,34 @@ def setup_websockets(app):
         "loop it until it doesn't need to be"
         """
         from test_runner import auto_test_loop
-        import threading
 
+        sid = request.sid
         max_attempts = data.get('max_attempts', 10) if data else 10
         delay = data.get('delay', 3) if data else 3
 
-        emit('test_output', {
-            'line': f'\n🔄 AUTO-LOOP MODE: Running until all tests pass (max {max_attempts} attempts)\n\n'
-        })
-
         def output_callback(line):
             """Stream test output to client"""
-            emit('test_output', {'line': line})
+            bus.send_to(sid, 'test_output', {'line': line})
 
-        def run_in_thread():
-            """Run auto-loop in background thread"""
+        def run_job():
+            """Run auto-loop on the bounded executor"""
             success = auto_test_loop(
                 max_attempts=max_attempts,
                 delay=delay,
                 output_callback=output_callback
             )
 
-            emit('auto_loop_complete', {
+            bus.send_to(sid, 'auto_loop_complete', {
                 'success': success,
                 'message': '🎉 All tests passed!' if success else '❌ Some tests still failing'
             })
 
-        # Run in background
-        thread = threading.Thread(target=run_in_thread)
-        thread.daemon = True
-        thread.start()
+        emit('test_output', {
+            'line': f'\n🔄 AUTO-LOOP MODE: Running until all tests pass (max {max_attempts} attempts)\n\n'
+        })
+
+        if not bus.submit(run_job):
+            _busy(sid)
 
     # ==============================================================================
     # OLLAMA CHAT - AI integration
@@ -448,7 +474,12 @@ def setup_websockets(app):
     @socketio.on('ollama_chat')
     def handle_ollama_chat(data):
         """
-        Chat with Ollama AI
+        Chat with Ollama AI, streamed
+
+        Emits ollama_token {'token'} per chunk as it is generated, then
+        ollama_response {'response', 'model', 'ttft_ms', 'total_ms', ...}
+        with the full text (authoritative if a slow client dropped tokens).
+        The generation is cancelled if the client disconnects.
 
         Args:
             data: {
@@ -456,9 +487,7 @@ def setup_websockets(app):
                 'model': 'llama3.2:3b'
             }
         """
-        import requests
-        import threading
-
+        sid = request.sid
         message = data.get('message')
         model = data.get('model', 'llama3.2:3b')
 
@@ -466,37 +495,35 @@ def setup_websockets(app):
             emit('ollama_error', {'error': 'Missing message'})
             return
 
-        def chat_in_thread():
-            """Call Ollama API in background"""
+        def chat_job():
+            """Stream Ollama tokens to the client on the bounded executor"""
             try:
-                response = requests.post(
-                    'http://localhost:11434/api/generate',
-                    json={
-                        'model': model,
-                        'prompt': message,
-                        'stream': False
-                    },
-                    timeout=60
-                )
-
-                response.raise_for_status()
-                result = response.json()
-
-                emit('ollama_response', {
-                    'response': result.get('response', ''),
-                    'model': model
-                })
-
+                stream = LLMStream.generate({'model': model, 'prompt': message}, timeout=60)
             except Exception as e:
-                emit('ollama_error', {
+                bus.send_to(sid, 'ollama_error', {
                     'error': str(e),
                     'message': 'Is Ollama running at localhost:11434?'
                 })
+                return
+
+            ollama_streams.setdefault(sid, set()).add(stream)
+            if not bus.is_connected(sid):
+                stream.cancel()      # left while the request was being accepted
+
+            try:
+                for token in stream:
+                    bus.send_to(sid, 'ollama_token', {'token': token, 'model': model})
+
+                if stream.error:
+                    bus.send_to(sid, 'ollama_error', {'error': stream.error})
+                elif not stream.cancelled:
+                    bus.send_to(sid, 'ollama_response', dict(stream.summary(), response=stream.text, model=model))
+            finally:
+                stream.close()
+                ollama_streams.get(sid, set()).discard(stream)
 
-        # Run in background
-        thread = threading.Thread(target=chat_in_thread)
-        thread.daemon = True
-        thread.start()
+        if not bus.submit(chat_job):
+            emit('ollama_error', {'error': 'busy', 'message': 'Too many chats in progress, try again shortly'})
 
     # ==============================================================================
     # NEURAL NETWORK TRAINING - Visual builder
@@ -514,8 +541,7 @@ def setup_websockets(app):
                 'batch_size': 32
             }
         """
-        import threading
-
+        sid = request.sid
         layers = data.get('layers', [])
         epochs = data.get('epochs', 10)
 
@@ -523,12 +549,7 @@ def setup_websockets(app):
             emit('error', {'message': 'No layers configured'})
             return
 
-        emit('training_started', {
-            'layers': len(layers),
-            'epochs': epochs
-        })
-
-        def train_in_thread():
+        def train_job():
             """Simulate training (placeholder)"""
             import time
 
@@ -537,22 +558,25 @@ def setup_websockets(app):
                 # For now, just simulate
                 time.sleep(0.5)
 
-                emit('training_progress', {
+                bus.send_to(sid, 'training_progress', {
                     'epoch': epoch + 1,
                     'total_epochs': epochs,
                     'loss': 0.5 / (epoch + 1),  # Fake decreasing loss
                     'message': f'Epoch {epoch + 1}/{epochs}'
                 })
 
-            emit('training_complete', {
+            bus.send_to(sid, 'training_complete', {
                 'message': 'Training complete!',
                 'final_loss': 0.05
             })
 
-        # Run in background
-        thread = threading.Thread(target=train_in_thread)
-        thread.daemon = True
-        thread.start()
+        emit('training_started', {
+            'layers': len(layers),
+            'epochs': epochs
+        })
+
+        if not bus.submit(train_job):
+            _busy(sid)
 
     # ==============================================================================
     # CRINGEPROOF MULTIPLAYER ROOMS
@@ -577,7 +601,7 @@ def setup_websockets(app):
             return
 
         # Join the room
-        join_room(room_code)
+        bus.join(request.sid, room_code)
 
         print(f"🎮 {username} joined cringeproof room: {room_code}")
 
@@ -588,11 +612,11 @@ def setup_websockets(app):
         })
 
         # Notify all other players in the room
-        emit('player_joined', {
+        bus.publish('player_joined', {
             'username': username,
             'room_code': room_code,
             'timestamp': datetime.now().isoformat()
-        }, room=room_code, include_self=False)
+        }, room=room_code, skip_sid=request.sid)
 
     @socketio.on('leave_cringeproof_room')
     def handle_leave_cringeproof_room(data):
@@ -612,12 +636,12 @@ def setup_websockets(app):
             return
 
         # Leave the room
-        leave_room(room_code)
+        bus.leave(request.sid, room_code)
 
         print(f"🎮 {username} left cringeproof room: {room_code}")
 
         # Notify all players in the room
-        emit('player_left', {
+        bus.publish('player_left', {
             'username': username,
             'room_code': room_code,
             'timestamp': datetime.now().isoformat()
@@ -646,12 +670,12 @@ def setup_websockets(app):
         print(f"💬 {username} in {room_code}: {message}")
 
         # Broadcast message to all players in room
-        emit('room_message', {
+        bus.publish('room_message', {
             'username': username,
             'message': message,
             'room_code': room_code,
             'timestamp': datetime.now().isoformat()
-        }, room=room_code, broadcast=True)
+        }, room=room_code)
 
     @socketio.on('share_game_result')
     def handle_share_game_result(data):
@@ -678,13 +702,13 @@ def setup_websockets(app):
         print(f"📊 {username} shared result in {room_code}: {score}% ({archetype})")
 
         # Broadcast result to all players in room
-        emit('game_result_shared', {
+        bus.publish('game_result_shared', {
             'username': username,
             'score': score,
             'archetype': archetype,
             'room_code': room_code,
             'timestamp': datetime.now().isoformat()
-        }, room=room_code, broadcast=True)
+        }, room=room_code)
 
     return socketio
 
@@ -737,6 +761,9 @@ def broadcast_brand_update(brand_slug, changes):
     """
     Helper to broadcast brand updates from anywhere in code
 
+    Works from any process - the event goes through the broadcast bus and
+    every WebSocket worker delivers it to its clients in the brand room.
+
     Usage:
         from websocket_server import broadcast_brand_update
 
@@ -745,21 +772,15 @@ def broadcast_brand_update(brand_slug, changes):
             'colors': ['#003366', '#0066cc']
         })
     """
-    from flask_socketio import SocketIO
-    socketio = SocketIO()
-
-    socketio.emit('brand_refresh', {
+    publish_event('brand_refresh', {
         'brand_slug': brand_slug,
         'changes': changes,
         'timestamp': datetime.now().isoformat()
-    }, room=f"brand:{brand_slug}", namespace='/')
+    }, room=f"brand:{brand_slug}")
 
 
 def broadcast_subscription(brand_slug, email):
     """Helper to broadcast new subscription"""
-    from flask_socketio import SocketIO
-    socketio = SocketIO()
-
     db = get_db()
     count = db.execute('''
         SELECT COUNT(*) as count FROM subscribers
@@ -768,11 +789,11 @@ def broadcast_subscription(brand_slug, email):
     ''', (brand_slug,)).fetchone()['count']
     db.close()
 
-    socketio.emit('subscriber_count_update', {
+    publish_event('subscriber_count_update', {
         'brand_slug': brand_slug,
         'count': count,
         'latest_subscriber': email
-    }, room='admin', namespace='/')
+    }, room='admin')
 
 
 # ==============================================================================